@@ -62,6 +62,7 @@ CREATE TABLE IF NOT EXISTS book_ticker_snapshots (
     -- Metadata
     sequence_number BIGINT,
     update_type VARCHAR(10) DEFAULT 'snapshot',
+    received_at TIMESTAMPTZ,              -- Local receive time (timestamp holds the exchange event time)
     created_at TIMESTAMPTZ DEFAULT NOW(),
     
     -- HFT Performance Constraints
@@ -101,6 +102,32 @@ SELECT create_hypertable('orderbook_depth', 'timestamp',
     chunk_time_interval => INTERVAL '30 minutes',
     if_not_exists => TRUE);
 
+-- Orderbook depth samples, array-encoded (one row per top-N sample, migration 004)
+-- Written by the depth collector with encoding='arrays'
+CREATE TABLE IF NOT EXISTS orderbook_depth_snapshots (
+    timestamp TIMESTAMPTZ NOT NULL,
+    symbol_id INTEGER NOT NULL REFERENCES symbols(id),  -- Foreign key to symbols table
+    
+    -- Top-N levels per side, element 1 = best level (float-only policy)
+    bid_prices FLOAT8[] NOT NULL,
+    bid_sizes FLOAT8[] NOT NULL,
+    ask_prices FLOAT8[] NOT NULL,
+    ask_sizes FLOAT8[] NOT NULL,
+    
+    -- Metadata
+    exchange_timestamp TIMESTAMPTZ,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    
+    CONSTRAINT chk_depth_bid_arrays CHECK (cardinality(bid_prices) = cardinality(bid_sizes)),
+    CONSTRAINT chk_depth_ask_arrays CHECK (cardinality(ask_prices) = cardinality(ask_sizes)),
+    
+    PRIMARY KEY (timestamp, symbol_id)
+);
+
+SELECT create_hypertable('orderbook_depth_snapshots', 'timestamp',
+    chunk_time_interval => INTERVAL '30 minutes',
+    if_not_exists => TRUE);
+
 -- Trade data table - NORMALIZED SCHEMA (matches TradeSnapshot model but with symbol_id)
 CREATE TABLE IF NOT EXISTS trade_snapshots (
     id BIGSERIAL,
@@ -326,6 +353,10 @@ CREATE INDEX IF NOT EXISTS idx_book_ticker_time_symbol
 CREATE INDEX IF NOT EXISTS idx_book_ticker_recent 
     ON book_ticker_snapshots(timestamp DESC) WHERE timestamp > NOW() - INTERVAL '1 hour';
 
+-- Feed latency / receive-clock replay queries (received_at, migration 005)
+CREATE INDEX IF NOT EXISTS idx_book_ticker_symbol_received 
+    ON book_ticker_snapshots(symbol_id, received_at DESC) WHERE received_at IS NOT NULL;
+
 -- HFT-optimized indexes for trade_snapshots
 CREATE INDEX IF NOT EXISTS idx_trade_snapshots_symbol_time 
     ON trade_snapshots(symbol_id, timestamp DESC);
@@ -422,6 +453,10 @@ CREATE INDEX IF NOT EXISTS idx_collector_status_recent
 CREATE INDEX IF NOT EXISTS idx_orderbook_depth_symbol_time_level 
     ON orderbook_depth(symbol_id, timestamp DESC, level);
 
+-- Indexes for orderbook_depth_snapshots table
+CREATE INDEX IF NOT EXISTS idx_orderbook_depth_snapshots_symbol_time 
+    ON orderbook_depth_snapshots(symbol_id, timestamp DESC);
+
 -- =============================================================================
 -- TIMESCALEDB CONTINUOUS AGGREGATES (NORMALIZED SCHEMA)
 -- =============================================================================
@@ -466,6 +501,7 @@ SELECT add_continuous_aggregate_policy('book_ticker_1min',
 -- Raw time-series data: Keep 3 days to prevent disk overflow (reduced from 7 days)
 SELECT add_retention_policy('book_ticker_snapshots', INTERVAL '3 days', if_not_exists => TRUE);
 SELECT add_retention_policy('orderbook_depth', INTERVAL '3 days', if_not_exists => TRUE);
+SELECT add_retention_policy('orderbook_depth_snapshots', INTERVAL '3 days', if_not_exists => TRUE);
 SELECT add_retention_policy('trade_snapshots', INTERVAL '3 days', if_not_exists => TRUE);
 
 -- Funding rates: Keep 7 days for analysis (reduced from 90 days)
@@ -517,6 +553,7 @@ ALTER TABLE exchanges OWNER TO arbitrage_user;
 ALTER TABLE symbols OWNER TO arbitrage_user;
 ALTER TABLE book_ticker_snapshots OWNER TO arbitrage_user;
 ALTER TABLE orderbook_depth OWNER TO arbitrage_user;
+ALTER TABLE orderbook_depth_snapshots OWNER TO arbitrage_user;
 ALTER TABLE trade_snapshots OWNER TO arbitrage_user;
 ALTER TABLE funding_rate_snapshots OWNER TO arbitrage_user;
 ALTER TABLE balance_snapshots OWNER TO arbitrage_user;
@@ -5,15 +5,18 @@ Collects and saves:
 1. Book ticker snapshots
 2. Funding rates  
 3. Trades
+4. Orderbook depth samples (optional, enabled via DepthCollectionConfig)
 
 Simple architecture with minimal dependencies.
 """
 
 import asyncio
 import logging
-from typing import List
+from typing import List, Optional
 
 from applications.data_collection.collector_ws_manager import CollectorWebSocketManager
+from applications.data_collection.depth_collector import DepthCollectionConfig
+from applications.data_collection.sampling import BookTickerSampler
 from applications.data_collection.snapshot_scheduler import SnapshotScheduler
 from exchanges.structs import Symbol, ExchangeEnum
 from db import close_database_manager, initialize_database_manager, get_database_manager
@@ -22,9 +25,13 @@ from db import close_database_manager, initialize_database_manager, get_database
 class DataCollector:
     """Simple data collector for funding rates, book tickers, and trades."""
     
-    def __init__(self, exchanges: List[ExchangeEnum], symbols: List[Symbol]):
+    def __init__(self, exchanges: List[ExchangeEnum], symbols: List[Symbol],
+                 depth_config: Optional[DepthCollectionConfig] = None,
+                 sampler: Optional[BookTickerSampler] = None):
         self.exchanges = exchanges
         self.symbols = symbols
+        self.depth_config = depth_config
+        self.sampler = sampler
         self.logger = logging.getLogger('data_collector')
         self.ws_manager = None
         self.scheduler = None
@@ -40,7 +47,8 @@ class DataCollector:
             self.logger.info("Database initialized")
             
             # Initialize WebSocket manager
-            self.ws_manager = CollectorWebSocketManager(self.exchanges, self.db)
+            self.ws_manager = CollectorWebSocketManager(self.exchanges, self.db, depth_config=self.depth_config,
+                                                        sampler=self.sampler)
             await self.ws_manager.initialize(self.symbols)
             self.logger.info("WebSocket manager initialized")
             
@@ -4,15 +4,19 @@ from datetime import datetime, timezone
 from typing import List, Dict, Optional, Union, Set
 
 from config import get_exchange_config
+from applications.data_collection.depth_collector import (DepthBookTracker, DepthCollectionConfig,
+                                                          DIFF_DEPTH_EXCHANGES)
+from applications.data_collection.sampling import BookTickerSampler
 from db import BookTickerSnapshot, TradeSnapshot
-from db.models import FundingRateSnapshot
+from db.models import FundingRateSnapshot, OrderbookDepthSnapshot
 from exchanges.adapters import BindedEventHandlersAdapter
 from exchanges.exchange_factory import get_composite_implementation
 from exchanges.interfaces.composite.futures.base_public_futures_composite import CompositePublicFuturesExchange
 from exchanges.interfaces.composite.spot.base_public_spot_composite import CompositePublicSpotExchange
-from exchanges.structs import ExchangeEnum, Symbol, BookTicker, Trade
+from exchanges.structs import ExchangeEnum, Symbol, BookTicker, Trade, OrderBook
 from infrastructure.logging import get_logger
 from infrastructure.networking.websocket.structs import PublicWebsocketChannelType
+from utils.time_utils import get_current_timestamp
 from dataclasses import dataclass
 
 @dataclass
@@ -21,28 +25,42 @@ class DataCache:
     book_tickers: List[BookTickerSnapshot]
     trades: List[TradeSnapshot]
     funding_rates: List[FundingRateSnapshot]
+    depth_snapshots: List[OrderbookDepthSnapshot]
 
     def __init__(self):
         self.book_tickers = []
         self.last_book_ticker: Dict[Symbol, BookTicker] = {}
         self.trades = []
         self.funding_rates = []
+        self.depth_snapshots = []
 
     def clear(self):
         """Clear all cached data."""
         self.book_tickers.clear()
         self.trades.clear()
         self.funding_rates.clear()
+        self.depth_snapshots.clear()
 
 
 
 class CollectorWebSocketManager:
     """Simple WebSocket manager for collecting market data."""
 
-    def __init__(self, exchanges: List[ExchangeEnum], database_manager=None):
-        """Initialize WebSocket manager."""
+    def __init__(self, exchanges: List[ExchangeEnum], database_manager=None,
+                 depth_config: Optional[DepthCollectionConfig] = None,
+                 sampler: Optional[BookTickerSampler] = None):
+        """
+        Initialize WebSocket manager.
+
+        Args:
+            exchanges: Exchanges to collect from
+            database_manager: DatabaseManager used for symbol_id resolution
+            depth_config: Enables orderbook depth collection when provided
+            sampler: Book ticker sampling policies (default policy if omitted)
+        """
         self.exchanges = exchanges
         self.db = database_manager
+        self.depth_config = depth_config
         self.logger = get_logger('data_collector')
 
         # Exchange clients
@@ -54,8 +72,15 @@ class CollectorWebSocketManager:
         # Data cache
         self.cache = DataCache()
 
+        # Book ticker change-detection / rate sampling
+        self.sampler = sampler or BookTickerSampler()
+
+        # Optional orderbook depth collection
+        self._depth_tracker: Optional[DepthBookTracker] = DepthBookTracker(depth_config) if depth_config else None
+
         # Background tasks
         self._funding_rate_sync_task: Optional[asyncio.Task] = None
+        self._depth_seed_tasks: Set[asyncio.Task] = set()
 
     async def initialize(self, symbols: List[Symbol]) -> None:
         """Initialize WebSocket connections."""
@@ -85,6 +110,9 @@ class CollectorWebSocketManager:
                         lambda book_ticker: self._handle_book_ticker_update(exchange, book_ticker.symbol, book_ticker))
             public_exchange.bind(PublicWebsocketChannelType.PUB_TRADE,
                         lambda trade: self._handle_trade_update(exchange, trade.symbol, trade))
+            if self._depth_tracker:
+                public_exchange.bind(PublicWebsocketChannelType.ORDERBOOK,
+                            lambda orderbook: self._handle_orderbook_update(exchange, orderbook.symbol, orderbook))
 
             # adapter.bind(PublicWebsocketChannelType.TICKER,
             #            lambda ticker: self._handle_ticker_update(exchange, ticker))
@@ -96,6 +124,8 @@ class CollectorWebSocketManager:
 
             # Initialize
             channels = [PublicWebsocketChannelType.BOOK_TICKER, PublicWebsocketChannelType.PUB_TRADE]
+            if self._depth_tracker:
+                channels.append(PublicWebsocketChannelType.ORDERBOOK)
             # if config.is_futures:
             #     channels.append(PublicWebsocketChannelType.TICKER)
 
@@ -103,6 +133,9 @@ class CollectorWebSocketManager:
             self._active_symbols[exchange].update(symbols)
             self._connected[exchange] = True
 
+            if self._depth_tracker and exchange in DIFF_DEPTH_EXCHANGES:
+                await self._seed_depth_books(exchange, symbols)
+
             self.logger.info(f"Initialized {exchange.value} with {len(symbols)} symbols")
 
         except Exception as e:
@@ -119,22 +152,23 @@ class CollectorWebSocketManager:
                 self.logger.warning(f"Cannot resolve symbol_id for {exchange.value} {symbol.base}/{symbol.quote}")
                 return
 
-            last_book_ticker = self.cache.last_book_ticker.get(symbol)
-            if (last_book_ticker and last_book_ticker.bid_price == book_ticker.bid_price and
-                    last_book_ticker.ask_price == book_ticker.ask_price):
-                # No change in prices, skip
+            received_ms = get_current_timestamp()
+            if not self.sampler.should_store(symbol_id, book_ticker, received_ms):
                 return
 
             # Update last book ticker
             self.cache.last_book_ticker[symbol] = book_ticker
-            # Create snapshot
+
+            # Exchange event time; fall back to receive time if the feed has none
+            event_ms = book_ticker.timestamp or received_ms
             snapshot = BookTickerSnapshot.from_symbol_id_and_data(
                 symbol_id=symbol_id,
                 bid_price=book_ticker.bid_price,
                 bid_qty=book_ticker.bid_quantity,
                 ask_price=book_ticker.ask_price,
                 ask_qty=book_ticker.ask_quantity,
-                timestamp=datetime.now(timezone.utc)
+                timestamp=datetime.fromtimestamp(event_ms / 1000, tz=timezone.utc),
+                received_at=datetime.fromtimestamp(received_ms / 1000, tz=timezone.utc)
             )
 
             # Add to cache
@@ -161,6 +195,63 @@ class CollectorWebSocketManager:
             self.logger.error(f"Error handling trade for {exchange.value} {symbol}: {e}")
 
 
+    async def _handle_orderbook_update(self, exchange: ExchangeEnum, symbol: Symbol, orderbook: OrderBook) -> None:
+        """Handle orderbook updates, sampling top-N depth at the configured cadence."""
+        try:
+            symbol_id = await self.db.resolve_symbol_id_async(exchange, symbol)
+            if not symbol_id:
+                return
+
+            snapshot = self._depth_tracker.on_update(
+                symbol_id,
+                orderbook,
+                is_diff=exchange in DIFF_DEPTH_EXCHANGES,
+                now_ms=get_current_timestamp(),
+                multiplier=self._get_quanto_multiplier(exchange, symbol),
+            )
+
+            if snapshot:
+                self.cache.depth_snapshots.append(snapshot)
+            elif self._depth_tracker.needs_seed(symbol_id):
+                # Sequence gap: diffs are buffered until a fresh snapshot is applied
+                self.logger.warning(f"Orderbook sequence gap for {exchange.value} {symbol}, reseeding")
+                task = asyncio.create_task(self._seed_depth_book(exchange, symbol, symbol_id))
+                self._depth_seed_tasks.add(task)
+                task.add_done_callback(self._depth_seed_tasks.discard)
+
+        except Exception as e:
+            self.logger.error(f"Error handling orderbook for {exchange.value} {symbol}: {e}")
+
+    async def _seed_depth_books(self, exchange: ExchangeEnum, symbols: List[Symbol]) -> None:
+        """Seed diff-based orderbooks from REST snapshots."""
+        for symbol in symbols:
+            symbol_id = await self.db.resolve_symbol_id_async(exchange, symbol)
+            if symbol_id:
+                await self._seed_depth_book(exchange, symbol, symbol_id)
+
+    async def _seed_depth_book(self, exchange: ExchangeEnum, symbol: Symbol, symbol_id: int) -> None:
+        """Seed one diff-based orderbook, buffering diffs that arrive while the snapshot is fetched."""
+        composite = self._exchanges[exchange]
+        self._depth_tracker.begin_seed(symbol_id, symbol)
+        try:
+            orderbook = await composite.rest_client.get_orderbook(symbol, max(self.depth_config.levels, 20))
+        except Exception as e:
+            self._depth_tracker.abort_seed(symbol_id)
+            self.logger.error(f"Failed to seed orderbook for {exchange.value} {symbol}: {e}")
+            return
+
+        if not self._depth_tracker.seed(symbol_id, orderbook, self._get_quanto_multiplier(exchange, symbol)):
+            # Buffered diffs do not connect to the snapshot; the next diff triggers a reseed
+            self.logger.warning(f"Orderbook snapshot for {exchange.value} {symbol} behind buffered diffs")
+
+    def _get_quanto_multiplier(self, exchange: ExchangeEnum, symbol: Symbol) -> float:
+        """Get contract size multiplier for a symbol (1.0 for spot)."""
+        symbols_info = self._exchanges[exchange].symbols_info
+        symbol_info = symbols_info.get(symbol) if symbols_info else None
+        if symbol_info and symbol_info.is_futures and symbol_info.quanto_multiplier:
+            return symbol_info.quanto_multiplier
+        return 1.0
+
     # async def _handle_ticker_update(self, exchange: ExchangeEnum, ticker_data: any) -> None:
     #     """Handle ticker updates for funding rate data."""
     #     try:
@@ -258,6 +349,9 @@ class CollectorWebSocketManager:
         if self._funding_rate_sync_task:
             self._funding_rate_sync_task.cancel()
 
+        for task in list(self._depth_seed_tasks):
+            task.cancel()
+
         for adapter in self._event_adapters.values():
             try:
                 await adapter.dispose()
@@ -0,0 +1,277 @@
+"""
+Orderbook Depth Collection
+
+Keeps an in-memory orderbook per collected symbol and samples the top-N levels
+into OrderbookDepthSnapshot rows for slippage research.
+
+Sampling happens inline in the orderbook update handler:
+- Rate-limited: at most one sample per symbol every `interval_ms`
+- Change-only: a sample is skipped when the top-N levels are identical to the
+  last written sample (optional)
+
+Feed handling:
+- Gate.io spot/futures deliver limited-level snapshots -> book is replaced
+- MEXC spot delivers incremental diffs (size 0 removes a level) -> book must be
+  seeded from a REST snapshot first; diffs for unseeded books are ignored
+
+Diff sequencing (versioned feeds, MEXC fromVersion/toVersion vs REST lastUpdateId):
+- begin_seed() buffers diffs while the REST snapshot is in flight; seed() replays
+  the buffer on top of the snapshot
+- diffs whose last version is <= the book version are stale and dropped
+- a diff starting beyond book version + 1 is a gap: the book is invalidated,
+  diffs are buffered again and needs_seed() asks the caller for a new snapshot
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional, Tuple
+
+from common.hft_orderbook import HFTOrderBook
+from db.models import OrderbookDepthSnapshot
+from exchanges.structs import ExchangeEnum, Symbol
+from exchanges.structs.common import OrderBook, OrderBookEntry
+
+
+# Exchanges whose ORDERBOOK channel streams diffs rather than snapshots
+DIFF_DEPTH_EXCHANGES = frozenset({ExchangeEnum.MEXC})
+
+DEPTH_ENCODINGS = ('arrays', 'levels')
+
+# Diffs buffered per symbol while a snapshot is pending; older diffs are dropped
+# (the snapshot supersedes them, a real gap is caught when the buffer is replayed)
+MAX_BUFFERED_DIFFS = 1000
+
+
+@dataclass
+class DepthCollectionConfig:
+    """Orderbook depth collection settings."""
+    levels: int = 10                # Top-N levels stored per side (orderbook_depth allows up to 20)
+    interval_ms: int = 1000         # Minimum spacing between samples per symbol
+    change_only: bool = True        # Skip samples whose top-N levels did not change
+    encoding: str = 'levels'        # 'levels' -> orderbook_depth, 'arrays' -> orderbook_depth_snapshots (opt-in)
+
+    def __post_init__(self):
+        if not 1 <= self.levels <= 20:
+            raise ValueError(f"levels must be between 1 and 20, got {self.levels}")
+        if self.interval_ms < 0:
+            raise ValueError(f"interval_ms must be non-negative, got {self.interval_ms}")
+        if self.encoding not in DEPTH_ENCODINGS:
+            raise ValueError(f"encoding must be one of {DEPTH_ENCODINGS}, got {self.encoding!r}")
+
+
+class _DepthState:
+    """Book and sampling state for one symbol."""
+    __slots__ = ('book', 'seeded', 'seeding', 'pending', 'last_sample_ms', 'last_fingerprint')
+
+    def __init__(self, symbol: Symbol):
+        self.book = HFTOrderBook(symbol)
+        self.seeded = False
+        self.seeding = False        # Snapshot request in flight
+        # Diffs (with their multiplier) received while the book awaits a snapshot
+        self.pending: Optional[Deque[Tuple[OrderBook, float]]] = None
+        self.last_sample_ms: float = 0.0
+        self.last_fingerprint: Optional[Tuple[float, ...]] = None
+
+
+def _to_pairs(entries: List[OrderBookEntry], multiplier: float) -> List[Tuple[float, float]]:
+    """Convert orderbook entries to (price, size) tuples with contract sizes scaled to base."""
+    if multiplier == 1:
+        return [(entry.price, entry.size) for entry in entries]
+    return [(entry.price, entry.size * multiplier) for entry in entries]
+
+
+class DepthBookTracker:
+    """
+    Per-symbol in-memory orderbooks with rate-limited, change-only top-N sampling.
+
+    Samples are only taken when an update arrives, so a quiet book produces no
+    rows (change-only) and a busy book produces at most one row per interval.
+    """
+
+    def __init__(self, config: Optional[DepthCollectionConfig] = None):
+        self.config = config or DepthCollectionConfig()
+        self._states: Dict[int, _DepthState] = {}
+        self._samples_taken = 0
+        self._samples_unchanged = 0
+        self._updates_ignored = 0
+        self._updates_stale = 0
+        self._resyncs = 0
+
+    def _get_state(self, symbol_id: int, symbol: Symbol) -> _DepthState:
+        state = self._states.get(symbol_id)
+        if state is None:
+            state = self._states[symbol_id] = _DepthState(symbol)
+        return state
+
+    def is_seeded(self, symbol_id: int) -> bool:
+        """Check whether a book has received its initial snapshot."""
+        state = self._states.get(symbol_id)
+        return state is not None and state.seeded
+
+    def needs_seed(self, symbol_id: int) -> bool:
+        """Check whether a book lost sync (sequence gap) and no snapshot is in flight."""
+        state = self._states.get(symbol_id)
+        return state is not None and state.pending is not None and not state.seeded and not state.seeding
+
+    def begin_seed(self, symbol_id: int, symbol: Symbol) -> None:
+        """
+        Start buffering diffs for a symbol before requesting its snapshot.
+
+        Args:
+            symbol_id: Database symbol id
+            symbol: Symbol of the book
+        """
+        state = self._get_state(symbol_id, symbol)
+        state.seeded = False
+        state.seeding = True
+        if state.pending is None:
+            state.pending = deque(maxlen=MAX_BUFFERED_DIFFS)
+
+    def abort_seed(self, symbol_id: int) -> None:
+        """Mark a snapshot request as failed; needs_seed() reports the book again."""
+        state = self._states.get(symbol_id)
+        if state is not None:
+            state.seeding = False
+
+    def seed(self, symbol_id: int, orderbook: OrderBook, multiplier: float = 1.0) -> bool:
+        """
+        Replace the book for a symbol with a full snapshot (REST or WS).
+
+        Diffs buffered since begin_seed() are replayed on top of the snapshot.
+
+        Args:
+            symbol_id: Database symbol id
+            orderbook: Snapshot orderbook
+            multiplier: Quanto multiplier applied to sizes (futures contracts -> base)
+
+        Returns:
+            False if the buffered diffs do not connect to the snapshot (book
+            invalidated again, see needs_seed())
+        """
+        state = self._get_state(symbol_id, orderbook.symbol)
+        state.book.apply_snapshot(
+            _to_pairs(orderbook.bids, multiplier),
+            _to_pairs(orderbook.asks, multiplier),
+            timestamp=orderbook.timestamp,
+            sequence=orderbook.last_update_id,
+        )
+        state.seeded = True
+        state.seeding = False
+
+        pending, state.pending = state.pending, None
+        for diff, diff_multiplier in pending or ():
+            if not self._apply_diff(state, diff, diff_multiplier):
+                return False
+        return True
+
+    def _apply_diff(self, state: _DepthState, orderbook: OrderBook, multiplier: float) -> bool:
+        """Apply a diff to a seeded book after the version check; False on a gap."""
+        last_id = orderbook.last_update_id
+        if last_id is not None and state.book.sequence:
+            if last_id <= state.book.sequence:
+                self._updates_stale += 1
+                return True
+            first_id = orderbook.first_update_id if orderbook.first_update_id is not None else last_id
+            if first_id > state.book.sequence + 1:
+                # Missed diffs: the book is wrong until a new snapshot arrives
+                self._resyncs += 1
+                state.seeded = False
+                state.pending = deque([(orderbook, multiplier)], maxlen=MAX_BUFFERED_DIFFS)
+                return False
+
+        state.book.apply_diff(
+            _to_pairs(orderbook.bids, multiplier),
+            _to_pairs(orderbook.asks, multiplier),
+            timestamp=orderbook.timestamp,
+            sequence=last_id,
+        )
+        return True
+
+    def on_update(
+        self,
+        symbol_id: int,
+        orderbook: OrderBook,
+        is_diff: bool,
+        now_ms: float,
+        multiplier: float = 1.0,
+    ) -> Optional[OrderbookDepthSnapshot]:
+        """
+        Apply an orderbook update and sample the top-N levels if due.
+
+        Args:
+            symbol_id: Database symbol id
+            orderbook: Orderbook update (diff or snapshot)
+            is_diff: True if the update is incremental
+            now_ms: Local receive time in milliseconds
+            multiplier: Quanto multiplier applied to sizes
+
+        Returns:
+            OrderbookDepthSnapshot if a sample was taken, otherwise None
+        """
+        if is_diff:
+            state = self._states.get(symbol_id)
+            if state is not None and state.pending is not None:
+                # Snapshot pending: replayed by seed()
+                state.pending.append((orderbook, multiplier))
+                return None
+            if state is None or not state.seeded:
+                self._updates_ignored += 1
+                return None
+            if not self._apply_diff(state, orderbook, multiplier):
+                return None
+        else:
+            self.seed(symbol_id, orderbook, multiplier)
+            state = self._states[symbol_id]
+
+        if state.last_sample_ms and now_ms - state.last_sample_ms < self.config.interval_ms:
+            return None
+
+        bids, asks = state.book.get_depth(self.config.levels)
+        if not bids and not asks:
+            return None
+
+        bid_prices = [entry.price for entry in bids]
+        bid_sizes = [entry.size for entry in bids]
+        ask_prices = [entry.price for entry in asks]
+        ask_sizes = [entry.size for entry in asks]
+
+        if self.config.change_only:
+            fingerprint = (*bid_prices, *bid_sizes, -1.0, *ask_prices, *ask_sizes)
+            if fingerprint == state.last_fingerprint:
+                self._samples_unchanged += 1
+                return None
+            state.last_fingerprint = fingerprint
+
+        state.last_sample_ms = now_ms
+        self._samples_taken += 1
+
+        exchange_ts = None
+        if orderbook.timestamp:
+            exchange_ts = datetime.fromtimestamp(orderbook.timestamp / 1000, tz=timezone.utc)
+
+        return OrderbookDepthSnapshot(
+            symbol_id=symbol_id,
+            bid_prices=bid_prices,
+            bid_sizes=bid_sizes,
+            ask_prices=ask_prices,
+            ask_sizes=ask_sizes,
+            timestamp=datetime.fromtimestamp(now_ms / 1000, tz=timezone.utc),
+            exchange_timestamp=exchange_ts,
+        )
+
+    def discard(self, symbol_id: int) -> None:
+        """Drop book state for a symbol (e.g. after unsubscribe or resync)."""
+        self._states.pop(symbol_id, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get sampling counters for monitoring."""
+        return {
+            'books': len(self._states),
+            'seeded_books': sum(1 for state in self._states.values() if state.seeded),
+            'samples_taken': self._samples_taken,
+            'samples_unchanged': self._samples_unchanged,
+            'updates_ignored': self._updates_ignored,
+            'updates_stale': self._updates_stale,
+            'resyncs': self._resyncs,
+        }
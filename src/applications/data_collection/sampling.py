@@ -0,0 +1,129 @@
+"""
+Book Ticker Sampling Policies
+
+Decides which book ticker updates the collector stores. A row is written when:
+- The top of book changed beyond an epsilon (price or size, relative), and at
+  least `min_interval_ms` passed since the last stored row for the symbol, or
+- No row was stored for `heartbeat_seconds` (keeps quiet books visible to
+  backtests that forward-fill); checked when the next update arrives
+
+Sampling runs on local receive time so a lagging exchange clock cannot stall
+the rate limiter or the heartbeat. Policies can be overridden per symbol.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from exchanges.structs import BookTicker, Symbol
+
+
+@dataclass(frozen=True)
+class BookTickerSamplingPolicy:
+    """Change-detection and rate settings for one symbol."""
+    price_epsilon: float = 0.0        # Relative price change that counts as a change (0 = any change)
+    size_epsilon: Optional[float] = 0.25  # Relative top-of-book size change; None ignores sizes
+    min_interval_ms: int = 100        # At most one row per interval per symbol
+    heartbeat_seconds: float = 30.0   # Store an unchanged row after this long; 0 disables
+
+    def __post_init__(self):
+        if self.price_epsilon < 0:
+            raise ValueError(f"price_epsilon must be non-negative, got {self.price_epsilon}")
+        if self.size_epsilon is not None and self.size_epsilon < 0:
+            raise ValueError(f"size_epsilon must be non-negative, got {self.size_epsilon}")
+        if self.min_interval_ms < 0:
+            raise ValueError(f"min_interval_ms must be non-negative, got {self.min_interval_ms}")
+        if self.heartbeat_seconds < 0:
+            raise ValueError(f"heartbeat_seconds must be non-negative, got {self.heartbeat_seconds}")
+
+
+def _exceeds(new: float, old: float, epsilon: float) -> bool:
+    """Check if a value moved by more than a relative epsilon (any change when epsilon is 0)."""
+    if epsilon == 0:
+        return new != old
+    return abs(new - old) > epsilon * abs(old)
+
+
+class BookTickerSampler:
+    """
+    Per-symbol book ticker sampler.
+
+    Compares each update with the last *stored* row, so a change that was
+    rate-limited is still stored by the first update after the interval ends
+    if the book has not reverted.
+    """
+
+    def __init__(self, default_policy: Optional[BookTickerSamplingPolicy] = None,
+                 symbol_policies: Optional[Dict[Symbol, BookTickerSamplingPolicy]] = None):
+        self.default_policy = default_policy or BookTickerSamplingPolicy()
+        self.symbol_policies: Dict[Symbol, BookTickerSamplingPolicy] = dict(symbol_policies or {})
+        self._last_stored: Dict[int, BookTicker] = {}
+        self._last_stored_ms: Dict[int, float] = {}
+        self._updates = 0
+        self._stored = 0
+        self._heartbeats = 0
+
+    def set_policy(self, symbol: Symbol, policy: BookTickerSamplingPolicy) -> None:
+        """Override the sampling policy for a symbol."""
+        self.symbol_policies[symbol] = policy
+
+    def get_policy(self, symbol: Symbol) -> BookTickerSamplingPolicy:
+        """Get the effective sampling policy for a symbol."""
+        return self.symbol_policies.get(symbol, self.default_policy)
+
+    def should_store(self, symbol_id: int, book_ticker: BookTicker, received_ms: float) -> bool:
+        """
+        Decide whether to store a book ticker update and record it if so.
+
+        Args:
+            symbol_id: Database symbol id (unique per exchange and symbol)
+            book_ticker: Book ticker update; its symbol selects the policy
+            received_ms: Local receive time in milliseconds
+
+        Returns:
+            True if the update should be stored
+        """
+        self._updates += 1
+        last = self._last_stored.get(symbol_id)
+
+        if last is None:
+            return self._store(symbol_id, book_ticker, received_ms)
+
+        policy = self.get_policy(book_ticker.symbol)
+        elapsed_ms = received_ms - self._last_stored_ms[symbol_id]
+
+        if policy.heartbeat_seconds and elapsed_ms >= policy.heartbeat_seconds * 1000:
+            self._heartbeats += 1
+            return self._store(symbol_id, book_ticker, received_ms)
+
+        if elapsed_ms < policy.min_interval_ms:
+            return False
+
+        if self._changed(last, book_ticker, policy):
+            return self._store(symbol_id, book_ticker, received_ms)
+
+        return False
+
+    @staticmethod
+    def _changed(last: BookTicker, current: BookTicker, policy: BookTickerSamplingPolicy) -> bool:
+        if (_exceeds(current.bid_price, last.bid_price, policy.price_epsilon) or
+                _exceeds(current.ask_price, last.ask_price, policy.price_epsilon)):
+            return True
+        if policy.size_epsilon is None:
+            return False
+        return (_exceeds(current.bid_quantity, last.bid_quantity, policy.size_epsilon) or
+                _exceeds(current.ask_quantity, last.ask_quantity, policy.size_epsilon))
+
+    def _store(self, symbol_id: int, book_ticker: BookTicker, received_ms: float) -> bool:
+        self._last_stored[symbol_id] = book_ticker
+        self._last_stored_ms[symbol_id] = received_ms
+        self._stored += 1
+        return True
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get sampling counters for monitoring."""
+        return {
+            'updates': self._updates,
+            'stored': self._stored,
+            'heartbeats': self._heartbeats,
+            'store_ratio': self._stored / self._updates if self._updates else 0.0,
+        }
@@ -39,7 +39,9 @@ class SnapshotScheduler:
                 try:
                     from db.operations import insert_book_ticker_snapshots_batch
                     result = await insert_book_ticker_snapshots_batch(cache.book_tickers)
-                    self.logger.info(f"Saved {result} book ticker snapshots (cached: {len(cache.book_tickers)})")
+                    sampling = self.ws_manager.sampler.get_stats()
+                    self.logger.info(f"Saved {result} book ticker snapshots (cached: {len(cache.book_tickers)}, "
+                                     f"stored {sampling['store_ratio']:.1%} of {sampling['updates']} updates)")
                     cache.book_tickers.clear()
                 except Exception as e:
                     self.logger.error(f"Failed to save book ticker snapshots: {e}")
@@ -79,6 +81,22 @@ class SnapshotScheduler:
                     # Clear problematic data to prevent repeated failures
                     cache.funding_rates.clear()
 
+            # Save orderbook depth samples
+            if cache.depth_snapshots:
+                try:
+                    from db.operations import insert_orderbook_depth_snapshots_batch
+                    encoding = self.ws_manager.depth_config.encoding
+                    result = await insert_orderbook_depth_snapshots_batch(cache.depth_snapshots, encoding=encoding)
+                    self.logger.info(f"Saved {result} orderbook depth rows (cached: {len(cache.depth_snapshots)})")
+                    cache.depth_snapshots.clear()
+                except Exception as e:
+                    self.logger.error(f"Failed to save orderbook depth snapshots: {e}")
+                    if cache.depth_snapshots:
+                        sample = cache.depth_snapshots[0]
+                        self.logger.debug(f"Depth sample: symbol_id={getattr(sample, 'symbol_id', 'N/A')}, timestamp={getattr(sample, 'timestamp', 'N/A')}")
+                    # Clear problematic data to prevent repeated failures
+                    cache.depth_snapshots.clear()
+
         except Exception as e:
             self.logger.error(f"Unexpected error in data saving loop: {e}")
             import traceback
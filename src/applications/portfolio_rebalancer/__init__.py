@@ -9,6 +9,8 @@ from .config import RebalanceConfig, PortfolioState, RebalanceAction
 from .rebalancer import ThresholdCascadeRebalancer
 from .trend_filtered_rebalancer import TrendFilteredRebalancer
 from .backtester import BacktestEngine, BacktestResults
+from .price_matrix import PriceMatrix
+from .config_sweep import config_grid, simulate_configs
 from .live_trader import LiveRebalancer
 from .portfolio_tracker import PortfolioTracker
 
@@ -20,6 +22,9 @@ __all__ = [
     'TrendFilteredRebalancer',
     'BacktestEngine',
     'BacktestResults',
+    'PriceMatrix',
+    'config_grid',
+    'simulate_configs',
     'LiveRebalancer',
     'PortfolioTracker'
 ]
@@ -15,7 +15,9 @@ from exchanges.integrations.mexc.rest.mexc_rest_spot_public import MexcPublicSpo
 from config.config_manager import HftConfig
 
 from .config import RebalanceConfig
+from .config_sweep import METRIC_COLUMNS, simulate_configs
 from .portfolio_tracker import PortfolioTracker
+from .price_matrix import PriceMatrix
 from .rebalancer import ThresholdCascadeRebalancer
 from .trend_filtered_rebalancer import TrendFilteredRebalancer
 
@@ -124,7 +126,17 @@ class BacktestEngine:
         self.tracker: Optional[PortfolioTracker] = None
         self.rebalancer: Optional[ThresholdCascadeRebalancer] = None
         self.price_data: Dict[str, List[Kline]] = {}
-        
+        self._price_matrix: Optional[PriceMatrix] = None
+        
+    @property
+    def price_matrix(self) -> PriceMatrix:
+        """Price data aligned on a common time axis (built on first use after fetching)."""
+        if self._price_matrix is None:
+            self._price_matrix = PriceMatrix.from_klines(
+                {asset: self.price_data.get(asset, []) for asset in self.assets}
+            )
+        return self._price_matrix
+
     async def fetch_historical_data(self, start_date: datetime, 
                                    end_date: datetime, interval: KlineInterval = KlineInterval.HOUR_1):
         """
@@ -136,6 +148,7 @@ class BacktestEngine:
             interval: Kline interval (default 1 hour)
         """
         print(f"Fetching historical data from {start_date} to {end_date}...")
+        self._price_matrix = None
         
         for asset in self.assets:
             symbol = Symbol(base=AssetName(asset), quote=AssetName('USDT'))
@@ -159,41 +172,23 @@ class BacktestEngine:
             # Small delay to respect rate limits
             await asyncio.sleep(0.5)
     
-    def align_price_data(self) -> List[datetime]:
+    def align_price_data(self, forward_fill: bool = False) -> List[datetime]:
         """
         Align price data across all assets and return common timestamps.
         
+        Args:
+            forward_fill: Also include timestamps where an asset has no candle
+                but a previous close to carry forward
+        
         Returns:
             List of timestamps where all assets have data
         """
         if not self.price_data:
             return []
         
-        # Get all unique timestamps
-        all_timestamps = set()
-        for klines in self.price_data.values():
-            for kline in klines:
-                all_timestamps.add(datetime.fromtimestamp(kline.open_time / 1000))
-        
-        # Sort timestamps
-        sorted_timestamps = sorted(all_timestamps)
-        
-        # Filter to only timestamps where all assets have data
-        common_timestamps = []
-        for timestamp in sorted_timestamps:
-            ts_ms = int(timestamp.timestamp() * 1000)
-            has_all_data = True
-            
-            for asset, klines in self.price_data.items():
-                # Check if this timestamp exists for this asset
-                if not any(k.open_time == ts_ms for k in klines):
-                    has_all_data = False
-                    break
-            
-            if has_all_data:
-                common_timestamps.append(timestamp)
-        
-        return common_timestamps
+        matrix = self.price_matrix
+        rows = matrix.filled_rows() if forward_fill else matrix.complete_rows()
+        return matrix.datetimes(rows)
     
     def get_prices_at_timestamp(self, timestamp: datetime) -> Dict[str, float]:
         """
@@ -203,19 +198,13 @@ class BacktestEngine:
             timestamp: Target timestamp
             
         Returns:
-            Dictionary of asset prices
+            Dictionary of asset prices (last close for assets without a
+            candle at this timestamp, omitted before an asset's first candle)
         """
-        prices = {}
-        ts_ms = int(timestamp.timestamp() * 1000)
-        
-        for asset, klines in self.price_data.items():
-            for kline in klines:
-                if kline.open_time == ts_ms:
-                    # Use close price of the candle
-                    prices[asset] = kline.close_price
-                    break
-        
-        return prices
+        row = self.price_matrix.row(int(timestamp.timestamp() * 1000))
+        if row is None:
+            return {}
+        return self.price_matrix.prices_at(row)
     
     async def run_backtest(self, start_date: datetime, 
                           end_date: datetime) -> BacktestResults:
@@ -232,12 +221,23 @@ class BacktestEngine:
         # Fetch historical data
         await self.fetch_historical_data(start_date, end_date)
         
+        return self.simulate()
+    
+    def simulate(self) -> BacktestResults:
+        """
+        Run the rebalancing simulation over the loaded price data.
+        
+        Returns:
+            Backtest results
+        """
         # Align timestamps
-        timestamps = self.align_price_data()
+        matrix = self.price_matrix
+        rows = matrix.complete_rows()
         
-        if not timestamps:
+        if len(rows) == 0:
             raise ValueError("No common timestamps found for all assets")
         
+        timestamps = matrix.datetimes(rows)
         print(f"\nRunning backtest with {len(timestamps)} time points...")
         
         # Initialize portfolio tracker and rebalancer
@@ -251,17 +251,17 @@ class BacktestEngine:
             print("Using Standard Threshold Rebalancer")
         
         # Get initial prices and initialize portfolio
-        initial_prices = self.get_prices_at_timestamp(timestamps[0])
+        initial_prices = matrix.prices_at(rows[0])
         self.tracker.initialize_equal_weights(initial_prices, timestamps[0])
         
         # Track performance
         rebalance_count = 0
         winning_rebalances = 0
         
-        # Run simulation
-        for i, timestamp in enumerate(timestamps):
+        # Run simulation on matrix rows
+        for i, (row, timestamp) in enumerate(zip(rows.tolist(), timestamps)):
             # Get current prices
-            prices = self.get_prices_at_timestamp(timestamp)
+            prices = matrix.prices_at(row)
             
             # Update portfolio state
             state = self.tracker.update_prices(prices, timestamp)
@@ -286,21 +286,11 @@ class BacktestEngine:
         rebalance_stats = self.rebalancer.get_statistics()
         
         # Calculate asset performance
-        final_state = self.tracker.portfolio_history[-1]
-        asset_returns = {}
-        
-        for asset in self.assets:
-            initial_price = self.get_prices_at_timestamp(timestamps[0])[asset]
-            final_price = self.get_prices_at_timestamp(timestamps[-1])[asset]
-            asset_returns[asset] = (final_price - initial_price) / initial_price
-        
-        best_performer = max(asset_returns.items(), key=lambda x: x[1])
-        worst_performer = min(asset_returns.items(), key=lambda x: x[1])
+        best_performer, worst_performer = self._asset_performance(rows)
         
         # Calculate annualized return
         days = (timestamps[-1] - timestamps[0]).days
-        years = days / 365.25
-        annualized_return = (1 + metrics['total_return']) ** (1/years) - 1 if years > 0 else 0
+        annualized_return = self._annualize(metrics['total_return'], days)
         
         # Get trend filtering stats if using trend filter
         trend_stats = None
@@ -331,6 +321,73 @@ class BacktestEngine:
             strategy_type=strategy_type
         )
     
+    def run_config_sweep(self, configs: List[RebalanceConfig]) -> List[BacktestResults]:
+        """
+        Evaluate many rebalancing configurations over the loaded price data in one pass.
+        
+        Uses the vectorized kernel (standard threshold rebalancer only; the
+        trend filter is not applied). Call fetch_historical_data() first.
+        
+        Args:
+            configs: Configurations to evaluate, e.g. from config_sweep.config_grid()
+            
+        Returns:
+            Backtest results in the order of configs
+        """
+        matrix = self.price_matrix
+        rows = matrix.complete_rows()
+        
+        if len(rows) == 0:
+            raise ValueError("No common timestamps found for all assets")
+        
+        metrics = simulate_configs(matrix.prices[rows], matrix.timestamps[rows], configs, self.initial_capital)
+        column = {name: i for i, name in enumerate(METRIC_COLUMNS)}
+        
+        start_date, end_date = matrix.datetimes(rows[[0, -1]])
+        days = (end_date - start_date).days
+        best_performer, worst_performer = self._asset_performance(rows)
+        
+        results = []
+        for values in metrics:
+            rebalances = int(values[column['total_rebalances']])
+            results.append(BacktestResults(
+                total_return=float(values[column['total_return']]),
+                annualized_return=self._annualize(float(values[column['total_return']]), days),
+                sharpe_ratio=float(values[column['sharpe_ratio']]),
+                max_drawdown=float(values[column['max_drawdown']]),
+                win_rate=values[column['winning_rebalances']] / rebalances if rebalances > 0 else 0,
+                total_trades=int(values[column['total_actions']]),
+                total_rebalances=rebalances,
+                total_fees=float(values[column['total_fees']]),
+                avg_rebalance_size=values[column['total_volume']] / rebalances if rebalances > 0 else 0,
+                final_value=float(values[column['final_value']]),
+                initial_value=self.initial_capital,
+                best_performer=best_performer,
+                worst_performer=worst_performer,
+                start_date=start_date,
+                end_date=end_date,
+                days_tested=days,
+            ))
+        return results
+    
+    def _asset_performance(self, rows: np.ndarray) -> Tuple[Tuple[str, float], Tuple[str, float]]:
+        """Best and worst asset return between the first and last simulated rows."""
+        initial_prices = self.price_matrix.prices[rows[0]]
+        final_prices = self.price_matrix.prices[rows[-1]]
+        asset_returns = {
+            asset: (final - initial) / initial
+            for asset, initial, final in zip(self.price_matrix.assets, initial_prices.tolist(), final_prices.tolist())
+        }
+        
+        best_performer = max(asset_returns.items(), key=lambda x: x[1])
+        worst_performer = min(asset_returns.items(), key=lambda x: x[1])
+        return best_performer, worst_performer
+    
+    @staticmethod
+    def _annualize(total_return: float, days: int) -> float:
+        years = days / 365.25
+        return (1 + total_return) ** (1/years) - 1 if years > 0 else 0
+    
     def plot_results(self) -> None:
         """
         Plot backtest results (requires matplotlib).
@@ -0,0 +1,299 @@
+"""
+Vectorized evaluation of many rebalancing configurations.
+
+Runs the ThresholdCascadeRebalancer / PortfolioTracker rules directly on a
+price matrix for a whole batch of RebalanceConfig variants. The kernel
+mirrors the object implementation operation by operation (same trigger
+order, cooldowns, order sizing, fee handling, failed trades and history
+entries), so metrics match BacktestEngine.simulate() for the standard
+rebalancer. Trend filtering is not covered.
+
+The per-config loop is compiled with numba when it is installed (a year of
+1m candles for 20 assets takes tens of milliseconds per configuration);
+without numba the same code runs as plain Python.
+"""
+
+import dataclasses
+import itertools
+from typing import List, Sequence
+
+import numpy as np
+
+from .config import RebalanceConfig
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# RebalanceConfig fields used by the kernel, in parameter column order
+SWEEP_PARAMETERS = ('upside_threshold', 'downside_threshold', 'sell_percentage', 'usdt_reserve',
+                    'min_order_value', 'cooldown_minutes', 'trading_fee')
+
+# Metric columns returned by simulate_configs
+METRIC_COLUMNS = ('final_value', 'total_return', 'max_drawdown', 'volatility', 'sharpe_ratio',
+                  'usdt_balance', 'total_rebalances', 'winning_rebalances', 'total_actions',
+                  'total_volume', 'total_fees')
+
+
+def config_grid(base: RebalanceConfig, **values: Sequence) -> List[RebalanceConfig]:
+    """
+    Cartesian product of config field values.
+
+    Args:
+        base: Config providing all other fields
+        **values: Field name -> candidate values, e.g. upside_threshold=[0.3, 0.4]
+
+    Returns:
+        One RebalanceConfig per combination
+    """
+    names = list(values.keys())
+    return [dataclasses.replace(base, **dict(zip(names, combo)))
+            for combo in itertools.product(*(values[name] for name in names))]
+
+
+def simulate_configs(prices: np.ndarray, timestamps_ms: np.ndarray,
+                     configs: Sequence[RebalanceConfig], initial_capital: float) -> np.ndarray:
+    """
+    Simulate equal-weight threshold rebalancing for every config.
+
+    Args:
+        prices: (T, A) prices of the simulated rows (no missing values)
+        timestamps_ms: (T,) row times in epoch ms, used for cooldowns
+        configs: Configurations to evaluate
+        initial_capital: Starting USDT
+
+    Returns:
+        (len(configs), len(METRIC_COLUMNS)) metrics
+    """
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    timestamps_ms = np.ascontiguousarray(timestamps_ms, dtype=np.int64)
+    if prices.ndim != 2 or len(prices) != len(timestamps_ms):
+        raise ValueError("prices must be (T, A) with one timestamp per row")
+    if len(prices) == 0 or prices.shape[1] == 0:
+        raise ValueError("No price rows to simulate")
+    if np.isnan(prices).any():
+        raise ValueError("prices contain missing values")
+
+    params = np.array([[float(getattr(config, name)) for name in SWEEP_PARAMETERS] for config in configs],
+                      dtype=np.float64).reshape(len(configs), len(SWEEP_PARAMETERS))
+    return _simulate_kernel(prices, timestamps_ms, params, float(initial_capital))
+
+
+def _simulate_kernel(prices, times, params, capital):
+    n_rows, n_assets = prices.shape
+    n_configs = params.shape[0]
+    out = np.zeros((n_configs, 11))
+    history = np.empty(2 * n_rows)
+    values = np.empty(n_assets)
+    act_asset = np.empty(n_assets + 1, dtype=np.int64)
+    act_side = np.empty(n_assets + 1, dtype=np.int64)      # 1 buy, -1 sell
+    act_qty = np.empty(n_assets + 1)
+    act_price = np.empty(n_assets + 1)
+    act_value = np.empty(n_assets + 1)
+
+    for c in range(n_configs):
+        upside = params[c, 0]
+        downside = params[c, 1]
+        sell_pct = params[c, 2]
+        reserve_pct = params[c, 3]
+        min_order = params[c, 4]
+        cooldown_ms = params[c, 5] * 60.0 * 1000.0
+        fee = params[c, 6]
+
+        positions = np.zeros(n_assets)
+        last = np.full(n_assets, -1, dtype=np.int64)
+        usdt = capital
+
+        # PortfolioTracker.initialize_equal_weights
+        available = capital - capital * reserve_pct
+        per_asset = available / n_assets
+        for a in range(n_assets):
+            price = prices[0, a]
+            if price > 0:
+                cost = per_asset * (1 + fee)
+                if usdt >= cost:
+                    positions[a] = per_asset / price
+                    usdt -= cost
+                    last[a] = times[0]
+
+        count = 0
+        peak = capital
+        trough = capital
+        rebalances = 0
+        winning = 0
+        total_actions = 0
+        total_volume = 0.0
+        total_fees = 0.0
+
+        for r in range(n_rows):
+            t = times[r]
+            # PortfolioTracker.update_prices
+            total_assets = 0.0
+            for a in range(n_assets):
+                values[a] = positions[a] * prices[r, a]
+                total_assets += values[a]
+            total = total_assets + usdt
+            mean = total_assets / n_assets
+            history[count] = total
+            count += 1
+            peak = max(peak, total)
+            if total < trough:
+                trough = total
+
+            # ThresholdCascadeRebalancer.check_rebalance_needed
+            trigger = -1
+            direction = 0
+            for a in range(n_assets):
+                if last[a] >= 0 and (t - last[a]) < cooldown_ms:
+                    continue
+                deviation = (values[a] - mean) / mean if mean > 0 else 0.0
+                if deviation > upside:
+                    trigger = a
+                    direction = 1
+                    break
+                elif deviation < -downside:
+                    trigger = a
+                    direction = -1
+                    break
+            if trigger < 0:
+                continue
+
+            # calculate_rebalance_actions
+            n_act = 0
+            price = prices[r, trigger]
+            if direction == 1:
+                sell_qty = positions[trigger] * sell_pct
+                sell_value = sell_qty * price
+                if sell_value >= min_order:
+                    act_asset[n_act] = trigger
+                    act_side[n_act] = -1
+                    act_qty[n_act] = sell_qty
+                    act_price[n_act] = price
+                    act_value[n_act] = sell_value
+                    n_act += 1
+                    proceeds = sell_value - sell_value * fee
+                    to_redistribute = proceeds - proceeds * reserve_pct
+                    if n_assets > 1 and to_redistribute > 0:
+                        per_value = to_redistribute / (n_assets - 1)
+                        for b in range(n_assets):
+                            if b == trigger or prices[r, b] <= 0 or per_value < min_order:
+                                continue
+                            act_asset[n_act] = b
+                            act_side[n_act] = 1
+                            act_qty[n_act] = per_value / prices[r, b]
+                            act_price[n_act] = prices[r, b]
+                            act_value[n_act] = per_value
+                            n_act += 1
+            else:
+                deficit = mean - values[trigger]
+                if deficit >= min_order:
+                    if usdt >= deficit:
+                        act_asset[n_act] = trigger
+                        act_side[n_act] = 1
+                        act_qty[n_act] = deficit / price
+                        act_price[n_act] = price
+                        act_value[n_act] = deficit
+                        n_act += 1
+                    else:
+                        total_excess = 0.0
+                        outperformers = 0
+                        for b in range(n_assets):
+                            if b != trigger and values[b] > mean:
+                                total_excess += values[b] - mean
+                                outperformers += 1
+                        if outperformers > 0 and total_excess > 0:
+                            for b in range(n_assets):
+                                if b == trigger or not values[b] > mean:
+                                    continue
+                                sell_value = min(deficit * min((values[b] - mean) / total_excess, 1.0),
+                                                 values[b] * 0.25)
+                                if sell_value < min_order:
+                                    continue
+                                act_asset[n_act] = b
+                                act_side[n_act] = -1
+                                act_qty[n_act] = sell_value / prices[r, b]
+                                act_price[n_act] = prices[r, b]
+                                act_value[n_act] = sell_value
+                                n_act += 1
+                            sold = 0.0
+                            for i in range(n_act):
+                                sold += act_value[i]
+                            total_proceeds = sold * (1 - fee)
+                            if total_proceeds > min_order:
+                                act_asset[n_act] = trigger
+                                act_side[n_act] = 1
+                                act_qty[n_act] = total_proceeds / price
+                                act_price[n_act] = price
+                                act_value[n_act] = total_proceeds
+                                n_act += 1
+            if n_act == 0:
+                continue
+
+            # execute_rebalance: trades that fail on balance are skipped
+            event_fees = 0.0
+            event_volume = 0.0
+            for i in range(n_act):
+                a = act_asset[i]
+                qty = act_qty[i]
+                trade_value = qty * act_price[i]
+                trade_fee = trade_value * fee
+                event_volume += act_value[i]
+                if act_side[i] == 1:
+                    cost = trade_value + trade_fee
+                    if usdt >= cost:
+                        positions[a] += qty
+                        usdt -= cost
+                        last[a] = t
+                        event_fees += act_value[i] * fee
+                else:
+                    if positions[a] >= qty:
+                        positions[a] -= qty
+                        usdt += trade_value - trade_fee
+                        last[a] = t
+                        event_fees += act_value[i] * fee
+
+            total_after = 0.0
+            for a in range(n_assets):
+                total_after += positions[a] * prices[r, a]
+            total_after += usdt
+            history[count] = total_after
+            count += 1
+            peak = max(peak, total_after)
+            if total_after < trough:
+                trough = total_after
+
+            rebalances += 1
+            if total_after > total:
+                winning += 1
+            total_actions += n_act
+            total_volume += event_volume
+            total_fees += event_fees
+
+        # PortfolioTracker.get_portfolio_metrics
+        final_value = history[count - 1]
+        volatility = 0.0
+        sharpe = 0.0
+        if count > 2:
+            returns = np.diff(history[:count]) / history[:count - 1]
+            volatility = np.std(returns)
+            if volatility > 0:
+                sharpe = np.mean(returns) / volatility
+
+        out[c, 0] = final_value
+        out[c, 1] = (final_value - capital) / capital
+        out[c, 2] = (trough - peak) / peak if peak > 0 else 0.0
+        out[c, 3] = volatility
+        out[c, 4] = sharpe
+        out[c, 5] = usdt
+        out[c, 6] = rebalances
+        out[c, 7] = winning
+        out[c, 8] = total_actions
+        out[c, 9] = total_volume
+        out[c, 10] = total_fees
+    return out
+
+
+if NUMBA_AVAILABLE:
+    _simulate_kernel = njit(cache=False)(_simulate_kernel)
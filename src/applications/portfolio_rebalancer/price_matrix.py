@@ -0,0 +1,89 @@
+"""
+Timestamp-aligned price matrix for portfolio backtesting.
+
+All assets share one sorted time axis (union of kline open times). Close
+prices are forward-filled, and a mask records which cells come from a real
+candle, so both "all assets traded" rows and "all assets known" rows are
+available without rescanning kline lists.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from exchanges.structs import Kline
+
+
+@dataclass
+class PriceMatrix:
+    """Close prices of several assets on a common time axis."""
+    assets: List[str]
+    timestamps: np.ndarray      # (T,) int64 kline open times in ms, sorted
+    prices: np.ndarray          # (T, A) close prices, forward-filled, NaN before the first candle
+    observed: np.ndarray        # (T, A) True where the asset has its own candle
+    _rows: Dict[int, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._rows = {ts: i for i, ts in enumerate(self.timestamps.tolist())}
+
+    @classmethod
+    def from_klines(cls, price_data: Dict[str, List[Kline]]) -> 'PriceMatrix':
+        """
+        Align kline lists of several assets.
+
+        Args:
+            price_data: Klines per asset; duplicate open times keep the first candle
+
+        Returns:
+            PriceMatrix with one column per asset in dict order
+        """
+        assets = list(price_data.keys())
+        open_times, closes = [], []
+        for asset in assets:
+            times = np.array([k.open_time for k in price_data[asset]], dtype=np.int64)
+            values = np.array([k.close_price for k in price_data[asset]], dtype=np.float64)
+            times, first = np.unique(times, return_index=True)
+            open_times.append(times)
+            closes.append(values[first])
+
+        timestamps = np.unique(np.concatenate(open_times)) if open_times else np.empty(0, dtype=np.int64)
+        n_rows = len(timestamps)
+        prices = np.full((n_rows, len(assets)), np.nan)
+        observed = np.zeros((n_rows, len(assets)), dtype=bool)
+        positions = np.arange(n_rows)
+
+        for col, (times, values) in enumerate(zip(open_times, closes)):
+            rows = np.searchsorted(timestamps, times)
+            observed[rows, col] = True
+            prices[rows, col] = values
+            # Forward fill: index of the last observed row at or before each row
+            last = np.maximum.accumulate(np.where(observed[:, col], positions, -1))
+            started = last >= 0
+            prices[started, col] = prices[last[started], col]
+
+        return cls(assets=assets, timestamps=timestamps, prices=prices, observed=observed)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def row(self, timestamp_ms: int) -> Optional[int]:
+        """Row of an exact open time, None if no asset has a candle there."""
+        return self._rows.get(timestamp_ms)
+
+    def complete_rows(self) -> np.ndarray:
+        """Rows where every asset has its own candle."""
+        return np.flatnonzero(self.observed.all(axis=1))
+
+    def filled_rows(self) -> np.ndarray:
+        """Rows where every asset has a (possibly forward-filled) price."""
+        return np.flatnonzero(~np.isnan(self.prices).any(axis=1))
+
+    def prices_at(self, row: int) -> Dict[str, float]:
+        """Prices of one row; assets without any candle yet are omitted."""
+        return {asset: price for asset, price in zip(self.assets, self.prices[row].tolist()) if price == price}
+
+    def datetimes(self, rows: np.ndarray) -> List[datetime]:
+        """Local datetimes of the given rows (as used by the rebalancer)."""
+        return [datetime.fromtimestamp(ts / 1000) for ts in self.timestamps[rows].tolist()]
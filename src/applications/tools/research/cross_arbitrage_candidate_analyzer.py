@@ -14,6 +14,7 @@ from infrastructure.logging import get_logger
 from trading.data_sources.book_ticker.book_ticker_source import CandlesBookTickerSource
 from trading.research.cross_arbitrage.hedged_cross_arbitrage_backtest import HedgedCrossArbitrageBacktest, BacktestConfig
 from trading.research.cross_arbitrage.arbitrage_analyzer import AnalyzerKeys
+from trading.signals_v2.optimization.result_store import BacktestResultStore, ResultKey
 
 ANALYZER_TF = KlineInterval.MINUTE_5
 
@@ -49,7 +50,18 @@ class BacktestResult:
 class CrossArbitrageCandidateAnalyzer:
     """Enhanced arbitrage candidate analyzer with multi-stage pipeline."""
     
-    def __init__(self, exchanges: Optional[List[ExchangeEnum]] = None, output_dir: str = "results"):
+    STRATEGY_VERSION = 1  # Bump when calculate_quick_metrics changes (invalidates stored screenings)
+
+    def __init__(self, exchanges: Optional[List[ExchangeEnum]] = None, output_dir: str = "results",
+                 result_store: Optional[BacktestResultStore] = None):
+        """
+        Args:
+            exchanges: Exchanges a candidate must be listed on
+            output_dir: Directory for result files
+            result_store: Optional store of screening metrics and backtests; re-running the
+                analysis only computes symbols/data windows without a stored run
+        """
+        self.result_store = result_store
         self.exchanges = exchanges or [ExchangeEnum.MEXC, ExchangeEnum.GATEIO, ExchangeEnum.GATEIO_FUTURES]
         self.config = HftConfig()
         self.logger = get_logger("CrossArbitrageCandidateAnalyzer")
@@ -174,6 +186,10 @@ class CrossArbitrageCandidateAnalyzer:
 
             self.symbol_df_cache[symbol] = df
 
+            if self.result_store is not None:
+                key = ResultKey.build(df, self, {'symbol': symbol, 'exchanges': self.exchanges})
+                return self.result_store.compute(key, lambda: self.calculate_quick_metrics(df, symbol),
+                                                 label=str(symbol))
             return self.calculate_quick_metrics(df, symbol)
             
         except Exception as e:
@@ -238,7 +254,7 @@ class CrossArbitrageCandidateAnalyzer:
             )
             
             # Run backtest
-            backtester = HedgedCrossArbitrageBacktest(config)
+            backtester = HedgedCrossArbitrageBacktest(config, result_store=self.result_store)
             cached_data = self.symbol_df_cache.get(candidate.symbol, None)
             results = await backtester.run_backtest(df_data=cached_data)
             
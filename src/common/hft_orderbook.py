@@ -71,6 +71,11 @@ class HFTOrderBook:
         self._sequence = 0
         self._is_snapshot = False
     
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the last applied snapshot or diff (0 if none)."""
+        return self._sequence
+    
     def apply_diff(
         self, 
         bid_updates: List[Tuple[float, float]], 
@@ -85,7 +90,8 @@ class HFTOrderBook:
             bid_updates: List of (price, size) tuples for bid updates
             ask_updates: List of (price, size) tuples for ask updates
             timestamp: Update timestamp (defaults to current time)
-            sequence: Sequence number for ordering validation
+            sequence: Sequence number of the diff; stored as-is, callers check
+                continuity against the `sequence` property before applying
             
         Performance: Target <100μs for typical updates (5-20 price levels)
         """
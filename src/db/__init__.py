@@ -54,6 +54,9 @@ try:
         get_book_ticker_snapshots,
         get_latest_book_ticker_snapshots,
         get_book_ticker_history,
+        stream_book_ticker_history,
+        stream_recent_trades,
+        stream_balance_history,
         get_exchange_by_id,
         get_exchange_by_enum,
         get_all_active_exchanges,
@@ -99,6 +102,9 @@ __all__ = [
     'get_book_ticker_snapshots',
     'get_latest_book_ticker_snapshots',
     'get_book_ticker_history',
+    'stream_book_ticker_history',
+    'stream_recent_trades',
+    'stream_balance_history',
     'get_exchange_by_id',
     'get_exchange_by_enum',
     'get_all_active_exchanges',
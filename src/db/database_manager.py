@@ -17,7 +17,7 @@ import asyncio
 import logging
 import time
 from datetime import datetime, timedelta, date
-from typing import Dict, List, Optional, Any, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 import asyncpg
 
 try:
@@ -32,6 +32,11 @@ from .models import (
     Exchange, Symbol as DBSymbol, BookTickerSnapshot, TradeSnapshot, 
     FundingRateSnapshot, BalanceSnapshot, SymbolType
 )
+from .streaming import (
+    BatchSchema, StreamBatch, RecordBatch, BOOK_TICKER_BATCH_SCHEMA, BOOK_TICKER_FRAME_SCHEMA, DEFAULT_BATCH_SIZE,
+    DEPTH_BATCH_SCHEMA, BatchAccumulator, records_to_arrays, to_arrow, epoch_us_sql,
+    depth_records_to_matrices
+)
 from exchanges.structs.common import Symbol
 from exchanges.structs.enums import ExchangeEnum
 
@@ -50,6 +55,13 @@ class DatabaseManager:
     _instance: Optional["DatabaseManager"] = None
     _logger = logging.getLogger(__name__)
     
+    # Bucket width (seconds) -> continuous aggregate created by migration 003
+    BOOK_TICKER_BUCKET_VIEWS: Dict[int, str] = {
+        1: 'book_ticker_1s',
+        5: 'book_ticker_5s',
+        60: 'book_ticker_60s',
+    }
+    
     def __new__(cls) -> "DatabaseManager":
         """Singleton pattern implementation."""
         if cls._instance is None:
@@ -67,6 +79,9 @@ class DatabaseManager:
         # Simple lookup table: (exchange_enum, base, quote) -> symbol_id
         self._lookup_table: Dict[Tuple[str, str, str], int] = {}
         
+        # Continuous aggregate views available in the connected database (lazy loaded)
+        self._bucket_views: Optional[set] = None
+        
         self._initialized = True
         self._logger.info("DatabaseManager initialized with simple lookup table")
 
@@ -245,6 +260,7 @@ class DatabaseManager:
             self._pool = None
         
         self._lookup_table.clear()
+        self._bucket_views = None
     
     def get_symbol_id(self, exchange_enum: ExchangeEnum, symbol: Symbol) -> int:
         """
@@ -395,6 +411,82 @@ class DatabaseManager:
             )
             return int(result.split()[-1])  # Extract count from "COPY N"
     
+    async def cursor_batches(
+        self,
+        query: str,
+        *args,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> AsyncIterator[List[asyncpg.Record]]:
+        """
+        Stream query results from a server-side cursor in fixed-size batches.
+        
+        Only one batch of records is held in memory at a time. The cursor runs
+        inside a read-only transaction on a dedicated pool connection, which is
+        held until the iterator is exhausted or closed. Consumers that may stop
+        early must close the iterator (`async with contextlib.aclosing(...)`):
+        breaking out of `async for` alone leaves the connection checked out
+        until the generator is garbage collected.
+        
+        Args:
+            query: SQL query
+            *args: Query parameters
+            batch_size: Rows fetched per round-trip
+            
+        Yields:
+            Lists of up to batch_size records
+        """
+        if not self._pool:
+            raise RuntimeError("DatabaseManager not initialized")
+        async with self._pool.acquire() as conn:
+            transaction = conn.transaction(readonly=True)
+            await transaction.start()
+            try:
+                cursor = await conn.cursor(query, *args)
+                while True:
+                    rows = await cursor.fetch(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+                    if len(rows) < batch_size:
+                        break
+            finally:
+                # Runs on exhaustion, errors and aclose(): ending the read-only
+                # transaction drops the cursor before the connection is released
+                if not conn.is_closed():
+                    await transaction.rollback()
+    
+    async def fetch_record_batches(
+        self,
+        query: str,
+        *args,
+        schema: BatchSchema,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        as_arrow: bool = False
+    ) -> AsyncIterator[StreamBatch]:
+        """
+        Stream query results as columnar NumPy (or Arrow) record batches.
+        
+        The query must select columns in schema order following db.streaming
+        conventions (float8 numerics, int8 epoch-microsecond timestamps).
+        
+        Args:
+            query: SQL query
+            *args: Query parameters
+            schema: Ordered column name -> dtype mapping
+            batch_size: Rows per batch
+            as_arrow: Yield pyarrow.RecordBatch instead of dict of NumPy arrays
+            
+        Yields:
+            Record batches of up to batch_size rows
+        """
+        batches = self.cursor_batches(query, *args, batch_size=batch_size)
+        try:
+            async for rows in batches:
+                batch = records_to_arrays(rows, schema)
+                yield to_arrow(batch) if as_arrow else batch
+        finally:
+            await batches.aclose()
+    
     async def get_connection_stats(self) -> Dict[str, Any]:
         """
         Get connection pool statistics.
@@ -698,8 +790,10 @@ class DatabaseManager:
         Get book ticker data as pandas DataFrame for HFT strategy analysis.
         
         Uses normalized schema with proper JOINs for data consistency.
-        Maximum precision preservation: no PostgreSQL casting, Decimal->float conversion in Python.
-        Calculates mid_price and spread_bps in Python to avoid database rounding.
+        Reads through a server-side cursor into columnar batches (db.streaming),
+        so only one batch of records is held in memory at a time. Prices and
+        quantities are cast to float8 server-side (correctly rounded, same values
+        as Decimal->float in Python); mid_price and spread_pct are computed in Python.
         
         Args:
             exchange: Filter by exchange (e.g., "GATEIO_FUTURES")
@@ -707,11 +801,11 @@ class DatabaseManager:
             symbol_quote: Filter by quote asset (e.g., "USDT") 
             start_time: Start time filter (optional)
             end_time: End time filter (optional)
-            limit: Maximum records to return
+            limit: Maximum records to return (the most recent ones)
             
         Returns:
-            pandas DataFrame with columns: timestamp, exchange, symbol_base, symbol_quote,
-            bid_price, bid_qty, ask_price, ask_qty, mid_price, spread_bps
+            pandas DataFrame indexed by UTC timestamp with columns: exchange, symbol_base,
+            symbol_quote, bid_price, bid_qty, ask_price, ask_qty, mid_price, spread_pct
         """
         if not PANDAS_AVAILABLE:
             raise ImportError("pandas is required for DataFrame operations. Install with: pip install pandas")
@@ -719,105 +813,393 @@ class DatabaseManager:
         if not self._pool:
             raise RuntimeError("DatabaseManager not initialized")
         
-        # Build dynamic WHERE clause using normalized schema
+        where_clause, params = self._build_book_ticker_filters(
+            exchange, symbol_base, symbol_quote, start_time, end_time, "bts.timestamp"
+        )
+        
+        # Latest `limit` rows need a descending scan; unbounded reads stream oldest first
+        order = "ASC"
+        limit_clause = ""
+        if limit:
+            order = "DESC"
+            params.append(limit)
+            limit_clause = f"LIMIT ${len(params)}"
+        
+        query = f"""
+            SELECT 
+                {epoch_us_sql('bts.timestamp')} AS timestamp,
+                e.enum_value AS exchange,
+                s.symbol_base,
+                s.symbol_quote,
+                bts.bid_price::float8 AS bid_price,
+                bts.bid_qty::float8 AS bid_qty,
+                bts.ask_price::float8 AS ask_price,
+                bts.ask_qty::float8 AS ask_qty
+            FROM book_ticker_snapshots bts
+            INNER JOIN symbols s ON bts.symbol_id = s.id
+            INNER JOIN exchanges e ON s.exchange_id = e.id
+            {where_clause}
+            ORDER BY bts.timestamp {order}
+            {limit_clause}
+        """
+        
+        accumulator = BatchAccumulator(BOOK_TICKER_FRAME_SCHEMA)
+        async for batch in self.fetch_record_batches(query, *params, schema=BOOK_TICKER_FRAME_SCHEMA):
+            accumulator.append(batch)
+        columns = accumulator.finish()
+        
+        index = pd.DatetimeIndex(columns.pop('timestamp'), name='timestamp').tz_localize('UTC')
+        df = pd.DataFrame(columns, index=index, copy=False)
+        
+        df['mid_price'] = (df['bid_price'] + df['ask_price']) / 2.0
+        df['spread_pct'] = ((df['ask_price'] - df['bid_price']) / df['mid_price']).where(df['mid_price'] > 0, 0.0)
+        
+        # Limited reads arrive newest first; time-series operations expect ascending order
+        df.sort_index(inplace=True)
+        
+        return df
+    
+    async def get_book_ticker_bucketed_dataframe(
+        self,
+        exchange: Optional[str] = None,
+        symbol_base: Optional[str] = None,
+        symbol_quote: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        bucket_seconds: int = 1,
+        include_ohlc: bool = False
+    ) -> "pd.DataFrame":
+        """
+        Get book ticker data aggregated into time buckets on the server.
+        
+        Uses TimescaleDB time_bucket + last() so only one row per bucket crosses the wire.
+        Reads from the matching continuous aggregate (book_ticker_1s/5s/60s, migration 003)
+        when available, otherwise aggregates book_ticker_snapshots on the fly.
+        Bucket boundaries match pandas floor(), so the result is equivalent to
+        BookTickerSnapshotLoader.rescale_to_seconds() on the raw snapshots.
+        
+        Args:
+            exchange: Filter by exchange (e.g., "GATEIO_FUTURES")
+            symbol_base: Filter by base asset (e.g., "MYX")
+            symbol_quote: Filter by quote asset (e.g., "USDT")
+            start_time: Start time filter (optional)
+            end_time: End time filter (optional)
+            bucket_seconds: Bucket width in seconds
+            include_ohlc: Also return mid_open/high/low/close and spread_open/high/low/close
+            
+        Returns:
+            pandas DataFrame indexed by bucket timestamp with columns: exchange, symbol_base,
+            symbol_quote, bid_price, bid_qty, ask_price, ask_qty, mid_price, spread_pct
+            (+ OHLC columns if requested); one row per bucket and symbol
+        """
+        if not PANDAS_AVAILABLE:
+            raise ImportError("pandas is required for DataFrame operations. Install with: pip install pandas")
+        
+        if not self._pool:
+            raise RuntimeError("DatabaseManager not initialized")
+        
+        bucket_seconds = max(int(bucket_seconds), 1)
+        view_name = self.BOOK_TICKER_BUCKET_VIEWS.get(bucket_seconds)
+        if view_name and view_name not in await self._get_bucket_views():
+            view_name = None
+        
+        time_column = "v.bucket" if view_name else "bts.timestamp"
+        where_clause, params = self._build_book_ticker_filters(
+            exchange, symbol_base, symbol_quote, start_time, end_time, time_column
+        )
+        param_counter = len(params) + 1
+        
+        ohlc_columns = [
+            'mid_open', 'mid_high', 'mid_low', 'mid_close',
+            'spread_open', 'spread_high', 'spread_low', 'spread_close'
+        ]
+        
+        if view_name:
+            # Pre-aggregated rows: just cast to float8 so no Decimal objects are created
+            ohlc_select = "".join(f",\n                v.{col}::float8 AS {col}" for col in ohlc_columns) if include_ohlc else ""
+            query = f"""
+                SELECT
+                    v.bucket AS timestamp,
+                    e.enum_value AS exchange,
+                    s.symbol_base,
+                    s.symbol_quote,
+                    v.bid_price::float8 AS bid_price,
+                    v.bid_qty::float8 AS bid_qty,
+                    v.ask_price::float8 AS ask_price,
+                    v.ask_qty::float8 AS ask_qty{ohlc_select}
+                FROM {view_name} v
+                INNER JOIN symbols s ON v.symbol_id = s.id
+                INNER JOIN exchanges e ON s.exchange_id = e.id
+                {where_clause}
+                ORDER BY v.bucket, e.enum_value, s.symbol_base, s.symbol_quote
+            """
+        else:
+            mid = "(bts.bid_price + bts.ask_price) / 2"
+            spread = f"(bts.ask_price - bts.bid_price) / ({mid})"
+            ohlc_select = f""",
+                    first({mid}, bts.timestamp)::float8 AS mid_open,
+                    max({mid})::float8 AS mid_high,
+                    min({mid})::float8 AS mid_low,
+                    last({mid}, bts.timestamp)::float8 AS mid_close,
+                    first({spread}, bts.timestamp)::float8 AS spread_open,
+                    max({spread})::float8 AS spread_high,
+                    min({spread})::float8 AS spread_low,
+                    last({spread}, bts.timestamp)::float8 AS spread_close""" if include_ohlc else ""
+            query = f"""
+                SELECT
+                    time_bucket(${param_counter}::interval, bts.timestamp) AS timestamp,
+                    e.enum_value AS exchange,
+                    s.symbol_base,
+                    s.symbol_quote,
+                    last(bts.bid_price, bts.timestamp)::float8 AS bid_price,
+                    last(bts.bid_qty, bts.timestamp)::float8 AS bid_qty,
+                    last(bts.ask_price, bts.timestamp)::float8 AS ask_price,
+                    last(bts.ask_qty, bts.timestamp)::float8 AS ask_qty{ohlc_select}
+                FROM book_ticker_snapshots bts
+                INNER JOIN symbols s ON bts.symbol_id = s.id
+                INNER JOIN exchanges e ON s.exchange_id = e.id
+                {where_clause}
+                GROUP BY 1, bts.symbol_id, e.enum_value, s.symbol_base, s.symbol_quote
+                ORDER BY 1, e.enum_value, s.symbol_base, s.symbol_quote
+            """
+            params.append(timedelta(seconds=bucket_seconds))
+        
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(query, *params)
+        
+        columns = ['timestamp', 'exchange', 'symbol_base', 'symbol_quote',
+                   'bid_price', 'bid_qty', 'ask_price', 'ask_qty']
+        if include_ohlc:
+            columns += ohlc_columns
+        
+        df = pd.DataFrame.from_records(rows, columns=columns) if rows else pd.DataFrame(columns=columns)
+        df.set_index('timestamp', inplace=True)
+        
+        df['mid_price'] = (df['bid_price'] + df['ask_price']) / 2.0
+        df['spread_pct'] = ((df['ask_price'] - df['bid_price']) / df['mid_price']).where(df['mid_price'] > 0, 0.0)
+        
+        return df
+    
+    async def stream_book_ticker_batches(
+        self,
+        exchange: Optional[str] = None,
+        symbol_base: Optional[str] = None,
+        symbol_quote: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        as_arrow: bool = False
+    ) -> AsyncIterator[StreamBatch]:
+        """
+        Stream raw book ticker snapshots as columnar batches, oldest first.
+        
+        Streaming counterpart of get_book_ticker_dataframe() for windows too large
+        to materialize as asyncpg.Record lists. Prices and quantities are cast to
+        float8 server-side; timestamps arrive as datetime64[us] (UTC).
+        
+        Args:
+            exchange: Filter by exchange (e.g., "GATEIO_FUTURES")
+            symbol_base: Filter by base asset (e.g., "MYX")
+            symbol_quote: Filter by quote asset (e.g., "USDT")
+            start_time: Start time filter (optional)
+            end_time: End time filter (optional)
+            batch_size: Rows per batch
+            as_arrow: Yield pyarrow.RecordBatch instead of dict of NumPy arrays
+            
+        Yields:
+            Batches with columns: timestamp, bid_price, bid_qty, ask_price, ask_qty
+        """
+        where_clause, params = self._build_book_ticker_filters(
+            exchange, symbol_base, symbol_quote, start_time, end_time, "bts.timestamp"
+        )
+        
+        query = f"""
+            SELECT
+                {epoch_us_sql('bts.timestamp')} AS timestamp,
+                bts.bid_price::float8 AS bid_price,
+                bts.bid_qty::float8 AS bid_qty,
+                bts.ask_price::float8 AS ask_price,
+                bts.ask_qty::float8 AS ask_qty
+            FROM book_ticker_snapshots bts
+            INNER JOIN symbols s ON bts.symbol_id = s.id
+            INNER JOIN exchanges e ON s.exchange_id = e.id
+            {where_clause}
+            ORDER BY bts.timestamp
+        """
+        
+        batches = self.fetch_record_batches(
+            query, *params, schema=BOOK_TICKER_BATCH_SCHEMA, batch_size=batch_size, as_arrow=as_arrow
+        )
+        try:
+            async for batch in batches:
+                yield batch
+        finally:
+            await batches.aclose()
+    
+    async def get_book_ticker_dataframe_streamed(
+        self,
+        exchange: Optional[str] = None,
+        symbol_base: Optional[str] = None,
+        symbol_quote: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> "pd.DataFrame":
+        """
+        Build the get_book_ticker_dataframe() frame from streamed NumPy batches.
+        
+        Batches are copied into in-place growing columns as they arrive (see
+        BatchAccumulator), so peak memory is the float64 columns plus growth slack
+        and one record batch, instead of every asyncpg.Record plus a per-row dict.
+        
+        Returns:
+            pandas DataFrame indexed by UTC timestamp with columns: bid_price, bid_qty,
+            ask_price, ask_qty, mid_price, spread_pct
+        """
+        if not PANDAS_AVAILABLE:
+            raise ImportError("pandas is required for DataFrame operations. Install with: pip install pandas")
+        
+        accumulator = BatchAccumulator(BOOK_TICKER_BATCH_SCHEMA)
+        async for batch in self.stream_book_ticker_batches(
+            exchange, symbol_base, symbol_quote, start_time, end_time, batch_size=batch_size
+        ):
+            accumulator.append(batch)
+        columns = accumulator.finish()
+        
+        index = pd.DatetimeIndex(columns.pop('timestamp'), name='timestamp').tz_localize('UTC')
+        df = pd.DataFrame(columns, index=index, copy=False)
+        
+        df['mid_price'] = (df['bid_price'] + df['ask_price']) / 2.0
+        df['spread_pct'] = ((df['ask_price'] - df['bid_price']) / df['mid_price']).where(df['mid_price'] > 0, 0.0)
+        
+        return df
+    
+    @staticmethod
+    def _build_book_ticker_filters(
+        exchange: Optional[str],
+        symbol_base: Optional[str],
+        symbol_quote: Optional[str],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+        time_column: str
+    ) -> Tuple[str, List[Any]]:
+        """
+        Build WHERE clause and parameters for book ticker queries (normalized schema).
+        
+        Expects the query to join symbols as "s" and exchanges as "e".
+        
+        Returns:
+            Tuple of (where_clause, params); parameters are numbered from $1
+        """
         where_conditions = []
-        params = []
-        param_counter = 1
+        params: List[Any] = []
         
         if exchange:
-            where_conditions.append(f"e.enum_value = ${param_counter}")
             params.append(exchange.upper())
-            param_counter += 1
+            where_conditions.append(f"e.enum_value = ${len(params)}")
         
         if symbol_base:
-            where_conditions.append(f"s.symbol_base = ${param_counter}")
             params.append(symbol_base.upper())
-            param_counter += 1
+            where_conditions.append(f"s.symbol_base = ${len(params)}")
         
         if symbol_quote:
-            where_conditions.append(f"s.symbol_quote = ${param_counter}")
             params.append(symbol_quote.upper())
-            param_counter += 1
-            
+            where_conditions.append(f"s.symbol_quote = ${len(params)}")
+        
         if start_time:
-            where_conditions.append(f"bts.timestamp >= ${param_counter}")
             params.append(start_time)
-            param_counter += 1
-            
+            where_conditions.append(f"{time_column} >= ${len(params)}")
+        
         if end_time:
-            where_conditions.append(f"bts.timestamp <= ${param_counter}")
             params.append(end_time)
-            param_counter += 1
+            where_conditions.append(f"{time_column} <= ${len(params)}")
         
         where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
-
-        limit_clause = ""
-        if limit:
-            limit_clause = f"LIMIT ${param_counter}"
-            params.append(limit)
-
-        # Use normalized schema with proper JOINs for data consistency
+        return where_clause, params
+    
+    async def _get_bucket_views(self) -> set:
+        """
+        Get names of book ticker continuous aggregates present in the database.
+        
+        Cached after the first lookup; refresh_lookup_table() resets the cache.
+        """
+        if self._bucket_views is not None:
+            return self._bucket_views
+        
+        try:
+            async with self._pool.acquire() as conn:
+                rows = await conn.fetch(
+                    """
+                    SELECT table_name
+                    FROM information_schema.tables
+                    WHERE table_schema = 'public'
+                    AND table_name = ANY($1::text[])
+                    """,
+                    list(self.BOOK_TICKER_BUCKET_VIEWS.values())
+                )
+            self._bucket_views = {row['table_name'] for row in rows}
+        except Exception as e:
+            self._logger.warning(f"Failed to check book ticker aggregate views: {e}")
+            self._bucket_views = set()
+        
+        return self._bucket_views
+    
+    # =============================================================================
+    # ORDERBOOK DEPTH OPERATIONS
+    # =============================================================================
+    
+    async def get_orderbook_depth_arrays(
+        self,
+        exchange: str,
+        symbol_base: str,
+        symbol_quote: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        levels: int = 10,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> RecordBatch:
+        """
+        Load array-encoded depth samples as level matrices for slippage modelling.
+        
+        Reads orderbook_depth_snapshots (migration 004) through a server-side
+        cursor, so only one batch of records is held in memory at a time.
+        
+        Args:
+            exchange: Exchange enum value (e.g., "GATEIO_FUTURES")
+            symbol_base: Base asset (e.g., "MYX")
+            symbol_quote: Quote asset (e.g., "USDT")
+            start_time: Start time filter (optional)
+            end_time: End time filter (optional)
+            levels: Level columns per side (NaN padded)
+            batch_size: Rows per cursor batch
+            
+        Returns:
+            Dictionary with 'timestamp' (datetime64[us], UTC) and (n, levels) float64
+            matrices 'bid_prices', 'bid_sizes', 'ask_prices', 'ask_sizes'; column 0 is the best level
+        """
+        where_clause, params = self._build_book_ticker_filters(
+            exchange, symbol_base, symbol_quote, start_time, end_time, "ods.timestamp"
+        )
+        
         query = f"""
-            SELECT 
-                bts.timestamp,
-                e.enum_value as exchange,
-                s.symbol_base,
-                s.symbol_quote,
-                bts.bid_price,
-                bts.bid_qty,
-                bts.ask_price,
-                bts.ask_qty
-            FROM book_ticker_snapshots bts
-            INNER JOIN symbols s ON bts.symbol_id = s.id
+            SELECT
+                {epoch_us_sql('ods.timestamp')} AS timestamp,
+                ods.bid_prices, ods.bid_sizes, ods.ask_prices, ods.ask_sizes
+            FROM orderbook_depth_snapshots ods
+            INNER JOIN symbols s ON ods.symbol_id = s.id
             INNER JOIN exchanges e ON s.exchange_id = e.id
             {where_clause}
-            ORDER BY bts.timestamp DESC
-            {limit_clause}
+            ORDER BY ods.timestamp
         """
         
-        async with self._pool.acquire() as conn:
-            rows = await conn.fetch(query, *params)
+        accumulator = BatchAccumulator(DEPTH_BATCH_SCHEMA)
+        async for rows in self.cursor_batches(query, *params, batch_size=batch_size):
+            accumulator.append(depth_records_to_matrices(rows, levels))
         
-        # Convert Decimal objects to float with maximum precision preservation
-        if not rows:
-            return pd.DataFrame(columns=[
-                'timestamp', 'exchange', 'symbol_base', 'symbol_quote',
-                'bid_price', 'bid_qty', 'ask_price', 'ask_qty', 'mid_price', 'spread_bps'
-            ])
+        if not len(accumulator):
+            return depth_records_to_matrices([], levels)
         
-        # Convert Decimal to float and calculate mid_price/spread_bps in Python for precision
-        data = []
-        # TODO: maybe this is not necessary, check and remove
-        for row in rows:
-            bid_price = float(row['bid_price'])    # Convert Decimal to float
-            bid_qty = float(row['bid_qty'])        # Convert Decimal to float  
-            ask_price = float(row['ask_price'])    # Convert Decimal to float
-            ask_qty = float(row['ask_qty'])        # Convert Decimal to float
-            
-            # Calculate mid_price and spread_bps in Python for maximum precision
-            mid_price = (bid_price + ask_price) / 2.0
-            spread_pct = ((ask_price - bid_price) / mid_price)  if mid_price > 0 else 0.0
-
-            data.append({
-                'timestamp': row['timestamp'],
-                'exchange': row['exchange'],
-                'symbol_base': row['symbol_base'],
-                'symbol_quote': row['symbol_quote'],
-                'bid_price': bid_price,
-                'bid_qty': bid_qty,
-                'ask_price': ask_price,
-                'ask_qty': ask_qty,
-                'mid_price': mid_price,
-                'spread_pct': spread_pct
-            })
-        
-        df = pd.DataFrame(data)
-        
-        # Set timestamp as index for time-series operations
-        df.set_index('timestamp', inplace=True)
-        df.sort_index(inplace=True)
-        
-        return df
+        return accumulator.finish()
     
     # =============================================================================
     # BALANCE OPERATIONS (Float-Only, HFT-Optimized)
@@ -1287,6 +1669,10 @@ class DatabaseManager:
             'idle_size': self._pool.get_idle_size()
         }
         
+        # Insert-path deduplication caches (book ticker and trade streams)
+        from .operations import get_dedup_cache_stats
+        stats['dedup_cache'] = get_dedup_cache_stats()
+        
         return stats
     
     async def cleanup_old_data(self, days_to_keep: int = 7) -> Dict[str, int]:
@@ -1363,6 +1749,7 @@ class DatabaseManager:
     
     async def refresh_lookup_table(self) -> None:
         """Manual refresh of lookup table from database."""
+        self._bucket_views = None
         await self._load_lookup_table()
         self._logger.info(f"Lookup table refreshed with {len(self._lookup_table)} entries")
     
@@ -0,0 +1,147 @@
+"""
+Bounded Deduplication Cache
+
+Time-indexed, per-symbol deduplication cache for collector inserts.
+
+Each symbol keeps a time-ordered ring (deque of (timestamp, key)) plus a set for
+O(1) membership checks. Entries are evicted incrementally on insert - expired
+entries from the ring head, and the oldest entries once the per-symbol cap is
+reached - so there is no periodic full rebuild and memory stays bounded between
+inserts regardless of trade rate.
+"""
+
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, Hashable, Optional, Set, Tuple
+
+import msgspec
+
+
+class DedupCacheStats(msgspec.Struct):
+    """Deduplication cache counters for monitoring."""
+    lookups: int = 0
+    hits: int = 0
+    expired_evictions: int = 0
+    capacity_evictions: int = 0
+    entries: int = 0
+    symbols: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that were duplicates."""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+class _SymbolWindow:
+    """Time-ordered ring plus membership set for one symbol."""
+    __slots__ = ('ring', 'keys', 'newest')
+
+    def __init__(self):
+        self.ring: Deque[Tuple[datetime, Hashable]] = deque()
+        self.keys: Set[Hashable] = set()
+        self.newest: Optional[datetime] = None
+
+
+class TimeWindowDedupCache:
+    """
+    Per-symbol sliding-window deduplication cache with a memory cap.
+
+    The window is measured in event time: an entry expires once the newest
+    timestamp seen for its symbol is more than `window` ahead of it. Each
+    insert evicts at most the entries that fell out of the window or exceed
+    `max_entries_per_symbol`, giving O(1) amortized cost per check.
+    """
+
+    def __init__(self, window: timedelta = timedelta(minutes=10),
+                 max_entries_per_symbol: int = 50_000):
+        self.window = window
+        self.max_entries_per_symbol = max_entries_per_symbol
+        self._symbols: Dict[Hashable, _SymbolWindow] = {}
+        self._entries = 0
+        self._lookups = 0
+        self._hits = 0
+        self._expired_evictions = 0
+        self._capacity_evictions = 0
+
+    def check_and_add(self, symbol_id: Hashable, timestamp: datetime, key: Hashable = None) -> bool:
+        """
+        Check whether (symbol_id, key) was seen within the window and record it.
+
+        Args:
+            symbol_id: Symbol identifier the entry belongs to
+            timestamp: Event timestamp used for window expiry
+            key: Deduplication key (defaults to the timestamp itself)
+
+        Returns:
+            True if this is a duplicate that should be skipped
+        """
+        if key is None:
+            key = timestamp
+
+        self._lookups += 1
+
+        state = self._symbols.get(symbol_id)
+        if state is None:
+            state = self._symbols[symbol_id] = _SymbolWindow()
+
+        if state.newest is None or timestamp > state.newest:
+            state.newest = timestamp
+            self._evict_expired(state)
+
+        if key in state.keys:
+            self._hits += 1
+            return True
+
+        state.ring.append((timestamp, key))
+        state.keys.add(key)
+        self._entries += 1
+
+        if len(state.ring) > self.max_entries_per_symbol:
+            _, old_key = state.ring.popleft()
+            state.keys.discard(old_key)
+            self._entries -= 1
+            self._capacity_evictions += 1
+
+        return False
+
+    def _evict_expired(self, state: _SymbolWindow) -> None:
+        """Pop ring-head entries older than the window (relative to newest)."""
+        cutoff = state.newest - self.window
+        ring = state.ring
+        while ring and ring[0][0] < cutoff:
+            _, old_key = ring.popleft()
+            state.keys.discard(old_key)
+            self._entries -= 1
+            self._expired_evictions += 1
+
+    def discard_symbol(self, symbol_id: Hashable) -> None:
+        """Drop all entries for a symbol (e.g. after unsubscribe)."""
+        state = self._symbols.pop(symbol_id, None)
+        if state is not None:
+            self._entries -= len(state.ring)
+
+    def clear(self) -> None:
+        """Drop all entries; counters are kept."""
+        self._symbols.clear()
+        self._entries = 0
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def get_stats(self) -> DedupCacheStats:
+        """Get cache counters and current size."""
+        return DedupCacheStats(
+            lookups=self._lookups,
+            hits=self._hits,
+            expired_evictions=self._expired_evictions,
+            capacity_evictions=self._capacity_evictions,
+            entries=self._entries,
+            symbols=len(self._symbols),
+        )
+
+    def get_stats_dict(self) -> Dict[str, Any]:
+        """Get cache stats as a plain dict including hit_rate."""
+        stats = self.get_stats()
+        result = msgspec.structs.asdict(stats)
+        result['hit_rate'] = stats.hit_rate
+        return result
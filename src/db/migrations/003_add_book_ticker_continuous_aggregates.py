@@ -0,0 +1,180 @@
+"""
+Migration 003: Add bucketed continuous aggregates for book_ticker_snapshots
+
+Creates TimescaleDB continuous aggregates for the bucket sizes used by research
+and backtesting loaders (1s, 5s, 60s). Each view keeps the last L1 quote per
+bucket plus OHLC of mid price and relative spread, so bucketed reads no longer
+need to transfer every raw snapshot.
+
+Views are created with real-time aggregation enabled (materialized_only = false)
+so the most recent, not yet materialized buckets are still returned.
+"""
+
+import logging
+from typing import Dict, Any, List
+
+from db.connection import get_db_manager
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_ID = "003"
+MIGRATION_NAME = "add_book_ticker_continuous_aggregates"
+
+# view_name -> (bucket, refresh start_offset, refresh end_offset, schedule_interval, retention)
+BOOK_TICKER_AGGREGATES = {
+    'book_ticker_1s': ('1 second', '30 minutes', '10 seconds', '1 minute', '14 days'),
+    'book_ticker_5s': ('5 seconds', '1 hour', '30 seconds', '1 minute', '30 days'),
+    'book_ticker_60s': ('1 minute', '3 hours', '2 minutes', '5 minutes', '90 days'),
+}
+
+
+async def migrate_up() -> Dict[str, Any]:
+    """Apply migration: Create bucketed book ticker continuous aggregates."""
+    db = get_db_manager()
+
+    result = {
+        'success': False,
+        'tables_created': [],
+        'policies_created': 0,
+        'errors': []
+    }
+
+    try:
+        existing_views = await _check_existing_views(db)
+
+        for view_name, (bucket, start_offset, end_offset, schedule, retention) in BOOK_TICKER_AGGREGATES.items():
+            if view_name in existing_views:
+                logger.info(f"{view_name} continuous aggregate already exists")
+                continue
+
+            await _create_book_ticker_aggregate(db, view_name, bucket)
+            result['tables_created'].append(view_name)
+            logger.info(f"Created {view_name} continuous aggregate")
+
+            result['policies_created'] += await _apply_aggregate_policies(
+                db, view_name, start_offset, end_offset, schedule, retention
+            )
+
+        result['success'] = True
+        logger.info(f"Migration {MIGRATION_ID} completed successfully")
+
+    except Exception as e:
+        error_msg = f"Migration {MIGRATION_ID} failed: {e}"
+        logger.error(error_msg)
+        result['errors'].append(error_msg)
+        raise
+
+    return result
+
+
+async def migrate_down() -> Dict[str, Any]:
+    """Rollback migration: Drop the bucketed book ticker continuous aggregates."""
+    db = get_db_manager()
+
+    try:
+        dropped = []
+        for view_name in reversed(list(BOOK_TICKER_AGGREGATES)):
+            await db.execute(f"DROP MATERIALIZED VIEW IF EXISTS {view_name} CASCADE")
+            dropped.append(view_name)
+
+        logger.info(f"Migration {MIGRATION_ID} rollback completed")
+        return {
+            'success': True,
+            'tables_dropped': dropped
+        }
+    except Exception as e:
+        logger.error(f"Migration {MIGRATION_ID} rollback failed: {e}")
+        raise
+
+
+async def _check_existing_views(db) -> set:
+    """Check which aggregate views already exist."""
+    rows = await db.fetch("""
+        SELECT table_name
+        FROM information_schema.tables
+        WHERE table_schema = 'public'
+        AND table_name = ANY($1::text[])
+    """, list(BOOK_TICKER_AGGREGATES))
+    return {row['table_name'] for row in rows}
+
+
+async def _create_book_ticker_aggregate(db, view_name: str, bucket: str) -> None:
+    """Create a single continuous aggregate over book_ticker_snapshots."""
+    # Continuous aggregates cannot be created inside a transaction block,
+    # so each statement runs on its own via db.execute().
+    await db.execute(f"""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS {view_name}
+        WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+        SELECT
+            time_bucket(INTERVAL '{bucket}', timestamp) AS bucket,
+            symbol_id,
+            LAST(bid_price, timestamp) AS bid_price,
+            LAST(bid_qty, timestamp) AS bid_qty,
+            LAST(ask_price, timestamp) AS ask_price,
+            LAST(ask_qty, timestamp) AS ask_qty,
+            FIRST((bid_price + ask_price) / 2, timestamp) AS mid_open,
+            MAX((bid_price + ask_price) / 2) AS mid_high,
+            MIN((bid_price + ask_price) / 2) AS mid_low,
+            LAST((bid_price + ask_price) / 2, timestamp) AS mid_close,
+            FIRST((ask_price - bid_price) / ((bid_price + ask_price) / 2), timestamp) AS spread_open,
+            MAX((ask_price - bid_price) / ((bid_price + ask_price) / 2)) AS spread_high,
+            MIN((ask_price - bid_price) / ((bid_price + ask_price) / 2)) AS spread_low,
+            LAST((ask_price - bid_price) / ((bid_price + ask_price) / 2), timestamp) AS spread_close,
+            COUNT(*) AS update_count
+        FROM book_ticker_snapshots
+        GROUP BY bucket, symbol_id
+        WITH NO DATA;
+    """)
+
+    await db.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_{view_name}_symbol_bucket
+        ON {view_name}(symbol_id, bucket DESC);
+    """)
+
+    await db.execute(f"""
+        COMMENT ON MATERIALIZED VIEW {view_name} IS
+        'Book ticker aggregate ({bucket} buckets): last L1 quote plus mid/spread OHLC per symbol';
+    """)
+
+
+async def _apply_aggregate_policies(db, view_name: str, start_offset: str, end_offset: str,
+                                    schedule: str, retention: str) -> int:
+    """Attach refresh and retention policies to a continuous aggregate."""
+    policies_created = 0
+
+    try:
+        await db.execute(f"""
+            SELECT add_continuous_aggregate_policy('{view_name}',
+                start_offset => INTERVAL '{start_offset}',
+                end_offset => INTERVAL '{end_offset}',
+                schedule_interval => INTERVAL '{schedule}',
+                if_not_exists => TRUE);
+        """)
+        policies_created += 1
+    except Exception as e:
+        logger.warning(f"Failed to add refresh policy for {view_name}: {e}")
+
+    # Aggregates outlive the 3-day raw retention on book_ticker_snapshots
+    try:
+        await db.execute(f"""
+            SELECT add_retention_policy('{view_name}', INTERVAL '{retention}', if_not_exists => TRUE);
+        """)
+        policies_created += 1
+        logger.info(f"Applied retention policy for {view_name}: {retention}")
+    except Exception as e:
+        logger.warning(f"Failed to apply retention policy for {view_name}: {e}")
+
+    return policies_created
+
+
+async def get_migration_info() -> Dict[str, Any]:
+    """Get information about this migration."""
+    views: List[str] = list(BOOK_TICKER_AGGREGATES)
+    return {
+        'id': MIGRATION_ID,
+        'name': MIGRATION_NAME,
+        'description': 'Add 1s/5s/60s continuous aggregates for book_ticker_snapshots',
+        'tables_created': views,
+        'dependencies': ['book_ticker_snapshots', 'symbols'],
+        'version': '1.0.0'
+    }
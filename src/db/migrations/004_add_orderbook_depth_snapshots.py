@@ -0,0 +1,137 @@
+"""
+Migration 004: Add orderbook_depth_snapshots table
+
+Creates a compact, array-encoded companion to the per-level orderbook_depth
+hypertable. Each row holds one top-N sample for a symbol with float8[] price
+and size arrays per side (index 1 = best level), which is roughly N times fewer
+rows than orderbook_depth and is written by the data collector via COPY.
+"""
+
+import logging
+from typing import Dict, Any
+
+from db.connection import get_db_manager
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_ID = "004"
+MIGRATION_NAME = "add_orderbook_depth_snapshots"
+
+
+async def migrate_up() -> Dict[str, Any]:
+    """Apply migration: Create orderbook_depth_snapshots hypertable."""
+    db = get_db_manager()
+
+    result = {
+        'success': False,
+        'tables_created': [],
+        'indexes_created': 0,
+        'hypertables_created': [],
+        'errors': []
+    }
+
+    try:
+        exists = await db.fetchval("""
+            SELECT EXISTS (
+                SELECT FROM information_schema.tables
+                WHERE table_schema = 'public'
+                AND table_name = 'orderbook_depth_snapshots'
+            )
+        """)
+
+        if exists:
+            logger.info("orderbook_depth_snapshots table already exists")
+            result['success'] = True
+            return result
+
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS orderbook_depth_snapshots (
+                timestamp TIMESTAMPTZ NOT NULL,
+                symbol_id INTEGER NOT NULL REFERENCES symbols(id),  -- Foreign key to symbols table
+
+                -- Top-N levels per side, element 1 = best level (float-only policy)
+                bid_prices FLOAT8[] NOT NULL,
+                bid_sizes FLOAT8[] NOT NULL,
+                ask_prices FLOAT8[] NOT NULL,
+                ask_sizes FLOAT8[] NOT NULL,
+
+                -- Metadata
+                exchange_timestamp TIMESTAMPTZ,
+                created_at TIMESTAMPTZ DEFAULT NOW(),
+
+                CONSTRAINT chk_depth_bid_arrays CHECK (cardinality(bid_prices) = cardinality(bid_sizes)),
+                CONSTRAINT chk_depth_ask_arrays CHECK (cardinality(ask_prices) = cardinality(ask_sizes)),
+
+                PRIMARY KEY (timestamp, symbol_id)
+            );
+        """)
+        result['tables_created'].append('orderbook_depth_snapshots')
+
+        await db.execute("""
+            COMMENT ON TABLE orderbook_depth_snapshots IS
+            'Top-N orderbook depth samples with array-encoded levels per side';
+        """)
+
+        try:
+            await db.execute("""
+                SELECT create_hypertable('orderbook_depth_snapshots', 'timestamp',
+                    chunk_time_interval => INTERVAL '30 minutes',
+                    if_not_exists => TRUE);
+            """)
+            result['hypertables_created'].append('orderbook_depth_snapshots')
+        except Exception as e:
+            logger.warning(f"Failed to create orderbook_depth_snapshots hypertable: {e}")
+
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_orderbook_depth_snapshots_symbol_time
+            ON orderbook_depth_snapshots(symbol_id, timestamp DESC);
+        """)
+        result['indexes_created'] += 1
+
+        # Same raw retention as orderbook_depth
+        try:
+            await db.execute("""
+                SELECT add_retention_policy('orderbook_depth_snapshots', INTERVAL '3 days', if_not_exists => TRUE);
+            """)
+            logger.info("Applied retention policy for orderbook_depth_snapshots: 3 days")
+        except Exception as e:
+            logger.warning(f"Failed to apply retention policy for orderbook_depth_snapshots: {e}")
+
+        result['success'] = True
+        logger.info(f"Migration {MIGRATION_ID} completed successfully")
+
+    except Exception as e:
+        error_msg = f"Migration {MIGRATION_ID} failed: {e}"
+        logger.error(error_msg)
+        result['errors'].append(error_msg)
+        raise
+
+    return result
+
+
+async def migrate_down() -> Dict[str, Any]:
+    """Rollback migration: Drop orderbook_depth_snapshots table."""
+    db = get_db_manager()
+
+    try:
+        await db.execute("DROP TABLE IF EXISTS orderbook_depth_snapshots CASCADE")
+        logger.info(f"Migration {MIGRATION_ID} rollback completed")
+        return {
+            'success': True,
+            'tables_dropped': ['orderbook_depth_snapshots']
+        }
+    except Exception as e:
+        logger.error(f"Migration {MIGRATION_ID} rollback failed: {e}")
+        raise
+
+
+async def get_migration_info() -> Dict[str, Any]:
+    """Get information about this migration."""
+    return {
+        'id': MIGRATION_ID,
+        'name': MIGRATION_NAME,
+        'description': 'Add array-encoded orderbook_depth_snapshots hypertable',
+        'tables_created': ['orderbook_depth_snapshots'],
+        'dependencies': ['symbols'],
+        'version': '1.0.0'
+    }
@@ -0,0 +1,104 @@
+"""
+Migration 005: Add received_at field to book_ticker_snapshots
+
+Book ticker rows are now stamped with the exchange event time in `timestamp`.
+The local receive time is stored separately in `received_at` so feed latency
+and clock skew can be measured and backtests can replay on either clock.
+"""
+
+import logging
+from typing import Dict, Any
+
+from db.connection import get_db_manager
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_ID = "005"
+MIGRATION_NAME = "add_book_ticker_received_at"
+
+
+async def migrate_up() -> Dict[str, Any]:
+    """Apply migration: Add received_at field to book_ticker_snapshots."""
+    db = get_db_manager()
+    
+    result = {
+        'success': False,
+        'tables_modified': [],
+        'columns_added': [],
+        'errors': []
+    }
+    
+    try:
+        # Check if column already exists
+        column_exists = await db.fetchval("""
+            SELECT EXISTS (
+                SELECT FROM information_schema.columns 
+                WHERE table_schema = 'public' 
+                AND table_name = 'book_ticker_snapshots' 
+                AND column_name = 'received_at'
+            )
+        """)
+        
+        if column_exists:
+            logger.info("Column received_at already exists in book_ticker_snapshots")
+        else:
+            # Nullable: rows collected before this migration only have the local timestamp
+            await db.execute("""
+                ALTER TABLE book_ticker_snapshots 
+                ADD COLUMN received_at TIMESTAMPTZ;
+            """)
+            result['columns_added'].append('received_at')
+            result['tables_modified'].append('book_ticker_snapshots')
+            
+            await db.execute("""
+                COMMENT ON COLUMN book_ticker_snapshots.received_at IS 
+                'Local receive time (timestamp holds the exchange event time)';
+            """)
+        
+        # Same index as docker/init-db.sql (fresh installs)
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_book_ticker_symbol_received 
+            ON book_ticker_snapshots(symbol_id, received_at DESC) WHERE received_at IS NOT NULL;
+        """)
+        
+        result['success'] = True
+        logger.info(f"Migration {MIGRATION_ID} completed successfully")
+        
+    except Exception as e:
+        error_msg = f"Migration {MIGRATION_ID} failed: {e}"
+        logger.error(error_msg)
+        result['errors'].append(error_msg)
+        raise
+    
+    return result
+
+
+async def migrate_down() -> Dict[str, Any]:
+    """Rollback migration: Remove received_at field from book_ticker_snapshots."""
+    db = get_db_manager()
+    
+    try:
+        await db.execute("DROP INDEX IF EXISTS idx_book_ticker_symbol_received")
+        await db.execute("ALTER TABLE book_ticker_snapshots DROP COLUMN IF EXISTS received_at")
+        
+        logger.info(f"Migration {MIGRATION_ID} rollback completed")
+        return {
+            'success': True, 
+            'columns_dropped': ['received_at']
+        }
+    except Exception as e:
+        logger.error(f"Migration {MIGRATION_ID} rollback failed: {e}")
+        raise
+
+
+async def get_migration_info() -> Dict[str, Any]:
+    """Get information about this migration."""
+    return {
+        'id': MIGRATION_ID,
+        'name': MIGRATION_NAME,
+        'description': 'Add received_at local receive time to book_ticker_snapshots table',
+        'tables_modified': ['book_ticker_snapshots'],
+        'columns_added': ['received_at'],
+        'dependencies': ['book_ticker_snapshots'],
+        'version': '1.0.0'
+    }
@@ -169,4 +169,19 @@ async def _is_migration_needed(migration: Dict[str, Any]) -> bool:
             if not exists:
                 return True  # At least one table is missing
     
-    return False  # All tables exist
\ No newline at end of file
+    # Check if the columns added by this migration exist
+    if 'columns_added' in migration:
+        for column_name in migration['columns_added']:
+            exists = await db.fetchval("""
+                SELECT EXISTS (
+                    SELECT FROM information_schema.columns 
+                    WHERE table_schema = 'public' 
+                    AND table_name = ANY($1::text[])
+                    AND column_name = $2
+                )
+            """, migration.get('tables_modified', []), column_name)
+            
+            if not exists:
+                return True  # At least one column is missing
+    
+    return False  # All tables and columns exist
\ No newline at end of file
@@ -6,7 +6,7 @@ Optimized for HFT requirements with zero-copy serialization.
 """
 
 from datetime import datetime, UTC
-from typing import Optional
+from typing import List, Optional
 from enum import IntEnum
 import msgspec
 
@@ -406,9 +406,10 @@ class BookTickerSnapshot(msgspec.Struct):
     ask_qty: float
     
     # Timing
-    timestamp: datetime
+    timestamp: datetime                         # Exchange event time
     created_at: Optional[datetime] = None
     id: Optional[int] = None
+    received_at: Optional[datetime] = None      # Local receive time
 
     @classmethod
     def from_symbol_id_and_data(
@@ -418,7 +419,8 @@ class BookTickerSnapshot(msgspec.Struct):
         bid_qty: float,
         ask_price: float,
         ask_qty: float,
-        timestamp: datetime
+        timestamp: datetime,
+        received_at: Optional[datetime] = None
     ) -> "BookTickerSnapshot":
         """
         Create BookTickerSnapshot from symbol ID and ticker data.
@@ -430,6 +432,7 @@ class BookTickerSnapshot(msgspec.Struct):
             ask_price: Best ask price
             ask_qty: Best ask quantity
             timestamp: Exchange timestamp
+            received_at: Local receive timestamp (optional)
             
         Returns:
             BookTickerSnapshot instance
@@ -443,7 +446,8 @@ class BookTickerSnapshot(msgspec.Struct):
             bid_qty=bid_qty,
             ask_price=ask_price,
             ask_qty=ask_qty,
-            timestamp=timestamp
+            timestamp=timestamp,
+            received_at=received_at
         )
     
     @classmethod
@@ -841,3 +845,52 @@ class TradeSnapshot(msgspec.Struct):
         return db_symbol.get_symbol_string()
 
 
+class OrderbookDepthSnapshot(msgspec.Struct):
+    """
+    Top-N orderbook depth snapshot structure.
+    
+    Stores one sample of the top levels per side in compact array form
+    (level 1 first). Bids are sorted by price descending, asks ascending.
+    Works with normalized database schema using symbol_id foreign keys.
+    """
+    # Database fields (normalized schema)
+    symbol_id: int                              # Foreign key to symbols table
+    
+    # Depth data (float-only, index 0 = best level)
+    bid_prices: List[float]
+    bid_sizes: List[float]
+    ask_prices: List[float]
+    ask_sizes: List[float]
+    
+    # Timing
+    timestamp: datetime                         # Local sample time
+    exchange_timestamp: Optional[datetime] = None  # Last book update time reported by exchange
+    id: Optional[int] = None
+    
+    @property
+    def levels(self) -> int:
+        """Number of levels on the deeper side."""
+        return max(len(self.bid_prices), len(self.ask_prices))
+    
+    def to_level_rows(self) -> List[tuple]:
+        """
+        Expand into per-level rows for the legacy orderbook_depth layout.
+        
+        Returns:
+            List of (timestamp, symbol_id, level, bid_price, bid_size, ask_price, ask_size)
+            with None for missing levels on the shallower side
+        """
+        rows = []
+        bid_count = len(self.bid_prices)
+        ask_count = len(self.ask_prices)
+        for i in range(self.levels):
+            rows.append((
+                self.timestamp,
+                self.symbol_id,
+                i + 1,
+                self.bid_prices[i] if i < bid_count else None,
+                self.bid_sizes[i] if i < bid_count else None,
+                self.ask_prices[i] if i < ask_count else None,
+                self.ask_sizes[i] if i < ask_count else None,
+            ))
+        return rows
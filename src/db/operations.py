@@ -7,57 +7,22 @@ Optimized for HFT requirements with minimal latency and maximum throughput.
 
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional, Dict, Any, Set
-from collections import defaultdict
-import time
+from typing import AsyncIterator, List, Optional, Dict, Any
 
 from .connection import get_db_manager
+from .dedup_cache import TimeWindowDedupCache
 from .models import (BookTickerSnapshot, TradeSnapshot, FundingRateSnapshot,
-                     BalanceSnapshot, Exchange, Symbol as DBSymbol, SymbolType)
+                     BalanceSnapshot, OrderbookDepthSnapshot, Exchange, Symbol as DBSymbol, SymbolType)
+from .streaming import (StreamBatch, BOOK_TICKER_BATCH_SCHEMA, TRADE_BATCH_SCHEMA,
+                        BALANCE_BATCH_SCHEMA, DEFAULT_BATCH_SIZE, epoch_us_sql)
 from exchanges.structs.common import Symbol
 
 
 logger = logging.getLogger(__name__)
 
-# Global deduplication cache for recent timestamps
-# Structure: {(exchange, symbol_base, symbol_quote): {timestamp1, timestamp2, ...}}
-_timestamp_cache: Dict[tuple, Set[datetime]] = defaultdict(set)
-_cache_last_cleanup = time.time()
-_cache_cleanup_interval = 300  # 5 minutes
-
-
-def _cleanup_timestamp_cache():
-    """
-    Clean up old entries from the timestamp cache to prevent memory bloat.
-    Removes timestamps older than 10 minutes.
-    """
-    global _cache_last_cleanup
-    current_time = time.time()
-    
-    if current_time - _cache_last_cleanup < _cache_cleanup_interval:
-        return
-    
-    cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=10)
-    total_removed = 0
-    
-    # Clean up old timestamps from each cache entry
-    for key in list(_timestamp_cache.keys()):
-        timestamp_set = _timestamp_cache[key]
-        old_size = len(timestamp_set)
-        
-        # Remove timestamps older than cutoff
-        timestamp_set = {ts for ts in timestamp_set if ts > cutoff_time}
-        _timestamp_cache[key] = timestamp_set
-        
-        # Remove empty entries
-        if not timestamp_set:
-            del _timestamp_cache[key]
-        
-        total_removed += old_size - len(timestamp_set)
-    
-    _cache_last_cleanup = current_time
-    if total_removed > 0:
-        logger.debug(f"Cleaned {total_removed} old timestamps from deduplication cache")
+# Global deduplication cache for recent book ticker timestamps
+# Per-symbol time-ordered ring, evicted incrementally (no periodic rebuild)
+_timestamp_cache = TimeWindowDedupCache(window=timedelta(minutes=10), max_entries_per_symbol=50_000)
 
 
 def _is_duplicate_timestamp(symbol_id: int, timestamp: datetime) -> bool:
@@ -67,15 +32,20 @@ def _is_duplicate_timestamp(symbol_id: int, timestamp: datetime) -> bool:
     Returns:
         True if this is a duplicate timestamp that should be skipped
     """
-    key = (symbol_id,)
-    
-    # Check if we've seen this exact timestamp recently
-    if timestamp in _timestamp_cache[key]:
-        return True
+    return _timestamp_cache.check_and_add(symbol_id, timestamp)
+
+
+def get_dedup_cache_stats() -> Dict[str, Any]:
+    """
+    Get deduplication cache metrics (size, evictions, hit rate) for monitoring.
     
-    # Add to cache for future checks
-    _timestamp_cache[key].add(timestamp)
-    return False
+    Returns:
+        Dictionary with 'book_ticker' and 'trades' cache statistics
+    """
+    return {
+        'book_ticker': _timestamp_cache.get_stats_dict(),
+        'trades': _trade_timestamp_cache.get_stats_dict(),
+    }
 
 
 async def insert_book_ticker_snapshot(snapshot: BookTickerSnapshot) -> int:
@@ -95,8 +65,8 @@ async def insert_book_ticker_snapshot(snapshot: BookTickerSnapshot) -> int:
     
     query = """
         INSERT INTO book_ticker_snapshots (
-            symbol_id, bid_price, bid_qty, ask_price, ask_qty, timestamp
-        ) VALUES ($1, $2, $3, $4, $5, $6)
+            symbol_id, bid_price, bid_qty, ask_price, ask_qty, timestamp, received_at
+        ) VALUES ($1, $2, $3, $4, $5, $6, $7)
         RETURNING id
     """
     
@@ -108,7 +78,8 @@ async def insert_book_ticker_snapshot(snapshot: BookTickerSnapshot) -> int:
             snapshot.bid_qty,
             snapshot.ask_price,
             snapshot.ask_qty,
-            snapshot.timestamp
+            snapshot.timestamp,
+            snapshot.received_at
         )
         
         logger.debug(f"Inserted book ticker snapshot {record_id} for symbol_id {snapshot.symbol_id}")
@@ -137,9 +108,6 @@ async def insert_book_ticker_snapshots_batch(snapshots: List[BookTickerSnapshot]
     if not snapshots:
         return 0
     
-    # Clean up cache periodically
-    _cleanup_timestamp_cache()
-    
     # Filter out known duplicate timestamps using cache
     filtered_snapshots = []
     cache_hits = 0
@@ -184,14 +152,15 @@ async def insert_book_ticker_snapshots_batch(snapshots: List[BookTickerSnapshot]
     # Use individual upserts in transaction for reliability
     query = """
         INSERT INTO book_ticker_snapshots (
-            symbol_id, bid_price, bid_qty, ask_price, ask_qty, timestamp
-        ) VALUES ($1, $2, $3, $4, $5, $6)
+            symbol_id, bid_price, bid_qty, ask_price, ask_qty, timestamp, received_at
+        ) VALUES ($1, $2, $3, $4, $5, $6, $7)
         ON CONFLICT (symbol_id, timestamp)
         DO UPDATE SET
             bid_price = EXCLUDED.bid_price,
             bid_qty = EXCLUDED.bid_qty,
             ask_price = EXCLUDED.ask_price,
             ask_qty = EXCLUDED.ask_qty,
+            received_at = EXCLUDED.received_at,
             created_at = NOW()
     """
     
@@ -206,7 +175,8 @@ async def insert_book_ticker_snapshots_batch(snapshots: List[BookTickerSnapshot]
                         snapshot.bid_qty,
                         snapshot.ask_price,
                         snapshot.ask_qty,
-                        snapshot.timestamp
+                        snapshot.timestamp,
+                        snapshot.received_at
                     )
                     count += 1
         
@@ -515,28 +485,29 @@ async def get_book_ticker_history(
     """
     
     try:
-        rows = await db.fetch(
+        snapshots = []
+        # Server-side cursor: only one batch of records is held next to the snapshots
+        async for rows in db.cursor_batches(
             query,
             exchange.upper(),
             str(symbol.base).upper(),
             str(symbol.quote).upper(),
             sample_interval_minutes,
             timestamp_from
-        )
-        
-        snapshots = [
-            BookTickerSnapshot(
-                id=row['id'],
-                symbol_id=row['symbol_id'],
-                bid_price=float(row['bid_price']),
-                bid_qty=float(row['bid_qty']),
-                ask_price=float(row['ask_price']),
-                ask_qty=float(row['ask_qty']),
-                timestamp=row['timestamp'],
-                created_at=row['created_at']
+        ):
+            snapshots.extend(
+                BookTickerSnapshot(
+                    id=row['id'],
+                    symbol_id=row['symbol_id'],
+                    bid_price=float(row['bid_price']),
+                    bid_qty=float(row['bid_qty']),
+                    ask_price=float(row['ask_price']),
+                    ask_qty=float(row['ask_qty']),
+                    timestamp=row['timestamp'],
+                    created_at=row['created_at']
+                )
+                for row in rows
             )
-            for row in rows
-        ]
         
         logger.debug(f"Retrieved {len(snapshots)} historical normalized book ticker snapshots for {exchange} {symbol.base}/{symbol.quote}")
         return snapshots
@@ -546,6 +517,83 @@ async def get_book_ticker_history(
         raise
 
 
+async def stream_book_ticker_history(
+    exchange: str,
+    symbol: Symbol,
+    hours_back: int = 24,
+    sample_interval_minutes: int = 1,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    as_arrow: bool = False
+) -> AsyncIterator[StreamBatch]:
+    """
+    Streaming variant of get_book_ticker_history() yielding columnar batches.
+    
+    Uses a server-side cursor so only one batch is held in memory. Pass
+    sample_interval_minutes=0 to stream every raw snapshot.
+    
+    Args:
+        exchange: Exchange identifier
+        symbol: Symbol object
+        hours_back: How many hours of history to retrieve
+        sample_interval_minutes: Sampling interval in minutes (0 = no downsampling)
+        batch_size: Rows per batch
+        as_arrow: Yield pyarrow.RecordBatch instead of dict of NumPy arrays
+        
+    Yields:
+        Batches with columns: timestamp, bid_price, bid_qty, ask_price, ask_qty
+    """
+    db = get_db_manager()
+    
+    timestamp_from = datetime.now(timezone.utc) - timedelta(hours=hours_back)
+    params = [exchange.upper(), str(symbol.base).upper(), str(symbol.quote).upper(), timestamp_from]
+    
+    if sample_interval_minutes > 0:
+        # Last snapshot per interval; DISTINCT ON keeps this a single sorted pass
+        query = f"""
+            SELECT {epoch_us_sql('sampled.timestamp')}, sampled.bid_price, sampled.bid_qty,
+                   sampled.ask_price, sampled.ask_qty
+            FROM (
+                SELECT DISTINCT ON (FLOOR(EXTRACT(EPOCH FROM bts.timestamp) / (60 * $5)))
+                       bts.timestamp,
+                       bts.bid_price::float8 AS bid_price, bts.bid_qty::float8 AS bid_qty,
+                       bts.ask_price::float8 AS ask_price, bts.ask_qty::float8 AS ask_qty
+                FROM book_ticker_snapshots bts
+                JOIN symbols s ON bts.symbol_id = s.id
+                JOIN exchanges e ON s.exchange_id = e.id
+                WHERE e.enum_value = $1 
+                  AND s.symbol_base = $2 
+                  AND s.symbol_quote = $3
+                  AND bts.timestamp >= $4
+                ORDER BY FLOOR(EXTRACT(EPOCH FROM bts.timestamp) / (60 * $5)), bts.timestamp DESC
+            ) sampled
+            ORDER BY sampled.timestamp ASC
+        """
+        params.append(sample_interval_minutes)
+    else:
+        query = f"""
+            SELECT {epoch_us_sql('bts.timestamp')},
+                   bts.bid_price::float8, bts.bid_qty::float8,
+                   bts.ask_price::float8, bts.ask_qty::float8
+            FROM book_ticker_snapshots bts
+            JOIN symbols s ON bts.symbol_id = s.id
+            JOIN exchanges e ON s.exchange_id = e.id
+            WHERE e.enum_value = $1 
+              AND s.symbol_base = $2 
+              AND s.symbol_quote = $3
+              AND bts.timestamp >= $4
+            ORDER BY bts.timestamp ASC
+        """
+    
+    batches = db.fetch_record_batches(
+        query, *params, schema=BOOK_TICKER_BATCH_SCHEMA, batch_size=batch_size, as_arrow=as_arrow
+    )
+    try:
+        async for batch in batches:
+            yield batch
+    finally:
+        await batches.aclose()
+
+
 async def cleanup_old_snapshots(days_to_keep: int = 7) -> int:
     """
     Clean up old BookTicker snapshots to manage database size.
@@ -582,7 +630,8 @@ async def get_database_stats() -> Dict[str, Any]:
     Get database statistics for monitoring.
     
     Returns:
-        Dictionary with database statistics
+        Dictionary with database statistics; 'dedup_cache' holds the insert-path
+        cache metrics per stream ('book_ticker', 'trades')
     """
     db = get_db_manager()
     
@@ -615,6 +664,7 @@ async def get_database_stats() -> Dict[str, Any]:
         
         # Add connection pool stats
         stats['connection_pool'] = await db.get_connection_stats()
+        stats['dedup_cache'] = get_dedup_cache_stats()
         
         return stats
         
@@ -627,7 +677,7 @@ async def get_database_stats() -> Dict[str, Any]:
 # Similar pattern to BookTicker operations but for trade data
 
 # Global deduplication cache for trade timestamps
-_trade_timestamp_cache: Dict[tuple, Set] = defaultdict(set)
+_trade_timestamp_cache = TimeWindowDedupCache(window=timedelta(minutes=10), max_entries_per_symbol=100_000)
 
 
 def _is_duplicate_trade_timestamp(symbol_id: int, timestamp: datetime, trade_id: str) -> bool:
@@ -637,49 +687,8 @@ def _is_duplicate_trade_timestamp(symbol_id: int, timestamp: datetime, trade_id:
     Returns:
         True if this is a duplicate trade that should be skipped
     """
-    key = (symbol_id,)
     trade_key = (timestamp, trade_id) if trade_id else timestamp
-    
-    # Check if we've seen this exact trade recently
-    if trade_key in _trade_timestamp_cache[key]:
-        return True
-    
-    # Add to cache for future checks
-    _trade_timestamp_cache[key].add(trade_key)
-    return False
-
-
-def _cleanup_trade_timestamp_cache():
-    """
-    Clean up old entries from the trade timestamp cache.
-    """
-    cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=10)
-    total_removed = 0
-    
-    for key in list(_trade_timestamp_cache.keys()):
-        trade_set = _trade_timestamp_cache[key]
-        old_size = len(trade_set)
-        
-        # Remove old trade entries
-        new_set = set()
-        for item in trade_set:
-            if isinstance(item, tuple) and len(item) == 2:
-                timestamp, trade_id = item
-                if timestamp > cutoff_time:
-                    new_set.add(item)
-            elif isinstance(item, datetime) and item > cutoff_time:
-                new_set.add(item)
-        
-        _trade_timestamp_cache[key] = new_set
-        
-        # Remove empty entries
-        if not new_set:
-            del _trade_timestamp_cache[key]
-        
-        total_removed += old_size - len(new_set)
-    
-    if total_removed > 0:
-        logger.debug(f"Cleaned {total_removed} old trade timestamps from cache")
+    return _trade_timestamp_cache.check_and_add(symbol_id, timestamp, trade_key)
 
 
 async def insert_trade_snapshot(snapshot: TradeSnapshot) -> int:
@@ -817,9 +826,6 @@ async def insert_trade_snapshots_batch(snapshots: List[TradeSnapshot]) -> int:
     if not snapshots:
         return 0
     
-    # Clean up cache periodically
-    _cleanup_trade_timestamp_cache()
-    
     # Filter out known duplicate trades using cache
     filtered_snapshots = []
     cache_hits = 0
@@ -935,24 +941,25 @@ async def get_recent_trades(
     """
     
     try:
-        rows = await db.fetch(query, exchange.upper(), str(symbol.base).upper(), str(symbol.quote).upper(), timestamp_from)
-        
         snapshots = []
-        for row in rows:
-            snapshot = TradeSnapshot(
-                id=row['id'],
-                symbol_id=row['symbol_id'],
-                price=float(row['price']),
-                quantity=float(row['quantity']),
-                side=row['side'],
-                trade_id=row['trade_id'],
-                timestamp=row['timestamp'],
-                created_at=row['created_at'],
-                quote_quantity=float(row['quote_quantity']) if row['quote_quantity'] else None,
-                is_buyer=row['is_buyer'],
-                is_maker=row['is_maker']
-            )
-            snapshots.append(snapshot)
+        async for rows in db.cursor_batches(
+            query, exchange.upper(), str(symbol.base).upper(), str(symbol.quote).upper(), timestamp_from
+        ):
+            for row in rows:
+                snapshot = TradeSnapshot(
+                    id=row['id'],
+                    symbol_id=row['symbol_id'],
+                    price=float(row['price']),
+                    quantity=float(row['quantity']),
+                    side=row['side'],
+                    trade_id=row['trade_id'],
+                    timestamp=row['timestamp'],
+                    created_at=row['created_at'],
+                    quote_quantity=float(row['quote_quantity']) if row['quote_quantity'] else None,
+                    is_buyer=row['is_buyer'],
+                    is_maker=row['is_maker']
+                )
+                snapshots.append(snapshot)
         
         logger.debug(f"Retrieved {len(snapshots)} recent trade snapshots")
         return snapshots
@@ -962,6 +969,59 @@ async def get_recent_trades(
         raise
 
 
+async def stream_recent_trades(
+    exchange: str,
+    symbol: Symbol,
+    minutes_back: int = 60,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    as_arrow: bool = False
+) -> AsyncIterator[StreamBatch]:
+    """
+    Streaming variant of get_recent_trades() yielding columnar batches, oldest first.
+    
+    Unlike get_recent_trades() there is no 10000-row cap. Side is encoded as
+    int8 (1 = buy, -1 = sell); missing quote_quantity is NaN and missing
+    is_buyer/is_maker flags are False.
+    
+    Args:
+        exchange: Exchange identifier
+        symbol: Symbol object
+        minutes_back: How many minutes of trades to retrieve
+        batch_size: Rows per batch
+        as_arrow: Yield pyarrow.RecordBatch instead of dict of NumPy arrays
+        
+    Yields:
+        Batches with columns: timestamp, price, quantity, quote_quantity, side,
+        is_buyer, is_maker, trade_id
+    """
+    db = get_db_manager()
+    timestamp_from = datetime.now(timezone.utc) - timedelta(minutes=minutes_back)
+    
+    query = f"""
+        SELECT {epoch_us_sql('ts.timestamp')},
+               ts.price::float8, ts.quantity::float8,
+               COALESCE(ts.quote_quantity::float8, 'NaN'::float8),
+               (CASE WHEN ts.side = 'buy' THEN 1 ELSE -1 END)::int2,
+               COALESCE(ts.is_buyer, false), COALESCE(ts.is_maker, false),
+               ts.trade_id
+        FROM trade_snapshots ts
+        JOIN symbols s ON ts.symbol_id = s.id
+        JOIN exchanges e ON s.exchange_id = e.id
+        WHERE e.enum_value = $1 AND s.symbol_base = $2 AND s.symbol_quote = $3 AND ts.timestamp >= $4
+        ORDER BY ts.timestamp ASC, ts.id ASC
+    """
+    
+    batches = db.fetch_record_batches(
+        query, exchange.upper(), str(symbol.base).upper(), str(symbol.quote).upper(), timestamp_from,
+        schema=TRADE_BATCH_SCHEMA, batch_size=batch_size, as_arrow=as_arrow
+    )
+    try:
+        async for batch in batches:
+            yield batch
+    finally:
+        await batches.aclose()
+
+
 async def get_trade_database_stats() -> Dict[str, Any]:
     """
     Get trade database statistics for monitoring.
@@ -997,6 +1057,7 @@ async def get_trade_database_stats() -> Dict[str, Any]:
             result = await db.fetchval(query)
             stats[key] = result
         
+        stats['dedup_cache'] = _trade_timestamp_cache.get_stats_dict()
         return stats
         
     except Exception as e:
@@ -1004,6 +1065,70 @@ async def get_trade_database_stats() -> Dict[str, Any]:
         return {}
 
 
+# =============================================================================
+# ORDERBOOK DEPTH OPERATIONS
+# =============================================================================
+
+async def insert_orderbook_depth_snapshots_batch(
+    snapshots: List[OrderbookDepthSnapshot],
+    encoding: str = 'levels'
+) -> int:
+    """
+    Insert orderbook depth samples via COPY.
+    
+    Samples are produced by the collector at a rate-limited, change-only cadence,
+    so (timestamp, symbol_id) collisions only occur within a single batch and are
+    resolved by keeping the latest sample.
+    
+    Args:
+        snapshots: List of OrderbookDepthSnapshot objects
+        encoding: 'levels' writes one row per level into orderbook_depth,
+                  'arrays' writes one row per sample into orderbook_depth_snapshots
+                  (compact, opt-in)
+        
+    Returns:
+        Number of rows written
+    """
+    if not snapshots:
+        return 0
+    
+    db = get_db_manager()
+    
+    # COPY has no ON CONFLICT - drop in-batch primary key collisions (last wins)
+    unique = {(snapshot.timestamp, snapshot.symbol_id): snapshot for snapshot in snapshots}
+    
+    try:
+        if encoding == 'arrays':
+            columns = ['timestamp', 'symbol_id', 'bid_prices', 'bid_sizes',
+                       'ask_prices', 'ask_sizes', 'exchange_timestamp']
+            records = [
+                (
+                    snapshot.timestamp,
+                    snapshot.symbol_id,
+                    snapshot.bid_prices,
+                    snapshot.bid_sizes,
+                    snapshot.ask_prices,
+                    snapshot.ask_sizes,
+                    snapshot.exchange_timestamp
+                )
+                for snapshot in unique.values()
+            ]
+            count = await db.copy_records_to_table('orderbook_depth_snapshots', records, columns)
+        elif encoding == 'levels':
+            columns = ['timestamp', 'symbol_id', 'level', 'bid_price', 'bid_size', 'ask_price', 'ask_size']
+            records = [row for snapshot in unique.values() for row in snapshot.to_level_rows()]
+            count = await db.copy_records_to_table('orderbook_depth', records, columns)
+        else:
+            raise ValueError(f"Unsupported depth encoding: {encoding}")
+        
+        logger.debug(f"Successfully inserted {count} orderbook depth rows ({encoding})")
+        return count
+        
+    except Exception as e:
+        logger.error(f"Failed to insert orderbook depth snapshots: {e}")
+        raise
+
+
 # =============================================================================
 # BALANCE OPERATIONS (HFT-OPTIMIZED)
 # =============================================================================
@@ -1184,28 +1309,27 @@ async def get_balance_history(
     """
     
     try:
-        rows = await db.fetch(
+        snapshots = []
+        async for rows in db.cursor_batches(
             query,
             exchange_name.upper(),
             asset_name.upper(),
             timestamp_from
-        )
-        
-        snapshots = []
-        for row in rows:
-            snapshot = BalanceSnapshot(
-                id=row['id'],
-                exchange_id=row['exchange_id'],
-                asset_name=row['asset_name'],
-                available_balance=float(row['available_balance']),
-                locked_balance=float(row['locked_balance']),
-                frozen_balance=float(row['frozen_balance']) if row['frozen_balance'] else None,
-                borrowing_balance=float(row['borrowing_balance']) if row['borrowing_balance'] else None,
-                interest_balance=float(row['interest_balance']) if row['interest_balance'] else None,
-                timestamp=row['timestamp'],
-                created_at=row['created_at']
-            )
-            snapshots.append(snapshot)
+        ):
+            for row in rows:
+                snapshot = BalanceSnapshot(
+                    id=row['id'],
+                    exchange_id=row['exchange_id'],
+                    asset_name=row['asset_name'],
+                    available_balance=float(row['available_balance']),
+                    locked_balance=float(row['locked_balance']),
+                    frozen_balance=float(row['frozen_balance']) if row['frozen_balance'] else None,
+                    borrowing_balance=float(row['borrowing_balance']) if row['borrowing_balance'] else None,
+                    interest_balance=float(row['interest_balance']) if row['interest_balance'] else None,
+                    timestamp=row['timestamp'],
+                    created_at=row['created_at']
+                )
+                snapshots.append(snapshot)
         
         logger.debug(f"Retrieved {len(snapshots)} historical balance snapshots for {exchange_name} {asset_name}")
         return snapshots
@@ -1215,6 +1339,58 @@ async def get_balance_history(
         raise
 
 
+async def stream_balance_history(
+    exchange_name: str,
+    asset_name: str,
+    hours_back: int = 24,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    as_arrow: bool = False
+) -> AsyncIterator[StreamBatch]:
+    """
+    Streaming variant of get_balance_history() yielding columnar batches.
+    
+    Missing optional balances (frozen/borrowing/interest) are NaN.
+    
+    Args:
+        exchange_name: Exchange identifier
+        asset_name: Asset symbol
+        hours_back: How many hours of history to retrieve
+        batch_size: Rows per batch
+        as_arrow: Yield pyarrow.RecordBatch instead of dict of NumPy arrays
+        
+    Yields:
+        Batches with columns: timestamp, available_balance, locked_balance,
+        frozen_balance, borrowing_balance, interest_balance
+    """
+    db = get_db_manager()
+    
+    timestamp_from = datetime.now(timezone.utc) - timedelta(hours=hours_back)
+    
+    query = f"""
+        SELECT {epoch_us_sql('bs.timestamp')},
+               bs.available_balance::float8, bs.locked_balance::float8,
+               COALESCE(bs.frozen_balance::float8, 'NaN'::float8),
+               COALESCE(bs.borrowing_balance::float8, 'NaN'::float8),
+               COALESCE(bs.interest_balance::float8, 'NaN'::float8)
+        FROM balance_snapshots bs
+        JOIN exchanges e ON bs.exchange_id = e.id
+        WHERE e.enum_value = $1 
+          AND bs.asset_name = $2
+          AND bs.timestamp >= $3
+        ORDER BY bs.timestamp ASC
+    """
+    
+    batches = db.fetch_record_batches(
+        query, exchange_name.upper(), asset_name.upper(), timestamp_from,
+        schema=BALANCE_BATCH_SCHEMA, batch_size=batch_size, as_arrow=as_arrow
+    )
+    try:
+        async for batch in batches:
+            yield batch
+    finally:
+        await batches.aclose()
+
+
 async def get_active_balances(
     exchange_name: Optional[str] = None,
     min_total_balance: float = 0.001
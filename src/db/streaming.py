@@ -0,0 +1,225 @@
+"""
+Streaming Record Batches
+
+Columnar conversion helpers for server-side cursor reads.
+
+Large historical reads (a week of tick-level book tickers) must not materialize every
+asyncpg.Record at once. Streaming queries fetch fixed-size batches from a server-side
+cursor and convert each batch into NumPy columns (or an Arrow RecordBatch when pyarrow
+is installed) before the next batch is pulled.
+
+Query conventions for streaming readers:
+- Numeric columns are cast to float8 in SQL (Float-Only Data Policy, no Decimal objects)
+- Nullable numeric columns use COALESCE(..., 'NaN') so they map to float64
+- Timestamps are selected as int8 epoch microseconds and viewed as datetime64[us]
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    pa = None
+
+
+DEFAULT_BATCH_SIZE = 50_000
+
+# Column name -> NumPy dtype; "datetime64[us]" marks int8 epoch-microsecond columns
+BatchSchema = Dict[str, str]
+RecordBatch = Dict[str, np.ndarray]
+
+BOOK_TICKER_BATCH_SCHEMA: BatchSchema = {
+    'timestamp': 'datetime64[us]',
+    'bid_price': 'float64',
+    'bid_qty': 'float64',
+    'ask_price': 'float64',
+    'ask_qty': 'float64',
+}
+
+# Book ticker rows with their exchange/symbol labels (multi-symbol reads)
+BOOK_TICKER_FRAME_SCHEMA: BatchSchema = {
+    'timestamp': 'datetime64[us]',
+    'exchange': 'object',
+    'symbol_base': 'object',
+    'symbol_quote': 'object',
+    'bid_price': 'float64',
+    'bid_qty': 'float64',
+    'ask_price': 'float64',
+    'ask_qty': 'float64',
+}
+
+TRADE_BATCH_SCHEMA: BatchSchema = {
+    'timestamp': 'datetime64[us]',
+    'price': 'float64',
+    'quantity': 'float64',
+    'quote_quantity': 'float64',
+    'side': 'int8',          # 1 = buy, -1 = sell
+    'is_buyer': 'bool',
+    'is_maker': 'bool',
+    'trade_id': 'object',
+}
+
+BALANCE_BATCH_SCHEMA: BatchSchema = {
+    'timestamp': 'datetime64[us]',
+    'available_balance': 'float64',
+    'locked_balance': 'float64',
+    'frozen_balance': 'float64',
+    'borrowing_balance': 'float64',
+    'interest_balance': 'float64',
+}
+
+# Per-side level arrays of orderbook_depth_snapshots, in select order
+DEPTH_LEVEL_COLUMNS = ('bid_prices', 'bid_sizes', 'ask_prices', 'ask_sizes')
+
+# depth_records_to_matrices() output; level columns are (n, levels) matrices
+DEPTH_BATCH_SCHEMA: BatchSchema = {
+    'timestamp': 'datetime64[us]',
+    **{name: 'float64' for name in DEPTH_LEVEL_COLUMNS},
+}
+
+
+def epoch_us_sql(column: str) -> str:
+    """SQL expression selecting a timestamptz column as int8 epoch microseconds."""
+    return f"(EXTRACT(EPOCH FROM {column}) * 1000000)::int8"
+
+
+def records_to_arrays(rows: Sequence[Sequence[Any]], schema: BatchSchema) -> RecordBatch:
+    """
+    Convert a batch of records into NumPy columns.
+
+    Rows are positional: column i of each record maps to the i-th schema entry.
+
+    Args:
+        rows: asyncpg.Record batch (or any sequence of tuples)
+        schema: Ordered column name -> dtype mapping
+
+    Returns:
+        Dictionary of column name -> 1-D NumPy array of len(rows)
+    """
+    count = len(rows)
+    batch: RecordBatch = {}
+
+    for idx, (name, dtype) in enumerate(schema.items()):
+        if dtype == 'datetime64[us]':
+            batch[name] = np.fromiter((row[idx] for row in rows), dtype=np.int64, count=count).view(dtype)
+        elif dtype == 'object':
+            column = np.empty(count, dtype=object)
+            column[:] = [row[idx] for row in rows]
+            batch[name] = column
+        else:
+            batch[name] = np.fromiter((row[idx] for row in rows), dtype=dtype, count=count)
+
+    return batch
+
+
+def depth_records_to_matrices(rows: Sequence[Sequence[Any]], levels: int) -> RecordBatch:
+    """
+    Convert array-encoded depth rows into fixed-width level matrices.
+    
+    Rows are (epoch_us, bid_prices, bid_sizes, ask_prices, ask_sizes). Books
+    shallower than `levels` are padded with NaN; deeper books are truncated.
+    
+    Args:
+        rows: Depth records from orderbook_depth_snapshots
+        levels: Number of level columns in the output
+        
+    Returns:
+        Dictionary with 'timestamp' (datetime64[us], shape (n,)) and
+        'bid_prices', 'bid_sizes', 'ask_prices', 'ask_sizes' (float64, shape (n, levels))
+    """
+    count = len(rows)
+    batch: RecordBatch = {
+        'timestamp': np.fromiter((row[0] for row in rows), dtype=np.int64, count=count).view('datetime64[us]')
+    }
+    
+    for idx, name in enumerate(DEPTH_LEVEL_COLUMNS, start=1):
+        matrix = np.full((count, levels), np.nan)
+        for i, row in enumerate(rows):
+            values = row[idx][:levels]
+            matrix[i, :len(values)] = values
+        batch[name] = matrix
+    
+    return batch
+
+
+def to_arrow(batch: RecordBatch) -> "pa.RecordBatch":
+    """Wrap NumPy columns into an Arrow RecordBatch (requires pyarrow)."""
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for Arrow record batches. Install with: pip install pyarrow")
+    return pa.RecordBatch.from_pydict(batch)
+
+
+def concat_batches(batches: List[RecordBatch], schema: BatchSchema) -> RecordBatch:
+    """Concatenate NumPy record batches column-wise (empty columns if no batches)."""
+    if not batches:
+        return {name: np.empty(0, dtype=dtype) for name, dtype in schema.items()}
+    return {name: np.concatenate([batch[name] for batch in batches]) for name in schema}
+
+
+class BatchAccumulator:
+    """
+    Append record batches into columns that grow in place.
+    
+    Replaces collecting every batch in a list and concatenating at the end, which
+    holds the batches and the concatenated copy at the same time (about twice the
+    final size). Columns are resized in place with geometric growth, so the peak is
+    the final columns plus growth slack plus one batch. 2-D columns (depth level
+    matrices) grow along the first axis.
+    
+    Columns handed out by finish() own their memory; the accumulator is not
+    reusable afterwards.
+    """
+    __slots__ = ('_schema', '_columns', '_size')
+    
+    GROWTH = 1.25
+    
+    def __init__(self, schema: BatchSchema):
+        """
+        Args:
+            schema: Ordered column name -> dtype mapping of the appended batches
+        """
+        self._schema = schema
+        self._columns: Optional[RecordBatch] = None
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def append(self, batch: RecordBatch) -> None:
+        """Copy one batch into the columns (the batch can be released afterwards)."""
+        count = len(next(iter(batch.values()))) if batch else 0
+        if count == 0:
+            return
+        
+        needed = self._size + count
+        if self._columns is None:
+            self._columns = {
+                name: np.empty((needed,) + batch[name].shape[1:], dtype=dtype)
+                for name, dtype in self._schema.items()
+            }
+        elif needed > len(next(iter(self._columns.values()))):
+            capacity = max(needed, int(needed * self.GROWTH))
+            for column in self._columns.values():
+                # No views of the columns exist before finish(), so skip the refcount check
+                column.resize((capacity,) + column.shape[1:], refcheck=False)
+        
+        for name, column in self._columns.items():
+            column[self._size:needed] = batch[name]
+        self._size = needed
+    
+    def finish(self) -> RecordBatch:
+        """Trim the columns to the appended rows and return them."""
+        if self._columns is None:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in self._schema.items()}
+        
+        for column in self._columns.values():
+            column.resize((self._size,) + column.shape[1:], refcheck=False)
+        columns, self._columns = self._columns, None
+        return columns
+
+
+StreamBatch = Union[RecordBatch, "pa.RecordBatch"]
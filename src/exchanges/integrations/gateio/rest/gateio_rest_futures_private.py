@@ -258,39 +258,29 @@ class GateioPrivateFuturesRestInterface(
         stop_price: Optional[float] = None,
     ) -> Order:
         """
-        Modify order: Gate.io historically lacks universal amend for every contract.
-        Implement as cancel + place new (safe fallback), consistent with Spot implementation approach.
-        """
-        try:
-            # Get existing order to preserve some fields
-            existing = await self.get_order(symbol, order_id)
-
-            # Cancel original
-            await self.cancel_order(symbol, order_id)
+        Amend open futures order in place. PUT /futures/usdt/orders/{id}
 
-            # Build new order parameters: prefer caller-provided, otherwise reuse existing
-            new_amount = qunatity if qunatity is not None else existing.quantity
-            new_price = price if price is not None else existing.price
-            new_tif = (
-                time_in_force if time_in_force is not None else existing.time_in_force
-            )
+        Only size (contracts, including the filled part) and price can be amended;
+        the order ID is kept, so there is no window without a resting order.
+        """
+        if qunatity is None and price is None:
+            raise ValueError("Either size or price is required to amend an order")
 
-            new_order = await self.place_order(
-                symbol=symbol,
-                side=existing.side,
-                order_type=existing.order_type,
-                quantity=new_amount,
-                price=new_price,
-                quote_quantity=quote_quantity,
-                time_in_force=new_tif,
-                stop_price=stop_price,
-            )
+        payload: Dict[str, Any] = {}
+        if qunatity is not None:
+            payload["size"] = int(qunatity)
+        if price is not None:
+            payload["price"] = format_price(price)
 
-            self.logger.info(
-                f"Modified futures order {order_id} -> new order {new_order.order_id}"
-            )
-            return new_order
+        try:
+            endpoint = f"/futures/usdt/orders/{order_id}"
+            response = await self.request(HTTPMethod.PUT, endpoint, data=payload)
+            order = rest_futures_to_order(response)
+            self.logger.info(f"Amended futures order {order_id}")
+            return order
 
+        except OrderNotFoundError:
+            raise
         except Exception as e:
             self.logger.error(f"Failed to modify futures order {order_id}: {e}")
             raise ExchangeRestError(500, f"Futures modify order failed: {str(e)}")
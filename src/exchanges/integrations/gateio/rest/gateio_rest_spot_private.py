@@ -458,28 +458,46 @@ class GateioPrivateSpotRestInterface(GateioBaseSpotRestInterface, PrivateSpotRes
         stop_price: Optional[float] = None
     ) -> Order:
         """
-        Modify an existing order (if supported).
-        
-        Note: Gate.io doesn't support order modification directly.
-        This method cancels the original order and places a new one.
-        
+        Amend price or amount of an open order in place (single call, order ID is kept).
+
+        https://www.gate.com/docs/developers/apiv4/en/#amend-single-order
+
         Args:
             symbol: Trading symbol
             order_id: Order ID to modify
             qunatity: New order amount
             price: New order price
-            quote_quantity: New quote quantity
-            time_in_force: New time in force
-            stop_price: New stop price (not used)
-            
+            quote_quantity: Not supported by amend
+            time_in_force: Not supported by amend
+            stop_price: Not supported by amend
+
         Returns:
-            New Order object
-            
+            Amended Order object
+
         Raises:
             ExchangeAPIError: If modification fails
         """
-        # TODO: implement modify order with single call
-        # https://www.gate.com/docs/developers/apiv4/en/#amend-single-order
+        if qunatity is None and price is None:
+            raise ValueError("Either amount or price is required to amend an order")
+
+        pair = GateioSpotSymbol.to_pair(symbol)
+        payload = {'currency_pair': pair}
+        if qunatity is not None:
+            payload['amount'] = str(qunatity)
+        if price is not None:
+            payload['price'] = str(price)
+
+        response_data = await self.request(
+            HTTPMethod.PATCH,
+            f'/spot/orders/{order_id}',
+            params={'currency_pair': pair},
+            data=payload
+        )
+
+        order = rest_spot_to_order(response_data)
+
+        self.logger.info(f"Amended order: {order_id}")
+        return order
 
     async def get_currency_info(self) -> Dict[AssetName, AssetInfo]:
         """
@@ -222,6 +222,10 @@ class GateioPrivateSpotWebsocket(GateioBaseWebsocket, PrivateBaseWebsocket):
                 quote_quantity=price * quantity,
                 side=to_side(trade_data.get('side', 'buy')),
                 timestamp=timestamp,
+                trade_id=str(trade_data['id']) if 'id' in trade_data else None,
+                order_id=OrderId(str(trade_data['order_id'])) if 'order_id' in trade_data else None,
+                fee=float(trade_data['fee']) if trade_data.get('fee') else None,
+                fee_asset=trade_data.get('fee_currency'),
                 is_maker=trade_data.get('role', '') == 'maker'  # May not be available in public trades
             )
 
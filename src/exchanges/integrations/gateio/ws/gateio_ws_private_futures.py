@@ -287,6 +287,9 @@ class GateioPrivateFuturesWebsocket(GateioBaseWebsocket, PrivateBaseWebsocket):
                     quote_quantity=price * quantity,
                     side=side,
                     timestamp=int(timestamp),
+                    trade_id=str(trade_data['id']) if 'id' in trade_data else None,
+                    order_id=OrderId(str(trade_data['order_id'])) if 'order_id' in trade_data else None,
+                    fee=float(trade_data['fee']) if trade_data.get('fee') else None,
                     is_maker=trade_data.get('role', '') == 'maker'  # May not be available
                 )
 
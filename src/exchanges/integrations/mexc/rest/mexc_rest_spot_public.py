@@ -207,7 +207,8 @@ class MexcPublicSpotRestInterface(MexcBaseRestInterface, PublicSpotRestInterface
             symbol=symbol,
             bids=bids,
             asks=asks,
-            timestamp=int(time.time())
+            timestamp=int(time.time()),
+            last_update_id=orderbook_data.lastUpdateId
         )
     
     async def get_recent_trades(self, symbol: Symbol, limit: int = 500) -> List[Trade]:
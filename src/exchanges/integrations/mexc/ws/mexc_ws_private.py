@@ -41,7 +41,7 @@ from websockets import connect
 
 from infrastructure.networking.websocket.structs import SubscriptionAction, WebsocketChannelType, \
     PrivateWebsocketChannelType
-from utils import safe_cancel_task, get_current_timestamp
+from utils import safe_cancel_task
 from exchanges.integrations.mexc.utils import from_subscription_action, _WS_ORDER_STATUS_MAPPING, _WS_ORDER_TYPE_MAPPING
 from exchanges.integrations.mexc.ws.protobuf_parser import MexcProtobufParser
 from exchanges.integrations.mexc.services.symbol_mapper import MexcSymbol
@@ -275,7 +275,11 @@ class MexcPrivateSpotWebsocket(PrivateBaseWebsocket):
                         quantity=float(deal_data.quantity) if hasattr(deal_data, 'quantity') else 0.0,
                         timestamp=int(getattr(deal_data, 'time', 0)),
                         side=Side.BUY if order_side == 1 else Side.SELL,
-                        trade_id=str(getattr(deal_data, 'time', get_current_timestamp()))  # Use timestamp as trade ID
+                        trade_id=getattr(deal_data, 'tradeId', '') or None,
+                        order_id=getattr(deal_data, 'orderId', '') or None,
+                        fee=float(deal_data.feeAmount) if getattr(deal_data, 'feeAmount', '') else None,
+                        fee_asset=getattr(deal_data, 'feeCurrency', '') or None,
+                        is_maker=bool(getattr(deal_data, 'isMaker', False))
                     )
 
                     await self._exec_bound_handler(PrivateWebsocketChannelType.EXECUTION, trade)
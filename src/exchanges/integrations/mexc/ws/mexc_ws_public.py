@@ -170,11 +170,14 @@ class MexcPublicSpotWebsocket(PublicBaseWebsocket):
                     size=float(ask_item.quantity)
                 ))
 
+            # Version range of the diff, checked against the REST snapshot's lastUpdateId
             orderbook = OrderBook(
                 symbol=symbol,
                 bids=bids,
                 asks=asks,
-                timestamp=get_current_timestamp()
+                timestamp=get_current_timestamp(),
+                first_update_id=int(depth_data.fromVersion) if depth_data.fromVersion else None,
+                last_update_id=int(depth_data.toVersion) if depth_data.toVersion else None
             )
             await self._exec_bound_handler(PublicWebsocketChannelType.ORDERBOOK, orderbook)
 
@@ -0,0 +1,535 @@
+"""
+Balance Ledger
+
+Incremental balance and position accounting for private composites, fed by
+private WebSocket events.
+
+Balances used to be refetched in full over REST (BalanceSyncMixin) and PnL
+recomputed from stored strategy state. The ledger instead applies every event
+as a delta:
+
+- executions move base/quote totals (spot) or realize PnL into the settlement
+  asset (futures); fees are charged to the fee asset (quote if not reported)
+- open spot orders lock their remaining notional; available = total - locked
+- transfers (withdrawals, credited deposits) adjust the asset total
+- per-symbol positions keep signed quantity, average price, running realized
+  PnL and unrealized PnL at the last marked price
+
+Exchange-reported balances (REST or the private BALANCE stream) are a
+reconciliation source, not the state: reconcile() reports per-asset drift
+without touching the ledger. apply_exchange_balances() is the correction path
+used by the composite:
+
+- on first load or after a stream gap (the ledger is marked stale) a complete
+  REST snapshot is adopted as the new baseline
+- an asset drifting on `adopt_after` consecutive reports takes the reported
+  total (deposits, funding payments, manual transfers and other changes that
+  produce no execution); a single drifting report is usually a race with
+  stream events and is only reported
+- futures margin (locked) is always taken from the latest report
+
+Ledger state is persistable: snapshot() returns a msgspec-encodable
+LedgerSnapshot, from_snapshot() / BasePrivateComposite.restore_ledger() load
+it. A strategy saves `exchange.ledger.snapshot()` with its persisted context
+and restores it before the composite initializes, so positions, realized PnL
+and order locks survive restarts. A restored ledger is stale: totals are
+re-baselined by the first REST snapshot.
+
+With record=True every applied event is kept as a msgspec-encodable
+LedgerEvent so a session can be replayed (replay()) in tests.
+
+Usage:
+    ledger = BalanceLedger()
+    ledger.load(rest_balances)            # baseline
+    ledger.apply_order(order)             # ORDER event
+    ledger.apply_trade(trade)             # EXECUTION event
+    drift, adopted = ledger.apply_exchange_balances(rest_balances)
+"""
+
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from msgspec import Struct
+
+from exchanges.structs.common import AssetBalance, Order, Symbol, Trade
+from exchanges.structs.enums import OrderType, Side
+from exchanges.structs.types import AssetName, OrderId
+from utils.exchange_utils import is_order_done
+from utils.time_utils import get_current_timestamp
+
+# Quantities below this are treated as zero (closed position, released lock)
+QTY_EPSILON = 1e-12
+
+
+# =============================================================================
+# State structs
+# =============================================================================
+
+class OrderLock(Struct):
+    """Funds reserved by an open spot order."""
+    asset: AssetName
+    amount: float
+
+
+class LedgerPosition(Struct):
+    """Signed position of one symbol built from executions."""
+    symbol: Symbol
+    qty: float = 0.0               # Signed base quantity (negative = short)
+    avg_price: float = 0.0
+    realized_pnl: float = 0.0      # In quote asset, before fees
+    fees: float = 0.0              # In quote asset (fees charged in quote only)
+    mark_price: Optional[float] = None
+
+    @property
+    def unrealized_pnl(self) -> float:
+        if self.mark_price is None or abs(self.qty) < QTY_EPSILON:
+            return 0.0
+        return (self.mark_price - self.avg_price) * self.qty
+
+    def apply(self, side: Side, quantity: float, price: float) -> float:
+        """Apply an execution.
+
+        Returns:
+            Realized PnL of the closed part (0.0 when the position grows)
+        """
+        signed = quantity if side == Side.BUY else -quantity
+        if abs(self.qty) < QTY_EPSILON or (self.qty > 0) == (signed > 0):
+            new_qty = self.qty + signed
+            self.avg_price = (abs(self.qty) * self.avg_price + quantity * price) / abs(new_qty)
+            self.qty = new_qty
+            return 0.0
+
+        closed = min(quantity, abs(self.qty))
+        realized = (price - self.avg_price) * closed * (1.0 if self.qty > 0 else -1.0)
+        self.realized_pnl += realized
+        remaining = self.qty + signed
+        if abs(remaining) < QTY_EPSILON:
+            self.qty, self.avg_price = 0.0, 0.0
+        else:
+            if (remaining > 0) != (self.qty > 0):
+                self.avg_price = price    # Flipped: the rest opens at the execution price
+            self.qty = remaining
+        return realized
+
+
+class BalanceDrift(Struct, frozen=True):
+    """Difference between the ledger and an exchange-reported balance."""
+    asset: AssetName
+    ledger_total: float
+    exchange_total: float
+
+    @property
+    def difference(self) -> float:
+        return self.exchange_total - self.ledger_total
+
+    def __str__(self):
+        return f"{self.asset}: ledger {self.ledger_total} vs exchange {self.exchange_total} ({self.difference:+})"
+
+
+class LedgerSnapshot(Struct):
+    """Persistable ledger state."""
+    is_futures: bool
+    totals: Dict[AssetName, float]
+    external_locked: Dict[AssetName, float]
+    order_locks: Dict[OrderId, OrderLock]
+    positions: List[LedgerPosition]
+    timestamp: int
+
+
+# =============================================================================
+# Recorded events (replay)
+# =============================================================================
+
+class BalancesLoaded(Struct, tag='balances'):
+    balances: List[AssetBalance]
+
+
+class BalancesReported(Struct, tag='reported'):
+    balances: List[AssetBalance]
+    complete: bool = True
+
+
+class OrderApplied(Struct, tag='order'):
+    order: Order
+
+
+class TradeApplied(Struct, tag='trade'):
+    trade: Trade
+
+
+class TransferApplied(Struct, tag='transfer'):
+    asset: AssetName
+    amount: float
+
+
+class PriceMarked(Struct, tag='mark'):
+    symbol: Symbol
+    price: float
+
+
+LedgerEvent = Union[BalancesLoaded, BalancesReported, OrderApplied, TradeApplied, TransferApplied, PriceMarked]
+
+
+# =============================================================================
+# Ledger
+# =============================================================================
+
+class BalanceLedger:
+    """In-memory balances and positions maintained from private stream deltas."""
+
+    def __init__(self, is_futures: bool = False,
+                 abs_tolerance: float = 1e-8,
+                 rel_tolerance: float = 1e-6,
+                 max_trade_ids: int = 10000,
+                 adopt_after: int = 2,
+                 record: bool = False):
+        """
+        Args:
+            is_futures: Futures account (executions realize PnL into the settlement asset,
+                        margin is taken from exchange-reported balances)
+            abs_tolerance: Absolute difference tolerated by reconcile()
+            rel_tolerance: Relative difference tolerated by reconcile()
+            max_trade_ids: Trade ids remembered for deduplication
+            adopt_after: Consecutive drifting reports of an asset before its reported total is adopted
+            record: Keep applied events for replay
+        """
+        if adopt_after < 1:
+            raise ValueError(f"adopt_after must be positive, got {adopt_after}")
+        self.is_futures = bool(is_futures)
+        self.abs_tolerance = abs_tolerance
+        self.rel_tolerance = rel_tolerance
+        self.max_trade_ids = max_trade_ids
+        self.adopt_after = adopt_after
+
+        self._totals: Dict[AssetName, float] = {}
+        # Locked funds not attributed to known orders (futures margin)
+        self._external_locked: Dict[AssetName, float] = {}
+        self._order_locks: Dict[OrderId, OrderLock] = {}
+        self._locked: Dict[AssetName, float] = {}          # Sum of order locks per asset
+        self._positions: Dict[Symbol, LedgerPosition] = {}
+
+        self._trade_ids: Set[str] = set()
+        self._trade_id_order: Deque[str] = deque()
+
+        self.events: Optional[List[LedgerEvent]] = [] if record else None
+        self.last_drift: List[BalanceDrift] = []
+        # Consecutive drifting reports per asset
+        self._drift_counts: Dict[AssetName, int] = {}
+
+        # False until a REST baseline was adopted (and again after a stream gap)
+        self.synced = False
+
+    # -------------------------------------------------------------------------
+    # Balances
+    # -------------------------------------------------------------------------
+
+    def get_balance(self, asset: AssetName) -> AssetBalance:
+        total = self._totals.get(asset, 0.0)
+        locked = min(self._external_locked.get(asset, 0.0) + self._locked.get(asset, 0.0), max(total, 0.0))
+        return AssetBalance(asset=asset, available=total - locked, locked=locked)
+
+    @property
+    def balances(self) -> Dict[AssetName, AssetBalance]:
+        return {asset: self.get_balance(asset) for asset in self._totals}
+
+    def total(self, asset: AssetName) -> float:
+        return self._totals.get(asset, 0.0)
+
+    # -------------------------------------------------------------------------
+    # Positions and PnL
+    # -------------------------------------------------------------------------
+
+    def get_position(self, symbol: Symbol) -> Optional[LedgerPosition]:
+        return self._positions.get(symbol)
+
+    @property
+    def positions(self) -> List[LedgerPosition]:
+        return list(self._positions.values())
+
+    @property
+    def realized_pnl(self) -> float:
+        return sum(position.realized_pnl for position in self._positions.values())
+
+    @property
+    def unrealized_pnl(self) -> float:
+        return sum(position.unrealized_pnl for position in self._positions.values())
+
+    def mark(self, symbol: Symbol, price: float) -> float:
+        """Update the mark price of a position.
+
+        Returns:
+            Unrealized PnL of the symbol at `price`
+        """
+        self._record(PriceMarked(symbol=symbol, price=price))
+        position = self._positions.get(symbol)
+        if position is None:
+            return 0.0
+        position.mark_price = price
+        return position.unrealized_pnl
+
+    # -------------------------------------------------------------------------
+    # Events
+    # -------------------------------------------------------------------------
+
+    def load(self, balances: Iterable[AssetBalance]) -> List[BalanceDrift]:
+        """Adopt a REST balance snapshot as the new baseline.
+
+        Returns:
+            Drift of the previous ledger state against the snapshot (empty on first load)
+        """
+        balances = list(balances)
+        drift = self.reconcile(balances) if self._totals else []
+        self._record(BalancesLoaded(balances=balances))
+
+        self._totals = {balance.asset: balance.total for balance in balances}
+        if self.is_futures:
+            self._take_margin(balances, complete=True)
+        self._drift_counts.clear()
+        self.synced = True
+        return drift
+
+    def apply_exchange_balances(self, balances: Iterable[AssetBalance],
+                                complete: bool = True) -> Tuple[List[BalanceDrift], List[AssetName]]:
+        """Reconcile exchange-reported balances and correct the ledger where it stays wrong.
+
+        Args:
+            balances: Exchange-reported balances (REST snapshot or BALANCE stream event)
+            complete: Full account snapshot (see reconcile()); partial reports are
+                      ignored while the ledger is not synced
+
+        Returns:
+            (drift against the report, assets whose reported total was adopted)
+        """
+        balances = list(balances)
+        if not self.synced:
+            if not complete:
+                return [], []
+            return self.load(balances), [balance.asset for balance in balances]
+        self._record(BalancesReported(balances=balances, complete=complete))
+
+        if self.is_futures:
+            self._take_margin(balances, complete)
+
+        drift = self.reconcile(balances, complete)
+        drifting = {d.asset: d for d in drift}
+        reported = list(self._drift_counts) if complete else [balance.asset for balance in balances]
+        for asset in reported:
+            if asset not in drifting:
+                self._drift_counts.pop(asset, None)
+
+        adopted = []
+        for asset, d in drifting.items():
+            count = self._drift_counts[asset] = self._drift_counts.get(asset, 0) + 1
+            if count >= self.adopt_after:
+                self._totals[asset] = d.exchange_total
+                del self._drift_counts[asset]
+                adopted.append(asset)
+        return drift, adopted
+
+    def apply_order(self, order: Order) -> None:
+        """Track funds locked by an open spot order (ORDER event / REST reply)."""
+        if self.is_futures:
+            return
+        self._record(OrderApplied(order=order))
+
+        self._release(order.order_id)
+        if is_order_done(order) or order.order_type != OrderType.LIMIT or not order.price:
+            return
+
+        remaining = order.remaining_quantity
+        if remaining is None:
+            remaining = order.quantity - order.filled_quantity
+        if remaining <= QTY_EPSILON:
+            return
+        if order.side == Side.BUY:
+            self._lock(order.order_id, order.symbol.quote, remaining * order.price)
+        else:
+            self._lock(order.order_id, order.symbol.base, remaining)
+
+    def apply_trade(self, trade: Trade) -> bool:
+        """Apply an execution (EXECUTION event, quantity in base asset).
+
+        Returns:
+            False if the execution was already applied
+        """
+        if trade.trade_id:
+            if trade.trade_id in self._trade_ids:
+                return False
+            self._remember_trade(trade.trade_id)
+        self._record(TradeApplied(trade=trade))
+
+        symbol, quantity, price = trade.symbol, trade.quantity, trade.price
+        position = self._positions.get(symbol)
+        if position is None:
+            position = self._positions[symbol] = LedgerPosition(symbol=symbol)
+        realized = position.apply(trade.side, quantity, price)
+
+        if self.is_futures:
+            self._add(symbol.quote, realized)
+        else:
+            notional = trade.quote_quantity if trade.quote_quantity is not None else quantity * price
+            if trade.side == Side.BUY:
+                self._add(symbol.base, quantity)
+                self._add(symbol.quote, -notional)
+            else:
+                self._add(symbol.base, -quantity)
+                self._add(symbol.quote, notional)
+            self._consume_lock(trade)
+
+        if trade.fee:
+            fee_asset = trade.fee_asset or symbol.quote
+            self._add(fee_asset, -trade.fee)
+            if fee_asset == symbol.quote:
+                position.fees += trade.fee
+        return True
+
+    def apply_transfer(self, asset: AssetName, amount: float) -> None:
+        """Apply a transfer: positive for credited deposits, negative for withdrawals (incl. fee)."""
+        self._record(TransferApplied(asset=asset, amount=amount))
+        self._add(asset, amount)
+
+    def mark_stale(self) -> None:
+        """Stream gap: events may be missing, adopt the next REST snapshot."""
+        self.synced = False
+
+    # -------------------------------------------------------------------------
+    # Reconciliation
+    # -------------------------------------------------------------------------
+
+    def reconcile(self, balances: Iterable[AssetBalance], complete: bool = True) -> List[BalanceDrift]:
+        """Compare exchange-reported balances with the ledger (ledger unchanged).
+
+        Args:
+            balances: Exchange-reported balances
+            complete: Full account snapshot: assets missing from `balances` are
+                      compared as zero and `last_drift` is updated. False for
+                      single-asset reports (BALANCE stream events).
+
+        Returns:
+            Assets whose totals differ beyond tolerance
+        """
+        reported = {balance.asset: balance.total for balance in balances}
+        assets = reported.keys() | self._totals.keys() if complete else reported.keys()
+        drift = []
+        for asset in sorted(assets):
+            ledger_total = self._totals.get(asset, 0.0)
+            exchange_total = reported.get(asset, 0.0)
+            tolerance = self.abs_tolerance + self.rel_tolerance * max(abs(ledger_total), abs(exchange_total))
+            if abs(exchange_total - ledger_total) > tolerance:
+                drift.append(BalanceDrift(asset=asset, ledger_total=ledger_total, exchange_total=exchange_total))
+        if complete:
+            self.last_drift = drift
+        return drift
+
+    # -------------------------------------------------------------------------
+    # Persistence and replay
+    # -------------------------------------------------------------------------
+
+    def snapshot(self) -> LedgerSnapshot:
+        return LedgerSnapshot(
+            is_futures=self.is_futures,
+            totals=dict(self._totals),
+            external_locked=dict(self._external_locked),
+            order_locks={order_id: OrderLock(asset=lock.asset, amount=lock.amount)
+                         for order_id, lock in self._order_locks.items()},
+            positions=[LedgerPosition(symbol=p.symbol, qty=p.qty, avg_price=p.avg_price,
+                                      realized_pnl=p.realized_pnl, fees=p.fees, mark_price=p.mark_price)
+                       for p in self._positions.values()],
+            timestamp=get_current_timestamp(),
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: LedgerSnapshot, **kwargs) -> 'BalanceLedger':
+        """Restore a ledger from a persisted snapshot.
+
+        The restored ledger is stale (events were missed while it was not
+        running): the next complete REST snapshot re-baselines the totals.
+        """
+        ledger = cls(is_futures=snapshot.is_futures, **kwargs)
+        ledger._totals = dict(snapshot.totals)
+        ledger._external_locked = dict(snapshot.external_locked)
+        for order_id, lock in snapshot.order_locks.items():
+            ledger._lock(order_id, lock.asset, lock.amount)
+        ledger._positions = {position.symbol: position for position in snapshot.positions}
+        return ledger
+
+    @classmethod
+    def replay(cls, events: Iterable[LedgerEvent], **kwargs) -> 'BalanceLedger':
+        """Rebuild a ledger from recorded events."""
+        ledger = cls(**kwargs)
+        for event in events:
+            ledger.apply_event(event)
+        return ledger
+
+    def apply_event(self, event: LedgerEvent) -> None:
+        if isinstance(event, TradeApplied):
+            self.apply_trade(event.trade)
+        elif isinstance(event, OrderApplied):
+            self.apply_order(event.order)
+        elif isinstance(event, TransferApplied):
+            self.apply_transfer(event.asset, event.amount)
+        elif isinstance(event, PriceMarked):
+            self.mark(event.symbol, event.price)
+        elif isinstance(event, BalancesLoaded):
+            self.load(event.balances)
+        elif isinstance(event, BalancesReported):
+            self.apply_exchange_balances(event.balances, event.complete)
+        else:
+            raise ValueError(f"Unknown ledger event: {event!r}")
+
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
+
+    def _record(self, event: LedgerEvent) -> None:
+        if self.events is not None:
+            self.events.append(event)
+
+    def _take_margin(self, balances: List[AssetBalance], complete: bool) -> None:
+        """Futures: locked funds (margin) as reported by the exchange."""
+        if complete:
+            self._external_locked.clear()
+        for balance in balances:
+            if balance.locked:
+                self._external_locked[balance.asset] = balance.locked
+            else:
+                self._external_locked.pop(balance.asset, None)
+
+    def _add(self, asset: AssetName, amount: float) -> None:
+        if amount:
+            self._totals[asset] = self._totals.get(asset, 0.0) + amount
+
+    def _lock(self, order_id: OrderId, asset: AssetName, amount: float) -> None:
+        self._order_locks[order_id] = OrderLock(asset=asset, amount=amount)
+        self._locked[asset] = self._locked.get(asset, 0.0) + amount
+
+    def _release(self, order_id: OrderId) -> None:
+        lock = self._order_locks.pop(order_id, None)
+        if lock is not None:
+            self._adjust_locked(lock.asset, -lock.amount)
+
+    def _consume_lock(self, trade: Trade) -> None:
+        """Release the part of the order lock the execution used (before the ORDER event)."""
+        lock = self._order_locks.get(trade.order_id) if trade.order_id else None
+        if lock is None:
+            return
+        # Buy locks are in quote at the order price: the execution price is only an estimate
+        used = trade.quantity if lock.asset == trade.symbol.base else trade.quantity * trade.price
+        used = min(used, lock.amount)
+        lock.amount -= used
+        self._adjust_locked(lock.asset, -used)
+        if lock.amount <= QTY_EPSILON:
+            self._release(trade.order_id)
+
+    def _adjust_locked(self, asset: AssetName, amount: float) -> None:
+        locked = self._locked.get(asset, 0.0) + amount
+        if locked <= QTY_EPSILON:
+            self._locked.pop(asset, None)
+        else:
+            self._locked[asset] = locked
+
+    def _remember_trade(self, trade_id: str) -> None:
+        self._trade_ids.add(trade_id)
+        self._trade_id_order.append(trade_id)
+        if len(self._trade_id_order) > self.max_trade_ids:
+            self._trade_ids.discard(self._trade_id_order.popleft())
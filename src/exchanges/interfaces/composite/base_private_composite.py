@@ -21,11 +21,16 @@ from infrastructure.exceptions.system import InitializationError
 from exchanges.interfaces.composite.base_composite import BaseCompositeExchange
 from exchanges.interfaces.composite.types import PrivateRestType, PrivateWebsocketType
 from exchanges.interfaces.composite.mixins import BalanceSyncMixin
+from exchanges.interfaces.composite.order_state_cache import OrderStateCache, is_order_final
+from exchanges.interfaces.composite.balance_ledger import BalanceLedger, LedgerSnapshot
 from infrastructure.logging import LoggingTimer, HFTLoggerInterface
 from utils.exchange_utils import is_order_done
 from exchanges.interfaces.common.binding import BoundHandlerInterface
 from infrastructure.networking.websocket.structs import PrivateWebsocketChannelType, WebsocketChannelType
 
+# How long to wait for the private order stream to confirm an order before falling back to REST
+ORDER_STREAM_WAIT_SECONDS = 2.0
+
 
 class BasePrivateComposite(BalanceSyncMixin,
                            BaseCompositeExchange[PrivateRestType, PrivateWebsocketType],
@@ -77,11 +82,16 @@ class BasePrivateComposite(BalanceSyncMixin,
         websocket_client.bind(PrivateWebsocketChannelType.EXECUTION, self._execution_handler)
         websocket_client.connection_loss = self.force_reload_on_ws_error
         # Private data state (HFT COMPLIANT - no caching of real-time data)
-        self._balances: Dict[AssetName, AssetBalance] = {}
+        self._balances: Dict[AssetName, AssetBalance] = {}     # Last exchange-reported (REST / BALANCE events)
         self._assets_info: Dict[AssetName, AssetInfo] = {}
-        # Unified order storage - single source of truth for all orders
-        self._orders: Dict[OrderId, Order] = {}
+        # Unified order storage - single source of truth for all orders, merged from
+        # private stream events and REST replies (see OrderStateCache)
         self._max_total_orders = 10000  # Memory management limit for total orders
+        self._order_cache = OrderStateCache(max_orders=self._max_total_orders)
+        self._orders: Dict[OrderId, Order] = self._order_cache.orders
+        self._order_stream_active = False  # ORDER channel subscribed
+        # Balances and positions maintained from stream deltas, reconciled against REST
+        self._ledger = BalanceLedger(is_futures=config.is_futures)
 
         # Balance sync configuration (now handled by BalanceSyncMixin)
         self._balance_sync_interval = balance_sync_interval
@@ -96,6 +106,10 @@ class BasePrivateComposite(BalanceSyncMixin,
     # Type-Safe Channel Publishing (Phase 1)
     # ========================================
     async def force_reload_on_ws_error(self):
+        # Order events may have been missed: REST until open orders are reconciled
+        self._order_cache.mark_stale()
+        # Executions may have been missed: adopt the next REST balance snapshot
+        self._ledger.mark_stale()
         await self.refresh_exchange_data()
 
     def publish(self, channel: PrivateWebsocketChannelType, data: Any) -> None:
@@ -144,9 +158,25 @@ class BasePrivateComposite(BalanceSyncMixin,
 
     @property
     def balances(self) -> Dict[AssetName, AssetBalance]:
-        """Get current account balances (thread-safe)."""
+        """Get current account balances (from the ledger once synced, exchange-reported before)."""
+        if self._ledger.synced:
+            return self._ledger.balances
         return self._balances.copy()
 
+    @property
+    def ledger(self) -> BalanceLedger:
+        """Balances and positions accounted from private stream events."""
+        return self._ledger
+
+    @property
+    def order_stream_live(self) -> bool:
+        """True if order state is maintained by the private stream (no gap since last reconciliation)."""
+        return self._order_stream_active and self._order_cache.synced
+
+    def _private_stream_connected(self) -> bool:
+        """True if the ORDER channel is subscribed on a connected private WebSocket."""
+        return self._order_stream_active and self._ws is not None and self._ws.is_connected()
+
     @property
     def open_orders(self) -> Dict[Symbol, List[Order]]:
         """Get current open orders (thread-safe)."""
@@ -259,7 +289,8 @@ class BasePrivateComposite(BalanceSyncMixin,
                 #                  f"qq: {quote_quantity}, price: {price}")
 
         if ensure:
-            return await self.fetch_order(symbol, order.order_id)
+            order = await self._update_order(order)
+            return await self.wait_for_fill(symbol, order.order_id)
             # # wait until order is no longer open
             # while True:
             #     await asyncio.sleep(0.1)
@@ -292,6 +323,31 @@ class BasePrivateComposite(BalanceSyncMixin,
             self.remove_order(order_id)
             return await self.fetch_order(symbol, order_id)
 
+    async def amend_order(self, symbol: Symbol, order_id: OrderId, price: float,
+                          quantity: Optional[float] = None) -> Order:
+        """
+        Amend price (and optionally quantity) of an open order in place.
+
+        Unlike cancel + place, the order keeps its ID and never leaves the book.
+
+        Args:
+            symbol: Trading symbol
+            order_id: Exchange order ID to amend
+            price: New limit price
+            quantity: Optional new quantity
+
+        Returns:
+            Amended order object
+
+        Raises:
+            NotImplementedError: If the exchange has no native amend
+            ExchangeError: If the amend fails
+        """
+        si = self.symbols_info.get(symbol)
+        quantity_ = si.round_base(quantity) if quantity is not None else None
+        order = await self._rest.modify_order(symbol, order_id, quantity_, price=si.round_quote(price))
+        return await self._update_order(order, order_id)
+
     async def fetch_order_rest(self, symbol: Symbol, order_id: OrderId) -> Order | None:
         try:
             order = await self._rest.get_order(symbol, order_id)
@@ -318,12 +374,40 @@ class BasePrivateComposite(BalanceSyncMixin,
         Raises:
             ExchangeError: If order not found or query fails
         """
+        # Terminal orders with complete fill data never change - no REST round trip
+        if self._order_cache.is_final(order_id):
+            return self._orders[order_id]
+
         # TODO: Mexc direct api doesn't provide correct prices disabled
         if self.config.exchange_enum == ExchangeEnum.MEXC:
             return await self.fetch_order_from_trades(symbol, order_id)
 
         return await self.fetch_order_rest(symbol, order_id)
 
+    async def wait_for_fill(self, symbol: Symbol, order_id: OrderId,
+                            timeout: float = ORDER_STREAM_WAIT_SECONDS) -> Order | None:
+        """
+        Wait for an order to complete, confirmed by the private order stream.
+
+        Falls back to REST (fetch_order) when the stream is not subscribed, after
+        a stream gap, or if the order did not complete within timeout.
+
+        Args:
+            symbol: Trading symbol
+            order_id: Exchange order ID
+            timeout: Seconds to wait for the stream
+
+        Returns:
+            Order object with current status
+        """
+        if self.order_stream_live:
+            order = await self._order_cache.wait_for_fill(order_id, timeout)
+            if order and is_order_final(order):
+                return order
+            self.logger.warning("Order not confirmed by stream, reconciling via REST",
+                                order_id=order_id, timeout=timeout)
+
+        return await self.fetch_order(symbol, order_id)
 
     async def fetch_order_from_trades(self, symbol: Symbol, order_id: OrderId, force = True) -> Order | None:
         """
@@ -374,8 +458,10 @@ class BasePrivateComposite(BalanceSyncMixin,
         try:
             with LoggingTimer(self.logger, "load_balances") as timer:
                 balances_data = await self._rest.get_balances()
+                self._balances = {b.asset: b for b in balances_data}
+                self._reconcile_ledger(balances_data)
                 for b in balances_data:
-                    await self._update_balance(b.asset, b)
+                    self.publish(PrivateWebsocketChannelType.BALANCE, b)
 
             self.logger.debug("Balances loaded successfully",
                               balance_count=len(balances_data),
@@ -387,6 +473,27 @@ class BasePrivateComposite(BalanceSyncMixin,
             self.logger.error("Failed to load balances", error=str(e))
             raise InitializationError(f"Balance loading failed: {e}")
 
+    def _reconcile_ledger(self, balances: List[AssetBalance], complete: bool = True) -> None:
+        """Reconcile exchange-reported balances with the ledger, correcting persistent drift.
+
+        Args:
+            balances: REST snapshot (complete) or BALANCE stream event (partial)
+            complete: Balances are a full account snapshot
+        """
+        drift, adopted = self._ledger.apply_exchange_balances(balances, complete)
+
+        if drift:
+            self.logger.warning("Balance ledger drift vs REST" if complete else "Balance ledger drift vs exchange",
+                                adopted=adopted, drift=[str(d) for d in drift])
+
+    def restore_ledger(self, snapshot: LedgerSnapshot) -> None:
+        """Restore a persisted ledger snapshot (call before initialize()).
+
+        Positions, realized PnL and order locks carry over; totals are
+        re-baselined by the first REST balance snapshot.
+        """
+        self._ledger = BalanceLedger.from_snapshot(snapshot)
+
     async  def _load_asset_info(self) -> None:
         """
         Load asset information from REST API with error handling.
@@ -436,9 +543,17 @@ class BasePrivateComposite(BalanceSyncMixin,
                         del prev_open_orders[o.order_id]
                     await self._update_order(o)
 
-                # orders that can be filled in-between reconnects, publish their updates
+                # orders that can be filled in-between reconnects: reconcile over REST, publish their updates
                 for prev_o in prev_open_orders.values():
-                    await self._update_order(prev_o)
+                    try:
+                        await self.fetch_order(prev_o.symbol, prev_o.order_id)
+                    except Exception as e:
+                        self.logger.error("Failed to reconcile order", order_id=prev_o.order_id, error=str(e))
+                        await self._update_order(prev_o)
+
+            # The stream maintains order state only once its subscription is live
+            if symbol is None and self._private_stream_connected():
+                self._order_cache.mark_synced()
 
             open_order_count = sum(1 for order in self._orders.values() if not is_order_done(order))
             self.logger.info("Open orders loaded",
@@ -473,6 +588,17 @@ class BasePrivateComposite(BalanceSyncMixin,
         """
         return self._orders.get(order_id)
 
+    def get_order_by_client_id(self, client_order_id: str) -> Optional[Order]:
+        """Get order by client order ID from unified storage.
+
+        Args:
+            client_order_id: Client order identifier
+
+        Returns:
+            Order object if found, None otherwise
+        """
+        return self._order_cache.get_by_client_id(client_order_id)
+
     def remove_order(self, order_id: OrderId) -> bool:
         """Remove order by ID from unified storage.
         
@@ -482,24 +608,35 @@ class BasePrivateComposite(BalanceSyncMixin,
         Returns:
             True if order was removed, False if not found
         """
-        if order_id in self._orders:
-            del self._orders[order_id]
+        if self._order_cache.remove(order_id):
             self.logger.info("🔲 Order removed from storage", order_id=order_id)
             return True
         return False
 
-    async def _update_order(self, order: Order | None, order_id: OrderId | None = None) -> Order | None:
+    async def _update_order(self, order: Order | None, order_id: OrderId | None = None,
+                            from_rest: bool = True) -> Order | None:
         """Update order in unified storage.
         
         Args:
             order: Order object to store/update
+            order_id: Requested order ID (for logging when no order was returned)
+            from_rest: False for private stream events
+
+        Returns:
+            Current order state (the stored one if the update was stale)
         """
         # Store in unified storage
         if not order:
             self.logger.warning("No order provided for update", order_id=order_id)
             return None
 
-        self._orders[order.order_id] = order
+        order, applied = self._order_cache.update(order, from_rest=from_rest)
+        if not applied:
+            # Older than the stored state (reordered event or stale REST reply)
+            self.logger.debug("Stale order update ignored", order_id=order.order_id, status=order.status.name)
+            return order
+
+        self._ledger.apply_order(order)
 
         # Log status appropriately
         if is_order_done(order):
@@ -551,12 +688,15 @@ class BasePrivateComposite(BalanceSyncMixin,
 
         Args:
             asset: Asset symbol
-            force: If True, bypass cache and fetch from REST
+            force: If True, bypass the ledger and return the exchange-reported REST balance
+                   (also reconciled into the ledger)
 
         Returns:
             AssetBalance object if found, None otherwise
         """
-        # Step 1: Check local cache first
+        # Step 1: Ledger, or the exchange-reported cache until it is synced
+        if self._ledger.synced and not force:
+            return self._ledger.get_balance(asset)
         if asset in self._balances and not force:
             return self._balances.get(asset, AssetBalance(asset=asset, available=0.0, locked=0.0))
 
@@ -608,6 +748,11 @@ class BasePrivateComposite(BalanceSyncMixin,
                 self.logger.info(f"{self._tag} Initializing WebSocket client...")
                 await self._ws.initialize()
                 await self._ws.subscribe(channels)
+                self._order_stream_active = PrivateWebsocketChannelType.ORDER in channels
+
+                # Orders loaded above predate the subscription: reconcile once it is live
+                if self._order_stream_active and await self._ws.wait_until_connected():
+                    await self._load_open_orders()
 
             else:
                 self.logger.info(f"{self._tag} No WebSocket client available - skipping WebSocket initialization")
@@ -615,7 +760,7 @@ class BasePrivateComposite(BalanceSyncMixin,
             self.logger.info(f"{self._tag} private initialization completed",
                              has_rest=self._rest is not None,
                              has_ws=self._ws is not None,
-                             balance_count=len(self._balances),
+                             balance_count=len(self.balances),
                              order_count=sum(1 for order in self._orders.values() if not is_order_done(order)))
 
         except Exception as e:
@@ -629,7 +774,7 @@ class BasePrivateComposite(BalanceSyncMixin,
 
     async def _order_handler(self, order: Order) -> None:
         """Handle order update event."""
-        o = await self._update_order(order)
+        o = await self._update_order(order, from_rest=False)
         self.logger.info("order update processed", order_id=order.order_id, order=str(o))
 
     async def _balance_handler(self, balance: AssetBalance) -> None:
@@ -649,6 +794,15 @@ class BasePrivateComposite(BalanceSyncMixin,
                          price=trade.price,
                          is_maker=trade.is_maker)
 
+        self._ledger.apply_trade(trade)
+
+        # Executions advance partially filled orders before the next order event
+        order = self._order_cache.apply_trade(trade)
+        if order:
+            self.logger.info("Order updated from execution", order_id=order.order_id,
+                             filled_quantity=order.filled_quantity, status=order.status.name)
+            self.publish(PrivateWebsocketChannelType.ORDER, order)
+
         # await self.publish('trades', trade)
 
     # Data refresh and utilities
@@ -689,8 +843,9 @@ class BasePrivateComposite(BalanceSyncMixin,
         )
 
     async def _update_balance(self, asset: AssetName, balance: AssetBalance) -> None:
-        """Update internal balance state."""
+        """Store and publish an exchange-reported balance; reconciled against the ledger."""
         self._balances[asset] = balance
+        self._reconcile_ledger([balance], complete=False)
 
         self.publish(PrivateWebsocketChannelType.BALANCE, balance)
 
@@ -395,10 +395,11 @@ class BasePublicComposite(BaseCompositeExchange[PublicRestType, PublicWebsocketT
     async def _handle_orderbook(self, orderbook: OrderBook) -> None:
         """Handle orderbook updates from WebSocket (direct data object)."""
         try:
-            self.logger.warning("ADD QUANTO MULTIPLIER TO ORDERBOOK HANDLER")
+            # NOTE: futures sizes are in contracts; subscribers scale by symbols_info quanto_multiplier
             self._update_orderbook(orderbook.symbol, orderbook, OrderbookUpdateType.DIFF)
             self._track_operation("orderbook_update")
 
+            self.publish(PublicWebsocketChannelType.ORDERBOOK, orderbook)  # Publish to streams
 
         except Exception as e:
             self.logger.error("Error handling direct orderbook", error=str(e))
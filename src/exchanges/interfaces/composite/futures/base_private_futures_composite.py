@@ -10,7 +10,7 @@ from abc import abstractmethod
 from typing import Dict, List, Optional, Any
 
 from exchanges.structs import Side
-from exchanges.structs.common import Symbol, Order, Position, SymbolsInfo, OrderId, FuturesBalance, TradingFee
+from exchanges.structs.common import Symbol, Order, Position, SymbolsInfo, OrderId, FuturesBalance, TradingFee, Trade
 from exchanges.interfaces.composite.base_private_composite import BasePrivateComposite
 from exchanges.interfaces.rest.interfaces import PrivateFuturesInterface
 from exchanges.interfaces.ws.ws_base_private import PrivateBaseWebsocket
@@ -181,6 +181,12 @@ class CompositePrivateFuturesExchange(BasePrivateComposite[PrivateFuturesInterfa
         self._positions[position.symbol] = position
         self.logger.debug(f"Updated futures position for {position.symbol}: {position}")
     
+    async def _execution_handler(self, trade: Trade) -> None:
+        """Convert execution quantity from contracts to base currency (matches _update_order)."""
+        trade.quantity = self.contracts_to_base_quantity(trade.symbol, trade.quantity)
+        trade.quote_quantity = trade.quantity * trade.price
+        await super()._execution_handler(trade)
+
     async def _futures_balance_handler(self, balance: FuturesBalance) -> None:
         """Handle futures balance updates from WebSocket with margin information."""
         self._futures_balances[balance.asset] = balance
@@ -205,7 +211,8 @@ class CompositePrivateFuturesExchange(BasePrivateComposite[PrivateFuturesInterfa
             raise ValueError(f"Symbol info or quanto multiplier not found for {symbol}")
         return contracts * symbol_info.quanto_multiplier
 
-    async def _update_order(self, order: Order | None, order_id: OrderId | None = None) -> Order | None:
+    async def _update_order(self, order: Order | None, order_id: OrderId | None = None,
+                            from_rest: bool = True) -> Order | None:
         """
         Override to adjust order quantities from contracts to base currency.
         This is necessary for futures exchanges where orders are often specified
@@ -219,7 +226,7 @@ class CompositePrivateFuturesExchange(BasePrivateComposite[PrivateFuturesInterfa
             order.remaining_quantity = self.contracts_to_base_quantity(order.symbol, order.remaining_quantity)
 
         # call base implementation to handle side effects properly
-        return await super()._update_order(order, order_id)
+        return await super()._update_order(order, order_id, from_rest)
 
     def round_base_to_contracts(self, symbol: Symbol, base_quantity: float) -> float:
         """Convert base currency quantity to contract quantity."""
@@ -238,6 +245,19 @@ class CompositePrivateFuturesExchange(BasePrivateComposite[PrivateFuturesInterfa
                                                 quantity=contracts_count, price=price,
                                                 **kwargs)
 
+    async def amend_order(self, symbol: Symbol, order_id: OrderId, price: float,
+                          quantity: Optional[float] = None) -> Order:
+        # Amend size is signed contracts (including the filled part), side must stay the same
+        symbol_info = self._symbols_info.get(symbol)
+        contracts = None
+        if quantity is not None:
+            contracts = self.round_base_to_contracts(symbol, quantity)
+            order = self.get_order(order_id)
+            if order and order.side == Side.SELL:
+                contracts = -contracts
+        order = await self._rest.modify_order(symbol, order_id, contracts, price=symbol_info.round_quote(price))
+        return await self._update_order(order, order_id)
+
     async def place_market_order(self, symbol: Symbol, side: Side,
                                  quantity: Optional[float] = None,
                                  quote_quantity: Optional[float] = None,
@@ -2,8 +2,14 @@
 Balance Sync Mixin for Private Exchange Interfaces
 
 This mixin provides automatic balance synchronization functionality for private
-exchange interfaces. It handles periodic REST API balance fetching and publishing
-balance snapshot events for data collection systems.
+exchange interfaces. It publishes periodic balance snapshot events for data
+collection systems.
+
+Balances are maintained incrementally by the composite's BalanceLedger, so
+snapshots are served from the ledger. A full REST fetch only runs every
+`balance_reconcile_every` snapshots (and while the ledger is not synced); it
+reconciles against the ledger and reports drift (included in the snapshot
+event); only drift that persists across reports corrects the ledger.
 
 Key Features:
 - Automatic balance sync with configurable intervals
@@ -36,8 +42,8 @@ class BalanceSyncMixin(ABC):
     Mixin providing automatic balance synchronization functionality.
     
     This mixin adds balance sync capabilities to private exchange interfaces:
-    - Periodic balance fetching from REST API
-    - Balance snapshot event publishing
+    - Balance snapshot event publishing from the ledger
+    - Periodic REST reconciliation
     - Configurable sync intervals
     - Error handling and recovery
     
@@ -48,11 +54,15 @@ class BalanceSyncMixin(ABC):
     - self._load_balances(): async method to load balances
     - self.balances: property returning current balances
     - self.publish(): method to publish events
+    - self.ledger: BalanceLedger reconciled by load_balances()
     """
     logger: 'HFTLoggerInterface'
     _balance_sync_interval: Optional[float]
     config: ExchangeConfig
 
+    # Snapshots between full REST reconciliations
+    balance_reconcile_every: int = 10
+
     def __init__(self, *args, **kwargs):
         """Initialize balance sync mixin state."""
         super().__init__(*args, **kwargs)
@@ -61,6 +71,7 @@ class BalanceSyncMixin(ABC):
         self._balance_sync_task: Optional[asyncio.Task] = None
         self._balance_sync_enabled = False
         self._last_balance_sync: Optional[datetime] = None
+        self._balance_syncs = 0
     
     def start_balance_sync(self) -> bool:
         """
@@ -111,14 +122,16 @@ class BalanceSyncMixin(ABC):
         """
         Main balance synchronization loop.
         
-        Fetches balances via REST and publishes balance snapshot events.
+        Publishes balance snapshot events, reconciling via REST every
+        `balance_reconcile_every` snapshots.
         """
         while self._balance_sync_enabled:
             try:
-                # Fetch balances via REST
-                await self._sync_balances_from_rest()
+                reconcile = self._balance_syncs % max(self.balance_reconcile_every, 1) == 0
+                await self._sync_balances(reconcile)
                 
                 # Update last sync time
+                self._balance_syncs += 1
                 self._last_balance_sync = datetime.now()
                 
                 # Wait for next sync
@@ -132,16 +145,17 @@ class BalanceSyncMixin(ABC):
                 # Continue running despite errors, with shorter retry interval
                 await asyncio.sleep(min(self._balance_sync_interval, 30.0))
     
-    async def _sync_balances_from_rest(self) -> None:
+    async def _sync_balances(self, reconcile: bool) -> None:
         """
-        Fetch current balances from REST API and publish balance snapshot event.
-        
-        This method fetches balances directly via REST (not WebSocket) and
-        publishes a BALANCE_SNAPSHOT event with the collected data.
+        Publish a BALANCE_SNAPSHOT event with the current balances.
+
+        Args:
+            reconcile: Fetch balances via REST first (reconciles the ledger).
+                       Always done while the ledger is not synced.
         """
         try:
-            # Fetch balances using the existing load balances method
-            await self.load_balances()
+            if reconcile or not self.ledger.synced:
+                await self.load_balances()
             
             # Get current balances
             current_balances = self.balances
@@ -152,7 +166,8 @@ class BalanceSyncMixin(ABC):
                     'exchange': self.config.exchange_enum,
                     'timestamp': datetime.now(),
                     'balances': current_balances,
-                    'balance_count': len(current_balances)
+                    'balance_count': len(current_balances),
+                    'ledger_drift': self.ledger.last_drift
                 }
                 
                 # Publish balance snapshot event
@@ -167,7 +182,7 @@ class BalanceSyncMixin(ABC):
                 self.logger.warning("No balances retrieved during sync")
                 
         except Exception as e:
-            self.logger.error(f"Failed to sync balances from REST: {e}", error=str(e))
+            self.logger.error(f"Failed to sync balances: {e}", error=str(e))
             raise
     
     async def sync_balances_once(self) -> Dict[AssetName, AssetBalance]:
@@ -175,7 +190,7 @@ class BalanceSyncMixin(ABC):
         Perform a one-time balance sync and return the current balances.
         
         This method is useful for manual balance refresh without starting
-        the automatic sync loop.
+        the automatic sync loop; it always reconciles via REST.
         
         Returns:
             Dictionary of current balances after sync
@@ -184,7 +199,7 @@ class BalanceSyncMixin(ABC):
             Exception: If balance sync fails
         """
         try:
-            await self._sync_balances_from_rest()
+            await self._sync_balances(reconcile=True)
             self._last_balance_sync = datetime.now()
             
             current_balances = self.balances
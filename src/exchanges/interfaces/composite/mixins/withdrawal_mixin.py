@@ -17,6 +17,7 @@ from exchanges.structs.common import (
 from exchanges.structs.types import AssetName
 
 if TYPE_CHECKING:
+    from exchanges.interfaces.composite.balance_ledger import BalanceLedger
     from exchanges.interfaces.rest import PrivateSpotRestInterface
     from infrastructure.logging import HFTLoggerInterface
 
@@ -24,6 +25,7 @@ if TYPE_CHECKING:
 class WithdrawalMixinProtocol(Protocol):
     """Protocol defining expected attributes for classes using WithdrawalMixin."""
     _rest: Optional['PrivateSpotRestInterface']
+    _ledger: Optional['BalanceLedger']
     _assets_info: Dict[AssetName, AssetInfo]
     logger: 'HFTLoggerInterface'
 
@@ -82,7 +84,14 @@ class WithdrawalMixin:
         if not hasattr(self, '_rest') or self._rest is None:
             raise NotImplementedError("Private REST client required for withdrawal operations")
         
-        return await self._rest.submit_withdrawal(request)
+        response = await self._rest.submit_withdrawal(request)
+
+        # Debit the balance ledger (amount plus network fee)
+        ledger = getattr(self, '_ledger', None)
+        if ledger is not None:
+            ledger.apply_transfer(response.asset, -(response.amount + response.fee))
+
+        return response
     
     async def cancel_withdrawal(self, withdrawal_id: str) -> bool:
         """
@@ -0,0 +1,347 @@
+"""
+Order State Cache
+
+Authoritative order state for private composites, fed by private WebSocket
+order and execution events and by REST replies.
+
+Strategy code used to confirm fills with fetch_order() REST round trips at the
+most latency-critical moment. The cache makes the private stream the primary
+source of truth:
+
+- orders are indexed by order id and client order id
+- updates are merged monotonically: a terminal state is never reverted and the
+  filled quantity never decreases (stale REST replies or reordered events are
+  dropped); an explicit sequence number wins when both sides carry one
+- execution events are aggregated per order (deduplicated by trade id) into
+  filled quantity, average price and fees
+- final orders report the average fill price as `price` (market orders are
+  streamed with price 0); a REST snapshot carrying the exchange-computed
+  average price replaces a stream snapshot of the same filled quantity
+- terminal orders are retained for `terminal_ttl` seconds, then pruned
+- wait_for_fill() returns a future resolved on the terminal state
+- after a stream gap (reconnect) the cache is marked stale until the composite
+  reconciled open orders over REST
+
+Usage:
+    cache = OrderStateCache()
+    cache.update(order, from_rest=True)        # REST reply
+    cache.update(order)                        # ORDER event
+    cache.apply_trade(trade)                   # EXECUTION event
+    order = await cache.wait_for_fill(order_id, timeout=1.0)
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+import msgspec
+
+from exchanges.structs.common import Order, Trade
+from exchanges.structs.enums import OrderStatus
+from exchanges.structs.types import OrderId
+from utils.exchange_utils import is_order_done
+
+# Relative tolerance when comparing aggregated fills with the order quantity
+FILL_TOLERANCE = 1e-9
+
+
+def _progress(order: Order) -> int:
+    """Lifecycle rank: open < partially filled < terminal."""
+    if is_order_done(order):
+        return 2
+    return 1 if order.status == OrderStatus.PARTIALLY_FILLED else 0
+
+
+def is_order_final(order: Order) -> bool:
+    """Terminal order whose fill data is complete (no REST confirmation needed)."""
+    if not is_order_done(order):
+        return False
+    if order.filled_quantity > 0:
+        return order.average_price is not None
+    return order.status != OrderStatus.FILLED
+
+
+class _Fills:
+    """Execution aggregate of one order."""
+    __slots__ = ('quantity', 'notional', 'fee', 'trade_ids')
+
+    def __init__(self):
+        self.quantity = 0.0
+        self.notional = 0.0
+        self.fee = 0.0
+        self.trade_ids: Set[str] = set()
+
+    @property
+    def average_price(self) -> Optional[float]:
+        return self.notional / self.quantity if self.quantity > 0 else None
+
+
+class OrderStateCache:
+    """Monotonic order store keyed by order id and client order id."""
+
+    def __init__(self, terminal_ttl: float = 3600.0, max_orders: int = 10000):
+        """
+        Args:
+            terminal_ttl: Seconds a terminal order is retained after completion
+            max_orders: Hard limit on stored orders (oldest terminal orders pruned first)
+        """
+        self.terminal_ttl = terminal_ttl
+        self.max_orders = max_orders
+
+        self.orders: Dict[OrderId, Order] = {}
+        self._client_ids: Dict[str, OrderId] = {}
+        self._sequences: Dict[OrderId, int] = {}
+        self._fills: Dict[OrderId, _Fills] = {}
+        self._terminal: Deque[Tuple[float, OrderId]] = deque()    # (completed at, order_id)
+        self._waiters: Dict[OrderId, List[asyncio.Future]] = {}
+
+        # False until open orders were reconciled over REST after (re)connect
+        self.synced = False
+
+    # -------------------------------------------------------------------------
+    # Lookup
+    # -------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def __contains__(self, order_id: OrderId) -> bool:
+        return order_id in self.orders
+
+    def get(self, order_id: OrderId) -> Optional[Order]:
+        return self.orders.get(order_id)
+
+    def get_by_client_id(self, client_order_id: str) -> Optional[Order]:
+        order_id = self._client_ids.get(client_order_id)
+        return self.orders.get(order_id) if order_id is not None else None
+
+    def is_final(self, order_id: OrderId) -> bool:
+        """True if the stored order is terminal with complete fill data."""
+        order = self.orders.get(order_id)
+        return order is not None and is_order_final(order)
+
+    # -------------------------------------------------------------------------
+    # Updates
+    # -------------------------------------------------------------------------
+
+    def update(self, order: Order, sequence: Optional[int] = None,
+               from_rest: bool = False) -> Tuple[Order, bool]:
+        """Merge an order snapshot (WebSocket event or REST reply).
+
+        Args:
+            order: Order snapshot
+            sequence: Optional exchange sequence number of the event
+            from_rest: Snapshot is a REST reply (its average price is authoritative)
+
+        Returns:
+            (current order state, whether the snapshot was applied)
+        """
+        order_id = order.order_id
+        current = self.orders.get(order_id)
+
+        if current is not None and not self._is_newer(order, current, sequence, from_rest):
+            return current, False
+
+        if current is not None:
+            order = self._carry_over(order, current)
+        fills = self._fills.get(order_id)
+        if fills is not None:
+            order = self._apply_fills(order, fills)
+
+        order = self._settle_price(order)
+        self._store(order, sequence)
+        return order, True
+
+    def apply_trade(self, trade: Trade) -> Optional[Order]:
+        """Aggregate an execution into its order.
+
+        Args:
+            trade: Private execution event (must carry order_id)
+
+        Returns:
+            Updated order if the execution advanced a known order, None otherwise
+        """
+        order_id = trade.order_id
+        if not order_id:
+            return None
+
+        fills = self._fills.get(order_id)
+        if fills is None:
+            if len(self._fills) >= self.max_orders:
+                self._drop_orphan_fills()
+            fills = self._fills[order_id] = _Fills()
+        # Executions without trade id cannot be deduplicated (distinct fills may share a timestamp)
+        if trade.trade_id:
+            if trade.trade_id in fills.trade_ids:
+                return None
+            fills.trade_ids.add(trade.trade_id)
+        fills.quantity += trade.quantity
+        fills.notional += trade.quantity * trade.price
+        fills.fee += trade.fee or 0.0
+
+        current = self.orders.get(order_id)
+        if current is None:
+            return None     # Applied once the order itself arrives
+        order = self._apply_fills(current, fills)
+        if order is current:
+            return None
+        order = self._settle_price(order)
+        self._store(order, self._sequences.get(order_id))
+        return order
+
+    def remove(self, order_id: OrderId) -> bool:
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return False
+        if order.client_order_id:
+            self._client_ids.pop(order.client_order_id, None)
+        self._sequences.pop(order_id, None)
+        self._fills.pop(order_id, None)
+        return True
+
+    def mark_stale(self) -> None:
+        """Stream gap: order state needs REST reconciliation."""
+        self.synced = False
+
+    def mark_synced(self) -> None:
+        self.synced = True
+
+    # -------------------------------------------------------------------------
+    # Waiting
+    # -------------------------------------------------------------------------
+
+    async def wait_for_fill(self, order_id: OrderId, timeout: float) -> Optional[Order]:
+        """Wait until the order reaches a terminal state.
+
+        Args:
+            order_id: Order identifier
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Terminal order, or None if it did not complete within timeout
+        """
+        order = self.orders.get(order_id)
+        if order is not None and is_order_done(order):
+            return order
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(order_id, []).append(future)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            waiters = self._waiters.get(order_id)
+            if waiters is not None:
+                if future in waiters:
+                    waiters.remove(future)
+                if not waiters:
+                    del self._waiters[order_id]
+
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
+
+    def _is_newer(self, order: Order, current: Order, sequence: Optional[int], from_rest: bool) -> bool:
+        current_sequence = self._sequences.get(order.order_id)
+        if sequence is not None and current_sequence is not None:
+            return sequence > current_sequence
+
+        progress, current_progress = _progress(order), _progress(current)
+        if progress != current_progress:
+            return progress > current_progress
+        if order.filled_quantity != current.filled_quantity:
+            return order.filled_quantity > current.filled_quantity
+        if progress == 2:
+            if from_rest and order.average_price is not None:
+                # Exchange-computed fill price replaces the stream aggregate
+                return order.average_price != current.average_price or not current.price
+            # Same terminal state: only accept snapshots adding fill details
+            return not is_order_final(current) and is_order_final(order)
+        return (order.timestamp or 0) >= (current.timestamp or 0)
+
+    @staticmethod
+    def _carry_over(order: Order, current: Order) -> Order:
+        """Keep fill details the newer snapshot lacks (REST replies are often partial)."""
+        changes = {}
+        if order.filled_quantity < current.filled_quantity:
+            changes['filled_quantity'] = current.filled_quantity
+            changes['average_price'] = current.average_price
+            if current.remaining_quantity is not None:
+                changes['remaining_quantity'] = current.remaining_quantity
+            if order.status == OrderStatus.CANCELED:
+                changes['status'] = OrderStatus.PARTIALLY_CANCELED
+        elif order.average_price is None and order.filled_quantity == current.filled_quantity:
+            changes['average_price'] = current.average_price
+        if order.fee is None and current.fee is not None:
+            changes['fee'] = current.fee
+            changes['fee_asset'] = current.fee_asset
+        if order.client_order_id is None and current.client_order_id is not None:
+            changes['client_order_id'] = current.client_order_id
+        return msgspec.structs.replace(order, **changes) if changes else order
+
+    @staticmethod
+    def _settle_price(order: Order) -> Order:
+        """Final orders report the average fill price (consumers book fills at `price`)."""
+        if (order.filled_quantity > 0 and is_order_final(order)
+                and order.price != order.average_price):
+            return msgspec.structs.replace(order, price=order.average_price)
+        return order
+
+    @staticmethod
+    def _apply_fills(order: Order, fills: _Fills) -> Order:
+        """Advance the order with executions not yet reflected in its snapshot."""
+        if fills.quantity <= order.filled_quantity * (1 + FILL_TOLERANCE):
+            complete = fills.quantity >= order.filled_quantity * (1 - FILL_TOLERANCE) > 0
+            if order.average_price is None and complete:
+                return msgspec.structs.replace(order, average_price=fills.average_price,
+                                               fee=order.fee if order.fee is not None else fills.fee)
+            return order
+
+        changes = {
+            'filled_quantity': fills.quantity,
+            'average_price': fills.average_price,
+            'fee': fills.fee,
+        }
+        if order.quantity:
+            changes['remaining_quantity'] = max(order.quantity - fills.quantity, 0.0)
+        if not is_order_done(order):
+            filled = order.quantity and fills.quantity >= order.quantity * (1 - FILL_TOLERANCE)
+            changes['status'] = OrderStatus.FILLED if filled else OrderStatus.PARTIALLY_FILLED
+        return msgspec.structs.replace(order, **changes)
+
+    def _store(self, order: Order, sequence: Optional[int]) -> None:
+        order_id = order.order_id
+        previous = self.orders.get(order_id)
+        self.orders[order_id] = order
+        if order.client_order_id:
+            self._client_ids[order.client_order_id] = order_id
+        if sequence is not None:
+            self._sequences[order_id] = sequence
+
+        if is_order_done(order):
+            if previous is None or not is_order_done(previous):
+                self._terminal.append((time.monotonic(), order_id))
+            self._resolve_waiters(order)
+        self._prune()
+
+    def _resolve_waiters(self, order: Order) -> None:
+        for future in self._waiters.pop(order.order_id, ()):
+            if not future.done():
+                future.set_result(order)
+
+    def _prune(self) -> None:
+        """Drop terminal orders past their TTL (and the oldest ones above max_orders)."""
+        expire_before = time.monotonic() - self.terminal_ttl
+        terminal = self._terminal
+        while terminal and (terminal[0][0] < expire_before or len(self.orders) > self.max_orders):
+            _, order_id = terminal.popleft()
+            order = self.orders.get(order_id)
+            if order is not None and is_order_done(order):
+                self.remove(order_id)
+
+    def _drop_orphan_fills(self) -> None:
+        """Forget executions of orders never seen (placed outside this session)."""
+        for order_id in [order_id for order_id in self._fills if order_id not in self.orders]:
+            del self._fills[order_id]
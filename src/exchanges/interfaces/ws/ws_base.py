@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from typing import Optional, Callable, Awaitable, Any, Dict, List
 
 from config.structs import ExchangeConfig
-from infrastructure.networking.websocket import WebSocketManager
+from infrastructure.networking.websocket import WebSocketManager, FrameRecorder
 
 # HFT Logger Integration
 from infrastructure.logging import get_exchange_logger, LoggingTimer, HFTLoggerInterface
@@ -147,6 +147,10 @@ class BaseWebsocketInterface(ABC):
         """Check if WebSocket is connected."""
         return self._ws_manager.is_connected()
 
+    def enable_frame_recording(self, recorder: Optional[FrameRecorder]) -> None:
+        """Record raw received frames under this interface's exchange tag (None disables)."""
+        self._ws_manager.enable_frame_recording(recorder, self.exchange_tag)
+
     async def close(self) -> None:
         """Close WebSocket connection and clean up resources."""
         self.logger.info("Stopping WebSocket connection",
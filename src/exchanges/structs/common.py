@@ -48,6 +48,8 @@ class OrderBook(Struct):
     asks: List[OrderBookEntry]
     timestamp: float
     last_update_id: Optional[int] = None
+    # Incremental feeds: first update id covered by a diff (last_update_id is its last)
+    first_update_id: Optional[int] = None
 
 class Order(Struct):
     """Order representation."""
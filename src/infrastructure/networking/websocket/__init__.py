@@ -1,7 +1,12 @@
 from .structs import ConnectionState
 from .ws_manager import WebSocketManager
+from .frame_recording import FrameRecorder, FrameReplayer, RecordedFrame, read_frames
 
 __all__ = [
     "ConnectionState",
     "WebSocketManager",
+    "FrameRecorder",
+    "FrameReplayer",
+    "RecordedFrame",
+    "read_frames",
 ]
\ No newline at end of file
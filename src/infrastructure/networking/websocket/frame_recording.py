@@ -0,0 +1,367 @@
+"""
+WebSocket Frame Recording and Replay
+
+Captures raw frames at the WebSocketManager receive boundary and feeds them
+back through the same connect -> reader -> queue -> message handler path,
+without touching the network. Used for bit-exact parser regression tests
+(MEXC protobuf, Gate.io JSON) and for ingest-path throughput benchmarks.
+
+Segment format (gzip-compressed stream, one file per segment):
+    b'WSF1' magic, then per frame:
+        int64 receive time (epoch ns), uint8 kind (0 = bytes, 1 = text),
+        uint16 connection id length, uint32 payload length,
+        connection id (utf-8), payload
+
+Segment files are named '{prefix}-{first frame ns}-{seq}.wsf.gz', so sorting
+by name is chronological per recorder. Recording buffers frames in memory
+and compresses/writes full buffers on a single background thread, keeping
+the receive path free of disk IO.
+
+Usage:
+    recorder = FrameRecorder('recordings/session1', prefix='mexc_public')
+    ws_interface.enable_frame_recording(recorder)
+    ...
+    recorder.close()
+
+    replayer = FrameReplayer('recordings/session1', speed=None)  # as fast as possible
+    replayer.attach(ws_interface._ws_manager)
+    await ws_interface.initialize()
+    await replayer.wait_until_processed()
+"""
+
+import asyncio
+import dataclasses
+import gzip
+import heapq
+import struct
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Optional, Union
+
+from websockets.protocol import State as WsState
+
+if TYPE_CHECKING:
+    from .ws_manager import WebSocketManager
+
+_MAGIC = b'WSF1'
+_HEADER = struct.Struct('<qBHI')
+_SUFFIX = '.wsf.gz'
+_KIND_BYTES = 0
+_KIND_TEXT = 1
+
+Frame = Union[bytes, str]
+
+
+@dataclass(frozen=True)
+class RecordedFrame:
+    """One received WebSocket frame."""
+    timestamp_ns: int       # Receive time, epoch nanoseconds
+    connection_id: str
+    payload: Frame          # bytes for binary frames, str for text frames
+
+
+# =============================================================================
+# Recording
+# =============================================================================
+
+class FrameRecorder:
+    """Append-only recorder of raw frames into compressed segment files."""
+
+    def __init__(self, directory: Union[str, Path], prefix: str = 'frames',
+                 segment_bytes: int = 64 * 1024 * 1024, flush_bytes: int = 1024 * 1024,
+                 compresslevel: int = 1):
+        """
+        Args:
+            directory: Output directory (created if missing)
+            prefix: Segment file name prefix
+            segment_bytes: Uncompressed size after which a new segment is started
+            flush_bytes: Buffered size handed to the writer thread
+            compresslevel: gzip level (1 keeps the writer thread cheap)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.segment_bytes = segment_bytes
+        self.flush_bytes = flush_bytes
+        self.compresslevel = compresslevel
+
+        self.frames_recorded = 0
+        self.segments: List[Path] = []
+
+        self._buffer = bytearray()
+        self._buffer_start_ns: Optional[int] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ws-frame-recorder')
+        self._pending: Optional[Future] = None
+        self._file: Optional[gzip.GzipFile] = None
+        self._segment_written = 0
+        self._closed = False
+
+    def record(self, connection_id: str, frame: Frame, timestamp_ns: Optional[int] = None) -> None:
+        """
+        Record one frame; cheap enough for the receive path.
+
+        Args:
+            connection_id: Connection the frame was received on
+            frame: Raw frame as returned by websocket.recv()
+            timestamp_ns: Receive time in epoch ns (defaults to now)
+        """
+        if self._closed:
+            return
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        if isinstance(frame, str):
+            kind, payload = _KIND_TEXT, frame.encode('utf-8')
+        else:
+            kind, payload = _KIND_BYTES, bytes(frame)
+        connection = connection_id.encode('utf-8')
+
+        if self._buffer_start_ns is None:
+            self._buffer_start_ns = timestamp_ns
+        buffer = self._buffer
+        buffer += _HEADER.pack(timestamp_ns, kind, len(connection), len(payload))
+        buffer += connection
+        buffer += payload
+        self.frames_recorded += 1
+        if len(buffer) >= self.flush_bytes:
+            self._submit()
+
+    def flush(self) -> None:
+        """Write buffered frames and wait for the writer thread."""
+        self._submit()
+        if self._pending is not None:
+            self._pending.result()
+
+    def close(self) -> None:
+        """Flush and close the current segment; further frames are ignored."""
+        if self._closed:
+            return
+        self.flush()
+        self._executor.submit(self._close_segment).result()
+        self._executor.shutdown(wait=True)
+        self._closed = True
+
+    def __enter__(self) -> 'FrameRecorder':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _submit(self) -> None:
+        if not self._buffer:
+            return
+        chunk, start_ns = bytes(self._buffer), self._buffer_start_ns
+        self._buffer.clear()
+        self._buffer_start_ns = None
+        # Single worker: chunks are written in submission order
+        self._pending = self._executor.submit(self._write, chunk, start_ns)
+
+    def _write(self, chunk: bytes, start_ns: int) -> None:
+        if self._file is None or self._segment_written >= self.segment_bytes:
+            self._close_segment()
+            path = self.directory / f"{self.prefix}-{start_ns:019d}-{len(self.segments):05d}{_SUFFIX}"
+            self._file = gzip.open(path, 'wb', compresslevel=self.compresslevel)
+            self._file.write(_MAGIC)
+            self._segment_written = 0
+            self.segments.append(path)
+        self._file.write(chunk)
+        self._segment_written += len(chunk)
+
+    def _close_segment(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# =============================================================================
+# Reading
+# =============================================================================
+
+def read_segment(path: Union[str, Path]) -> Iterator[RecordedFrame]:
+    """Iterate over the frames of one segment file."""
+    with gzip.open(path, 'rb') as f:
+        data = f.read()
+    if data[:len(_MAGIC)] != _MAGIC:
+        raise ValueError(f"{path} is not a frame segment")
+
+    offset, end = len(_MAGIC), len(data)
+    header_size = _HEADER.size
+    connections = {}
+    while offset < end:
+        timestamp_ns, kind, connection_len, payload_len = _HEADER.unpack_from(data, offset)
+        offset += header_size
+        raw_connection = data[offset:offset + connection_len]
+        connection = connections.get(raw_connection)
+        if connection is None:
+            connection = connections[raw_connection] = raw_connection.decode('utf-8')
+        offset += connection_len
+        payload = data[offset:offset + payload_len]
+        offset += payload_len
+        if len(payload) != payload_len:
+            raise ValueError(f"{path} is truncated")
+        yield RecordedFrame(timestamp_ns, connection, payload.decode('utf-8') if kind == _KIND_TEXT else payload)
+
+
+def read_frames(source: Union[str, Path], connection_id: Optional[str] = None) -> Iterator[RecordedFrame]:
+    """
+    Iterate over recorded frames in receive order.
+
+    Args:
+        source: Segment file, or a directory whose segments (of any number of
+            recorders) are merged by receive time
+        connection_id: Only frames of this connection
+
+    Returns:
+        Iterator of RecordedFrame
+    """
+    source = Path(source)
+    if source.is_dir():
+        by_prefix = {}
+        for path in sorted(source.glob(f'*{_SUFFIX}')):
+            by_prefix.setdefault(path.name.rsplit('-', 2)[0], []).append(path)
+        streams = [_chain_segments(paths) for paths in by_prefix.values()]
+        frames = heapq.merge(*streams, key=lambda frame: frame.timestamp_ns)
+    else:
+        frames = read_segment(source)
+
+    for frame in frames:
+        if connection_id is None or frame.connection_id == connection_id:
+            yield frame
+
+
+def _chain_segments(paths: List[Path]) -> Iterator[RecordedFrame]:
+    for path in paths:
+        yield from read_segment(path)
+
+
+# =============================================================================
+# Replay
+# =============================================================================
+
+class ReplayWebSocket:
+    """Minimal WebSocketClientProtocol stand-in serving recorded frames."""
+
+    def __init__(self, replayer: 'FrameReplayer'):
+        self._replayer = replayer
+        self._closed = asyncio.get_running_loop().create_future()
+        self.state = WsState.OPEN
+
+    async def recv(self) -> Frame:
+        frame = await self._replayer._next_frame()
+        if frame is None:
+            # Recording exhausted: behave like an idle connection until closed
+            await self._closed
+            raise ConnectionError("Replay connection closed")
+        return frame
+
+    async def send(self, message: Frame) -> None:
+        # Subscriptions, pings and auth requests are not sent anywhere
+        self._replayer.sent_messages.append(message)
+
+    async def ping(self, *args, **kwargs) -> None:
+        return None
+
+    async def close(self, *args, **kwargs) -> None:
+        self.state = WsState.CLOSED
+        if not self._closed.done():
+            self._closed.set_result(None)
+
+
+class FrameReplayer:
+    """
+    Replays recorded frames through a WebSocketManager.
+
+    The replayer replaces the manager's connect method, so frames travel the
+    exact production path: reader -> message queue -> message handler.
+    """
+
+    def __init__(self, source: Union[str, Path], connection_id: Optional[str] = None,
+                 speed: Optional[float] = 1.0, preload: bool = True):
+        """
+        Args:
+            source: Segment file or recording directory
+            connection_id: Only replay frames of this connection
+            speed: 1.0 replays at the original pace, 10.0 ten times faster,
+                None as fast as the consumer accepts frames
+            preload: Decompress everything up front so benchmarks do not
+                measure decompression
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive or None")
+        self.speed = speed
+        self.sent_messages: List[Frame] = []
+        self.frames_replayed = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+        frames = read_frames(source, connection_id)
+        self._frames: Iterator[RecordedFrame] = iter(list(frames)) if preload else frames
+        self._first_ns: Optional[int] = None
+        self._start_loop_time = 0.0
+        self._finished: Optional[asyncio.Event] = None
+        self._manager: Optional['WebSocketManager'] = None
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    @property
+    def frames_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.frames_replayed / elapsed if elapsed > 0 else 0.0
+
+    def attach(self, manager: 'WebSocketManager') -> None:
+        """
+        Route a WebSocketManager's connections to this replayer.
+
+        Queue overflow dropping is disabled on the manager: replayed frames
+        arrive faster than live ones and every frame must reach the handler.
+        """
+        manager.connect_method = self.connect
+        manager.manager_config = dataclasses.replace(manager.manager_config, drop_on_overflow=False)
+        self._manager = manager
+
+    async def connect(self) -> ReplayWebSocket:
+        """Connect method for WebSocketManager; reconnects continue where the stream stopped."""
+        self._event()
+        return ReplayWebSocket(self)
+
+    async def wait_finished(self) -> None:
+        """Wait until every frame was handed to the reader."""
+        await self._event().wait()
+
+    async def wait_until_processed(self) -> None:
+        """Wait until every frame went through the attached manager's handler."""
+        await self.wait_finished()
+        if self._manager is not None:
+            await self._manager.wait_until_drained()
+        self.finished_at = time.perf_counter()
+
+    def _event(self) -> asyncio.Event:
+        if self._finished is None:
+            self._finished = asyncio.Event()
+        return self._finished
+
+    async def _next_frame(self) -> Optional[Frame]:
+        frame = next(self._frames, None)
+        if frame is None:
+            if self.finished_at is None:
+                self.finished_at = time.perf_counter()
+            self._event().set()
+            return None
+
+        if self._first_ns is None:
+            self._first_ns = frame.timestamp_ns
+            self._start_loop_time = asyncio.get_running_loop().time()
+            self.started_at = time.perf_counter()
+        elif self.speed is not None:
+            due = self._start_loop_time + (frame.timestamp_ns - self._first_ns) / 1e9 / self.speed
+            delay = due - asyncio.get_running_loop().time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        self.frames_replayed += 1
+        return frame.payload
@@ -102,6 +102,7 @@ class WebSocketManagerConfig:
     message_timeout: float = 30.0
     enable_performance_tracking: bool = True
     max_pending_messages: int = 1000
+    drop_on_overflow: bool = True  # False: the reader waits for queue space (replay)
     batch_processing_enabled: bool = True
     batch_size: int = 100
 
@@ -23,6 +23,7 @@ from websockets.client import WebSocketClientProtocol
 from websockets.protocol import State as WsState
 
 from .structs import (ParsedMessage, WebSocketManagerConfig, PerformanceMetrics, ConnectionState)
+from .frame_recording import FrameRecorder
 from config.structs import WebSocketConfig
 from infrastructure.exceptions.exchange import ExchangeRestError
 import msgspec
@@ -90,9 +91,28 @@ class WebSocketManager:
             maxsize=self.manager_config.max_pending_messages
         )
 
+        # Optional raw frame recording (opt-in)
+        self._frame_recorder: Optional[FrameRecorder] = None
+        self._frame_connection_id = ""
+
     async def on_connection_error(self):
         pass
 
+    def enable_frame_recording(self, recorder: Optional[FrameRecorder], connection_id: str) -> None:
+        """
+        Record every received raw frame before it is queued.
+
+        Args:
+            recorder: Frame recorder, None disables recording
+            connection_id: Identifier stored with each frame
+        """
+        self._frame_recorder = recorder
+        self._frame_connection_id = connection_id
+
+    async def wait_until_drained(self) -> None:
+        """Wait until every queued message went through the message handler."""
+        await self._message_queue.join()
+
     async def initialize(self) -> None:
         """
         Initialize WebSocket connection using direct connection method.
@@ -207,6 +227,8 @@ class WebSocketManager:
             while self.is_connected():
                 try:
                     raw_message = await self._websocket.recv()
+                    if self._frame_recorder is not None:
+                        self._frame_recorder.record(self._frame_connection_id, raw_message)
                     await self._on_raw_message(raw_message)
                 except Exception as e:
                     await self._on_reader_error(e)
@@ -285,7 +307,7 @@ class WebSocketManager:
         """Queue raw message for processing."""
         start_time = time.perf_counter()
         try:
-            if self._message_queue.full():
+            if self._message_queue.full() and self.manager_config.drop_on_overflow:
                 self.logger.debug("Message queue full, dropping oldest",
                                   queue_size=self._message_queue.qsize(),
                                   max_size=self.manager_config.max_pending_messages)
@@ -1,12 +1,23 @@
 """Arbitrage signal generation based on statistical thresholds."""
 
-from typing import Dict, Tuple, Union
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 import numpy as np
 
+from trading.analysis.rolling_quantile import RollingMoments, RollingQuantile
+from trading.analysis.streaming_quantile import WindowExtremes
 from trading.signals.types import Signal
 
 
+# Percentile of window extremes used for entry/exit thresholds
+EXTREMES_PERCENTILE = 25.0
+# Minimum current spread for ENTER (0.05 = 0.05% profit after costs, currently disabled)
+MIN_PROFIT_THRESHOLD = 0
+# Both spreads within this band count as normalized (EXIT)
+NORMALIZED_SPREAD_THRESHOLD = 0.02
+
+
 @dataclass
 class ArbStats:
     """Statistics for arbitrage spreads."""
@@ -111,29 +122,316 @@ def calculate_arb_signals(
         current=current_gateio_spot_vs_futures
     )
     
-    # Generate signal
-    signal = Signal.HOLD
+    signal = _classify_signal(
+        current_mexc_vs_gateio_futures, current_gateio_spot_vs_futures,
+        mexc_gateio_min_25pct, gateio_max_25pct
+    )
     
+    return ArbSignal(
+        signal=signal,
+        mexc_vs_gateio_futures=mexc_gateio_stats,
+        gateio_spot_vs_futures=gateio_stats
+    )
+
+
+def _classify_signal(
+    current_mexc_vs_gateio_futures: float,
+    current_gateio_spot_vs_futures: float,
+    mexc_gateio_min_25pct: float,
+    gateio_max_25pct: float
+) -> Signal:
+    """Map current spreads and percentile thresholds to ENTER/EXIT/HOLD."""
     # IMPROVED SIGNAL LOGIC WITH PROFIT VALIDATION
     # Check ENTER condition: mexc_vs_gateio_futures < 25th percentile of minimums AND is profitable
-    min_profit_threshold =0 # 0.05  # Minimum 0.05% profit after costs
-    
     if (current_mexc_vs_gateio_futures < mexc_gateio_min_25pct and 
-        current_mexc_vs_gateio_futures > min_profit_threshold):
-        signal = Signal.ENTER
+        current_mexc_vs_gateio_futures > MIN_PROFIT_THRESHOLD):
+        return Signal.ENTER
     
     # Check EXIT condition: gateio_spot_vs_futures > 25th percentile of maximums OR spreads normalized
-    elif (current_gateio_spot_vs_futures > gateio_max_25pct or 
-          (abs(current_mexc_vs_gateio_futures) < 0.02 and abs(current_gateio_spot_vs_futures) < 0.02)):
-        signal = Signal.EXIT
+    if (current_gateio_spot_vs_futures > gateio_max_25pct or 
+          (abs(current_mexc_vs_gateio_futures) < NORMALIZED_SPREAD_THRESHOLD and
+           abs(current_gateio_spot_vs_futures) < NORMALIZED_SPREAD_THRESHOLD)):
+        return Signal.EXIT
+    
+    return Signal.HOLD
+
+
+class _StridedExtremes:
+    """
+    Percentile of strided rolling-window extremes over a trailing lookback.
+    
+    calculate_arb_signals() takes windows of `window_size` starting at offsets
+    0, step, 2*step, ... of the history slice. When the slice start moves, the
+    window starts shift with it, so one RollingQuantile is kept per start
+    position residue (mod step); the active one is selected by the slice start.
+    Each window extreme is inserted and evicted exactly once: O(log n) per sample.
+    """
+    __slots__ = ('step', 'classes')
+    
+    def __init__(self, step: int):
+        self.step = step
+        self.classes: List[RollingQuantile] = [RollingQuantile() for _ in range(step)]
+    
+    def add(self, position: int, value: float) -> None:
+        self.classes[position % self.step].push(value)
+    
+    def evict(self, position: int) -> None:
+        self.classes[position % self.step].pop_oldest()
+    
+    def percentile(self, start: int, p: float) -> float:
+        return self.classes[start % self.step].percentile(p)
+
+
+class ArbSignalTracker:
+    """
+    Incremental equivalent of calling calculate_arb_signals() on every tick.
+    
+    update(mexc, gateio) returns the same ArbSignal as
+    calculate_arb_signals(history[start:], ..., window_size) where history holds
+    all samples pushed so far (including the current one) and
+    start = max(0, i - lookback_periods), without rescanning the history.
+    """
+    
+    def __init__(self, window_size: int = 10, lookback_periods: Optional[int] = None):
+        """
+        Args:
+            window_size: Rolling window size for extremes (>= 2)
+            lookback_periods: History slice is the last lookback_periods + 1 samples (None = all)
+        """
+        if window_size < 2:
+            raise ValueError(f"window_size must be >= 2, got {window_size}")
+        self.window_size = window_size
+        self.lookback_periods = lookback_periods
+        step = window_size // 2
+        
+        self._index = -1
+        self._start = 0
+        self._recent_mexc: Deque[float] = deque(maxlen=window_size)
+        self._recent_gateio: Deque[float] = deque(maxlen=window_size)
+        self._lookback_mexc: Deque[float] = deque()
+        self._lookback_gateio: Deque[float] = deque()
+        self._mexc_moments = RollingMoments()
+        self._gateio_moments = RollingMoments()
+        self._mexc_mins = _StridedExtremes(step)
+        self._mexc_maxs = _StridedExtremes(step)
+        self._gateio_mins = _StridedExtremes(step)
+        self._gateio_maxs = _StridedExtremes(step)
+    
+    def advance(self, mexc_value: float, gateio_value: float) -> Optional[Tuple[float, ...]]:
+        """
+        Push one sample pair and compute threshold statistics.
+        
+        Returns:
+            (mexc_min_25pct, mexc_max_25pct, mexc_mean, gateio_min_25pct, gateio_max_25pct,
+            gateio_mean), or None while the history slice is shorter than window_size
+        """
+        mexc_value = float(mexc_value)
+        gateio_value = float(gateio_value)
+        self._index += 1
+        i = self._index
+        w = self.window_size
+        
+        self._lookback_mexc.append(mexc_value)
+        self._lookback_gateio.append(gateio_value)
+        self._mexc_moments.add(mexc_value)
+        self._gateio_moments.add(gateio_value)
+        self._recent_mexc.append(mexc_value)
+        self._recent_gateio.append(gateio_value)
+        
+        # Slide the history start; drop the sample and the window starting there
+        start = 0 if self.lookback_periods is None else max(0, i - self.lookback_periods)
+        if start > self._start:
+            self._mexc_moments.remove(self._lookback_mexc.popleft())
+            self._gateio_moments.remove(self._lookback_gateio.popleft())
+            if self._start <= i - w:
+                for extremes in (self._mexc_mins, self._mexc_maxs, self._gateio_mins, self._gateio_maxs):
+                    extremes.evict(self._start)
+            self._start = start
+        
+        # Window ending at the current sample
+        position = i + 1 - w
+        if position >= start:
+            self._mexc_mins.add(position, min(self._recent_mexc) if _finite(self._recent_mexc) else np.nan)
+            self._mexc_maxs.add(position, max(self._recent_mexc) if _finite(self._recent_mexc) else np.nan)
+            self._gateio_mins.add(position, min(self._recent_gateio) if _finite(self._recent_gateio) else np.nan)
+            self._gateio_maxs.add(position, max(self._recent_gateio) if _finite(self._recent_gateio) else np.nan)
+        
+        if i + 1 - start < w:
+            return None
+        
+        return (
+            self._mexc_mins.percentile(start, EXTREMES_PERCENTILE),
+            self._mexc_maxs.percentile(start, EXTREMES_PERCENTILE),
+            self._mexc_moments.mean,
+            self._gateio_mins.percentile(start, EXTREMES_PERCENTILE),
+            self._gateio_maxs.percentile(start, EXTREMES_PERCENTILE),
+            self._gateio_moments.mean,
+        )
+    
+    def update(self, mexc_vs_gateio_futures: float, gateio_spot_vs_futures: float) -> ArbSignal:
+        """Push the current spreads and return the ArbSignal for them."""
+        stats = self.advance(mexc_vs_gateio_futures, gateio_spot_vs_futures)
+        
+        if stats is None:
+            return _hold_signal(mexc_vs_gateio_futures, gateio_spot_vs_futures)
+        
+        mexc_min, mexc_max, mexc_mean, gateio_min, gateio_max, gateio_mean = stats
+        return ArbSignal(
+            signal=_classify_signal(mexc_vs_gateio_futures, gateio_spot_vs_futures, mexc_min, gateio_max),
+            mexc_vs_gateio_futures=ArbStats(mexc_min, mexc_max, mexc_mean, mexc_vs_gateio_futures),
+            gateio_spot_vs_futures=ArbStats(gateio_min, gateio_max, gateio_mean, gateio_spot_vs_futures)
+        )
+
+
+def _finite(values: Deque[float]) -> bool:
+    """True if no value is NaN (np.min/np.max propagate NaN)."""
+    return all(v == v for v in values)
+
+
+def calculate_arb_signals_streaming(
+    mexc_vs_gateio_futures_extremes: WindowExtremes,
+    gateio_spot_vs_futures_extremes: WindowExtremes,
+    mexc_vs_gateio_futures_mean: float,
+    gateio_spot_vs_futures_mean: float,
+    current_mexc_vs_gateio_futures: float,
+    current_gateio_spot_vs_futures: float
+) -> ArbSignal:
+    """
+    Per-tick equivalent of calculate_arb_signals() over streaming window extremes.
+    
+    The extremes are updated once per history sample (WindowExtremes.push), so
+    evaluating the current spreads costs O(1) / O(log n) instead of a
+    percentile pass over the full history arrays.
+    
+    Args:
+        mexc_vs_gateio_futures_extremes: Window extremes of the MEXC vs Gate.io futures history
+        gateio_spot_vs_futures_extremes: Window extremes of the Gate.io spot vs futures history
+        mexc_vs_gateio_futures_mean: Mean of the MEXC vs Gate.io futures history
+        gateio_spot_vs_futures_mean: Mean of the Gate.io spot vs futures history
+        current_mexc_vs_gateio_futures: Current MEXC vs Gate.io futures spread
+        current_gateio_spot_vs_futures: Current Gate.io spot vs futures spread
+        
+    Returns:
+        ArbSignal with entry/exit/hold signal and statistics (HOLD until both
+        histories contain a full window)
+    """
+    if not len(mexc_vs_gateio_futures_extremes) or not len(gateio_spot_vs_futures_extremes):
+        return _hold_signal(current_mexc_vs_gateio_futures, current_gateio_spot_vs_futures)
+    
+    mexc_gateio_stats = ArbStats(
+        min_25pct=mexc_vs_gateio_futures_extremes.min_percentile(EXTREMES_PERCENTILE),
+        max_25pct=mexc_vs_gateio_futures_extremes.max_percentile(EXTREMES_PERCENTILE),
+        mean=mexc_vs_gateio_futures_mean,
+        current=current_mexc_vs_gateio_futures
+    )
+    gateio_stats = ArbStats(
+        min_25pct=gateio_spot_vs_futures_extremes.min_percentile(EXTREMES_PERCENTILE),
+        max_25pct=gateio_spot_vs_futures_extremes.max_percentile(EXTREMES_PERCENTILE),
+        mean=gateio_spot_vs_futures_mean,
+        current=current_gateio_spot_vs_futures
+    )
     
     return ArbSignal(
-        signal=signal,
+        signal=_classify_signal(current_mexc_vs_gateio_futures, current_gateio_spot_vs_futures,
+                                mexc_gateio_stats.min_25pct, gateio_stats.max_25pct),
         mexc_vs_gateio_futures=mexc_gateio_stats,
         gateio_spot_vs_futures=gateio_stats
     )
 
 
+def _hold_signal(current_mexc_vs_gateio_futures: float, current_gateio_spot_vs_futures: float) -> ArbSignal:
+    """HOLD with stats falling back to the current values (insufficient history)."""
+    return ArbSignal(
+        signal=Signal.HOLD,
+        mexc_vs_gateio_futures=ArbStats(current_mexc_vs_gateio_futures, current_mexc_vs_gateio_futures,
+                                        current_mexc_vs_gateio_futures, current_mexc_vs_gateio_futures),
+        gateio_spot_vs_futures=ArbStats(current_gateio_spot_vs_futures, current_gateio_spot_vs_futures,
+                                        current_gateio_spot_vs_futures, current_gateio_spot_vs_futures)
+    )
+
+
+@dataclass
+class ArbSignalSeries:
+    """Per-row arbitrage signals and statistics (see calculate_arb_signals_series)."""
+    signal: np.ndarray              # object array of Signal
+    mexc_min_25pct: np.ndarray
+    mexc_max_25pct: np.ndarray
+    mexc_mean: np.ndarray
+    gateio_min_25pct: np.ndarray
+    gateio_max_25pct: np.ndarray
+    gateio_mean: np.ndarray
+
+
+def calculate_arb_signals_series(
+    mexc_vs_gateio_futures: Union[np.ndarray, list],
+    gateio_spot_vs_futures: Union[np.ndarray, list],
+    window_size: int = 10,
+    lookback_periods: Optional[int] = None
+) -> ArbSignalSeries:
+    """
+    Batch equivalent of calling calculate_arb_signals() for every row.
+    
+    Row i matches calculate_arb_signals(x[start:i+1], y[start:i+1], x[i], y[i], window_size)
+    with start = max(0, i - lookback_periods) (0 if lookback_periods is None),
+    computed in one O(n log n) pass instead of O(n * lookback).
+    
+    Args:
+        mexc_vs_gateio_futures: MEXC vs Gate.io futures spread series
+        gateio_spot_vs_futures: Gate.io spot vs futures spread series
+        window_size: Rolling window size for calculating statistics
+        lookback_periods: Trailing history length (None = expanding history)
+        
+    Returns:
+        ArbSignalSeries with one entry per row
+    """
+    x = np.asarray(mexc_vs_gateio_futures, dtype=np.float64)
+    y = np.asarray(gateio_spot_vs_futures, dtype=np.float64)
+    if len(x) != len(y):
+        raise ValueError(f"Series lengths differ: {len(x)} != {len(y)}")
+    
+    n = len(x)
+    stats = np.empty((n, 6))
+    tracker = ArbSignalTracker(window_size, lookback_periods)
+    
+    for i, (x_i, y_i) in enumerate(zip(x.tolist(), y.tolist())):
+        row = tracker.advance(x_i, y_i)
+        if row is None:
+            # Insufficient history: stats fall back to the current values
+            stats[i] = (x_i, x_i, x_i, y_i, y_i, y_i)
+        else:
+            stats[i] = row
+    
+    mexc_min, mexc_max, mexc_mean, gateio_min, gateio_max, gateio_mean = stats.T
+    ready = np.arange(n) + 1 - _series_starts(n, lookback_periods) >= window_size
+    
+    enter = ready & (x < mexc_min) & (x > MIN_PROFIT_THRESHOLD)
+    exit_ = ready & ~enter & (
+        (y > gateio_max) |
+        ((np.abs(x) < NORMALIZED_SPREAD_THRESHOLD) & (np.abs(y) < NORMALIZED_SPREAD_THRESHOLD))
+    )
+    
+    signal = np.full(n, Signal.HOLD, dtype=object)
+    signal[enter] = Signal.ENTER
+    signal[exit_] = Signal.EXIT
+    
+    return ArbSignalSeries(
+        signal=signal,
+        mexc_min_25pct=mexc_min.copy(),
+        mexc_max_25pct=mexc_max.copy(),
+        mexc_mean=mexc_mean.copy(),
+        gateio_min_25pct=gateio_min.copy(),
+        gateio_max_25pct=gateio_max.copy(),
+        gateio_mean=gateio_mean.copy()
+    )
+
+
+def _series_starts(n: int, lookback_periods: Optional[int]) -> np.ndarray:
+    """History slice start index for each row."""
+    if lookback_periods is None:
+        return np.zeros(n, dtype=np.int64)
+    return np.maximum(np.arange(n) - lookback_periods, 0)
+
+
 def calculate_arb_signals_simple(
     mexc_vs_gateio_futures_history: Union[np.ndarray, list],
     gateio_spot_vs_futures_history: Union[np.ndarray, list],
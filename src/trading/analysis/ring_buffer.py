@@ -0,0 +1,221 @@
+"""
+Ring Buffer
+
+Fixed-capacity float history for live spread series.
+
+Live tasks used to grow their spread history with np.append and trim it with a
+slice on every update, copying the whole history twice per tick. RingBuffer
+preallocates its storage once:
+
+- push() is O(1) and writes into the existing array (no per-tick allocation)
+- values() is a zero-copy, ordered (oldest -> newest) view of the window
+- sum / mean / std / min / max are maintained incrementally
+
+Ordered views use the double-write trick: storage has 2 * capacity slots and
+every sample is written at slot i and i + capacity, so the window is always the
+contiguous slice [start, start + size).
+
+Statistics follow NumPy semantics: any NaN in the window makes mean/std/min/max
+NaN. sum and sum of squares are recomputed from the window every `capacity`
+pushes to bound floating-point drift.
+"""
+
+import math
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-capacity sliding window backed by a preallocated NumPy array.
+
+    Views returned by values() share memory with the buffer: they are read-only
+    and only valid until the next push()/extend()/clear().
+    """
+    __slots__ = ('capacity', '_data', '_start', '_size', '_sum', '_sumsq', '_nan_count',
+                 '_min', '_max', '_extrema_stale', '_pushes_since_resync')
+
+    def __init__(self, capacity: int, values: Optional[Iterable[float]] = None):
+        """
+        Args:
+            capacity: Maximum number of samples kept (oldest samples are evicted)
+            values: Optional initial samples (only the last `capacity` are kept)
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=np.float64)
+        self.clear()
+        if values is not None:
+            self.extend(values)
+
+    def clear(self) -> None:
+        self._start = 0
+        self._size = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._nan_count = 0
+        self._min = math.inf
+        self._max = -math.inf
+        self._extrema_stale = False
+        self._pushes_since_resync = 0
+
+    # -------------------------------------------------------------------------
+    # Updates
+    # -------------------------------------------------------------------------
+
+    def push(self, value: float) -> None:
+        """Append a sample, evicting the oldest one if the buffer is full."""
+        value = float(value)
+        data = self._data
+        capacity = self.capacity
+
+        if self._size < capacity:
+            slot = self._size
+            self._size += 1
+        else:
+            slot = self._start
+            self._evict(data.item(slot))
+            self._start = slot + 1 if slot + 1 < capacity else 0
+
+        data[slot] = value
+        data[slot + capacity] = value
+
+        if value != value:
+            self._nan_count += 1
+        else:
+            self._sum += value
+            self._sumsq += value * value
+            if value < self._min:
+                self._min = value
+            if value > self._max:
+                self._max = value
+
+        self._pushes_since_resync += 1
+        if self._pushes_since_resync >= capacity:
+            self._resync()
+
+    def extend(self, values: Union[np.ndarray, Iterable[float]]) -> None:
+        """Append many samples at once (bulk load, e.g. candle history)."""
+        values = np.asarray(values if isinstance(values, np.ndarray) else list(values), dtype=np.float64)
+        if values.ndim != 1:
+            values = values.ravel()
+        if not len(values):
+            return
+        if self._size + len(values) > self.capacity:
+            window = np.concatenate((self.values(), values))[-self.capacity:]
+        else:
+            window = np.concatenate((self.values(), values))
+        self._load(window)
+
+    def _evict(self, value: float) -> None:
+        if value != value:
+            self._nan_count -= 1
+            return
+        self._sum -= value
+        self._sumsq -= value * value
+        if value <= self._min or value >= self._max:
+            # The evicted sample may have been the extremum: recompute on demand
+            self._extrema_stale = True
+
+    def _load(self, window: np.ndarray) -> None:
+        size = len(window)
+        self._data[:size] = window
+        self._data[self.capacity:self.capacity + size] = window
+        self._start = 0
+        self._size = size
+        self._resync()
+
+    def _resync(self) -> None:
+        """Recompute all statistics from the window."""
+        window = self.values()
+        finite = window[~np.isnan(window)]
+        self._nan_count = len(window) - len(finite)
+        self._sum = float(finite.sum())
+        self._sumsq = float(np.dot(finite, finite))
+        self._min = float(finite.min()) if len(finite) else math.inf
+        self._max = float(finite.max()) if len(finite) else -math.inf
+        self._extrema_stale = False
+        self._pushes_since_resync = 0
+
+    # -------------------------------------------------------------------------
+    # Access
+    # -------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def is_full(self) -> bool:
+        return self._size == self.capacity
+
+    def values(self) -> np.ndarray:
+        """Read-only ordered view of the window (oldest first), without copying."""
+        view = self._data[self._start:self._start + self._size]
+        view.flags.writeable = False
+        return view
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        view = self.values()
+        return view if dtype is None else view.astype(dtype, copy=False)
+
+    def __getitem__(self, index):
+        return self.values()[index]
+
+    def last(self) -> float:
+        """Most recent sample (NaN if empty)."""
+        if not self._size:
+            return math.nan
+        return self._data.item(self._start + self._size - 1)
+
+    # -------------------------------------------------------------------------
+    # Statistics
+    # -------------------------------------------------------------------------
+
+    @property
+    def sum(self) -> float:
+        if self._nan_count:
+            return math.nan
+        return self._sum
+
+    @property
+    def mean(self) -> float:
+        if self._nan_count or not self._size:
+            return math.nan
+        return self._sum / self._size
+
+    @property
+    def var(self) -> float:
+        """Population variance (ddof=0)."""
+        if self._nan_count or not self._size:
+            return math.nan
+        mean = self._sum / self._size
+        return max(self._sumsq / self._size - mean * mean, 0.0)
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation (ddof=0)."""
+        return math.sqrt(self.var)
+
+    @property
+    def min(self) -> float:
+        if self._nan_count or not self._size:
+            return math.nan
+        if self._extrema_stale:
+            self._refresh_extrema()
+        return self._min
+
+    @property
+    def max(self) -> float:
+        if self._nan_count or not self._size:
+            return math.nan
+        if self._extrema_stale:
+            self._refresh_extrema()
+        return self._max
+
+    def _refresh_extrema(self) -> None:
+        window = self.values()
+        self._min = float(window.min())
+        self._max = float(window.max())
+        self._extrema_stale = False
@@ -0,0 +1,253 @@
+"""
+Rolling Quantile Engine
+
+Incremental sliding-window order statistics for signal generation.
+
+Signal code used to recompute percentiles by sorting the whole history on every
+row (O(n * W log W) per backtest). RollingQuantile keeps the window in a
+SortedList, so each push/evict is O(log W) and quantile/rank lookups are
+O(log W), with the same results as the NumPy calls they replace:
+
+- quantile(q)        == np.quantile(window, q)              (linear interpolation)
+- rank(x)            == np.searchsorted(np.sort(window), x)  (values strictly below x)
+- mean / std         == np.mean(window) / np.std(window)     (population, ddof=0)
+
+NaN follows NumPy semantics: any NaN in the window makes quantile/mean/std NaN,
+and NaN sorts after all numbers for rank().
+
+Two APIs are provided:
+- Push API: RollingQuantile.push() per sample for live tasks
+- Batch API: rolling_window_stats() runs a whole array in one pass
+"""
+
+import math
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Sequence
+
+import numpy as np
+from sortedcontainers import SortedList
+
+
+def _lerp(a: float, b: float, t: float) -> float:
+    """Linear interpolation matching numpy's quantile _lerp (stable for t >= 0.5)."""
+    diff = b - a
+    if t >= 0.5:
+        return b - diff * (1 - t)
+    return a + diff * t
+
+
+def quantile_sorted(sorted_values: Sequence[float], q: float) -> float:
+    """
+    Quantile of an already sorted sequence using numpy's default 'linear' method.
+
+    Args:
+        sorted_values: Ascending, NaN-free sequence supporting len() and indexing
+        q: Quantile in [0, 1]
+
+    Returns:
+        Interpolated quantile, or NaN for an empty sequence
+    """
+    n = len(sorted_values)
+    if n == 0:
+        return math.nan
+    virtual = (n - 1) * q
+    lo = math.floor(virtual)
+    hi = min(lo + 1, n - 1)
+    return _lerp(sorted_values[lo], sorted_values[hi], virtual - lo)
+
+
+class RollingMoments:
+    """Welford mean/variance with add and remove, NaN-aware."""
+    __slots__ = ('count', 'nan_count', '_mean', '_m2')
+
+    def __init__(self):
+        self.count = 0          # Finite values tracked
+        self.nan_count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        if value != value:
+            self.nan_count += 1
+            return
+        self.count += 1
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+
+    def remove(self, value: float) -> None:
+        if value != value:
+            self.nan_count -= 1
+            return
+        if self.count <= 1:
+            self.count = 0
+            self._mean = 0.0
+            self._m2 = 0.0
+            return
+        old_mean = self._mean
+        self.count -= 1
+        self._mean = (old_mean * (self.count + 1) - value) / self.count
+        self._m2 = max(self._m2 - (value - old_mean) * (value - self._mean), 0.0)
+
+    @property
+    def mean(self) -> float:
+        if self.nan_count or not self.count:
+            return math.nan
+        return self._mean
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation (ddof=0)."""
+        if self.nan_count or not self.count:
+            return math.nan
+        return math.sqrt(self._m2 / self.count)
+
+
+class RollingQuantile:
+    """
+    Sliding-window order statistics with O(log W) updates.
+
+    With `window=None` the window only shrinks through pop_oldest(), which lets
+    callers manage custom (e.g. time-based or strided) windows.
+    """
+    __slots__ = ('window', '_values', '_sorted', '_moments')
+
+    def __init__(self, window: Optional[int] = None, values: Optional[Iterable[float]] = None):
+        if window is not None and window <= 0:
+            raise ValueError(f"window must be positive, got {window}")
+        self.window = window
+        self._values: Deque[float] = deque()
+        self._sorted = SortedList()
+        self._moments = RollingMoments()
+        if values is not None:
+            for value in values:
+                self.push(value)
+
+    def push(self, value: float) -> None:
+        """Append a sample, evicting the oldest one if the window is full."""
+        value = float(value)
+        self._values.append(value)
+        if value == value:
+            self._sorted.add(value)
+        self._moments.add(value)
+        if self.window is not None and len(self._values) > self.window:
+            self.pop_oldest()
+
+    def pop_oldest(self) -> float:
+        """Remove and return the oldest sample."""
+        value = self._values.popleft()
+        if value == value:
+            self._sorted.remove(value)
+        self._moments.remove(value)
+        return value
+
+    def clear(self) -> None:
+        self._values.clear()
+        self._sorted.clear()
+        self._moments = RollingMoments()
+
+    def __len__(self) -> int:
+        """Number of samples in the window (including NaN)."""
+        return len(self._values)
+
+    def quantile(self, q: float) -> float:
+        """Window quantile (q in [0, 1]), equal to np.quantile(window, q)."""
+        if self._moments.nan_count:
+            return math.nan
+        return quantile_sorted(self._sorted, q)
+
+    def percentile(self, p: float) -> float:
+        """Window percentile (p in [0, 100]), equal to np.percentile(window, p)."""
+        return self.quantile(p / 100)
+
+    def rank(self, value: float) -> int:
+        """Number of window values strictly below `value` (np.searchsorted side='left')."""
+        if value != value:
+            return len(self._sorted)
+        return self._sorted.bisect_left(value)
+
+    def percentile_rank(self, value: float) -> float:
+        """rank(value) as a percentage of the window size."""
+        size = len(self._values)
+        return self.rank(value) / size * 100 if size else math.nan
+
+    @property
+    def mean(self) -> float:
+        return self._moments.mean
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation (ddof=0)."""
+        return self._moments.std
+
+    @property
+    def min(self) -> float:
+        if self._moments.nan_count or not self._sorted:
+            return math.nan
+        return self._sorted[0]
+
+    @property
+    def max(self) -> float:
+        if self._moments.nan_count or not self._sorted:
+            return math.nan
+        return self._sorted[-1]
+
+    def to_array(self) -> np.ndarray:
+        """Window contents in insertion order."""
+        return np.fromiter(self._values, dtype=np.float64, count=len(self._values))
+
+
+def rolling_window_stats(
+    values: Iterable[float],
+    window: Optional[int] = None,
+    quantiles: Sequence[float] = (),
+    percentile_rank: bool = False,
+    mean: bool = False,
+    std: bool = False,
+    engine: Optional[RollingQuantile] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Trailing-window statistics for every sample in one pass.
+
+    Row i describes the window ending at (and including) sample i.
+
+    Args:
+        values: Input samples
+        window: Window length in samples (None = expanding); ignored if engine is given
+        quantiles: Quantiles in [0, 1] to evaluate per row
+        percentile_rank: Include rank of each sample within its window, in percent
+        mean: Include rolling mean
+        std: Include rolling population standard deviation
+        engine: Existing RollingQuantile to continue from; it is left holding the final window
+
+    Returns:
+        Dictionary with 'count' (window size per row) and any requested of
+        'quantiles' (n, len(quantiles)), 'percentile_rank', 'mean', 'std'
+    """
+    data = np.asarray(values, dtype=np.float64)
+    n = len(data)
+    engine = engine if engine is not None else RollingQuantile(window)
+
+    result: Dict[str, np.ndarray] = {'count': np.empty(n, dtype=np.int64)}
+    if quantiles:
+        result['quantiles'] = np.empty((n, len(quantiles)))
+    if percentile_rank:
+        result['percentile_rank'] = np.empty(n)
+    if mean:
+        result['mean'] = np.empty(n)
+    if std:
+        result['std'] = np.empty(n)
+
+    for i, value in enumerate(data.tolist()):
+        engine.push(value)
+        result['count'][i] = len(engine)
+        for j, q in enumerate(quantiles):
+            result['quantiles'][i, j] = engine.quantile(q)
+        if percentile_rank:
+            result['percentile_rank'][i] = engine.percentile_rank(value)
+        if mean:
+            result['mean'][i] = engine.mean
+        if std:
+            result['std'][i] = engine.std
+
+    return result
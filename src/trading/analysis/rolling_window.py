@@ -0,0 +1,165 @@
+"""
+Rolling Window Indicators
+
+O(1) sliding-window statistics for live indicator reads.
+
+Indicator code used to materialize the last N samples as a list
+(list(history)[-n:]) and rescan it for every read. RollingWindow is updated
+once per sample and answers reads in O(1):
+
+- sum / mean / std  Welford add/remove (RollingMoments)
+- min / max         monotonic deques (amortized O(1) per push)
+- last / values()   preallocated ring array, no per-push allocation
+
+Ewma is the matching incremental exponentially weighted mean.
+
+NaN follows NumPy semantics: any NaN in the window makes the statistics NaN.
+"""
+
+import math
+from collections import deque
+from typing import Deque, Iterable, Optional, Tuple
+
+import numpy as np
+
+from trading.analysis.rolling_quantile import RollingMoments
+
+
+class RollingWindow:
+    """Fixed-size sliding window with incremental mean/std and min/max."""
+    __slots__ = ('size', '_data', '_count', '_moments', '_mins', '_maxs')
+
+    def __init__(self, size: int, values: Optional[Iterable[float]] = None):
+        """
+        Args:
+            size: Window length (samples)
+            values: Optional initial samples (only the last `size` are kept)
+        """
+        if size <= 0:
+            raise ValueError(f"size must be positive, got {size}")
+        self.size = size
+        self._data = np.zeros(size, dtype=np.float64)
+        self.clear()
+        if values is not None:
+            for value in values:
+                self.push(value)
+
+    def clear(self) -> None:
+        self._count = 0                                  # Samples pushed since clear()
+        self._moments = RollingMoments()
+        self._mins: Deque[Tuple[int, float]] = deque()   # (index, value), values increasing
+        self._maxs: Deque[Tuple[int, float]] = deque()   # (index, value), values decreasing
+
+    def push(self, value: float) -> None:
+        """Append a sample, evicting the oldest one if the window is full."""
+        value = float(value)
+        index = self._count
+        slot = index % self.size
+        if index >= self.size:
+            self._moments.remove(self._data.item(slot))
+            expired = index - self.size
+            if self._mins and self._mins[0][0] <= expired:
+                self._mins.popleft()
+            if self._maxs and self._maxs[0][0] <= expired:
+                self._maxs.popleft()
+
+        self._data[slot] = value
+        self._count = index + 1
+        self._moments.add(value)
+        if value == value:
+            mins = self._mins
+            while mins and mins[-1][1] >= value:
+                mins.pop()
+            mins.append((index, value))
+            maxs = self._maxs
+            while maxs and maxs[-1][1] <= value:
+                maxs.pop()
+            maxs.append((index, value))
+
+    # -------------------------------------------------------------------------
+    # Access
+    # -------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return min(self._count, self.size)
+
+    @property
+    def is_full(self) -> bool:
+        return self._count >= self.size
+
+    def last(self) -> float:
+        """Most recent sample (NaN if empty)."""
+        if not self._count:
+            return math.nan
+        return self._data.item((self._count - 1) % self.size)
+
+    def values(self) -> np.ndarray:
+        """Window contents, oldest first (copy; for diagnostics)."""
+        if self._count <= self.size:
+            return self._data[:self._count].copy()
+        return np.roll(self._data, -(self._count % self.size))
+
+    # -------------------------------------------------------------------------
+    # Statistics
+    # -------------------------------------------------------------------------
+
+    @property
+    def sum(self) -> float:
+        if not self._count:
+            return 0.0
+        return self._moments.mean * len(self)
+
+    @property
+    def mean(self) -> float:
+        return self._moments.mean
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation (ddof=0)."""
+        return self._moments.std
+
+    @property
+    def min(self) -> float:
+        if self._moments.nan_count or not self._mins:
+            return math.nan
+        return self._mins[0][1]
+
+    @property
+    def max(self) -> float:
+        if self._moments.nan_count or not self._maxs:
+            return math.nan
+        return self._maxs[0][1]
+
+    @property
+    def range(self) -> float:
+        """max - min of the window."""
+        return self.max - self.min
+
+
+class Ewma:
+    """Incremental exponentially weighted moving average (pandas ewm(adjust=False))."""
+    __slots__ = ('alpha', 'value', 'count')
+
+    def __init__(self, span: Optional[float] = None, alpha: Optional[float] = None):
+        """
+        Args:
+            span: Decay in samples (alpha = 2 / (span + 1))
+            alpha: Smoothing factor in (0, 1] (overrides span)
+        """
+        if alpha is None:
+            if span is None or span < 1:
+                raise ValueError(f"span must be >= 1, got {span}")
+            alpha = 2.0 / (span + 1.0)
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError(f"alpha must be in (0, 1], got {alpha}")
+        self.alpha = alpha
+        self.value = math.nan
+        self.count = 0
+
+    def push(self, value: float) -> float:
+        """Update with a sample (NaN is skipped) and return the average."""
+        value = float(value)
+        if value == value:
+            self.value = value if not self.count else self.value + self.alpha * (value - self.value)
+            self.count += 1
+        return self.value
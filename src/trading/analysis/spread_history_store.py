@@ -0,0 +1,314 @@
+"""
+Spread History Snapshots
+
+Warm start for live spread histories.
+
+Arbitrage tasks used to rebuild their spread history on every start by running
+an ArbitrageAnalyzer over days of candles, delaying trading by minutes. Running
+tasks now persist their history buffers periodically; on start the snapshot is
+restored and only the gap since it was written is backfilled. The full analyzer
+run remains the fallback when no (fresh) snapshot exists.
+
+Snapshot file layout (little-endian):
+
+    b'SPRH' | uint16 version | uint32 header length | header (msgspec JSON) | float64 series data
+
+The header records the series names and lengths (in data order), the timestamp
+of the newest sample and the rolling statistics at save time. Files are written
+by a background PersistenceWriter (atomic rename), so saving never blocks the
+event loop on disk I/O.
+"""
+
+import asyncio
+import struct
+import time
+from collections import deque
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Mapping, MutableMapping, Optional, Tuple, Union
+
+import msgspec
+import numpy as np
+import pandas as pd
+
+from infrastructure.logging import HFTLoggerInterface, get_logger
+from trading.analysis.ring_buffer import RingBuffer
+from trading.task_manager.persistence_writer import DurabilityPolicy, PersistenceWriter
+
+SNAPSHOT_MAGIC = b'SPRH'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = '.sprh'
+
+_PREFIX = struct.Struct('<4sHI')
+
+SpreadBuffer = Union[RingBuffer, deque]
+Backfill = Callable[[float], Awaitable[Optional[Mapping[str, np.ndarray]]]]
+
+
+class _SnapshotHeader(msgspec.Struct):
+    key: str
+    written_at: float
+    last_timestamp: float
+    interval_seconds: float
+    series: List[Tuple[str, int]]
+    stats: Dict[str, Dict[str, float]] = {}
+
+
+class SpreadHistorySnapshot(msgspec.Struct):
+    """Decoded snapshot: spread series (oldest first) and when they were taken."""
+    key: str
+    written_at: float                      # Epoch seconds the snapshot was taken
+    last_timestamp: float                  # Epoch seconds of the newest sample
+    interval_seconds: float                # Nominal sampling interval of the series
+    series: Dict[str, np.ndarray]
+    stats: Dict[str, Dict[str, float]] = {}
+
+    def age(self, now: Optional[float] = None) -> float:
+        """Seconds since the newest sample."""
+        return (time.time() if now is None else now) - self.last_timestamp
+
+    def restore(self, buffers: Mapping[str, SpreadBuffer]) -> int:
+        """
+        Append the snapshot series to the matching buffers.
+
+        Returns:
+            Number of samples restored into the longest series
+        """
+        restored = 0
+        for name, values in self.series.items():
+            buffer = buffers.get(name)
+            if buffer is None:
+                continue
+            buffer.extend(values if isinstance(buffer, RingBuffer) else values.tolist())
+            restored = max(restored, len(values))
+        return restored
+
+
+def _series_stats(values: np.ndarray) -> Dict[str, float]:
+    if not len(values):
+        return {}
+    return {
+        'mean': float(np.mean(values)),
+        'std': float(np.std(values)),
+        'min': float(np.min(values)),
+        'max': float(np.max(values)),
+    }
+
+
+def encode_snapshot(key: str, buffers: Mapping[str, Union[SpreadBuffer, np.ndarray]],
+                    last_timestamp: float, interval_seconds: float,
+                    written_at: Optional[float] = None) -> bytes:
+    """
+    Serialize spread buffers into the compact binary snapshot format.
+
+    Args:
+        key: Snapshot identifier (task type + symbol + exchanges)
+        buffers: Series name -> RingBuffer, deque or array (oldest first)
+        last_timestamp: Epoch seconds of the newest sample
+        interval_seconds: Nominal sampling interval of the series
+        written_at: Snapshot time (default: now)
+
+    Returns:
+        Snapshot bytes
+    """
+    arrays = {}
+    stats = {}
+    for name, buffer in buffers.items():
+        if isinstance(buffer, RingBuffer):
+            array = buffer.values()
+            stats[name] = {'mean': buffer.mean, 'std': buffer.std, 'min': buffer.min, 'max': buffer.max} \
+                if len(buffer) else {}
+        else:
+            array = np.asarray(buffer if isinstance(buffer, np.ndarray) else list(buffer), dtype=np.float64)
+            stats[name] = _series_stats(array)
+        arrays[name] = np.ascontiguousarray(array, dtype='<f8')
+
+    header = msgspec.json.encode(_SnapshotHeader(
+        key=key,
+        written_at=time.time() if written_at is None else written_at,
+        last_timestamp=last_timestamp,
+        interval_seconds=interval_seconds,
+        series=[(name, len(array)) for name, array in arrays.items()],
+        stats=stats,
+    ))
+    return b''.join([_PREFIX.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header)), header,
+                     *(array.tobytes() for array in arrays.values())])
+
+
+def decode_snapshot(data: bytes) -> SpreadHistorySnapshot:
+    """
+    Parse snapshot bytes.
+
+    Raises:
+        ValueError: If the data is not a valid snapshot of a supported version
+    """
+    if len(data) < _PREFIX.size:
+        raise ValueError("Truncated spread snapshot")
+    magic, version, header_length = _PREFIX.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("Not a spread snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported spread snapshot version {version}")
+
+    offset = _PREFIX.size + header_length
+    try:
+        header = msgspec.json.decode(data[_PREFIX.size:offset], type=_SnapshotHeader)
+    except msgspec.DecodeError as e:
+        raise ValueError(f"Corrupt spread snapshot header: {e}") from e
+
+    series = {}
+    for name, length in header.series:
+        end = offset + length * 8
+        if end > len(data):
+            raise ValueError(f"Truncated spread snapshot series '{name}'")
+        series[name] = np.frombuffer(data, dtype='<f8', count=length, offset=offset).astype(np.float64)
+        offset = end
+
+    return SpreadHistorySnapshot(key=header.key, written_at=header.written_at,
+                                 last_timestamp=header.last_timestamp,
+                                 interval_seconds=header.interval_seconds,
+                                 series=series, stats=header.stats)
+
+
+def rows_after(df: pd.DataFrame, since: float) -> pd.DataFrame:
+    """Rows of a time-indexed frame strictly newer than `since` (epoch seconds, naive index = UTC)."""
+    if df.empty:
+        return df
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is None:
+        index = index.tz_localize('UTC')
+    return df[index > pd.Timestamp(since, unit='s', tz='UTC')]
+
+
+class SpreadHistoryStore:
+    """
+    Directory of spread history snapshots, one file per key.
+
+    Usage:
+        store = get_spread_history_store()
+        restored = await store.warm_start(key, buffers, backfill=load_gap, max_age_seconds=86400)
+        if not restored:
+            ...  # Full analyzer load
+        store.save(key, buffers, last_timestamp=time.time(), interval_seconds=300)
+    """
+
+    def __init__(self, base_path: str = "spread_history", logger: Optional[HFTLoggerInterface] = None,
+                 durability: Optional[DurabilityPolicy] = None):
+        """
+        Args:
+            base_path: Snapshot directory
+            logger: Logger (default: module logger)
+            durability: Write policy (default: every change, no fsync - snapshots are a cache)
+        """
+        self.base_path = Path(base_path)
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        self.logger = logger or get_logger('spread_history_store')
+        self._writer = PersistenceWriter(self.logger, durability or DurabilityPolicy(fsync=False),
+                                         name="spread-history-writer")
+
+    def path(self, key: str) -> Path:
+        return self.base_path / f"{key}{SNAPSHOT_SUFFIX}"
+
+    def save(self, key: str, buffers: Mapping[str, Union[SpreadBuffer, np.ndarray]],
+             last_timestamp: Optional[float] = None, interval_seconds: float = 300.0) -> None:
+        """
+        Snapshot buffers now and queue the file write.
+
+        Args:
+            key: Snapshot identifier
+            buffers: Series name -> buffer
+            last_timestamp: Epoch seconds of the newest sample (default: now)
+            interval_seconds: Nominal sampling interval
+        """
+        data = encode_snapshot(key, buffers, time.time() if last_timestamp is None else last_timestamp,
+                               interval_seconds)
+        self._writer.submit(key, self.path(key), data)
+
+    def load(self, key: str, max_age_seconds: Optional[float] = None,
+             now: Optional[float] = None) -> Optional[SpreadHistorySnapshot]:
+        """
+        Read a snapshot.
+
+        Args:
+            key: Snapshot identifier
+            max_age_seconds: Ignore snapshots whose newest sample is older than this
+            now: Reference epoch time (default: now)
+
+        Returns:
+            Snapshot, or None if missing, unreadable or stale
+        """
+        self._writer.flush()
+        path = self.path(key)
+        try:
+            snapshot = decode_snapshot(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable spread snapshot {path.name}", error=str(e))
+            return None
+
+        if max_age_seconds is not None and snapshot.age(now) > max_age_seconds:
+            self.logger.info(f"Spread snapshot {key} is stale",
+                             age_seconds=round(snapshot.age(now)), max_age_seconds=max_age_seconds)
+            return None
+        return snapshot
+
+    async def warm_start(self, key: str, buffers: MutableMapping[str, SpreadBuffer],
+                         backfill: Optional[Backfill] = None,
+                         max_age_seconds: Optional[float] = None) -> bool:
+        """
+        Restore buffers from the snapshot and backfill the gap since it was written.
+
+        Args:
+            key: Snapshot identifier
+            buffers: Series name -> buffer to append to
+            backfill: async callable(since_epoch_seconds) returning the samples newer
+                than `since` per series (failures keep the restored history)
+            max_age_seconds: Snapshots older than this are ignored
+
+        Returns:
+            True if the buffers were restored from a snapshot (False = caller should do a full load)
+        """
+        now = time.time()
+        snapshot = await asyncio.to_thread(self.load, key, max_age_seconds, now)
+        if snapshot is None:
+            return False
+
+        restored = snapshot.restore(buffers)
+        backfilled = 0
+        if backfill is not None and snapshot.age(now) > snapshot.interval_seconds:
+            try:
+                gap = await backfill(snapshot.last_timestamp)
+            except Exception as e:
+                self.logger.warning(f"Spread history backfill failed for {key}", error=str(e))
+                gap = None
+            for name, values in (gap or {}).items():
+                buffer = buffers.get(name)
+                if buffer is not None and len(values):
+                    values = np.asarray(values, dtype=np.float64)
+                    buffer.extend(values if isinstance(buffer, RingBuffer) else values.tolist())
+                    backfilled = max(backfilled, len(values))
+
+        self.logger.info(f"Spread history warm start for {key}", restored=restored, backfilled=backfilled,
+                         snapshot_age_seconds=round(snapshot.age(now)))
+        return True
+
+    def delete(self, key: str) -> None:
+        self._writer.submit(key, None, remove=[self.path(key)])
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until queued snapshots are written (False on timeout)."""
+        return self._writer.flush(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        self._writer.close(timeout)
+
+
+_stores: Dict[str, SpreadHistoryStore] = {}
+
+
+def get_spread_history_store(base_path: str = "spread_history") -> SpreadHistoryStore:
+    """Shared store per directory (one writer thread for all tasks)."""
+    store = _stores.get(base_path)
+    if store is None:
+        store = _stores[base_path] = SpreadHistoryStore(base_path)
+    return store
@@ -0,0 +1,375 @@
+"""
+Streaming Quantile Estimators
+
+Per-tick quantiles without recomputing percentiles over the full history.
+
+Live entry/exit thresholds used to call np.percentile over whole history arrays
+on every evaluation (O(n log n) per tick). The estimators here are updated once
+per sample and answer quantile queries in O(1) / O(log n):
+
+- RollingQuantile(window)  exact quantiles over a sliding window, O(log W)
+                           (trading.analysis.rolling_quantile, for small windows)
+- P2Quantile(q)            P² single-quantile estimator (Jain & Chlamtac), O(1)
+                           push and query, five markers of state
+- TDigest(compression)     merging t-digest in NumPy: arbitrary quantiles over an
+                           unbounded stream, amortized O(1) push, bounded query cost
+
+All of them implement the QuantileEstimator protocol (push / quantile /
+percentile / len), so threshold code can switch between exact windowed and
+approximate unbounded estimation through create_quantile_estimator().
+
+WindowExtremes turns a spread stream into the ArbStats thresholds: percentiles
+of rolling-window minima and maxima, as computed by calculate_arb_signals().
+
+NaN handling: RollingQuantile follows NumPy (NaN in the window -> NaN). The
+unbounded estimators skip NaN samples (a single NaN would otherwise poison
+them forever) and count them in `nan_count`.
+"""
+
+import math
+from collections import deque
+from typing import Callable, Deque, Iterable, List, Optional, Protocol, runtime_checkable
+
+import numpy as np
+
+from trading.analysis.rolling_quantile import RollingQuantile, quantile_sorted
+
+
+@runtime_checkable
+class QuantileEstimator(Protocol):
+    """Common interface of streaming quantile estimators."""
+
+    def push(self, value: float) -> None:
+        ...
+
+    def quantile(self, q: float) -> float:
+        ...
+
+    def percentile(self, p: float) -> float:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+
+# =============================================================================
+# P² estimator
+# =============================================================================
+
+class P2Quantile:
+    """
+    P² estimator of a single quantile with O(1) memory and update cost.
+
+    Five markers track the minimum, the q/2, q and (1+q)/2 quantiles and the
+    maximum; marker heights are adjusted with piecewise-parabolic interpolation.
+    Exact while fewer than five samples were seen.
+    """
+    __slots__ = ('q', 'count', 'nan_count', '_heights', '_positions', '_desired', '_increments')
+
+    def __init__(self, q: float):
+        """
+        Args:
+            q: Tracked quantile in (0, 1)
+        """
+        if not 0.0 < q < 1.0:
+            raise ValueError(f"q must be in (0, 1), got {q}")
+        self.q = q
+        self.count = 0
+        self.nan_count = 0
+        self._heights: List[float] = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1.0, 1.0 + 2 * q, 1.0 + 4 * q, 3.0 + 2 * q, 5.0]
+        self._increments = (0.0, q / 2, q, (1.0 + q) / 2, 1.0)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def push(self, value: float) -> None:
+        value = float(value)
+        if value != value:
+            self.nan_count += 1
+            return
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            heights.append(value)
+            if self.count == 5:
+                heights.sort()
+            return
+
+        # Find the cell of the new sample, extending the extremes if needed
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+
+        positions = self._positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        desired = self._desired
+        increments = self._increments
+        for i in range(5):
+            desired[i] += increments[i]
+
+        # Move the middle markers towards their desired positions
+        for i in (1, 2, 3):
+            offset = desired[i] - positions[i]
+            if (offset >= 1.0 and positions[i + 1] - positions[i] > 1) or \
+                    (offset <= -1.0 and positions[i - 1] - positions[i] < -1):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        heights = self._heights
+        positions = self._positions
+        span = positions[i + 1] - positions[i - 1]
+        right = (positions[i] - positions[i - 1] + step) * (heights[i + 1] - heights[i]) / (positions[i + 1] - positions[i])
+        left = (positions[i + 1] - positions[i] - step) * (heights[i] - heights[i - 1]) / (positions[i] - positions[i - 1])
+        return heights[i] + step / span * (right + left)
+
+    def quantile(self, q: Optional[float] = None) -> float:
+        """Estimate of the tracked quantile (q must be None or the tracked one)."""
+        if q is not None and not math.isclose(q, self.q):
+            raise ValueError(f"P2Quantile tracks q={self.q}, not {q}")
+        if not self.count:
+            return math.nan
+        if self.count < 5:
+            return quantile_sorted(sorted(self._heights), self.q)
+        return self._heights[2]
+
+    def percentile(self, p: Optional[float] = None) -> float:
+        return self.quantile(None if p is None else p / 100)
+
+
+# =============================================================================
+# t-digest
+# =============================================================================
+
+class TDigest:
+    """
+    Merging t-digest (Dunning) with NumPy centroid arrays.
+
+    Samples are collected in a preallocated buffer and merged into at most
+    ~compression centroids with the k1 (arcsine) scale, which keeps centroids
+    small near the tails, so extreme quantiles stay accurate. Queries merge the
+    pending buffer first; their cost is bounded by compression + buffer size,
+    independent of the number of samples seen.
+    """
+    __slots__ = ('compression', 'count', 'nan_count', 'min', 'max',
+                 '_means', '_weights', '_buffer', '_buffered', '_cumulative')
+
+    def __init__(self, compression: float = 100.0, buffer_size: Optional[int] = None):
+        """
+        Args:
+            compression: Accuracy parameter (max centroids ~ compression)
+            buffer_size: Samples buffered between merges (default: 5 * compression)
+        """
+        if compression < 10:
+            raise ValueError(f"compression must be >= 10, got {compression}")
+        self.compression = float(compression)
+        self.count = 0
+        self.nan_count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means = np.empty(0, dtype=np.float64)
+        self._weights = np.empty(0, dtype=np.float64)
+        self._buffer = np.empty(buffer_size or int(5 * compression), dtype=np.float64)
+        self._buffered = 0
+        self._cumulative: Optional[np.ndarray] = None   # Centroid centers in cumulative weight (cached)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def push(self, value: float) -> None:
+        value = float(value)
+        if value != value:
+            self.nan_count += 1
+            return
+        self._buffer[self._buffered] = value
+        self._buffered += 1
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if self._buffered == len(self._buffer):
+            self._merge()
+
+    def extend(self, values: Iterable[float]) -> None:
+        values = np.asarray(values if isinstance(values, np.ndarray) else list(values), dtype=np.float64)
+        for value in values:
+            self.push(value)
+
+    def _merge(self) -> None:
+        pending = self._buffer[:self._buffered]
+        means = np.concatenate((self._means, pending))
+        weights = np.concatenate((self._weights, np.ones(self._buffered)))
+        self._buffered = 0
+        self._cumulative = None
+
+        order = np.argsort(means, kind='stable')
+        means = means[order]
+        weights = weights[order]
+        total = weights.sum()
+
+        # k1 scale: centroids whose centers fall in the same unit k-interval are merged
+        centers = (np.cumsum(weights) - weights / 2) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * centers - 1)
+        bins = np.floor(k - k[0]).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+
+        merged_weights = np.add.reduceat(weights, starts)
+        self._means = np.add.reduceat(means * weights, starts) / merged_weights
+        self._weights = merged_weights
+
+    def _centroids(self):
+        if self._buffered:
+            self._merge()
+        if self._cumulative is None:
+            self._cumulative = np.cumsum(self._weights) - self._weights / 2
+        return self._means, self._weights, self._cumulative
+
+    def quantile(self, q: float) -> float:
+        """Estimated quantile (q in [0, 1])."""
+        if not self.count:
+            return math.nan
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        means, weights, cumulative = self._centroids()
+        if len(means) == 1:
+            return float(means[0])
+        total = float(self.count)
+        xs = np.concatenate(([0.0], cumulative, [total]))
+        ys = np.concatenate(([self.min], means, [self.max]))
+        return float(np.interp(q * total, xs, ys))
+
+    def percentile(self, p: float) -> float:
+        return self.quantile(p / 100)
+
+    def cdf(self, value: float) -> float:
+        """Estimated fraction of samples below `value`."""
+        if not self.count:
+            return math.nan
+        if value <= self.min:
+            return 0.0
+        if value >= self.max:
+            return 1.0
+        means, weights, cumulative = self._centroids()
+        total = float(self.count)
+        xs = np.concatenate(([self.min], means, [self.max]))
+        ys = np.concatenate(([0.0], cumulative, [total]))
+        return float(np.interp(value, xs, ys)) / total
+
+    @property
+    def centroid_count(self) -> int:
+        return len(self._centroids()[0])
+
+
+# =============================================================================
+# Factory and window extremes
+# =============================================================================
+
+ESTIMATOR_WINDOW = 'window'
+ESTIMATOR_P2 = 'p2'
+ESTIMATOR_TDIGEST = 'tdigest'
+
+EstimatorFactory = Callable[[], QuantileEstimator]
+
+
+def create_quantile_estimator(kind: str = ESTIMATOR_WINDOW, *, window: Optional[int] = None,
+                              q: float = 0.25, compression: float = 100.0) -> EstimatorFactory:
+    """
+    Factory for a QuantileEstimator kind.
+
+    Args:
+        kind: 'window' (exact RollingQuantile over the last `window` samples),
+            'p2' (P² for quantile q) or 'tdigest' (t-digest, any quantile)
+        window: Window size for 'window' (None = unbounded exact history)
+        q: Quantile tracked by 'p2'
+        compression: t-digest compression
+
+    Returns:
+        Zero-argument callable creating a fresh estimator
+    """
+    if kind == ESTIMATOR_WINDOW:
+        return lambda: RollingQuantile(window)
+    if kind == ESTIMATOR_P2:
+        return lambda: P2Quantile(q)
+    if kind == ESTIMATOR_TDIGEST:
+        return lambda: TDigest(compression)
+    raise ValueError(f"Unknown quantile estimator '{kind}'")
+
+
+class WindowExtremes:
+    """
+    Streaming percentiles of rolling-window minima and maxima.
+
+    Every `step` samples the minimum and maximum of the last `window_size`
+    samples are pushed into two estimators. With an unbounded exact estimator
+    this reproduces the thresholds of calculate_arb_signals() over the whole
+    stream (windows start at offsets 0, step, 2 * step, ...).
+    """
+    __slots__ = ('window_size', 'step', 'count', '_window', '_factory', 'mins', 'maxs')
+
+    def __init__(self, window_size: int = 10, step: Optional[int] = None,
+                 estimator: Optional[EstimatorFactory] = None):
+        """
+        Args:
+            window_size: Window length for the extremes (>= 2)
+            step: Samples between windows (default: window_size // 2)
+            estimator: Estimator factory for the extremes (default: exact, unbounded)
+        """
+        if window_size < 2:
+            raise ValueError(f"window_size must be >= 2, got {window_size}")
+        self.window_size = window_size
+        self.step = step or window_size // 2
+        self._factory = estimator or create_quantile_estimator(ESTIMATOR_WINDOW)
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self._window: Deque[float] = deque(maxlen=self.window_size)
+        self.mins: QuantileEstimator = self._factory()
+        self.maxs: QuantileEstimator = self._factory()
+
+    def __len__(self) -> int:
+        """Number of windows seen."""
+        return len(self.mins)
+
+    def push(self, value: float) -> None:
+        value = float(value)
+        self._window.append(value)
+        self.count += 1
+        offset = self.count - self.window_size
+        if offset >= 0 and offset % self.step == 0:
+            window = self._window
+            if all(v == v for v in window):
+                self.mins.push(min(window))
+                self.maxs.push(max(window))
+            else:
+                self.mins.push(math.nan)
+                self.maxs.push(math.nan)
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.push(value)
+
+    def min_percentile(self, p: float) -> float:
+        """p-th percentile of the window minima."""
+        return self.mins.percentile(p)
+
+    def max_percentile(self, p: float) -> float:
+        """p-th percentile of the window maxima."""
+        return self.maxs.percentile(p)
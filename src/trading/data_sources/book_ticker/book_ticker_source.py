@@ -32,9 +32,9 @@ class BookTickerSourceProtocol(Protocol):
 class BookTickerDbSource(BookTickerSourceProtocol):
     """Book ticker data source using snapshot loader and candles loader."""
 
-    def __init__(self, window_minutes: int = 1):
+    def __init__(self, window_minutes: int = 1, server_side_buckets: bool = True):
         self.window_minutes = window_minutes
-        self.snapshot_loader = BookTickerSnapshotLoader()
+        self.snapshot_loader = BookTickerSnapshotLoader(server_side_buckets=server_side_buckets)
 
     async def get_multi_exchange_data(
         self,
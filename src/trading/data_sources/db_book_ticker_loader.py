@@ -2,6 +2,8 @@
 Simple data loader utility with file-based caching for book ticker snapshots.
 
 Rounds timestamps to 5-minute intervals to enable efficient caching and reduce DB calls.
+When a rounding interval is requested, buckets are aggregated on the database server
+(time_bucket + last) so only one row per bucket is transferred.
 """
 
 import asyncio
@@ -20,15 +22,26 @@ class BookTickerSnapshotLoader:
     """Simple data loader with file-based caching for book ticker data."""
     
     def __init__(self, cache_dir: str = "book_tickers",
-                 logger: HFTLoggerInterface = None):
-        """Initialize with cache directory."""
+                 logger: HFTLoggerInterface = None,
+                 server_side_buckets: bool = True):
+        """
+        Initialize with cache directory.
+
+        Args:
+            cache_dir: Cache sub-directory under HftConfig.cache_dir
+            logger: Optional logger
+            server_side_buckets: Aggregate rounded requests in the database instead of
+                loading raw snapshots and rescaling them in pandas
+        """
         self.cache_dir = HftConfig.cache_dir / cache_dir
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.logger = logger or get_logger(__name__)
+        self.server_side_buckets = server_side_buckets
     
 
     def _generate_cache_key(self, exchange: str, symbol_base: str, symbol_quote: str, 
-                           start_time: datetime, end_time: datetime, rounding_seconds: int) -> str:
+                           start_time: datetime, end_time: datetime, rounding_seconds: int,
+                           bucketed: bool = False) -> str:
         """Generate cache key from parameters."""
         start_rounded = round_datetime_to_interval(start_time, rounding_seconds)
         end_rounded = round_datetime_to_interval(end_time, rounding_seconds)
@@ -36,7 +49,9 @@ class BookTickerSnapshotLoader:
         start_str = start_rounded.strftime("%Y%m%d_%H%M%S")
         end_str = end_rounded.strftime("%Y%m%d_%H%M%S")
         
-        return f"{exchange}_{symbol_base}_{symbol_quote}_{start_str}_{end_str}.pkl"
+        # Bucketed frames are already aggregated, so the bucket width is part of the key
+        suffix = f"_{rounding_seconds}s" if bucketed else ""
+        return f"{exchange}_{symbol_base}_{symbol_quote}_{start_str}_{end_str}{suffix}.pkl"
     
     def _load_from_cache(self, cache_key: str) -> Optional[pd.DataFrame]:
         """Load dataframe from cache file."""
@@ -68,6 +83,10 @@ class BookTickerSnapshotLoader:
         First checks cache, falls back to DB if not found.
         Rounds timestamps to 5-minute intervals for cache efficiency.
         """
+        if rounding_seconds and self.server_side_buckets:
+            return await self._get_bucketed_dataframe(exchange, symbol_base, symbol_quote,
+                                                      start_time, end_time, rounding_seconds)
+
         # Generate cache key
         cache_key = self._generate_cache_key(exchange, symbol_base, symbol_quote, start_time, end_time, rounding_seconds)
         
@@ -101,6 +120,36 @@ class BookTickerSnapshotLoader:
         
         return df
 
+    async def _get_bucketed_dataframe(self, exchange: str, symbol_base: str, symbol_quote: str,
+                                      start_time: datetime, end_time: datetime,
+                                      rounding_seconds: int) -> pd.DataFrame:
+        """Get server-side bucketed book ticker dataframe with caching."""
+        cache_key = self._generate_cache_key(exchange, symbol_base, symbol_quote, start_time, end_time,
+                                             rounding_seconds, bucketed=True)
+
+        df = self._load_from_cache(cache_key)
+        if df is not None:
+            self.logger.info(f"  📁 Loaded from cache: {cache_key}")
+            return df
+
+        self.logger.info(f"  🗄️  Loading {rounding_seconds}s book ticker buckets from database "
+                         f"{exchange} {symbol_base} {symbol_quote}...")
+        db_manager = await get_database_manager()
+        df = await db_manager.get_book_ticker_bucketed_dataframe(
+            exchange=exchange,
+            symbol_base=symbol_base,
+            symbol_quote=symbol_quote,
+            start_time=start_time,
+            end_time=end_time,
+            bucket_seconds=rounding_seconds,
+        )
+
+        if not df.empty:
+            self._save_to_cache(df, cache_key)
+            self.logger.info(f"  💾 Cached as: {cache_key}")
+
+        return df
+
     # python
     def rescale_to_seconds(self, df: pd.DataFrame, window_seconds: int = 1) -> pd.DataFrame:
         """Rescale book ticker data using the dataframe index as the timestamp."""
@@ -0,0 +1,96 @@
+"""
+Parquet Cache for Market Data Sources
+
+Wraps any BookTickerSourceProtocol source and stores each fetched
+multi-exchange frame as a Parquet file keyed by the request parameters.
+Repeated research runs (walk-forward, parameter searches) then read local
+files instead of hitting the database, and with offline=True they never do.
+
+Only requests with an explicit date_to are cached; "latest N hours"
+requests (date_to=None) always go to the wrapped source.
+"""
+
+import hashlib
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+
+from exchanges.structs import ExchangeEnum, Symbol
+from exchanges.structs.enums import KlineInterval
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    try:
+        import fastparquet  # noqa: F401
+        PARQUET_AVAILABLE = True
+    except ImportError:
+        PARQUET_AVAILABLE = False
+
+
+class ParquetCachedSource:
+    """Read-through Parquet cache in front of a market data source."""
+
+    def __init__(self, source=None, cache_dir: Union[str, Path] = 'data/cache/market_data', offline: bool = False):
+        """
+        Initialize cached source.
+
+        Args:
+            source: Wrapped source with get_multi_exchange_data (None requires offline=True)
+            cache_dir: Directory for cached Parquet files
+            offline: Never call the wrapped source; missing files raise FileNotFoundError
+        """
+        if not PARQUET_AVAILABLE:
+            raise ImportError("pyarrow or fastparquet is required for the Parquet cache. Install with: pip install pyarrow")
+        if source is None and not offline:
+            raise ValueError("A source is required unless offline=True")
+        self.source = source
+        self.cache_dir = Path(cache_dir)
+        self.offline = offline
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def cache_path(self, exchanges: list[ExchangeEnum], symbol: Symbol, date_to: datetime, hours: int,
+                   timeframe: Union[KlineInterval, int]) -> Path:
+        """Cache file for a request (human-readable prefix plus a short hash of all parameters)."""
+        timeframe_key = timeframe if isinstance(timeframe, int) else timeframe.name
+        exchanges_key = '-'.join(exchange.name for exchange in exchanges)
+        date_key = pd.Timestamp(date_to).strftime('%Y%m%dT%H%M%S')
+        raw = f"{symbol.base}/{symbol.quote}|{exchanges_key}|{date_key}|{hours}|{timeframe_key}"
+        digest = hashlib.sha1(raw.encode()).hexdigest()[:10]
+        return self.cache_dir / f"{symbol.base}_{symbol.quote}_{date_key}_{hours}h_{timeframe_key}_{digest}.parquet"
+
+    async def get_multi_exchange_data(
+        self,
+        exchanges: list[ExchangeEnum],
+        symbol: Symbol,
+        date_to: Optional[datetime] = None,
+        hours: int = 24,
+        timeframe: Union[KlineInterval, int] = KlineInterval.MINUTE_1
+    ) -> pd.DataFrame:
+        """Fetch book ticker data from the cache, or from the wrapped source and cache it."""
+        if date_to is None:
+            if self.offline:
+                raise ValueError("Offline cache lookups need an explicit date_to")
+            return await self.source.get_multi_exchange_data(exchanges, symbol, date_to=date_to, hours=hours,
+                                                             timeframe=timeframe)
+
+        path = self.cache_path(exchanges, symbol, date_to, hours, timeframe)
+        if path.exists():
+            self.logger.debug(f"Loading cached market data from {path}")
+            return pd.read_parquet(path)
+        if self.offline:
+            raise FileNotFoundError(f"No cached market data at {path}")
+
+        df = await self.source.get_multi_exchange_data(exchanges, symbol, date_to=date_to, hours=hours,
+                                                       timeframe=timeframe)
+        if not df.empty:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.parquet.tmp')
+            df.to_parquet(tmp_path)
+            tmp_path.replace(path)
+            self.logger.info(f"Cached {len(df)} rows to {path}")
+        return df
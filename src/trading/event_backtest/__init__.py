@@ -0,0 +1,33 @@
+"""
+Event-driven tick backtesting.
+
+- market_streams: columnar book ticker / trade streams
+- order_matching: top-of-book matching with queue position and partial fills
+- simulated_exchange: exchange-side simulator and DualExchange-compatible client view
+- virtual_clock: asyncio event loop on simulated time
+- tick_engine: heap-merged replay with per-exchange latency
+"""
+
+from trading.event_backtest.market_streams import BookTickerStream, TradeStream
+from trading.event_backtest.order_matching import OrderMatcher, RestingOrder
+from trading.event_backtest.simulated_exchange import (
+    ExchangeSimulator, SimulatedExchange, SimulatedFill, SimulatedPrivateExchange, SimulatedPublicExchange
+)
+from trading.event_backtest.tick_engine import LatencyModel, TickBacktestEngine, TickBacktestStats
+from trading.event_backtest.virtual_clock import VirtualClockEventLoop
+
+__all__ = [
+    'BookTickerStream',
+    'TradeStream',
+    'OrderMatcher',
+    'RestingOrder',
+    'ExchangeSimulator',
+    'SimulatedExchange',
+    'SimulatedFill',
+    'SimulatedPrivateExchange',
+    'SimulatedPublicExchange',
+    'LatencyModel',
+    'TickBacktestEngine',
+    'TickBacktestStats',
+    'VirtualClockEventLoop',
+]
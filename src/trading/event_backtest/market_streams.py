@@ -0,0 +1,165 @@
+"""
+Market Data Streams
+
+Columnar (NumPy) containers for recorded book ticker and public trade
+streams. One stream holds one symbol on one exchange; the backtest engine
+merges any number of streams by timestamp.
+
+Timestamps are epoch milliseconds (int64), matching BookTicker.timestamp.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from exchanges.structs import BookTicker, Side, Symbol, Trade
+
+
+def _to_epoch_ms(df: pd.DataFrame, timestamp_column: str) -> np.ndarray:
+    """Epoch milliseconds from a timestamp column or a DatetimeIndex."""
+    if timestamp_column in df.columns:
+        values = df[timestamp_column]
+        if pd.api.types.is_numeric_dtype(values):
+            return values.to_numpy(dtype=np.int64)
+        index = pd.DatetimeIndex(pd.to_datetime(values, utc=True))
+    elif isinstance(df.index, pd.DatetimeIndex):
+        index = df.index
+    else:
+        raise ValueError(f"DataFrame needs a DatetimeIndex or a '{timestamp_column}' column")
+    return index.as_unit('ms').asi8.astype(np.int64)
+
+
+def _check_sorted(timestamps: np.ndarray, name: str) -> None:
+    if len(timestamps) > 1 and (np.diff(timestamps) < 0).any():
+        raise ValueError(f"{name} timestamps must be sorted")
+
+
+@dataclass
+class BookTickerStream:
+    """Top-of-book updates for one symbol."""
+    symbol: Symbol
+    timestamps: np.ndarray      # int64 epoch ms
+    bid_price: np.ndarray
+    bid_qty: np.ndarray
+    ask_price: np.ndarray
+    ask_qty: np.ndarray
+
+    def __post_init__(self):
+        self.timestamps = np.asarray(self.timestamps, dtype=np.int64)
+        for name in ('bid_price', 'bid_qty', 'ask_price', 'ask_qty'):
+            column = np.asarray(getattr(self, name), dtype=np.float64)
+            if len(column) != len(self.timestamps):
+                raise ValueError(f"Column {name} has {len(column)} rows, expected {len(self.timestamps)}")
+            setattr(self, name, column)
+        _check_sorted(self.timestamps, "Book ticker")
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_frame(cls, symbol: Symbol, df: pd.DataFrame, timestamp_column: str = 'timestamp') -> 'BookTickerStream':
+        """
+        Build from a DataFrame with bid_price/bid_qty/ask_price/ask_qty columns.
+
+        Args:
+            symbol: Symbol of the stream
+            df: Book ticker snapshots (e.g. BookTickerSnapshot rows)
+            timestamp_column: Column with timestamps; the index is used when absent
+        """
+        return cls(
+            symbol=symbol,
+            timestamps=_to_epoch_ms(df, timestamp_column),
+            bid_price=df['bid_price'].to_numpy(),
+            bid_qty=df['bid_qty'].to_numpy(),
+            ask_price=df['ask_price'].to_numpy(),
+            ask_qty=df['ask_qty'].to_numpy(),
+        )
+
+    @classmethod
+    def from_book_tickers(cls, tickers: Iterable[BookTicker], symbol: Optional[Symbol] = None) -> 'BookTickerStream':
+        """Build from BookTicker structs (e.g. recorded websocket messages)."""
+        tickers = list(tickers)
+        if symbol is None:
+            if not tickers:
+                raise ValueError("symbol is required for an empty stream")
+            symbol = tickers[0].symbol
+        return cls(
+            symbol=symbol,
+            timestamps=[t.timestamp for t in tickers],
+            bid_price=[t.bid_price for t in tickers],
+            bid_qty=[t.bid_quantity for t in tickers],
+            ask_price=[t.ask_price for t in tickers],
+            ask_qty=[t.ask_quantity for t in tickers],
+        )
+
+
+@dataclass
+class TradeStream:
+    """Public trades for one symbol."""
+    symbol: Symbol
+    timestamps: np.ndarray      # int64 epoch ms
+    price: np.ndarray
+    qty: np.ndarray
+    side: np.ndarray            # Taker side as int8 Side value (0 = unknown)
+
+    def __post_init__(self):
+        self.timestamps = np.asarray(self.timestamps, dtype=np.int64)
+        self.price = np.asarray(self.price, dtype=np.float64)
+        self.qty = np.asarray(self.qty, dtype=np.float64)
+        self.side = np.asarray(self.side, dtype=np.int8)
+        for name in ('price', 'qty', 'side'):
+            if len(getattr(self, name)) != len(self.timestamps):
+                raise ValueError(f"Column {name} has {len(getattr(self, name))} rows, expected {len(self.timestamps)}")
+        _check_sorted(self.timestamps, "Trade")
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_frame(cls, symbol: Symbol, df: pd.DataFrame, timestamp_column: str = 'timestamp') -> 'TradeStream':
+        """
+        Build from a DataFrame with price/quantity/side columns.
+
+        Args:
+            symbol: Symbol of the stream
+            df: Trades (e.g. TradeSnapshot rows); side is 'buy'/'sell', a Side or missing
+            timestamp_column: Column with timestamps; the index is used when absent
+        """
+        if 'side' in df.columns:
+            sides = df['side'].map(_side_code).to_numpy(dtype=np.int8)
+        else:
+            sides = np.zeros(len(df), dtype=np.int8)
+        qty_column = 'quantity' if 'quantity' in df.columns else 'qty'
+        return cls(
+            symbol=symbol,
+            timestamps=_to_epoch_ms(df, timestamp_column),
+            price=df['price'].to_numpy(),
+            qty=df[qty_column].to_numpy(),
+            side=sides,
+        )
+
+    @classmethod
+    def from_trades(cls, trades: Iterable[Trade], symbol: Optional[Symbol] = None) -> 'TradeStream':
+        """Build from Trade structs."""
+        trades = list(trades)
+        if symbol is None:
+            if not trades:
+                raise ValueError("symbol is required for an empty stream")
+            symbol = trades[0].symbol
+        return cls(
+            symbol=symbol,
+            timestamps=[t.timestamp for t in trades],
+            price=[t.price for t in trades],
+            qty=[t.quantity for t in trades],
+            side=[int(t.side) for t in trades],
+        )
+
+
+def _side_code(side) -> int:
+    if isinstance(side, Side):
+        return int(side)
+    if isinstance(side, str):
+        return {'buy': int(Side.BUY), 'sell': int(Side.SELL)}.get(side.lower(), 0)
+    return 0
@@ -0,0 +1,203 @@
+"""
+Order Matching with Queue Position
+
+Exchange-side matching for one symbol from top-of-book and public trade
+data. Recorded streams do not contain our orders, so fills are inferred:
+
+- A resting limit order joining the best level queues behind the displayed
+  quantity; a better price starts at the front, a worse one waits (unknown
+  queue) until its level becomes the best level
+- Trades at the order's price consume the queue ahead first; only the
+  excess volume fills the order, which produces partial fills
+- Trades through the price, or the opposite side of the book reaching it,
+  fill the remaining quantity
+- When the displayed size at the order's level shrinks without trades,
+  the queue ahead shrinks with it (cancellations ahead of us)
+
+Own orders do not queue behind each other. Depth beyond the top of book is
+not recorded, so marketable orders take the displayed top quantity at the
+top price and rest the remainder at their limit price.
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+from exchanges.structs import OrderId, Side
+
+# (order id, fill price, fill quantity)
+MatchedFill = Tuple[OrderId, float, float]
+
+_NO_FILLS: List[MatchedFill] = []
+
+
+class RestingOrder:
+    """Resting limit order with its estimated position in the queue."""
+    __slots__ = ('order_id', 'side', 'price', 'remaining', 'queue_ahead')
+
+    def __init__(self, order_id: OrderId, side: Side, price: float, remaining: float, queue_ahead: float):
+        self.order_id = order_id
+        self.side = side
+        self.price = price
+        self.remaining = remaining
+        self.queue_ahead = queue_ahead
+
+
+class OrderMatcher:
+    """Top of book and resting limit orders of one symbol on one exchange."""
+
+    def __init__(self, price_tolerance: float = 1e-12, qty_tolerance: float = 1e-12):
+        """
+        Args:
+            price_tolerance: Prices closer than this are the same level
+            qty_tolerance: Remaining quantity below this counts as filled
+        """
+        self.bid_price = math.nan
+        self.bid_qty = 0.0
+        self.ask_price = math.nan
+        self.ask_qty = 0.0
+        self.timestamp = 0
+        self.resting: Dict[OrderId, RestingOrder] = {}
+        self._price_tol = price_tolerance
+        self._qty_tol = qty_tolerance
+
+    @property
+    def has_book(self) -> bool:
+        return not (math.isnan(self.bid_price) or math.isnan(self.ask_price))
+
+    # =========================================================================
+    # Market data
+    # =========================================================================
+
+    def update_book(self, timestamp: int, bid_price: float, bid_qty: float,
+                    ask_price: float, ask_qty: float) -> List[MatchedFill]:
+        """Apply a top-of-book update; returns maker fills of resting orders."""
+        self.timestamp = timestamp
+        self.bid_price = bid_price
+        self.bid_qty = bid_qty
+        self.ask_price = ask_price
+        self.ask_qty = ask_qty
+        if not self.resting:
+            return _NO_FILLS
+
+        tol = self._price_tol
+        fills = []
+        for order in list(self.resting.values()):
+            price = order.price
+            if order.side == Side.BUY:
+                if ask_price <= price + tol:
+                    # Sellers now rest at or below our bid: we were traded through
+                    fills.append(self._fill(order, order.remaining))
+                elif bid_price > price + tol:
+                    continue
+                elif bid_price >= price - tol:
+                    order.queue_ahead = min(order.queue_ahead, bid_qty)
+                else:
+                    order.queue_ahead = 0.0
+            else:
+                if bid_price >= price - tol:
+                    fills.append(self._fill(order, order.remaining))
+                elif ask_price < price - tol:
+                    continue
+                elif ask_price <= price + tol:
+                    order.queue_ahead = min(order.queue_ahead, ask_qty)
+                else:
+                    order.queue_ahead = 0.0
+        return fills
+
+    def match_trade(self, price: float, qty: float, taker_side: int = 0) -> List[MatchedFill]:
+        """
+        Apply a public trade; returns maker fills of resting orders.
+
+        Args:
+            price: Trade price
+            qty: Trade quantity
+            taker_side: Side value of the aggressor (0 = unknown, matches both sides)
+        """
+        if not self.resting:
+            return _NO_FILLS
+
+        tol = self._price_tol
+        fills = []
+        for order in list(self.resting.values()):
+            if order.side == Side.BUY:
+                if taker_side == Side.BUY:
+                    continue
+                through = price < order.price - tol
+                at_level = not through and price <= order.price + tol
+            else:
+                if taker_side == Side.SELL:
+                    continue
+                through = price > order.price + tol
+                at_level = not through and price >= order.price - tol
+
+            if through:
+                fills.append(self._fill(order, order.remaining))
+            elif at_level:
+                if order.queue_ahead >= qty:
+                    order.queue_ahead -= qty
+                    continue
+                executable = qty - order.queue_ahead
+                order.queue_ahead = 0.0
+                fills.append(self._fill(order, min(order.remaining, executable)))
+        return fills
+
+    # =========================================================================
+    # Orders
+    # =========================================================================
+
+    def add_limit(self, order_id: OrderId, side: Side, price: float, qty: float) -> Optional[Tuple[float, float]]:
+        """
+        Add a limit order arriving at the exchange.
+
+        Returns:
+            (price, qty) taken immediately as taker if the order crosses the book,
+            else None. Any remainder rests in the book.
+        """
+        tol = self._price_tol
+        taken = None
+        if self.has_book:
+            if side == Side.BUY and price >= self.ask_price - tol:
+                taken = (self.ask_price, self._take_qty(qty, self.ask_qty))
+            elif side == Side.SELL and price <= self.bid_price + tol:
+                taken = (self.bid_price, self._take_qty(qty, self.bid_qty))
+
+        remaining = qty - (taken[1] if taken else 0.0)
+        if remaining > self._qty_tol:
+            self.resting[order_id] = RestingOrder(order_id, side, price, remaining, self._initial_queue(side, price))
+        return taken
+
+    def market_price(self, side: Side) -> Optional[float]:
+        """Price a market order takes (top of the opposite side), None without a book."""
+        if not self.has_book:
+            return None
+        return self.ask_price if side == Side.BUY else self.bid_price
+
+    def remove(self, order_id: OrderId) -> Optional[RestingOrder]:
+        """Remove a resting order (cancel)."""
+        return self.resting.pop(order_id, None)
+
+    def _initial_queue(self, side: Side, price: float) -> float:
+        if not self.has_book:
+            return math.inf
+        tol = self._price_tol
+        if side == Side.BUY:
+            best, displayed, improves = self.bid_price, self.bid_qty, price > self.bid_price + tol
+        else:
+            best, displayed, improves = self.ask_price, self.ask_qty, price < self.ask_price - tol
+        if improves:
+            return 0.0
+        if abs(price - best) <= tol:
+            return displayed
+        return math.inf
+
+    def _take_qty(self, qty: float, displayed: float) -> float:
+        # Missing or zero displayed size: assume the order is fully taken
+        if not displayed > 0:
+            return qty
+        return min(qty, displayed)
+
+    def _fill(self, order: RestingOrder, qty: float) -> MatchedFill:
+        order.remaining -= qty
+        if order.remaining <= self._qty_tol:
+            del self.resting[order.order_id]
+        return order.order_id, order.price, qty
@@ -0,0 +1,605 @@
+"""
+Simulated Exchange
+
+Two views of every simulated venue:
+
+- ExchangeSimulator: exchange-side truth (books, orders, balances, positions)
+  evaluated at exchange time, i.e. when requests arrive and market events
+  happen
+- SimulatedExchange: what the strategy sees, with the DualExchange surface
+  (public/private composites, adapters) used by PositionManager and the
+  strategy tasks. REST calls are round trips through the engine with the
+  venue's latency model; order and balance updates reach the private cache
+  through an ordered, delayed private stream; book tickers arrive with the
+  market-data latency.
+
+Because the two views are separated in time, live races are reproduced:
+a cancel can arrive after the order filled (it then returns the filled
+order), and a REST response can be older than the private stream state
+(the cache keeps the newest version).
+"""
+
+import itertools
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import msgspec
+
+from exchanges.adapters import BindedEventHandlersAdapter
+from exchanges.structs import (AssetBalance, AssetName, BookTicker, ExchangeEnum, Fees, Order, OrderId,
+                               OrderStatus, OrderType, Position, Side, Symbol, SymbolsInfo)
+from infrastructure.exceptions.exchange import ExchangeRestError, InsufficientBalanceError, OrderNotFoundError
+from infrastructure.logging import HFTLoggerInterface, get_logger
+from infrastructure.networking.websocket.structs import PrivateWebsocketChannelType, PublicWebsocketChannelType
+
+from .order_matching import OrderMatcher
+
+if TYPE_CHECKING:
+    from .tick_engine import LatencyModel, TickBacktestEngine
+
+_BALANCE_TOLERANCE = 1e-9
+
+
+@dataclass
+class SimulatedFill:
+    """One execution recorded by the exchange simulator."""
+    timestamp: float
+    exchange: ExchangeEnum
+    symbol: Symbol
+    order_id: OrderId
+    side: Side
+    price: float
+    qty: float
+    fee: float
+    is_maker: bool
+
+
+# =============================================================================
+# Exchange side
+# =============================================================================
+
+class ExchangeSimulator:
+    """Exchange-side state of one simulated venue."""
+
+    def __init__(self,
+                 engine: 'TickBacktestEngine',
+                 exchange_enum: ExchangeEnum,
+                 symbols_info: SymbolsInfo,
+                 latency: 'LatencyModel',
+                 fees: Optional[Fees] = None,
+                 balances: Optional[Dict[AssetName, float]] = None,
+                 is_futures: bool = False):
+        """
+        Args:
+            engine: Backtest engine providing the clock and event scheduling
+            exchange_enum: Simulated exchange
+            symbols_info: Tradable symbols (precision drives rounding and price levels)
+            latency: Latency model of the venue
+            fees: Maker/taker fee rates (fractions, e.g. 0.001 = 0.1%)
+            balances: Initial available balances per asset
+            is_futures: Track signed positions instead of spot balances
+        """
+        self.engine = engine
+        self.exchange_enum = exchange_enum
+        self.symbols_info = dict(symbols_info)
+        self.latency = latency
+        self.fees = fees or Fees()
+        self.is_futures = is_futures
+
+        self.matchers: Dict[Symbol, OrderMatcher] = {
+            symbol: OrderMatcher(price_tolerance=0.5 * 10 ** -info.quote_precision)
+            for symbol, info in self.symbols_info.items()
+        }
+        self.orders: Dict[OrderId, Order] = {}
+        self.balances: Dict[AssetName, AssetBalance] = {
+            AssetName(asset): AssetBalance(AssetName(asset), float(amount), 0.0)
+            for asset, amount in (balances or {}).items()
+        }
+        self.positions: Dict[Symbol, Tuple[float, float]] = {}   # signed base qty, entry price
+        self.fills: List[SimulatedFill] = []
+
+        self._versions: Dict[OrderId, int] = {}
+        self._locks: Dict[OrderId, Tuple[AssetName, float]] = {}   # locked asset, amount per unit
+        self._order_ids = itertools.count(1)
+        self._private_ms = -math.inf
+        self._private_handler: Optional[Callable[[Tuple[Optional[Order], int, Dict[AssetName, AssetBalance]]],
+                                                 None]] = None
+
+    def connect_private_stream(self,
+                               handler: Callable[[Tuple[Optional[Order], int, Dict[AssetName, AssetBalance]]], None]):
+        """Set the client-side receiver of order/balance updates."""
+        self._private_handler = handler
+
+    # =========================================================================
+    # Market data
+    # =========================================================================
+
+    def on_book_ticker(self, symbol: Symbol, timestamp: int, bid_price: float, bid_qty: float,
+                       ask_price: float, ask_qty: float) -> None:
+        for order_id, price, qty in self.matchers[symbol].update_book(timestamp, bid_price, bid_qty,
+                                                                       ask_price, ask_qty):
+            self._execute(self.orders[order_id], price, qty, is_maker=True)
+
+    def on_trade(self, symbol: Symbol, price: float, qty: float, taker_side: int) -> None:
+        for order_id, fill_price, fill_qty in self.matchers[symbol].match_trade(price, qty, taker_side):
+            self._execute(self.orders[order_id], fill_price, fill_qty, is_maker=True)
+
+    def get_book_ticker(self, symbol: Symbol) -> Optional[BookTicker]:
+        matcher = self._matcher(symbol)
+        if not matcher.has_book:
+            return None
+        return BookTicker(symbol=symbol, bid_price=matcher.bid_price, bid_quantity=matcher.bid_qty,
+                          ask_price=matcher.ask_price, ask_quantity=matcher.ask_qty,
+                          timestamp=int(matcher.timestamp))
+
+    # =========================================================================
+    # Requests (run at exchange time)
+    # =========================================================================
+
+    def place_order(self, symbol: Symbol, side: Side, order_type: OrderType, quantity: float,
+                    price: Optional[float] = None) -> Tuple[Order, int]:
+        """Accept an order; returns the order snapshot and its version."""
+        matcher = self._matcher(symbol)
+        if quantity <= 0:
+            raise ExchangeRestError(400, f"Invalid order quantity {quantity}")
+
+        order = Order(
+            symbol=symbol,
+            order_id=OrderId(f"{self.exchange_enum.value}-{next(self._order_ids)}"),
+            side=side,
+            order_type=order_type,
+            quantity=quantity,
+            price=price,
+            remaining_quantity=quantity,
+            timestamp=int(self.engine.now_ms),
+            exchange=self.exchange_enum,
+        )
+
+        if order_type == OrderType.MARKET:
+            top = matcher.market_price(side)
+            if top is None:
+                raise ExchangeRestError(400, f"No market data for {symbol}")
+            self._check_market_balance(order, top)
+            order.price = top
+            self.orders[order.order_id] = order
+            self.engine.stats.orders_placed += 1
+            self._execute(order, top, quantity, is_maker=False)
+        else:
+            if price is None or price <= 0:
+                raise ExchangeRestError(400, f"Invalid limit price {price}")
+            self._lock(order)
+            self.orders[order.order_id] = order
+            self.engine.stats.orders_placed += 1
+            taken = matcher.add_limit(order.order_id, side, price, quantity)
+            if taken:
+                self._execute(order, taken[0], taken[1], is_maker=False)
+            else:
+                self._publish(order)
+        return self._reply(order)
+
+    def cancel_order(self, symbol: Symbol, order_id: OrderId) -> Tuple[Order, int]:
+        """Cancel an order; an order that is already done is returned unchanged."""
+        order = self.orders.get(order_id)
+        if order is None:
+            raise OrderNotFoundError(404, f"Order {order_id} not found")
+        if order.is_done:
+            if order.status == OrderStatus.FILLED:
+                # The cancel lost the race against the fill
+                self.engine.stats.cancels_lost += 1
+            return self._reply(order)
+
+        self.matchers[order.symbol].remove(order_id)
+        order.status = OrderStatus.PARTIALLY_CANCELED if order.filled_quantity > 0 else OrderStatus.CANCELED
+        order.timestamp = int(self.engine.now_ms)
+        self._release(order)
+        self.engine.stats.orders_canceled += 1
+        self._publish(order)
+        return self._reply(order)
+
+    def get_order(self, symbol: Symbol, order_id: OrderId) -> Tuple[Order, int]:
+        order = self.orders.get(order_id)
+        if order is None:
+            raise OrderNotFoundError(404, f"Order {order_id} not found")
+        return self._reply(order)
+
+    def get_balances(self) -> Dict[AssetName, AssetBalance]:
+        return {asset: msgspec.structs.replace(balance) for asset, balance in self.balances.items()}
+
+    def deposit(self, asset: AssetName, amount: float) -> None:
+        """Credit an incoming transfer (e.g. a withdrawal from another venue landing)."""
+        asset = AssetName(asset)
+        self._balance(asset).available += amount
+        self._stream(None, 0, (asset,))
+
+    def get_position(self, symbol: Symbol) -> Optional[Position]:
+        qty, entry_price = self.positions.get(symbol, (0.0, 0.0))
+        if abs(qty) <= _BALANCE_TOLERANCE:
+            return None
+        info = self.symbols_info.get(symbol)
+        multiplier = info.quanto_multiplier if info and info.quanto_multiplier else 1.0
+        return Position(symbol=symbol, side=Side.BUY if qty > 0 else Side.SELL, size=abs(qty) / multiplier,
+                        entry_price=entry_price, qty_base=abs(qty), timestamp=int(self.engine.now_ms))
+
+    # =========================================================================
+    # Execution and accounting
+    # =========================================================================
+
+    def _execute(self, order: Order, price: float, qty: float, is_maker: bool) -> None:
+        remaining = order.quantity - order.filled_quantity
+        qty = min(qty, remaining)
+        if qty <= 0:
+            return
+
+        fee_rate = self.fees.maker_fee if is_maker else self.fees.taker_fee
+        notional = price * qty
+        fee = notional * fee_rate
+
+        filled_before = order.filled_quantity
+        order.filled_quantity = filled_before + qty
+        order.average_price = ((order.average_price or 0.0) * filled_before + notional) / order.filled_quantity
+        order.remaining_quantity = max(order.quantity - order.filled_quantity, 0.0)
+        order.fee = (order.fee or 0.0) + fee
+        order.fee_asset = order.symbol.quote
+        order.timestamp = int(self.engine.now_ms)
+        done = order.remaining_quantity <= _BALANCE_TOLERANCE
+        order.status = OrderStatus.FILLED if done else OrderStatus.PARTIALLY_FILLED
+
+        if self.is_futures:
+            self._settle_futures(order, price, qty, fee)
+        else:
+            self._settle_spot(order, price, qty, fee)
+        if done:
+            self.matchers[order.symbol].remove(order.order_id)
+            self._release(order)
+
+        self.fills.append(SimulatedFill(self.engine.now_ms, self.exchange_enum, order.symbol, order.order_id,
+                                        order.side, price, qty, fee, is_maker))
+        self.engine.stats.fills += 1
+        self._publish(order)
+
+    def _settle_spot(self, order: Order, price: float, qty: float, fee: float) -> None:
+        base = self._balance(order.symbol.base)
+        quote = self._balance(order.symbol.quote)
+        lock = self._locks.get(order.order_id)
+        if order.side == Side.BUY:
+            if lock:
+                # Release the locked quote at the limit price, refund any price improvement
+                quote.locked -= qty * lock[1]
+                quote.available += qty * (lock[1] - price)
+            else:
+                quote.available -= price * qty
+            quote.available -= fee
+            base.available += qty
+        else:
+            if lock:
+                base.locked -= qty
+            else:
+                base.available -= qty
+            quote.available += price * qty - fee
+
+    def _settle_futures(self, order: Order, price: float, qty: float, fee: float) -> None:
+        position_qty, entry_price = self.positions.get(order.symbol, (0.0, 0.0))
+        signed = qty if order.side == Side.BUY else -qty
+        realized = 0.0
+        if position_qty == 0 or (position_qty > 0) == (signed > 0):
+            new_qty = position_qty + signed
+            entry_price = (abs(position_qty) * entry_price + qty * price) / abs(new_qty)
+        else:
+            closing = min(qty, abs(position_qty))
+            direction = 1.0 if position_qty > 0 else -1.0
+            realized = closing * (price - entry_price) * direction
+            new_qty = position_qty + signed
+            if abs(new_qty) <= _BALANCE_TOLERANCE:
+                new_qty, entry_price = 0.0, 0.0
+            elif (new_qty > 0) != (position_qty > 0):
+                entry_price = price   # Flipped: the rest opens at the fill price
+        self.positions[order.symbol] = (new_qty, entry_price)
+        quote = self._balance(order.symbol.quote)
+        quote.available += realized - fee
+
+    def _check_market_balance(self, order: Order, price: float) -> None:
+        if self.is_futures:
+            return
+        if order.side == Side.BUY:
+            asset, needed = order.symbol.quote, order.quantity * price * (1 + self.fees.taker_fee)
+        else:
+            asset, needed = order.symbol.base, order.quantity
+        self._require(asset, needed)
+
+    def _lock(self, order: Order) -> None:
+        if self.is_futures:
+            return
+        if order.side == Side.BUY:
+            asset, per_unit = order.symbol.quote, order.price
+        else:
+            asset, per_unit = order.symbol.base, 1.0
+        amount = order.quantity * per_unit
+        balance = self._require(asset, amount)
+        balance.available -= amount
+        balance.locked += amount
+        self._locks[order.order_id] = (asset, per_unit)
+
+    def _release(self, order: Order) -> None:
+        lock = self._locks.pop(order.order_id, None)
+        if lock is None:
+            return
+        amount = (order.quantity - order.filled_quantity) * lock[1]
+        balance = self._balance(lock[0])
+        balance.locked -= amount
+        balance.available += amount
+
+    def _require(self, asset: AssetName, amount: float) -> AssetBalance:
+        balance = self._balance(asset)
+        if balance.available + _BALANCE_TOLERANCE < amount:
+            raise InsufficientBalanceError(400, f"Insufficient {asset}: available {balance.available}, "
+                                                f"required {amount}")
+        return balance
+
+    def _balance(self, asset: AssetName) -> AssetBalance:
+        balance = self.balances.get(asset)
+        if balance is None:
+            balance = self.balances[asset] = AssetBalance(asset, 0.0, 0.0)
+        return balance
+
+    def _matcher(self, symbol: Symbol) -> OrderMatcher:
+        matcher = self.matchers.get(symbol)
+        if matcher is None:
+            raise ExchangeRestError(400, f"Unknown symbol {symbol} on {self.exchange_enum.name}")
+        return matcher
+
+    # =========================================================================
+    # Private stream
+    # =========================================================================
+
+    def _reply(self, order: Order) -> Tuple[Order, int]:
+        return msgspec.structs.replace(order), self._versions.get(order.order_id, 0)
+
+    def _publish(self, order: Order) -> None:
+        version = self._versions.get(order.order_id, 0) + 1
+        self._versions[order.order_id] = version
+        self._stream(msgspec.structs.replace(order), version, (order.symbol.base, order.symbol.quote))
+
+    def _stream(self, order: Optional[Order], version: int, assets: Iterable[AssetName]) -> None:
+        """Deliver an order update (None = balances only) with the balances of `assets`."""
+        if self._private_handler is None:
+            return
+        # Websocket streams are ordered: a delivery never overtakes an earlier one
+        self._private_ms = max(self.engine.now_ms + self.latency.private_delay(), self._private_ms)
+        balances = {asset: msgspec.structs.replace(self.balances[asset]) for asset in assets if asset in self.balances}
+        self.engine.schedule_client(self._private_ms, self._private_handler, (order, version, balances))
+
+
+# =============================================================================
+# Strategy side
+# =============================================================================
+
+class _SimulatedComposite:
+    """Handler binding shared by the simulated public and private composites."""
+
+    def __init__(self, engine: 'TickBacktestEngine', simulator: ExchangeSimulator):
+        self._engine = engine
+        self._simulator = simulator
+        self._handlers: Dict[Any, Callable[[Any], Any]] = {}
+        self.is_connected = True
+
+    @property
+    def symbols_info(self) -> SymbolsInfo:
+        return self._simulator.symbols_info
+
+    def bind(self, channel, handler: Callable[[Any], Any]) -> None:
+        self._handlers[channel] = handler
+
+    def unbind(self, channel) -> bool:
+        return self._handlers.pop(channel, None) is not None
+
+    def handler(self, channel) -> Optional[Callable[[Any], Any]]:
+        return self._handlers.get(channel)
+
+    def publish(self, channel, data: Any) -> None:
+        handler = self._handlers.get(channel)
+        if handler is not None:
+            self._engine.dispatch(handler, data)
+
+    async def initialize(self, *args, **kwargs) -> None:
+        pass
+
+    async def refresh_exchange_data(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def _request(self, fn: Callable, *args):
+        return await self._engine.request(self._simulator.latency, fn, *args)
+
+
+class SimulatedPublicExchange(_SimulatedComposite):
+    """Public composite fed by the replayed market data."""
+
+    def __init__(self, engine: 'TickBacktestEngine', simulator: ExchangeSimulator):
+        super().__init__(engine, simulator)
+        self.book_ticker: Dict[Symbol, BookTicker] = {}
+
+    async def load_symbols_info(self) -> SymbolsInfo:
+        return dict(self._simulator.symbols_info)
+
+    async def get_book_ticker(self, symbol: Symbol, force: bool = False) -> Optional[BookTicker]:
+        if symbol in self.book_ticker and not force:
+            return self.book_ticker[symbol]
+        return await self._request(self._simulator.get_book_ticker, symbol)
+
+    def get_min_base_quantity(self, symbol: Symbol) -> Optional[float]:
+        return self.symbols_info[symbol].get_min_base_quantity(self.book_ticker[symbol].ask_price)
+
+    async def add_symbol(self, symbol: Symbol) -> None:
+        pass
+
+    async def remove_symbol(self, symbol: Symbol) -> None:
+        pass
+
+
+class SimulatedPrivateExchange(_SimulatedComposite):
+    """Private composite: REST round trips plus a cache fed by the private stream."""
+
+    def __init__(self, engine: 'TickBacktestEngine', simulator: ExchangeSimulator):
+        super().__init__(engine, simulator)
+        self._orders: Dict[OrderId, Order] = {}
+        self._versions: Dict[OrderId, int] = {}
+        self._balances: Dict[AssetName, AssetBalance] = simulator.get_balances()
+        simulator.connect_private_stream(self._on_private_update)
+
+    @property
+    def balances(self) -> Dict[AssetName, AssetBalance]:
+        return self._balances
+
+    @property
+    def open_orders(self) -> Dict[Symbol, List[Order]]:
+        orders: Dict[Symbol, List[Order]] = {}
+        for order in self._orders.values():
+            if not order.is_done:
+                orders.setdefault(order.symbol, []).append(order)
+        return orders
+
+    def get_order(self, order_id: OrderId) -> Optional[Order]:
+        return self._orders.get(order_id)
+
+    def get_fees(self, symbol: Optional[Symbol] = None) -> Fees:
+        return self._simulator.fees
+
+    async def place_limit_order(self, symbol: Symbol, side: Side, quantity: float, price: float, **kwargs) -> Order:
+        info = self.symbols_info[symbol]
+        return self._merge(await self._request(self._simulator.place_order, symbol, side, OrderType.LIMIT,
+                                               info.round_base(quantity), info.round_quote(price)))
+
+    async def place_market_order(self, symbol: Symbol, side: Side,
+                                 quantity: Optional[float] = None,
+                                 quote_quantity: Optional[float] = None,
+                                 price: Optional[float] = None,
+                                 ensure: bool = True, **kwargs) -> Order:
+        if quantity is None:
+            if quote_quantity is None or not price:
+                raise ValueError("Market orders require quantity, or quote_quantity with price")
+            quantity = quote_quantity / price
+        info = self.symbols_info[symbol]
+        return self._merge(await self._request(self._simulator.place_order, symbol, side, OrderType.MARKET,
+                                               info.round_base(quantity), price))
+
+    async def cancel_order(self, symbol: Symbol, order_id: OrderId) -> Order:
+        return self._merge(await self._request(self._simulator.cancel_order, symbol, order_id))
+
+    async def fetch_order(self, symbol: Symbol, order_id: OrderId) -> Optional[Order]:
+        try:
+            return self._merge(await self._request(self._simulator.get_order, symbol, order_id))
+        except OrderNotFoundError:
+            return None
+
+    async def get_active_order(self, symbol: Symbol, order_id: OrderId) -> Optional[Order]:
+        order = self._orders.get(order_id)
+        if order is not None:
+            return order
+        return await self.fetch_order(symbol, order_id)
+
+    async def wait_for_fill(self, symbol: Symbol, order_id: OrderId, timeout: float = 2.0) -> Optional[Order]:
+        order = self._orders.get(order_id)
+        if order is not None and order.is_done:
+            return order
+        return await self.fetch_order(symbol, order_id)
+
+    async def get_open_orders(self, symbol: Optional[Symbol] = None, force: bool = False) -> List[Order]:
+        orders = [order for order in self._orders.values() if not order.is_done]
+        if symbol is not None:
+            orders = [order for order in orders if order.symbol == symbol]
+        return orders
+
+    async def get_asset_balance(self, asset: AssetName, force: bool = False) -> AssetBalance:
+        if force or asset not in self._balances:
+            await self.load_balances()
+        return self._balances.get(asset, AssetBalance(asset, 0.0, 0.0))
+
+    async def load_balances(self) -> None:
+        self._balances.update(await self._request(self._simulator.get_balances))
+
+    async def get_position(self, symbol: Symbol, force: bool = False) -> Optional[Position]:
+        return await self._request(self._simulator.get_position, symbol)
+
+    def _merge(self, reply: Tuple[Order, int]) -> Order:
+        """Store a REST reply unless the private stream already delivered a newer state."""
+        order, version = reply
+        if version >= self._versions.get(order.order_id, -1):
+            self._orders[order.order_id] = order
+            self._versions[order.order_id] = version
+        return order
+
+    def _on_private_update(self, update: Tuple[Optional[Order], int, Dict[AssetName, AssetBalance]]) -> None:
+        order, version, balances = update
+        if order is not None:
+            # The stream is ordered, so every update is delivered; a REST reply may have cached it already
+            if version >= self._versions.get(order.order_id, -1):
+                self._orders[order.order_id] = order
+                self._versions[order.order_id] = version
+            self.publish(PrivateWebsocketChannelType.ORDER, order)
+        self._balances.update(balances)
+        for balance in balances.values():
+            self.publish(PrivateWebsocketChannelType.BALANCE, balance)
+
+
+class SimulatedExchange:
+    """DualExchange-compatible facade over a simulated venue."""
+
+    def __init__(self, engine: 'TickBacktestEngine', simulator: ExchangeSimulator,
+                 logger: Optional[HFTLoggerInterface] = None):
+        self.logger = logger or get_logger(f'event_backtest.{simulator.exchange_enum.name.lower()}')
+        self.simulator = simulator
+        self.public = SimulatedPublicExchange(engine, simulator)
+        self.private = SimulatedPrivateExchange(engine, simulator)
+        self.adapter_private = BindedEventHandlersAdapter(self.logger).bind_to_exchange(self.private)
+        self.adapter_public = BindedEventHandlersAdapter(self.logger).bind_to_exchange(self.public)
+
+        self.name = simulator.exchange_enum.value
+        self.is_futures = simulator.is_futures
+        self.exchange_enum = simulator.exchange_enum
+
+    @property
+    def is_connected(self) -> bool:
+        return True
+
+    @property
+    def balances(self) -> Dict[AssetName, AssetBalance]:
+        return self.private.balances
+
+    async def initialize(self, symbols=None, public_channels: Optional[List[PublicWebsocketChannelType]] = None,
+                         private_channels: Optional[List[PrivateWebsocketChannelType]] = None) -> None:
+        pass
+
+    async def bind_handlers(self,
+                            on_book_ticker: Optional[Callable[[BookTicker], Awaitable[None]]] = None,
+                            on_order: Optional[Callable[[Order], Awaitable[None]]] = None,
+                            on_balance: Optional[Callable[[AssetBalance], Awaitable[None]]] = None,
+                            on_position: Optional[Callable[[Position], Awaitable[None]]] = None) -> None:
+        on_book_ticker and self.adapter_public.bind(PublicWebsocketChannelType.BOOK_TICKER, on_book_ticker)
+        on_order and self.adapter_private.bind(PrivateWebsocketChannelType.ORDER, on_order)
+        on_balance and self.adapter_private.bind(PrivateWebsocketChannelType.BALANCE, on_balance)
+        on_position and self.adapter_private.bind(PrivateWebsocketChannelType.POSITION, on_position)
+
+    async def unbind_handlers(self,
+                              on_book_ticker: Optional[Callable[[BookTicker], Awaitable[None]]] = None,
+                              on_order: Optional[Callable[[Order], Awaitable[None]]] = None,
+                              on_balance: Optional[Callable[[AssetBalance], Awaitable[None]]] = None,
+                              on_position: Optional[Callable[[Position], Awaitable[None]]] = None) -> None:
+        on_book_ticker and self.adapter_public.unbind(PublicWebsocketChannelType.BOOK_TICKER, on_book_ticker)
+        on_order and self.adapter_private.unbind(PrivateWebsocketChannelType.ORDER, on_order)
+        on_balance and self.adapter_private.unbind(PrivateWebsocketChannelType.BALANCE, on_balance)
+        on_position and self.adapter_private.unbind(PrivateWebsocketChannelType.POSITION, on_position)
+
+    async def force_refresh(self) -> None:
+        pass
+
+    async def subscribe_symbols(self, symbols: List[Symbol]) -> None:
+        pass
+
+    async def unsubscribe_symbols(self, symbols: List[Symbol]) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
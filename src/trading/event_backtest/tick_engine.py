@@ -0,0 +1,437 @@
+"""
+Event-Driven Tick Backtest Engine
+
+Deterministic replay of recorded book ticker and trade streams against the
+live strategy interfaces. All events live in one heap ordered by
+(timestamp, priority, sequence):
+
+- Market events at the exchange (book updates, trades) drive the simulated
+  matching of resting orders
+- The same events reach the strategy after the market-data latency
+- REST requests arrive at the exchange after the request latency and their
+  responses return after the response latency
+- Order/balance updates reach the private cache through an ordered private
+  stream with its own latency
+
+Each stream is a NumPy column set with a cursor: only the next row of every
+stream sits in the heap, so memory stays proportional to the data, and rows
+are processed without per-event allocations on the exchange side.
+
+Strategy code runs on a VirtualClockEventLoop. While the strategy has
+nothing scheduled, the engine advances the clock directly; it only yields to
+the loop when something was delivered to the strategy or a strategy timer is
+due, so idle stretches of market data cost a heap pop and a matcher update.
+
+Usage:
+    engine = TickBacktestEngine()
+    mexc = engine.add_exchange(ExchangeEnum.MEXC, symbols_info, fees=Fees(0.0, 0.001),
+                               balances={'USDT': 10_000}, latency=LatencyModel(5, 20, 20, 10))
+    engine.add_book_tickers(ExchangeEnum.MEXC, BookTickerStream.from_frame(symbol, book_df))
+    engine.add_trades(ExchangeEnum.MEXC, TradeStream.from_frame(symbol, trades_df))
+
+    async def strategy(engine):
+        manager = PositionManager(PositionData(symbol=symbol), mexc, logger)
+        await manager.initialize()
+        while True:
+            await manager.place_trailing_limit_order(Side.BUY, 1.0, trail_pct=0.1)
+            await asyncio.sleep(0.5)
+
+    stats = engine.run(strategy)
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from exchanges.structs import AssetName, BookTicker, ExchangeEnum, Fees, Side, SymbolsInfo, Trade
+from infrastructure.logging import HFTLoggerInterface, get_logger
+from infrastructure.networking.websocket.structs import PublicWebsocketChannelType
+
+from .market_streams import BookTickerStream, TradeStream
+from .simulated_exchange import ExchangeSimulator, SimulatedExchange, SimulatedPublicExchange
+from .virtual_clock import VirtualClockEventLoop
+
+# Event priorities for equal timestamps
+PRIORITY_MARKET = 0      # Market events at the exchange
+PRIORITY_EXCHANGE = 1    # Requests arriving at the exchange
+PRIORITY_CLIENT = 2      # Deliveries to the strategy
+
+
+@dataclass
+class LatencyModel:
+    """One-way latencies of a venue in milliseconds."""
+    market_data_ms: float = 0.0       # Exchange event -> strategy (book ticker, trades)
+    request_ms: float = 0.0           # Strategy -> exchange (REST request)
+    response_ms: float = 0.0          # Exchange -> strategy (REST response)
+    private_stream_ms: float = 0.0    # Exchange -> strategy (order/balance updates)
+    jitter_ms: float = 0.0            # Uniform jitter added to REST and private stream legs
+    seed: int = 0                     # Jitter seed (runs are reproducible)
+    _rng: random.Random = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+
+    def _jitter(self) -> float:
+        return self._rng.uniform(0.0, self.jitter_ms) if self.jitter_ms > 0 else 0.0
+
+    def request_delay(self) -> float:
+        return self.request_ms + self._jitter()
+
+    def response_delay(self) -> float:
+        return self.response_ms + self._jitter()
+
+    def private_delay(self) -> float:
+        return self.private_stream_ms + self._jitter()
+
+
+@dataclass
+class TickBacktestStats:
+    """Counters of one engine run."""
+    market_events: int = 0
+    client_events: int = 0
+    requests: int = 0
+    orders_placed: int = 0
+    orders_canceled: int = 0
+    cancels_lost: int = 0             # Cancels that arrived after the order had filled
+    fills: int = 0
+    wall_seconds: float = 0.0
+
+    @property
+    def events_per_minute(self) -> float:
+        """Market event throughput (exchange-side events per wall-clock minute)."""
+        return self.market_events / self.wall_seconds * 60.0 if self.wall_seconds > 0 else math.inf
+
+
+class _BookTickerReplay:
+    """Cursor feeding one book ticker stream to the exchange and, delayed, to the strategy."""
+
+    def __init__(self, engine: 'TickBacktestEngine', simulator: ExchangeSimulator,
+                 public: SimulatedPublicExchange, stream: BookTickerStream):
+        self._engine = engine
+        self._simulator = simulator
+        self._public = public
+        self._symbol = stream.symbol
+        self._delay = simulator.latency.market_data_ms
+        self._ts = stream.timestamps.tolist()
+        self._bid = stream.bid_price.tolist()
+        self._bid_qty = stream.bid_qty.tolist()
+        self._ask = stream.ask_price.tolist()
+        self._ask_qty = stream.ask_qty.tolist()
+        self._n = len(self._ts)
+
+    @property
+    def first_timestamp(self) -> Optional[int]:
+        return self._ts[0] if self._n else None
+
+    def start(self) -> None:
+        if self._n:
+            self._engine.schedule(self._ts[0], PRIORITY_MARKET, self._exchange_step, 0)
+            self._engine.schedule(self._ts[0] + self._delay, PRIORITY_CLIENT, self._client_step, 0)
+
+    def _exchange_step(self, i: int) -> None:
+        self._simulator.on_book_ticker(self._symbol, self._ts[i], self._bid[i], self._bid_qty[i],
+                                       self._ask[i], self._ask_qty[i])
+        self._engine.stats.market_events += 1
+        i += 1
+        if i < self._n:
+            self._engine.schedule(self._ts[i], PRIORITY_MARKET, self._exchange_step, i)
+
+    def _client_step(self, i: int) -> None:
+        ticker = BookTicker(symbol=self._symbol, bid_price=self._bid[i], bid_quantity=self._bid_qty[i],
+                            ask_price=self._ask[i], ask_quantity=self._ask_qty[i], timestamp=self._ts[i])
+        self._public.book_ticker[self._symbol] = ticker
+        self._public.publish(PublicWebsocketChannelType.BOOK_TICKER, ticker)
+        self._engine.stats.client_events += 1
+        i += 1
+        if i < self._n:
+            self._engine.schedule(self._ts[i] + self._delay, PRIORITY_CLIENT, self._client_step, i)
+
+
+class _TradeReplay:
+    """Cursor feeding one public trade stream to the exchange and, delayed, to the strategy."""
+
+    def __init__(self, engine: 'TickBacktestEngine', simulator: ExchangeSimulator,
+                 public: SimulatedPublicExchange, stream: TradeStream):
+        self._engine = engine
+        self._simulator = simulator
+        self._public = public
+        self._symbol = stream.symbol
+        self._delay = simulator.latency.market_data_ms
+        self._ts = stream.timestamps.tolist()
+        self._price = stream.price.tolist()
+        self._qty = stream.qty.tolist()
+        self._side = stream.side.tolist()
+        self._n = len(self._ts)
+
+    @property
+    def first_timestamp(self) -> Optional[int]:
+        return self._ts[0] if self._n else None
+
+    def start(self) -> None:
+        if self._n:
+            self._engine.schedule(self._ts[0], PRIORITY_MARKET, self._exchange_step, 0)
+            self._engine.schedule(self._ts[0] + self._delay, PRIORITY_CLIENT, self._client_step, 0)
+
+    def _exchange_step(self, i: int) -> None:
+        self._simulator.on_trade(self._symbol, self._price[i], self._qty[i], self._side[i])
+        self._engine.stats.market_events += 1
+        i += 1
+        if i < self._n:
+            self._engine.schedule(self._ts[i], PRIORITY_MARKET, self._exchange_step, i)
+
+    def _client_step(self, i: int) -> None:
+        if self._public.handler(PublicWebsocketChannelType.PUB_TRADE) is not None:
+            side = self._side[i]
+            trade = Trade(symbol=self._symbol, side=Side(side) if side else Side.BUY, quantity=self._qty[i],
+                          price=self._price[i], timestamp=self._ts[i], is_buyer=side == Side.BUY)
+            self._public.publish(PublicWebsocketChannelType.PUB_TRADE, trade)
+            self._engine.stats.client_events += 1
+        i += 1
+        if i < self._n:
+            self._engine.schedule(self._ts[i] + self._delay, PRIORITY_CLIENT, self._client_step, i)
+
+
+class TickBacktestEngine:
+    """Deterministic event-driven backtester for strategies written against DualExchange."""
+
+    def __init__(self, logger: Optional[HFTLoggerInterface] = None):
+        self.logger = logger or get_logger('event_backtest.engine')
+        self.stats = TickBacktestStats()
+
+        self._simulators: Dict[ExchangeEnum, ExchangeSimulator] = {}
+        self._exchanges: Dict[ExchangeEnum, SimulatedExchange] = {}
+        self._replays: List[Any] = []
+
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+        self._loop: Optional[VirtualClockEventLoop] = None
+        self._origin_ms = 0.0
+        self._now_ms = 0.0
+        self._dispatched = False
+        self._error: Optional[BaseException] = None
+
+        # Pending wake-up of the replay loop while strategy code runs
+        self._wake: Optional[asyncio.Future] = None
+        self._wake_ms = math.inf
+        self._wake_handle: Optional[asyncio.TimerHandle] = None
+
+    # =========================================================================
+    # Setup
+    # =========================================================================
+
+    def add_exchange(self,
+                     exchange_enum: ExchangeEnum,
+                     symbols_info: SymbolsInfo,
+                     fees: Optional[Fees] = None,
+                     balances: Optional[Dict[AssetName, float]] = None,
+                     latency: Optional[LatencyModel] = None,
+                     is_futures: Optional[bool] = None) -> SimulatedExchange:
+        """
+        Register a simulated venue.
+
+        Args:
+            exchange_enum: Exchange to simulate
+            symbols_info: Tradable symbols
+            fees: Maker/taker fee rates (fractions)
+            balances: Initial available balances per asset
+            latency: Latency model (default: zero latency)
+            is_futures: Futures accounting (default: from symbols_info)
+
+        Returns:
+            DualExchange-compatible exchange for the strategy
+        """
+        if exchange_enum in self._simulators:
+            raise ValueError(f"Exchange {exchange_enum.name} already added")
+        if is_futures is None:
+            is_futures = any(info.is_futures for info in symbols_info.values())
+        simulator = ExchangeSimulator(self, exchange_enum, symbols_info, latency or LatencyModel(),
+                                      fees=fees, balances=balances, is_futures=is_futures)
+        exchange = SimulatedExchange(self, simulator)
+        self._simulators[exchange_enum] = simulator
+        self._exchanges[exchange_enum] = exchange
+        return exchange
+
+    def exchange(self, exchange_enum: ExchangeEnum) -> SimulatedExchange:
+        return self._exchanges[exchange_enum]
+
+    def simulator(self, exchange_enum: ExchangeEnum) -> ExchangeSimulator:
+        return self._simulators[exchange_enum]
+
+    def add_book_tickers(self, exchange_enum: ExchangeEnum, stream: BookTickerStream) -> None:
+        simulator = self._stream_simulator(exchange_enum, stream.symbol)
+        self._replays.append(_BookTickerReplay(self, simulator, self._exchanges[exchange_enum].public, stream))
+
+    def add_trades(self, exchange_enum: ExchangeEnum, stream: TradeStream) -> None:
+        simulator = self._stream_simulator(exchange_enum, stream.symbol)
+        self._replays.append(_TradeReplay(self, simulator, self._exchanges[exchange_enum].public, stream))
+
+    def _stream_simulator(self, exchange_enum: ExchangeEnum, symbol) -> ExchangeSimulator:
+        simulator = self._simulators.get(exchange_enum)
+        if simulator is None:
+            raise ValueError(f"Exchange {exchange_enum.name} not added")
+        if symbol not in simulator.symbols_info:
+            raise ValueError(f"Symbol {symbol} not in {exchange_enum.name} symbols info")
+        return simulator
+
+    # =========================================================================
+    # Clock and scheduling
+    # =========================================================================
+
+    @property
+    def now_ms(self) -> float:
+        """Current simulated time in epoch milliseconds."""
+        if self._loop is None:
+            return self._now_ms
+        # Strategy timers may have moved the loop clock past the last processed event
+        return max(self._now_ms, self._origin_ms + round(self._loop.time() * 1000.0, 3))
+
+    def schedule(self, timestamp: float, priority: int, action: Callable[[Any], None], arg: Any = None) -> None:
+        """Push an event; wakes the replay loop early if the event precedes its wake-up."""
+        heapq.heappush(self._heap, (timestamp, priority, next(self._seq), action, arg))
+        if timestamp < self._wake_ms and self._wake is not None:
+            self._set_wake(timestamp)
+
+    def schedule_client(self, timestamp: float, action: Callable[[Any], None], arg: Any = None) -> None:
+        self.schedule(timestamp, PRIORITY_CLIENT, action, arg)
+
+    async def request(self, latency: LatencyModel, fn: Callable[..., Any], *args) -> Any:
+        """Round trip to the exchange: `fn` runs at arrival time, its result returns after the response latency."""
+        self.stats.requests += 1
+        future = self._loop.create_future()
+        self.schedule(self.now_ms + latency.request_delay(), PRIORITY_EXCHANGE, self._serve,
+                      (future, latency, fn, args))
+        return await future
+
+    def dispatch(self, handler: Callable[[Any], Awaitable[None]], data: Any) -> None:
+        """Run a strategy handler as a task (websocket delivery)."""
+        task = self._loop.create_task(handler(data))
+        task.add_done_callback(self._on_task_done)
+        self._dispatched = True
+
+    def _serve(self, item) -> None:
+        future, latency, fn, args = item
+        try:
+            result, error = fn(*args), None
+        except Exception as e:
+            result, error = None, e
+        self.schedule(self._now_ms + latency.response_delay(), PRIORITY_CLIENT, self._respond,
+                      (future, result, error))
+
+    def _respond(self, item) -> None:
+        future, result, error = item
+        if future.done():
+            return   # Requesting task was cancelled
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+        self._dispatched = True
+
+    def _to_loop_time(self, timestamp: float) -> float:
+        return (timestamp - self._origin_ms) / 1000.0
+
+    def _set_wake(self, timestamp: float) -> None:
+        if self._wake_handle is not None:
+            self._wake_handle.cancel()
+        self._wake_ms = timestamp
+        self._wake_handle = self._loop.call_at(self._to_loop_time(timestamp), self._wake_up, self._wake, timestamp)
+
+    def _wake_up(self, future: asyncio.Future, timestamp: float) -> None:
+        if not future.done():
+            self._now_ms = max(self._now_ms, timestamp)
+            future.set_result(None)
+
+    async def _sleep_until(self, timestamp: float) -> None:
+        """Let strategy code run until `timestamp` (or until it schedules an earlier event)."""
+        self._wake = self._loop.create_future()
+        self._set_wake(timestamp)
+        try:
+            await self._wake
+        finally:
+            self._wake_handle.cancel()
+            self._wake = None
+            self._wake_handle = None
+            self._wake_ms = math.inf
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None and self._error is None:
+            self._error = task.exception()
+
+    # =========================================================================
+    # Run
+    # =========================================================================
+
+    def run(self, strategy: Callable[['TickBacktestEngine'], Awaitable[Any]]) -> TickBacktestStats:
+        """
+        Replay all streams with the strategy running on simulated time.
+
+        Args:
+            strategy: Coroutine function called with the engine at the first
+                event; it may return early (handlers keep running) or loop
+                until the data is exhausted (it is then cancelled)
+
+        Returns:
+            Run statistics
+
+        Raises:
+            Any exception raised by the strategy or its handlers
+        """
+        loop = VirtualClockEventLoop()
+        self._loop = loop
+        started = time.perf_counter()
+        try:
+            loop.run_until_complete(self._run(strategy))
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
+            self._loop = None
+            self.stats.wall_seconds = time.perf_counter() - started
+        return self.stats
+
+    async def _run(self, strategy: Callable[['TickBacktestEngine'], Awaitable[Any]]) -> None:
+        starts = [replay.first_timestamp for replay in self._replays if replay.first_timestamp is not None]
+        self._origin_ms = float(min(starts)) if starts else 0.0
+        self._now_ms = self._origin_ms
+        for replay in self._replays:
+            replay.start()
+
+        main = self._loop.create_task(strategy(self))
+        main.add_done_callback(self._on_task_done)
+        await self._replay()
+
+    async def _replay(self) -> None:
+        heap = self._heap
+        loop = self._loop
+        heappop = heapq.heappop
+        while heap:
+            if self._error is not None:
+                raise self._error
+            timestamp = heap[0][0]
+            if self._dispatched or not loop.is_idle_until(self._to_loop_time(timestamp)):
+                # Strategy code has work to do before the next event
+                self._dispatched = False
+                if timestamp > self._now_ms:
+                    await self._sleep_until(timestamp)
+                else:
+                    await asyncio.sleep(0)
+                continue
+            if timestamp > self._now_ms:
+                self._now_ms = timestamp
+                loop.advance_to(self._to_loop_time(timestamp))
+            _, _, _, action, arg = heappop(heap)
+            action(arg)
+
+        # Let the strategy react to the final deliveries
+        while self._error is None and not loop.is_idle_until(self._to_loop_time(self._now_ms)):
+            await asyncio.sleep(0)
+        if self._error is not None:
+            raise self._error
@@ -27,7 +27,9 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from trading.data_sources.book_ticker.book_ticker_source import CandlesBookTickerSource, BookTickerDbSource
 from exchanges.structs.enums import ExchangeEnum, KlineInterval
 from exchanges.structs import Symbol
-from trading.analysis.arbitrage_signals import calculate_arb_signals
+from trading.analysis.arbitrage_signals import calculate_arb_signals_series
+from trading.signals.types import Signal
+from trading.signals_v2.position_simulation import simulate_positions
 
 
 class AnalyzerKeys:
@@ -230,70 +232,46 @@ class ArbitrageAnalyzer:
         df['gateio_spot_mean'] = np.nan
 
         # Calculate signals_v2 using unified methodology from hedged backtest
-        for i in range(len(df)):
-            # Skip if insufficient history
-            if i < min_history:
-                continue
-                
-            # Get historical data (fixed lookback period like hedged backtest)
-            start_idx = max(0, i - lookback_periods)
-            mexc_history = df[mexc_col].iloc[start_idx:i+1].values
-            gateio_history = df[gateio_col].iloc[start_idx:i+1].values
-            
-            # Use unified signal detection like hedged backtest
-            if len(mexc_history) >= min_history:
-                signal_result = calculate_arb_signals(
-                    mexc_vs_gateio_futures_history=mexc_history,
-                    gateio_spot_vs_futures_history=gateio_history,
-                    current_mexc_vs_gateio_futures=df.iloc[i][mexc_col],
-                    current_gateio_spot_vs_futures=df.iloc[i][gateio_col],
-                    window_size=window_size
-                )
-                
-                # Store statistics
-                df.iloc[i, df.columns.get_loc('mexc_gateio_min_25pct')] = signal_result.mexc_vs_gateio_futures.min_25pct
-                df.iloc[i, df.columns.get_loc('gateio_spot_max_25pct')] = signal_result.gateio_spot_vs_futures.max_25pct
-                df.iloc[i, df.columns.get_loc('mexc_gateio_mean')] = signal_result.mexc_vs_gateio_futures.mean
-                df.iloc[i, df.columns.get_loc('gateio_spot_mean')] = signal_result.gateio_spot_vs_futures.mean
-                
-                # IMPROVED SIGNAL LOGIC WITH PROFITABILITY VALIDATION
-                if signal_result.signal.value == 'ENTER':
-                    # Get current net spreads (after costs) for profitability check
-                    current_mexc_net = df.iloc[i]['mexc_vs_gateio_futures_net']
-                    current_gateio_net = df.iloc[i]['gateio_spot_vs_futures_net']
-                    
-                    # Only enter if net spread is positive and significant
-                    min_profit_threshold = 0.05  # Minimum 0.05% profit after all costs
-                    
-                    # Choose best direction based on net profitability
-                    mexc_profitable = current_mexc_net > min_profit_threshold
-                    gateio_profitable = current_gateio_net > min_profit_threshold
-                    
-                    if mexc_profitable and current_mexc_net >= current_gateio_net:
-                        # MEXC direction is most profitable
-                        df.iloc[i, df.columns.get_loc('signal')] = 'ENTER'
-                        df.iloc[i, df.columns.get_loc('direction')] = 'MEXC_TO_GATEIO'
-                    elif gateio_profitable and current_gateio_net > current_mexc_net:
-                        # Gate.io direction is most profitable
-                        df.iloc[i, df.columns.get_loc('signal')] = 'ENTER'
-                        df.iloc[i, df.columns.get_loc('direction')] = 'GATEIO_TO_MEXC'
-                    else:
-                        # No profitable opportunity, stay in HOLD
-                        df.iloc[i, df.columns.get_loc('signal')] = 'HOLD'
-                        df.iloc[i, df.columns.get_loc('direction')] = 'NONE'
-                        
-                elif signal_result.signal.value == 'EXIT':
-                    # Additional exit validation: only exit if spread has normalized
-                    current_mexc_net = df.iloc[i]['mexc_vs_gateio_futures_net']
-                    current_gateio_net = df.iloc[i]['gateio_spot_vs_futures_net']
-                    
-                    # Exit if spreads are no longer profitable or have reversed
-                    max_exit_threshold = 0.02  # Exit if spread < 0.02%
-                    if abs(current_mexc_net) < max_exit_threshold and abs(current_gateio_net) < max_exit_threshold:
-                        df.iloc[i, df.columns.get_loc('signal')] = 'EXIT'
-                    else:
-                        # Don't exit yet, wait for better conditions
-                        df.iloc[i, df.columns.get_loc('signal')] = 'HOLD'
+        # (one incremental pass; equivalent to calculate_arb_signals over a fixed lookback per row)
+        series = calculate_arb_signals_series(
+            df[mexc_col].to_numpy(dtype=np.float64),
+            df[gateio_col].to_numpy(dtype=np.float64),
+            window_size=window_size,
+            lookback_periods=lookback_periods
+        )
+
+        # Skip if insufficient history
+        active = np.arange(len(df)) >= min_history
+
+        # Store statistics
+        df['mexc_gateio_min_25pct'] = np.where(active, series.mexc_min_25pct, np.nan)
+        df['gateio_spot_max_25pct'] = np.where(active, series.gateio_max_25pct, np.nan)
+        df['mexc_gateio_mean'] = np.where(active, series.mexc_mean, np.nan)
+        df['gateio_spot_mean'] = np.where(active, series.gateio_mean, np.nan)
+
+        # IMPROVED SIGNAL LOGIC WITH PROFITABILITY VALIDATION
+        # Current net spreads (after costs) for profitability check
+        current_mexc_net = df['mexc_vs_gateio_futures_net'].to_numpy(dtype=np.float64)
+        current_gateio_net = df['gateio_spot_vs_futures_net'].to_numpy(dtype=np.float64)
+        is_enter = active & (series.signal == Signal.ENTER)
+        is_exit = active & (series.signal == Signal.EXIT)
+
+        # Only enter if net spread is positive and significant
+        min_profit_threshold = 0.05  # Minimum 0.05% profit after all costs
+
+        # Choose best direction based on net profitability
+        mexc_profitable = current_mexc_net > min_profit_threshold
+        gateio_profitable = current_gateio_net > min_profit_threshold
+        enter_mexc = is_enter & mexc_profitable & (current_mexc_net >= current_gateio_net)
+        enter_gateio = is_enter & ~enter_mexc & gateio_profitable & (current_gateio_net > current_mexc_net)
+
+        # Additional exit validation: only exit if spread has normalized
+        max_exit_threshold = 0.02  # Exit if spread < 0.02%
+        exit_normalized = is_exit & (np.abs(current_mexc_net) < max_exit_threshold) & \
+            (np.abs(current_gateio_net) < max_exit_threshold)
+
+        df['signal'] = np.select([enter_mexc | enter_gateio, exit_normalized], ['ENTER', 'EXIT'], default='HOLD')
+        df['direction'] = np.select([enter_mexc, enter_gateio], ['MEXC_TO_GATEIO', 'GATEIO_TO_MEXC'], default='NONE')
 
         # --- Unified Bidirectional Position Tracking and P&L Calculation ---
         df['position_open'] = False
@@ -451,104 +429,86 @@ class ArbitrageAnalyzer:
         position_size_usd = legacy_params.get('position_size_usd', 1000.0)
         total_fees = legacy_params.get('total_fees', 0.0067)
         
-        # State tracking variables
-        position_open = False
-        entry_time = None
-        entry_spread = 0.0
-        spot_entry_price = 0.0
-        futures_entry_price = 0.0
-        cumulative_pnl = 0.0
-        
-        for idx in df.index:
-            current_spread = df.loc[idx, 'rdn_combined_spread']
-            current_time = df.loc[idx, 'timestamp'] if 'timestamp' in df.columns else idx
-            
-            # Skip if data is missing
-            if pd.isna(current_spread):
-                continue
-                
-            if not position_open:
-                # Entry logic: Enter when spread is deeply negative
-                if (current_spread < entry_spread_threshold and 
-                    not pd.isna(df.loc[idx, 'rdn_spread_volatility']) and
-                    df.loc[idx, 'rdn_spread_volatility'] > 0.1):  # Require minimum volatility
-                    
-                    # Enter reverse delta-neutral position
-                    df.loc[idx, 'rdn_signal'] = 'ENTER'
-                    df.loc[idx, 'rdn_position_open'] = True
-                    df.loc[idx, 'rdn_entry_time'] = current_time
-                    df.loc[idx, 'rdn_entry_spread'] = current_spread
-                    
-                    # Use MEXC for spot and Gate.io futures (most liquid combination)
-                    spot_entry_price = df.loc[idx, AnalyzerKeys.mexc_ask]  # Buy MEXC spot
-                    futures_entry_price = df.loc[idx, AnalyzerKeys.gateio_futures_bid]  # Sell Gate.io futures
-                    
-                    df.loc[idx, 'rdn_spot_entry'] = spot_entry_price
-                    df.loc[idx, 'rdn_futures_entry'] = futures_entry_price
-                    
-                    # Update state
-                    position_open = True
-                    entry_time = current_time
-                    entry_spread = current_spread
-                    
-            else:
-                # Exit logic
-                time_held = (current_time - entry_time).total_seconds() / 3600 if hasattr(current_time - entry_time, 'total_seconds') else 0
-                df.loc[idx, 'rdn_holding_hours'] = time_held
-                
-                should_exit = False
-                exit_reason = ""
-                
-                # Exit conditions
-                if current_spread > exit_spread_threshold:
-                    should_exit = True
-                    exit_reason = "SPREAD_COMPRESSION"
-                elif current_spread < stop_loss_threshold:
-                    should_exit = True
-                    exit_reason = "STOP_LOSS"
-                elif time_held > max_holding_hours:
-                    should_exit = True
-                    exit_reason = "MAX_TIME"
-                
-                if should_exit:
-                    # Exit position
-                    df.loc[idx, 'rdn_signal'] = f'EXIT_{exit_reason}'
-                    
-                    # Exit prices
-                    spot_exit_price = df.loc[idx, AnalyzerKeys.mexc_bid]  # Sell MEXC spot
-                    futures_exit_price = df.loc[idx, AnalyzerKeys.gateio_futures_ask]  # Buy Gate.io futures
-                    
-                    df.loc[idx, 'rdn_spot_exit'] = spot_exit_price
-                    df.loc[idx, 'rdn_futures_exit'] = futures_exit_price
-                    
-                    # Calculate P&L for reverse delta-neutral
-                    # Long spot: profit = (exit_price - entry_price) / entry_price
-                    # Short futures: profit = (entry_price - exit_price) / entry_price
-                    spot_pnl = (spot_exit_price - spot_entry_price) / spot_entry_price
-                    futures_pnl = (futures_entry_price - futures_exit_price) / futures_entry_price
-                    gross_pnl = (spot_pnl + futures_pnl) * 100  # Convert to percentage
-                    
-                    # Apply fees
-                    net_pnl = gross_pnl - (total_fees * 100)  # Subtract fees
-                    
-                    df.loc[idx, 'rdn_trade_pnl'] = net_pnl
-                    cumulative_pnl += net_pnl
-                    df.loc[idx, 'rdn_cumulative_pnl'] = cumulative_pnl
-                    
-                    # Reset position
-                    position_open = False
-                    entry_time = None
-                
-                # Forward fill position state
-                if position_open:
-                    df.loc[idx, 'rdn_position_open'] = True
-                    df.loc[idx, 'rdn_entry_time'] = entry_time
-                    df.loc[idx, 'rdn_entry_spread'] = entry_spread
-                    df.loc[idx, 'rdn_spot_entry'] = spot_entry_price
-                    df.loc[idx, 'rdn_futures_entry'] = futures_entry_price
-            
-            # Forward fill cumulative P&L
-            df.loc[idx, 'rdn_cumulative_pnl'] = cumulative_pnl
+        # Vectorized entry/exit conditions; rows with missing spread are skipped entirely
+        spread = df['rdn_combined_spread'].to_numpy(dtype=np.float64)
+        volatility = df['rdn_spread_volatility'].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(spread)
+        entries = (spread < entry_spread_threshold) & (volatility > 0.1)  # Require minimum volatility
+        compression = spread > exit_spread_threshold
+        stop_loss = spread < stop_loss_threshold
+        
+        # Holding time is only known for datetime rows
+        times = df['timestamp'] if 'timestamp' in df.columns else df.index
+        timestamps = pd.DatetimeIndex(times) if pd.api.types.is_datetime64_any_dtype(times) else None
+        
+        sim = simulate_positions(
+            entries, compression | stop_loss, timestamps,
+            n_rows=len(df),
+            evaluate=valid,
+            max_hold=pd.Timedelta(hours=max_holding_hours) if timestamps is not None else None,
+            strict_max_hold=True
+        )
+        closed = sim.closed
+        entry_rows = sim.entry_rows
+        exit_rows = sim.exit_rows[closed]
+        
+        # Use MEXC for spot and Gate.io futures (most liquid combination)
+        spot_entry = df[AnalyzerKeys.mexc_ask].to_numpy(dtype=np.float64)[entry_rows]  # Buy MEXC spot
+        futures_entry = df[AnalyzerKeys.gateio_futures_bid].to_numpy(dtype=np.float64)[entry_rows]  # Sell Gate.io futures
+        spot_exit = df[AnalyzerKeys.mexc_bid].to_numpy(dtype=np.float64)[exit_rows]  # Sell MEXC spot
+        futures_exit = df[AnalyzerKeys.gateio_futures_ask].to_numpy(dtype=np.float64)[exit_rows]  # Buy Gate.io futures
+        
+        # Calculate P&L for reverse delta-neutral
+        # Long spot: profit = (exit_price - entry_price) / entry_price
+        # Short futures: profit = (entry_price - exit_price) / entry_price
+        spot_pnl = (spot_exit - spot_entry[closed]) / spot_entry[closed]
+        futures_pnl = (futures_entry[closed] - futures_exit) / futures_entry[closed]
+        gross_pnl = (spot_pnl + futures_pnl) * 100  # Convert to percentage
+        net_pnl = gross_pnl - (total_fees * 100)  # Subtract fees
+        
+        # Per-row output: each trade spans its entry row through its exit row
+        n_rows = len(df)
+        rows = np.arange(n_rows)
+        span = np.full(n_rows, -1, dtype=np.int64)
+        ends = np.where(sim.exit_rows >= 0, sim.exit_rows + 1, n_rows)
+        for k, (start, end) in enumerate(zip(entry_rows.tolist(), ends.tolist())):
+            span[start:end] = k
+        in_span = valid & (span >= 0)
+        span_entry = entry_rows[np.maximum(span, 0)]
+        exit_row = np.zeros(n_rows, dtype=bool)
+        exit_row[exit_rows] = True
+        held_rows = np.flatnonzero(in_span & ~exit_row)
+        held_trades = span[held_rows]
+        
+        signal = np.full(n_rows, 'HOLD', dtype=object)
+        signal[entry_rows] = 'ENTER'
+        signal[exit_rows] = np.select(
+            [compression[exit_rows], stop_loss[exit_rows]], ['EXIT_SPREAD_COMPRESSION', 'EXIT_STOP_LOSS'],
+            default='EXIT_MAX_TIME'
+        )
+        df['rdn_signal'] = signal
+        position_open = np.zeros(n_rows, dtype=bool)
+        position_open[held_rows] = True
+        df['rdn_position_open'] = position_open
+        entry_times = pd.Series(times).iloc[entry_rows].to_numpy()
+        df.iloc[held_rows, df.columns.get_loc('rdn_entry_time')] = entry_times[held_trades]
+        df.iloc[held_rows, df.columns.get_loc('rdn_entry_spread')] = spread[entry_rows][held_trades]
+        df.iloc[held_rows, df.columns.get_loc('rdn_spot_entry')] = spot_entry[held_trades]
+        df.iloc[held_rows, df.columns.get_loc('rdn_futures_entry')] = futures_entry[held_trades]
+        df.iloc[exit_rows, df.columns.get_loc('rdn_spot_exit')] = spot_exit
+        df.iloc[exit_rows, df.columns.get_loc('rdn_futures_exit')] = futures_exit
+        df.iloc[exit_rows, df.columns.get_loc('rdn_trade_pnl')] = net_pnl
+        
+        if timestamps is not None:
+            # Hours since entry on every evaluated row after the entry row
+            open_rows = np.flatnonzero(in_span & (rows != span_entry))
+            elapsed_ns = timestamps.asi8[open_rows] - timestamps.asi8[span_entry[open_rows]]
+            df.iloc[open_rows, df.columns.get_loc('rdn_holding_hours')] = elapsed_ns / 1e9 / 3600
+        
+        # Cumulative P&L on evaluated rows
+        realized = np.zeros(n_rows, dtype=np.float64)
+        realized[exit_rows] = net_pnl
+        df['rdn_cumulative_pnl'] = np.where(valid, np.cumsum(realized), 0.0)
             
         return df
 
@@ -22,10 +22,10 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
+import time
 from typing import Dict, Any, List, Optional, NamedTuple, Tuple
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from enum import Enum
-import matplotlib.pyplot as plt
 import sys
 import os
 
@@ -38,7 +38,11 @@ src_path = os.path.join(os.path.dirname(__file__), 'src')
 sys.path.insert(0, src_path)
 
 from trading.research.cross_arbitrage.arbitrage_analyzer import ArbitrageAnalyzer, AnalyzerKeys
-from trading.analysis.arbitrage_signals import ArbSignal, ArbStats, Signal, calculate_arb_signals
+from trading.analysis.arbitrage_signals import Signal, calculate_arb_signals_series
+from trading.signals_v2.optimization.result_store import BacktestResultStore, ResultKey
+from trading.research.cross_arbitrage.hedged_simulation import (
+    EXIT_SIGNAL, ROUTE_A_TO_B, ROUTE_B_TO_A, HedgedTrades, simulate_hedged_positions
+)
 
 
 class PositionStatus(Enum):
@@ -128,9 +132,23 @@ class HedgedCrossArbitrageBacktest:
     5. Position closing (Gate.io spot sell + Gate.io futures buy)
     """
     
-    def __init__(self, config: Optional[BacktestConfig] = None, cache_dir: str = "cache"):
-        """Initialize backtester with configuration."""
+    SIGNAL_HISTORY = 500  # Trailing periods used for signal calculation
+    MIN_SIGNAL_HISTORY = 50  # Periods required before generating signals_v2
+    STRATEGY_VERSION = 1  # Bump when simulation results change (invalidates stored runs)
+    
+    def __init__(self, config: Optional[BacktestConfig] = None, cache_dir: str = "cache",
+                 result_store: Optional[BacktestResultStore] = None):
+        """
+        Initialize backtester with configuration.
+
+        Args:
+            config: Backtest configuration
+            cache_dir: Output directory for result CSVs (relative to this module)
+            result_store: Optional store; a run with the same prepared data, config and
+                STRATEGY_VERSION is returned from the store instead of simulated again
+        """
         self.config = config or BacktestConfig()
+        self.result_store = result_store
         self.cache_dir = Path(__file__).parent / cache_dir
         self.cache_dir.mkdir(exist_ok=True)
         
@@ -171,7 +189,17 @@ class HedgedCrossArbitrageBacktest:
         # Load and prepare data
         df = await self._load_and_prepare_data(df_data=df_data)
 
+        result_key = None
+        if self.result_store is not None:
+            result_key = ResultKey.build(df, self, asdict(self.config))
+            stored = self.result_store.get(result_key)
+            if stored is not None:
+                print(f"♻️ Using stored backtest run {stored.run_id} from {stored.created_at}")
+                self.positions = stored.result['positions']
+                return {'config': self.config, **stored.result}
+
         # Run simulation
+        start_time = time.perf_counter()
         df_with_signals = self._simulate_trading(df)
         
         # Calculate performance metrics
@@ -187,6 +215,13 @@ class HedgedCrossArbitrageBacktest:
             'backtest_start': df_with_signals.index.min(),
             'backtest_end': df_with_signals.index.max()
         }
+
+        if result_key is not None:
+            self.result_store.put(
+                result_key, {k: v for k, v in results.items() if k != 'config'},
+                label=str(self.config.symbol), trades=self.positions, metrics=performance,
+                duration_ms=(time.perf_counter() - start_time) * 1000
+            )
         
         # Save results
         self._save_results(results)
@@ -208,254 +243,164 @@ class HedgedCrossArbitrageBacktest:
         """Simulate the complete trading strategy on historical data."""
         print(f"🔄 Simulating trading strategy...")
         
-        # Initialize tracking columns
-        df['signal'] = 'HOLD'
-        df['direction'] = 'NONE'
-        df['position_action'] = None
-        df['active_positions'] = 0
-        df['cumulative_pnl'] = 0.0
+        mexc_spread = df[AnalyzerKeys.mexc_vs_gateio_futures_arb].to_numpy(dtype=np.float64)
+        gateio_spread = df[AnalyzerKeys.gateio_spot_vs_futures_arb].to_numpy(dtype=np.float64)
         
-        cumulative_pnl = 0.0
+        # Generate signals_v2 for all rows, then jump between trade events
+        signals, directions = self._generate_signals(mexc_spread, gateio_spread)
+        routes = np.select(
+            [directions == "MEXC_TO_GATEIO", directions == "GATEIO_TO_MEXC"], [ROUTE_A_TO_B, ROUTE_B_TO_A], 0
+        )
+        trades = simulate_hedged_positions(
+            pd.DatetimeIndex(df.index),
+            spot_a_bid=df[AnalyzerKeys.mexc_bid].to_numpy(dtype=np.float64),
+            spot_a_ask=df[AnalyzerKeys.mexc_ask].to_numpy(dtype=np.float64),
+            spot_b_bid=df[AnalyzerKeys.gateio_spot_bid].to_numpy(dtype=np.float64),
+            spot_b_ask=df[AnalyzerKeys.gateio_spot_ask].to_numpy(dtype=np.float64),
+            futures_bid=df[AnalyzerKeys.gateio_futures_bid].to_numpy(dtype=np.float64),
+            futures_ask=df[AnalyzerKeys.gateio_futures_ask].to_numpy(dtype=np.float64),
+            entry_routes=routes,
+            exits=signals == Signal.EXIT,
+            transfer_time=pd.Timedelta(minutes=self.config.min_transfer_time_minutes),
+            max_hold=pd.Timedelta(hours=self.config.max_position_duration_hours),
+            max_concurrent=self.config.max_concurrent_positions
+        )
+        pnl = self._calculate_trade_pnl(trades)
+        self._record_positions(df.index, trades, pnl, mexc_spread, gateio_spread)
         
-        for idx, row in df.iterrows():
-            current_time = idx
-            
-            # Update historical spreads for signal calculation using numpy arrays
-            self.historical_spreads['mexc_vs_gateio_futures'] = np.append(
-                self.historical_spreads['mexc_vs_gateio_futures'], 
-                row[AnalyzerKeys.mexc_vs_gateio_futures_arb]
-            )
-            self.historical_spreads['gateio_spot_vs_futures'] = np.append(
-                self.historical_spreads['gateio_spot_vs_futures'], 
-                row[AnalyzerKeys.gateio_spot_vs_futures_arb]
-            )
-            
-            # Keep only recent history (e.g., last 500 periods for signal calculation)
-            max_history = 500
-            if len(self.historical_spreads['mexc_vs_gateio_futures']) > max_history:
-                self.historical_spreads['mexc_vs_gateio_futures'] = self.historical_spreads['mexc_vs_gateio_futures'][-max_history:]
-                self.historical_spreads['gateio_spot_vs_futures'] = self.historical_spreads['gateio_spot_vs_futures'][-max_history:]
-            
-            # Update position statuses (check for transfer completion, forced exits)
-            self._update_position_statuses(current_time)
-            
-            # Generate signals_v2
-            signal_result, direction = self._generate_signal(row)
-            df.at[idx, 'signal'] = signal_result.signal.value
-            df.at[idx, 'direction'] = direction or 'NONE'
-            
-            # Execute trading logic
-            action = self._execute_trading_logic(current_time, row, signal_result, direction)
-            df.at[idx, 'position_action'] = action
-            df.at[idx, 'active_positions'] = len(self.open_positions)
-            
-            # Update cumulative PnL
-            period_pnl = sum(pos.pnl for pos in self.positions if pos.pnl is not None and pos.exit_time == current_time)
-            cumulative_pnl += period_pnl
-            df.at[idx, 'cumulative_pnl'] = cumulative_pnl
+        # Tracking columns
+        df['signal'] = [signal.value for signal in signals]
+        df['direction'] = directions
+        df['position_action'] = self._position_actions(trades)
+        df['active_positions'] = trades.active_positions()
+        df['cumulative_pnl'] = trades.realized_pnl(pnl)
+        
+        # Keep the trailing history the signals_v2 were calculated on
+        self.historical_spreads['mexc_vs_gateio_futures'] = mexc_spread[-self.SIGNAL_HISTORY:].copy()
+        self.historical_spreads['gateio_spot_vs_futures'] = gateio_spread[-self.SIGNAL_HISTORY:].copy()
         
         print(f"✅ Simulation complete: {len(self.positions)} total positions, {len([p for p in self.positions if p.pnl is not None])} closed")
         
         return df
     
-    def _generate_signal(self, row: pd.Series) -> Tuple[Any, Optional[str]]:
-        """Generate unified bidirectional signals_v2."""
-        
-        # Ensure we have enough historical data
-        if len(self.historical_spreads['mexc_vs_gateio_futures']) < 50:
-            return ArbSignal(
-                signal=Signal.HOLD,
-                mexc_vs_gateio_futures=ArbStats(0, 0, 0, row[AnalyzerKeys.mexc_vs_gateio_futures_arb]),
-                gateio_spot_vs_futures=ArbStats(0, 0, 0, row[AnalyzerKeys.gateio_spot_vs_futures_arb])
-            ), None
-        
-        # Calculate arbitrage opportunities in both directions
-        mexc_to_gateio_spread = row[AnalyzerKeys.mexc_vs_gateio_futures_arb]  # MEXC cheaper
-        gateio_to_mexc_spread = -mexc_to_gateio_spread  # Gate.io cheaper (opposite)
-        
-        # Use existing signal calculation for both directions
-        signal_result = calculate_arb_signals(
-            mexc_vs_gateio_futures_history=self.historical_spreads['mexc_vs_gateio_futures'],
-            gateio_spot_vs_futures_history=self.historical_spreads['gateio_spot_vs_futures'],
-            current_mexc_vs_gateio_futures=mexc_to_gateio_spread,
-            current_gateio_spot_vs_futures=row[AnalyzerKeys.gateio_spot_vs_futures_arb]
+    def _generate_signals(self, mexc_spread: np.ndarray, gateio_spread: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate unified bidirectional signals_v2 for every row.
+        
+        Each row uses the trailing SIGNAL_HISTORY spreads including itself and
+        holds until MIN_SIGNAL_HISTORY rows are available.
+        
+        Returns:
+            Tuple of (Signal per row, direction per row or 'NONE')
+        """
+        series = calculate_arb_signals_series(
+            mexc_spread, gateio_spread, lookback_periods=self.SIGNAL_HISTORY - 1
         )
+        warmed_up = np.arange(len(mexc_spread)) >= self.MIN_SIGNAL_HISTORY - 1
+        signals = np.where(warmed_up, series.signal, Signal.HOLD)
         
         # Detect best direction based on spread magnitude
-        mexc_opportunity = mexc_to_gateio_spread  # Negative = MEXC cheaper
-        gateio_opportunity = gateio_to_mexc_spread  # Positive = Gate.io cheaper
-        
-        # Determine preferred direction
-        direction = None
-        if signal_result.signal == Signal.ENTER:
-            # Choose direction based on which spread is more favorable
-            if abs(mexc_opportunity) > abs(gateio_opportunity) and mexc_opportunity < 0:
-                direction = "MEXC_TO_GATEIO"  # MEXC cheaper, buy MEXC
-            elif abs(gateio_opportunity) > abs(mexc_opportunity) and gateio_opportunity > 0:
-                direction = "GATEIO_TO_MEXC"  # Gate.io cheaper, buy Gate.io
-            else:
-                # Default to original direction if unclear
-                direction = "MEXC_TO_GATEIO" if mexc_opportunity < 0 else "GATEIO_TO_MEXC"
+        mexc_opportunity = mexc_spread  # Negative = MEXC cheaper
+        gateio_opportunity = -mexc_spread  # Positive = Gate.io cheaper (opposite)
+        direction = np.select(
+            [
+                (np.abs(mexc_opportunity) > np.abs(gateio_opportunity)) & (mexc_opportunity < 0),
+                (np.abs(gateio_opportunity) > np.abs(mexc_opportunity)) & (gateio_opportunity > 0),
+                mexc_opportunity < 0  # Default to original direction if unclear
+            ],
+            ["MEXC_TO_GATEIO", "GATEIO_TO_MEXC", "MEXC_TO_GATEIO"],
+            default="GATEIO_TO_MEXC"
+        )
+        directions = np.where(signals == Signal.ENTER, direction, "NONE").astype(object)
         
-        return signal_result, direction
+        return signals, directions
     
-
-    def _execute_trading_logic(self, current_time: datetime, row: pd.Series, signal_result: Any, direction: Optional[str]) -> Optional[str]:
-        """Execute unified position management based on signals_v2 and direction."""
-        action = None
-        
-        signal = signal_result.signal
-
-        # Check for entry signals_v2 with direction
-        if (signal == Signal.ENTER and direction and
-            len(self.open_positions) < self.config.max_concurrent_positions):
-            action = self._open_position(current_time, row, direction)
+    def _calculate_trade_pnl(self, trades: HedgedTrades) -> np.ndarray:
+        """Three-exchange delta-neutral P&L per trade in USD (NaN for open positions)."""
+        spot_return, futures_return = trades.leg_returns()
         
-        # Check for exit signals_v2 on ready positions
-        elif signal == Signal.EXIT:
-            action = self._close_ready_positions(current_time, row)
+        # Spot leg: what we get from selling vs what we paid for buying
+        spot_pnl_usd = spot_return * self.config.position_size_usd
+        # Futures hedge leg: we sold futures at entry, buy back at exit
+        futures_pnl_usd = futures_return * self.config.position_size_usd
         
-        # Force close positions that have been open too long
-        self._force_close_expired_positions(current_time, row)
+        # Apply fees (entry + exit + transfer fees)
+        fee_cost = (self.config.fees_bps / 10000) * self.config.position_size_usd
         
-        return action
+        return (spot_pnl_usd + futures_pnl_usd) - fee_cost
     
-    def _open_position(self, current_time: datetime, row: pd.Series, direction: str) -> str:
-        """Open a unified bidirectional hedged arbitrage position."""
-        
-        if direction == "MEXC_TO_GATEIO":
-            # Buy MEXC spot + Sell Gate.io futures → transfer to Gate.io
-            source_spot_entry = row[AnalyzerKeys.mexc_ask]  # Buy MEXC spot
-            hedge_futures_entry = row[AnalyzerKeys.gateio_futures_bid]  # Sell Gate.io futures
-            source_exchange = "MEXC"
-            dest_exchange = "GATEIO"
-            entry_spread = row[AnalyzerKeys.mexc_vs_gateio_futures_arb]
-            entry_cost = source_spot_entry - hedge_futures_entry
+    def _record_positions(self, index: pd.Index, trades: HedgedTrades, pnl: np.ndarray,
+                          mexc_spread: np.ndarray, gateio_spread: np.ndarray):
+        """Create Position objects for the simulated trades."""
+        last_row = trades.n_rows - 1
+        
+        for k in range(len(trades)):
+            entry_row = int(trades.entry_rows[k])
+            exit_row = int(trades.exit_rows[k])
+            ready_row = int(trades.ready_rows[k])
+            source_spot_entry = float(trades.source_spot_entry[k])
+            hedge_futures_entry = float(trades.hedge_futures_entry[k])
             
-        elif direction == "GATEIO_TO_MEXC":
-            # Buy Gate.io spot + Sell Gate.io futures → transfer to MEXC
-            source_spot_entry = row[AnalyzerKeys.gateio_spot_ask]  # Buy Gate.io spot
-            hedge_futures_entry = row[AnalyzerKeys.gateio_futures_bid]  # Sell Gate.io futures
-            source_exchange = "GATEIO"
-            dest_exchange = "MEXC"
-            entry_spread = -row[AnalyzerKeys.mexc_vs_gateio_futures_arb]  # Reverse spread
-            entry_cost = source_spot_entry - hedge_futures_entry
+            if trades.routes[k] == ROUTE_A_TO_B:
+                # Buy MEXC spot + Sell Gate.io futures → transfer to Gate.io
+                direction, source_exchange, dest_exchange = "MEXC_TO_GATEIO", "MEXC", "GATEIO"
+                entry_spread = float(mexc_spread[entry_row])
+            else:
+                # Buy Gate.io spot + Sell Gate.io futures → transfer to MEXC
+                direction, source_exchange, dest_exchange = "GATEIO_TO_MEXC", "GATEIO", "MEXC"
+                entry_spread = float(-mexc_spread[entry_row])  # Reverse spread
             
-        else:
-            raise ValueError(f"Unknown direction: {direction}")
-        
-        position = Position(
-            entry_time=current_time,
-            direction=direction,
-            entry_spread=entry_spread,
-            entry_signal_reason=f"ENTER signal triggered ({direction})",
-            source_spot_entry=source_spot_entry,
-            hedge_futures_entry=hedge_futures_entry,
-            source_exchange=source_exchange,
-            dest_exchange=dest_exchange,
-            status=PositionStatus.WAITING_TRANSFER,
-            entry_cost_usd=entry_cost
-        )
-        
-        self.positions.append(position)
-        self.open_positions.append(position)
-        
-        return f"OPEN_{direction}_{len(self.positions)}"
-    
-    def _update_position_statuses(self, current_time: datetime):
-        """Update position statuses based on time elapsed."""
-        for position in self.open_positions:
-            if position.status == PositionStatus.WAITING_TRANSFER:
-                minutes_elapsed = (current_time - position.entry_time).total_seconds() / 60
-                if minutes_elapsed >= self.config.min_transfer_time_minutes:
-                    position.status = PositionStatus.READY_TO_EXIT
-                    position.transfer_complete_time = current_time
-    
-    def _close_ready_positions(self, current_time: datetime, row: pd.Series) -> Optional[str]:
-        """Close positions that are ready to exit."""
-        ready_positions = [p for p in self.open_positions if p.status == PositionStatus.READY_TO_EXIT]
-        
-        if not ready_positions:
-            return None
-        
-        closed_count = 0
-        for position in ready_positions:
-            self._close_position(position, current_time, row, "EXIT signal triggered")
-            closed_count += 1
-        
-        return f"CLOSE_{closed_count}_POSITIONS"
-    
-    def _force_close_expired_positions(self, current_time: datetime, row: pd.Series):
-        """Force close positions that have been open too long."""
-        max_duration = timedelta(hours=self.config.max_position_duration_hours)
-        
-        expired_positions = [
-            p for p in self.open_positions 
-            if (current_time - p.entry_time) > max_duration
-        ]
-        
-        for position in expired_positions:
-            self._close_position(position, current_time, row, "FORCED_CLOSE_EXPIRED")
-    
-    def _close_position(self, position: Position, current_time: datetime, row: pd.Series, reason: str):
-        """Close a unified bidirectional hedged arbitrage position."""
-        
-        if position.direction == "MEXC_TO_GATEIO":
-            # Close: Sell Gate.io spot + Buy Gate.io futures
-            dest_spot_exit = row[AnalyzerKeys.gateio_spot_bid]  # Sell Gate.io spot
-            hedge_futures_exit = row[AnalyzerKeys.gateio_futures_ask]  # Buy Gate.io futures
-            exit_spread = row[AnalyzerKeys.gateio_spot_vs_futures_arb]
-            exit_cost = hedge_futures_exit - dest_spot_exit
+            position = Position(
+                entry_time=index[entry_row],
+                direction=direction,
+                entry_spread=entry_spread,
+                entry_signal_reason=f"ENTER signal triggered ({direction})",
+                source_spot_entry=source_spot_entry,
+                hedge_futures_entry=hedge_futures_entry,
+                source_exchange=source_exchange,
+                dest_exchange=dest_exchange,
+                status=PositionStatus.WAITING_TRANSFER,
+                entry_cost_usd=source_spot_entry - hedge_futures_entry
+            )
             
-        elif position.direction == "GATEIO_TO_MEXC":
-            # Close: Sell MEXC spot + Buy Gate.io futures  
-            dest_spot_exit = row[AnalyzerKeys.mexc_bid]  # Sell MEXC spot
-            hedge_futures_exit = row[AnalyzerKeys.gateio_futures_ask]  # Buy Gate.io futures
-            exit_spread = -row[AnalyzerKeys.mexc_vs_gateio_futures_arb]  # Reverse spread
-            exit_cost = hedge_futures_exit - dest_spot_exit
+            if ready_row <= (exit_row if exit_row >= 0 else last_row):
+                position.status = PositionStatus.READY_TO_EXIT
+                position.transfer_complete_time = index[ready_row]
             
-        else:
-            raise ValueError(f"Unknown direction: {position.direction}")
-        
-        # THREE-EXCHANGE DELTA-NEUTRAL P&L CALCULATION
-        # Gate.io Futures always provides hedging reference price
-        # Calculate actual position values relative to current futures price
-        
-        current_futures_price = hedge_futures_exit  # Current Gate.io futures price
-        
-        # THREE-EXCHANGE DELTA-NEUTRAL P&L (Your Method)
-        # Calculate P&L for each leg separately, then combine
-        
-        # Spot leg: What we get from selling vs what we paid for buying
-        spot_pnl_per_unit = dest_spot_exit - position.source_spot_entry
-        spot_pnl_usd = (spot_pnl_per_unit / position.source_spot_entry) * self.config.position_size_usd
-        
-        # Futures hedge leg: We sold futures at entry, buy back at current price
-        futures_pnl_per_unit = position.hedge_futures_entry - hedge_futures_exit  # Profit when futures drops
-        futures_pnl_usd = (futures_pnl_per_unit / position.hedge_futures_entry) * self.config.position_size_usd
-        
-        # Total delta-neutral P&L = spot + futures hedge
-        gross_profit_usd = spot_pnl_usd + futures_pnl_usd
-        
-        # Apply fees (entry + exit + transfer fees)
-        fee_cost = (self.config.fees_bps / 10000) * self.config.position_size_usd
-        
-        # Net profit after fees
-        pnl_usd = gross_profit_usd - fee_cost
-        
-        # Update position with unified structure
-        position.exit_time = current_time
-        position.dest_spot_exit = dest_spot_exit
-        position.hedge_futures_exit = hedge_futures_exit
-        position.exit_spread = exit_spread
-        position.exit_signal_reason = reason
-        position.pnl = pnl_usd
-        position.holding_period_minutes = int((current_time - position.entry_time).total_seconds() / 60)
-        position.status = PositionStatus.CLOSED
-        position.exit_cost_usd = exit_cost
-        
-        # Remove from open positions
-        self.open_positions.remove(position)
+            if exit_row >= 0:
+                exit_time = index[exit_row]
+                position.exit_time = exit_time
+                position.dest_spot_exit = float(trades.dest_spot_exit[k])
+                position.hedge_futures_exit = float(trades.hedge_futures_exit[k])
+                if direction == "MEXC_TO_GATEIO":
+                    position.exit_spread = float(gateio_spread[exit_row])
+                else:
+                    position.exit_spread = float(-mexc_spread[exit_row])  # Reverse spread
+                position.exit_signal_reason = ("EXIT signal triggered" if trades.exit_reasons[k] == EXIT_SIGNAL
+                                               else "FORCED_CLOSE_EXPIRED")
+                position.pnl = float(pnl[k])
+                position.holding_period_minutes = int((exit_time - position.entry_time).total_seconds() / 60)
+                position.status = PositionStatus.CLOSED
+                position.exit_cost_usd = position.hedge_futures_exit - position.dest_spot_exit
+            
+            self.positions.append(position)
+            if exit_row < 0:
+                self.open_positions.append(position)
+    
+    def _position_actions(self, trades: HedgedTrades) -> List[Optional[str]]:
+        """Per-row action labels: position openings and EXIT-signal closes."""
+        actions: List[Optional[str]] = [None] * trades.n_rows
+        first_id = len(self.positions) - len(trades) + 1
+        for k, (row, route) in enumerate(zip(trades.entry_rows.tolist(), trades.routes.tolist())):
+            direction = "MEXC_TO_GATEIO" if route == ROUTE_A_TO_B else "GATEIO_TO_MEXC"
+            actions[row] = f"OPEN_{direction}_{first_id + k}"
+        
+        signal_exits = trades.exit_rows[trades.exit_reasons == EXIT_SIGNAL]
+        rows, counts = np.unique(signal_exits, return_counts=True)
+        for row, count in zip(rows.tolist(), counts.tolist()):
+            actions[row] = f"CLOSE_{count}_POSITIONS"
+        
+        return actions
     
     def _validate_arbitrage_opportunity(self, entry_spread: float, exit_spread: float) -> tuple[bool, float]:
         """Validate that arbitrage opportunity is theoretically profitable."""
@@ -625,8 +570,10 @@ class HedgedCrossArbitrageBacktest:
         
         return report
     
-    def create_visualizations(self, results: Dict[str, Any], save_plots: bool = True) -> Dict[str, plt.Figure]:
+    def create_visualizations(self, results: Dict[str, Any], save_plots: bool = True) -> Dict[str, Any]:
         """Create comprehensive visualization suite."""
+        import matplotlib.pyplot as plt
+        
         figs = {}
         
         # 1. Cumulative PnL Chart
@@ -0,0 +1,193 @@
+"""
+Vectorized Hedged Position Simulation
+
+Event-driven kernel for hedged spot/futures arbitrage with transfers between
+two spot venues (A and B) and several concurrent positions:
+
+- Entry: buy spot on the source venue at the ask, sell futures at the bid
+- Transfer: the position becomes ready to exit once the transfer time has
+  elapsed (status updates happen at the start of each row)
+- Exit: on an exit row, all ready positions sell spot on the destination
+  venue at the bid and buy futures back at the ask
+- Expiry: after every row, positions held longer than max_hold are closed
+
+Entry routes and exit conditions are precomputed arrays. The state only
+changes on candidate rows (entries while below the position limit, exit
+rows once some position is ready, expiry rows), so the kernel jumps between
+them with binary searches and the Python loop runs once per trade event
+instead of once per row. Pass the same arrays for venue A and B to model a
+single-venue hedge.
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from trading.signals_v2.position_simulation import SignalIndex
+
+# Entry routes (0 = no entry)
+ROUTE_A_TO_B = 1    # Buy spot A, sell spot B after the transfer
+ROUTE_B_TO_A = -1   # Buy spot B, sell spot A after the transfer
+
+# Exit reasons
+EXIT_OPEN = -1      # Still open at the end of the data
+EXIT_SIGNAL = 0     # Closed on an exit row after the transfer
+EXIT_EXPIRED = 1    # Closed after exceeding max_hold
+
+
+@dataclass
+class HedgedTrades:
+    """Trade list of a hedged multi-position simulation (entry order)."""
+    n_rows: int
+    routes: np.ndarray               # ROUTE_A_TO_B / ROUTE_B_TO_A
+    entry_rows: np.ndarray
+    ready_rows: np.ndarray           # First row with the transfer complete (n_rows = never)
+    exit_rows: np.ndarray            # -1 = still open
+    exit_reasons: np.ndarray         # EXIT_SIGNAL / EXIT_EXPIRED / EXIT_OPEN
+    source_spot_entry: np.ndarray
+    hedge_futures_entry: np.ndarray
+    dest_spot_exit: np.ndarray       # NaN while open
+    hedge_futures_exit: np.ndarray   # NaN while open
+
+    def __len__(self) -> int:
+        return len(self.entry_rows)
+
+    @property
+    def closed(self) -> np.ndarray:
+        """Mask of trades that were closed within the data."""
+        return self.exit_rows >= 0
+
+    def leg_returns(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Relative P&L of both legs per trade (NaN while open).
+
+        Returns:
+            (long spot return, short futures return)
+        """
+        spot = (self.dest_spot_exit - self.source_spot_entry) / self.source_spot_entry
+        futures = (self.hedge_futures_entry - self.hedge_futures_exit) / self.hedge_futures_entry
+        return spot, futures
+
+    def active_positions(self) -> np.ndarray:
+        """Open positions per row after the row was processed."""
+        delta = np.zeros(self.n_rows + 1, dtype=np.int64)
+        np.add.at(delta, self.entry_rows, 1)
+        closed = self.closed
+        np.add.at(delta, self.exit_rows[closed], -1)
+        return np.cumsum(delta[:-1])
+
+    def realized_pnl(self, trade_pnl: np.ndarray) -> np.ndarray:
+        """
+        Cumulative realized P&L per row, booking each closed trade on its exit row.
+
+        Args:
+            trade_pnl: P&L per trade (same order as the trades)
+        """
+        realized = np.zeros(self.n_rows, dtype=np.float64)
+        closed = self.closed
+        np.add.at(realized, self.exit_rows[closed], np.asarray(trade_pnl, dtype=np.float64)[closed])
+        return np.cumsum(realized)
+
+
+def simulate_hedged_positions(timestamps: pd.DatetimeIndex,
+                              spot_a_bid: np.ndarray, spot_a_ask: np.ndarray,
+                              spot_b_bid: np.ndarray, spot_b_ask: np.ndarray,
+                              futures_bid: np.ndarray, futures_ask: np.ndarray,
+                              entry_routes: np.ndarray, exits: np.ndarray,
+                              transfer_time: pd.Timedelta, max_hold: pd.Timedelta,
+                              max_concurrent: int) -> HedgedTrades:
+    """
+    Simulate hedged transfer arbitrage positions.
+
+    Per row, in order: transfers that completed become ready; an entry opens a
+    position if below max_concurrent, otherwise an exit row closes every ready
+    position; finally positions held longer than max_hold are closed.
+
+    Args:
+        timestamps: Sorted row timestamps
+        spot_a_bid, spot_a_ask: Spot venue A prices
+        spot_b_bid, spot_b_ask: Spot venue B prices
+        futures_bid, futures_ask: Hedge futures prices
+        entry_routes: Route per row (ROUTE_A_TO_B, ROUTE_B_TO_A, 0 = no entry)
+        exits: Boolean exit condition per row
+        transfer_time: Time before a position may exit on an exit row
+        max_hold: Holding time after which the position is force-closed
+        max_concurrent: Maximum number of open positions
+
+    Returns:
+        HedgedTrades with rows and execution prices of every position
+    """
+    times = np.asarray(timestamps.asi8, dtype=np.int64)
+    n_rows = len(times)
+    entry_routes = np.asarray(entry_routes, dtype=np.int8)
+    exits = np.asarray(exits, dtype=bool)
+    if len(entry_routes) != n_rows or len(exits) != n_rows:
+        raise ValueError("entry_routes and exits must have one value per timestamp")
+
+    entry_index = SignalIndex(entry_routes != 0)
+    exit_index = SignalIndex(exits)
+    transfer_ns = int(pd.Timedelta(transfer_time).value)
+    max_hold_ns = int(pd.Timedelta(max_hold).value)
+
+    entry_rows, ready_rows, expiry_rows, exit_rows, exit_reasons = [], [], [], [], []
+    open_trades = []
+    row = 0
+    while row < n_rows:
+        candidates = []
+        if len(open_trades) < max_concurrent:
+            candidates.append(entry_index.next(row))
+        if open_trades:
+            ready = min(ready_rows[k] for k in open_trades)
+            candidates.append(exit_index.next(max(row, ready)))
+            candidates.append(min(expiry_rows[k] for k in open_trades))
+        candidates = [c for c in candidates if 0 <= c < n_rows]
+        if not candidates:
+            break
+        row = min(candidates)
+
+        if entry_routes[row] != 0 and len(open_trades) < max_concurrent:
+            entry_time = times[row]
+            # Status updates run before trading, so a position is never ready on its entry row
+            ready_row = int(np.searchsorted(times, entry_time + transfer_ns, side='left'))
+            expiry_row = int(np.searchsorted(times, entry_time + max_hold_ns, side='right'))
+            open_trades.append(len(entry_rows))
+            entry_rows.append(row)
+            ready_rows.append(max(ready_row, row + 1))
+            expiry_rows.append(max(expiry_row, row))
+            exit_rows.append(-1)
+            exit_reasons.append(EXIT_OPEN)
+        elif exits[row]:
+            for k in open_trades:
+                if ready_rows[k] <= row:
+                    exit_rows[k], exit_reasons[k] = row, EXIT_SIGNAL
+        for k in open_trades:
+            if exit_rows[k] < 0 and expiry_rows[k] <= row:
+                exit_rows[k], exit_reasons[k] = row, EXIT_EXPIRED
+        open_trades = [k for k in open_trades if exit_rows[k] < 0]
+        row += 1
+
+    entry_rows = np.asarray(entry_rows, dtype=np.int64)
+    exit_rows = np.asarray(exit_rows, dtype=np.int64)
+    routes = entry_routes[entry_rows]
+    a_to_b = routes == ROUTE_A_TO_B
+    closed = exit_rows >= 0
+    exit_at = np.where(closed, exit_rows, 0)
+
+    def at_exit(prices: np.ndarray) -> np.ndarray:
+        return np.where(closed, np.asarray(prices, dtype=np.float64)[exit_at], np.nan)
+
+    return HedgedTrades(
+        n_rows=n_rows,
+        routes=routes,
+        entry_rows=entry_rows,
+        ready_rows=np.minimum(np.asarray(ready_rows, dtype=np.int64), n_rows),
+        exit_rows=exit_rows,
+        exit_reasons=np.asarray(exit_reasons, dtype=np.int8),
+        source_spot_entry=np.where(a_to_b, np.asarray(spot_a_ask, dtype=np.float64)[entry_rows],
+                                   np.asarray(spot_b_ask, dtype=np.float64)[entry_rows]),
+        hedge_futures_entry=np.asarray(futures_bid, dtype=np.float64)[entry_rows],
+        dest_spot_exit=np.where(a_to_b, at_exit(spot_b_bid), at_exit(spot_a_bid)),
+        hedge_futures_exit=at_exit(futures_ask),
+    )
@@ -14,6 +14,7 @@ Key Features:
 - Auto-configuration: Smart data source selection
 """
 
+import asyncio
 import pandas as pd
 import numpy as np
 import time
@@ -25,10 +26,85 @@ from ..types.signal_types import Signal
 
 # Import strategy signal architecture
 from trading.strategies.base.strategy_signal_factory import create_strategy_signal, normalize_strategy_type
+from trading.signals_v2.optimization import ParallelParameterOptimizer
 
 # Ensure strategy registrations are loaded
 
 
+async def _run_strategy_backtest(df: pd.DataFrame,
+                                 strategy_type: str,
+                                 initial_capital: float,
+                                 **params) -> Dict[str, Any]:
+    """Run a single strategy backtest (shared by the backtester and optimizer workers)."""
+    try:
+        # Normalize strategy type
+        strategy_type = normalize_strategy_type(strategy_type)
+        
+        # Create strategy instance
+        strategy = create_strategy_signal(strategy_type, **params)
+        
+        # Preload strategy with historical data
+        await strategy.preload(df, **params)
+        
+        # Apply signals_v2 to backtest data (includes internal position tracking)
+        performance_metrics = strategy.backtest(df, **params)
+        
+        # Extract trades and performance data
+        trades = performance_metrics.get('completed_trades', [])
+        performance = {
+            'total_pnl_usd': performance_metrics.get('total_pnl_usd', 0.0),
+            'total_pnl_pct': performance_metrics.get('total_pnl_pct', 0.0),
+            'win_rate': performance_metrics.get('win_rate', 0.0),
+            'avg_trade_pnl': performance_metrics.get('total_pnl_usd', 0.0) / max(len(trades), 1),
+            'max_drawdown': performance_metrics.get('max_drawdown', 0.0),
+            'sharpe_ratio': performance_metrics.get('sharpe_ratio', 0.0)
+        }
+        
+        # Count signals_v2
+        signal_distribution = df_with_signals['signal'].value_counts().to_dict()
+        signal_dist_named = {
+            'ENTER': signal_distribution.get('enter', 0),
+            'EXIT': signal_distribution.get('exit', 0), 
+            'HOLD': signal_distribution.get('hold', 0) + signal_distribution.get(Signal.HOLD.value, 0)
+        }
+        
+        return {
+            'strategy_type': strategy_type,
+            'total_trades': len(trades),
+            'total_pnl_usd': performance['total_pnl_usd'],
+            'total_pnl_pct': performance['total_pnl_pct'],
+            'win_rate': performance['win_rate'],
+            'avg_trade_pnl': performance['avg_trade_pnl'],
+            'max_drawdown': performance['max_drawdown'],
+            'sharpe_ratio': performance['sharpe_ratio'],
+            'signal_distribution': signal_dist_named,
+            'final_balance': initial_capital + performance['total_pnl_usd'],
+            'current_position': performance_metrics.get('current_position')
+        }
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return {
+            'strategy_type': strategy_type,
+            'error': str(e),
+            'total_trades': 0,
+            'total_pnl_pct': 0.0,
+            'signal_distribution': {'ENTER': 0, 'EXIT': 0, 'HOLD': 0}
+        }
+
+
+class _StrategyTypeEvaluator:
+    """Picklable optimizer evaluator running _run_strategy_backtest in a worker process."""
+
+    def __init__(self, strategy_type: str, initial_capital: float):
+        self.strategy_type = strategy_type
+        self.initial_capital = initial_capital
+
+    def __call__(self, df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, Any]:
+        return asyncio.run(_run_strategy_backtest(df, self.strategy_type, self.initial_capital, **params))
+
+
 class VectorizedStrategyBacktester:
     """
     Modern Vectorized Strategy Backtester
@@ -199,63 +275,8 @@ class VectorizedStrategyBacktester:
         Returns:
             Backtest results
         """
-        try:
-            # Normalize strategy type
-            strategy_type = normalize_strategy_type(strategy_type)
-            
-            # Create strategy instance
-            strategy = create_strategy_signal(strategy_type, **params)
-            
-            # Preload strategy with historical data
-            await strategy.preload(df, **params)
-            
-            # Apply signals_v2 to backtest data (includes internal position tracking)
-            performance_metrics = strategy.backtest(df, **params)
-            
-            # Extract trades and performance data
-            trades = performance_metrics.get('completed_trades', [])
-            performance = {
-                'total_pnl_usd': performance_metrics.get('total_pnl_usd', 0.0),
-                'total_pnl_pct': performance_metrics.get('total_pnl_pct', 0.0),
-                'win_rate': performance_metrics.get('win_rate', 0.0),
-                'avg_trade_pnl': performance_metrics.get('total_pnl_usd', 0.0) / max(len(trades), 1),
-                'max_drawdown': performance_metrics.get('max_drawdown', 0.0),
-                'sharpe_ratio': performance_metrics.get('sharpe_ratio', 0.0)
-            }
-            
-            # Count signals_v2
-            signal_distribution = df_with_signals['signal'].value_counts().to_dict()
-            signal_dist_named = {
-                'ENTER': signal_distribution.get('enter', 0),
-                'EXIT': signal_distribution.get('exit', 0), 
-                'HOLD': signal_distribution.get('hold', 0) + signal_distribution.get(Signal.HOLD.value, 0)
-            }
-            
-            return {
-                'strategy_type': strategy_type,
-                'total_trades': len(trades),
-                'total_pnl_usd': performance['total_pnl_usd'],
-                'total_pnl_pct': performance['total_pnl_pct'],
-                'win_rate': performance['win_rate'],
-                'avg_trade_pnl': performance['avg_trade_pnl'],
-                'max_drawdown': performance['max_drawdown'],
-                'sharpe_ratio': performance['sharpe_ratio'],
-                'signal_distribution': signal_dist_named,
-                'final_balance': self.initial_capital + performance['total_pnl_usd'],
-                'current_position': performance_metrics.get('current_position')
-            }
-            
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            return {
-                'strategy_type': strategy_type,
-                'error': str(e),
-                'total_trades': 0,
-                'total_pnl_pct': 0.0,
-                'signal_distribution': {'ENTER': 0, 'EXIT': 0, 'HOLD': 0}
-            }
-    
+        return await _run_strategy_backtest(df, strategy_type, self.initial_capital, **params)
+
     async def _load_data_from_source_async(self, symbol: Symbol, days: int, start_date: Optional[datetime] = None) -> pd.DataFrame:
         """
         Load data from the configured data source (async version).
@@ -390,7 +411,8 @@ class VectorizedStrategyBacktester:
                                       param_ranges: Dict[str, list],
                                       days: int = 7,
                                       metric: str = 'total_pnl_pct',
-                                      max_combinations: int = 50) -> Dict[str, Any]:
+                                      max_combinations: int = 50,
+                                      max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Optimize strategy parameters using grid search.
         
@@ -401,6 +423,7 @@ class VectorizedStrategyBacktester:
             days: Number of days of data to use
             metric: Metric to optimize ('total_pnl_pct', 'win_rate', 'sharpe_ratio')
             max_combinations: Maximum parameter combinations to test
+            max_workers: Worker processes for evaluation (None = all cores, 1 = serial)
             
         Returns:
             Dictionary with optimization results
@@ -437,43 +460,45 @@ class VectorizedStrategyBacktester:
             best_result = None
             results = []
             
-            # Test each parameter combination
-            for i, combination in enumerate(combinations):
-                # Create parameter dictionary for this combination
-                test_params = dict(zip(param_names, combination))
-                
-                try:
-                    # Run backtest with these parameters
-                    result = await self.run_single_strategy_backtest(df, strategy_type, **test_params)
-                    
-                    if 'error' not in result:
-                        metric_value = result.get(metric, 0)
-                        
-                        # Check if this is the best result so far
-                        is_better = (
-                            metric_value > best_metric_value if metric in ['total_pnl_pct', 'win_rate', 'sharpe_ratio']
-                            else metric_value < best_metric_value
-                        )
-                        
-                        if is_better:
-                            best_metric_value = metric_value
-                            best_params = test_params.copy()
-                            best_result = result.copy()
-                        
-                        results.append({
-                            'params': test_params,
-                            'metric_value': metric_value,
-                            'result': result
-                        })
-                        
-                        # Progress update
-                        if (i + 1) % 10 == 0 or i == len(combinations) - 1:
-                            print(f"   Progress: {i + 1}/{len(combinations)} combinations tested")
-                    
-                except Exception as e:
-                    print(f"   ⚠️ Error testing combination {i + 1}: {e}")
+            # Test parameter combinations across worker processes (df published once to shared memory)
+            optimizer = ParallelParameterOptimizer(
+                _StrategyTypeEvaluator(strategy_type, self.initial_capital), max_workers=max_workers
+            )
+            evaluations = await optimizer.evaluate_async(df, [dict(zip(param_names, c)) for c in combinations])
+
+            # Evaluations are in combination order, so ties resolve like the serial loop
+            for i, evaluation in enumerate(evaluations):
+                test_params = evaluation.params
+                result = evaluation.result
+
+                if not evaluation.ok:
+                    print(f"   ⚠️ Error testing combination {i + 1}: {evaluation.error}")
                     continue
-            
+
+                if 'error' not in result:
+                    metric_value = result.get(metric, 0)
+
+                    # Check if this is the best result so far
+                    is_better = (
+                        metric_value > best_metric_value if metric in ['total_pnl_pct', 'win_rate', 'sharpe_ratio']
+                        else metric_value < best_metric_value
+                    )
+
+                    if is_better:
+                        best_metric_value = metric_value
+                        best_params = test_params.copy()
+                        best_result = result.copy()
+
+                    results.append({
+                        'params': test_params,
+                        'metric_value': metric_value,
+                        'result': result
+                    })
+
+                    # Progress update
+                    if (i + 1) % 10 == 0 or i == len(combinations) - 1:
+                        print(f"   Progress: {i + 1}/{len(combinations)} combinations tested")
+
             if not results:
                 return {
                     'error': 'No successful parameter combinations found',
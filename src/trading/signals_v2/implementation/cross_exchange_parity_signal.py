@@ -26,6 +26,7 @@ from exchanges.structs import Symbol, BookTicker, Fees
 from exchanges.structs.enums import ExchangeEnum, Side
 from infrastructure.logging import HFTLoggerInterface, get_logger
 from trading.signals_v2.entities import PositionEntry, TradeEntry, PerformanceMetrics, BacktestingParams
+from trading.signals_v2.position_simulation import PositionSimulation, simulate_positions
 from trading.signals_v2.strategy_signal import StrategySignal
 from trading.data_sources.column_utils import get_column_key
 
@@ -88,6 +89,7 @@ class CrossExchangeParitySignal(StrategySignal):
         # Position tracking
         self.position: Optional[PositionEntry] = PositionEntry(entry_time=datetime.now(UTC))
         self.historical_positions: List[PositionEntry] = []
+        self.simulation: Optional[PositionSimulation] = None
         
         # Analysis results for reporting
         self.analysis_results = {}
@@ -182,127 +184,87 @@ class CrossExchangeParitySignal(StrategySignal):
         
         return df.copy()
     
-    def _check_time_exit(self, current_time, entry_time) -> bool:
-        """Check if position should be exited due to time limits."""
-        if entry_time is None:
-            return False
-            
-        hold_time = (current_time - entry_time).total_seconds() / 60
-        return hold_time >= self.params['max_position_time_minutes']
-    
-    def _check_min_hold_time(self, current_time, entry_time) -> bool:
-        """Check if minimum hold time has passed."""
-        if entry_time is None:
-            return True
-            
-        hold_time = (current_time - entry_time).total_seconds() / 60
-        return hold_time >= self.params['min_hold_time_minutes']
-    
     def _emulate_parity_trading(self, df: pd.DataFrame) -> None:
-        """Emulate parity trading using vectorized approach."""
-        
-        # Track position state
-        position_active = False
-        entry_time = None
-        daily_position_count = 0
-        last_trade_date = None
+        """Emulate parity trading with the shared position simulation kernel."""
         
-        # Find signal changes for efficient processing
+        # Signals are only acted on where they change, and only on rows with complete prices
         signal_changes = (
             df['parity_entry_signal'].ne(df['parity_entry_signal'].shift()) |
             df['exit_signal'].ne(df['exit_signal'].shift())
+        ).to_numpy()
+        price_cols = [self.col_mexc_bid, self.col_mexc_ask, self.col_gateio_futures_bid, self.col_gateio_futures_ask]
+        valid_prices = df[price_cols].notna().all(axis=1).to_numpy()
+        
+        # Entries need a clear direction
+        entries = (df['parity_entry_signal'] & (df['mexc_higher'] | df['futures_higher'])).to_numpy()
+        
+        simulation = simulate_positions(
+            entries,
+            df['exit_signal'].to_numpy(),
+            df.index,
+            evaluate=signal_changes & valid_prices,
+            min_hold=pd.Timedelta(minutes=self.params['min_hold_time_minutes']),
+            max_hold=pd.Timedelta(minutes=self.params['max_position_time_minutes']),
+            max_entries_per_day=int(self.params['max_daily_positions'])
         )
-        signal_points = df[signal_changes].copy()
+        self.simulation = simulation
         
-        for idx, row in signal_points.iterrows():
-            current_time = idx
-            current_date = current_time.date() if hasattr(current_time, 'date') else None
+        for entry_row, exit_row in zip(simulation.entry_rows, simulation.exit_rows):
+            self._open_parity_position(df.index[entry_row], df.iloc[entry_row])
+            if exit_row >= 0:
+                self._close_parity_position(df.index[exit_row], df.iloc[exit_row])
+    
+    def _open_parity_position(self, current_time, row) -> None:
+        """Open parity position in the direction of the divergence."""
+        if row['mexc_higher']:  # Sell MEXC (higher), buy futures (lower)
+            # Use average price for quantity to ensure equal quantities
+            avg_price = (row[self.col_mexc_bid] + row[self.col_gateio_futures_ask]) / 2
+            qty = self.params['position_size_usd'] / avg_price
             
-            # Data validation: Skip rows with NaN prices
-            required_prices = [
-                row[self.col_mexc_bid], row[self.col_mexc_ask],
-                row[self.col_gateio_futures_bid], row[self.col_gateio_futures_ask]
+            trades = [
+                TradeEntry(
+                    exchange=ExchangeEnum.MEXC,
+                    side=Side.SELL,
+                    price=row[self.col_mexc_bid],
+                    qty=qty,
+                    fee_pct=self.fees.get(ExchangeEnum.MEXC, Fees()).taker_fee,
+                    slippage_pct=self._backtesting_params.slippage_pct
+                ),
+                TradeEntry(
+                    exchange=ExchangeEnum.GATEIO_FUTURES,
+                    side=Side.BUY,
+                    price=row[self.col_gateio_futures_ask],
+                    qty=qty,
+                    fee_pct=self.fees.get(ExchangeEnum.GATEIO_FUTURES, Fees()).taker_fee,
+                    slippage_pct=self._backtesting_params.slippage_pct
+                )
             ]
-            if pd.isna(required_prices).any():
-                continue  # Skip this row if any required price is NaN
-            
-            # Reset daily counter
-            if last_trade_date != current_date:
-                daily_position_count = 0
-                last_trade_date = current_date
+        else:  # Buy MEXC (lower), sell futures (higher)
+            # Use average price for quantity to ensure equal quantities
+            avg_price = (row[self.col_mexc_ask] + row[self.col_gateio_futures_bid]) / 2
+            qty = self.params['position_size_usd'] / avg_price
             
-            # Entry logic
-            if (not position_active and 
-                row['parity_entry_signal'] and 
-                daily_position_count < self.params['max_daily_positions']):
-                
-                # Determine direction and create trades
-                if row['mexc_higher']:  # Sell MEXC (higher), buy futures (lower)
-                    # Use average price for quantity to ensure equal quantities
-                    avg_price = (row[self.col_mexc_bid] + row[self.col_gateio_futures_ask]) / 2
-                    qty = self.params['position_size_usd'] / avg_price
-                    
-                    trades = [
-                        TradeEntry(
-                            exchange=ExchangeEnum.MEXC,
-                            side=Side.SELL,
-                            price=row[self.col_mexc_bid],
-                            qty=qty,
-                            fee_pct=self.fees.get(ExchangeEnum.MEXC, Fees()).taker_fee,
-                            slippage_pct=self._backtesting_params.slippage_pct
-                        ),
-                        TradeEntry(
-                            exchange=ExchangeEnum.GATEIO_FUTURES,
-                            side=Side.BUY,
-                            price=row[self.col_gateio_futures_ask],
-                            qty=qty,
-                            fee_pct=self.fees.get(ExchangeEnum.GATEIO_FUTURES, Fees()).taker_fee,
-                            slippage_pct=self._backtesting_params.slippage_pct
-                        )
-                    ]
-                elif row['futures_higher']:  # Buy MEXC (lower), sell futures (higher)
-                    # Use average price for quantity to ensure equal quantities
-                    avg_price = (row[self.col_mexc_ask] + row[self.col_gateio_futures_bid]) / 2
-                    qty = self.params['position_size_usd'] / avg_price
-                    
-                    trades = [
-                        TradeEntry(
-                            exchange=ExchangeEnum.MEXC,
-                            side=Side.BUY,
-                            price=row[self.col_mexc_ask],
-                            qty=qty,
-                            fee_pct=self.fees.get(ExchangeEnum.MEXC, Fees()).taker_fee,
-                            slippage_pct=self._backtesting_params.slippage_pct
-                        ),
-                        TradeEntry(
-                            exchange=ExchangeEnum.GATEIO_FUTURES,
-                            side=Side.SELL,
-                            price=row[self.col_gateio_futures_bid],
-                            qty=qty,
-                            fee_pct=self.fees.get(ExchangeEnum.GATEIO_FUTURES, Fees()).taker_fee,
-                            slippage_pct=self._backtesting_params.slippage_pct
-                        )
-                    ]
-                else:
-                    continue  # No clear direction
-                
-                # Execute entry trades
-                self.position.add_arbitrage_trade(current_time, trades)
-                position_active = True
-                entry_time = current_time
-                daily_position_count += 1
-                
-            # Exit logic
-            elif (position_active and 
-                  (row['exit_signal'] or 
-                   self._check_time_exit(current_time, entry_time))):
-                
-                # Check minimum hold time
-                if self._check_min_hold_time(current_time, entry_time):
-                    # Close position (reverse trades)
-                    self._close_parity_position(current_time, row)
-                    position_active = False
-                    entry_time = None
+            trades = [
+                TradeEntry(
+                    exchange=ExchangeEnum.MEXC,
+                    side=Side.BUY,
+                    price=row[self.col_mexc_ask],
+                    qty=qty,
+                    fee_pct=self.fees.get(ExchangeEnum.MEXC, Fees()).taker_fee,
+                    slippage_pct=self._backtesting_params.slippage_pct
+                ),
+                TradeEntry(
+                    exchange=ExchangeEnum.GATEIO_FUTURES,
+                    side=Side.SELL,
+                    price=row[self.col_gateio_futures_bid],
+                    qty=qty,
+                    fee_pct=self.fees.get(ExchangeEnum.GATEIO_FUTURES, Fees()).taker_fee,
+                    slippage_pct=self._backtesting_params.slippage_pct
+                )
+            ]
+        
+        # Execute entry trades
+        self.position.add_arbitrage_trade(current_time, trades)
     
     def _close_parity_position(self, current_time, row) -> None:
         """Close parity position with appropriate trades."""
@@ -16,6 +16,7 @@ from exchanges.structs.common import Symbol, AssetName
 from exchanges.structs.enums import ExchangeEnum, KlineInterval
 from trading.data_sources.candles_loader import CandlesLoader
 from trading.signals_v2.entities import PositionEntry, TradeEntry, PerformanceMetrics
+from trading.signals_v2.position_simulation import scan_first, simulate_positions
 from trading.signals_v2.report_utils import generate_generic_report
 
 @dataclass
@@ -289,6 +290,28 @@ class HedgedMomentumSignal:
             
         return None
         
+    def _exit_reasons(self, hold_time: float, pnl_pct: float, momentum_exhausted: bool) -> List[str]:
+        """Exit reasons for a position (empty list = keep holding)."""
+        exit_reasons = []
+        
+        # Time-based exit
+        if hold_time >= self.params.max_position_time_minutes:
+            exit_reasons.append(f"Max hold time reached: {hold_time:.1f}min")
+            
+        # Profit taking
+        if pnl_pct >= self.params.take_profit_pct:
+            exit_reasons.append(f"Take profit hit: {pnl_pct:.2f}%")
+            
+        # Stop loss
+        if pnl_pct <= -self.params.stop_loss_pct:
+            exit_reasons.append(f"Stop loss hit: {pnl_pct:.2f}%")
+            
+        # Momentum reversal
+        if momentum_exhausted:
+            exit_reasons.append("Momentum exhausted")
+        
+        return exit_reasons
+        
     def check_exit_conditions(self, position: HedgedPosition, current_time: datetime = None) -> Optional[Dict]:
         """Check if position should be exited."""
         
@@ -375,24 +398,8 @@ class HedgedMomentumSignal:
         pnl_pct = (total_pnl / total_invested) * 100
         
         # Exit conditions
-        exit_reasons = []
-        
-        # Time-based exit
-        if hold_time >= self.params.max_position_time_minutes:
-            exit_reasons.append(f"Max hold time reached: {hold_time:.1f}min")
-            
-        # Profit taking
-        if pnl_pct >= self.params.take_profit_pct:
-            exit_reasons.append(f"Take profit hit: {pnl_pct:.2f}%")
-            
-        # Stop loss
-        if pnl_pct <= -self.params.stop_loss_pct:
-            exit_reasons.append(f"Stop loss hit: {pnl_pct:.2f}%")
-            
-        # Momentum reversal
         momentum_signal = self.momentum_signals.get(position.spot_exchange, {})
-        if momentum_signal.get("signal") == "HOLD":
-            exit_reasons.append("Momentum exhausted")
+        exit_reasons = self._exit_reasons(hold_time, pnl_pct, momentum_signal.get("signal") == "HOLD")
             
         if exit_reasons:
             return {
@@ -416,102 +423,137 @@ class HedgedMomentumSignal:
         # Get historical data
         await self.update_market_data(symbol, hours)
         
+        return self.backtest_price_data(symbol, hours)
+        
+    @staticmethod
+    def _position_pnl(spot_entry: float, futures_entry: float, spot_qty: float, futures_qty: float,
+                      spot_price: np.ndarray, futures_price: np.ndarray) -> Tuple[np.ndarray, np.ndarray,
+                                                                                  np.ndarray, np.ndarray]:
+        """
+        Vectorized check_exit_conditions P&L for a long spot / short futures position.
+        
+        Returns:
+            Tuple of (spot prices, futures prices, P&L USD, P&L %) with unrealistic
+            prices (spot outside 0.5x-2x of entry) replaced by the entry prices
+        """
+        unrealistic = (spot_price < spot_entry * 0.5) | (spot_price > spot_entry * 2.0)
+        spot_price = np.where(unrealistic, spot_entry, spot_price)
+        futures_price = np.where(unrealistic, futures_entry, futures_price)
+        
+        spot_pnl = (spot_price - spot_entry) * spot_qty
+        futures_pnl = (futures_entry - futures_price) * futures_qty
+        total_pnl = spot_pnl + futures_pnl
+        pnl_pct = (total_pnl / (spot_entry * spot_qty)) * 100
+        return spot_price, futures_price, total_pnl, pnl_pct
+        
+    def backtest_price_data(self, symbol: Symbol, hours: int) -> Tuple[PerformanceMetrics, List[Dict]]:
+        """
+        Backtest on the loaded price data with the shared position simulation kernel.
+        
+        Evaluates the same minute grid as the live logic: indicators are
+        computed once (rolling windows only look back, so each minute sees the
+        values it would have computed from its own history), entries need both
+        exchanges to have momentum_lookback candles, and the daily position
+        limit applies per backtest day.
+        
+        Returns:
+            Tuple of (PerformanceMetrics, trade records)
+        """
         # Initialize backtesting
         trades = []
-        positions = []
-        equity_curve = []
         
         # Get the common time range across all exchanges
-        mexc_data = self.price_data[ExchangeEnum.MEXC]
-        futures_data = self.price_data[ExchangeEnum.GATEIO_FUTURES]
+        mexc_data = self._calculate_indicators(self.price_data[ExchangeEnum.MEXC].copy())
+        futures_data = self._calculate_indicators(self.price_data[ExchangeEnum.GATEIO_FUTURES].copy())
         
         start_time = max(mexc_data.index.min(), futures_data.index.min())
         end_time = min(mexc_data.index.max(), futures_data.index.max())
         
         print(f"INFO: Backtest period: {start_time} to {end_time}")
         
-        # Simulate trading on minute-by-minute basis
-        current_time = start_time
-        current_positions = {}
-        
-        while current_time <= end_time:
-            # Update to current time slice
-            for exchange in [ExchangeEnum.MEXC, ExchangeEnum.GATEIO_FUTURES]:
-                if exchange in self.price_data:
-                    current_data = self.price_data[exchange].loc[:current_time]
-                    if len(current_data) >= self.params.momentum_lookback:
-                        # Recalculate indicators up to current time
-                        current_df = current_data.copy()
-                        current_df = self._calculate_indicators(current_df)
-                        self.momentum_signals[exchange] = self._analyze_momentum(current_df)
-            
-            # Check for new entry signals
-            if len(current_positions) == 0:  # Only one position at a time for simplicity
-                entry_signal = self.generate_entry_signal(symbol, current_time)
-                
-                if entry_signal:
-                    # Create hedged position - LONG spot only (spot market constraints)
-                    # We BUY spot assets and HEDGE with SHORT futures position
-                    position = HedgedPosition(
-                        entry_time=current_time,
-                        symbol=symbol,
-                        spot_exchange=entry_signal["spot_exchange"],
-                        spot_side="long",  # Always LONG in spot (BUY assets)
-                        spot_price=entry_signal["spot_price"],
-                        spot_quantity=entry_signal["spot_size_usd"] / entry_signal["spot_price"],
-                        futures_exchange=entry_signal["futures_exchange"],
-                        futures_side="short",  # Always SHORT futures (hedge the spot position)
-                        futures_price=entry_signal["futures_price"],
-                        futures_quantity=entry_signal["futures_size_usd"] / entry_signal["futures_price"],
-                        hedge_ratio=entry_signal["hedge_ratio"]
-                    )
-                    
-                    current_positions[f"pos_{len(positions)}"] = position
-                    self.daily_position_count += 1
-                    
-                    print(f"INFO: Entered hedged position at {current_time}: {entry_signal['direction']} "
-                          f"spot@{entry_signal['spot_price']:.4f}, "
-                          f"hedge@{entry_signal['futures_price']:.4f}")
-            
-            # Check exit conditions for existing positions
-            positions_to_close = []
-            for pos_id, position in current_positions.items():
-                exit_signal = self.check_exit_conditions(position, current_time)
-                
-                if exit_signal:
-                    positions_to_close.append((pos_id, exit_signal))
-                    
-            # Close positions
-            for pos_id, exit_signal in positions_to_close:
-                position = exit_signal["position"]
-                
-                # Create trade record
-                trade = {
-                    "entry_time": position.entry_time,
-                    "exit_time": current_time,
-                    "symbol": str(symbol),
-                    "direction": position.spot_side,
-                    "spot_entry": position.spot_price,
-                    "spot_exit": exit_signal["spot_price"],
-                    "futures_entry": position.futures_price,
-                    "futures_exit": exit_signal["futures_price"],
-                    "pnl_usd": exit_signal["pnl_usd"],
-                    "pnl_pct": exit_signal["pnl_pct"],
-                    "hold_time": exit_signal["hold_time_minutes"],
-                    "exit_reason": ", ".join(exit_signal["reasons"])
-                }
-                
-                trades.append(trade)
-                positions.append(position)
-                del current_positions[pos_id]
-                exit_spot = exit_signal["spot_price"]
-                exit_futures = exit_signal["futures_price"]
-                print(f"INFO: Closed position: P&L=${exit_signal['pnl_usd']:.2f} "
-                      f"spot @ {exit_spot} futures @ {exit_futures} "
-                      f"({exit_signal['pnl_pct']:.2f}%) in {exit_signal['hold_time_minutes']:.1f}min")
-            
-            # Move to next minute
-            current_time += pd.Timedelta(minutes=1)
+        # Minute grid with the latest candle at or before each minute
+        grid = pd.date_range(start_time, end_time, freq='1min')
+        mexc_rows = mexc_data.index.get_indexer(grid, method='ffill')
+        futures_rows = futures_data.index.get_indexer(grid, method='ffill')
+        
+        spot_close = mexc_data['close'].to_numpy(dtype=np.float64)[mexc_rows]
+        futures_close = futures_data['close'].to_numpy(dtype=np.float64)[futures_rows]
+        volatility = mexc_data['volatility'].to_numpy(dtype=np.float64)[mexc_rows]
+        momentum = mexc_data['momentum'].to_numpy(dtype=np.float64)[mexc_rows]
+        rsi = mexc_data['rsi'].to_numpy(dtype=np.float64)[mexc_rows]
+        price_vs_sma = mexc_data['price_vs_sma'].to_numpy(dtype=np.float64)[mexc_rows]
+        
+        # _analyze_momentum LONG signal - LONG only (spot market constraints)
+        mexc_ready = mexc_rows + 1 >= self.params.momentum_lookback
+        futures_ready = futures_rows + 1 >= self.params.momentum_lookback
+        long_signal = (mexc_ready &
+                       (momentum > self.params.momentum_threshold) &
+                       (rsi > 50) & (rsi < self.params.rsi_overbought) &
+                       (price_vs_sma > 1.0))
+        momentum_exhausted = ~long_signal
+        
+        entries: Dict[int, Tuple[float, float]] = {}
+        
+        def find_exit(entry_row: int, start_row: int) -> int:
+            # Position sizes at entry
+            hedge_ratio = self._calculate_hedge_ratio(volatility[entry_row])
+            spot_qty = self.params.position_size_usd / spot_close[entry_row]
+            futures_qty = self.params.position_size_usd * hedge_ratio / futures_close[entry_row]
+            entries[entry_row] = (hedge_ratio, futures_qty)
+            
+            def exit_hit(a: int, b: int) -> np.ndarray:
+                _, _, _, pnl_pct = self._position_pnl(spot_close[entry_row], futures_close[entry_row],
+                                                      spot_qty, futures_qty, spot_close[a:b], futures_close[a:b])
+                return ((pnl_pct >= self.params.take_profit_pct) |
+                        (pnl_pct <= -self.params.stop_loss_pct) |
+                        momentum_exhausted[a:b])
+            
+            return scan_first(exit_hit, start_row, len(grid))
+        
+        simulation = simulate_positions(
+            long_signal & futures_ready,
+            find_exit,
+            grid,
+            max_hold=pd.Timedelta(minutes=self.params.max_position_time_minutes),
+            exit_on_entry_row=True,
+            max_entries_per_day=self.params.max_daily_positions
+        )
+        
+        for entry_row, exit_row in zip(simulation.entry_rows, simulation.exit_rows):
+            entry_time = grid[entry_row]
+            hedge_ratio, futures_qty = entries[entry_row]
+            print(f"INFO: Entered hedged position at {entry_time}: LONG "
+                  f"spot@{spot_close[entry_row]:.4f}, "
+                  f"hedge@{futures_close[entry_row]:.4f}")
+            if exit_row < 0:
+                break
+            
+            spot_qty = self.params.position_size_usd / spot_close[entry_row]
+            exit_spot, exit_futures, pnl_usd, pnl_pct = (
+                float(v[0]) for v in self._position_pnl(
+                    spot_close[entry_row], futures_close[entry_row], spot_qty, futures_qty,
+                    spot_close[exit_row:exit_row + 1], futures_close[exit_row:exit_row + 1]))
+            hold_time = (grid[exit_row] - entry_time).total_seconds() / 60
+            reasons = self._exit_reasons(hold_time, pnl_pct, bool(momentum_exhausted[exit_row]))
+            
+            # Create trade record
+            trades.append({
+                "entry_time": entry_time,
+                "exit_time": grid[exit_row],
+                "symbol": str(symbol),
+                "direction": "long",
+                "spot_entry": spot_close[entry_row],
+                "spot_exit": exit_spot,
+                "futures_entry": futures_close[entry_row],
+                "futures_exit": exit_futures,
+                "pnl_usd": pnl_usd,
+                "pnl_pct": pnl_pct,
+                "hold_time": hold_time,
+                "exit_reason": ", ".join(reasons)
+            })
+            print(f"INFO: Closed position: P&L=${pnl_usd:.2f} "
+                  f"spot @ {exit_spot} futures @ {exit_futures} "
+                  f"({pnl_pct:.2f}%) in {hold_time:.1f}min")
             
         # Calculate performance metrics
         if trades:
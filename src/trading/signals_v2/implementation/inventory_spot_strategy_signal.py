@@ -19,6 +19,7 @@ from trading.signals.types import Signal
 from exchanges.structs.enums import ExchangeEnum, Side
 from numbers import Number
 from trading.signals_v2.entities import PerformanceMetrics, TradeEntry, PositionEntry, BacktestingParams
+from trading.signals_v2.position_simulation import PositionSimulation, simulate_positions
 from trading.signals_v2.strategy_signal import StrategySignal
 from trading.data_sources.column_utils import get_column_key
 import numpy as np
@@ -47,14 +48,14 @@ class ArbitrageLegType(Struct):
     is_market: bool
 
 
-type ArbitrageSignalType = Literal['both_market', 'limit_mexc', 'limit_gateio']
-type InventorySpreadDirectionType = Literal[
+ArbitrageSignalType = Literal['both_market', 'limit_mexc', 'limit_gateio']
+InventorySpreadDirectionType = Literal[
     'mexc_to_gateio', 'gateio_to_mexc',
     'mexc_to_gateio_fut', 'gateio_fut_to_mexc',
     'gateio_to_gateio_fut', 'gateio_fut_to_gateio']
 
 
-type ExchangeSideAllowanceType = Dict[ExchangeEnum, Dict[Side, bool]]
+ExchangeSideAllowanceType = Dict[ExchangeEnum, Dict[Side, bool]]
 
 
 class ArbitrageSetup(Struct):
@@ -181,7 +182,7 @@ class InventorySpreadStats(Struct):
         )
 
 
-type InventorySignalPairType = Dict[ExchangeEnum, ArbitrageLegType]  # (side, is_market_order)
+InventorySignalPairType = Dict[ExchangeEnum, ArbitrageLegType]  # (side, is_market_order)
 
 
 class InventorySpotStrategySignal(StrategySignal):
@@ -279,6 +280,7 @@ class InventorySpotStrategySignal(StrategySignal):
         self._history_index = 0
 
         self.position: Optional[PositionEntry] = PositionEntry(entry_time=datetime.now(UTC))
+        self.simulation: Optional[PositionSimulation] = None
         self.historical_positions: List[PositionEntry] = []
 
         self._last_update_time: datetime = datetime.now(UTC)
@@ -373,49 +375,55 @@ class InventorySpotStrategySignal(StrategySignal):
         df.loc[idx:, [self.col_mexc_balance, self.col_gateio_balance]] = balances
         # df.loc[idx:, self.col_gateio_balance] = self.position.balances[ExchangeEnum.GATEIO]
 
-    def _update_transfer_in_progress(self, df: pd.DataFrame, idx: pd.Timestamp):
-        transfer_to = idx + pd.Timedelta(minutes=self._backtesting_params.transfer_delay_minutes)
-
-        # Method 1: Using searchsorted (fastest for sorted DatetimeIndex)
-        transfer_idx = df.index.searchsorted(transfer_to, side='left')
-        if transfer_idx < len(df):
-            actual_idx = df.index[transfer_idx]
-            df.loc[idx:actual_idx, 'transfer_in_progress'] = True
-        else:
-            # transfer_to is beyond the end of the dataframe
-            df.loc[idx:, 'transfer_in_progress'] = True
-
     def _emulate_trading(self, df: pd.DataFrame) -> None:
         """
         Internal vectorized position tracking for backtesting.
 
         Processes signal changes and manages positions/trades internally.
-        This replaces the external PositionTracker.track_positions_vectorized() method.
+        Each arbitrage sells the whole inventory on the exchange holding it and
+        transfers it back, so the inventory never changes exchange; only the
+        direction selling from that exchange trades, and no signal is processed
+        while the transfer is in progress.
 
         Args:
             df: DataFrame with signal column added
         """
-        # Reset state for fresh backtest
-
         # Find signal changes
         profit_cols = ['mexc_to_gateio_signal', 'gateio_to_mexc_signal']
-        changes_mask = df[profit_cols].ne(df[profit_cols].shift()).any(axis=1)
-        signal_points = df[changes_mask].copy()
-
-        for idx, row in signal_points.iterrows():
-            if self.position and df.loc[idx, 'transfer_in_progress']:
-                continue  # Skip processing during transfer
+        changes_mask = df[profit_cols].ne(df[profit_cols].shift()).any(axis=1).to_numpy()
+
+        mexc_qty = df[self.col_mexc_balance].iloc[0]
+        gateio_qty = df[self.col_gateio_balance].iloc[0]
+        mexc_to_gateio = df['mexc_to_gateio_signal'].to_numpy()
+        if mexc_qty != 0:
+            direction, qty = 'mexc_to_gateio', mexc_qty
+            entries = changes_mask & mexc_to_gateio
+        elif gateio_qty != 0:
+            # A MEXC-to-Gate.io signal takes precedence and finds no MEXC balance
+            direction, qty = 'gateio_to_mexc', gateio_qty
+            entries = changes_mask & ~mexc_to_gateio & df['gateio_to_mexc_signal'].to_numpy()
+        else:
+            return
 
-            if row['mexc_to_gateio_signal']:
-                qty = df.loc[idx, self.col_mexc_balance]
-                if qty == 0:
-                    continue
+        # Each trade blocks signals until the first row at or after the transfer completes
+        simulation = simulate_positions(
+            entries & ~df['transfer_in_progress'].to_numpy(dtype=bool),
+            None,
+            df.index,
+            max_hold=pd.Timedelta(minutes=self._backtesting_params.transfer_delay_minutes),
+            exit_on_entry_row=True
+        )
+        self.simulation = simulation
+        df['transfer_in_progress'] = df['transfer_in_progress'].to_numpy(dtype=bool) | simulation.position.astype(bool)
 
+        for row in simulation.entry_rows:
+            idx = df.index[row]
+            if direction == 'mexc_to_gateio':
                 self.position.add_arbitrage_trade(idx, [
                     TradeEntry(
                         exchange=ExchangeEnum.MEXC,
                         side=Side.SELL,  # ✅ SELL on MEXC (higher price)
-                        price=row[self.col_mexc_bid],
+                        price=df[self.col_mexc_bid].iat[row],
                         qty=qty,
                         fee_pct=self.fees.get(ExchangeEnum.MEXC).taker_fee,
                         slippage_pct=self._backtesting_params.slippage_pct
@@ -423,7 +431,7 @@ class InventorySpotStrategySignal(StrategySignal):
                     TradeEntry(
                         exchange=ExchangeEnum.GATEIO,
                         side=Side.BUY,  # ✅ BUY on Gate.io (lower price)
-                        price=row[self.col_gateio_ask],
+                        price=df[self.col_gateio_ask].iat[row],
                         qty=qty,
                         fee_pct=self.fees.get(ExchangeEnum.GATEIO).taker_fee,
                         slippage_pct=self._backtesting_params.slippage_pct
@@ -437,19 +445,12 @@ class InventorySpotStrategySignal(StrategySignal):
                     ExchangeEnum.MEXC,
                     self._backtesting_params.transfer_fee_usd
                 )
-                self._update_transfer_in_progress(df, idx)
-
-                self._update_df_balance(df, idx)
-            elif row['gateio_to_mexc_signal']:
-                qty = df.loc[idx, self.col_gateio_balance]
-                if qty == 0:
-                    continue
-
+            else:
                 self.position.add_arbitrage_trade(idx, [
                     TradeEntry(
                         exchange=ExchangeEnum.GATEIO,
                         side=Side.SELL,  # ✅ SELL on Gate.io (higher price)
-                        price=row[self.col_gateio_bid],
+                        price=df[self.col_gateio_bid].iat[row],
                         qty=qty,
                         fee_pct=self.fees.get(ExchangeEnum.MEXC).taker_fee,
                         slippage_pct=self._backtesting_params.slippage_pct
@@ -457,7 +458,7 @@ class InventorySpotStrategySignal(StrategySignal):
                     TradeEntry(
                         exchange=ExchangeEnum.MEXC,
                         side=Side.BUY,  # ✅ BUY on MEXC (lower price)
-                        price=row[self.col_mexc_ask],
+                        price=df[self.col_mexc_ask].iat[row],
                         qty=qty,
                         fee_pct=self.fees.get(ExchangeEnum.GATEIO).taker_fee,
                         slippage_pct=self._backtesting_params.slippage_pct
@@ -471,9 +472,6 @@ class InventorySpotStrategySignal(StrategySignal):
                     ExchangeEnum.GATEIO,
                     self._backtesting_params.transfer_fee_usd
                 )
-                self._update_transfer_in_progress(df, idx)
-
-                self._update_df_balance(df, idx)
 
     def get_live_signal(self, mexc_buy: float, mexc_sell: float, gateio_buy: float, gateio_sell: float,
                         gateio_fut_buy: float, gateio_fut_sell) -> Tuple[
@@ -25,6 +25,7 @@ from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+from trading.analysis.rolling_quantile import RollingQuantile, rolling_window_stats
 from trading.signals_v2.strategy_signal import StrategySignal
 from trading.signals_v2.entities import (
     PerformanceMetrics, ArbitrageTrade, TradeEntry, PositionEntry,
@@ -463,23 +464,105 @@ class MexcGateioFuturesArbitrageSignal(StrategySignal):
         df_result['exit_signal'] = False
         df_result['favorable_direction'] = 'none'
         
-        # Process each timestamp to build up historical data and generate signals
-        for i, (timestamp, row) in enumerate(df_result.iterrows()):
-            # Calculate spread metrics for current timestamp
-            spread_metrics = self.calculate_spread_metrics(df_result.iloc[:i+1], timestamp)
-            
-            # Apply signals
-            df_result.loc[timestamp, 'entry_signal'] = spread_metrics.entry_signal
-            df_result.loc[timestamp, 'exit_signal'] = spread_metrics.exit_signal
-            df_result.loc[timestamp, 'favorable_direction'] = spread_metrics.favorable_direction
-            
-            # Add percentile information
-            df_result.loc[timestamp, 'mexc_to_fut_percentile'] = spread_metrics.mexc_to_gateio_fut_percentile
-            df_result.loc[timestamp, 'fut_to_mexc_percentile'] = spread_metrics.gateio_fut_to_mexc_percentile
-            df_result.loc[timestamp, 'volatility'] = spread_metrics.volatility
+        # Incremental equivalent of calling calculate_spread_metrics() row by row:
+        # rolling windows continue from (and update) the instance spread history
+        metrics = self._calculate_spread_metrics_batch(df_result)
+        
+        # Apply signals
+        df_result['entry_signal'] = metrics['entry_signal']
+        df_result['exit_signal'] = metrics['exit_signal']
+        df_result['favorable_direction'] = metrics['favorable_direction']
+        
+        # Add percentile information
+        df_result['mexc_to_fut_percentile'] = metrics['mexc_to_fut_percentile']
+        df_result['fut_to_mexc_percentile'] = metrics['fut_to_mexc_percentile']
+        df_result['volatility'] = metrics['volatility']
         
         return df_result
 
+    def _calculate_spread_metrics_batch(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Vectorized calculate_spread_metrics() for every row of a DataFrame.
+        
+        Uses RollingQuantile windows seeded with the current spread history, so
+        each row costs O(log W) instead of re-sorting the whole history.
+        Rows with missing prices get neutral metrics and do not enter the history.
+        
+        Args:
+            df: DataFrame with MEXC spot and Gate.io futures price columns
+            
+        Returns:
+            Dictionary of per-row arrays matching SpreadMetrics fields
+        """
+        n = len(df)
+        mexc_bid = df[self.col_mexc_bid].to_numpy(dtype=np.float64)
+        mexc_ask = df[self.col_mexc_ask].to_numpy(dtype=np.float64)
+        gateio_fut_bid = df[self.col_gateio_fut_bid].to_numpy(dtype=np.float64)
+        gateio_fut_ask = df[self.col_gateio_fut_ask].to_numpy(dtype=np.float64)
+        
+        valid = (mexc_bid > 0) & (mexc_ask > 0) & (gateio_fut_bid > 0) & (gateio_fut_ask > 0)
+        
+        total_fees = (self.fee_structure.mexc_spot_taker_fee + 
+                     self.fee_structure.gateio_futures_taker_fee)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mexc_to_fut_spread = ((gateio_fut_bid - mexc_ask) / mexc_ask) - total_fees
+            fut_to_mexc_spread = ((mexc_bid - gateio_fut_ask) / gateio_fut_ask) - total_fees
+        
+        # Rolling windows continue from the existing history (None = unbounded, like arr[-0:])
+        max_history_length = self.historical_window_hours * 12 or None  # 5-minute intervals
+        mexc_engine = RollingQuantile(max_history_length, self._mexc_to_fut_history)
+        fut_engine = RollingQuantile(max_history_length, self._fut_to_mexc_history)
+        
+        mexc_stats = rolling_window_stats(mexc_to_fut_spread[valid], percentile_rank=True, std=True,
+                                          engine=mexc_engine)
+        fut_stats = rolling_window_stats(fut_to_mexc_spread[valid], percentile_rank=True, std=True,
+                                         engine=fut_engine)
+        
+        self._mexc_to_fut_history = mexc_engine.to_array()
+        self._fut_to_mexc_history = fut_engine.to_array()
+        
+        # Percentile rank needs more than 10 samples of history
+        mexc_percentile = np.where(mexc_stats['count'] > 10, mexc_stats['percentile_rank'], 50.0)
+        fut_percentile = np.where(fut_stats['count'] > 10, fut_stats['percentile_rank'], 50.0)
+        volatility = (mexc_stats['std'] + fut_stats['std']) / 2
+        
+        mexc_spread = mexc_to_fut_spread[valid]
+        fut_spread = fut_to_mexc_spread[valid]
+        
+        entry_threshold = np.full(len(volatility), self.entry_quantile * 100)
+        if self.volatility_adjustment:
+            entry_threshold *= (1 + volatility * 10)  # Increase threshold in volatile periods
+        
+        min_profit = total_fees + self.min_spread_threshold
+        entry_signal = (
+            ((mexc_percentile >= entry_threshold) & (mexc_spread > min_profit)) |
+            ((fut_percentile >= entry_threshold) & (fut_spread > min_profit))
+        )
+        exit_threshold = self.exit_quantile * 100
+        exit_signal = (mexc_percentile <= exit_threshold) | (fut_percentile <= exit_threshold)
+        
+        # Scatter valid-row results back; missing-price rows keep neutral metrics
+        result = {
+            'mexc_to_gateio_fut': np.zeros(n),
+            'gateio_fut_to_mexc': np.zeros(n),
+            'mexc_to_fut_percentile': np.full(n, 50.0),
+            'fut_to_mexc_percentile': np.full(n, 50.0),
+            'volatility': np.zeros(n),
+            'favorable_direction': np.full(n, 'none', dtype=object),
+            'entry_signal': np.zeros(n, dtype=bool),
+            'exit_signal': np.zeros(n, dtype=bool),
+        }
+        result['mexc_to_gateio_fut'][valid] = mexc_spread
+        result['gateio_fut_to_mexc'][valid] = fut_spread
+        result['mexc_to_fut_percentile'][valid] = mexc_percentile
+        result['fut_to_mexc_percentile'][valid] = fut_percentile
+        result['volatility'][valid] = volatility
+        result['favorable_direction'][valid] = np.where(mexc_spread > fut_spread, 'mexc_to_fut', 'fut_to_mexc')
+        result['entry_signal'][valid] = entry_signal
+        result['exit_signal'][valid] = exit_signal
+        
+        return result
+
     def analyze_signals(self, df: pd.DataFrame) -> dict:
         """
         Analyze spread distributions and signal generation thresholds.
@@ -6,12 +6,13 @@ immediately hedges to delta-neutral, then exits when price stabilizes.
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from dataclasses import dataclass
 from enum import Enum, IntEnum
 
 from trading.signals_v2.strategy_signal import StrategySignal
 from trading.signals_v2.entities import ArbitrageTrade, PerformanceMetrics, BacktestingParams, PositionEntry, TradeEntry
+from trading.signals_v2.position_simulation import scan_first, simulate_positions
 from exchanges.structs import Side
 from trading.indicators.candles_spikes_indicator import CandlesSpikeIndicator
 from trading.data_sources.column_utils import get_column_key
@@ -40,6 +41,10 @@ class SpikeLimits:
     futures_sell: float
 
 
+SPIKE_EXCHANGES = [ExchangeEnum.MEXC, ExchangeEnum.GATEIO, ExchangeEnum.GATEIO_FUTURES]
+FUTURES_LIMIT_SAFETY_SPREAD = 0.001  # Futures limits 0.1% tighter to ensure hedge profit
+
+
 class SpikeCatchingStrategySignal(StrategySignal):
     """
     Strategy that catches spikes using wide limits and immediately hedges to delta-neutral
@@ -118,6 +123,20 @@ class SpikeCatchingStrategySignal(StrategySignal):
         else:
             return 2.0  # Default 2% offset
 
+    @staticmethod
+    def _limit_levels(prices: np.ndarray, offset_pct: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Wide limit levels for [MEXC, GATEIO, FUTURES] prices.
+
+        Spot limits sit offset_pct away from the price; futures limits are
+        FUTURES_LIMIT_SAFETY_SPREAD tighter so the hedge stays profitable.
+
+        Returns:
+            Tuple of (buy limits, sell limits)
+        """
+        tighten = np.array([0.0, 0.0, FUTURES_LIMIT_SAFETY_SPREAD])
+        return prices * (1 - offset_pct + tighten), prices * (1 + offset_pct - tighten)
+
     def _setup_limits(self, data: pd.Series) -> SpikeLimits:
         """Setup wide limit orders for spike catching"""
         prices = self._get_current_prices(data)
@@ -146,16 +165,10 @@ class SpikeCatchingStrategySignal(StrategySignal):
             avg_vol = np.mean(volatilities)
             print(f"   Average Volatility: {avg_vol:.2f}%")
         
-        # Spot exchanges: wide buy/sell limits
-        mexc_buy = prices['mexc'] * (1 - offset_pct)
-        mexc_sell = prices['mexc'] * (1 + offset_pct)
-        gateio_buy = prices['gateio'] * (1 - offset_pct)
-        gateio_sell = prices['gateio'] * (1 + offset_pct)
-        
-        # Futures: opposite with safe spread (slightly tighter to ensure hedge profit)
-        futures_spread = 0.001  # 0.1% safety margin
-        futures_buy = prices['futures'] * (1 - offset_pct + futures_spread)
-        futures_sell = prices['futures'] * (1 + offset_pct - futures_spread)
+        buy_limits, sell_limits = self._limit_levels(
+            np.array([prices['mexc'], prices['gateio'], prices['futures']], dtype=np.float64), offset_pct)
+        mexc_buy, gateio_buy, futures_buy = (float(v) for v in buy_limits)
+        mexc_sell, gateio_sell, futures_sell = (float(v) for v in sell_limits)
         
         print(f"   New Limits: MEXC buy={mexc_buy:.6f} sell={mexc_sell:.6f}")
         print(f"              GATEIO buy={gateio_buy:.6f} sell={gateio_sell:.6f}")
@@ -432,6 +445,43 @@ class SpikeCatchingStrategySignal(StrategySignal):
             print(f"🔄 CLOSED → SETUP at {market_data.name} (ready for next opportunity)")
             return SpikeSignal.HOLD
 
+    def _price_matrix(self, df: pd.DataFrame) -> np.ndarray:
+        """Prices as a (3, rows) array for [MEXC, GATEIO, FUTURES] (close or bid/ask mid)."""
+        if get_column_key(ExchangeEnum.MEXC, 'close') in df.columns:
+            columns = [df[get_column_key(exchange, 'close')] for exchange in SPIKE_EXCHANGES]
+        else:
+            columns = [(df[get_column_key(exchange, 'bid_price')] + df[get_column_key(exchange, 'ask_price')]) / 2
+                       for exchange in SPIKE_EXCHANGES]
+        return np.vstack([column.to_numpy(dtype=np.float64) for column in columns])
+
+    def _dynamic_offsets(self, df: pd.DataFrame) -> np.ndarray:
+        """Vectorized _calculate_dynamic_offset for every row (percent)."""
+        vol_cols = [get_column_key(exchange, 'volatility') for exchange in SPIKE_EXCHANGES
+                    if get_column_key(exchange, 'volatility') in df.columns]
+        if not vol_cols:
+            return np.full(len(df), 2.0)  # Default 2% offset
+        avg_volatility = df[vol_cols].to_numpy(dtype=np.float64).mean(axis=1)
+        return np.clip(avg_volatility * self.spike_offset_multiplier, 1.0, 5.0)
+
+    def _stabilized_rows(self, df: pd.DataFrame) -> np.ndarray:
+        """Rows where every exchange's deviation is back below the stabilization threshold."""
+        dev_cols = [get_column_key(exchange, 'deviation_pct') for exchange in SPIKE_EXCHANGES
+                    if get_column_key(exchange, 'deviation_pct') in df.columns]
+        if not dev_cols:
+            return np.zeros(len(df), dtype=bool)
+        # A missing deviation on any exchange does not count as stabilized
+        return np.abs(df[dev_cols].to_numpy(dtype=np.float64)).max(axis=1) < self.stabilization_threshold
+
+    @staticmethod
+    def _first_fill(prices: np.ndarray, buy_limits: np.ndarray, sell_limits: np.ndarray) -> Dict:
+        """Fill info for the first hit limit in _detect_spike_fill order (buy before sell per exchange)."""
+        for i, exchange in enumerate(SPIKE_EXCHANGES):
+            if prices[i] <= buy_limits[i]:
+                return {'exchange': exchange, 'side': 'buy', 'price': float(buy_limits[i])}
+            if prices[i] >= sell_limits[i]:
+                return {'exchange': exchange, 'side': 'sell', 'price': float(sell_limits[i])}
+        raise ValueError("No limit was hit")
+
     def backtest(self, df: pd.DataFrame) -> PerformanceMetrics:
         """Execute comprehensive backtest of the spike-catching strategy"""
         # Preload the spike indicator
@@ -451,10 +501,52 @@ class SpikeCatchingStrategySignal(StrategySignal):
             'profitable_exits': 0
         }
         
-        # Run strategy on each data point
-        for timestamp, row in df.iterrows():
-            signal = self.generate_signal(row)
-            # Signal is used internally to manage state
+        # Same state machine as generate_signal, jumping between transitions:
+        # SETUP row -> WAITING until a limit fills -> HEDGED until exit -> CLOSED row -> SETUP
+        prices = self._price_matrix(df)
+        offsets_pct = self._dynamic_offsets(df) / 100.0
+        n_rows = len(df)
+        fills: Dict[int, Dict] = {}
+        
+        def find_fill(start: int) -> int:
+            # The first row sets up limits; after an exit one row resets the state before the next setup
+            setup_row = start + 1 if start else 0
+            if setup_row >= n_rows:
+                return -1
+            self.analysis_results['total_setups'] += 1
+            buy_limits, sell_limits = self._limit_levels(prices[:, setup_row], offsets_pct[setup_row])
+            
+            def hit(a: int, b: int) -> np.ndarray:
+                window = prices[:, a:b]
+                return ((window <= buy_limits[:, None]) | (window >= sell_limits[:, None])).any(axis=0)
+            
+            fill_row = scan_first(hit, setup_row + 1, n_rows)
+            if fill_row >= 0:
+                fills[fill_row] = self._first_fill(prices[:, fill_row], buy_limits, sell_limits)
+            return fill_row
+        
+        simulation = simulate_positions(
+            find_fill,
+            self._stabilized_rows(df),
+            df.index,
+            n_rows=n_rows,
+            max_hold=pd.Timedelta(minutes=self.max_position_time_minutes),
+            strict_max_hold=True
+        )
+        
+        for entry_row, exit_row in zip(simulation.entry_rows, simulation.exit_rows):
+            position = self._execute_hedge(fills[entry_row], df.iloc[entry_row])
+            self.analysis_results['spike_catches'] += 1
+            self.analysis_results['successful_hedges'] += 1
+            if exit_row < 0:
+                self.active_position = position
+                self.state = PositionState.HEDGED
+                break
+            
+            trade = self._close_position(position, df.iloc[exit_row])
+            self.trades.append(trade)
+            if trade.pnl_usdt > 0:
+                self.analysis_results['profitable_exits'] += 1
         
         # Calculate performance metrics from all trades
         if self.trades:
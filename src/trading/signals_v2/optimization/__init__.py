@@ -0,0 +1,68 @@
+"""
+Strategy parameter optimization utilities.
+
+- shared_frame: publish market data to shared memory for worker processes
+- parallel: process-pool evaluation of parameter sets
+- search: grid, random, successive halving, Hyperband and TPE search strategies
+- walk_forward: walk-forward / purged k-fold validation with stitched out-of-sample metrics
+- result_store: SQLite store of backtest results keyed by data hash, strategy version and params
+"""
+
+from trading.signals_v2.optimization.parallel import (
+    OptimizationSession, ParallelParameterOptimizer, ParameterEvaluation, StrategyEvaluator, parameter_grid
+)
+from trading.signals_v2.optimization.result_store import (
+    BacktestResultStore, ResultKey, StoredRun, canonical_params, data_fingerprint, result_metrics, strategy_identity
+)
+from trading.signals_v2.optimization.search import (
+    Categorical, GridSearch, Hyperband, IntUniform, LogUniform, ParameterSearch, RandomSearch, SearchBudget,
+    SearchResult, SearchResultsLog, SearchSpace, SearchTrial, SuccessiveHalving, TPESearch, Uniform
+)
+from trading.signals_v2.optimization.shared_frame import (SharedFrame, SharedFrameSpec, UnsupportedFrameError,
+                                                          attach_shared_frame)
+from trading.signals_v2.optimization.walk_forward import (
+    Fold, FoldResult, WalkForwardHarness, WalkForwardReport, parameter_stability, purged_kfold_folds,
+    stitch_performance, walk_forward_folds
+)
+
+__all__ = [
+    'OptimizationSession',
+    'ParallelParameterOptimizer',
+    'ParameterEvaluation',
+    'StrategyEvaluator',
+    'parameter_grid',
+    'SharedFrame',
+    'SharedFrameSpec',
+    'UnsupportedFrameError',
+    'attach_shared_frame',
+    'Categorical',
+    'Uniform',
+    'LogUniform',
+    'IntUniform',
+    'SearchSpace',
+    'SearchBudget',
+    'SearchTrial',
+    'SearchResult',
+    'SearchResultsLog',
+    'ParameterSearch',
+    'GridSearch',
+    'RandomSearch',
+    'SuccessiveHalving',
+    'Hyperband',
+    'TPESearch',
+    'Fold',
+    'FoldResult',
+    'WalkForwardHarness',
+    'WalkForwardReport',
+    'walk_forward_folds',
+    'purged_kfold_folds',
+    'stitch_performance',
+    'parameter_stability',
+    'BacktestResultStore',
+    'ResultKey',
+    'StoredRun',
+    'canonical_params',
+    'data_fingerprint',
+    'result_metrics',
+    'strategy_identity',
+]
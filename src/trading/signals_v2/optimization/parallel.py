@@ -0,0 +1,296 @@
+"""
+Parallel Parameter Optimizer
+
+Evaluates strategy parameter sets across a process pool. The market data
+frame is published once to shared memory (see shared_frame.py); each worker
+attaches to it in its initializer, then receives only chunks of
+(index, params) and returns only the evaluation results (e.g.
+PerformanceMetrics). Scales with cores because nothing proportional to the
+data size crosses process boundaries per task.
+
+Guarantees:
+- Results are returned in input order regardless of completion order
+- max_workers=1 (or a single parameter set) runs serially in-process
+- If the pool cannot be started or breaks, or the frame has columns that
+  cannot be shared (object/string dtypes), evaluation falls back to serial
+
+Adaptive searches use session() to keep one pool and one published frame
+across rounds, optionally evaluating on a prefix of the rows.
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from trading.signals_v2.entities import PerformanceMetrics
+from trading.signals_v2.optimization.shared_frame import (SharedFrame, SharedFrameSpec, UnsupportedFrameError,
+                                                          attach_shared_frame)
+from trading.signals_v2.strategy_signal import StrategySignal
+
+logger = logging.getLogger(__name__)
+
+# Evaluation callable: (market data, params) -> picklable result
+Evaluator = Callable[[pd.DataFrame, Dict[str, Any]], Any]
+
+
+@dataclass
+class ParameterEvaluation:
+    """Outcome of evaluating one parameter set."""
+    index: int                       # Position in the submitted parameter list
+    params: Dict[str, Any]
+    result: Any = None               # Evaluator return value (PerformanceMetrics for StrategyEvaluator)
+    error: Optional[str] = None
+    duration_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class StrategyEvaluator:
+    """
+    Picklable evaluator that builds a strategy from params and backtests it.
+
+    Args:
+        strategy_factory: Module-level class or function (or functools.partial of
+            one) returning a StrategySignal for the given keyword params
+    """
+
+    def __init__(self, strategy_factory: Callable[..., StrategySignal]):
+        self.strategy_factory = strategy_factory
+
+    def __call__(self, df: pd.DataFrame, params: Dict[str, Any]) -> PerformanceMetrics:
+        return self.strategy_factory(**params).backtest(df)
+
+
+def parameter_grid(param_grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Expand a parameter grid into parameter sets (first key varies slowest).
+
+    Args:
+        param_grid: Parameter name -> candidate values
+
+    Returns:
+        List of parameter dictionaries in nested-loop order
+    """
+    names = list(param_grid.keys())
+    return [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+
+
+def _evaluate_chunk(
+    evaluator: Evaluator,
+    df: pd.DataFrame,
+    chunk: Sequence[Tuple[int, Dict[str, Any]]]
+) -> List[ParameterEvaluation]:
+    """Evaluate parameter sets, capturing per-set errors like the serial grid loops."""
+    results = []
+    for index, params in chunk:
+        start = time.perf_counter()
+        try:
+            result = evaluator(df, params)
+            results.append(ParameterEvaluation(index, params, result, duration_ms=(time.perf_counter() - start) * 1000))
+        except Exception as e:
+            logger.debug(f"Parameter set {index} failed: {traceback.format_exc()}")
+            results.append(ParameterEvaluation(index, params, error=f"{type(e).__name__}: {e}",
+                                               duration_ms=(time.perf_counter() - start) * 1000))
+    return results
+
+
+# Worker process state, set once per worker by _init_worker
+_worker_df: Optional[pd.DataFrame] = None
+_worker_shm = None
+_worker_evaluator: Optional[Evaluator] = None
+
+
+def _init_worker(spec: SharedFrameSpec, evaluator: Evaluator) -> None:
+    global _worker_df, _worker_shm, _worker_evaluator
+    _worker_df, _worker_shm = attach_shared_frame(spec)
+    _worker_evaluator = evaluator
+
+
+def _run_worker_chunk(task: Tuple[Optional[int], Sequence[Tuple[int, Dict[str, Any]]]]) -> List[ParameterEvaluation]:
+    rows, chunk = task
+    df = _worker_df if rows is None else _worker_df.iloc[:rows]
+    return _evaluate_chunk(_worker_evaluator, df, chunk)
+
+
+class OptimizationSession:
+    """
+    Process pool and shared frame kept alive across several evaluation batches.
+
+    Used by adaptive searches that evaluate in rounds (and on growing data
+    prefixes) so the frame is published and the workers started only once.
+    Falls back to serial evaluation for the rest of the session if the pool
+    cannot be started or breaks, or if the frame cannot be shared.
+    """
+
+    def __init__(self, optimizer: 'ParallelParameterOptimizer', df: pd.DataFrame, workers: Optional[int] = None):
+        self.optimizer = optimizer
+        self.df = df
+        self.workers = workers or optimizer.max_workers
+        self._shared: Optional[SharedFrame] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._serial = self.workers <= 1
+
+    @property
+    def rows(self) -> int:
+        return len(self.df)
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            context = multiprocessing.get_context(self.optimizer.mp_context) if self.optimizer.mp_context else None
+            self._shared = SharedFrame.publish(self.df)
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                                 initializer=_init_worker,
+                                                 initargs=(self._shared.spec, self.optimizer.evaluator))
+        return self._executor
+
+    def evaluate(self, param_sets: Sequence[Dict[str, Any]], rows: Optional[int] = None) -> List[ParameterEvaluation]:
+        """
+        Evaluate parameter sets on the first `rows` rows of the session frame.
+
+        Args:
+            param_sets: Parameter dictionaries to evaluate
+            rows: Data prefix length (None = full frame)
+
+        Returns:
+            ParameterEvaluation per parameter set, in input order
+        """
+        if not param_sets:
+            return []
+
+        if self._serial or len(param_sets) == 1:
+            df = self.df if rows is None else self.df.iloc[:rows]
+            return _evaluate_chunk(self.optimizer.evaluator, df, list(enumerate(param_sets)))
+
+        try:
+            executor = self._ensure_pool()
+            chunks = self.optimizer._chunks(param_sets, self.workers)
+            evaluations = [
+                evaluation
+                for chunk_results in executor.map(_run_worker_chunk, [(rows, chunk) for chunk in chunks])
+                for evaluation in chunk_results
+            ]
+        except (BrokenProcessPool, OSError, UnsupportedFrameError) as e:
+            logger.warning(f"Process pool unavailable ({e}), falling back to serial evaluation")
+            self._shutdown()
+            self._serial = True
+            return self.evaluate(param_sets, rows)
+
+        evaluations.sort(key=lambda evaluation: evaluation.index)
+        return evaluations
+
+    def _shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    def close(self) -> None:
+        """Stop the workers and release the shared frame."""
+        self._shutdown()
+
+    def __enter__(self) -> 'OptimizationSession':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class ParallelParameterOptimizer:
+    """
+    Evaluate parameter sets on one dataset across a process pool.
+
+    Evaluators and their results must be picklable; strategies must not modify
+    the input frame in place (workers receive read-only columns).
+    """
+
+    def __init__(self,
+                 evaluator: Evaluator,
+                 max_workers: Optional[int] = None,
+                 chunk_size: Optional[int] = None,
+                 mp_context: Optional[str] = 'spawn'):
+        """
+        Initialize parallel optimizer.
+
+        Args:
+            evaluator: Callable (df, params) -> result, e.g. StrategyEvaluator
+            max_workers: Worker processes (None = os.cpu_count(), 1 = serial)
+            chunk_size: Parameter sets per task (None = ~4 tasks per worker)
+            mp_context: multiprocessing start method ('spawn' is safe with a running
+                event loop and DB pool threads; 'fork' starts faster on Linux)
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError(f"max_workers must be positive, got {max_workers}")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        self.evaluator = evaluator
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.mp_context = mp_context
+
+    def _chunks(self, param_sets: Sequence[Dict[str, Any]], workers: int) -> List[List[Tuple[int, Dict[str, Any]]]]:
+        indexed = list(enumerate(param_sets))
+        size = self.chunk_size or max(1, math.ceil(len(indexed) / (workers * 4)))
+        return [indexed[i:i + size] for i in range(0, len(indexed), size)]
+
+    def evaluate_serial(self, df: pd.DataFrame, param_sets: Sequence[Dict[str, Any]]) -> List[ParameterEvaluation]:
+        """Evaluate all parameter sets in the current process."""
+        return _evaluate_chunk(self.evaluator, df, list(enumerate(param_sets)))
+
+    def evaluate(self, df: pd.DataFrame, param_sets: Sequence[Dict[str, Any]]) -> List[ParameterEvaluation]:
+        """
+        Evaluate parameter sets, in parallel when worthwhile.
+
+        Args:
+            df: Market data shared by all evaluations
+            param_sets: Parameter dictionaries to evaluate
+
+        Returns:
+            ParameterEvaluation per parameter set, in input order
+        """
+        workers = min(self.max_workers, len(param_sets))
+        if workers <= 1:
+            return self.evaluate_serial(df, param_sets)
+
+        try:
+            return self._evaluate_parallel(df, param_sets, workers)
+        except (BrokenProcessPool, OSError, UnsupportedFrameError) as e:
+            logger.warning(f"Process pool unavailable ({e}), falling back to serial evaluation")
+            return self.evaluate_serial(df, param_sets)
+
+    def _evaluate_parallel(self, df: pd.DataFrame, param_sets: Sequence[Dict[str, Any]],
+                           workers: int) -> List[ParameterEvaluation]:
+        with OptimizationSession(self, df, workers) as session:
+            return session.evaluate(param_sets)
+
+    def session(self, df: pd.DataFrame) -> OptimizationSession:
+        """
+        Open a session that keeps workers attached to `df` across evaluate() calls.
+
+        Args:
+            df: Market data shared by all evaluations in the session
+
+        Returns:
+            OptimizationSession (use as a context manager)
+        """
+        return OptimizationSession(self, df)
+
+    async def evaluate_async(self, df: pd.DataFrame,
+                             param_sets: Sequence[Dict[str, Any]]) -> List[ParameterEvaluation]:
+        """evaluate() without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.evaluate, df, param_sets)
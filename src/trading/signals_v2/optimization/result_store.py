@@ -0,0 +1,563 @@
+"""
+Backtest Result Store
+
+Local SQLite store for backtest results, keyed by:
+- a content hash of the input data slice (or of a data request descriptor)
+- the strategy class and its STRATEGY_VERSION
+- the canonicalized parameters (JSON with sorted keys, numbers normalized)
+
+Each run keeps the pickled result object, a numeric metrics summary for
+queries and an optional trade log. A repeated screening or grid search
+reads stored runs and only computes keys it has not seen; bumping a
+strategy's STRATEGY_VERSION invalidates its old runs.
+
+Usage:
+    store = BacktestResultStore('data/cache/backtest_results.sqlite')
+    key = ResultKey.build(df, SpikeCatchingStrategySignal, params)
+    metrics = store.compute(key, lambda: strategy.backtest(df), label='BTC_USDT')
+    store.runs(strategy='SpikeCatchingStrategySignal').sort_values('sharpe_ratio')
+"""
+
+import asyncio
+import dataclasses
+import functools
+import hashlib
+import json
+import logging
+import math
+import pickle
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import msgspec
+import numpy as np
+import pandas as pd
+
+from trading.signals_v2.entities import PerformanceMetrics
+from trading.signals_v2.optimization.parallel import ParallelParameterOptimizer, ParameterEvaluation
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    digest TEXT NOT NULL UNIQUE,
+    data_hash TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    version TEXT NOT NULL,
+    params_json TEXT NOT NULL,
+    label TEXT,
+    metrics_json TEXT NOT NULL,
+    result BLOB,
+    duration_ms REAL NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_strategy ON runs (strategy, version);
+CREATE INDEX IF NOT EXISTS runs_label ON runs (label);
+CREATE TABLE IF NOT EXISTS trade_logs (
+    run_id INTEGER PRIMARY KEY REFERENCES runs (run_id) ON DELETE CASCADE,
+    records TEXT NOT NULL
+);
+"""
+
+
+# =============================================================================
+# Keys
+# =============================================================================
+
+def _canonical(value: Any) -> Any:
+    """Convert a parameter value to JSON builtins that compare equal across runs."""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, Enum):
+        return _canonical(value.value)
+    # Before the integer check: np.timedelta64 is an np.signedinteger
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, (pd.Timedelta, timedelta, np.timedelta64)):
+        return pd.Timedelta(value).isoformat()
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        if not math.isfinite(value):
+            return repr(value)
+        # 10 and 10.0 are the same parameter value
+        return int(value) if value.is_integer() and abs(value) < 2 ** 53 else value
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(v) for v in value), key=lambda v: json.dumps(v, sort_keys=True))
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return {'__data__': data_fingerprint(value)}
+    if isinstance(value, functools.partial):
+        return {'__partial__': _qualified_name(value.func), 'args': _canonical(value.args),
+                'keywords': _canonical(value.keywords)}
+    if isinstance(value, type) or callable(value) and hasattr(value, '__qualname__'):
+        return _qualified_name(value)
+    if isinstance(value, msgspec.Struct):
+        return {'__type__': _qualified_name(type(value)), **_canonical(msgspec.structs.asdict(value))}
+    if dataclasses.is_dataclass(value):
+        fields = {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+        return {'__type__': _qualified_name(type(value)), **_canonical(fields)}
+    if hasattr(value, '__dict__'):
+        public = {k: v for k, v in vars(value).items() if not k.startswith('_')}
+        return {'__type__': _qualified_name(type(value)), **_canonical(public)}
+    raise TypeError(f"Cannot canonicalize parameter value of type {type(value).__name__}")
+
+
+def canonical_params(params: Any) -> str:
+    """
+    Canonical JSON of a parameter structure.
+
+    Dict order, int/float spelling (10 vs 10.0), enums, dataclasses and
+    msgspec structs do not change the result.
+
+    Args:
+        params: Parameters (dicts, sequences, scalars, dataclasses, structs, ...)
+
+    Returns:
+        Compact JSON string with sorted keys
+    """
+    return json.dumps(_canonical(params), sort_keys=True, separators=(',', ':'))
+
+
+def data_fingerprint(data: Any) -> str:
+    """
+    Content hash of the input data.
+
+    DataFrames and Series hash index, column names, dtypes and values; other
+    objects (e.g. a request descriptor of symbol, exchanges, date range and
+    timeframe) hash their canonical JSON.
+
+    Args:
+        data: DataFrame, Series, ndarray or canonicalizable descriptor
+
+    Returns:
+        SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    if isinstance(data, pd.DataFrame):
+        digest.update(b'frame')
+        digest.update(json.dumps([str(c) for c in data.columns]).encode())
+        digest.update(json.dumps([str(t) for t in data.dtypes]).encode())
+        digest.update(str(data.index.dtype).encode())
+        digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    elif isinstance(data, pd.Series):
+        digest.update(f'series|{data.name}|{data.dtype}|{data.index.dtype}'.encode())
+        digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    elif isinstance(data, np.ndarray):
+        array = np.ascontiguousarray(data)
+        digest.update(f'ndarray|{array.dtype.str}|{array.shape}'.encode())
+        digest.update(array.tobytes())
+    else:
+        digest.update(b'descriptor')
+        digest.update(canonical_params(data).encode())
+    return digest.hexdigest()
+
+
+def _qualified_name(obj: Any) -> str:
+    return f"{obj.__module__}.{obj.__qualname__}"
+
+
+def strategy_identity(strategy: Any) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Strategy name, version and fixed keyword arguments.
+
+    Args:
+        strategy: Strategy class, instance, or functools.partial of a class/factory
+
+    Returns:
+        (qualified class name, STRATEGY_VERSION as string, partial keywords)
+    """
+    fixed: Dict[str, Any] = {}
+    while isinstance(strategy, functools.partial):
+        if strategy.args:
+            raise ValueError("Positional partial arguments are not supported in result keys")
+        fixed = {**strategy.keywords, **fixed}
+        strategy = strategy.func
+    cls = strategy if isinstance(strategy, type) or callable(strategy) and hasattr(strategy, '__qualname__') \
+        else type(strategy)
+    return _qualified_name(cls), str(getattr(cls, 'STRATEGY_VERSION', 0)), fixed
+
+
+@dataclasses.dataclass(frozen=True)
+class ResultKey:
+    """Identity of a backtest run."""
+    data_hash: str
+    strategy: str                    # Qualified strategy class name
+    version: str
+    params_json: str                 # canonical_params() of all call parameters
+
+    @classmethod
+    def build(cls, data: Any, strategy: Any, params: Optional[Dict[str, Any]] = None,
+              version: Optional[Union[int, str]] = None, data_hash: Optional[str] = None) -> 'ResultKey':
+        """
+        Build a key from data, strategy and parameters.
+
+        Args:
+            data: Input data slice (or descriptor) passed to data_fingerprint
+            strategy: Strategy class, instance or functools.partial (its keywords join the params)
+            params: Strategy parameters
+            version: Overrides the strategy's STRATEGY_VERSION
+            data_hash: Precomputed data fingerprint (skips hashing `data`)
+
+        Returns:
+            ResultKey
+        """
+        name, default_version, fixed = strategy_identity(strategy)
+        return cls(
+            data_hash=data_hash or data_fingerprint(data),
+            strategy=name,
+            version=str(version) if version is not None else default_version,
+            params_json=canonical_params({**fixed, **(params or {})}),
+        )
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return json.loads(self.params_json)
+
+    @property
+    def digest(self) -> str:
+        raw = '\x1f'.join((self.data_hash, self.strategy, self.version, self.params_json))
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+
+# =============================================================================
+# Result summaries
+# =============================================================================
+
+def result_metrics(result: Any) -> Dict[str, Optional[float]]:
+    """
+    Numeric metrics of a result for queries.
+
+    Supports signals_v2 PerformanceMetrics, NamedTuples, dataclasses and
+    dicts; non-finite values become None.
+    """
+    if isinstance(result, PerformanceMetrics):
+        values = {name: getattr(result, name) for name in
+                  ('total_pnl_usd', 'total_pnl_pct', 'win_rate', 'avg_trade_pnl', 'max_drawdown', 'sharpe_ratio',
+                   'trade_freq', 'total_trades')}
+    elif isinstance(result, tuple) and hasattr(result, '_asdict'):
+        values = result._asdict()
+    elif dataclasses.is_dataclass(result) and not isinstance(result, type):
+        values = {f.name: getattr(result, f.name) for f in dataclasses.fields(result)}
+    elif isinstance(result, dict):
+        values = result
+    else:
+        return {}
+
+    metrics = {}
+    for name, value in values.items():
+        if isinstance(value, (bool, np.bool_)) or not isinstance(value, (int, float, np.integer, np.floating)):
+            continue
+        value = float(value)
+        metrics[str(name)] = value if math.isfinite(value) else None
+    return metrics
+
+
+def _trade_records(trades: Any) -> List[Dict[str, Any]]:
+    if isinstance(trades, pd.DataFrame):
+        records = trades.reset_index().to_dict('records') if trades.index.name else trades.to_dict('records')
+    else:
+        records = []
+        for trade in trades:
+            if isinstance(trade, dict):
+                records.append(trade)
+            elif dataclasses.is_dataclass(trade):
+                records.append({f.name: getattr(trade, f.name) for f in dataclasses.fields(trade)})
+            else:
+                records.append({k: v for k, v in vars(trade).items() if not k.startswith('_')})
+    return [{str(k): _record_value(v) for k, v in record.items()} for record in records]
+
+
+def _record_value(value: Any) -> Any:
+    try:
+        return _canonical(value)
+    except TypeError:
+        return str(value)
+
+
+@dataclasses.dataclass
+class StoredRun:
+    """A stored backtest run."""
+    run_id: int
+    key: ResultKey
+    label: Optional[str]
+    metrics: Dict[str, Optional[float]]
+    duration_ms: float
+    created_at: str
+    result: Any = None               # Unpickled result object (None if not loaded)
+
+
+# =============================================================================
+# Store
+# =============================================================================
+
+class BacktestResultStore:
+    """
+    SQLite-backed store of backtest results.
+
+    Safe to share between threads of one process (a lock serializes access);
+    worker processes should return results to the parent, which stores them.
+    """
+
+    def __init__(self, path: Union[str, Path] = 'data/cache/backtest_results.sqlite'):
+        """
+        Open (or create) a result store.
+
+        Args:
+            path: SQLite database file (':memory:' for a temporary store)
+        """
+        self.path = str(path)
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA foreign_keys = ON')
+        if self.path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode = WAL')
+        self._conn.executescript(_SCHEMA)
+
+    # -------------------------------------------------------------------------
+    # Single runs
+    # -------------------------------------------------------------------------
+
+    def get(self, key: ResultKey, load_result: bool = True) -> Optional[StoredRun]:
+        """
+        Stored run for a key.
+
+        Args:
+            key: Run identity
+            load_result: Unpickle the result object
+
+        Returns:
+            StoredRun, or None if missing (or its result can no longer be unpickled)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT run_id, label, metrics_json, duration_ms, created_at, result FROM runs WHERE digest = ?',
+                (key.digest,)
+            ).fetchone()
+        if row is None:
+            return None
+        run_id, label, metrics_json, duration_ms, created_at, blob = row
+        result = None
+        if load_result and blob is not None:
+            try:
+                result = pickle.loads(blob)
+            except Exception as e:
+                logger.warning(f"Stored result {run_id} of {key.strategy} cannot be loaded ({e}), ignoring it")
+                return None
+        return StoredRun(run_id, key, label, json.loads(metrics_json), duration_ms, created_at, result)
+
+    def put(self, key: ResultKey, result: Any, label: Optional[str] = None, trades: Any = None,
+            duration_ms: float = 0.0, metrics: Any = None) -> int:
+        """
+        Store (or replace) the result of a run.
+
+        Args:
+            key: Run identity
+            result: Picklable result (PerformanceMetrics, NamedTuple, dataclass, dict, ...)
+            label: Free-form tag for queries, e.g. the symbol
+            trades: Optional trade log (DataFrame or sequence of dicts/dataclasses);
+                defaults to result.trades when present
+            duration_ms: Compute time of the run
+            metrics: Object to take the query metrics from (defaults to result)
+
+        Returns:
+            run_id
+        """
+        if trades is None:
+            trades = getattr(result, 'trades', None)
+        metrics_json = json.dumps(result_metrics(result if metrics is None else metrics), sort_keys=True)
+        blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        records = json.dumps(_trade_records(trades)) if trades is not None else None
+        created_at = datetime.now(timezone.utc).isoformat()
+
+        with self._lock, self._conn:
+            run_id = self._conn.execute(
+                """
+                INSERT INTO runs (digest, data_hash, strategy, version, params_json, label, metrics_json, result,
+                                  duration_ms, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (digest) DO UPDATE SET
+                    label = excluded.label, metrics_json = excluded.metrics_json, result = excluded.result,
+                    duration_ms = excluded.duration_ms, created_at = excluded.created_at
+                RETURNING run_id
+                """,
+                (key.digest, key.data_hash, key.strategy, key.version, key.params_json, label, metrics_json, blob,
+                 duration_ms, created_at)
+            ).fetchone()[0]
+            self._conn.execute('DELETE FROM trade_logs WHERE run_id = ?', (run_id,))
+            if records is not None:
+                self._conn.execute('INSERT INTO trade_logs (run_id, records) VALUES (?, ?)', (run_id, records))
+        return run_id
+
+    def compute(self, key: ResultKey, compute_fn: Callable[[], Any], label: Optional[str] = None,
+                store_trades: bool = True) -> Any:
+        """
+        Stored result for the key, or compute and store it.
+
+        Args:
+            key: Run identity
+            compute_fn: Produces the result on a miss
+            label: Tag stored with a new run
+            store_trades: Store result.trades as trade log
+
+        Returns:
+            Result object
+        """
+        stored = self.get(key)
+        if stored is not None:
+            return stored.result
+        start = time.perf_counter()
+        result = compute_fn()
+        duration_ms = (time.perf_counter() - start) * 1000
+        self.put(key, result, label=label, trades=None if store_trades else [], duration_ms=duration_ms)
+        return result
+
+    def evaluate(self, optimizer: ParallelParameterOptimizer, df: pd.DataFrame,
+                 param_sets: Sequence[Dict[str, Any]], strategy: Any, label: Optional[str] = None,
+                 version: Optional[Union[int, str]] = None) -> List[ParameterEvaluation]:
+        """
+        optimizer.evaluate() that only evaluates parameter sets without a stored run.
+
+        Args:
+            optimizer: Optimizer evaluating the missing parameter sets
+            df: Market data (hashed once)
+            param_sets: Parameter dictionaries
+            strategy: Strategy class / factory identifying the runs (e.g. the StrategyEvaluator factory)
+            label: Tag stored with new runs
+            version: Overrides the strategy's STRATEGY_VERSION
+
+        Returns:
+            ParameterEvaluation per parameter set, in input order (failed sets are not stored)
+        """
+        data_hash = data_fingerprint(df)
+        keys = [ResultKey.build(None, strategy, params, version=version, data_hash=data_hash) for params in param_sets]
+        evaluations: List[Optional[ParameterEvaluation]] = [None] * len(param_sets)
+        missing = []
+        for i, (key, params) in enumerate(zip(keys, param_sets)):
+            stored = self.get(key)
+            if stored is None:
+                missing.append(i)
+            else:
+                evaluations[i] = ParameterEvaluation(i, params, stored.result, duration_ms=stored.duration_ms)
+
+        if missing:
+            computed = optimizer.evaluate(df, [param_sets[i] for i in missing])
+            for i, evaluation in zip(missing, computed):
+                evaluation.index = i
+                evaluations[i] = evaluation
+                if evaluation.ok:
+                    self.put(keys[i], evaluation.result, label=label, duration_ms=evaluation.duration_ms)
+        logger.info(f"Result store: {len(param_sets) - len(missing)} stored, {len(missing)} evaluated")
+        return evaluations
+
+    async def evaluate_async(self, optimizer: ParallelParameterOptimizer, df: pd.DataFrame,
+                             param_sets: Sequence[Dict[str, Any]], strategy: Any, label: Optional[str] = None,
+                             version: Optional[Union[int, str]] = None) -> List[ParameterEvaluation]:
+        """evaluate() without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.evaluate, optimizer, df, param_sets, strategy, label=label, version=version))
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def runs(self, strategy: Optional[str] = None, version: Optional[Union[int, str]] = None,
+             label: Optional[str] = None, data_hash: Optional[str] = None) -> pd.DataFrame:
+        """
+        Stored runs as a comparison table.
+
+        Args:
+            strategy: Class name, qualified name or qualified-name suffix
+            version: Strategy version
+            label: Run label
+            data_hash: Data fingerprint
+
+        Returns:
+            One row per run: run_id, strategy, version, label, data_hash, created_at,
+            duration_ms, one column per parameter and one per metric
+        """
+        clauses, args = [], []
+        if strategy is not None:
+            clauses.append("(strategy = ? OR strategy LIKE ?)")
+            args += [strategy, f'%.{strategy}']
+        if version is not None:
+            clauses.append("version = ?")
+            args.append(str(version))
+        if label is not None:
+            clauses.append("label = ?")
+            args.append(label)
+        if data_hash is not None:
+            clauses.append("data_hash = ?")
+            args.append(data_hash)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT run_id, strategy, version, label, data_hash, created_at, duration_ms, params_json, "
+                f"metrics_json FROM runs {where} ORDER BY run_id", args
+            ).fetchall()
+
+        records = []
+        for run_id, name, run_version, run_label, run_data, created_at, duration_ms, params_json, metrics_json in rows:
+            params = json.loads(params_json)
+            record = {'run_id': run_id, 'strategy': name.rsplit('.', 1)[-1], 'version': run_version,
+                      'label': run_label, 'data_hash': run_data, 'created_at': created_at, 'duration_ms': duration_ms}
+            if isinstance(params, dict):
+                record.update({k: v if not isinstance(v, (dict, list)) else json.dumps(v, sort_keys=True)
+                               for k, v in params.items() if k not in record})
+            record.update({k: v for k, v in json.loads(metrics_json).items() if k not in record})
+            records.append(record)
+        return pd.DataFrame.from_records(records)
+
+    def best(self, metric: str, n: int = 10, ascending: bool = False, **filters) -> pd.DataFrame:
+        """Top runs by a metric (filters as in runs())."""
+        table = self.runs(**filters)
+        if table.empty or metric not in table.columns:
+            return table
+        return table.sort_values(metric, ascending=ascending, kind='stable').head(n).reset_index(drop=True)
+
+    def trades(self, run_id: int) -> pd.DataFrame:
+        """Trade log of a run (empty if none was stored)."""
+        with self._lock:
+            row = self._conn.execute('SELECT records FROM trade_logs WHERE run_id = ?', (run_id,)).fetchone()
+        return pd.DataFrame.from_records(json.loads(row[0])) if row else pd.DataFrame()
+
+    def delete(self, strategy: Optional[str] = None, version: Optional[Union[int, str]] = None,
+               label: Optional[str] = None, data_hash: Optional[str] = None) -> int:
+        """Delete matching runs (all runs without filters); returns the number deleted."""
+        run_ids = self.runs(strategy=strategy, version=version, label=label, data_hash=data_hash)
+        if run_ids.empty:
+            return 0
+        ids = [int(i) for i in run_ids['run_id']]
+        with self._lock, self._conn:
+            self._conn.executemany('DELETE FROM runs WHERE run_id = ?', [(i,) for i in ids])
+        return len(ids)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM runs').fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> 'BacktestResultStore':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -0,0 +1,684 @@
+"""
+Parameter Search Strategies
+
+Pluggable alternatives to exhaustive grid search, all behind ParameterSearch:
+
+- GridSearch: every combination of categorical dimensions (baseline)
+- RandomSearch: independent samples from the space
+- SuccessiveHalving: many configs on a short data prefix, keep the top 1/eta,
+  re-evaluate survivors on an eta-times longer prefix until the full dataset
+- Hyperband: several successive-halving brackets trading breadth for depth
+- TPESearch: Tree-structured Parzen Estimator in NumPy - models good vs bad
+  trials per dimension and proposes points maximizing l(x)/g(x)
+
+Every search evaluates through an OptimizationSession (one process pool and
+one shared-memory frame for the whole run), respects a SearchBudget
+(max evaluations, wall time) and records each trial in a SearchResultsLog,
+optionally appended to a JSON-lines file as it runs.
+
+Scores are "higher is better"; failed evaluations score -inf.
+"""
+
+import asyncio
+import json
+import math
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from trading.signals_v2.entities import PerformanceMetrics
+from trading.signals_v2.optimization.parallel import OptimizationSession, ParallelParameterOptimizer, parameter_grid
+
+# ============================================================================
+# Search Space
+# ============================================================================
+
+
+class Dimension(ABC):
+    """One parameter dimension."""
+
+    @abstractmethod
+    def sample(self, rng: np.random.Generator) -> Any:
+        """Draw a value uniformly from the prior."""
+
+
+class NumericDimension(Dimension):
+    """Ordered dimension that maps to the unit interval (TPE models it as a density)."""
+
+    @abstractmethod
+    def to_unit(self, value: Any) -> float:
+        """Map a value into [0, 1]."""
+
+    @abstractmethod
+    def from_unit(self, unit: float) -> Any:
+        """Map a point of [0, 1] (clipped) back to a value."""
+
+
+@dataclass(frozen=True)
+class Categorical(Dimension):
+    """Finite set of values (plain lists in a search space become Categorical)."""
+    values: tuple
+
+    def __post_init__(self):
+        if not self.values:
+            raise ValueError("Categorical dimension needs at least one value")
+
+    def sample(self, rng: np.random.Generator) -> Any:
+        return self.values[int(rng.integers(len(self.values)))]
+
+    def index(self, value: Any) -> int:
+        return self.values.index(value)
+
+
+@dataclass(frozen=True)
+class Uniform(NumericDimension):
+    """Continuous value in [low, high]."""
+    low: float
+    high: float
+
+    def __post_init__(self):
+        if not self.high > self.low:
+            raise ValueError(f"high must be greater than low, got [{self.low}, {self.high}]")
+
+    def sample(self, rng: np.random.Generator) -> float:
+        return self.from_unit(float(rng.random()))
+
+    def to_unit(self, value: float) -> float:
+        return (value - self.low) / (self.high - self.low)
+
+    def from_unit(self, unit: float) -> float:
+        return float(self.low + min(max(unit, 0.0), 1.0) * (self.high - self.low))
+
+
+@dataclass(frozen=True)
+class LogUniform(NumericDimension):
+    """Positive continuous value, uniform in log space."""
+    low: float
+    high: float
+
+    def __post_init__(self):
+        if not 0 < self.low < self.high:
+            raise ValueError(f"LogUniform needs 0 < low < high, got [{self.low}, {self.high}]")
+
+    def sample(self, rng: np.random.Generator) -> float:
+        return self.from_unit(float(rng.random()))
+
+    def to_unit(self, value: float) -> float:
+        return (math.log(value) - math.log(self.low)) / (math.log(self.high) - math.log(self.low))
+
+    def from_unit(self, unit: float) -> float:
+        unit = min(max(unit, 0.0), 1.0)
+        return float(math.exp(math.log(self.low) + unit * (math.log(self.high) - math.log(self.low))))
+
+
+@dataclass(frozen=True)
+class IntUniform(NumericDimension):
+    """Integer value in [low, high] on a step grid."""
+    low: int
+    high: int
+    step: int = 1
+
+    def __post_init__(self):
+        if self.high < self.low or self.step < 1:
+            raise ValueError(f"Invalid integer range [{self.low}, {self.high}] step {self.step}")
+
+    def sample(self, rng: np.random.Generator) -> int:
+        return self.low + self.step * int(rng.integers((self.high - self.low) // self.step + 1))
+
+    def to_unit(self, value: int) -> float:
+        return (value - self.low) / (self.high - self.low) if self.high > self.low else 0.5
+
+    def from_unit(self, unit: float) -> int:
+        raw = self.low + min(max(unit, 0.0), 1.0) * (self.high - self.low)
+        return int(self.low + round((raw - self.low) / self.step) * self.step)
+
+
+SearchSpace = Dict[str, Union[Dimension, Sequence[Any]]]
+
+
+def normalize_space(space: SearchSpace) -> Dict[str, Dimension]:
+    """Convert plain value lists to Categorical dimensions."""
+    return {name: dim if isinstance(dim, Dimension) else Categorical(tuple(dim)) for name, dim in space.items()}
+
+
+def sample_params(space: Dict[str, Dimension], rng: np.random.Generator) -> Dict[str, Any]:
+    """Draw one parameter set from the prior."""
+    return {name: dim.sample(rng) for name, dim in space.items()}
+
+
+# ============================================================================
+# Budget, Trials and Results Log
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class SearchBudget:
+    """Limits for a search run; None disables a limit."""
+    max_evaluations: Optional[int] = None  # Evaluations of any data fraction
+    max_seconds: Optional[float] = None    # Wall time, checked between batches
+
+    def __post_init__(self):
+        if self.max_evaluations is not None and self.max_evaluations < 1:
+            raise ValueError(f"max_evaluations must be positive, got {self.max_evaluations}")
+        if self.max_seconds is not None and self.max_seconds <= 0:
+            raise ValueError(f"max_seconds must be positive, got {self.max_seconds}")
+
+
+@dataclass
+class SearchTrial:
+    """One evaluated parameter set."""
+    trial_id: int
+    params: Dict[str, Any]
+    score: float
+    fraction: float                  # Share of the dataset (prefix) used
+    rows: int
+    result: Any = None               # Evaluator result (e.g. PerformanceMetrics)
+    error: Optional[str] = None
+    duration_ms: float = 0.0
+    rung: int = 0                    # Successive-halving rung / TPE round
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _metrics_summary(result: Any) -> Optional[Dict[str, float]]:
+    if isinstance(result, PerformanceMetrics):
+        return {
+            'total_pnl_pct': result.total_pnl_pct,
+            'win_rate': result.win_rate,
+            'sharpe_ratio': result.sharpe_ratio,
+            'max_drawdown': result.max_drawdown,
+            'total_trades': result.total_trades,
+        }
+    if isinstance(result, dict):
+        return {key: value for key, value in result.items() if isinstance(value, (int, float))}
+    return None
+
+
+class SearchResultsLog:
+    """
+    Trial log kept in memory and optionally appended to a JSON-lines file.
+
+    Each line holds the trial parameters, score, data fraction, error and a
+    numeric metrics summary, so long searches can be inspected while running.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.trials: List[SearchTrial] = []
+
+    def record(self, trial: SearchTrial, search_name: str) -> None:
+        self.trials.append(trial)
+        if self.path is None:
+            return
+        line = {
+            'logged_at': datetime.now(timezone.utc).isoformat(),
+            'search': search_name,
+            'trial_id': trial.trial_id,
+            'rung': trial.rung,
+            'fraction': trial.fraction,
+            'rows': trial.rows,
+            'params': trial.params,
+            'score': trial.score if math.isfinite(trial.score) else None,
+            'error': trial.error,
+            'duration_ms': round(trial.duration_ms, 3),
+            'metrics': _metrics_summary(trial.result),
+        }
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(line, default=str) + '\n')
+
+    def __len__(self) -> int:
+        return len(self.trials)
+
+
+@dataclass
+class SearchResult:
+    """Outcome of a search run."""
+    best_params: Optional[Dict[str, Any]]
+    best_score: float
+    best_trial: Optional[SearchTrial]
+    trials: List[SearchTrial]
+    elapsed_seconds: float
+    stopped_reason: str              # 'completed', 'max_evaluations' or 'max_seconds'
+
+    @property
+    def evaluations(self) -> int:
+        return len(self.trials)
+
+    def top(self, n: int = 10) -> List[SearchTrial]:
+        """Best trials at the largest data fraction evaluated."""
+        return _rank_final(self.trials)[:n]
+
+
+def _rank_final(trials: Sequence[SearchTrial]) -> List[SearchTrial]:
+    """Trials at the largest evaluated fraction, best first (stable for ties)."""
+    ok = [trial for trial in trials if trial.ok]
+    if not ok:
+        return []
+    fraction = max(trial.fraction for trial in ok)
+    final = [trial for trial in ok if trial.fraction == fraction]
+    return sorted(final, key=lambda trial: -trial.score)
+
+
+# ============================================================================
+# Search Context
+# ============================================================================
+
+
+class SearchContext:
+    """Evaluation gateway handed to search strategies; enforces the budget and logs trials."""
+
+    def __init__(self, session: OptimizationSession, space: Dict[str, Dimension],
+                 score_fn: Callable[[Any], float], budget: SearchBudget, log: SearchResultsLog,
+                 rng: np.random.Generator, search_name: str, batch_size: int):
+        self.session = session
+        self.space = space
+        self.score_fn = score_fn
+        self.budget = budget
+        self.log = log
+        self.rng = rng
+        self.batch_size = batch_size
+        self._search_name = search_name
+        self._started = time.monotonic()
+        self.stopped_reason: Optional[str] = None
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started
+
+    @property
+    def remaining_evaluations(self) -> Optional[int]:
+        if self.budget.max_evaluations is None:
+            return None
+        return max(self.budget.max_evaluations - len(self.log), 0)
+
+    @property
+    def exhausted(self) -> bool:
+        if self.remaining_evaluations == 0:
+            self.stopped_reason = 'max_evaluations'
+        elif self.budget.max_seconds is not None and self.elapsed >= self.budget.max_seconds:
+            self.stopped_reason = 'max_seconds'
+        return self.stopped_reason is not None
+
+    def evaluate(self, param_sets: Sequence[Dict[str, Any]], fraction: float = 1.0,
+                 rung: int = 0) -> List[SearchTrial]:
+        """
+        Evaluate parameter sets on a data prefix, within the remaining budget.
+
+        Args:
+            param_sets: Parameter dictionaries to evaluate
+            fraction: Share of rows (prefix) to evaluate on, in (0, 1]
+            rung: Round label stored on the trials
+
+        Returns:
+            Trials in input order; may be shorter than param_sets (or empty)
+            when the budget runs out
+        """
+        if self.exhausted:
+            return []
+        remaining = self.remaining_evaluations
+        if remaining is not None:
+            param_sets = list(param_sets)[:remaining]
+
+        fraction = min(max(fraction, 0.0), 1.0)
+        rows = max(1, int(round(self.session.rows * fraction)))
+        evaluations = self.session.evaluate(param_sets, rows=None if rows >= self.session.rows else rows)
+
+        trials = []
+        for evaluation in evaluations:
+            score = -math.inf
+            error = evaluation.error
+            if evaluation.ok:
+                try:
+                    score = float(self.score_fn(evaluation.result))
+                except Exception as e:
+                    error = f"score: {type(e).__name__}: {e}"
+                if math.isnan(score):
+                    score = -math.inf
+            trial = SearchTrial(
+                trial_id=len(self.log),
+                params=evaluation.params,
+                score=score,
+                fraction=rows / self.session.rows,
+                rows=rows,
+                result=evaluation.result,
+                error=error,
+                duration_ms=evaluation.duration_ms,
+                rung=rung,
+            )
+            self.log.record(trial, self._search_name)
+            trials.append(trial)
+        return trials
+
+
+# ============================================================================
+# Search Strategies
+# ============================================================================
+
+
+def default_score(result: Any) -> float:
+    """Default objective: total P&L percentage of a PerformanceMetrics result."""
+    return result.total_pnl_pct
+
+
+class ParameterSearch(ABC):
+    """
+    Base class for parameter search strategies.
+
+    Subclasses implement _search(ctx) and only talk to the data through
+    ctx.evaluate(), which enforces the budget and records the results log.
+    """
+
+    name = 'search'
+
+    def __init__(self, budget: Optional[SearchBudget] = None, seed: Optional[int] = None,
+                 log_path: Optional[str] = None):
+        """
+        Initialize parameter search.
+
+        Args:
+            budget: Evaluation / wall-time limits (None = unlimited)
+            seed: Random seed for reproducible proposals
+            log_path: Optional JSON-lines file the trials are appended to
+        """
+        self.budget = budget or SearchBudget()
+        self.seed = seed
+        self.log_path = log_path
+
+    @abstractmethod
+    def _search(self, ctx: SearchContext) -> None:
+        """Run the strategy using ctx.evaluate()."""
+
+    def run(self, optimizer: ParallelParameterOptimizer, df, space: SearchSpace,
+            score_fn: Callable[[Any], float] = default_score) -> SearchResult:
+        """
+        Run the search.
+
+        Args:
+            optimizer: Evaluator and worker configuration
+            df: Market data (prefixes of it are used by multi-fidelity searches)
+            space: Parameter name -> Dimension or list of values
+            score_fn: Maps an evaluation result to a score (higher is better)
+
+        Returns:
+            SearchResult with the best full-data trial and the complete trial list
+        """
+        log = SearchResultsLog(self.log_path)
+        with optimizer.session(df) as session:
+            ctx = SearchContext(
+                session=session,
+                space=normalize_space(space),
+                score_fn=score_fn,
+                budget=self.budget,
+                log=log,
+                rng=np.random.default_rng(self.seed),
+                search_name=self.name,
+                batch_size=max(1, session.workers),
+            )
+            self._search(ctx)
+
+        ranked = _rank_final(log.trials)
+        best = ranked[0] if ranked else None
+        return SearchResult(
+            best_params=dict(best.params) if best else None,
+            best_score=best.score if best else -math.inf,
+            best_trial=best,
+            trials=log.trials,
+            elapsed_seconds=ctx.elapsed,
+            stopped_reason=ctx.stopped_reason or 'completed',
+        )
+
+    async def run_async(self, optimizer: ParallelParameterOptimizer, df, space: SearchSpace,
+                        score_fn: Callable[[Any], float] = default_score) -> SearchResult:
+        """run() without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.run, optimizer, df, space, score_fn)
+
+
+class GridSearch(ParameterSearch):
+    """Exhaustive search over categorical dimensions, in nested-loop order."""
+
+    name = 'grid'
+
+    def _search(self, ctx: SearchContext) -> None:
+        grid = {}
+        for name, dim in ctx.space.items():
+            if not isinstance(dim, Categorical):
+                raise ValueError(f"GridSearch needs categorical dimensions, {name!r} is {type(dim).__name__}")
+            grid[name] = dim.values
+
+        param_sets = parameter_grid(grid)
+        for start in range(0, len(param_sets), ctx.batch_size * 4):
+            if not ctx.evaluate(param_sets[start:start + ctx.batch_size * 4]):
+                return
+
+
+class RandomSearch(ParameterSearch):
+    """Independent samples from the search space."""
+
+    name = 'random'
+
+    def __init__(self, n_trials: int = 100, **kwargs):
+        super().__init__(**kwargs)
+        if n_trials < 1:
+            raise ValueError(f"n_trials must be positive, got {n_trials}")
+        self.n_trials = n_trials
+
+    def _search(self, ctx: SearchContext) -> None:
+        done = 0
+        while done < self.n_trials:
+            batch = [sample_params(ctx.space, ctx.rng) for _ in range(min(ctx.batch_size, self.n_trials - done))]
+            trials = ctx.evaluate(batch)
+            if not trials:
+                return
+            done += len(trials)
+
+
+def _successive_halving(ctx: SearchContext, configs: List[Dict[str, Any]], min_fraction: float,
+                        eta: int, max_fraction: float = 1.0) -> None:
+    """Evaluate configs on growing prefixes, keeping the top 1/eta after each rung."""
+    fraction = min_fraction
+    rung = 0
+    while configs:
+        trials = ctx.evaluate(configs, fraction=fraction, rung=rung)
+        if fraction >= max_fraction or len(trials) <= 1:
+            return
+        keep = max(1, len(trials) // eta)
+        ranked = sorted(trials, key=lambda trial: -trial.score)[:keep]
+        configs = [trial.params for trial in ranked if trial.ok]
+        fraction = min(max_fraction, fraction * eta)
+        rung += 1
+
+
+class SuccessiveHalving(ParameterSearch):
+    """
+    Successive halving on growing data prefixes.
+
+    Rung 0 evaluates n_configs random configs on min_fraction of the rows;
+    each following rung keeps the best 1/eta and multiplies the prefix by eta
+    until the full dataset is reached.
+    """
+
+    name = 'successive_halving'
+
+    def __init__(self, n_configs: int = 81, min_fraction: float = 1 / 27, eta: int = 3, **kwargs):
+        super().__init__(**kwargs)
+        if n_configs < 1:
+            raise ValueError(f"n_configs must be positive, got {n_configs}")
+        if not 0 < min_fraction <= 1:
+            raise ValueError(f"min_fraction must be in (0, 1], got {min_fraction}")
+        if eta < 2:
+            raise ValueError(f"eta must be at least 2, got {eta}")
+        self.n_configs = n_configs
+        self.min_fraction = min_fraction
+        self.eta = eta
+
+    def _search(self, ctx: SearchContext) -> None:
+        configs = [sample_params(ctx.space, ctx.rng) for _ in range(self.n_configs)]
+        _successive_halving(ctx, configs, self.min_fraction, self.eta)
+
+
+class Hyperband(ParameterSearch):
+    """
+    Hyperband: successive-halving brackets from aggressive (many configs,
+    short prefixes) to conservative (few configs, full data).
+    """
+
+    name = 'hyperband'
+
+    def __init__(self, min_fraction: float = 1 / 27, eta: int = 3, **kwargs):
+        super().__init__(**kwargs)
+        if not 0 < min_fraction <= 1:
+            raise ValueError(f"min_fraction must be in (0, 1], got {min_fraction}")
+        if eta < 2:
+            raise ValueError(f"eta must be at least 2, got {eta}")
+        self.min_fraction = min_fraction
+        self.eta = eta
+
+    def brackets(self) -> List[tuple]:
+        """(n_configs, starting fraction) per bracket, most aggressive first."""
+        s_max = int(math.floor(math.log(1 / self.min_fraction, self.eta) + 1e-9))
+        return [
+            (int(math.ceil((s_max + 1) / (s + 1) * self.eta ** s)), self.eta ** -s)
+            for s in range(s_max, -1, -1)
+        ]
+
+    def _search(self, ctx: SearchContext) -> None:
+        for n_configs, fraction in self.brackets():
+            if ctx.exhausted:
+                return
+            configs = [sample_params(ctx.space, ctx.rng) for _ in range(n_configs)]
+            _successive_halving(ctx, configs, fraction, self.eta)
+
+
+class TPESearch(ParameterSearch):
+    """
+    Tree-structured Parzen Estimator (independent per dimension, NumPy only).
+
+    After n_startup random trials, completed trials are split into the best
+    `gamma` share (l) and the rest (g). Numeric dimensions get Gaussian
+    Parzen densities in unit space (plus a uniform prior component);
+    categorical dimensions get smoothed frequencies. Candidates are drawn
+    from l and the ones with the highest log l(x) - log g(x) are evaluated.
+    """
+
+    name = 'tpe'
+
+    def __init__(self, n_trials: int = 100, n_startup: int = 10, gamma: float = 0.25,
+                 n_candidates: int = 24, **kwargs):
+        super().__init__(**kwargs)
+        if n_trials < 1:
+            raise ValueError(f"n_trials must be positive, got {n_trials}")
+        if not 0 < gamma < 1:
+            raise ValueError(f"gamma must be in (0, 1), got {gamma}")
+        self.n_trials = n_trials
+        self.n_startup = max(1, n_startup)
+        self.gamma = gamma
+        self.n_candidates = max(1, n_candidates)
+
+    def _search(self, ctx: SearchContext) -> None:
+        history: List[SearchTrial] = []
+        round_number = 0
+        while len(history) < self.n_trials:
+            size = min(ctx.batch_size, self.n_trials - len(history))
+            if len(history) < self.n_startup:
+                batch = [sample_params(ctx.space, ctx.rng) for _ in range(min(size, self.n_startup - len(history)))]
+            else:
+                batch = self._propose(ctx, history, size)
+            trials = ctx.evaluate(batch, rung=round_number)
+            if not trials:
+                return
+            history.extend(trials)
+            round_number += 1
+
+    def _split(self, history: List[SearchTrial]) -> tuple:
+        ranked = sorted(history, key=lambda trial: -trial.score)
+        n_good = max(1, int(math.ceil(self.gamma * len([t for t in ranked if t.ok]))))
+        return ranked[:n_good], ranked[n_good:]
+
+    def _propose(self, ctx: SearchContext, history: List[SearchTrial], size: int) -> List[Dict[str, Any]]:
+        good, bad = self._split(history)
+        n_candidates = self.n_candidates * size
+        candidates: Dict[str, list] = {}
+        log_ratio = np.zeros(n_candidates)
+
+        for name, dim in ctx.space.items():
+            good_values = [trial.params[name] for trial in good]
+            bad_values = [trial.params[name] for trial in bad]
+            if isinstance(dim, Categorical):
+                samples, ratio = self._categorical(dim, good_values, bad_values, n_candidates, ctx.rng)
+                candidates[name] = [dim.values[i] for i in samples]
+            else:
+                samples, ratio = self._numeric(dim, good_values, bad_values, n_candidates, ctx.rng)
+                candidates[name] = [dim.from_unit(u) for u in samples]
+            log_ratio += ratio
+
+        order = np.argsort(-log_ratio, kind='stable')
+        proposals = []
+        seen = set()
+        for i in order:
+            params = {name: values[i] for name, values in candidates.items()}
+            key = tuple(params.values())
+            if key in seen:
+                continue
+            seen.add(key)
+            proposals.append(params)
+            if len(proposals) == size:
+                break
+        return proposals
+
+    @staticmethod
+    def _categorical(dim: Categorical, good: list, bad: list, n: int, rng: np.random.Generator) -> tuple:
+        k = len(dim.values)
+        good_counts = np.bincount([dim.index(v) for v in good], minlength=k) + 1.0
+        bad_counts = np.bincount([dim.index(v) for v in bad], minlength=k) + 1.0
+        l_prob = good_counts / good_counts.sum()
+        g_prob = bad_counts / bad_counts.sum()
+        samples = rng.choice(k, size=n, p=l_prob)
+        return samples, np.log(l_prob[samples]) - np.log(g_prob[samples])
+
+    @staticmethod
+    def _bandwidths(centers: np.ndarray) -> np.ndarray:
+        """Per-point bandwidth: larger gap to a neighbour (domain edges count), floored at 1/min(100, n+1)."""
+        n = len(centers)
+        order = np.argsort(centers, kind='stable')
+        padded = np.concatenate(([0.0], centers[order], [1.0]))
+        gaps = np.maximum(padded[1:-1] - padded[:-2], padded[2:] - padded[1:-1])
+        bandwidths = np.empty(n)
+        bandwidths[order] = np.clip(gaps, 1.0 / min(100, n + 1), 1.0)
+        return bandwidths
+
+    @classmethod
+    def _parzen_log_density(cls, x: np.ndarray, centers: np.ndarray) -> np.ndarray:
+        """Log density of a Gaussian mixture on [0, 1] plus a uniform prior component."""
+        n = len(centers)
+        if n == 0:
+            return np.zeros_like(x)
+        bandwidths = cls._bandwidths(centers)
+        z = (x[:, None] - centers[None, :]) / bandwidths[None, :]
+        kernels = np.exp(-0.5 * z * z) / (bandwidths[None, :] * math.sqrt(2 * math.pi))
+        density = (kernels.sum(axis=1) + 1.0) / (n + 1)  # Uniform prior on [0, 1] has density 1
+        return np.log(density)
+
+    def _numeric(self, dim: NumericDimension, good: list, bad: list, n: int, rng: np.random.Generator) -> tuple:
+        good_units = np.array([dim.to_unit(v) for v in good], dtype=np.float64)
+        bad_units = np.array([dim.to_unit(v) for v in bad], dtype=np.float64)
+
+        # Sample from l: pick a component (a good point or the prior) and jitter by its bandwidth
+        component = rng.integers(len(good_units) + 1, size=n)
+        from_prior = component == len(good_units)
+        if len(good_units):
+            picked = np.minimum(component, len(good_units) - 1)
+            jitter = rng.normal(0, 1, n) * self._bandwidths(good_units)[picked]
+            samples = np.where(from_prior, rng.random(n), good_units[picked] + jitter)
+        else:
+            samples = rng.random(n)
+        samples = np.clip(samples, 0.0, 1.0)
+
+        ratio = self._parzen_log_density(samples, good_units) - self._parzen_log_density(samples, bad_units)
+        return samples, ratio
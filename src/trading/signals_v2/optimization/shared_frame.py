@@ -0,0 +1,190 @@
+"""
+Shared-Memory DataFrames
+
+Publishes a market-data DataFrame once into a multiprocessing.shared_memory
+block so optimizer workers can attach to it without pickling the frame.
+
+Layout: every column (and the index) is a contiguous NumPy array inside a
+single block, 64-byte aligned. Workers rebuild a DataFrame whose columns are
+read-only views on that block - attaching is O(columns), not O(rows).
+
+Supported dtypes are numeric, bool and datetime64 (tz-aware timestamps are
+stored as int64 nanoseconds plus the timezone). Object/string columns are
+rejected; drop or encode them before publishing.
+"""
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+_ALIGNMENT = 64
+
+
+class UnsupportedFrameError(TypeError):
+    """Frame has a column (or index) that cannot be stored in shared memory."""
+
+
+@dataclass(frozen=True)
+class SharedArraySpec:
+    """Location of one array inside the shared block."""
+    name: Any                 # Column label (None for the index)
+    dtype: str                # NumPy dtype string of the stored array
+    offset: int               # Byte offset within the block
+    length: int
+    tz: Optional[str] = None  # Timezone for tz-aware datetime arrays
+
+
+@dataclass(frozen=True)
+class SharedFrameSpec:
+    """Picklable handle that workers use to attach to a published frame."""
+    shm_name: str
+    rows: int
+    index: SharedArraySpec
+    columns: Tuple[SharedArraySpec, ...]
+    index_kind: str           # 'datetime', 'range' or 'array'
+
+
+def _to_storable(values: Any, label: Any) -> Tuple[np.ndarray, Optional[str]]:
+    """Convert a column or index to a fixed-width NumPy array plus optional timezone."""
+    if isinstance(values.dtype, pd.DatetimeTZDtype):
+        return values.tz_convert('UTC').tz_localize(None).to_numpy('datetime64[ns]').view(np.int64), str(values.dtype.tz)
+
+    array = np.asarray(values)
+    if array.dtype.kind == 'M':
+        return array.astype('datetime64[ns]'), None
+    if array.dtype.kind not in 'biuf':
+        raise UnsupportedFrameError(f"Column {label!r} has unsupported dtype {array.dtype} for shared memory")
+    return np.ascontiguousarray(array), None
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class SharedFrame:
+    """
+    Owner side of a DataFrame published to shared memory.
+
+    Use as a context manager; the block is unlinked on exit. Workers attach
+    with attach_shared_frame(spec).
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, spec: SharedFrameSpec):
+        self._shm = shm
+        self.spec = spec
+
+    @classmethod
+    def publish(cls, df: pd.DataFrame) -> 'SharedFrame':
+        """
+        Copy a DataFrame into a new shared memory block.
+
+        Args:
+            df: Frame with numeric/bool/datetime columns
+
+        Returns:
+            SharedFrame owning the block
+
+        Raises:
+            UnsupportedFrameError: If a column or the index is object/string typed
+        """
+        if isinstance(df.index, pd.RangeIndex):
+            index_kind = 'range'
+            index_array = np.array([df.index.start, df.index.stop, df.index.step], dtype=np.int64)
+            index_tz = None
+        else:
+            index_kind = 'datetime' if isinstance(df.index, pd.DatetimeIndex) else 'array'
+            index_array, index_tz = _to_storable(df.index, 'index')
+
+        arrays: List[Tuple[Any, np.ndarray, Optional[str]]] = [(df.index.name, index_array, index_tz)]
+        for label in df.columns:
+            array, tz = _to_storable(df[label].array if isinstance(df[label].dtype, pd.DatetimeTZDtype)
+                                     else df[label].to_numpy(), label)
+            arrays.append((label, array, tz))
+
+        specs = []
+        offset = 0
+        for label, array, tz in arrays:
+            offset = _aligned(offset)
+            specs.append(SharedArraySpec(label, array.dtype.str, offset, len(array), tz))
+            offset += array.nbytes
+
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        try:
+            for spec, (_, array, _) in zip(specs, arrays):
+                target = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf, offset=spec.offset)
+                target[:] = array
+        except Exception:
+            shm.close()
+            shm.unlink()
+            raise
+
+        return cls(shm, SharedFrameSpec(
+            shm_name=shm.name,
+            rows=len(df),
+            index=specs[0],
+            columns=tuple(specs[1:]),
+            index_kind=index_kind,
+        ))
+
+    def close(self) -> None:
+        """Release and unlink the shared block."""
+        if self._shm is None:
+            return
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        self._shm = None
+
+    def __enter__(self) -> 'SharedFrame':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def _view(shm: shared_memory.SharedMemory, spec: SharedArraySpec) -> np.ndarray:
+    array = np.ndarray((spec.length,), dtype=np.dtype(spec.dtype), buffer=shm.buf, offset=spec.offset)
+    array.flags.writeable = False
+    return array
+
+
+def attach_shared_frame(spec: SharedFrameSpec) -> Tuple[pd.DataFrame, shared_memory.SharedMemory]:
+    """
+    Rebuild a published DataFrame from shared memory without copying column data.
+
+    Columns are read-only views: strategies that modify the input frame in
+    place must copy it first (as SpikeCatchingStrategySignal does).
+
+    Args:
+        spec: Spec from SharedFrame.spec
+
+    Returns:
+        Tuple of (DataFrame, SharedMemory handle). Keep the handle alive for as
+        long as the frame is used and close() it afterwards.
+    """
+    shm = shared_memory.SharedMemory(name=spec.shm_name)
+
+    index_values = _view(shm, spec.index)
+    if spec.index_kind == 'range':
+        start, stop, step = (int(v) for v in index_values)
+        index = pd.RangeIndex(start, stop, step, name=spec.index.name)
+    elif spec.index.tz is not None:
+        index = pd.DatetimeIndex(index_values.view('datetime64[ns]'), name=spec.index.name).tz_localize('UTC')
+        index = index.tz_convert(spec.index.tz)
+    else:
+        index = pd.Index(index_values, name=spec.index.name)
+
+    data = {}
+    for column in spec.columns:
+        values = _view(shm, column)
+        if column.tz is not None:
+            values = pd.DatetimeIndex(values.view('datetime64[ns]')).tz_localize('UTC').tz_convert(column.tz)
+        data[column.name] = values
+
+    df = pd.DataFrame(data, index=index, copy=False)
+    return df, shm
@@ -0,0 +1,488 @@
+"""
+Walk-Forward and Purged Cross-Validation
+
+Out-of-sample evaluation of a StrategySignal plus parameter search:
+
+1. Slice the data into folds:
+   - walk_forward_folds: rolling (fixed-length) or anchored (expanding) train
+     windows, each followed by an embargo gap and a test window
+   - purged_kfold_folds: contiguous test blocks with the embargo purged on
+     both sides from the training data
+2. For every fold, run the parameter search on the training rows only and
+   backtest the winning parameters on the unseen test rows. With `warmup`,
+   the rows right before the test window are prepended so rolling features
+   start warm; trades inside the warm-up are dropped before scoring
+3. Stitch the test-window trades into one out-of-sample PerformanceMetrics
+   and report how stable the chosen parameters are across folds
+
+Sizes and embargo are given either in rows (int) or as time spans
+(pd.Timedelta / '6h' strings, requires a DatetimeIndex).
+
+Purged folds train on two blocks around the test window. Each block is
+backtested separately and the results stitched, so rolling features never
+span the purge gap.
+
+Folds run in parallel through ParallelParameterOptimizer: the frame is
+published to shared memory once and each worker receives only a fold
+description. Each fold's inner search runs serially inside its worker.
+"""
+
+import asyncio
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from trading.signals_v2.entities import PerformanceMetrics
+from trading.signals_v2.optimization.parallel import ParallelParameterOptimizer, StrategyEvaluator
+from trading.signals_v2.optimization.search import ParameterSearch, SearchSpace, default_score
+from trading.signals_v2.strategy_signal import StrategySignal
+
+Span = Union[int, str, pd.Timedelta]
+
+# ============================================================================
+# Fold Generation
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class Fold:
+    """Train/test split as half-open positional (iloc) ranges."""
+    fold_id: int
+    train: Tuple[Tuple[int, int], ...]
+    test: Tuple[int, int]
+
+    @property
+    def train_rows(self) -> int:
+        return sum(end - start for start, end in self.train)
+
+    @property
+    def test_rows(self) -> int:
+        return self.test[1] - self.test[0]
+
+    @property
+    def train_block_rows(self) -> Tuple[int, ...]:
+        return tuple(end - start for start, end in self.train)
+
+    def train_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Training rows (purged folds concatenate the blocks; see train_block_rows for the boundaries)."""
+        if len(self.train) == 1:
+            start, end = self.train[0]
+            return df.iloc[start:end]
+        return pd.concat([df.iloc[start:end] for start, end in self.train])
+
+    def test_frame(self, df: pd.DataFrame, warmup_start: Optional[int] = None) -> pd.DataFrame:
+        """Test rows, optionally preceded by the rows from `warmup_start` (iloc position)."""
+        start = self.test[0] if warmup_start is None else min(warmup_start, self.test[0])
+        return df.iloc[start:self.test[1]]
+
+
+def _coordinates(index: pd.Index, spans: Sequence[Optional[Span]]) -> Tuple[np.ndarray, List[Optional[int]], int]:
+    """
+    Map the index and spans to a common integer axis (row numbers or epoch nanoseconds).
+
+    Returns:
+        Tuple of (coordinates, converted spans, end coordinate exclusive)
+    """
+    given = [span for span in spans
+             if span is not None and not (isinstance(span, (int, np.integer)) and span == 0)]
+    if all(isinstance(span, (int, np.integer)) for span in given):
+        return np.arange(len(index)), [None if s is None else int(s) for s in spans], len(index)
+
+    if not isinstance(index, pd.DatetimeIndex):
+        raise ValueError("Time-based fold sizes require a DatetimeIndex")
+    if any(isinstance(span, (int, np.integer)) for span in given):
+        raise ValueError("Fold sizes must be all row counts or all time spans")
+    coords = index.asi8
+    converted = [None if s is None else int(pd.Timedelta(s).value) for s in spans]
+    # The data covers the last bar's full interval, e.g. 24 one-minute bars span exactly 24 minutes
+    bar = int(np.median(np.diff(coords))) if len(coords) > 1 else 1
+    return coords, converted, int(coords[-1]) + max(bar, 1)
+
+
+def walk_forward_folds(index: pd.Index,
+                       train_size: Span,
+                       test_size: Span,
+                       step: Optional[Span] = None,
+                       embargo: Span = 0,
+                       anchored: bool = False) -> List[Fold]:
+    """
+    Build walk-forward folds.
+
+    Args:
+        index: Index of the data (sorted ascending)
+        train_size: Training window (initial window when anchored)
+        test_size: Test window
+        step: Shift between folds (defaults to test_size, i.e. adjacent test windows)
+        embargo: Gap between the end of training and the start of testing
+        anchored: Expanding training windows starting at the first row
+
+    Returns:
+        Folds with complete test windows, in time order
+    """
+    if not len(index):
+        return []
+    coords, (train, test, step, embargo), end = _coordinates(index, [train_size, test_size, step, embargo])
+    step = step if step is not None else test
+    if train <= 0 or test <= 0 or step <= 0 or embargo < 0:
+        raise ValueError("train_size, test_size and step must be positive and embargo non-negative")
+
+    origin = int(coords[0])
+    folds = []
+    k = 0
+    while True:
+        test_start = origin + train + embargo + k * step
+        test_end = test_start + test
+        if test_end > end:
+            break
+        train_start = origin if anchored else origin + k * step
+        train_end = test_start - embargo
+
+        positions = np.searchsorted(coords, [train_start, train_end, test_start, test_end], side='left')
+        tr_start, tr_end, te_start, te_end = (int(p) for p in positions)
+        if tr_end > tr_start and te_end > te_start:
+            folds.append(Fold(len(folds), ((tr_start, tr_end),), (te_start, te_end)))
+        k += 1
+    return folds
+
+
+def purged_kfold_folds(index: pd.Index, n_splits: int = 5, embargo: Span = 0) -> List[Fold]:
+    """
+    Build purged k-fold splits: contiguous test blocks, training on everything
+    else except `embargo` on each side of the test block.
+
+    Args:
+        index: Index of the data (sorted ascending)
+        n_splits: Number of test blocks
+        embargo: Rows or time span purged before and after each test block
+
+    Returns:
+        One fold per test block
+    """
+    if n_splits < 2:
+        raise ValueError(f"n_splits must be at least 2, got {n_splits}")
+    n = len(index)
+    coords, (embargo,), _ = _coordinates(index, [embargo])
+    if embargo < 0:
+        raise ValueError("embargo must be non-negative")
+
+    folds = []
+    for block in np.array_split(np.arange(n), n_splits):
+        if not len(block):
+            continue
+        te_start, te_end = int(block[0]), int(block[-1]) + 1
+        before_end = int(np.searchsorted(coords, coords[te_start] - embargo, side='left')) if embargo else te_start
+        after_start = int(np.searchsorted(coords, coords[te_end - 1] + embargo, side='right')) if embargo else te_end
+        train = tuple((s, e) for s, e in ((0, before_end), (after_start, n)) if e > s)
+        if train:
+            folds.append(Fold(len(folds), train, (te_start, te_end)))
+    return folds
+
+
+# ============================================================================
+# Results
+# ============================================================================
+
+
+@dataclass
+class FoldResult:
+    """Optimization and out-of-sample outcome for one fold."""
+    fold: Fold
+    best_params: Optional[Dict[str, Any]] = None
+    train_score: float = -math.inf
+    test_score: float = -math.inf
+    test_metrics: Optional[PerformanceMetrics] = None
+    evaluations: int = 0
+    train_period: Tuple[Any, Any] = (None, None)
+    test_period: Tuple[Any, Any] = (None, None)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.test_metrics is not None
+
+
+def stitch_performance(metrics: Sequence[PerformanceMetrics], initial_capital_usd: float) -> PerformanceMetrics:
+    """
+    Combine consecutive out-of-sample results into one PerformanceMetrics.
+
+    Follows PositionEntry.get_performance_metrics: P&L relative to initial
+    capital, win rate over trades, drawdown on cumulative trade P&L and a
+    per-trade Sharpe ratio with the same volatility floor and cap.
+
+    Args:
+        metrics: Per-fold test metrics in time order
+        initial_capital_usd: Capital the percentages refer to
+
+    Returns:
+        Stitched PerformanceMetrics
+    """
+    trades = [trade for m in metrics for trade in m.trades]
+    total_pnl = sum(m.total_pnl_usd for m in metrics)
+    if not trades:
+        return PerformanceMetrics(total_pnl_usd=total_pnl, total_pnl_pct=total_pnl / initial_capital_usd * 100)
+
+    win_rate = sum(1 for t in trades if t.pnl_usdt > 0) / len(trades) * 100
+
+    cumulative = np.cumsum([t.pnl_usdt for t in trades])
+    peaks = np.maximum.accumulate(np.maximum(cumulative, 0))
+    drawdowns = np.where(peaks > 0, peaks - cumulative, np.maximum(-cumulative, 0))
+    max_drawdown = float(drawdowns.max() / initial_capital_usd * 100)
+
+    sharpe_ratio = 0.0
+    if len(trades) > 1 and total_pnl != 0:
+        returns = np.array([t.pnl_usdt / initial_capital_usd for t in trades])
+        std_return = max(float(np.std(returns, ddof=1)), 0.001)
+        sharpe_ratio = max(-5.0, min(5.0, float(np.mean(returns)) / std_return))
+
+    delays = np.diff([t.timestamp.timestamp() for t in trades]) / 60 if len(trades) > 1 else np.array([0.0])
+
+    return PerformanceMetrics(
+        total_pnl_usd=total_pnl,
+        total_pnl_pct=total_pnl / initial_capital_usd * 100,
+        win_rate=win_rate,
+        avg_trade_pnl=total_pnl / len(trades),
+        max_drawdown=max_drawdown,
+        sharpe_ratio=sharpe_ratio,
+        trades=trades,
+        trade_freq=float(np.mean(delays)),
+    )
+
+
+def parameter_stability(fold_params: Sequence[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Summarize how consistently each parameter was chosen across folds.
+
+    Returns:
+        Per parameter: 'mode', 'mode_share' (fraction of folds choosing it) and,
+        for numeric parameters, 'mean', 'std' and 'cv' (std / |mean|)
+    """
+    stability: Dict[str, Dict[str, Any]] = {}
+    names = sorted({name for params in fold_params for name in params})
+    for name in names:
+        values = [params[name] for params in fold_params if name in params]
+        mode, count = Counter(values).most_common(1)[0]
+        stats: Dict[str, Any] = {'mode': mode, 'mode_share': count / len(values)}
+        if all(isinstance(v, (int, float, np.number)) and not isinstance(v, bool) for v in values):
+            array = np.asarray(values, dtype=np.float64)
+            mean = float(array.mean())
+            std = float(array.std())
+            stats.update(mean=mean, std=std, cv=std / abs(mean) if mean else math.inf if std else 0.0)
+        stability[name] = stats
+    return stability
+
+
+@dataclass
+class WalkForwardReport:
+    """Stitched out-of-sample results of a walk-forward run."""
+    folds: List[FoldResult]
+    oos_metrics: PerformanceMetrics
+    stability: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def successful_folds(self) -> List[FoldResult]:
+        return [fold for fold in self.folds if fold.ok]
+
+    @property
+    def walk_forward_efficiency(self) -> float:
+        """Mean test score / mean train score (1.0 = no degradation out of sample)."""
+        folds = [f for f in self.successful_folds if math.isfinite(f.train_score) and math.isfinite(f.test_score)]
+        if not folds:
+            return math.nan
+        train = float(np.mean([f.train_score for f in folds]))
+        return float(np.mean([f.test_score for f in folds])) / train if train else math.nan
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """One row per fold with periods, chosen params and scores."""
+        rows = []
+        for result in self.folds:
+            row = {
+                'fold': result.fold.fold_id,
+                'train_start': result.train_period[0],
+                'train_end': result.train_period[1],
+                'test_start': result.test_period[0],
+                'test_end': result.test_period[1],
+                'train_score': result.train_score,
+                'test_score': result.test_score,
+                'test_pnl_pct': result.test_metrics.total_pnl_pct if result.test_metrics else math.nan,
+                'test_trades': result.test_metrics.total_trades if result.test_metrics else 0,
+                'evaluations': result.evaluations,
+                'error': result.error,
+            }
+            row.update(result.best_params or {})
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+
+# ============================================================================
+# Harness
+# ============================================================================
+
+
+def _drop_warmup(metrics: PerformanceMetrics, test_start: Any, initial_capital_usd: float) -> PerformanceMetrics:
+    """Recompute metrics from the trades at or after the start of the test window."""
+    start = pd.Timestamp(test_start)
+    trades = [trade for trade in metrics.trades if pd.Timestamp(trade.timestamp) >= start]
+    if len(trades) == len(metrics.trades):
+        return metrics
+    test_only = PerformanceMetrics(total_pnl_usd=sum(trade.pnl_usdt for trade in trades), trades=trades)
+    return stitch_performance([test_only], initial_capital_usd)
+
+
+class _BlockwiseEvaluator:
+    """
+    Backtest each training block separately and stitch the results.
+
+    Purged folds train on the rows before and after the test window; running
+    one backtest over their concatenation would let rolling features span the
+    purge gap. Row prefixes (successive halving rungs) cut the blocks in order.
+    """
+
+    def __init__(self, strategy_factory: Callable[..., StrategySignal], block_rows: Sequence[int],
+                 initial_capital_usd: float):
+        self.strategy_factory = strategy_factory
+        self.block_rows = tuple(block_rows)
+        self.initial_capital_usd = initial_capital_usd
+
+    def __call__(self, df: pd.DataFrame, params: Dict[str, Any]) -> PerformanceMetrics:
+        metrics = []
+        start = 0
+        for rows in self.block_rows:
+            end = min(start + rows, len(df))
+            if end > start:
+                metrics.append(self.strategy_factory(**params).backtest(df.iloc[start:end]))
+            start += rows
+        if len(metrics) == 1:
+            return metrics[0]
+        return stitch_performance(metrics, self.initial_capital_usd)
+
+
+class _FoldEvaluator:
+    """Picklable per-fold job: search on the train rows, backtest the winner on the test rows."""
+
+    def __init__(self, strategy_factory: Callable[..., StrategySignal], search: ParameterSearch,
+                 space: SearchSpace, score_fn: Callable[[Any], float],
+                 initial_capital_usd: float = 1000.0, warmup: Span = 0):
+        self.strategy_factory = strategy_factory
+        self.search = search
+        self.space = space
+        self.score_fn = score_fn
+        self.initial_capital_usd = initial_capital_usd
+        self.warmup = warmup
+
+    def _warmup_start(self, index: pd.Index, test_start: int) -> Optional[int]:
+        """iloc position where the warm-up before the test window begins (None without warm-up)."""
+        coords, (warmup,), _ = _coordinates(index, [self.warmup])
+        if not warmup:
+            return None
+        if warmup < 0:
+            raise ValueError("warmup must be non-negative")
+        if isinstance(self.warmup, (int, np.integer)):
+            return max(test_start - warmup, 0)
+        return int(np.searchsorted(coords, coords[test_start] - warmup, side='left'))
+
+    def __call__(self, df: pd.DataFrame, params: Dict[str, Any]) -> FoldResult:
+        fold: Fold = params['fold']
+        train_df = fold.train_frame(df)
+        warmup_start = self._warmup_start(df.index, fold.test[0])
+        test_df = fold.test_frame(df, warmup_start)
+        test_start = df.index[fold.test[0]]
+        result = FoldResult(
+            fold=fold,
+            train_period=(train_df.index[0], train_df.index[-1]),
+            test_period=(test_start, test_df.index[-1]),
+        )
+
+        if len(fold.train) > 1:
+            evaluator = _BlockwiseEvaluator(self.strategy_factory, fold.train_block_rows, self.initial_capital_usd)
+        else:
+            evaluator = StrategyEvaluator(self.strategy_factory)
+        inner = ParallelParameterOptimizer(evaluator, max_workers=1)
+        search_result = self.search.run(inner, train_df, self.space, self.score_fn)
+        result.evaluations = search_result.evaluations
+        if search_result.best_params is None:
+            result.error = 'No successful parameter sets on training data'
+            return result
+
+        result.best_params = search_result.best_params
+        result.train_score = search_result.best_score
+        test_metrics = self.strategy_factory(**search_result.best_params).backtest(test_df)
+        if warmup_start is not None:
+            test_metrics = _drop_warmup(test_metrics, test_start, self.initial_capital_usd)
+        result.test_metrics = test_metrics
+        result.test_score = float(self.score_fn(result.test_metrics))
+        return result
+
+
+class WalkForwardHarness:
+    """
+    Walk-forward / purged cross-validation for a StrategySignal and a ParameterSearch.
+
+    Usage:
+        harness = WalkForwardHarness(partial(SpikeCatchingStrategySignal, symbol=symbol, ...),
+                                     TPESearch(n_trials=60, seed=1), space)
+        folds = walk_forward_folds(df.index, '24h', '6h', embargo='30min')
+        report = harness.run(df, folds)
+    """
+
+    def __init__(self,
+                 strategy_factory: Callable[..., StrategySignal],
+                 search: ParameterSearch,
+                 space: SearchSpace,
+                 score_fn: Callable[[Any], float] = default_score,
+                 initial_capital_usd: float = 1000.0,
+                 max_workers: Optional[int] = None,
+                 warmup: Span = 0):
+        """
+        Initialize walk-forward harness.
+
+        Args:
+            strategy_factory: Picklable callable returning a strategy for keyword params
+            search: Search strategy run independently on every training window
+            space: Parameter search space
+            score_fn: Objective (higher is better) for search and test scoring
+            initial_capital_usd: Capital for the stitched out-of-sample percentages
+            max_workers: Processes running folds (None = all cores, 1 = serial)
+            warmup: Rows or time span before each test window fed to the test
+                backtest for indicator warm-up; its trades are not scored
+                (requires trade timestamps comparable to the index)
+        """
+        self.evaluator = _FoldEvaluator(strategy_factory, search, space, score_fn, initial_capital_usd, warmup)
+        self.initial_capital_usd = initial_capital_usd
+        self.max_workers = max_workers
+
+    def run(self, df: pd.DataFrame, folds: Sequence[Fold]) -> WalkForwardReport:
+        """
+        Optimize and test every fold, then stitch the out-of-sample results.
+
+        Args:
+            df: Market data (local DB extract or Parquet cache)
+            folds: Folds from walk_forward_folds() or purged_kfold_folds()
+
+        Returns:
+            WalkForwardReport
+        """
+        optimizer = ParallelParameterOptimizer(self.evaluator, max_workers=self.max_workers)
+        evaluations = optimizer.evaluate(df, [{'fold': fold} for fold in folds])
+
+        results = []
+        for evaluation in evaluations:
+            if evaluation.ok:
+                results.append(evaluation.result)
+            else:
+                results.append(FoldResult(fold=evaluation.params['fold'], error=evaluation.error))
+
+        successful = [result for result in results if result.ok]
+        return WalkForwardReport(
+            folds=results,
+            oos_metrics=stitch_performance([r.test_metrics for r in successful], self.initial_capital_usd),
+            stability=parameter_stability([r.best_params for r in successful]),
+        )
+
+    async def run_async(self, df: pd.DataFrame, folds: Sequence[Fold]) -> WalkForwardReport:
+        """run() without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.run, df, folds)
@@ -0,0 +1,257 @@
+"""
+Vectorized Position Simulation
+
+Shared state machine for signal backtests that hold at most one position at
+a time. Instead of visiting every row with df.iterrows(), the simulation
+jumps between candidate rows:
+
+- Entry/exit conditions are boolean arrays whose True positions are
+  precomputed once (SignalIndex); finding the next entry or exit is a
+  binary search
+- Time limits (min/max hold) are binary searches on the timestamps
+- Conditions that depend on the entry (limit fills relative to a setup
+  price, take profit / stop loss) are callables evaluated on row slices with
+  scan_first(), so each row is still touched at most once
+
+The Python loop therefore runs once per trade, not once per row. Strategies
+build their TradeEntry objects only for the returned entry/exit rows.
+
+Semantics (matching the row loops this replaces):
+- A position opens on the first evaluated entry row after the previous exit
+  row (never on the exit row itself)
+- It closes on the first evaluated row after the entry (or on the entry row
+  with exit_on_entry_row=True) where the minimum hold has elapsed and either
+  the exit condition or the maximum hold is met
+- Rows excluded by `evaluate` are skipped entirely (no entries, no exits)
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from exchanges.structs import Side
+
+# Entry finder: (first row to search) -> entry row or -1
+EntryFinder = Callable[[int], int]
+# Exit finder: (entry row, first row to search) -> exit row or -1
+ExitFinder = Callable[[int, int], int]
+HoldSpan = Union[int, pd.Timedelta]
+
+
+class SignalIndex:
+    """Positions of True values in a boolean array with O(log n) next-row lookups."""
+
+    def __init__(self, mask: np.ndarray):
+        self.rows = np.flatnonzero(np.asarray(mask, dtype=bool))
+
+    def next(self, start: int) -> int:
+        """First True row at or after `start` (-1 if none)."""
+        k = int(np.searchsorted(self.rows, start, side='left'))
+        return int(self.rows[k]) if k < len(self.rows) else -1
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+def scan_first(condition: Callable[[int, int], np.ndarray], start: int, stop: int, chunk: int = 256) -> int:
+    """
+    First row in [start, stop) where a path-dependent condition holds.
+
+    The condition is evaluated on growing slices (chunk, 2*chunk, ...), so
+    finding a row k rows ahead costs O(k) vectorized work.
+
+    Args:
+        condition: (a, b) -> boolean array for rows a..b-1
+        start: First row to test
+        stop: End of the searchable range (exclusive)
+        chunk: Initial slice length
+
+    Returns:
+        Matching row or -1
+    """
+    a = start
+    while a < stop:
+        b = min(a + chunk, stop)
+        hits = np.flatnonzero(condition(a, b))
+        if len(hits):
+            return a + int(hits[0])
+        a = b
+        chunk *= 2
+    return -1
+
+
+def _first_at_or_after(times: np.ndarray, value: int, strict: bool = False) -> int:
+    return int(np.searchsorted(times, value, side='right' if strict else 'left'))
+
+
+@dataclass
+class PositionSimulation:
+    """Entry/exit rows of a one-position-at-a-time simulation."""
+    n_rows: int
+    entry_rows: np.ndarray           # Row positions of entries
+    exit_rows: np.ndarray            # Row positions of exits (-1 = still open at the end)
+
+    @property
+    def closed(self) -> np.ndarray:
+        """Mask of trades that were closed within the data."""
+        return self.exit_rows >= 0
+
+    @property
+    def position(self) -> np.ndarray:
+        """Per-row holding flag (1 from the entry row through the exit row)."""
+        delta = np.zeros(self.n_rows + 1, dtype=np.int64)
+        np.add.at(delta, self.entry_rows, 1)
+        ends = np.where(self.exit_rows >= 0, self.exit_rows + 1, self.n_rows)
+        np.add.at(delta, ends, -1)
+        return np.cumsum(delta[:-1]).astype(np.int8)
+
+    def equity_curve(self, trade_pnl: np.ndarray, initial_capital: float = 0.0) -> np.ndarray:
+        """
+        Realized equity per row, booking each closed trade's P&L on its exit row.
+
+        Args:
+            trade_pnl: P&L per trade (same order as entry_rows)
+            initial_capital: Starting equity
+        """
+        realized = np.zeros(self.n_rows, dtype=np.float64)
+        closed = self.closed
+        np.add.at(realized, self.exit_rows[closed], np.asarray(trade_pnl, dtype=np.float64)[closed])
+        return initial_capital + np.cumsum(realized)
+
+
+def simulate_positions(entries: Union[np.ndarray, EntryFinder],
+                       exits: Union[np.ndarray, ExitFinder, None] = None,
+                       timestamps: Optional[pd.DatetimeIndex] = None,
+                       *,
+                       n_rows: Optional[int] = None,
+                       evaluate: Optional[np.ndarray] = None,
+                       min_hold: Optional[HoldSpan] = None,
+                       max_hold: Optional[HoldSpan] = None,
+                       strict_max_hold: bool = False,
+                       exit_on_entry_row: bool = False,
+                       max_entries_per_day: Optional[int] = None) -> PositionSimulation:
+    """
+    Simulate one position at a time from entry/exit conditions.
+
+    Args:
+        entries: Boolean entry array, or finder (start_row) -> entry row / -1
+        exits: Boolean exit array, finder (entry_row, start_row) -> exit row / -1,
+            or None for time-based exits only
+        timestamps: Row timestamps (hold spans are then Timedeltas; without
+            timestamps they are row counts)
+        n_rows: Number of rows (required when no array argument gives it)
+        evaluate: Rows where entries and exits may happen (None = all rows)
+        min_hold: Minimum hold before any exit
+        max_hold: Hold after which the position is closed on the next evaluated row
+        strict_max_hold: Close only once the hold exceeds max_hold (default: reaches it)
+        exit_on_entry_row: Allow the exit check on the entry row itself
+        max_entries_per_day: Entry limit per calendar day (requires timestamps)
+
+    Returns:
+        PositionSimulation with entry and exit rows
+    """
+    if n_rows is None:
+        for candidate in (entries, exits, evaluate, timestamps):
+            if candidate is not None and not callable(candidate):
+                n_rows = len(candidate)
+                break
+        else:
+            raise ValueError("n_rows is required when entries and exits are both callables")
+    if max_entries_per_day is not None and timestamps is None:
+        raise ValueError("max_entries_per_day requires timestamps")
+
+    valid = np.ones(n_rows, dtype=bool) if evaluate is None else np.asarray(evaluate, dtype=bool)
+    evaluated = SignalIndex(valid)
+
+    if callable(entries):
+        find_entry = entries
+    else:
+        entry_index = SignalIndex(np.asarray(entries, dtype=bool) & valid)
+        find_entry = entry_index.next
+
+    exit_index = None
+    if exits is not None and not callable(exits):
+        exit_index = SignalIndex(np.asarray(exits, dtype=bool) & valid)
+
+    if timestamps is not None:
+        times = timestamps.asi8
+        to_units = lambda span: int(pd.Timedelta(span).value)
+        days = timestamps.normalize().asi8 if max_entries_per_day is not None else None
+    else:
+        times = np.arange(n_rows, dtype=np.int64)
+        to_units = int
+        days = None
+    min_units = to_units(min_hold) if min_hold is not None else None
+    max_units = to_units(max_hold) if max_hold is not None else None
+
+    entry_rows = []
+    exit_rows = []
+    day_key, day_count = None, 0
+    start = 0
+    while start < n_rows:
+        entry = find_entry(start)
+        if entry < 0 or entry >= n_rows:
+            break
+
+        if days is not None:
+            if days[entry] != day_key:
+                day_key, day_count = days[entry], 0
+            if day_count >= max_entries_per_day:
+                # Skip to the first row of the next calendar day
+                start = _first_at_or_after(days, day_key, strict=True)
+                continue
+            day_count += 1
+
+        earliest = entry if exit_on_entry_row else entry + 1
+        if min_units is not None:
+            earliest = max(earliest, _first_at_or_after(times, times[entry] + min_units))
+
+        candidates = []
+        if exit_index is not None:
+            candidates.append(exit_index.next(earliest))
+        elif callable(exits):
+            candidates.append(exits(entry, earliest) if earliest < n_rows else -1)
+        if max_units is not None:
+            limit = max(earliest, _first_at_or_after(times, times[entry] + max_units, strict=strict_max_hold))
+            candidates.append(evaluated.next(limit))
+        candidates = [row for row in candidates if 0 <= row < n_rows]
+        exit_row = min(candidates) if candidates else -1
+
+        entry_rows.append(entry)
+        exit_rows.append(exit_row)
+        if exit_row < 0:
+            break
+        start = exit_row + 1
+
+    return PositionSimulation(
+        n_rows=n_rows,
+        entry_rows=np.asarray(entry_rows, dtype=np.int64),
+        exit_rows=np.asarray(exit_rows, dtype=np.int64),
+    )
+
+
+def leg_net_values(side: Side, price: np.ndarray, qty: np.ndarray, fee_pct: float,
+                   slippage_pct: float) -> np.ndarray:
+    """
+    Vectorized TradeEntry.net_value: signed cash flow after slippage and fees.
+
+    Args:
+        side: BUY (cash outflow) or SELL (cash inflow)
+        price: Quoted prices
+        qty: Quantities
+        fee_pct: Trading fee in percent
+        slippage_pct: Slippage in percent
+
+    Returns:
+        Net cash flow per element
+    """
+    slippage_factor = 1 + (slippage_pct / 100.0)
+    price = np.asarray(price, dtype=np.float64)
+    qty = np.asarray(qty, dtype=np.float64)
+    if side == Side.BUY:
+        effective = price * slippage_factor
+        return -(effective * qty + effective * qty * fee_pct / 100.0)
+    effective = price / slippage_factor
+    return effective * qty - effective * qty * fee_pct / 100.0
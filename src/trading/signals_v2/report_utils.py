@@ -154,6 +154,6 @@ def generate_generic_report(items: Dict[str, Any], title: Optional[str] = None,
         if isinstance(value, float):
             value = f"{value:.2f}"
 
-        lines.append(f"{" "*offset}{key:>10} {value}")
+        lines.append(f"{' ' * offset}{key:>10} {value}")
 
     return "\n".join(lines)
\ No newline at end of file
@@ -3,6 +3,7 @@ Modern Vectorized Strategy Backtester
 
 """
 import asyncio
+import functools
 import pandas as pd
 import time
 from datetime import datetime
@@ -19,6 +20,10 @@ from trading.signals_v2.implementation.mexc_gateio_futures_arbitrage_signal impo
 from trading.signals_v2.implementation.cross_exchange_parity_signal import CrossExchangeParitySignal
 from trading.signals_v2.entities import BacktestingParams, PerformanceMetrics
 from trading.signals_v2.strategy_signal import StrategySignal
+from trading.signals_v2.optimization import (BacktestResultStore, GridSearch, ParallelParameterOptimizer,
+                                             ParameterEvaluation, ParameterSearch, SearchSpace, StrategyEvaluator,
+                                             WalkForwardHarness, parameter_grid, walk_forward_folds)
+from trading.data_sources.parquet_cache import ParquetCachedSource
 from trading.data_sources.book_ticker.book_ticker_source import (BookTickerDbSource, CandlesBookTickerSource,
                                                                  BookTickerSourceProtocol)
 
@@ -33,6 +38,32 @@ TRADING_FEES = {
     ExchangeEnum.GATEIO_FUTURES: Fees(taker_fee=0.05, maker_fee=0.05),
 }
 
+# Spike catching parameter grid based on debug analysis findings
+SPIKE_PARAM_GRID = {
+    'spike_offset_multiplier': [2.0, 3.0, 4.0, 5.0, 6.0],  # Handle high volatility
+    'stabilization_threshold': [1.0, 1.5, 2.0, 2.5, 3.0],  # Exit condition sensitivity
+    'max_position_time_minutes': [10, 15, 20, 25, 30]       # Position holding time
+}
+
+
+def _composite_score(performance: PerformanceMetrics) -> float:
+    """Optimization score: prioritize profitable trades with good win rate."""
+    if performance.total_trades == 0:
+        return -1000  # Penalty for no trades
+
+    # Score combines profitability, win rate, and risk-adjusted returns
+    profit_score = performance.total_pnl_pct
+    win_rate_score = performance.win_rate
+    risk_adjusted_score = performance.sharpe_ratio * 10  # Scale Sharpe ratio
+
+    # Composite score with weights
+    return (
+        profit_score * 0.4 +           # 40% weight on profitability
+        win_rate_score * 0.3 +         # 30% weight on win rate
+        risk_adjusted_score * 0.2 +    # 20% weight on risk-adjusted returns
+        performance.total_trades * 0.1  # 10% weight on trade frequency
+    )
+
 
 class SignalBacktester:
     """
@@ -43,13 +74,18 @@ class SignalBacktester:
                  initial_capital_usdt: float = 1000.0,
                  position_size_usdt: float = 100.0,
                  candles_timeframe=KlineInterval.MINUTE_1,
-                 snapshot_seconds: int = 60):
+                 snapshot_seconds: int = 60,
+                 cache_dir: Optional[str] = None,
+                 result_store: Optional[Union[str, BacktestResultStore]] = None):
         """
         Initialize vectorized backtester using strategy signal architecture.
         
         Args:
             initial_capital_usdt: Starting capital
             position_size_usdt: Default position size
+            cache_dir: Optional Parquet cache directory for loaded market data (requires pyarrow)
+            result_store: Optional BacktestResultStore (or SQLite path); grid optimization only
+                evaluates parameter sets without a stored run for the same data and strategy version
         """
         self.initial_capital_usdt = initial_capital_usdt
         self.position_size_usdt = position_size_usdt
@@ -57,6 +93,12 @@ class SignalBacktester:
         self.data_source: Dict[BacktestDataSource, BookTickerSourceProtocol] = {'candles_book_ticker': CandlesBookTickerSource(),
                                                                                 'snapshot_book_ticker': BookTickerDbSource(),
                                                                                 'candles': CandlesLoader()}
+        if cache_dir is not None:
+            self.data_source = {name: ParquetCachedSource(source, cache_dir)
+                                for name, source in self.data_source.items()}
+        if isinstance(result_store, str):
+            result_store = BacktestResultStore(result_store)
+        self.result_store = result_store
         self.candles_timeframe = candles_timeframe
         self.snapshot_seconds = snapshot_seconds
 
@@ -85,10 +127,18 @@ class SignalBacktester:
                                           symbol: Symbol,
                                           data_source: BacktestDataSource,
                                           hours: int = 24,
-                                          end_date: Optional[datetime] = None) -> Dict:
+                                          end_date: Optional[datetime] = None,
+                                          max_workers: Optional[int] = None,
+                                          search: Optional[ParameterSearch] = None,
+                                          param_space: Optional[SearchSpace] = None) -> Dict:
         """
-        Systematic parameter optimization using grid search.
-        
+        Systematic parameter optimization using grid search (or a pluggable search strategy).
+
+        Args:
+            max_workers: Worker processes for the grid search (None = all cores, 1 = serial)
+            search: Optional search strategy (RandomSearch, Hyperband, TPESearch, ...) replacing the grid
+            param_space: Search space for `search` (defaults to the grid values as categoricals)
+
         Returns:
             Dict containing best parameters and optimization results
         """
@@ -112,11 +162,7 @@ class SignalBacktester:
         print(f"📊 Data split: {len(train_df)} training rows, {len(validation_df)} validation rows")
 
         # Parameter grid based on debug analysis findings
-        param_grid = {
-            'spike_offset_multiplier': [2.0, 3.0, 4.0, 5.0, 6.0],  # Handle high volatility
-            'stabilization_threshold': [1.0, 1.5, 2.0, 2.5, 3.0],  # Exit condition sensitivity
-            'max_position_time_minutes': [10, 15, 20, 25, 30]       # Position holding time
-        }
+        param_grid = SPIKE_PARAM_GRID
         
         print(f"🎯 Testing {len(param_grid['spike_offset_multiplier']) * len(param_grid['stabilization_threshold']) * len(param_grid['max_position_time_minutes'])} parameter combinations")
 
@@ -134,75 +180,68 @@ class SignalBacktester:
         best_score = float('-inf')
         optimization_results = []
 
-        # Grid search with progress tracking
-        total_combinations = len(param_grid['spike_offset_multiplier']) * len(param_grid['stabilization_threshold']) * len(param_grid['max_position_time_minutes'])
-        current_combination = 0
-
-        for spike_offset in param_grid['spike_offset_multiplier']:
-            for stabilization_threshold in param_grid['stabilization_threshold']:
-                for max_position_time in param_grid['max_position_time_minutes']:
-                    current_combination += 1
-                    
-                    # Create strategy with current parameters
-                    strategy = SpikeCatchingStrategySignal(
-                        symbol=symbol,
-                        spike_offset_multiplier=spike_offset,
-                        stabilization_threshold=stabilization_threshold,
-                        max_position_time_minutes=max_position_time,
-                        backtesting_params=backtesting_params,
-                        fees=TRADING_FEES
-                    )
-
-                    try:
-                        # Test on training data
-                        train_performance = await self.run_single_backtest(strategy, train_df)
-                        
-                        # Calculate composite score (prioritize profitable trades with good win rate)
-                        if train_performance.total_trades > 0:
-                            # Score combines profitability, win rate, and risk-adjusted returns
-                            profit_score = train_performance.total_pnl_pct
-                            win_rate_score = train_performance.win_rate
-                            risk_adjusted_score = train_performance.sharpe_ratio * 10  # Scale Sharpe ratio
-                            
-                            # Composite score with weights
-                            composite_score = (
-                                profit_score * 0.4 +           # 40% weight on profitability
-                                win_rate_score * 0.3 +         # 30% weight on win rate
-                                risk_adjusted_score * 0.2 +    # 20% weight on risk-adjusted returns
-                                train_performance.total_trades * 0.1  # 10% weight on trade frequency
-                            )
-                        else:
-                            composite_score = -1000  # Penalty for no trades
-                        
-                        # Track results
-                        result = {
-                            'spike_offset_multiplier': spike_offset,
-                            'stabilization_threshold': stabilization_threshold,
-                            'max_position_time_minutes': max_position_time,
-                            'total_trades': train_performance.total_trades,
-                            'total_pnl_pct': train_performance.total_pnl_pct,
-                            'win_rate': train_performance.win_rate,
-                            'sharpe_ratio': train_performance.sharpe_ratio,
-                            'composite_score': composite_score
-                        }
-                        
-                        optimization_results.append(result)
-                        
-                        # Update best parameters
-                        if composite_score > best_score:
-                            best_score = composite_score
-                            best_params = result.copy()
-                        
-                        # Progress update
-                        if current_combination % 5 == 0 or current_combination == total_combinations:
-                            print(f"⚡ Progress: {current_combination}/{total_combinations} | "
-                                  f"Current: P&L={train_performance.total_pnl_pct:.2f}%, "
-                                  f"Trades={train_performance.total_trades}, "
-                                  f"Score={composite_score:.2f}")
-                    
-                    except Exception as e:
-                        print(f"❌ Error testing params {spike_offset}, {stabilization_threshold}, {max_position_time}: {e}")
-                        continue
+        # Grid search across worker processes (train_df published once to shared memory)
+        param_sets = parameter_grid(param_grid)
+        total_combinations = len(param_sets)
+        strategy_factory = functools.partial(
+            SpikeCatchingStrategySignal,
+            symbol=symbol,
+            backtesting_params=backtesting_params,
+            fees=TRADING_FEES
+        )
+        optimizer = ParallelParameterOptimizer(StrategyEvaluator(strategy_factory), max_workers=max_workers)
+        if search is None and self.result_store is not None:
+            evaluations = await self.result_store.evaluate_async(optimizer, train_df, param_sets, strategy_factory,
+                                                                 label=str(symbol))
+        elif search is None:
+            evaluations = await optimizer.evaluate_async(train_df, param_sets)
+        else:
+            search_result = await search.run_async(optimizer, train_df, param_space or param_grid,
+                                                   score_fn=_composite_score)
+            print(f"🔎 {search.name} search: {search_result.evaluations} evaluations in "
+                  f"{search_result.elapsed_seconds:.1f}s ({search_result.stopped_reason})")
+            # Rank only trials evaluated on the full training set (multi-fidelity searches use prefixes)
+            final_fraction = search_result.best_trial.fraction if search_result.best_trial else 1.0
+            evaluations = [
+                ParameterEvaluation(trial.trial_id, trial.params, trial.result, trial.error)
+                for trial in search_result.trials if trial.fraction == final_fraction
+            ]
+            total_combinations = len(evaluations)
+
+        # Results arrive in evaluation order, so ties resolve exactly like the serial loop
+        for current_combination, evaluation in enumerate(evaluations, 1):
+            params = evaluation.params
+            if not evaluation.ok:
+                print(f"❌ Error testing params {params['spike_offset_multiplier']}, "
+                      f"{params['stabilization_threshold']}, {params['max_position_time_minutes']}: {evaluation.error}")
+                continue
+
+            train_performance = evaluation.result
+            composite_score = _composite_score(train_performance)
+
+            # Track results
+            result = {
+                **params,
+                'total_trades': train_performance.total_trades,
+                'total_pnl_pct': train_performance.total_pnl_pct,
+                'win_rate': train_performance.win_rate,
+                'sharpe_ratio': train_performance.sharpe_ratio,
+                'composite_score': composite_score
+            }
+
+            optimization_results.append(result)
+
+            # Update best parameters
+            if composite_score > best_score:
+                best_score = composite_score
+                best_params = result.copy()
+
+            # Progress update
+            if current_combination % 5 == 0 or current_combination == total_combinations:
+                print(f"⚡ Progress: {current_combination}/{total_combinations} | "
+                      f"Current: P&L={train_performance.total_pnl_pct:.2f}%, "
+                      f"Trades={train_performance.total_trades}, "
+                      f"Score={composite_score:.2f}")
 
         if not best_params:
             return {'error': 'No valid parameter combinations found'}
@@ -254,6 +293,99 @@ class SignalBacktester:
         }
 
 
+    async def walk_forward_strategy_parameters(self,
+                                               symbol: Symbol,
+                                               data_source: BacktestDataSource,
+                                               hours: int = 72,
+                                               end_date: Optional[datetime] = None,
+                                               search: Optional[ParameterSearch] = None,
+                                               param_space: Optional[SearchSpace] = None,
+                                               train_hours: float = 24,
+                                               test_hours: float = 6,
+                                               embargo_minutes: float = 30,
+                                               anchored: bool = False,
+                                               max_workers: Optional[int] = None) -> Dict:
+        """
+        Walk-forward optimization: optimize on each training window, trade the next test window.
+
+        Args:
+            search: Search strategy per training window (defaults to the full grid)
+            param_space: Search space (defaults to the spike catching grid)
+            train_hours: Training window length (initial length when anchored)
+            test_hours: Out-of-sample window length and step between folds
+            embargo_minutes: Gap between training and test windows
+            anchored: Expanding instead of rolling training windows
+            max_workers: Processes running folds (None = all cores, 1 = serial)
+
+        Returns:
+            Dict with stitched out-of-sample performance, parameter stability and per-fold results
+        """
+        print(f"🔧 Starting walk-forward optimization for {symbol}")
+
+        timeframe = self.candles_timeframe if data_source == 'candles' else self.snapshot_seconds
+        df = await self.data_source[data_source].get_multi_exchange_data(
+            self.exchanges, symbol, hours=hours, date_to=end_date, timeframe=timeframe)
+
+        if df.empty:
+            return {'error': 'No data available for walk-forward optimization'}
+
+        folds = walk_forward_folds(df.index, pd.Timedelta(hours=train_hours), pd.Timedelta(hours=test_hours),
+                                   embargo=pd.Timedelta(minutes=embargo_minutes), anchored=anchored)
+        if not folds:
+            return {'error': f'Not enough data for a {train_hours}h train / {test_hours}h test fold'}
+
+        print(f"📊 {len(folds)} folds: {train_hours}h train, {embargo_minutes}min embargo, {test_hours}h test"
+              f"{' (anchored)' if anchored else ''}")
+
+        backtesting_params = BacktestingParams(
+            initial_balance_usd=self.initial_capital_usdt,
+            position_size_usd=self.position_size_usdt,
+            transfer_delay_minutes=8,
+            transfer_fee_usd=0.0,
+            slippage_pct=0.05,
+            execution_failure_rate=0.10,
+        )
+        strategy_factory = functools.partial(
+            SpikeCatchingStrategySignal,
+            symbol=symbol,
+            backtesting_params=backtesting_params,
+            fees=TRADING_FEES
+        )
+
+        harness = WalkForwardHarness(
+            strategy_factory,
+            search or GridSearch(),
+            param_space or SPIKE_PARAM_GRID,
+            score_fn=_composite_score,
+            initial_capital_usd=self.initial_capital_usdt,
+            max_workers=max_workers
+        )
+        report = await harness.run_async(df, folds)
+        oos = report.oos_metrics
+
+        print(f"\n🧪 Out-of-sample (stitched over {len(report.successful_folds)}/{len(folds)} folds):")
+        print(f"   P&L: {oos.total_pnl_pct:.2f}%")
+        print(f"   Trades: {oos.total_trades}")
+        print(f"   Win Rate: {oos.win_rate:.1f}%")
+        print(f"   Sharpe Ratio: {oos.sharpe_ratio:.2f}")
+        print(f"   Walk-forward efficiency: {report.walk_forward_efficiency:.2f}")
+        for name, stats in report.stability.items():
+            print(f"   {name}: mode={stats['mode']} ({stats['mode_share']:.0%} of folds)")
+
+        return {
+            'oos_performance': {
+                'total_pnl_pct': oos.total_pnl_pct,
+                'total_trades': oos.total_trades,
+                'win_rate': oos.win_rate,
+                'sharpe_ratio': oos.sharpe_ratio,
+                'max_drawdown': oos.max_drawdown
+            },
+            'walk_forward_efficiency': report.walk_forward_efficiency,
+            'parameter_stability': report.stability,
+            'folds': report.to_dataframe().to_dict('records'),
+            'report': report
+        }
+
     async def run_backtest(self, symbol: Symbol,
                            data_source: BacktestDataSource,
                            hours: int = 24,
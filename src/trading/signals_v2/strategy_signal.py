@@ -20,6 +20,10 @@ class StrategySignal(ABC):
     All strategy implementations must provide backtesting capabilities with
     realistic cost modeling, risk management, and performance analytics.
     """
+
+    # Bump when backtest() results change for the same data and parameters
+    # (invalidates runs stored in BacktestResultStore)
+    STRATEGY_VERSION = 1
     
     @abstractmethod
     def backtest(self, df: pd.DataFrame) -> PerformanceMetrics:
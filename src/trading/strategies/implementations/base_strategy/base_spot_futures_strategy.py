@@ -292,7 +292,7 @@ class BaseSpotFuturesArbitrageTask(BaseStrategyTask[BaseSpotFuturesTaskContext])
             self.logger.error(f"🚫 Failed to cancel {tag_str} order", error=str(e))
             # Try to fetch order status instead
         finally:
-            order = await exchange.fetch_order(symbol, order_id)
+            order = await exchange.wait_for_fill(symbol, order_id)
 
         self._track_order_execution(market_type, order)
         return order
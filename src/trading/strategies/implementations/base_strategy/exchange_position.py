@@ -347,7 +347,7 @@ class ExchangePosition(Struct):
             self._logger.error(f"🚫 {self.tag} Failed to cancel order", error=str(e))
             # Try to fetch order status instead
         finally:
-            order = await self._ex.private.fetch_order(self.symbol, order_id)
+            order = await self._ex.private.wait_for_fill(self.symbol, order_id)
 
         self._track_order_execution(order)
 
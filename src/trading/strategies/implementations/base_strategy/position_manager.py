@@ -19,6 +19,7 @@ from utils.exchange_utils import is_order_done
 
 from .position_data import PositionData
 from .pnl_tracker import PositionChange
+from .quote_manager import QuoteManager, RequoteBudget
 
 
 class PositionManager:
@@ -34,7 +35,8 @@ class PositionManager:
                  exchange: DualExchange,
                  logger: HFTLoggerInterface,
                  save_context: Optional[Callable[[PositionData], None]] = None,
-                 on_order_filled_callback: Optional[Callable[[Order, PositionChange], Awaitable[None]]] = None):
+                 on_order_filled_callback: Optional[Callable[[Order, PositionChange], Awaitable[None]]] = None,
+                 requote_budget: Optional[RequoteBudget] = None):
         self._position = position_data
         self._exchange = exchange
         self._logger = logger
@@ -46,6 +48,10 @@ class PositionManager:
         self._last_order: Optional[Order] = None
         self._on_order_filled_callback = on_order_filled_callback
 
+        # Owner of the trailing limit order (hysteresis, requote budget, amend/cancel-replace)
+        self._quotes = QuoteManager(exchange.private, position_data.symbol, logger,
+                                    on_order=self._track_order_execution, budget=requote_budget)
+
     @property
     def symbol(self):
         return self._position.symbol
@@ -320,15 +326,7 @@ class PositionManager:
             return order
 
         except InsufficientBalanceError as ife:
-            # Mark position as fulfilled if we can't place more orders due to balance
-            # self._position.qty = self._position.target_qty
-
-            await self.exchange.private.load_balances()
-            self._position.qty = self.balance_base  # Adjust position qty to balance
-
-            self._logger.error(f"🚫 {self.tag} Insufficient balance to place order "
-                               f"| pos: {self._position}, order: {quantity} @ {price}  adjust position amount",
-                               error=str(ife))
+            await self._on_insufficient_balance(ife, quantity, price)
             return None
         except Exception as e:
             self._logger.error(f"🚫 {self.tag} Failed to place order", error=str(e))
@@ -336,6 +334,17 @@ class PositionManager:
         finally:
             self._save()
 
+    async def _on_insufficient_balance(self, error: InsufficientBalanceError, quantity: float, price: float):
+        # Mark position as fulfilled if we can't place more orders due to balance
+        # self._position.qty = self._position.target_qty
+
+        await self.exchange.private.load_balances()
+        self._position.qty = self.balance_base  # Adjust position qty to balance
+
+        self._logger.error(f"🚫 {self.tag} Insufficient balance to place order "
+                           f"| pos: {self._position}, order: {quantity} @ {price}  adjust position amount",
+                           error=str(error))
+
     async def cancel_order(self) -> Optional[Order]:
         """Cancel active order for the position."""
         if self._last_order is None:
@@ -352,7 +361,7 @@ class PositionManager:
             # Try to fetch order status instead
         finally:
             if not order or not order.is_done:
-                order = await self._exchange.private.fetch_order(self.symbol, order_id)
+                order = await self._exchange.private.wait_for_fill(self.symbol, order_id)
 
         await self._track_order_execution(order)
         return order
@@ -408,16 +417,21 @@ class PositionManager:
 
     async def place_trailing_limit_order(self, side: Side, quantity: float,
                                          top_offset_pct: float = 0, trail_pct: float = 0) -> Optional[Order]:
+        """Keep a limit order at the top of book, moving it when the book trails away.
+
+        Requotes go through the quote manager: moves below the tick hysteresis or
+        over the requote budget are skipped, the order is amended in place where
+        the exchange supports it, and a cancel-replace never places the
+        replacement if the old order filled while cancelling.
+
+        Returns:
+            Order with fills (hedge outside), None otherwise
+        """
         order = self._last_order
 
         price = self.book_ticker.ask_price if side == Side.SELL else self.book_ticker.bid_price
 
-        if self._should_cancel_trailing_order(price, trail_pct):
-            self._logger.info(f"🔻 {self.tag} Updating trailing limit order from {order.price} to {price}")
-            o = await self.cancel_order()
-            if o and o.is_filled:
-                return o  # Filled during cancel handle hedge outside
-        elif order:
+        if order and not self._should_cancel_trailing_order(price, trail_pct):
             if order.is_done:
                 return order
 
@@ -425,11 +439,25 @@ class PositionManager:
 
         price_with_offset = self._adjust_price_by_pct(price, top_offset_pct, side)
 
-        new_order = await self.place_order(side, quantity, price_with_offset, is_market=False)
+        # PositionManager tracks the active order, the quote manager acts on it
+        self._quotes.attach(order)
+        try:
+            qty_after_fees = await self.deduct_fees(side, quantity)
+            new_order = await self._quotes.quote(side, qty_after_fees, price_with_offset)
+        except InsufficientBalanceError as ife:
+            await self._on_insufficient_balance(ife, quantity, price_with_offset)
+            return None
+        except Exception as e:
+            self._logger.error(f"🚫 {self.tag} Failed to update trailing limit order", error=str(e))
+            return None
+        finally:
+            self._save()
 
         if new_order:
-            self._logger.info(f"🔺 {self.tag} Placed trailing limit order {new_order}")
+            if order is None or new_order.order_id != order.order_id or new_order.price != order.price:
+                self._logger.info(f"🔺 {self.tag} Trailing limit order at {new_order.price}",
+                                  order=str(new_order))
             if new_order.is_filled:
-                return new_order
+                return new_order  # Filled (possibly during requote) handle hedge outside
 
         return None
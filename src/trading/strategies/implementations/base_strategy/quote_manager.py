@@ -0,0 +1,261 @@
+"""
+Quote Manager
+
+Owner of one resting limit order per symbol/side.
+
+Trailing limit orders used to be moved by cancel + place on every qualifying
+tick: two REST calls per move, no resting order in between, no bound on the
+requote rate, and a fill racing the cancel could leave both the fill and the
+replacement order exposed. QuoteManager replaces that with:
+
+- hysteresis: requotes closer than `min_requote_ticks` price ticks are skipped
+- a per-symbol requote budget (token bucket) shared by all quotes of a symbol
+- native amend where the exchange supports it (order keeps its ID and queue
+  slot on price-only changes where the venue allows it)
+- cancel-replace otherwise, where the replacement is only placed after the
+  cancel is confirmed terminal by the private order-state cache and the old
+  order did not fill in between; a (partially) filled order is returned to the
+  caller instead, which re-sizes the next quote from its updated position
+
+Usage:
+    quotes = QuoteManager(exchange.private, symbol, logger, on_order=track_order)
+    order = await quotes.quote(Side.BUY, quantity, price)
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from exchanges.structs import Order, Side, Symbol
+from infrastructure.logging import HFTLoggerInterface
+
+OrderCallback = Callable[[Order], Awaitable[None]]
+
+# Seconds to wait for the private stream to confirm a cancel before reconciling via REST
+CANCEL_CONFIRM_SECONDS = 2.0
+
+
+class RequoteBudget:
+    """Token bucket limiting requotes: `rate` per second with bursts up to `burst`."""
+    __slots__ = ('rate', 'burst', '_tokens', '_updated_at')
+
+    def __init__(self, rate: float = 2.0, burst: float = 5.0):
+        """
+        Args:
+            rate: Sustained requotes per second
+            burst: Maximum requotes in a burst
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"Invalid requote budget: rate={rate}, burst={burst}")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated_at: Optional[float] = None
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def try_acquire(self, now: float) -> bool:
+        """Spend one requote if available.
+
+        Args:
+            now: Monotonic time in seconds (event loop time, virtual in backtests)
+
+        Returns:
+            True if the requote may proceed
+        """
+        if self._updated_at is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+
+class QuoteManager:
+    """Places, moves and cancels the resting limit order of one symbol."""
+
+    def __init__(self,
+                 exchange,
+                 symbol: Symbol,
+                 logger: HFTLoggerInterface,
+                 on_order: Optional[OrderCallback] = None,
+                 budget: Optional[RequoteBudget] = None,
+                 min_requote_ticks: float = 1.0,
+                 cancel_confirm_timeout: float = CANCEL_CONFIRM_SECONDS):
+        """Initialize quote manager.
+
+        Args:
+            exchange: Private exchange (composite or simulated)
+            symbol: Quoted symbol
+            logger: Logger instance
+            on_order: Awaited with every order state returned by the exchange
+            budget: Requote budget (share one instance across quotes of the same symbol)
+            min_requote_ticks: Minimum price move, in ticks, worth a requote
+            cancel_confirm_timeout: Seconds to wait for cancel confirmation from the stream
+        """
+        self._exchange = exchange
+        self.symbol = symbol
+        self.logger = logger
+        self._on_order = on_order
+        self.budget = budget or RequoteBudget()
+        self.min_requote_ticks = min_requote_ticks
+        self.cancel_confirm_timeout = cancel_confirm_timeout
+
+        self._order: Optional[Order] = None
+        # Cleared on the first NotImplementedError, cancel-replace from then on
+        self._amend_supported = callable(getattr(exchange, 'amend_order', None))
+
+        # Counters
+        self.requotes = 0
+        self.amends = 0
+        self.skipped = 0
+        self.throttled = 0
+        self.fill_races = 0
+
+    # -------------------------------------------------------------------------
+    # State
+    # -------------------------------------------------------------------------
+
+    @property
+    def order(self) -> Optional[Order]:
+        """Resting order, refreshed from the private order-state cache."""
+        if self._order is not None:
+            cached = self._exchange.get_order(self._order.order_id)
+            if cached is not None:
+                self._order = cached
+        return self._order
+
+    @property
+    def tick(self) -> float:
+        info = self._exchange.symbols_info[self.symbol]
+        return info.tick or 10 ** -info.quote_precision
+
+    def attach(self, order: Optional[Order]) -> None:
+        """Take ownership of an existing order (restored or placed elsewhere)."""
+        self._order = order
+
+    def needs_requote(self, price: float) -> bool:
+        """True if quoting at `price` would place or move the order."""
+        order = self.order
+        if order is None or order.is_done:
+            return True
+        return self._is_significant(order, price)
+
+    def _is_significant(self, order: Order, price: float) -> bool:
+        tick = self.tick
+        # Half a tick below the threshold absorbs float rounding of rounded prices
+        return abs(price - order.price) >= self.min_requote_ticks * tick - tick * 0.5
+
+    # -------------------------------------------------------------------------
+    # Quoting
+    # -------------------------------------------------------------------------
+
+    async def quote(self, side: Side, quantity: float, price: float) -> Optional[Order]:
+        """Place the order at `price` or move the resting one there.
+
+        Args:
+            side: Order side
+            quantity: Quantity of a newly placed order (amends keep the resting quantity)
+            price: Target limit price
+
+        Returns:
+            Resting order (new, moved or unchanged), the previous order if it
+            completed (filled before or during the requote; no replacement
+            placed), or None if nothing rests
+        """
+        price = self._exchange.symbols_info[self.symbol].round_quote(price)
+        order = self.order
+
+        if order is not None and order.is_done:
+            # Completed since the last quote (stream update): report it, place nothing
+            return await self._accept(order)
+
+        if order is None:
+            return await self._place(side, quantity, price)
+
+        if order.side == side and not self._is_significant(order, price):
+            self.skipped += 1
+            return order
+
+        if not self.budget.try_acquire(asyncio.get_running_loop().time()):
+            self.throttled += 1
+            return order
+
+        self.requotes += 1
+        if order.side == side and self._amend_supported:
+            amended = await self._amend(order, price)
+            if amended is not None:
+                return amended
+
+        return await self._replace(order, side, quantity, price)
+
+    async def cancel(self) -> Optional[Order]:
+        """Cancel the resting order and confirm its terminal state.
+
+        Returns:
+            Final order state (None if nothing rests or the order is unknown),
+            or the still-open order if the cancel could not be confirmed
+        """
+        order = self._order
+        if order is None:
+            return None
+
+        cancelled = None
+        try:
+            cancelled = await self._exchange.cancel_order(self.symbol, order.order_id)
+        except Exception as e:
+            self.logger.error(f"🚫 Failed to cancel quote {order.order_id}", error=str(e))
+
+        if cancelled is None or not cancelled.is_done:
+            cancelled = await self._exchange.wait_for_fill(self.symbol, order.order_id,
+                                                           self.cancel_confirm_timeout)
+
+        if cancelled is None:
+            # Unknown to the exchange: nothing rests
+            self._order = None
+            return None
+        return await self._accept(cancelled)
+
+    async def _amend(self, order: Order, price: float) -> Optional[Order]:
+        """Native amend; None if the cancel-replace path should take over."""
+        try:
+            amended = await self._exchange.amend_order(self.symbol, order.order_id, price)
+        except NotImplementedError:
+            self._amend_supported = False
+            self.logger.info(f"Native amend not supported for {self.symbol}, using cancel-replace")
+            return None
+        except Exception as e:
+            # Typically the order completed meanwhile: cancel-replace reconciles its state
+            self.logger.warning(f"⚠️ Amend of {order.order_id} failed, falling back to cancel-replace",
+                                error=str(e))
+            return None
+
+        self.amends += 1
+        return await self._accept(amended)
+
+    async def _replace(self, order: Order, side: Side, quantity: float, price: float) -> Optional[Order]:
+        cancelled = await self.cancel()
+        if cancelled is not None and not cancelled.is_done:
+            # Cancel unconfirmed: placing a replacement could double the exposure
+            self.logger.warning(f"⚠️ Cancel of {order.order_id} not confirmed, keeping quote")
+            return cancelled
+        if cancelled is not None and cancelled.filled_quantity > 0:
+            # (Partially) filled: the caller re-sizes from its position before quoting again
+            if cancelled.filled_quantity > order.filled_quantity:
+                self.fill_races += 1
+            self.logger.info(f"Quote {order.order_id} filled during requote, no replacement placed",
+                             filled=cancelled.filled_quantity)
+            return cancelled
+        return await self._place(side, quantity, price)
+
+    async def _place(self, side: Side, quantity: float, price: float) -> Order:
+        order = await self._exchange.place_limit_order(self.symbol, side, quantity, price)
+        return await self._accept(order)
+
+    async def _accept(self, order: Order) -> Order:
+        self._order = None if order.is_done else order
+        if self._on_order:
+            await self._on_order(order)
+        return order
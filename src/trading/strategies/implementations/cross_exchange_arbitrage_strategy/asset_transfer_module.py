@@ -53,6 +53,11 @@ class TransferRequest(Struct, frozen=False, kw_only=True):
     network: Optional[str] = None
     memo: Optional[str] = None
     last_deposit_check: Optional[float] = None
+
+    # Balance stream tracking (TransferTracker)
+    balance_baseline: Optional[float] = None   # Destination balance when the transfer was submitted
+    credited_amount: float = 0.0               # Destination balance increase since then
+    timed_out: bool = False
     
     # Enhanced completion tracking
     # completed: bool = False              # True only when BOTH withdrawal and deposit complete
@@ -1,5 +1,5 @@
 import asyncio
-from typing import Optional, Type, Dict, Literal, TypeAlias
+from typing import Optional, Type, Dict, Literal, Tuple, TypeAlias
 import msgspec
 from msgspec import Struct
 import numpy as np
@@ -14,16 +14,25 @@ from trading.research.cross_arbitrage.arbitrage_analyzer import AnalyzerKeys
 
 from utils.math_utils import get_decrease_vector
 from trading.strategies.implementations.cross_exchange_arbitrage_strategy.asset_transfer_module import AssetTransferModule, TransferRequest
+from trading.strategies.implementations.cross_exchange_arbitrage_strategy.transfer_tracker import (
+    TransferPollPolicy, TransferTracker
+)
 from trading.strategies.implementations.base_strategy.unified_position import Position, PositionError
 
 from trading.strategies.implementations.base_strategy.base_strategy import BaseStrategyContext, BaseStrategyTask
 from trading.analysis.arbitrage_signals import calculate_arb_signals, ArbSignal
+from trading.analysis.ring_buffer import RingBuffer
 
 PrimaryExchangeRole: TypeAlias = Literal['source', 'dest']
 
 ExchangeRoleType: TypeAlias = PrimaryExchangeRole | Literal['hedge']
 
+# REST fallback for transfer tracking: first check after 30s, backing off to 10 minutes
 TRANSFER_REFRESH_SECONDS = 30
+TRANSFER_REFRESH_MAX_SECONDS = 600
+
+# Rolling spread history: 7 days * 24 hours * 12 five-minute intervals
+MAX_SPREAD_HISTORY_POINTS = 2016
 
 
 class ExchangeData(Struct):
@@ -120,10 +129,10 @@ class CrossExchangeArbitrageTask(BaseStrategyTask[CrossExchangeArbitrageTaskCont
         # Initialize candle-based analyzer like in hedged backtest
         self.analyzer = ArbitrageAnalyzer()
         
-        # Initialize historical spreads for signal generation with numpy arrays
+        # Initialize historical spreads for signal generation with preallocated ring buffers
         self.historical_spreads = {
-            'mexc_vs_gateio_futures': np.array([], dtype=np.float64),
-            'gateio_spot_vs_futures': np.array([], dtype=np.float64)
+            'mexc_vs_gateio_futures': RingBuffer(MAX_SPREAD_HISTORY_POINTS),
+            'gateio_spot_vs_futures': RingBuffer(MAX_SPREAD_HISTORY_POINTS)
         }
         
         # Initialize signal generator (will be populated from candles)
@@ -150,7 +159,13 @@ class CrossExchangeArbitrageTask(BaseStrategyTask[CrossExchangeArbitrageTaskCont
             logger=self.logger
         )
 
-        self._transfer_task: Optional[asyncio.Task] = None
+        # Transfer completion from private balance updates, REST polling as backoff fallback
+        self._transfer_tracker = TransferTracker(
+            self._transfer_module, self.logger,
+            on_update=self._on_transfer_update,
+            poll_policy=TransferPollPolicy(initial_seconds=TRANSFER_REFRESH_SECONDS,
+                                           max_seconds=TRANSFER_REFRESH_MAX_SECONDS)
+        )
         self.context.status = 'inactive'
 
     def create_exchanges(self):
@@ -201,19 +216,13 @@ class CrossExchangeArbitrageTask(BaseStrategyTask[CrossExchangeArbitrageTaskCont
 
         # Signal generator is ready to use immediately (no initialization needed)
 
-        # if there is an active transfer, restore state
+        self._transfer_tracker.start()
+
+        # if there is an active transfer, resume tracking (persisted baseline, immediate REST check)
         transfer_request = self.context.transfer_request
         if transfer_request:
-            transfer_request = await self._transfer_module.update_transfer_request(transfer_request)
-
-            if not transfer_request:
-                self.logger.warning(f"⚠️ Could not restore active transfer - remove")
-                self.context.transfer_request = None
-                self.context.set_save_flag()
-            else:
-                self.context.transfer_request = transfer_request
-                self.logger.warning(f"Waiting for active transfer to complete")
-                await self._start_transfer_monitor()
+            self.logger.warning(f"Waiting for active transfer to complete")
+            await self._start_transfer_monitor(poll_now=True)
 
         self.logger.info("✅ Candle-based signal generation initialized")
 
@@ -227,33 +236,43 @@ class CrossExchangeArbitrageTask(BaseStrategyTask[CrossExchangeArbitrageTaskCont
     def _get_fees(self, exchange_role: ExchangeRoleType):
         return self._exchanges[exchange_role].private.get_fees(self.context.symbol)
 
-    async def _start_transfer_monitor(self):
-        self._transfer_task = asyncio.create_task(self._update_transfer_status())
+    def _on_transfer_update(self, request: TransferRequest):
+        """Persist transfer progress reported by the tracker."""
+        if self.context.transfer_request and self.context.transfer_request.transfer_id == request.transfer_id:
+            self.context.transfer_request = request
+            self.context.set_save_flag()
 
-    async def _stop_transfer_monitor(self):
-        if self._transfer_task:
-            self._transfer_task.cancel()
-            try:
-                await self._transfer_task
-            except asyncio.CancelledError:
-                pass
-            self._transfer_task = None
-
-    async def _update_transfer_status(self):
-        transfer_request = self.context.transfer_request
+    def _transfer_destination(self, request: TransferRequest) -> Optional[DualExchange]:
+        for exchange_role in ('source', 'dest'):
+            if self.context.settings[exchange_role].exchange == request.to_exchange:
+                return self._exchanges[exchange_role]
+        return None
 
-        while transfer_request:
-            if not transfer_request.in_progress:
-                break
-            try:
-                transfer_request = await self._transfer_module.update_transfer_request(transfer_request)
-                self.context.transfer_request = transfer_request
-                if not transfer_request:
-                    break
-            except Exception as e:
-                self.logger.error(f"❌ Error updating transfer status: {e}")
-                break
-            await asyncio.sleep(TRANSFER_REFRESH_SECONDS)
+    async def _start_transfer_monitor(self, poll_now: bool = False, baseline: Optional[float] = None):
+        """Track the active transfer, fed by the destination's balance stream while it is pending."""
+        request = self.context.transfer_request
+        destination = self._transfer_destination(request)
+        if destination is not None:
+            await destination.bind_handlers(on_balance=self._transfer_tracker.balance_handler(request.to_exchange))
+        await self._transfer_tracker.track(request, poll_now=poll_now, baseline=baseline)
+
+    async def _stop_transfer_monitor(self):
+        request = self.context.transfer_request
+        if request:
+            self._transfer_tracker.untrack(request.transfer_id)
+            destination = self._transfer_destination(request)
+            if destination is not None:
+                await destination.unbind_handlers(
+                    on_balance=self._transfer_tracker.balance_handler(request.to_exchange))
+
+    async def _submit_transfer(self, asset, from_exchange: ExchangeEnum, to_exchange: ExchangeEnum, qty: float,
+                               buy_price: Optional[float] = None) -> Tuple[TransferRequest, Optional[float]]:
+        """Submit a transfer, reading the destination baseline balance before the withdrawal."""
+        baseline = await self._transfer_tracker.read_baseline(to_exchange, asset)
+        transfer_request = await self._transfer_module.transfer_asset(
+            asset, from_exchange, to_exchange, qty, buy_price=buy_price
+        )
+        return transfer_request, baseline
 
     async def _load_initial_balances(self):
         hedge_position = self.context.positions['hedge']
@@ -447,9 +466,9 @@ class CrossExchangeArbitrageTask(BaseStrategyTask[CrossExchangeArbitrageTaskCont
                 self.logger.error(f"❌ Missing required columns in candle data: {missing_columns}")
                 return
             
-            # Populate historical spreads with numpy arrays for better performance
-            self.historical_spreads['mexc_vs_gateio_futures'] = df[AnalyzerKeys.mexc_vs_gateio_futures_arb].values.astype(np.float64)
-            self.historical_spreads['gateio_spot_vs_futures'] = df[AnalyzerKeys.gateio_spot_vs_futures_arb].values.astype(np.float64)
+            # Populate historical spreads (ring buffers keep the most recent points)
+            self.historical_spreads['mexc_vs_gateio_futures'].extend(df[AnalyzerKeys.mexc_vs_gateio_futures_arb].values)
+            self.historical_spreads['gateio_spot_vs_futures'].extend(df[AnalyzerKeys.gateio_spot_vs_futures_arb].values)
             
             loaded_count = len(self.historical_spreads['mexc_vs_gateio_futures'])
             
@@ -482,21 +501,9 @@ class CrossExchangeArbitrageTask(BaseStrategyTask[CrossExchangeArbitrageTaskCont
             current_mexc_spread = self.mexc_vs_gateio_futures_spread
             current_gateio_spread = self.gateio_spot_vs_futures_spread
             
-            # Append current spreads to historical data
-            self.historical_spreads['mexc_vs_gateio_futures'] = np.append(
-                self.historical_spreads['mexc_vs_gateio_futures'], 
-                current_mexc_spread
-            )
-            self.historical_spreads['gateio_spot_vs_futures'] = np.append(
-                self.historical_spreads['gateio_spot_vs_futures'], 
-                current_gateio_spread
-            )
-            
-            # Keep rolling window (maintain last 2016 points = 7 days * 24 hours * 12 five-minute intervals)
-            max_history_points = 2016
-            if len(self.historical_spreads['mexc_vs_gateio_futures']) > max_history_points:
-                self.historical_spreads['mexc_vs_gateio_futures'] = self.historical_spreads['mexc_vs_gateio_futures'][-max_history_points:]
-                self.historical_spreads['gateio_spot_vs_futures'] = self.historical_spreads['gateio_spot_vs_futures'][-max_history_points:]
+            # Append current spreads to historical data (oldest points are evicted in place)
+            self.historical_spreads['mexc_vs_gateio_futures'].push(current_mexc_spread)
+            self.historical_spreads['gateio_spot_vs_futures'].push(current_gateio_spread)
             
             # Update timestamp
             self._last_spread_update_time = current_time
@@ -523,8 +530,8 @@ class CrossExchangeArbitrageTask(BaseStrategyTask[CrossExchangeArbitrageTaskCont
             )
         
         arb_signal_result = calculate_arb_signals(
-            mexc_vs_gateio_futures_history=self.historical_spreads['mexc_vs_gateio_futures'],
-            gateio_spot_vs_futures_history=self.historical_spreads['gateio_spot_vs_futures'],
+            mexc_vs_gateio_futures_history=self.historical_spreads['mexc_vs_gateio_futures'].values(),
+            gateio_spot_vs_futures_history=self.historical_spreads['gateio_spot_vs_futures'].values(),
             current_mexc_vs_gateio_futures=self.mexc_vs_gateio_futures_spread,
             current_gateio_spot_vs_futures=self.gateio_spot_vs_futures_spread
         )
@@ -761,7 +768,7 @@ class CrossExchangeArbitrageTask(BaseStrategyTask[CrossExchangeArbitrageTaskCont
             tag_str = f"{self._tag} {tag}".strip()
             self.logger.error(f"🚫 Failed to cancel {tag_str} order", error=str(e))
             # Try to fetch order status instead
-            order = await exchange.fetch_order(symbol, order_id)
+            order = await exchange.wait_for_fill(symbol, order_id)
 
         self._track_order_execution(exchange_role, order)
         return order
@@ -1063,8 +1070,12 @@ class CrossExchangeArbitrageTask(BaseStrategyTask[CrossExchangeArbitrageTaskCont
             dest_pos.reset(0.0)
             hedge_pos.reset()
 
-    async def _initiate_new_transfer(self) -> Optional[TransferRequest]:
-        """Initiate a new transfer if position is fulfilled."""
+    async def _initiate_new_transfer(self) -> Optional[Tuple[TransferRequest, Optional[float]]]:
+        """Initiate a new transfer if position is fulfilled.
+
+        Returns:
+            (transfer request, destination baseline balance) or None
+        """
         symbol = self.context.symbol
         current_role = self.context.current_role
         source_pos = self.context.positions['source']
@@ -1076,12 +1087,12 @@ class CrossExchangeArbitrageTask(BaseStrategyTask[CrossExchangeArbitrageTaskCont
             base_balance = await self._exchanges['source'].private.get_asset_balance(symbol.base, force=True)
             qty = min(source_pos.qty, base_balance.available)
             
-            transfer_request = await self._transfer_module.transfer_asset(
+            submitted = await self._submit_transfer(
                 symbol.base, source_exchange, dest_exchange, qty, buy_price=source_pos.price
             )
             
             self.logger.info(f"🚀 Starting transfer of {qty} {symbol.base} from {source_exchange.name} to {dest_exchange.name}")
-            return transfer_request
+            return submitted
             
         elif current_role == 'dest' and dest_pos.is_fulfilled(self._get_min_base_qty('dest')):
             source_exchange = self.context.settings['source'].exchange
@@ -1093,12 +1104,10 @@ class CrossExchangeArbitrageTask(BaseStrategyTask[CrossExchangeArbitrageTaskCont
             if qty * self._get_book_ticker('dest').bid_price < quote_balance.available:
                 qty = quote_balance.available
             
-            transfer_request = await self._transfer_module.transfer_asset(
-                symbol.quote, dest_exchange, source_exchange, qty
-            )
+            submitted = await self._submit_transfer(symbol.quote, dest_exchange, source_exchange, qty)
             
             self.logger.info(f"🚀 Started transfer of {qty} {symbol.quote} from {dest_exchange.name} to {source_exchange.name}")
-            return transfer_request
+            return submitted
             
         return None
 
@@ -1116,15 +1125,16 @@ class CrossExchangeArbitrageTask(BaseStrategyTask[CrossExchangeArbitrageTaskCont
                     else:
                         self.logger.error(f"❌ Transfer failed, check manually {request}")
 
+                    await self._stop_transfer_monitor()
                     self.context.transfer_request = None
                     self.context.set_save_flag()
-                    await self._stop_transfer_monitor()
                     return False
             else:
                 # No active transfer, check if we should initiate one
-                transfer_request = await self._initiate_new_transfer()
+                submitted = await self._initiate_new_transfer()
                 
-                if transfer_request:
+                if submitted:
+                    transfer_request, baseline = submitted
                     self.context.transfer_request = transfer_request
                     
                     # Reset position tracking but keep PnL
@@ -1135,7 +1145,7 @@ class CrossExchangeArbitrageTask(BaseStrategyTask[CrossExchangeArbitrageTaskCont
                         self.context.positions['dest'].reset(reset_pnl=False)
                     
                     self.context.set_save_flag()
-                    await self._start_transfer_monitor()
+                    await self._start_transfer_monitor(baseline=baseline)
                     return True
                 else:
                     return False
@@ -1168,9 +1178,11 @@ class CrossExchangeArbitrageTask(BaseStrategyTask[CrossExchangeArbitrageTaskCont
 
     async def cleanup(self):
         await super().cleanup()
+        if self.context is not None:
+            await self._stop_transfer_monitor()
 
         # Close exchange connections
         close_tasks = []
         for exchange in self._exchanges.values():
             close_tasks.append(exchange.close())
-        await asyncio.gather(*close_tasks, self._stop_transfer_monitor())
+        await asyncio.gather(*close_tasks, self._transfer_tracker.stop())
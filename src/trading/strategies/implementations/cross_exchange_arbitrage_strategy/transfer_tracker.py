@@ -0,0 +1,275 @@
+"""Push-driven transfer completion tracking for cross-exchange arbitrage.
+
+Transfers used to be confirmed by polling withdrawal status and deposit history
+over REST every 30 seconds. TransferTracker completes them from private
+WebSocket balance updates of the destination exchange instead:
+
+- the destination balance of the asset is read before the withdrawal is
+  submitted and passed to track() as baseline (persisted in the
+  TransferRequest, so restarts resume tracking); a baseline read afterwards
+  could already include the credit
+- baseline and catch-up reads are exchange-reported REST balances, the same
+  source as BALANCE events (the balance ledger only learns about the deposit
+  once the tracker credits it)
+- the balance handler of the destination exchange is bound while transfers
+  are tracked and unbound when tracking ends
+- every balance update credits ``total - baseline`` to the oldest pending
+  transfer of that asset/exchange
+- the transfer completes once the credit covers the expected quantity within
+  the network fee tolerance; smaller credits are recorded as partial
+- REST polling remains as a fallback on an exponential backoff schedule
+  (exchanges without balance streams, transfers restored without baseline)
+- transfers not completed within ``timeout_seconds`` are flagged ``timed_out``
+  and keep being polled at the maximum backoff
+- completed transfers are credited to the destination balance ledger
+
+The tracker assumes the destination balance of the asset only changes through
+the transfer while it is pending (the arbitrage task does not trade during
+transfers).
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from msgspec import Struct
+
+from exchanges.structs.common import AssetBalance
+from exchanges.structs.enums import ExchangeEnum, DepositStatus, WithdrawalStatus
+from infrastructure.logging import HFTLoggerInterface
+from trading.strategies.implementations.cross_exchange_arbitrage_strategy.asset_transfer_module import (
+    AssetTransferModule, TransferRequest
+)
+from utils.time_utils import get_current_timestamp
+
+BalanceHandler = Callable[[AssetBalance], Awaitable[None]]
+
+
+class TransferPollPolicy(Struct, frozen=True):
+    """Backoff schedule for REST fallback polls."""
+    initial_seconds: float = 30.0
+    max_seconds: float = 600.0
+    multiplier: float = 2.0
+
+    def delay(self, attempt: int) -> float:
+        """Seconds until poll number `attempt` (0-based)."""
+        return min(self.initial_seconds * self.multiplier ** min(attempt, 64), self.max_seconds)
+
+
+class TransferTracker:
+    """Tracks pending TransferRequests from balance updates with REST fallback.
+
+    Usage:
+        tracker = TransferTracker(transfer_module, logger, on_update=lambda r: context.set_save_flag())
+        tracker.start()
+        baseline = await tracker.read_baseline(to_exchange, asset)      # before submitting
+        request = await transfer_module.transfer_asset(asset, from_exchange, to_exchange, qty)
+        await exchange.bind_handlers(on_balance=tracker.balance_handler(to_exchange))
+        await tracker.track(request, baseline=baseline)
+        ...
+        await exchange.unbind_handlers(on_balance=tracker.balance_handler(to_exchange))
+    """
+
+    def __init__(self, transfer_module: AssetTransferModule, logger: HFTLoggerInterface,
+                 on_update: Optional[Callable[[TransferRequest], None]] = None,
+                 poll_policy: Optional[TransferPollPolicy] = None,
+                 amount_tolerance: float = 0.001,
+                 timeout_seconds: float = 3600.0):
+        """Initialize transfer tracker.
+
+        Args:
+            transfer_module: Transfer module used for REST status checks
+            logger: Logger instance
+            on_update: Called after a tracked request changed (persist it)
+            poll_policy: REST fallback backoff schedule
+            amount_tolerance: Relative tolerance on the credited quantity (on top of the network fee)
+            timeout_seconds: Age after which a pending transfer is flagged as timed out
+        """
+        self._transfer_module = transfer_module
+        self.logger = logger
+        self._on_update = on_update
+        self.poll_policy = poll_policy or TransferPollPolicy()
+        self.amount_tolerance = amount_tolerance
+        self.timeout_seconds = timeout_seconds
+
+        self._pending: Dict[str, TransferRequest] = {}
+        self._next_poll: Dict[str, float] = {}      # transfer_id -> monotonic deadline
+        self._poll_attempts: Dict[str, int] = {}
+        self._handlers: Dict[ExchangeEnum, BalanceHandler] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    # -------------------------------------------------------------------------
+    # Tracking
+    # -------------------------------------------------------------------------
+
+    @property
+    def pending(self) -> List[TransferRequest]:
+        return list(self._pending.values())
+
+    async def read_baseline(self, exchange: ExchangeEnum, asset: str) -> Optional[float]:
+        """Destination balance to pass to track(); read it before submitting the withdrawal.
+
+        Returns:
+            Total balance of the asset, None if it could not be read (REST tracking only)
+        """
+        try:
+            balance = await self._transfer_module.exchanges[exchange].get_asset_balance(asset, force=True)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Could not read {asset} baseline balance, REST tracking only: {e}")
+            return None
+        return balance.total if balance else 0.0
+
+    async def track(self, request: TransferRequest, poll_now: bool = False,
+                    baseline: Optional[float] = None) -> None:
+        """Start tracking a transfer.
+
+        Args:
+            request: Submitted (or restored) transfer request
+            poll_now: Schedule the first REST check immediately (restored transfers)
+            baseline: Destination balance read before the withdrawal was submitted
+                (ignored if the request already carries a persisted baseline)
+        """
+        if request.balance_baseline is None and baseline is not None:
+            request.balance_baseline = baseline
+            self._notify(request)
+
+        self._pending[request.transfer_id] = request
+        self._poll_attempts[request.transfer_id] = 0
+        self._next_poll[request.transfer_id] = time.monotonic() + (0.0 if poll_now else self.poll_policy.delay(0))
+        self._wakeup.set()
+
+        if request.balance_baseline is not None and request.to_exchange is not None:
+            # Credit whatever landed since the submission (fast transfers, restarts)
+            try:
+                exchange = self._transfer_module.exchanges[request.to_exchange]
+                balance = await exchange.get_asset_balance(request.asset, force=True)
+            except Exception:
+                return
+            if balance is not None:
+                self.on_balance(request.to_exchange, balance)
+
+    def untrack(self, transfer_id: str) -> None:
+        self._pending.pop(transfer_id, None)
+        self._next_poll.pop(transfer_id, None)
+        self._poll_attempts.pop(transfer_id, None)
+
+    def balance_handler(self, exchange: ExchangeEnum) -> BalanceHandler:
+        """Private BALANCE channel handler for one exchange (the same object on every call, for unbinding)."""
+        handler = self._handlers.get(exchange)
+        if handler is None:
+            async def on_balance(balance: AssetBalance) -> None:
+                self.on_balance(exchange, balance)
+            handler = self._handlers[exchange] = on_balance
+        return handler
+
+    def on_balance(self, exchange: ExchangeEnum, balance: AssetBalance) -> None:
+        """Credit a balance update to the oldest matching pending transfer."""
+        for request in self._pending.values():
+            if (request.to_exchange == exchange and request.asset == balance.asset
+                    and request.balance_baseline is not None and request.in_progress):
+                self._apply_credit(request, balance.total - request.balance_baseline)
+                return
+
+    def _apply_credit(self, request: TransferRequest, credited: float) -> None:
+        if credited <= request.credited_amount:
+            return
+
+        request.credited_amount = credited
+        expected = request.qty
+        tolerance = request.fees + expected * self.amount_tolerance
+
+        if credited >= expected - tolerance:
+            request.withdrawal_status = WithdrawalStatus.COMPLETED
+            request.deposit_status = DepositStatus.COMPLETED
+            self.logger.info(f"✅ Transfer {request.transfer_id} credited via balance stream",
+                             credited=credited, expected=expected)
+            self.untrack(request.transfer_id)
+            self._credit_ledger(request, credited)
+        else:
+            # Partial credit: confirm the rest soon through REST
+            request.deposit_status = DepositStatus.PROCESSING
+            self._next_poll[request.transfer_id] = time.monotonic()
+            self._wakeup.set()
+            self.logger.info(f"⏳ Partial credit for transfer {request.transfer_id}",
+                             credited=credited, expected=expected)
+        self._notify(request)
+
+    # -------------------------------------------------------------------------
+    # REST fallback
+    # -------------------------------------------------------------------------
+
+    async def poll(self, transfer_id: str) -> Optional[TransferRequest]:
+        """Check a pending transfer over REST and schedule the next check."""
+        request = self._pending.get(transfer_id)
+        if request is None:
+            return None
+
+        try:
+            request = await self._transfer_module.update_transfer_request(request)
+            self._pending[transfer_id] = request
+        except Exception as e:
+            self.logger.error(f"❌ Error updating transfer status: {e}")
+        request.last_status_check = get_current_timestamp()
+
+        if not request.in_progress:
+            self.untrack(transfer_id)
+            if request.completed:
+                # Exact credit unknown over REST: ledger reconciliation reports any difference
+                self._credit_ledger(request, request.qty)
+        else:
+            attempt = self._poll_attempts.get(transfer_id, 0) + 1
+            self._poll_attempts[transfer_id] = attempt
+            self._next_poll[transfer_id] = time.monotonic() + self.poll_policy.delay(attempt)
+            self._check_timeout(request)
+        self._notify(request)
+        return request
+
+    def _check_timeout(self, request: TransferRequest) -> None:
+        if request.timed_out or not request.created_at:
+            return
+        age_seconds = (get_current_timestamp() - request.created_at) / 1000
+        if age_seconds > self.timeout_seconds:
+            request.timed_out = True
+            self._poll_attempts[request.transfer_id] = 64   # Stay at the maximum backoff
+            self.logger.error(f"❌ Transfer {request.transfer_id} not completed after {age_seconds:.0f}s, "
+                              f"check manually: {request}")
+
+    async def run(self) -> None:
+        """Poll loop: sleeps until the earliest REST deadline or a new transfer."""
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+            due = [transfer_id for transfer_id, deadline in self._next_poll.items() if deadline <= now]
+            for transfer_id in due:
+                await self.poll(transfer_id)
+
+            timeout = min(self._next_poll.values(), default=None)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(),
+                                       None if timeout is None else max(timeout - time.monotonic(), 0.0))
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _credit_ledger(self, request: TransferRequest, amount: float) -> None:
+        exchange = self._transfer_module.exchanges.get(request.to_exchange)
+        ledger = getattr(exchange, 'ledger', None)
+        if ledger is not None:
+            ledger.apply_transfer(request.asset, amount)
+
+    def _notify(self, request: TransferRequest) -> None:
+        if self._on_update:
+            self._on_update(request)
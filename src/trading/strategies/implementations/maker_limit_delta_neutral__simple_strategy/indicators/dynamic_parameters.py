@@ -37,6 +37,9 @@ class DynamicParameters:
         self.medium_volatility_threshold = 1.0  # 1.0%
         self.high_volatility_threshold = 2.0  # 2.0%
         
+        # Volatility assessment window
+        self.volatility_periods = 20  # 20 minutes for volatility assessment
+        
         # Trend detection parameters
         self.trend_detection_periods = 15  # 15 minutes for trend analysis
         self.trend_threshold = 0.002  # 0.2% price movement to detect trend
@@ -112,17 +115,13 @@ class DynamicParameters:
         Returns:
             "low", "medium", "high", or "unknown"
         """
-        recent_prices = self.state.get_recent_prices(minutes=20)
+        window = self.state.window('spot_prices', self.volatility_periods)
         
-        if len(recent_prices['spot_prices']) < 10:
+        if len(window) < 10:
             return "unknown"
         
-        spot_prices = recent_prices['spot_prices']
-        
         # Calculate volatility as price range percentage
-        price_range = max(spot_prices) - min(spot_prices)
-        current_price = spot_prices[-1]
-        volatility_pct = (price_range / current_price) * 100
+        volatility_pct = (window.range / window.last()) * 100
         
         if volatility_pct <= self.low_volatility_threshold:
             return "low"
@@ -139,17 +138,23 @@ class DynamicParameters:
         Returns:
             True if market appears to be trending
         """
-        recent_prices = self.state.get_recent_prices(minutes=self.trend_detection_periods)
+        periods = self.trend_detection_periods
+        window = self.state.window('spot_prices', periods)
         
-        if len(recent_prices['spot_prices']) < 10:
+        if len(window) < 10:
             return False
         
-        prices = recent_prices['spot_prices']
-        
         # Simple trend detection: compare first half vs second half
-        mid_point = len(prices) // 2
-        first_half_avg = sum(prices[:mid_point]) / mid_point
-        second_half_avg = sum(prices[mid_point:]) / (len(prices) - mid_point)
+        if window.is_full:
+            second_half = self.state.window('spot_prices', periods - periods // 2)
+            first_half_avg = (window.sum - second_half.sum) / (periods // 2)
+            second_half_avg = second_half.mean
+        else:
+            # Warm-up (fewer than `periods` samples): halves of the available history
+            prices = self.state.spot_prices.values()
+            mid_point = len(prices) // 2
+            first_half_avg = float(prices[:mid_point].mean())
+            second_half_avg = float(prices[mid_point:].mean())
         
         # Calculate trend strength
         trend_strength = abs(second_half_avg - first_half_avg) / first_half_avg
@@ -162,12 +167,12 @@ class DynamicParameters:
         Returns:
             True if market appears to have good liquidity
         """
-        recent_spreads = self.state.get_recent_spreads(minutes=5)
+        spot_window = self.state.window('spot_spreads', 5)
         
-        if not recent_spreads['spot_spreads']:
+        if not len(spot_window):
             return False
         
-        avg_spot_spread = sum(recent_spreads['spot_spreads']) / len(recent_spreads['spot_spreads'])
+        avg_spot_spread = spot_window.mean
         
         # Consider high liquidity if spot spread is below 0.1%
         return avg_spot_spread < 0.1
@@ -2,13 +2,24 @@
 Market State Tracker for Maker Limit Strategy
 
 Maintains rolling history of prices and spreads with real-time updates.
+
+History is kept in preallocated ring buffers. Indicators read registered
+rolling windows (window()) that are updated once per sample, so volatility,
+spread and trend checks are O(1) per book ticker instead of materializing and
+rescanning lists.
 """
 
 import time
-from collections import deque
-from typing import Dict, List
+from typing import Dict, List, Tuple
+
+import numpy as np
+
 from exchanges.structs import BookTicker
 from infrastructure.logging import get_logger
+from trading.analysis.ring_buffer import RingBuffer
+from trading.analysis.rolling_window import Ewma, RollingWindow
+
+SERIES = ('spot_prices', 'futures_prices', 'spot_spreads', 'futures_spreads')
 
 
 class SimpleMarketState:
@@ -21,17 +32,22 @@ class SimpleMarketState:
             max_history_minutes: Maximum minutes of history to keep (default: 2 hours)
         """
         self.logger = get_logger("SimpleMarketState")
+        self.max_history_minutes = max_history_minutes
         
         # Price tracking for volatility calculation
-        self.spot_prices = deque(maxlen=max_history_minutes)
-        self.futures_prices = deque(maxlen=max_history_minutes)
+        self.spot_prices = RingBuffer(max_history_minutes)
+        self.futures_prices = RingBuffer(max_history_minutes)
         
         # Spread tracking for safety checks
-        self.spot_spreads = deque(maxlen=max_history_minutes)
-        self.futures_spreads = deque(maxlen=max_history_minutes)
+        self.spot_spreads = RingBuffer(max_history_minutes)
+        self.futures_spreads = RingBuffer(max_history_minutes)
         
         # Timestamps for data alignment
-        self.timestamps = deque(maxlen=max_history_minutes)
+        self.timestamps = RingBuffer(max_history_minutes)
+        
+        # Incremental indicators: (series, size) -> window, updated on every sample
+        self._windows: Dict[Tuple[str, int], RollingWindow] = {}
+        self.spot_price_ewma = Ewma(span=20)
         
         # Update control
         self.last_update = 0
@@ -46,11 +62,10 @@ class SimpleMarketState:
         try:
             # Load historical data if available
             if historical_data['spot_prices']:
-                self.spot_prices.extend(historical_data['spot_prices'])
-                self.futures_prices.extend(historical_data['futures_prices'])
-                self.spot_spreads.extend(historical_data['spot_spreads'])
-                self.futures_spreads.extend(historical_data['futures_spreads'])
+                for name in SERIES:
+                    getattr(self, name).extend(historical_data[name])
                 self.timestamps.extend(historical_data['timestamps'])
+                self._rebuild_indicators()
                 
                 self.logger.info(f"✅ Loaded {len(self.spot_prices)} historical data points")
             else:
@@ -80,12 +95,8 @@ class SimpleMarketState:
             spot_spread_pct = ((spot_book.ask_price - spot_book.bid_price) / spot_mid) * 100
             futures_spread_pct = ((futures_book.ask_price - futures_book.bid_price) / futures_mid) * 100
             
-            # Append to rolling history
-            self.spot_prices.append(spot_mid)
-            self.futures_prices.append(futures_mid)
-            self.spot_spreads.append(spot_spread_pct)
-            self.futures_spreads.append(futures_spread_pct)
-            self.timestamps.append(current_time)
+            # Append to rolling history and indicator windows
+            self._append(current_time, spot_mid, futures_mid, spot_spread_pct, futures_spread_pct)
             
             self.last_update = current_time
             
@@ -97,6 +108,54 @@ class SimpleMarketState:
         except Exception as e:
             self.logger.error(f"Error updating market state: {e}")
     
+    def _append(self, timestamp: float, spot_price: float, futures_price: float,
+                spot_spread: float, futures_spread: float):
+        """Append one sample to the history buffers and all registered windows."""
+        sample = {
+            'spot_prices': spot_price,
+            'futures_prices': futures_price,
+            'spot_spreads': spot_spread,
+            'futures_spreads': futures_spread,
+        }
+        for name, value in sample.items():
+            getattr(self, name).push(value)
+        self.timestamps.push(timestamp)
+        for (name, _), window in self._windows.items():
+            window.push(sample[name])
+        self.spot_price_ewma.push(spot_price)
+    
+    def _rebuild_indicators(self):
+        """Re-seed windows and EWMA from the history buffers (after bulk loads)."""
+        for (name, size), window in self._windows.items():
+            window.clear()
+            for value in getattr(self, name).values()[-size:].tolist():
+                window.push(value)
+        self.spot_price_ewma = Ewma(span=20)
+        for value in self.spot_prices.values().tolist():
+            self.spot_price_ewma.push(value)
+    
+    def window(self, series: str, size: int) -> RollingWindow:
+        """Rolling window over the last `size` samples of a series.
+        
+        Windows are created on first use (seeded from history) and then updated
+        incrementally on every sample, so reads are O(1).
+        
+        Args:
+            series: One of 'spot_prices', 'futures_prices', 'spot_spreads', 'futures_spreads'
+            size: Window length in samples (minutes)
+            
+        Returns:
+            RollingWindow with mean/std/min/max of the most recent samples
+        """
+        key = (series, size)
+        window = self._windows.get(key)
+        if window is None:
+            if series not in SERIES:
+                raise ValueError(f"Unknown market state series '{series}'")
+            window = RollingWindow(size, getattr(self, series).values()[-size:].tolist())
+            self._windows[key] = window
+        return window
+    
     def get_recent_prices(self, minutes: int = 20) -> Dict[str, List[float]]:
         """Get recent price data for analysis.
         
@@ -109,12 +168,10 @@ class SimpleMarketState:
         if not self.spot_prices:
             return {'spot_prices': [], 'futures_prices': []}
         
-        # Return last N minutes of data
-        n_points = min(minutes, len(self.spot_prices))
-        
+        # Return last N minutes of data (indicators use window() instead)
         return {
-            'spot_prices': list(self.spot_prices)[-n_points:],
-            'futures_prices': list(self.futures_prices)[-n_points:]
+            'spot_prices': self.spot_prices.values()[-minutes:].tolist(),
+            'futures_prices': self.futures_prices.values()[-minutes:].tolist()
         }
     
     def get_recent_spreads(self, minutes: int = 5) -> Dict[str, List[float]]:
@@ -129,12 +186,10 @@ class SimpleMarketState:
         if not self.spot_spreads:
             return {'spot_spreads': [], 'futures_spreads': []}
         
-        # Return last N minutes of data
-        n_points = min(minutes, len(self.spot_spreads))
-        
+        # Return last N minutes of data (indicators use window() instead)
         return {
-            'spot_spreads': list(self.spot_spreads)[-n_points:],
-            'futures_spreads': list(self.futures_spreads)[-n_points:]
+            'spot_spreads': self.spot_spreads.values()[-minutes:].tolist(),
+            'futures_spreads': self.futures_spreads.values()[-minutes:].tolist()
         }
     
     def get_current_state(self) -> Dict:
@@ -151,10 +206,11 @@ class SimpleMarketState:
             }
         
         return {
-            'spot_price': self.spot_prices[-1],
-            'futures_price': self.futures_prices[-1],
-            'spot_spread': self.spot_spreads[-1],
-            'futures_spread': self.futures_spreads[-1],
+            'spot_price': self.spot_prices.last(),
+            'futures_price': self.futures_prices.last(),
+            'spot_spread': self.spot_spreads.last(),
+            'futures_spread': self.futures_spreads.last(),
+            'spot_price_ewma': self.spot_price_ewma.value,
             'data_points': len(self.spot_prices),
             'initialized': self.initialized,
             'last_update': self.last_update
@@ -173,19 +229,14 @@ class SimpleMarketState:
         current_time = time.time()
         cutoff_time = current_time - (max_age_hours * 3600)
         
-        # Find first index to keep
-        keep_from = 0
-        for i, timestamp in enumerate(self.timestamps):
-            if timestamp >= cutoff_time:
-                keep_from = i
-                break
+        # Find first index to keep (0 = nothing recent enough, keep everything)
+        fresh = self.timestamps.values() >= cutoff_time
+        keep_from = int(np.argmax(fresh)) if fresh.any() else 0
         
         if keep_from > 0:
-            # Convert deques to lists, slice, and recreate deques
-            self.spot_prices = deque(list(self.spot_prices)[keep_from:], maxlen=self.spot_prices.maxlen)
-            self.futures_prices = deque(list(self.futures_prices)[keep_from:], maxlen=self.futures_prices.maxlen)
-            self.spot_spreads = deque(list(self.spot_spreads)[keep_from:], maxlen=self.spot_spreads.maxlen)
-            self.futures_spreads = deque(list(self.futures_spreads)[keep_from:], maxlen=self.futures_spreads.maxlen)
-            self.timestamps = deque(list(self.timestamps)[keep_from:], maxlen=self.timestamps.maxlen)
+            for name in SERIES + ('timestamps',):
+                buffer = getattr(self, name)
+                setattr(self, name, RingBuffer(self.max_history_minutes, buffer.values()[keep_from:]))
+            self._rebuild_indicators()
             
             self.logger.info(f"🧹 Cleaned old data, kept {len(self.spot_prices)} recent points")
\ No newline at end of file
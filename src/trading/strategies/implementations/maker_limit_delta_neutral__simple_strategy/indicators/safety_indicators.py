@@ -27,6 +27,10 @@ class SafetyIndicators:
         self.max_spread_ratio = config.get('max_spread_ratio', 1.5)  # futures <= 1.5x spot
         self.min_data_points = config.get('min_data_points', 10)
         
+        # Indicator windows (samples = minutes)
+        self.spread_window_minutes = 5
+        self.volatility_window_minutes = 20
+        
         # Logging control
         self.last_log_time = 0
         self.log_interval = 300  # Log safety status every 5 minutes
@@ -74,15 +78,16 @@ class SafetyIndicators:
         
         Returns True if futures trading should be avoided due to wide spreads.
         """
-        recent_spreads = self.state.get_recent_spreads(minutes=5)
+        spot_window = self.state.window('spot_spreads', self.spread_window_minutes)
+        futures_window = self.state.window('futures_spreads', self.spread_window_minutes)
         
-        if not recent_spreads['spot_spreads'] or not recent_spreads['futures_spreads']:
+        if not len(spot_window) or not len(futures_window):
             self.logger.warning("No spread data available, blocking trading")
             return True  # Conservative: block if no spread data
         
-        # Calculate average spreads over last 5 minutes
-        avg_spot_spread = sum(recent_spreads['spot_spreads']) / len(recent_spreads['spot_spreads'])
-        avg_futures_spread = sum(recent_spreads['futures_spreads']) / len(recent_spreads['futures_spreads'])
+        # Average spreads over last 5 minutes
+        avg_spot_spread = spot_window.mean
+        avg_futures_spread = futures_window.mean
         
         # Check if futures spread is too wide relative to spot
         spread_ratio = avg_futures_spread / avg_spot_spread if avg_spot_spread > 0 else float('inf')
@@ -99,19 +104,12 @@ class SafetyIndicators:
         
         Returns True if volatility exceeds safe trading thresholds.
         """
-        recent_prices = self.state.get_recent_prices(minutes=20)
+        volatility_pct = self._volatility_pct()
         
-        if len(recent_prices['spot_prices']) < 10:  # Need at least 10 minutes
+        if volatility_pct is None:  # Need at least 10 minutes
             self.logger.debug("Insufficient price history for volatility check")
             return True  # Conservative: block if insufficient data
         
-        spot_prices = recent_prices['spot_prices']
-        
-        # Calculate price range volatility
-        price_range = max(spot_prices) - min(spot_prices)
-        current_price = spot_prices[-1]
-        volatility_pct = (price_range / current_price) * 100
-        
         is_volatile = volatility_pct > self.max_volatility_threshold
         
         if is_volatile:
@@ -119,6 +117,13 @@ class SafetyIndicators:
         
         return is_volatile
     
+    def _volatility_pct(self):
+        """Spot price range over the volatility window in percent (None if < 10 points)."""
+        window = self.state.window('spot_prices', self.volatility_window_minutes)
+        if len(window) < 10:
+            return None
+        return (window.range / window.last()) * 100
+    
     def _data_is_fresh(self) -> bool:
         """Check if market data is recent enough for trading decisions."""
         
@@ -139,8 +144,8 @@ class SafetyIndicators:
     def get_safety_metrics(self) -> Dict:
         """Get current safety metrics for monitoring."""
         
-        recent_spreads = self.state.get_recent_spreads(minutes=5)
-        recent_prices = self.state.get_recent_prices(minutes=20)
+        spot_window = self.state.window('spot_spreads', self.spread_window_minutes)
+        futures_window = self.state.window('futures_spreads', self.spread_window_minutes)
         
         metrics = {
             'data_points': len(self.state.spot_prices),
@@ -149,9 +154,9 @@ class SafetyIndicators:
         }
         
         # Add spread metrics
-        if recent_spreads['spot_spreads'] and recent_spreads['futures_spreads']:
-            avg_spot_spread = sum(recent_spreads['spot_spreads']) / len(recent_spreads['spot_spreads'])
-            avg_futures_spread = sum(recent_spreads['futures_spreads']) / len(recent_spreads['futures_spreads'])
+        if len(spot_window) and len(futures_window):
+            avg_spot_spread = spot_window.mean
+            avg_futures_spread = futures_window.mean
             spread_ratio = avg_futures_spread / avg_spot_spread if avg_spot_spread > 0 else 0
             
             metrics.update({
@@ -162,12 +167,8 @@ class SafetyIndicators:
             })
         
         # Add volatility metrics
-        if len(recent_prices['spot_prices']) >= 10:
-            spot_prices = recent_prices['spot_prices']
-            price_range = max(spot_prices) - min(spot_prices)
-            current_price = spot_prices[-1]
-            volatility_pct = (price_range / current_price) * 100
-            
+        volatility_pct = self._volatility_pct()
+        if volatility_pct is not None:
             metrics.update({
                 'volatility_pct': volatility_pct,
                 'volatility_safe': volatility_pct <= self.max_volatility_threshold
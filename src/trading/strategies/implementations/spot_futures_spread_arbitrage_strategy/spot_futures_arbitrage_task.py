@@ -16,6 +16,7 @@ from trading.strategies.implementations.base_strategy.unified_position import Po
 
 from trading.strategies.implementations.base_strategy.base_strategy import BaseStrategyContext, BaseStrategyTask
 from trading.analysis.arbitrage_signals import ArbSignal, ArbStats
+from trading.analysis.ring_buffer import RingBuffer
 
 from trading.signals.structs import Signal
 
@@ -25,6 +26,9 @@ TRANSFER_REFRESH_SECONDS = 30
 
 SPOT_FUTURES_ARBITRAGE_TASK_TYPE = "spot_futures_arbitrage_strategy"
 
+# Rolling spread history: 7 days * 24 hours * 12 five-minute intervals
+MAX_SPREAD_HISTORY_POINTS = 2016
+
 
 class SpotFuturesArbitrageTaskContext(BaseStrategyContext, kw_only=True):
     """Context for cross-exchange spot-futures arbitrage execution.
@@ -111,10 +115,10 @@ class SpotFuturesArbitrageTask(BaseStrategyTask[SpotFuturesArbitrageTaskContext]
 
         self._symbol_info: Dict[MarketType, Optional[SymbolInfo]] = {'spot': None, 'futures': None}
 
-        # Initialize historical spreads for signal generation with numpy arrays
+        # Initialize historical spreads for signal generation with preallocated ring buffers
         self.historical_spreads = {
-            'spot_vs_futures': np.array([], dtype=np.float64),
-            'execution_spreads': np.array([], dtype=np.float64)
+            'spot_vs_futures': RingBuffer(MAX_SPREAD_HISTORY_POINTS),
+            'execution_spreads': RingBuffer(MAX_SPREAD_HISTORY_POINTS)
         }
         
         # Spread monitoring
@@ -380,23 +384,23 @@ class SpotFuturesArbitrageTask(BaseStrategyTask[SpotFuturesArbitrageTaskContext]
             
             if spot_df is None or futures_df is None or spot_df.empty or futures_df.empty:
                 self.logger.warning("⚠️ No historical candle data available, using empty arrays")
-                self.historical_spreads['spot_vs_futures'] = np.array([], dtype=np.float64)
-                self.historical_spreads['execution_spreads'] = np.array([], dtype=np.float64)
+                self.historical_spreads['spot_vs_futures'].clear()
+                self.historical_spreads['execution_spreads'].clear()
             else:
                 # Merge candle data on timestamp
                 merged_df = self._merge_and_calculate_spreads(spot_df, futures_df)
                 
                 if len(merged_df) > 0:
-                    # Populate historical spreads arrays
-                    self.historical_spreads['spot_vs_futures'] = merged_df['basis_spread'].values.astype(np.float64)
-                    self.historical_spreads['execution_spreads'] = merged_df['execution_spread'].values.astype(np.float64)
+                    # Populate historical spreads buffers
+                    self.historical_spreads['spot_vs_futures'].extend(merged_df['basis_spread'].values)
+                    self.historical_spreads['execution_spreads'].extend(merged_df['execution_spread'].values)
                     
                     self.logger.info(f"✅ Loaded {len(merged_df)} historical spread data points")
                     self.logger.info(f"📈 Spread range: {merged_df['basis_spread'].min():.4f}% to {merged_df['basis_spread'].max():.4f}%")
                 else:
                     self.logger.warning("⚠️ No merged candle data available")
-                    self.historical_spreads['spot_vs_futures'] = np.array([], dtype=np.float64)
-                    self.historical_spreads['execution_spreads'] = np.array([], dtype=np.float64)
+                    self.historical_spreads['spot_vs_futures'].clear()
+                    self.historical_spreads['execution_spreads'].clear()
             
             self.logger.info("✅ Z-score based signal generation initialized with historical data")
             
@@ -406,8 +410,8 @@ class SpotFuturesArbitrageTask(BaseStrategyTask[SpotFuturesArbitrageTaskContext]
             self.logger.debug(f"Full error traceback: {traceback.format_exc()}")
             
             # Fallback to empty arrays
-            self.historical_spreads['spot_vs_futures'] = np.array([], dtype=np.float64)
-            self.historical_spreads['execution_spreads'] = np.array([], dtype=np.float64)
+            self.historical_spreads['spot_vs_futures'].clear()
+            self.historical_spreads['execution_spreads'].clear()
 
     def candles_to_bid_ask_spread(self, df, exchange_enum: ExchangeEnum):
         # df = df[['close', 'high', 'low']].copy()
@@ -510,21 +514,9 @@ class SpotFuturesArbitrageTask(BaseStrategyTask[SpotFuturesArbitrageTaskContext]
             current_spot_futures_spread = self.spot_vs_futures_spread
             current_execution_spread = self._calculate_execution_spreads()['total']
             
-            # Append current spreads to historical data
-            self.historical_spreads['spot_vs_futures'] = np.append(
-                self.historical_spreads['spot_vs_futures'], 
-                current_spot_futures_spread
-            )
-            self.historical_spreads['execution_spreads'] = np.append(
-                self.historical_spreads['execution_spreads'], 
-                current_execution_spread
-            )
-            
-            # Keep rolling window (maintain last 2016 points = 7 days * 24 hours * 12 five-minute intervals)
-            max_history_points = 2016
-            if len(self.historical_spreads['spot_vs_futures']) > max_history_points:
-                self.historical_spreads['spot_vs_futures'] = self.historical_spreads['spot_vs_futures'][-max_history_points:]
-                self.historical_spreads['execution_spreads'] = self.historical_spreads['execution_spreads'][-max_history_points:]
+            # Append current spreads to historical data (oldest points are evicted in place)
+            self.historical_spreads['spot_vs_futures'].push(current_spot_futures_spread)
+            self.historical_spreads['execution_spreads'].push(current_execution_spread)
             
             # Update timestamp
             self._last_spread_update_time = current_time
@@ -549,7 +541,7 @@ class SpotFuturesArbitrageTask(BaseStrategyTask[SpotFuturesArbitrageTaskContext]
         
         # Rolling statistics (last 20 periods)
         window = 20
-        recent_spreads = historical_spreads[-window:]
+        recent_spreads = historical_spreads.values()[-window:]
         basis_mean = np.mean(recent_spreads)
         basis_std = np.std(recent_spreads)
         
@@ -892,7 +884,7 @@ class SpotFuturesArbitrageTask(BaseStrategyTask[SpotFuturesArbitrageTaskContext]
         except Exception as e:
             self.logger.error(f"🚫 Failed to cancel {tag_str} order", error=str(e))
             # Try to fetch order status instead
-            order = await exchange.fetch_order(symbol, order_id)
+            order = await exchange.wait_for_fill(symbol, order_id)
 
         self._track_order_execution(market_type, order)
         return order
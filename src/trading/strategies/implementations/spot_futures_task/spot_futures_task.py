@@ -16,7 +16,10 @@ Key Features:
 """
 
 import asyncio
+import math
+import time
 import numpy as np
+import pandas as pd
 from collections import deque
 from typing import Dict, Optional, Type, List
 from datetime import datetime, timezone, timedelta
@@ -29,6 +32,8 @@ from infrastructure.logging import HFTLoggerInterface
 from trading.strategies.implementations.base_strategy.pnl_tracker import PositionChange
 from trading.strategies.implementations.base_strategy.position_manager import PositionManager
 from trading.strategies.structs import MarketData
+from trading.analysis.rolling_quantile import RollingQuantile
+from trading.analysis.spread_history_store import get_spread_history_store, rows_after
 
 from trading.strategies.implementations.base_strategy.base_multi_spot_futures_strategy import (
     BaseMultiSpotFuturesArbitrageTask,
@@ -39,6 +44,10 @@ from trading.data_sources.book_ticker.book_ticker_source import BookTickerDbSour
 from utils.logging_utils import disable_default_exchange_logging
 
 
+# Seconds between spread history snapshots
+SPREAD_SNAPSHOT_INTERVAL = 60.0
+
+
 class SpotFuturesTaskContext(BaseMultiSpotFuturesTaskContext, kw_only=True):
     """
     Minimal context for simplified spot-futures arbitrage strategy.
@@ -107,6 +116,12 @@ class SpotFuturesStrategyTask(BaseMultiSpotFuturesArbitrageTask[SpotFuturesTaskC
         # Initialize spread history for quantile calculations (optimized with deque for HFT performance)
         max_history_length = self.context.historical_window_hours * 12  # 5-minute intervals
         self._spread_history: deque = deque(maxlen=max_history_length)
+        # Sorted mirror of the history: O(log n) percentile rank / O(1) std per tick
+        self._spread_quantiles = RollingQuantile(max_history_length)
+        
+        # Spread history snapshots for warm restarts
+        self._spread_store = get_spread_history_store()
+        self._last_spread_snapshot = time.monotonic()
         self._daily_trade_count: Dict[str, int] = {}
         
         # Current arbitrage state (simplified)
@@ -131,8 +146,16 @@ class SpotFuturesStrategyTask(BaseMultiSpotFuturesArbitrageTask[SpotFuturesTaskC
 
     async def stop(self):
         """Handle strategy shutdown."""
+        if self._historical_data_loaded:
+            self._save_spread_snapshot()
         await super().stop()
 
+    @property
+    def _spread_snapshot_key(self) -> str:
+        """Snapshot key: strategy, symbol and exchange pair."""
+        return (f"{self.context.name}_{self.context.symbol.base}_{self.context.symbol.quote}_"
+                f"{self.spot_exchange.name}_{self.futures_exchange.name}")
+
     def get_spot_book_ticker(self) -> BookTicker:
         """Get current spot book ticker."""
         return self._spot_ex[0].public.book_ticker[self.context.symbol]
@@ -143,7 +166,11 @@ class SpotFuturesStrategyTask(BaseMultiSpotFuturesArbitrageTask[SpotFuturesTaskC
 
     async def _load_initial_spread_history(self):
         """
-        Load initial spread history from database book ticker snapshots.
+        Load initial spread history, preferring the local snapshot.
+        
+        A snapshot written by a previous run is restored and only the gap since it
+        was written is loaded from the database. Without a (fresh) snapshot the
+        full window is loaded from database book ticker snapshots.
         
         This provides historical context for quantile-based threshold calculations
         similar to mexc_gateio_futures_arbitrage_signal.py preloading.
@@ -152,26 +179,18 @@ class SpotFuturesStrategyTask(BaseMultiSpotFuturesArbitrageTask[SpotFuturesTaskC
             if self._historical_data_loaded:
                 return
 
+            if await self._spread_store.warm_start(self._spread_snapshot_key, {'max_spread': self._spread_history},
+                                                   backfill=self._backfill_spread_history,
+                                                   max_age_seconds=self.context.historical_window_hours * 3600):
+                self.logger.info(f"✅ Restored spread history with {len(self._spread_history)} data points from snapshot")
+                self._sync_spread_quantiles()
+                self._historical_data_loaded = True
+                return
+
             self.logger.info("📊 Loading initial spread history from database...")
             
-            # Create BookTickerDbSource for historical data
-            db_source = BookTickerDbSource()
-            
-            # Define exchanges to load data for
-            exchanges = [self.spot_exchange, self.futures_exchange]
-            
             # Load historical data (use same timeframe as signal uses for backtesting)
-            end_time = datetime.now(timezone.utc)
-            # start_time = end_time - timedelta(hours=self.context.historical_window_hours)
-            
-            # Get multi-exchange data for both spot and futures
-            df = await db_source.get_multi_exchange_data(
-                exchanges=exchanges, 
-                symbol=self.context.symbol, 
-                hours=self.context.historical_window_hours,
-                date_to=end_time,
-                timeframe=KlineInterval.MINUTE_1 # 5-minute intervals for good granularity
-            )
+            df = await self._load_book_ticker_history(self.context.historical_window_hours)
             
             if df.empty:
                 self.logger.warning("⚠️ No historical book ticker data found in database")
@@ -179,36 +198,10 @@ class SpotFuturesStrategyTask(BaseMultiSpotFuturesArbitrageTask[SpotFuturesTaskC
             
             self.logger.info(f"📈 Loaded {len(df)} historical data points")
             
-            # Generate dynamic column keys for consistency
-            spot_bid_col = get_column_key(self.spot_exchange, 'bid_price')
-            spot_ask_col = get_column_key(self.spot_exchange, 'ask_price')
-            futures_bid_col = get_column_key(self.futures_exchange, 'bid_price')
-            futures_ask_col = get_column_key(self.futures_exchange, 'ask_price')
-            
-            # Check if required columns exist
-            required_cols = [spot_bid_col, spot_ask_col, futures_bid_col, futures_ask_col]
-            missing_cols = [col for col in required_cols if col not in df.columns]
-            
-            if missing_cols:
-                self.logger.warning(f"⚠️ Missing columns in historical data: {missing_cols}")
+            historical_spreads = self._historical_spreads_from_df(df)
+            if historical_spreads is None:
                 return
             
-            # Calculate historical fee-adjusted spreads
-            total_fees = self.context.spot_taker_fee + self.context.futures_taker_fee
-            
-            # Spot to Futures: Buy spot, sell futures
-            # Profitable when: futures_bid - spot_ask > total_fees  
-            spot_to_futures_spreads = ((df[futures_bid_col] - df[spot_ask_col]) / 
-                                       df[spot_ask_col]) - total_fees
-            
-            # Futures to Spot: Buy futures, sell spot
-            # Profitable when: spot_bid - futures_ask > total_fees
-            futures_to_spot_spreads = ((df[spot_bid_col] - df[futures_ask_col]) / 
-                                       df[futures_ask_col]) - total_fees
-            
-            # Use maximum spread for simplified history tracking (similar to signal logic)
-            historical_spreads = np.maximum(spot_to_futures_spreads, futures_to_spot_spreads)
-            
             # Filter out NaN values and convert to list
             valid_spreads = historical_spreads.dropna().tolist()
             
@@ -216,18 +209,86 @@ class SpotFuturesStrategyTask(BaseMultiSpotFuturesArbitrageTask[SpotFuturesTaskC
                 # Initialize deque with recent data (deque will automatically limit to maxlen)
                 recent_data = valid_spreads[-self.context.historical_window_hours * 60:]  # Keep recent data
                 self._spread_history.extend(recent_data)
+                self._sync_spread_quantiles()
                 self.logger.info(f"✅ Initialized spread history with {len(self._spread_history)} data points")
                 self.logger.info(f"📊 Spread range: {min(self._spread_history):.4f}% to {max(self._spread_history):.4f}%")
             else:
                 self.logger.warning("⚠️ No valid spread data calculated from historical book tickers")
             
             self._historical_data_loaded = True
+            self._save_spread_snapshot()
             
         except Exception as e:
             self.logger.error(f"❌ Error loading initial spread history: {e}")
             import traceback
             traceback.print_exc()
 
+    async def _load_book_ticker_history(self, hours: int) -> pd.DataFrame:
+        """Load spot and futures book ticker history for the last `hours` from the database."""
+        # Create BookTickerDbSource for historical data
+        db_source = BookTickerDbSource()
+        
+        # Get multi-exchange data for both spot and futures
+        return await db_source.get_multi_exchange_data(
+            exchanges=[self.spot_exchange, self.futures_exchange],
+            symbol=self.context.symbol, 
+            hours=hours,
+            date_to=datetime.now(timezone.utc),
+            timeframe=KlineInterval.MINUTE_1
+        )
+
+    def _historical_spreads_from_df(self, df: pd.DataFrame) -> Optional[pd.Series]:
+        """Maximum fee-adjusted spread per row of a book ticker history frame."""
+        # Generate dynamic column keys for consistency
+        spot_bid_col = get_column_key(self.spot_exchange, 'bid_price')
+        spot_ask_col = get_column_key(self.spot_exchange, 'ask_price')
+        futures_bid_col = get_column_key(self.futures_exchange, 'bid_price')
+        futures_ask_col = get_column_key(self.futures_exchange, 'ask_price')
+        
+        # Check if required columns exist
+        required_cols = [spot_bid_col, spot_ask_col, futures_bid_col, futures_ask_col]
+        missing_cols = [col for col in required_cols if col not in df.columns]
+        
+        if missing_cols:
+            self.logger.warning(f"⚠️ Missing columns in historical data: {missing_cols}")
+            return None
+        
+        # Calculate historical fee-adjusted spreads
+        total_fees = self.context.spot_taker_fee + self.context.futures_taker_fee
+        
+        # Spot to Futures: Buy spot, sell futures
+        # Profitable when: futures_bid - spot_ask > total_fees  
+        spot_to_futures_spreads = ((df[futures_bid_col] - df[spot_ask_col]) / 
+                                   df[spot_ask_col]) - total_fees
+        
+        # Futures to Spot: Buy futures, sell spot
+        # Profitable when: spot_bid - futures_ask > total_fees
+        futures_to_spot_spreads = ((df[spot_bid_col] - df[futures_ask_col]) / 
+                                   df[futures_ask_col]) - total_fees
+        
+        # Use maximum spread for simplified history tracking (similar to signal logic)
+        return np.maximum(spot_to_futures_spreads, futures_to_spot_spreads)
+
+    async def _backfill_spread_history(self, since: float) -> Dict[str, np.ndarray]:
+        """Spreads newer than `since` (epoch seconds) for the snapshot gap."""
+        hours = max(1, math.ceil((time.time() - since) / 3600))
+        df = rows_after(await self._load_book_ticker_history(hours), since)
+        if df.empty:
+            return {}
+        historical_spreads = self._historical_spreads_from_df(df)
+        if historical_spreads is None:
+            return {}
+        return {'max_spread': historical_spreads.dropna().values}
+
+    def _save_spread_snapshot(self):
+        """Queue a spread history snapshot (written off the event loop)."""
+        self._last_spread_snapshot = time.monotonic()
+        try:
+            self._spread_store.save(self._spread_snapshot_key, {'max_spread': self._spread_history},
+                                    interval_seconds=60.0)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Failed to snapshot spread history: {e}")
+
     @property
     def spot_position_qty(self) -> float:
         """Get current spot position quantity."""
@@ -275,12 +336,17 @@ class SpotFuturesStrategyTask(BaseMultiSpotFuturesArbitrageTask[SpotFuturesTaskC
             'futures_to_spot': futures_to_spot_spread
         }
 
+    def _sync_spread_quantiles(self):
+        """Rebuild the sorted spread window after bulk history loads."""
+        self._spread_quantiles = RollingQuantile(self._spread_history.maxlen, values=self._spread_history)
+
     def update_spread_history(self, spreads: Dict[str, float]) -> Dict[str, float]:
         """
         Update spread history and calculate percentiles for threshold decisions.
         
         Integrated from signal logic (lines 156-177) with simplified single-spread tracking.
-        Optimized with deque for O(1) append operations in HFT environments.
+        The history is mirrored in a RollingQuantile, so the percentile rank costs
+        O(log n) per tick instead of sorting the full history.
         
         Args:
             spreads: Current spread calculations
@@ -291,16 +357,16 @@ class SpotFuturesStrategyTask(BaseMultiSpotFuturesArbitrageTask[SpotFuturesTaskC
         # Use the maximum spread for history tracking (simplified approach)
         current_max_spread = max(spreads['spot_to_futures'], spreads['futures_to_spot'])
         self._spread_history.append(current_max_spread)  # O(1) append with automatic size limiting
+        self._spread_quantiles.push(current_max_spread)
+        if time.monotonic() - self._last_spread_snapshot >= SPREAD_SNAPSHOT_INTERVAL:
+            self._save_spread_snapshot()
         
         # Calculate percentiles for current spreads (need sufficient history)
         if len(self._spread_history) < 50:
             return {'percentile_rank': 50.0, 'volatility': 0.0, 'sufficient_history': False}
         
-        sorted_history = sorted(self._spread_history)
-        percentile_rank = (np.searchsorted(sorted_history, current_max_spread) / 
-                          len(sorted_history) * 100)
-        
-        volatility = np.std(self._spread_history)
+        percentile_rank = self._spread_quantiles.percentile_rank(current_max_spread)
+        volatility = self._spread_quantiles.std
         
         return {
             'percentile_rank': percentile_rank,
@@ -150,6 +150,9 @@ class StrategyTaskManager:
         # Clean up all task resources
         await self._cleanup_task_resources()
 
+        # Wait for queued context saves without blocking the loop
+        await self._persistence.drain()
+
     
     async def _cleanup_task_resources(self):
         """Clean up all task resources including exchange connections."""
@@ -251,7 +254,7 @@ class StrategyTaskManager:
         """Recover tasks from persistence storage using TaskRecovery helper."""
         try:
             # Load all active tasks
-            raw_contexts = self._persistence.load_active_task_raw_context()
+            raw_contexts = await self._persistence.load_active_task_raw_context()
 
             for task_name, json_data in raw_contexts:
                 try:
@@ -1,66 +1,80 @@
 import time
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from infrastructure.logging import HFTLoggerInterface
+from trading.task_manager.persistence import STATE_DIRS, state_dir_name
+from trading.task_manager.persistence_writer import DurabilityPolicy, PersistenceWriter
 
 
 class TaskPersistenceManager:
-    """Manages task persistence and recovery with atomic operations and state-based organization."""
+    """Manages task persistence and recovery with atomic operations and state-based organization.
 
-    def __init__(self, logger: HFTLoggerInterface, base_path: str = "task_data"):
+    Writes go through a background PersistenceWriter (coalesced per task,
+    fsync + atomic rename), so saving never blocks the event loop on disk I/O.
+    """
+
+    def __init__(self, logger: HFTLoggerInterface, base_path: str = "task_data",
+                 durability: Optional[DurabilityPolicy] = None):
         self.logger = logger
         self.base_path = Path(base_path)
         self._ensure_directories()
+        self._writer = PersistenceWriter(logger, durability, name="strategy-task-persistence")
 
     def _ensure_directories(self):
         """Create necessary directory structure."""
-        dirs = ["active", "completed", "errored"]
-        for dir_name in dirs:
+        for dir_name in STATE_DIRS:
             (self.base_path / dir_name).mkdir(parents=True, exist_ok=True)
 
     def save_context(self, task_name: str, status: str, raw_context: str) -> bool:
-        """Save task context to appropriate directory based on state.
+        """Queue task context for saving to the directory of its state.
 
         Args:
             task_name: Unique task identifier
-            context: Task context to save
+            status: Task status selecting the directory
+            raw_context: Serialized context
 
         Returns:
-            bool: True if save successful, False otherwise
+            bool: True if the save was queued
         """
         try:
-            # Determine directory based on state
-            if status == 'completed':
-                dir_path = self.base_path / "completed"
-            elif status in ['error', 'cancelled']:
-                dir_path = self.base_path / "errored"
-            else:
-                dir_path = self.base_path / "active"
-
-            # Atomic write with temp file
-            temp_path = dir_path / f".{task_name}.tmp"
-            final_path = dir_path / f"{task_name}.json"
-
-            # Write atomically
-            temp_path.write_text(raw_context)
-            temp_path.rename(final_path)
-
-            # Clean up old location if task moved directories
-            self._cleanup_old_locations(task_name, dir_path)
-
+            dir_name = state_dir_name(status)
+            self._writer.submit(
+                task_name,
+                self.base_path / dir_name / f"{task_name}.json",
+                raw_context.encode(),
+                # Clean up old location if task moved directories
+                remove=[self.base_path / other / f"{task_name}.json" for other in STATE_DIRS if other != dir_name]
+            )
             return True
 
         except Exception as e:
             self.logger.error(f"Failed to save task {task_name}", error=str(e))
             return False
 
-    def load_active_task_raw_context(self) -> List[Tuple[str, str]]:
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until all queued saves are on disk (False on timeout)."""
+        return self._writer.flush(timeout)
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all queued saves are on disk without blocking the event loop (False on timeout)."""
+        return await self._writer.drain(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Flush queued saves and stop the writer thread."""
+        self._writer.close(timeout)
+
+    def get_writer_stats(self) -> Dict[str, object]:
+        """Background writer statistics (pending, writes, coalesced, failures, max_write_ms)."""
+        return self._writer.stats()
+
+    async def load_active_task_raw_context(self) -> List[Tuple[str, str]]:
         """Load all active task data for recovery.
 
         Returns:
             List[Tuple[str, str]]: List of (task_id, json_data) tuples
         """
+        await self._writer.drain()
         active_dir = self.base_path / "active"
         tasks = []
 
@@ -74,20 +88,6 @@ class TaskPersistenceManager:
 
         return tasks
 
-    def _cleanup_old_locations(self, task_id: str, current_dir: Path):
-        """Remove task files from other directories when moved.
-
-        Args:
-            task_id: Task identifier
-            current_dir: Current directory where task is now stored
-        """
-        for dir_name in ["active", "completed", "errored"]:
-            dir_path = self.base_path / dir_name
-            if dir_path != current_dir:
-                old_file = dir_path / f"{task_id}.json"
-                if old_file.exists():
-                    old_file.unlink()
-
     def cleanup_completed(self, max_age_hours: int = 24):
         """Remove old completed tasks.
 
@@ -5,25 +5,49 @@ from typing import Dict, List, Optional, Tuple, Type, TypeVar
 
 from infrastructure.logging import HFTLoggerInterface
 from trading.tasks.base_task import TaskContext
+from trading.task_manager.persistence_writer import DurabilityPolicy, PersistenceWriter
 from trading.task_manager.serialization import TaskSerializer
 from trading.struct import TradingStrategyState
 
 T = TypeVar('T', bound=TaskContext)
 
 
+STATE_DIRS = ("active", "completed", "errored")
+
+
+def state_dir_name(state: str) -> str:
+    """Persistence directory for a task state."""
+    if state == 'completed':
+        return "completed"
+    if state in ['error', 'cancelled']:
+        return "errored"
+    return "active"
+
+
 class TaskPersistenceManager:
-    """Manages task persistence and recovery with atomic operations and state-based organization."""
+    """Manages task persistence and recovery with atomic operations and state-based organization.
+    
+    Saves are encoded on the caller's thread and written by a background
+    PersistenceWriter (coalesced per task, fsync + atomic rename).
+    """
     
-    def __init__(self, logger: HFTLoggerInterface, base_path: str = "task_data"):
+    def __init__(self, logger: HFTLoggerInterface, base_path: str = "task_data",
+                 durability: Optional[DurabilityPolicy] = None):
+        """
+        Args:
+            logger: Logger for persistence events
+            base_path: Root directory of the task files
+            durability: Write policy (default: write every change, fsync)
+        """
         self.logger = logger
         self.base_path = Path(base_path)
         self._ensure_directories()
         self._init_metadata()
+        self._writer = PersistenceWriter(logger, durability, name="task-persistence")
     
     def _ensure_directories(self):
         """Create necessary directory structure."""
-        dirs = ["active", "completed", "errored"]
-        for dir_name in dirs:
+        for dir_name in STATE_DIRS:
             (self.base_path / dir_name).mkdir(parents=True, exist_ok=True)
     
     def _init_metadata(self):
@@ -38,46 +62,56 @@ class TaskPersistenceManager:
             metadata_path.write_text(json.dumps(metadata, indent=2))
     
     def save_context(self, task_id: str, context: TaskContext) -> bool:
-        """Save task context to appropriate directory based on state.
+        """Queue task context for saving to the directory of its state.
         
         Args:
             task_id: Unique task identifier
-            context: Task context to save
+            context: Task context to save (snapshotted before returning)
             
         Returns:
-            bool: True if save successful, False otherwise
+            bool: True if the snapshot was queued, False if it could not be encoded
         """
         try:
-            # Determine directory based on state
-            if context.state == 'completed':
-                dir_path = self.base_path / "completed"
-            elif context.state in ['error', 'cancelled']:
-                dir_path = self.base_path / "errored"
-            else:
-                dir_path = self.base_path / "active"
-            
-            # Atomic write with temp file
-            temp_path = dir_path / f".{task_id}.tmp"
-            final_path = dir_path / f"{task_id}.json"
-            
-            # Serialize context using centralized serializer
-            data = TaskSerializer.serialize_context(context)
-            
-            # Write atomically
-            temp_path.write_text(data)
-            temp_path.rename(final_path)
-            
-            # Clean up old location if task moved directories
-            self._cleanup_old_locations(task_id, dir_path)
-            
-            return True
-            
+            data = TaskSerializer.encode_context(context)
         except Exception as e:
             self.logger.error(f"Failed to save task {task_id}", error=str(e))
             return False
+        
+        dir_name = state_dir_name(context.state)
+        self._writer.submit(
+            task_id,
+            self.base_path / dir_name / f"{task_id}.json",
+            data,
+            # Clean up old location if task moved directories
+            remove=[self.base_path / other / f"{task_id}.json" for other in STATE_DIRS if other != dir_name]
+        )
+        return True
     
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until all queued saves are on disk.
+        
+        Returns:
+            False if the timeout expired first
+        """
+        return self._writer.flush(timeout)
     
-    def load_context(self, task_id: str, context_class: Type[T]) -> Optional[T]:
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all queued saves are on disk without blocking the event loop.
+        
+        Returns:
+            False if the timeout expired first
+        """
+        return await self._writer.drain(timeout)
+    
+    def close(self, timeout: Optional[float] = 5.0):
+        """Flush queued saves and stop the writer thread."""
+        self._writer.close(timeout)
+    
+    def get_writer_stats(self) -> Dict[str, object]:
+        """Background writer statistics (pending, writes, coalesced, failures, max_write_ms)."""
+        return self._writer.stats()
+    
+    async def load_context(self, task_id: str, context_class: Type[T]) -> Optional[T]:
         """Load a specific task context.
         
         Args:
@@ -87,6 +121,9 @@ class TaskPersistenceManager:
         Returns:
             Optional[T]: Loaded context or None if not found/failed
         """
+        # Queued saves first, so the latest snapshot is read
+        await self._writer.drain()
+        
         # Search in all directories
         for dir_name in ["active", "errored", "completed"]:
             file_path = self.base_path / dir_name / f"{task_id}.json"
@@ -100,12 +137,13 @@ class TaskPersistenceManager:
         return None
     
     
-    def load_active_tasks(self) -> List[Tuple[str, str]]:
+    async def load_active_tasks(self) -> List[Tuple[str, str]]:
         """Load all active task data for recovery.
         
         Returns:
             List[Tuple[str, str]]: List of (task_id, json_data) tuples
         """
+        await self._writer.drain()
         active_dir = self.base_path / "active"
         tasks = []
         
@@ -119,20 +157,6 @@ class TaskPersistenceManager:
         
         return tasks
     
-    def _cleanup_old_locations(self, task_id: str, current_dir: Path):
-        """Remove task files from other directories when moved.
-        
-        Args:
-            task_id: Task identifier
-            current_dir: Current directory where task is now stored
-        """
-        for dir_name in ["active", "completed", "errored"]:
-            dir_path = self.base_path / dir_name
-            if dir_path != current_dir:
-                old_file = dir_path / f"{task_id}.json"
-                if old_file.exists():
-                    old_file.unlink()
-    
     def cleanup_completed(self, max_age_hours: int = 24):
         """Remove old completed tasks.
         
@@ -158,12 +182,12 @@ class TaskPersistenceManager:
             Dict[str, int]: Statistics by directory
         """
         stats = {}
-        for dir_name in ["active", "completed", "errored"]:
+        for dir_name in STATE_DIRS:
             dir_path = self.base_path / dir_name
             stats[dir_name] = len(list(dir_path.glob("*.json")))
         return stats
     
-    def remove_task(self, task_id: str) -> bool:
+    async def remove_task(self, task_id: str) -> bool:
         """Remove a task from all directories.
         
         Args:
@@ -172,12 +196,11 @@ class TaskPersistenceManager:
         Returns:
             bool: True if task was found and removed
         """
-        found = False
-        for dir_name in ["active", "completed", "errored"]:
-            file_path = self.base_path / dir_name / f"{task_id}.json"
-            if file_path.exists():
-                file_path.unlink()
-                found = True
+        # A save still queued counts as persisted: let it land before looking
+        await self._writer.drain()
+        paths = [self.base_path / dir_name / f"{task_id}.json" for dir_name in STATE_DIRS]
+        found = any(path.exists() for path in paths)
+        self._writer.submit(task_id, None, remove=paths)
         
         if found:
             self.logger.info(f"Removed task {task_id} from persistence")
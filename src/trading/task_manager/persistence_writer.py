@@ -0,0 +1,232 @@
+"""Background writer for task persistence files.
+
+Encoding a context snapshot is cheap and stays on the event loop (so later
+mutations cannot leak into the snapshot); file I/O, fsync and atomic rename run
+on a dedicated thread so disk stalls never block order handling.
+
+Pending writes are coalesced per key: if a task changes state several times
+before the writer gets to it, only the latest snapshot is written.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from infrastructure.logging import HFTLoggerInterface
+
+
+@dataclass(frozen=True)
+class DurabilityPolicy:
+    """When and how the writer makes snapshots durable.
+
+    Attributes:
+        flush_interval_ms: 0 = write every change as soon as it is submitted;
+            N > 0 = write at most every N ms (changes within the window are coalesced)
+        fsync: fsync files and directories before/after the atomic rename
+    """
+    flush_interval_ms: float = 0.0
+    fsync: bool = True
+
+    @classmethod
+    def every_change(cls, fsync: bool = True) -> 'DurabilityPolicy':
+        return cls(0.0, fsync)
+
+    @classmethod
+    def every(cls, interval_ms: float, fsync: bool = True) -> 'DurabilityPolicy':
+        return cls(float(interval_ms), fsync)
+
+
+@dataclass
+class _WriteOp:
+    path: Optional[Path]               # None = delete only
+    data: bytes
+    remove: Tuple[Path, ...]           # Files removed after the write (e.g. the task's old state directory)
+
+
+class PersistenceWriter:
+    """Coalescing background file writer with atomic replace.
+
+    Usage:
+        writer = PersistenceWriter(logger, DurabilityPolicy.every(50))
+        writer.submit('task-1', Path('active/task-1.json'), data)
+        writer.flush()   # Block until everything submitted so far is on disk
+        await writer.drain()   # Same, from a coroutine without blocking the event loop
+    """
+
+    def __init__(self, logger: HFTLoggerInterface, policy: Optional[DurabilityPolicy] = None,
+                 name: str = "persistence-writer"):
+        """
+        Args:
+            logger: Logger for write failures
+            policy: Durability policy (default: every change, fsync)
+            name: Writer thread name
+        """
+        self.logger = logger
+        self.policy = policy or DurabilityPolicy()
+        self.name = name
+
+        self._pending: Dict[str, _WriteOp] = {}
+        self._condition = threading.Condition()
+        self._submitted = 0                 # Sequence of the last submitted op
+        self._completed = 0                 # Sequence up to which everything is written
+        self._flush_requested = 0           # flush() target overriding the flush interval
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        # Statistics
+        self.writes = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.max_write_ms = 0.0
+        self.last_error: Optional[str] = None
+
+    # -------------------------------------------------------------------------
+    # Producer side (event loop)
+    # -------------------------------------------------------------------------
+
+    def submit(self, key: str, path: Optional[Path], data: bytes = b"", remove: Iterable[Path] = ()) -> None:
+        """Queue a write (replacing any pending write for the same key).
+
+        Args:
+            key: Coalescing key (task id)
+            path: Destination file (None to only remove files)
+            data: File content
+            remove: Files to delete once the write is done
+        """
+        op = _WriteOp(Path(path) if path is not None else None, data, tuple(Path(p) for p in remove))
+        with self._condition:
+            if self._closed:
+                raise RuntimeError(f"{self.name} is closed")
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = op
+            self._submitted += 1
+            self._ensure_thread()
+            self._condition.notify_all()
+
+    def pending(self) -> int:
+        """Number of keys waiting to be written."""
+        with self._condition:
+            return len(self._pending)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write everything submitted so far (ignoring the flush interval).
+
+        Returns:
+            False if the timeout expired first
+        """
+        with self._condition:
+            target = self._submitted
+            if self._completed >= target:
+                return True
+            self._flush_requested = target
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: self._completed >= target, timeout)
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """flush() for coroutines: wait on a worker thread so the event loop keeps running.
+
+        Returns:
+            False if the timeout expired first
+        """
+        with self._condition:
+            if self._completed >= self._submitted:
+                return True
+        return await asyncio.to_thread(self.flush, timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Flush pending writes and stop the writer thread."""
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, object]:
+        with self._condition:
+            return {
+                'pending': len(self._pending),
+                'writes': self.writes,
+                'coalesced': self.coalesced,
+                'failures': self.failures,
+                'max_write_ms': self.max_write_ms,
+                'last_error': self.last_error,
+            }
+
+    # -------------------------------------------------------------------------
+    # Writer thread
+    # -------------------------------------------------------------------------
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        interval = self.policy.flush_interval_ms / 1000.0
+        last_flush = 0.0
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if not self._pending and self._closed:
+                    return
+                if interval > 0:
+                    # Coalesce changes until the interval since the last flush elapsed
+                    due = last_flush + interval
+                    while self._flush_requested <= self._completed and not self._closed:
+                        remaining = due - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                batch, self._pending = self._pending, {}
+                sequence = self._submitted
+
+            for key, op in batch.items():
+                self._write(key, op)
+            last_flush = time.monotonic()
+
+            with self._condition:
+                # Submissions after the batch was taken are still pending
+                self._completed = sequence
+                self._condition.notify_all()
+
+    def _write(self, key: str, op: _WriteOp) -> None:
+        started = time.perf_counter()
+        try:
+            if op.path is not None:
+                self._atomic_write(op.path, op.data)
+            for path in op.remove:
+                if path != op.path:
+                    try:
+                        path.unlink()
+                    except FileNotFoundError:
+                        pass
+            self.writes += 1
+        except Exception as e:
+            self.failures += 1
+            self.last_error = f"{key}: {e}"
+            self.logger.error(f"Failed to persist {key}", error=str(e))
+        finally:
+            self.max_write_ms = max(self.max_write_ms, (time.perf_counter() - started) * 1000)
+
+    def _atomic_write(self, path: Path, data: bytes) -> None:
+        temp_path = path.with_name(f".{path.name}.tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            if self.policy.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        if self.policy.fsync:
+            # Persist the rename itself
+            dir_fd = os.open(path.parent, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
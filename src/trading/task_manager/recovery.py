@@ -26,7 +26,7 @@ class TaskRecovery:
             List[Tuple[str, str]]: List of (task_id, json_data) tuples
         """
         try:
-            active_tasks = self.persistence.load_active_tasks()
+            active_tasks = await self.persistence.load_active_tasks()
             self.logger.info(f"Found {len(active_tasks)} tasks to recover")
             return active_tasks
             
@@ -0,0 +1,265 @@
+"""Deadline scheduler for TaskManager.
+
+Keeps a min-heap of (deadline, sequence, task_id) entries so the execution loop
+can sleep until the earliest deadline instead of polling every task. Market-data
+handlers wake tasks early through an asyncio.Event.
+
+Removal and rescheduling are O(log n): the live deadline of each task is kept in
+a dict and superseded heap entries are skipped lazily when they reach the top
+(the heap is compacted when stale entries dominate).
+"""
+
+import asyncio
+import heapq
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+# Dispatch reasons
+DISPATCH_TIMER = 'timer'    # Deadline reached
+DISPATCH_WAKEUP = 'wakeup'  # Woken by a market-data tick before its deadline
+
+
+class LagHistogram:
+    """Fixed-bucket histogram of scheduling lag in milliseconds."""
+
+    DEFAULT_BUCKETS_MS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 1000.0)
+
+    def __init__(self, buckets_ms: Optional[Sequence[float]] = None):
+        """
+        Args:
+            buckets_ms: Ascending bucket upper bounds (an overflow bucket is added)
+        """
+        self.buckets_ms: Tuple[float, ...] = tuple(buckets_ms or self.DEFAULT_BUCKETS_MS)
+        self.reset()
+
+    def reset(self) -> None:
+        self.counts: List[int] = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, lag_ms: float) -> None:
+        lag_ms = max(0.0, lag_ms)
+        self.counts[bisect_left(self.buckets_ms, lag_ms)] += 1
+        self.count += 1
+        self.total_ms += lag_ms
+        if lag_ms > self.max_ms:
+            self.max_ms = lag_ms
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (max lag for the overflow bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return self.buckets_ms[i] if i < len(self.buckets_ms) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'count': self.count,
+            'mean_ms': self.mean_ms,
+            'max_ms': self.max_ms,
+            'p50_ms': self.percentile(50),
+            'p99_ms': self.percentile(99),
+            'buckets': {f"<={b:g}ms": c for b, c in zip(self.buckets_ms, self.counts)} | {'overflow': self.counts[-1]},
+        }
+
+
+class DeadlineScheduler:
+    """Min-heap of task deadlines with tick wakeups.
+
+    A task is either scheduled (it has a live deadline in the heap) or dispatched
+    (popped by pop_due and running until it is scheduled again). Waking a
+    dispatched task makes its next schedule() call due immediately.
+    """
+
+    # Compact the heap when stale entries exceed live ones by this margin
+    COMPACT_SLACK = 64
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            clock: Monotonic time source in seconds
+        """
+        self.clock = clock
+        self._heap: List[Tuple[float, int, str]] = []
+        self._live: Dict[str, Tuple[float, int]] = {}        # task_id -> (deadline, sequence)
+        self._sequence = 0
+        self._dispatched: Set[str] = set()                   # Popped by pop_due, not rescheduled yet
+        self._woken_at: Dict[str, float] = {}                # task_id -> first wakeup since its last dispatch
+        self._subscriptions: Dict[Hashable, Set[str]] = defaultdict(set)
+        self._task_keys: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._event = asyncio.Event()
+
+        self.timer_lag = LagHistogram()
+        self.wakeup_lag = LagHistogram()
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._live
+
+    # -------------------------------------------------------------------------
+    # Scheduling
+    # -------------------------------------------------------------------------
+
+    def schedule(self, task_id: str, deadline: Optional[float] = None) -> None:
+        """Set (or replace) the deadline of a task; None = due now."""
+        now = self.clock()
+        if deadline is None:
+            deadline = now
+        self._dispatched.discard(task_id)
+        if task_id in self._woken_at:
+            # Woken while running: due right away
+            deadline = min(deadline, now)
+        previous = self._live.get(task_id)
+        self._sequence += 1
+        self._live[task_id] = (deadline, self._sequence)
+        heapq.heappush(self._heap, (deadline, self._sequence, task_id))
+        if previous is not None:
+            self._maybe_compact()
+        if self._heap[0][2] == task_id and self._heap[0][1] == self._sequence:
+            # New earliest deadline: the loop may be sleeping on a later one
+            self._event.set()
+
+    def delay(self, task_id: str, seconds: float) -> None:
+        """Schedule a task `seconds` from now."""
+        self.schedule(task_id, self.clock() + seconds)
+
+    def cancel(self, task_id: str) -> bool:
+        """Forget a task (scheduled or dispatched); returns False if unknown."""
+        known = self._live.pop(task_id, None) is not None or task_id in self._dispatched
+        self._dispatched.discard(task_id)
+        self._woken_at.pop(task_id, None)
+        for key in self._task_keys.pop(task_id, ()):
+            subscribers = self._subscriptions.get(key)
+            if subscribers is not None:
+                subscribers.discard(task_id)
+                if not subscribers:
+                    del self._subscriptions[key]
+        self._maybe_compact()
+        return known
+
+    def deadline(self, task_id: str) -> Optional[float]:
+        entry = self._live.get(task_id)
+        return entry[0] if entry else None
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._live.clear()
+        self._dispatched.clear()
+        self._woken_at.clear()
+        self._subscriptions.clear()
+        self._task_keys.clear()
+
+    # -------------------------------------------------------------------------
+    # Wakeups
+    # -------------------------------------------------------------------------
+
+    def subscribe(self, task_id: str, key: Hashable) -> None:
+        """Wake the task whenever wake_key(key) is called (e.g. key = symbol)."""
+        self._subscriptions[key].add(task_id)
+        self._task_keys[task_id].add(key)
+
+    def wake(self, task_id: str) -> None:
+        """Make a task due now (or right after its running execution)."""
+        entry = self._live.get(task_id)
+        if entry is None and task_id not in self._dispatched:
+            return
+        now = self.clock()
+        if entry is not None and entry[0] <= now:
+            return  # Already due
+        self._woken_at.setdefault(task_id, now)
+        if entry is not None:
+            self.schedule(task_id, now)
+
+    def wake_key(self, key: Hashable) -> int:
+        """Wake all tasks subscribed to a key; returns the number of tasks woken."""
+        subscribers = self._subscriptions.get(key)
+        if not subscribers:
+            return 0
+        for task_id in subscribers:
+            self.wake(task_id)
+        return len(subscribers)
+
+    # -------------------------------------------------------------------------
+    # Dispatch
+    # -------------------------------------------------------------------------
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest live deadline (None if nothing is scheduled)."""
+        heap = self._heap
+        while heap:
+            deadline, sequence, task_id = heap[0]
+            if self._live.get(task_id) == (deadline, sequence):
+                return deadline
+            heapq.heappop(heap)
+        return None
+
+    def pop_due(self, now: Optional[float] = None) -> List[Tuple[str, str]]:
+        """
+        Remove and return every task whose deadline has passed.
+
+        Returns:
+            (task_id, DISPATCH_TIMER / DISPATCH_WAKEUP) in deadline order
+        """
+        now = self.clock() if now is None else now
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            deadline, sequence, task_id = heapq.heappop(heap)
+            if self._live.get(task_id) != (deadline, sequence):
+                continue
+            del self._live[task_id]
+            self._dispatched.add(task_id)
+            woken_at = self._woken_at.pop(task_id, None)
+            if woken_at is not None:
+                self.wakeup_lag.record((now - woken_at) * 1000)
+                due.append((task_id, DISPATCH_WAKEUP))
+            else:
+                self.timer_lag.record((now - deadline) * 1000)
+                due.append((task_id, DISPATCH_TIMER))
+        return due
+
+    async def wait(self, max_wait: Optional[float] = None) -> None:
+        """Sleep until the earliest deadline, a wakeup, or max_wait seconds."""
+        self._event.clear()
+        deadline = self.next_deadline()
+        timeout = None if deadline is None else max(0.0, deadline - self.clock())
+        if max_wait is not None:
+            timeout = max_wait if timeout is None else min(timeout, max_wait)
+        if timeout == 0.0:
+            return
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def interrupt(self) -> None:
+        """Return from wait() immediately (e.g. on shutdown)."""
+        self._event.set()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            'scheduled': len(self._live),
+            'dispatched': len(self._dispatched),
+            'heap_size': len(self._heap),
+            'timer_lag': self.timer_lag.to_dict(),
+            'wakeup_lag': self.wakeup_lag.to_dict(),
+        }
+
+    def _maybe_compact(self) -> None:
+        if len(self._heap) > 2 * len(self._live) + self.COMPACT_SLACK:
+            self._heap = [(deadline, sequence, task_id) for task_id, (deadline, sequence) in self._live.items()]
+            heapq.heapify(self._heap)
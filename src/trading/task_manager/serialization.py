@@ -15,52 +15,57 @@ from trading.struct import TradingStrategyState
 
 T = TypeVar('T', bound=msgspec.Struct)
 
+_JSON_ENCODER = msgspec.json.Encoder()
+
 
 class TaskSerializer:
     """Centralized task serialization with enhanced struct handling."""
     
     @staticmethod
-    def serialize_context(context: msgspec.Struct) -> str:
-        """Serialize task context to JSON string.
+    def _encode_hook(value: Any) -> Any:
+        """msgspec hook for values without a native encoding."""
+        if isinstance(value, Exception):
+            return {
+                'type': type(value).__name__,
+                'message': str(value)
+            }
+        if hasattr(value, 'value'):  # Enum-like types
+            return value.value
+        raise NotImplementedError(f"Cannot serialize {type(value).__name__}")
+    
+    @staticmethod
+    def encode_context(context: msgspec.Struct) -> bytes:
+        """Serialize task context to JSON bytes.
+        
+        Structs are encoded natively by msgspec (nested structs as objects, enums
+        by value, Symbol as {base, quote}, exceptions as {type, message}). The
+        result is an independent snapshot: later context mutations do not affect it.
         
         Args:
             context: Task context to serialize
             
         Returns:
-            str: JSON string representation
+            bytes: Compact JSON representation
         """
-        def _serialize_value(value):
-            """Recursively serialize complex values."""
-            if hasattr(value, 'value'):  # Enum types
-                return value.value
-            elif isinstance(value, Symbol):
-                return {
-                    'base': value.base,
-                    'quote': value.quote
-                }
-            elif isinstance(value, msgspec.Struct):
-                # Handle nested msgspec.Struct objects (like TradingParameters)
-                return {k: _serialize_value(v) for k, v in msgspec.structs.asdict(value).items()}
-            elif isinstance(value, Exception):
-                return {
-                    'type': type(value).__name__,
-                    'message': str(value)
-                }
-            elif isinstance(value, dict):
-                return {k: _serialize_value(v) for k, v in value.items()}
-            elif isinstance(value, (list, tuple)):
-                return [_serialize_value(item) for item in value]
-            else:
-                return value
-        
-        # Convert struct to dict and recursively serialize all values
-        data = {k: _serialize_value(v) for k, v in msgspec.structs.asdict(context).items()}
+        data = msgspec.to_builtins(context, enc_hook=TaskSerializer._encode_hook)
         
         # Add metadata
         data['_persisted_at'] = time.time()
         data['_schema_version'] = "1.0.0"
         
-        return json.dumps(data, indent=2)
+        return _JSON_ENCODER.encode(data)
+    
+    @staticmethod
+    def serialize_context(context: msgspec.Struct) -> str:
+        """Serialize task context to JSON string.
+        
+        Args:
+            context: Task context to serialize
+            
+        Returns:
+            str: JSON string representation
+        """
+        return TaskSerializer.encode_context(context).decode()
     
     @staticmethod
     def deserialize_context(data: str, context_class: Type[T]) -> T:
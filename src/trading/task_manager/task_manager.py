@@ -1,18 +1,21 @@
 """Simplified Task Manager for external loop management of trading tasks.
 
 Provides centralized orchestration of trading tasks with automatic lifecycle management.
+Tasks are dispatched from a deadline heap: the loop sleeps until the earliest
+deadline or until a market-data tick wakes the tasks subscribed to its symbol.
 """
 
 import asyncio
 import time
 import traceback
-from collections import defaultdict
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 from infrastructure.logging import HFTLoggerInterface
 from trading.tasks.base_task import BaseTradingTask, TaskExecutionResult
 from trading.task_manager.persistence import TaskPersistenceManager
+from trading.task_manager.persistence_writer import DurabilityPolicy
 from trading.task_manager.recovery import TaskRecovery
-from exchanges.structs import Symbol
+from trading.task_manager.scheduler import DeadlineScheduler
+from exchanges.structs import Symbol, BookTicker
 
 
 class TaskManager:
@@ -22,12 +25,14 @@ class TaskManager:
     Tasks on the same symbol are executed sequentially to prevent conflicts.
     """
     
-    def __init__(self, logger: HFTLoggerInterface, base_path: str = "task_data"):
+    def __init__(self, logger: HFTLoggerInterface, base_path: str = "task_data",
+                 durability: Optional[DurabilityPolicy] = None):
         """Initialize TaskManager.
         
         Args:
             logger: HFT logger for task management events
             base_path: Base path for task persistence storage
+            durability: Context write policy (default: every change, fsync; writes run off the event loop)
         """
         self.logger = logger
         self._tasks: Dict[str, BaseTradingTask] = {}
@@ -35,22 +40,23 @@ class TaskManager:
         self._running = False
         self._executor_task: Optional[asyncio.Task] = None
         
-        # Track next execution time for each task
-        self._next_execution: Dict[str, float] = {}
+        # Deadline heap of scheduled tasks and in-flight executions
+        self._scheduler = DeadlineScheduler()
+        self._executions: Dict[str, asyncio.Task] = {}
         
         # Performance metrics
         self._total_executions = 0
         self._start_time = time.time()
         
         # Initialize persistence manager and recovery helper
-        self._persistence = TaskPersistenceManager(logger, base_path)
+        self._persistence = TaskPersistenceManager(logger, base_path, durability)
         self._recovery = TaskRecovery(logger, self._persistence)
 
     @property
     def task_count(self):
         return len(self._tasks)
 
-    async def add_task(self, task: BaseTradingTask) -> str:
+    async def add_task(self, task: BaseTradingTask, wake_on_tick: bool = False) -> str:
         """Add a task for managed execution.
         
         For strategy tasks with deterministic IDs, duplicate tasks are handled gracefully.
@@ -58,6 +64,8 @@ class TaskManager:
         
         Args:
             task: Trading task to manage
+            wake_on_tick: Execute the task as soon as its symbol ticks (see notify_symbol),
+                not only when its next_delay elapses
             
         Returns:
             Task ID for reference
@@ -78,7 +86,9 @@ class TaskManager:
                 raise ValueError(f"Task {task_id} already registered")
         
         self._tasks[task_id] = task
-        self._next_execution[task_id] = time.time()  # Ready immediately
+        self._scheduler.schedule(task_id)  # Ready immediately
+        if wake_on_tick:
+            self._scheduler.subscribe(task_id, task.context.symbol)
         
         task_type = "strategy" if self._is_strategy_task(task) else "non-strategy"
         self.logger.info(f"Added {task_type} task {task_id}",
@@ -98,7 +108,7 @@ class TaskManager:
         """
         if task_id in self._tasks:
             del self._tasks[task_id]
-            del self._next_execution[task_id]
+            self._scheduler.cancel(task_id)
             
             self.logger.info(f"Removed task {task_id}")
             return True
@@ -116,6 +126,24 @@ class TaskManager:
         """
         return self._tasks.get(task_id)
     
+    def notify_symbol(self, symbol: Symbol) -> int:
+        """Wake the tasks subscribed to a symbol (call from market-data handlers).
+        
+        Args:
+            symbol: Symbol that ticked
+            
+        Returns:
+            Number of tasks woken
+        """
+        return self._scheduler.wake_key(symbol)
+    
+    async def on_book_ticker(self, book_ticker: BookTicker) -> None:
+        """Book ticker handler waking the tasks on its symbol.
+        
+        Usage: await exchange.bind_handlers(on_book_ticker=task_manager.on_book_ticker)
+        """
+        self._scheduler.wake_key(book_ticker.symbol)
+    
     def _is_strategy_task(self, task: BaseTradingTask) -> bool:
         """Check if task is a strategy task (uses deterministic IDs).
         
@@ -164,6 +192,7 @@ class TaskManager:
         
         self.logger.info("Stopping TaskManager...")
         self._running = False
+        self._scheduler.interrupt()
         
         if self._executor_task:
             try:
@@ -176,9 +205,16 @@ class TaskManager:
                 except asyncio.CancelledError:
                     pass
         
+        # Let in-flight executions finish
+        if self._executions:
+            await asyncio.wait(list(self._executions.values()), timeout=5.0)
+        
         # Clean up all task resources
         await self._cleanup_task_resources()
         
+        # Wait for queued context saves without blocking the loop
+        await self._persistence.drain()
+        
         self.logger.info(f"TaskManager stopped",
                         total_executions=self._total_executions,
                         runtime_seconds=time.time() - self._start_time)
@@ -195,27 +231,12 @@ class TaskManager:
         
         # Clear tasks
         self._tasks.clear()
-        self._next_execution.clear()
+        self._scheduler.clear()
     
-    def _get_ready_tasks(self) -> List[BaseTradingTask]:
-        """Get tasks ready for execution.
-        
-        Returns:
-            List of tasks whose next_execution time has passed
-        """
-        current_time = time.time()
-        ready = []
-        
-        for task_id, task in self._tasks.items():
-            # Skip completed/cancelled tasks
-            if task.state in ['completed', 'cancelled']:
-                continue
-            
-            # Check if ready to execute
-            if current_time >= self._next_execution.get(task_id, 0):
-                ready.append(task)
-        
-        return ready
+    def _reschedule(self, task_id: str, delay: float):
+        """Schedule the next execution of a task that is still managed."""
+        if task_id in self._tasks:
+            self._scheduler.delay(task_id, delay)
     
     async def _execute_task(self, task: BaseTradingTask) -> TaskExecutionResult:
         """Execute a single task.
@@ -246,7 +267,7 @@ class TaskManager:
                     task.context.should_save_flag = False
                 
                 # Calculate next execution time
-                self._next_execution[task.task_id] = time.time() + max(0.001, result.next_delay)
+                self._reschedule(task.task_id, max(0.001, result.next_delay))
                 
                 # Update metrics
                 self._total_executions += 1
@@ -266,54 +287,55 @@ class TaskManager:
                 )
                 
                 # Backoff on error
-                self._next_execution[task.task_id] = time.time() + 1.0
+                self._reschedule(task.task_id, 1.0)
                 
                 return result
     
+    async def _run_task(self, task: BaseTradingTask):
+        """Execute a dispatched task and remove it once it no longer continues."""
+        result = await self._execute_task(task)
+        if result.should_continue:
+            return
+        
+        # Remove completed/cancelled tasks from persistence (keep errored)
+        if result.state in ['completed', 'cancelled']:
+            # Save final state first, then it will be auto-cleaned by persistence manager
+            if result.context:
+                self._persistence.save_context(result.task_id, result.context)
+        
+        await self.remove_task(result.task_id)
+        self.logger.info(f"Task {result.task_id} completed, removed from manager", state=result.state)
+    
+    def _execution_done(self, task_id: str, execution: asyncio.Task):
+        if self._executions.get(task_id) is execution:
+            del self._executions[task_id]
+        if not execution.cancelled() and execution.exception() is not None:
+            self.logger.error(f"Task {task_id} dispatch failed", error=str(execution.exception()))
+    
     async def _execution_loop(self):
-        """Main loop orchestrating all task executions."""
+        """Main loop dispatching tasks from the deadline heap.
+        
+        Due tasks run as independent asyncio tasks (symbol locks keep tasks on the
+        same symbol sequential) and reschedule themselves when done; the loop sleeps
+        until the earliest deadline or a wakeup in between.
+        """
         self.logger.info("TaskManager execution loop started")
         
         while self._running:
             try:
-                # Get tasks ready for execution
-                ready_tasks = self._get_ready_tasks()
-                
-                if not ready_tasks:
-                    # No tasks ready, small sleep
-                    await asyncio.sleep(0.01)
-                    continue
-                
-                # Group tasks by symbol
-                by_symbol = defaultdict(list)
-                for task in ready_tasks:
-                    by_symbol[task.context.symbol].append(task)
-                
-                # Execute tasks - parallel across symbols, sequential within symbol
-                coroutines = []
-                for symbol, symbol_tasks in by_symbol.items():
-                    # Tasks on same symbol execute sequentially via lock
-                    for task in symbol_tasks:
-                        coroutines.append(self._execute_task(task))
-                
-                if coroutines:
-                    # Execute all tasks (symbol locks handle sequencing)
-                    results = await asyncio.gather(*coroutines, return_exceptions=True)
+                for task_id, _ in self._scheduler.pop_due():
+                    task = self._tasks.get(task_id)
+                    # Completed/cancelled tasks stay parked until removed, but leave the
+                    # scheduler: a dispatched entry would otherwise never be released
+                    if task is None or task.state in ['completed', 'cancelled']:
+                        self._scheduler.cancel(task_id)
+                        continue
                     
-                    # Remove completed tasks and cleanup persistence
-                    for result in results:
-                        if isinstance(result, TaskExecutionResult) and not result.should_continue:
-                            # Remove completed/cancelled tasks from persistence (keep errored)
-                            if result.state in ['completed', 'cancelled']:
-                                # Save final state first, then it will be auto-cleaned by persistence manager
-                                if result.context:
-                                    self._persistence.save_context(result.task_id, result.context)
-                            
-                            await self.remove_task(result.task_id)
-                            self.logger.info(f"Task {result.task_id} completed, removed from manager", state=result.state)
+                    execution = asyncio.create_task(self._run_task(task))
+                    self._executions[task_id] = execution
+                    execution.add_done_callback(lambda done, tid=task_id: self._execution_done(tid, done))
                 
-                # Minimal sleep for cooperative multitasking
-                await asyncio.sleep(0.001)
+                await self._scheduler.wait()
                 
             except Exception as e:
                 self.logger.error(f"TaskManager execution loop error", error=str(e))
@@ -345,7 +367,7 @@ class TaskManager:
                     if task:
                         # Add to manager
                         self._tasks[task_id] = task
-                        self._next_execution[task_id] = time.time()  # Ready immediately
+                        self._scheduler.schedule(task_id)  # Ready immediately
                         await task.start()
                         
                         self.logger.info(f"✅ Recovered task {task_id}", 
@@ -390,13 +412,16 @@ class TaskManager:
         Returns:
             Dictionary with status information
         """
+        now = self._scheduler.clock()
         tasks_info = []
         for task_id, task in self._tasks.items():
+            deadline = self._scheduler.deadline(task_id)
             tasks_info.append({
                 "task_id": task_id,
                 "symbol": str(task.context.symbol),
                 "state": task.state,
-                "next_execution": self._next_execution.get(task_id, 0) - time.time()
+                "running": task_id in self._executions,
+                "next_execution": deadline - now if deadline is not None else 0.0
             })
         
         return {
@@ -405,5 +430,17 @@ class TaskManager:
             "total_executions": self._total_executions,
             "runtime_seconds": time.time() - self._start_time,
             "persistence_stats": self._persistence.get_statistics(),
+            "persistence_writer": self._persistence.get_writer_stats(),
+            "scheduler": self.get_scheduler_stats(),
             "tasks": tasks_info
-        }
\ No newline at end of file
+        }
+    
+    def get_scheduler_stats(self) -> Dict[str, any]:
+        """Get scheduling lag histograms.
+        
+        Returns:
+            Dictionary with heap size and timer/wakeup lag histograms (ms):
+            timer lag is dispatch time minus deadline, wakeup lag is dispatch
+            time minus the first tick that woke the task
+        """
+        return self._scheduler.stats()
@@ -12,6 +12,7 @@ Key Features:
 """
 
 import asyncio
+import math
 import time
 import numpy as np
 from typing import Optional, Dict, Type, Literal
@@ -27,9 +28,13 @@ from trading.tasks.arbitrage_task_context import (
 from exchanges.structs import Symbol, Side, ExchangeEnum, Order
 from infrastructure.logging import HFTLoggerInterface, get_logger
 from utils.exchange_utils import flip_side
-from trading.analysis.arbitrage_signals import calculate_arb_signals
+from trading.analysis.arbitrage_signals import ArbSignal, calculate_arb_signals_streaming
+from trading.analysis.ring_buffer import RingBuffer
+from trading.analysis.spread_history_store import SpreadHistoryStore, get_spread_history_store, rows_after
+from trading.analysis.streaming_quantile import WindowExtremes, create_quantile_estimator
 from trading.signals.structs import Signal
 from trading.research.cross_arbitrage.arbitrage_analyzer import ArbitrageAnalyzer
+from trading.strategies.implementations.base_strategy.quote_manager import QuoteManager, RequoteBudget
 
 # Import existing arbitrage components
 from trading.task_manager.exchange_manager import (
@@ -57,6 +62,16 @@ class SpotFuturesArbitrageTask(BaseArbitrageTask):
 
     name: str = "SpotFuturesArbitrageTask"
 
+    # Spread history length used for signal calculation
+    MAX_SPREAD_HISTORY = 500
+    # Spread history snapshots: save cadence and the oldest snapshot still worth restoring
+    SPREAD_SNAPSHOT_INTERVAL = 60.0
+    SPREAD_SNAPSHOT_MAX_AGE = 24 * 3600.0
+    SPREAD_HISTORY_INTERVAL = 300.0  # Analyzer candle interval (5 minutes)
+    # Entry/exit threshold estimator ('window' = exact over the history buffer, 'p2'/'tdigest' = unbounded)
+    SPREAD_QUANTILE_ESTIMATOR = 'window'
+    SPREAD_EXTREMES_WINDOW = 10
+
     @property
     def spot_ticker(self):
         return self.exchange_manager.get_exchange('spot').public.book_ticker.get(self.context.symbol)
@@ -101,16 +116,29 @@ class SpotFuturesArbitrageTask(BaseArbitrageTask):
                  context: ArbitrageTaskContext,
                  spot_exchange: ExchangeEnum,
                  futures_exchange: ExchangeEnum,
+                 spread_store: Optional[SpreadHistoryStore] = None,
                  **kwargs):
-        """Initialize exchange-agnostic spot-futures arbitrage strategy."""
+        """Initialize exchange-agnostic spot-futures arbitrage strategy.
+        
+        Args:
+            spread_store: Spread history snapshot store (default: shared store)
+        """
         # Initialize base arbitrage task with common setup
         super().__init__(logger, context, spot_exchange, futures_exchange, **kwargs)
         
-        # Initialize historical spreads for signal generation with numpy arrays
+        # Initialize historical spreads for signal generation (last 500 periods)
         self.historical_spreads = {
-            'spot_vs_futures': np.array([], dtype=np.float64),  # Spot vs Futures spread
-            'execution_spreads': np.array([], dtype=np.float64)  # Combined execution spread
+            'spot_vs_futures': RingBuffer(self.MAX_SPREAD_HISTORY),  # Spot vs Futures spread
+            'execution_spreads': RingBuffer(self.MAX_SPREAD_HISTORY)  # Combined execution spread
         }
+        # Streaming entry/exit thresholds, updated once per history sample and read per tick
+        self._spread_thresholds = {name: self._create_spread_thresholds() for name in self.historical_spreads}
+        
+        # Spread history snapshots for warm restarts
+        self._spread_store = spread_store or get_spread_history_store()
+        self._spread_snapshot_key = (f"{self.name}_{self.context.symbol.base}_{self.context.symbol.quote}_"
+                                     f"{spot_exchange.name}_{futures_exchange.name}")
+        self._last_spread_snapshot = time.monotonic()
         
         # Signal generation setup
         self._candle_data_loaded = False
@@ -122,12 +150,26 @@ class SpotFuturesArbitrageTask(BaseArbitrageTask):
         self.min_profit_margin = 0.1  # 0.1% minimum profit margin
         self.max_acceptable_spread = 0.2  # 0.2% maximum acceptable total spread
 
+        # Limit order requotes: one quote manager per direction, one budget for the spot symbol
+        self._limit_quotes: Dict[str, QuoteManager] = {}
+        self._limit_requote_budget = RequoteBudget()
+
     async def _load_initial_spread_history(self):
         """Load initial spread history from candles once during initialization."""
         if self._candle_data_loaded:
             return
             
         try:
+            # Warm start: restore the last snapshot and backfill only the gap since it was written
+            if await self._spread_store.warm_start(self._spread_snapshot_key, self.historical_spreads,
+                                                   backfill=self._backfill_spread_history,
+                                                   max_age_seconds=self.SPREAD_SNAPSHOT_MAX_AGE):
+                self.logger.info(f"✅ Restored {len(self.historical_spreads['spot_vs_futures'])} "
+                                 f"spread history points from snapshot")
+                self._rebuild_spread_thresholds()
+                self._candle_data_loaded = True
+                return
+            
             self.logger.info("📥 Loading initial spread history from candles...")
             
             # Import analyzer here to avoid circular imports
@@ -144,12 +186,13 @@ class SpotFuturesArbitrageTask(BaseArbitrageTask):
             # Extract spot vs futures spread from candle data
             # For spot-futures arbitrage, we use the spread between spot and futures prices
             if 'spot_vs_futures_arb' in df.columns:
-                self.historical_spreads['spot_vs_futures'] = df['spot_vs_futures_arb'].values.astype(np.float64)
+                self.historical_spreads['spot_vs_futures'].extend(df['spot_vs_futures_arb'].values)
             else:
                 # Calculate from individual exchange data if available
                 self.logger.warning("⚠️ No pre-calculated spread column found, using current real-time data only")
                 
             loaded_count = len(self.historical_spreads['spot_vs_futures'])
+            self._rebuild_spread_thresholds()
             
             if loaded_count < 50:
                 self.logger.warning(f"⚠️ Insufficient historical data: {loaded_count} points (need at least 50)")
@@ -157,12 +200,50 @@ class SpotFuturesArbitrageTask(BaseArbitrageTask):
                 self.logger.info(f"✅ Loaded {loaded_count} historical spread data points")
             
             self._candle_data_loaded = True
+            self._save_spread_snapshot()
             
         except Exception as e:
             self.logger.error(f"❌ Failed to load initial spread history: {e}")
             import traceback
             self.logger.debug(f"Full error traceback: {traceback.format_exc()}")
 
+    async def _backfill_spread_history(self, since: float) -> Dict[str, np.ndarray]:
+        """Spreads newer than `since` (epoch seconds) for the snapshot gap."""
+        analyzer = ArbitrageAnalyzer()
+        hours = max(1, math.ceil((time.time() - since) / 3600))
+        df = await analyzer.book_ticker_source.get_multi_exchange_data(
+            exchanges=analyzer.exchanges, symbol=self.context.symbol, hours=hours, timeframe=analyzer.tf
+        )
+        df = rows_after(df.dropna(), since)
+        if df.empty:
+            return {}
+        df, _ = await analyzer.run_analysis(self.context.symbol, df_data=df)
+        if 'spot_vs_futures_arb' not in df.columns:
+            return {}
+        return {'spot_vs_futures': df['spot_vs_futures_arb'].values}
+
+    def _create_spread_thresholds(self) -> WindowExtremes:
+        """Window extremes estimator covering the windows of one full history buffer."""
+        window_size = self.SPREAD_EXTREMES_WINDOW
+        windows = (self.MAX_SPREAD_HISTORY - window_size) // (window_size // 2) + 1
+        return WindowExtremes(window_size, estimator=create_quantile_estimator(
+            self.SPREAD_QUANTILE_ESTIMATOR, window=windows))
+
+    def _rebuild_spread_thresholds(self):
+        """Re-seed the threshold estimators from the history buffers (after bulk loads)."""
+        for name, thresholds in self._spread_thresholds.items():
+            thresholds.reset()
+            thresholds.extend(self.historical_spreads[name].values().tolist())
+
+    def _save_spread_snapshot(self):
+        """Queue a spread history snapshot (written off the event loop)."""
+        self._last_spread_snapshot = time.monotonic()
+        try:
+            self._spread_store.save(self._spread_snapshot_key, self.historical_spreads,
+                                    interval_seconds=self.SPREAD_HISTORY_INTERVAL)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Failed to snapshot spread history: {e}")
+
     def _update_historical_spreads(self):
         """Update historical spreads with current real-time data."""
         try:
@@ -171,21 +252,14 @@ class SpotFuturesArbitrageTask(BaseArbitrageTask):
             execution_spreads = self._calculate_execution_spreads()
             current_execution_spread = execution_spreads['total']
             
-            # Append to historical data
-            self.historical_spreads['spot_vs_futures'] = np.append(
-                self.historical_spreads['spot_vs_futures'], 
-                current_spot_vs_futures
-            )
-            self.historical_spreads['execution_spreads'] = np.append(
-                self.historical_spreads['execution_spreads'], 
-                current_execution_spread
-            )
+            # Append to historical data (ring buffers keep the last MAX_SPREAD_HISTORY periods)
+            self.historical_spreads['spot_vs_futures'].push(current_spot_vs_futures)
+            self.historical_spreads['execution_spreads'].push(current_execution_spread)
+            self._spread_thresholds['spot_vs_futures'].push(current_spot_vs_futures)
+            self._spread_thresholds['execution_spreads'].push(current_execution_spread)
             
-            # Keep only recent history (e.g., last 500 periods for signal calculation)
-            max_history = 500
-            if len(self.historical_spreads['spot_vs_futures']) > max_history:
-                self.historical_spreads['spot_vs_futures'] = self.historical_spreads['spot_vs_futures'][-max_history:]
-                self.historical_spreads['execution_spreads'] = self.historical_spreads['execution_spreads'][-max_history:]
+            if time.monotonic() - self._last_spread_snapshot >= self.SPREAD_SNAPSHOT_INTERVAL:
+                self._save_spread_snapshot()
                 
         except Exception as e:
             self.logger.error(f"❌ Error updating historical spreads: {e}")
@@ -250,16 +324,22 @@ class SpotFuturesArbitrageTask(BaseArbitrageTask):
         """Get current arbitrage signal with full ArbStats."""
         if len(self.historical_spreads['spot_vs_futures']) < 50:
             # Return fallback signal for insufficient data
-            from trading.analysis.arbitrage_signals import ArbSignal, ArbStats
+            from trading.analysis.arbitrage_signals import ArbStats
             return ArbSignal(
                 signal=Signal.HOLD,
                 mexc_vs_gateio_futures=ArbStats(0, 0, 0, self.spot_vs_futures_spread),
                 gateio_spot_vs_futures=ArbStats(0, 0, 0, self._calculate_execution_spreads()['total'])
             )
         
-        return calculate_arb_signals(
-            mexc_vs_gateio_futures_history=self.historical_spreads['spot_vs_futures'],
-            gateio_spot_vs_futures_history=self.historical_spreads['execution_spreads'],
+        return self._calculate_current_signal()
+
+    def _calculate_current_signal(self) -> ArbSignal:
+        """Classify the current spreads against the streaming history thresholds (O(1) per tick)."""
+        return calculate_arb_signals_streaming(
+            self._spread_thresholds['spot_vs_futures'],
+            self._spread_thresholds['execution_spreads'],
+            self.historical_spreads['spot_vs_futures'].mean,
+            self.historical_spreads['execution_spreads'].mean,
             current_mexc_vs_gateio_futures=self.spot_vs_futures_spread,
             current_gateio_spot_vs_futures=self._calculate_execution_spreads()['total']
         )
@@ -397,12 +477,7 @@ class SpotFuturesArbitrageTask(BaseArbitrageTask):
                 return Signal.HOLD
             
             # Generate signal using current market data with historical context
-            signal_result = calculate_arb_signals(
-                mexc_vs_gateio_futures_history=self.historical_spreads['spot_vs_futures'],
-                gateio_spot_vs_futures_history=self.historical_spreads['execution_spreads'],
-                current_mexc_vs_gateio_futures=self.spot_vs_futures_spread,
-                current_gateio_spot_vs_futures=self._calculate_execution_spreads()['total']
-            )
+            signal_result = self._calculate_current_signal()
             
             return signal_result.signal
             
@@ -1133,45 +1208,59 @@ class SpotFuturesArbitrageTask(BaseArbitrageTask):
             self.logger.error(f"Error handling limit order fill: {e}")
 
     async def _update_limit_order(self, direction: Literal['enter', 'exit'], order_id: str, new_price: float):
-        """Update limit order price."""
+        """Move limit order to new price through the direction's quote manager.
+
+        Amends in place where the spot exchange supports it, otherwise cancels and
+        replaces. Requotes are bounded by tick hysteresis and the shared requote
+        budget; if the order filled while being moved no replacement is placed.
+        """
         try:
-            # Cancel old order using exchange directly
             exchange = self.exchange_manager.get_exchange('spot')
-            if exchange:
-                o = await exchange.private.cancel_order(self.context.symbol, order_id)
-                self._process_order_fill('spot', o)
-                if o.filled_quantity > 0:
-                    self.logger.info(f"⚠️ Partial fill detected when cancelling limit order {order_id}, processed fill.")
-                    return
-            
-            # Place new order
+            if not exchange:
+                return
+
+            limit_order = exchange.private.get_order(order_id)
+            if limit_order is None:
+                return  # Completed - handled by _check_limit_order_fills
+
+            quotes = self._limit_quotes.get(direction)
+            if quotes is None:
+                quotes = QuoteManager(exchange.private, self.context.symbol, self.logger,
+                                      on_order=self._on_limit_order_update, budget=self._limit_requote_budget)
+                self._limit_quotes[direction] = quotes
+            quotes.attach(limit_order)
+
             spot_side = Side.BUY if direction == 'enter' else Side.SELL
-            qty_usdt = self.context.single_order_size_usdt  
+            qty_usdt = self.context.single_order_size_usdt
             spot_qty = qty_usdt / new_price
-            
-            spot_orders: Dict[ArbitrageExchangeType, OrderPlacementParams] = {
-                'spot': OrderPlacementParams(side=spot_side, quantity=spot_qty, price=new_price, order_type='limit')
-            }
-            
-            placed_orders = await self.exchange_manager.place_order_parallel(spot_orders)
-            
-            if placed_orders.get('spot'):
+
+            order = await quotes.quote(spot_side, spot_qty, new_price)
+
+            if order is None or order.is_done:
+                if order is not None and order.filled_quantity > 0:
+                    self.logger.info(f"⚠️ Fill detected when moving limit order {order_id}, processed fill.")
+                return
+
+            if order.order_id != order_id or order.price != limit_order.price:
                 # Update tracking
                 new_limit_orders = self.context.active_limit_orders.copy()
-                new_limit_orders[direction] = placed_orders['spot'].order_id
+                new_limit_orders[direction] = order.order_id
                 new_limit_prices = self.context.limit_order_prices.copy()
-                new_limit_prices[direction] = new_price
-                
+                new_limit_prices[direction] = order.price
+
                 self.evolve_context(
                     active_limit_orders=new_limit_orders,
                     limit_order_prices=new_limit_prices
                 )
-                
-                self.logger.info(f"🔄 Updated {direction} limit order: {new_price:.6f}")
-            
+
+                self.logger.info(f"🔄 Updated {direction} limit order: {order.price:.6f}")
+
         except Exception as e:
             self.logger.error(f"Error updating limit order: {e}")
 
+    async def _on_limit_order_update(self, order: Order):
+        self._process_order_fill('spot', order)
+
     async def _cancel_limit_orders(self):
         """Cancel all active limit orders."""
         try:
@@ -1218,6 +1307,9 @@ class SpotFuturesArbitrageTask(BaseArbitrageTask):
 
     async def cleanup(self):
         """Clean up strategy resources."""
+        if self._candle_data_loaded:
+            self._save_spread_snapshot()
+        
         # Cancel limit orders and rebalance if needed
         if self.context.params.limit_orders_enabled:
             await self._cancel_limit_orders()
@@ -0,0 +1,85 @@
+"""Unit tests for applications.data_collection.sampling.BookTickerSampler.
+
+Test Coverage:
+- First update per symbol is always stored
+- Price/size change detection with relative epsilons
+- Per-symbol rate limiting and heartbeat rows
+- Per-symbol policy overrides
+"""
+
+import pytest
+
+from applications.data_collection.sampling import BookTickerSampler, BookTickerSamplingPolicy
+from exchanges.structs.common import BookTicker, Symbol
+from exchanges.structs.types import AssetName
+
+
+BTC = Symbol(base=AssetName('BTC'), quote=AssetName('USDT'))
+ETH = Symbol(base=AssetName('ETH'), quote=AssetName('USDT'))
+
+
+def _ticker(bid=100.0, ask=101.0, bid_qty=1.0, ask_qty=1.0, symbol=BTC) -> BookTicker:
+    return BookTicker(symbol=symbol, bid_price=bid, bid_quantity=bid_qty,
+                      ask_price=ask, ask_quantity=ask_qty, timestamp=0)
+
+
+class TestBookTickerSampler:
+    """Sampling decisions per symbol."""
+
+    def test_first_update_and_unchanged(self):
+        sampler = BookTickerSampler(BookTickerSamplingPolicy(min_interval_ms=0, heartbeat_seconds=0))
+
+        assert sampler.should_store(1, _ticker(), 0) is True
+        assert sampler.should_store(1, _ticker(), 10) is False
+        # Same symbol on another exchange has its own state
+        assert sampler.should_store(2, _ticker(), 10) is True
+
+    def test_price_and_size_epsilon(self):
+        policy = BookTickerSamplingPolicy(price_epsilon=0.001, size_epsilon=0.5,
+                                          min_interval_ms=0, heartbeat_seconds=0)
+        sampler = BookTickerSampler(policy)
+        sampler.should_store(1, _ticker(), 0)
+
+        assert sampler.should_store(1, _ticker(bid=100.05), 1) is False   # 0.05% < 0.1%
+        assert sampler.should_store(1, _ticker(bid_qty=1.4), 2) is False  # 40% < 50%
+        assert sampler.should_store(1, _ticker(bid_qty=1.6), 3) is True
+        assert sampler.should_store(1, _ticker(bid=100.2, bid_qty=1.6), 4) is True
+
+    def test_sizes_ignored_when_epsilon_none(self):
+        sampler = BookTickerSampler(BookTickerSamplingPolicy(size_epsilon=None, min_interval_ms=0,
+                                                             heartbeat_seconds=0))
+        sampler.should_store(1, _ticker(), 0)
+
+        assert sampler.should_store(1, _ticker(ask_qty=50.0), 1) is False
+
+    def test_rate_limit_compares_with_last_stored(self):
+        sampler = BookTickerSampler(BookTickerSamplingPolicy(min_interval_ms=100, heartbeat_seconds=0))
+        sampler.should_store(1, _ticker(), 0)
+
+        assert sampler.should_store(1, _ticker(bid=100.5), 50) is False
+        # Change is still pending relative to the last stored row
+        assert sampler.should_store(1, _ticker(bid=100.5), 120) is True
+        assert sampler.should_store(1, _ticker(bid=100.5), 300) is False
+
+    def test_heartbeat(self):
+        sampler = BookTickerSampler(BookTickerSamplingPolicy(min_interval_ms=0, heartbeat_seconds=1.0))
+        sampler.should_store(1, _ticker(), 0)
+
+        assert sampler.should_store(1, _ticker(), 999) is False
+        assert sampler.should_store(1, _ticker(), 1_000) is True
+        assert sampler.get_stats()['heartbeats'] == 1
+
+    def test_symbol_policy_override(self):
+        sampler = BookTickerSampler(
+            BookTickerSamplingPolicy(min_interval_ms=0, heartbeat_seconds=0),
+            symbol_policies={ETH: BookTickerSamplingPolicy(min_interval_ms=1_000, heartbeat_seconds=0)}
+        )
+        sampler.should_store(1, _ticker(), 0)
+        sampler.should_store(2, _ticker(symbol=ETH), 0)
+
+        assert sampler.should_store(1, _ticker(bid=100.5), 10) is True
+        assert sampler.should_store(2, _ticker(bid=100.5, symbol=ETH), 10) is False
+
+    def test_policy_validation(self):
+        with pytest.raises(ValueError):
+            BookTickerSamplingPolicy(price_epsilon=-0.1)
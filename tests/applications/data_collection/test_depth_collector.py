@@ -0,0 +1,137 @@
+"""Unit tests for applications.data_collection.depth_collector.DepthBookTracker.
+
+Test Coverage:
+- Snapshot feeds replace the book, diff feeds require a seed
+- Rate-limited sampling per symbol
+- Change-only sampling skips identical top-N levels
+- Quanto multiplier scaling and per-level row expansion
+- Versioned diffs: buffered during the seed, stale ones dropped, reseed on a gap
+"""
+
+import pytest
+
+from applications.data_collection.depth_collector import DepthBookTracker, DepthCollectionConfig
+from exchanges.structs.common import OrderBook, OrderBookEntry, Symbol
+from exchanges.structs.types import AssetName
+
+
+SYMBOL = Symbol(base=AssetName('BTC'), quote=AssetName('USDT'))
+
+
+def _book(bids, asks, timestamp=1_700_000_000_000.0, versions=(None, None)) -> OrderBook:
+    return OrderBook(
+        symbol=SYMBOL,
+        bids=[OrderBookEntry(price=p, size=s) for p, s in bids],
+        asks=[OrderBookEntry(price=p, size=s) for p, s in asks],
+        timestamp=timestamp,
+        first_update_id=versions[0],
+        last_update_id=versions[1],
+    )
+
+
+class TestDepthBookTracker:
+    """Book maintenance and sampling policy."""
+
+    def test_snapshot_feed_samples_top_levels(self):
+        tracker = DepthBookTracker(DepthCollectionConfig(levels=2, interval_ms=0))
+
+        sample = tracker.on_update(
+            1, _book([(99.0, 1.0), (100.0, 2.0), (98.0, 3.0)], [(101.0, 1.0), (102.0, 4.0)]),
+            is_diff=False, now_ms=1_000.0
+        )
+
+        assert sample.bid_prices == [100.0, 99.0]
+        assert sample.bid_sizes == [2.0, 1.0]
+        assert sample.ask_prices == [101.0, 102.0]
+        assert sample.levels == 2
+        assert sample.exchange_timestamp is not None
+
+    def test_diff_feed_requires_seed(self):
+        tracker = DepthBookTracker(DepthCollectionConfig(levels=5, interval_ms=0))
+
+        assert tracker.on_update(1, _book([(100.0, 1.0)], []), is_diff=True, now_ms=1.0) is None
+        assert tracker.get_stats()['updates_ignored'] == 1
+
+        tracker.seed(1, _book([(100.0, 1.0), (99.0, 1.0)], [(101.0, 1.0)]))
+        sample = tracker.on_update(1, _book([(100.0, 0.0)], [(101.5, 2.0)]), is_diff=True, now_ms=2.0)
+
+        assert sample.bid_prices == [99.0]
+        assert sample.ask_prices == [101.0, 101.5]
+
+    def test_rate_limit_per_symbol(self):
+        tracker = DepthBookTracker(DepthCollectionConfig(interval_ms=1000, change_only=False))
+        book = _book([(100.0, 1.0)], [(101.0, 1.0)])
+
+        assert tracker.on_update(1, book, is_diff=False, now_ms=10_000.0) is not None
+        assert tracker.on_update(1, book, is_diff=False, now_ms=10_500.0) is None
+        assert tracker.on_update(2, book, is_diff=False, now_ms=10_500.0) is not None
+        assert tracker.on_update(1, book, is_diff=False, now_ms=11_000.0) is not None
+
+    def test_change_only_skips_identical_levels(self):
+        tracker = DepthBookTracker(DepthCollectionConfig(levels=1, interval_ms=0))
+
+        assert tracker.on_update(1, _book([(100.0, 1.0)], [(101.0, 1.0)]), False, 1.0) is not None
+        # Change below the sampled depth is invisible at levels=1
+        assert tracker.on_update(1, _book([(100.0, 1.0), (99.0, 5.0)], [(101.0, 1.0)]), False, 2.0) is None
+        assert tracker.on_update(1, _book([(100.0, 2.0)], [(101.0, 1.0)]), False, 3.0) is not None
+        assert tracker.get_stats()['samples_unchanged'] == 1
+
+    def test_quanto_multiplier_and_level_rows(self):
+        tracker = DepthBookTracker(DepthCollectionConfig(levels=3, interval_ms=0))
+
+        sample = tracker.on_update(
+            7, _book([(100.0, 2.0), (99.0, 1.0)], [(101.0, 3.0)]), is_diff=False, now_ms=1.0, multiplier=0.1
+        )
+        rows = sample.to_level_rows()
+
+        assert sample.bid_sizes == pytest.approx([0.2, 0.1])
+        assert [row[2] for row in rows] == [1, 2]
+        assert rows[1][1] == 7
+        assert rows[1][5] is None and rows[1][6] is None
+
+    def test_diffs_buffered_during_seed(self):
+        tracker = DepthBookTracker(DepthCollectionConfig(levels=5, interval_ms=0))
+        tracker.begin_seed(1, SYMBOL)
+
+        # Both arrive while the REST snapshot (version 11) is in flight
+        assert tracker.on_update(1, _book([(99.0, 0.0)], [], versions=(10, 10)), True, 1.0) is None
+        assert tracker.on_update(1, _book([(98.0, 4.0)], [], versions=(11, 12)), True, 2.0) is None
+
+        assert tracker.seed(1, _book([(100.0, 1.0), (99.0, 1.0)], [(101.0, 1.0)], versions=(None, 11)))
+        sample = tracker.on_update(1, _book([], [(101.0, 2.0)], versions=(13, 13)), True, 3.0)
+
+        # Version 10 predates the snapshot and is dropped; 11-12 applies on top of it
+        assert sample.bid_prices == [100.0, 99.0, 98.0]
+        assert sample.ask_sizes == [2.0]
+        assert tracker.get_stats()['updates_stale'] == 1
+
+    def test_gap_requests_reseed(self):
+        tracker = DepthBookTracker(DepthCollectionConfig(levels=5, interval_ms=0))
+        tracker.seed(1, _book([(100.0, 1.0)], [(101.0, 1.0)], versions=(None, 5)))
+        assert tracker.on_update(1, _book([(100.0, 2.0)], [], versions=(6, 7)), True, 1.0) is not None
+
+        assert tracker.on_update(1, _book([(100.0, 3.0)], [], versions=(9, 9)), True, 2.0) is None
+        assert tracker.needs_seed(1) and not tracker.is_seeded(1)
+
+        tracker.begin_seed(1, SYMBOL)
+        assert not tracker.needs_seed(1)
+        tracker.on_update(1, _book([(100.0, 4.0)], [], versions=(10, 10)), True, 3.0)
+
+        assert tracker.seed(1, _book([(100.0, 3.0)], [(101.0, 1.0)], versions=(None, 9)))
+        sample = tracker.on_update(1, _book([], [(102.0, 1.0)], versions=(11, 11)), True, 4.0)
+        assert sample.bid_sizes == [4.0]
+        assert tracker.get_stats()['resyncs'] == 1
+
+    def test_snapshot_behind_buffer_is_rejected(self):
+        tracker = DepthBookTracker(DepthCollectionConfig(levels=5, interval_ms=0))
+        tracker.begin_seed(1, SYMBOL)
+        tracker.on_update(1, _book([(100.0, 2.0)], [], versions=(20, 21)), True, 1.0)
+
+        assert not tracker.seed(1, _book([(100.0, 1.0)], [], versions=(None, 15)))
+        assert tracker.needs_seed(1)
+
+    def test_config_validation(self):
+        with pytest.raises(ValueError):
+            DepthCollectionConfig(levels=25)
+        with pytest.raises(ValueError):
+            DepthCollectionConfig(encoding='json')
@@ -0,0 +1,181 @@
+"""Unit tests for the portfolio rebalancer price matrix and config sweep.
+
+Test Coverage:
+- Alignment of kline lists with gaps: forward fill, observed mask, row lookup
+- BacktestEngine lookups against the previous linear-scan semantics
+- Vectorized config sweep parity with BacktestEngine.simulate()
+- config_grid expansion and input validation
+- Throughput of the sweep kernel on minute data (performance)
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from applications.portfolio_rebalancer import BacktestEngine, RebalanceConfig
+from applications.portfolio_rebalancer.config_sweep import (
+    METRIC_COLUMNS, NUMBA_AVAILABLE, config_grid, simulate_configs
+)
+from applications.portfolio_rebalancer.price_matrix import PriceMatrix
+from exchanges.structs import AssetName, Kline, Symbol
+from exchanges.structs.enums import KlineInterval
+
+T0 = 1_700_000_000_000
+MINUTE = 60_000
+
+
+def _klines(asset, open_times, closes):
+    symbol = Symbol(base=AssetName(asset), quote=AssetName('USDT'))
+    return [Kline(symbol=symbol, interval=KlineInterval.MINUTE_1, open_time=int(t), close_time=int(t) + MINUTE - 1,
+                  open_price=c, high_price=c, low_price=c, close_price=c, volume=1.0, quote_volume=c)
+            for t, c in zip(open_times, closes)]
+
+
+def _random_price_data(assets, n_rows, seed=0, gap_every=0):
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i, asset in enumerate(assets):
+        closes = 10.0 * (i + 1) * np.exp(np.cumsum(rng.normal(0, 0.01, n_rows)))
+        times = T0 + np.arange(n_rows) * MINUTE
+        keep = np.ones(n_rows, dtype=bool)
+        if gap_every:
+            keep[(i + 1)::gap_every] = False
+        data[asset] = _klines(asset, times[keep], closes[keep])
+    return data
+
+
+def _engine(assets, price_data, config=None):
+    engine = BacktestEngine(assets, 10_000.0, config=config)
+    engine.price_data = price_data
+    return engine
+
+
+def _linear_scan_prices(price_data, ts_ms):
+    """Previous BacktestEngine.get_prices_at_timestamp implementation."""
+    prices = {}
+    for asset, klines in price_data.items():
+        for kline in klines:
+            if kline.open_time == ts_ms:
+                prices[asset] = kline.close_price
+                break
+    return prices
+
+
+# =============================================================================
+# Price matrix
+# =============================================================================
+
+class TestPriceMatrix:
+    def test_alignment_forward_fill_and_mask(self):
+        matrix = PriceMatrix.from_klines({
+            'A': _klines('A', [T0, T0 + MINUTE, T0 + 3 * MINUTE], [1.0, 2.0, 4.0]),
+            'B': _klines('B', [T0 + MINUTE, T0 + 2 * MINUTE, T0 + 2 * MINUTE], [10.0, 20.0, 99.0]),
+        })
+
+        assert matrix.timestamps.tolist() == [T0 + i * MINUTE for i in range(4)]
+        np.testing.assert_array_equal(matrix.prices, [[1.0, np.nan], [2.0, 10.0], [2.0, 20.0], [4.0, 20.0]])
+        assert matrix.observed.tolist() == [[True, False], [True, True], [False, True], [True, False]]
+        assert matrix.complete_rows().tolist() == [1]
+        assert matrix.filled_rows().tolist() == [1, 2, 3]
+        assert matrix.row(T0 + 2 * MINUTE) == 2
+        assert matrix.row(T0 + 5 * MINUTE) is None
+        assert matrix.prices_at(0) == {'A': 1.0}
+
+    def test_asset_without_data(self):
+        matrix = PriceMatrix.from_klines({'A': _klines('A', [T0], [1.0]), 'B': []})
+
+        assert len(matrix) == 1
+        assert matrix.complete_rows().tolist() == []
+        assert matrix.filled_rows().tolist() == []
+
+
+class TestBacktestEngineLookups:
+    def test_matches_linear_scan_on_common_timestamps(self):
+        assets = ['BTC', 'ETH', 'SOL']
+        price_data = _random_price_data(assets, 300, gap_every=7)
+        engine = _engine(assets, price_data)
+
+        timestamps = engine.align_price_data()
+        expected = [ts for ts in sorted({k.open_time for kl in price_data.values() for k in kl})
+                    if all(any(k.open_time == ts for k in kl) for kl in price_data.values())]
+        assert [int(t.timestamp() * 1000) for t in timestamps] == expected
+        for timestamp in timestamps:
+            ts_ms = int(timestamp.timestamp() * 1000)
+            assert engine.get_prices_at_timestamp(timestamp) == _linear_scan_prices(price_data, ts_ms)
+
+    def test_forward_filled_timestamps(self):
+        assets = ['BTC', 'ETH']
+        engine = _engine(assets, _random_price_data(assets, 50, gap_every=5))
+
+        assert len(engine.align_price_data(forward_fill=True)) == 50
+        assert len(engine.align_price_data()) < 50
+
+
+# =============================================================================
+# Config sweep
+# =============================================================================
+
+class TestConfigSweep:
+    ASSETS = ['BTC', 'ETH', 'SOL', 'XRP']
+
+    def _configs(self):
+        base = RebalanceConfig(min_order_value=5.0)
+        return config_grid(base, upside_threshold=[0.03, 0.08], downside_threshold=[0.03, 0.1],
+                           cooldown_minutes=[0, 30], usdt_reserve=[0.0, 0.3])
+
+    def test_grid(self):
+        configs = self._configs()
+
+        assert len(configs) == 16
+        assert {(c.upside_threshold, c.cooldown_minutes) for c in configs} == {
+            (u, m) for u in (0.03, 0.08) for m in (0, 30)}
+        assert all(c.min_order_value == 5.0 for c in configs)
+
+    def test_matches_object_simulation(self):
+        price_data = _random_price_data(self.ASSETS, 600, seed=3, gap_every=11)
+        configs = self._configs()
+        sweep = _engine(self.ASSETS, price_data).run_config_sweep(configs)
+
+        total_rebalances = 0
+        for config, vectorized in zip(configs, sweep):
+            expected = _engine(self.ASSETS, price_data, config=config).simulate()
+            total_rebalances += expected.total_rebalances
+            for name in ('total_return', 'sharpe_ratio', 'max_drawdown', 'win_rate', 'total_fees',
+                         'avg_rebalance_size', 'final_value', 'annualized_return'):
+                assert getattr(vectorized, name) == pytest.approx(getattr(expected, name), rel=1e-9, abs=1e-12), name
+            assert vectorized.total_trades == expected.total_trades
+            assert vectorized.total_rebalances == expected.total_rebalances
+            assert (vectorized.start_date, vectorized.end_date) == (expected.start_date, expected.end_date)
+            assert vectorized.best_performer == expected.best_performer
+        # Both upside and downside branches were exercised
+        assert total_rebalances > 50
+
+    def test_validation(self):
+        prices = np.ones((3, 2))
+        times = T0 + np.arange(3) * MINUTE
+
+        with pytest.raises(ValueError):
+            simulate_configs(prices[:0], times[:0], [RebalanceConfig()], 1000.0)
+        with pytest.raises(ValueError):
+            simulate_configs(np.where(prices > 0, np.nan, prices), times, [RebalanceConfig()], 1000.0)
+        assert simulate_configs(prices, times, [], 1000.0).shape == (0, len(METRIC_COLUMNS))
+
+
+@pytest.mark.performance
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+class TestSweepThroughput:
+    def test_minute_data(self):
+        rng = np.random.default_rng(0)
+        n_rows, n_assets = 200_000, 20
+        prices = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.002, (n_rows, n_assets)), axis=0))
+        times = T0 + np.arange(n_rows, dtype=np.int64) * MINUTE
+        configs = config_grid(RebalanceConfig(), upside_threshold=[0.2, 0.4], downside_threshold=[0.2, 0.35])
+        simulate_configs(prices[:10], times[:10], configs[:1], 10_000.0)   # JIT warm-up
+
+        started = time.perf_counter()
+        metrics = simulate_configs(prices, times, configs, 10_000.0)
+        elapsed = time.perf_counter() - started
+
+        assert metrics.shape == (4, len(METRIC_COLUMNS))
+        assert elapsed < 5.0
@@ -0,0 +1,113 @@
+"""Unit tests for db.dedup_cache.TimeWindowDedupCache.
+
+Test Coverage:
+- Duplicate detection per symbol
+- Incremental expiry driven by event time
+- Per-symbol memory cap eviction
+- Hit-rate and eviction metrics
+- Database stats report the caches of every deduplicated stream
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from unittest.mock import AsyncMock, MagicMock
+
+from db import operations
+from db.dedup_cache import TimeWindowDedupCache
+
+
+T0 = datetime(2025, 10, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+class TestTimeWindowDedupCache:
+    """Essential behaviour of the bounded dedup cache."""
+
+    def test_duplicates_are_per_symbol(self):
+        cache = TimeWindowDedupCache()
+
+        assert cache.check_and_add(1, T0) is False
+        assert cache.check_and_add(1, T0) is True
+        assert cache.check_and_add(2, T0) is False
+        assert len(cache) == 2
+
+    def test_custom_key(self):
+        cache = TimeWindowDedupCache()
+
+        assert cache.check_and_add(1, T0, (T0, 'a')) is False
+        assert cache.check_and_add(1, T0, (T0, 'b')) is False
+        assert cache.check_and_add(1, T0, (T0, 'a')) is True
+
+    def test_expiry_follows_event_time(self):
+        cache = TimeWindowDedupCache(window=timedelta(seconds=10))
+
+        cache.check_and_add(1, T0)
+        cache.check_and_add(1, T0 + timedelta(seconds=5))
+        # Advancing the symbol clock past the window evicts the oldest entry only
+        cache.check_and_add(1, T0 + timedelta(seconds=11))
+
+        stats = cache.get_stats()
+        assert stats.expired_evictions == 1
+        assert len(cache) == 2
+        # Evicted entry is no longer considered a duplicate
+        assert cache.check_and_add(1, T0) is False
+
+    def test_out_of_order_timestamps_do_not_evict(self):
+        cache = TimeWindowDedupCache(window=timedelta(seconds=10))
+
+        cache.check_and_add(1, T0 + timedelta(seconds=5))
+        cache.check_and_add(1, T0)
+
+        assert cache.get_stats().expired_evictions == 0
+        assert cache.check_and_add(1, T0) is True
+
+    def test_memory_cap_evicts_oldest(self):
+        cache = TimeWindowDedupCache(window=timedelta(hours=1), max_entries_per_symbol=3)
+
+        for i in range(5):
+            cache.check_and_add(1, T0 + timedelta(milliseconds=i))
+
+        stats = cache.get_stats()
+        assert len(cache) == 3
+        assert stats.capacity_evictions == 2
+        assert cache.check_and_add(1, T0 + timedelta(milliseconds=4)) is True
+        assert cache.check_and_add(1, T0) is False
+
+    def test_hit_rate_metrics(self):
+        cache = TimeWindowDedupCache()
+
+        cache.check_and_add(1, T0)
+        cache.check_and_add(1, T0)
+        cache.check_and_add(1, T0)
+        cache.check_and_add(1, T0 + timedelta(seconds=1))
+
+        stats = cache.get_stats_dict()
+        assert stats['lookups'] == 4
+        assert stats['hits'] == 2
+        assert stats['hit_rate'] == 0.5
+        assert stats['symbols'] == 1
+
+    def test_discard_symbol(self):
+        cache = TimeWindowDedupCache()
+
+        cache.check_and_add(1, T0)
+        cache.check_and_add(2, T0)
+        cache.discard_symbol(1)
+
+        assert len(cache) == 1
+        assert cache.check_and_add(1, T0) is False
+
+
+class TestDedupStats:
+    """Monitoring output of the insert-path caches."""
+
+    async def test_database_stats_cover_all_streams(self, monkeypatch):
+        db = MagicMock()
+        db.fetchval = AsyncMock(return_value=0)
+        db.get_connection_stats = AsyncMock(return_value={})
+        monkeypatch.setattr(operations, 'get_db_manager', lambda: db)
+
+        stats = await operations.get_database_stats()
+        assert set(stats['dedup_cache']) == {'book_ticker', 'trades'}
+
+        trade_stats = await operations.get_trade_database_stats()
+        assert trade_stats['dedup_cache'] == stats['dedup_cache']['trades']
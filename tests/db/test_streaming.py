@@ -0,0 +1,245 @@
+"""Unit tests for db.streaming columnar batch conversion.
+
+Test Coverage:
+- Positional record -> NumPy column conversion for all schema dtypes
+- Epoch-microsecond timestamps viewed as datetime64[us]
+- Batch concatenation including the empty case
+- Depth level arrays padded into fixed-width matrices
+- In-place batch accumulation (1-D, object and 2-D columns, empty result)
+- Cursor connections and transactions released when a consumer stops early
+- get_book_ticker_dataframe() built from cursor batches
+"""
+
+from contextlib import aclosing
+from datetime import datetime, timezone
+
+import numpy as np
+
+from db.database_manager import DatabaseManager
+from db.streaming import (
+    BOOK_TICKER_BATCH_SCHEMA, DEPTH_BATCH_SCHEMA, TRADE_BATCH_SCHEMA, BatchAccumulator,
+    records_to_arrays, concat_batches, depth_records_to_matrices
+)
+
+
+def _epoch_us(ts: datetime) -> int:
+    return int(ts.timestamp() * 1_000_000)
+
+
+class TestRecordsToArrays:
+    """Conversion of cursor batches into NumPy columns."""
+
+    def test_book_ticker_batch(self):
+        ts = datetime(2025, 10, 1, 12, 0, 0, 250000, tzinfo=timezone.utc)
+        rows = [
+            (_epoch_us(ts), 100.0, 1.5, 100.1, 2.0),
+            (_epoch_us(ts) + 1_000, 100.05, 1.0, 100.15, 3.0),
+        ]
+
+        batch = records_to_arrays(rows, BOOK_TICKER_BATCH_SCHEMA)
+
+        assert list(batch) == list(BOOK_TICKER_BATCH_SCHEMA)
+        assert batch['timestamp'].dtype == np.dtype('datetime64[us]')
+        assert batch['timestamp'][0] == np.datetime64('2025-10-01T12:00:00.250000')
+        assert batch['bid_price'].dtype == np.float64
+        np.testing.assert_array_equal(batch['ask_qty'], [2.0, 3.0])
+
+    def test_trade_batch_mixed_dtypes(self):
+        rows = [
+            (0, 10.0, 1.0, float('nan'), 1, True, False, 'a1'),
+            (1, 10.5, 2.0, 21.0, -1, False, True, None),
+        ]
+
+        batch = records_to_arrays(rows, TRADE_BATCH_SCHEMA)
+
+        np.testing.assert_array_equal(batch['side'], np.array([1, -1], dtype=np.int8))
+        assert batch['is_maker'].dtype == np.bool_
+        assert np.isnan(batch['quote_quantity'][0])
+        assert batch['trade_id'].dtype == object
+        assert batch['trade_id'][1] is None
+
+    def test_empty_batch(self):
+        batch = records_to_arrays([], BOOK_TICKER_BATCH_SCHEMA)
+        assert all(len(column) == 0 for column in batch.values())
+
+
+class TestConcatBatches:
+    """Column-wise batch concatenation."""
+
+    def test_concat_preserves_order(self):
+        first = records_to_arrays([(0, 1.0, 1.0, 2.0, 1.0)], BOOK_TICKER_BATCH_SCHEMA)
+        second = records_to_arrays([(1, 3.0, 1.0, 4.0, 1.0)], BOOK_TICKER_BATCH_SCHEMA)
+
+        merged = concat_batches([first, second], BOOK_TICKER_BATCH_SCHEMA)
+
+        np.testing.assert_array_equal(merged['bid_price'], [1.0, 3.0])
+        assert merged['timestamp'].dtype == np.dtype('datetime64[us]')
+
+    def test_concat_no_batches(self):
+        merged = concat_batches([], BOOK_TICKER_BATCH_SCHEMA)
+        assert merged['timestamp'].dtype == np.dtype('datetime64[us]')
+        assert len(merged['ask_price']) == 0
+
+
+class TestDepthRecordsToMatrices:
+    """Array-encoded depth rows -> fixed-width level matrices."""
+
+    def test_padding_and_truncation(self):
+        rows = [
+            (0, [100.0, 99.0, 98.0], [1.0, 2.0, 3.0], [101.0], [4.0]),
+            (1_000, [100.5], [1.5], [101.5, 102.0], [2.5, 3.5]),
+        ]
+
+        batch = depth_records_to_matrices(rows, levels=2)
+
+        assert batch['timestamp'].dtype == np.dtype('datetime64[us]')
+        assert batch['bid_prices'].shape == (2, 2)
+        np.testing.assert_array_equal(batch['bid_prices'][0], [100.0, 99.0])
+        assert np.isnan(batch['bid_sizes'][1, 1])
+        np.testing.assert_array_equal(batch['ask_sizes'][1], [2.5, 3.5])
+
+    def test_empty(self):
+        batch = depth_records_to_matrices([], levels=5)
+        assert batch['ask_prices'].shape == (0, 5)
+
+
+class TestBatchAccumulator:
+    """Incremental column accumulation replacing list + concatenate."""
+
+    def test_matches_concat(self):
+        batches = [
+            records_to_arrays([(i, float(i), 1.0, float(i) + 0.1, 2.0) for i in range(start, start + size)],
+                              BOOK_TICKER_BATCH_SCHEMA)
+            for start, size in ((0, 3), (3, 1), (4, 7), (11, 0), (11, 5))
+        ]
+
+        accumulator = BatchAccumulator(BOOK_TICKER_BATCH_SCHEMA)
+        for batch in batches:
+            accumulator.append(batch)
+        assert len(accumulator) == 16
+
+        columns = accumulator.finish()
+        expected = concat_batches(batches, BOOK_TICKER_BATCH_SCHEMA)
+        for name in BOOK_TICKER_BATCH_SCHEMA:
+            assert columns[name].dtype == expected[name].dtype
+            np.testing.assert_array_equal(columns[name], expected[name])
+
+    def test_object_and_matrix_columns(self):
+        trades = BatchAccumulator(TRADE_BATCH_SCHEMA)
+        trades.append(records_to_arrays([(0, 1.0, 1.0, 1.0, 1, True, False, 'a')], TRADE_BATCH_SCHEMA))
+        trades.append(records_to_arrays([(1, 1.0, 1.0, 1.0, -1, False, True, None)], TRADE_BATCH_SCHEMA))
+        assert list(trades.finish()['trade_id']) == ['a', None]
+
+        depth = BatchAccumulator(DEPTH_BATCH_SCHEMA)
+        depth.append(depth_records_to_matrices([(0, [100.0], [1.0], [101.0], [1.0])], levels=2))
+        depth.append(depth_records_to_matrices([(1, [99.0, 98.0], [2.0, 3.0], [], [])], levels=2))
+        matrices = depth.finish()
+        assert matrices['bid_prices'].shape == (2, 2)
+        np.testing.assert_array_equal(matrices['bid_sizes'][1], [2.0, 3.0])
+        assert np.isnan(matrices['ask_prices'][1]).all()
+
+    def test_empty(self):
+        columns = BatchAccumulator(BOOK_TICKER_BATCH_SCHEMA).finish()
+        assert columns['timestamp'].dtype == np.dtype('datetime64[us]')
+        assert all(len(column) == 0 for column in columns.values())
+
+
+class _FakeCursor:
+    def __init__(self, rows):
+        self._rows = rows
+
+    async def fetch(self, count):
+        rows, self._rows = self._rows[:count], self._rows[count:]
+        return rows
+
+
+class _FakeTransaction:
+    def __init__(self, connection):
+        self._connection = connection
+
+    async def start(self):
+        self._connection.open_transactions += 1
+
+    async def rollback(self):
+        self._connection.open_transactions -= 1
+
+
+class _FakeConnection:
+    """asyncpg connection double serving a fixed result set through a cursor."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.open_transactions = 0
+
+    def transaction(self, readonly=False):
+        return _FakeTransaction(self)
+
+    async def cursor(self, query, *args):
+        return _FakeCursor(self.rows)
+
+    def is_closed(self):
+        return False
+
+
+class _FakePool:
+    def __init__(self, connection):
+        self.connection = connection
+        self.acquired = 0
+
+    def acquire(self):
+        pool = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                pool.acquired += 1
+                return pool.connection
+
+            async def __aexit__(self, *exc):
+                pool.acquired -= 1
+
+        return _Acquire()
+
+
+class TestCursorRelease:
+    """Server-side cursor reads give their connection back when stopped early."""
+
+    def _manager(self, rows):
+        manager = object.__new__(DatabaseManager)
+        manager.__init__()
+        manager._pool = _FakePool(_FakeConnection(rows))
+        return manager
+
+    async def test_exhausted(self):
+        manager = self._manager([(i, 1.0, 1.0, 2.0, 1.0) for i in range(5)])
+        batches = [batch async for batch in manager.fetch_record_batches(
+            "SELECT", schema=BOOK_TICKER_BATCH_SCHEMA, batch_size=2)]
+
+        assert [len(batch['timestamp']) for batch in batches] == [2, 2, 1]
+        assert manager._pool.acquired == 0 and manager._pool.connection.open_transactions == 0
+
+    async def test_closed_early(self):
+        manager = self._manager([(i, 1.0, 1.0, 2.0, 1.0) for i in range(10)])
+
+        async with aclosing(manager.fetch_record_batches(
+                "SELECT", schema=BOOK_TICKER_BATCH_SCHEMA, batch_size=2)) as batches:
+            async for _ in batches:
+                assert manager._pool.acquired == 1
+                break
+
+        assert manager._pool.acquired == 0
+        assert manager._pool.connection.open_transactions == 0
+
+    async def test_book_ticker_dataframe(self):
+        ts = _epoch_us(datetime(2025, 10, 1, tzinfo=timezone.utc))
+        # Limited reads arrive newest first
+        manager = self._manager([
+            (ts + 1_000, 'MEXC', 'ETH', 'USDT', 101.0, 1.0, 103.0, 2.0),
+            (ts, 'MEXC', 'ETH', 'USDT', 100.0, 1.0, 102.0, 2.0),
+        ])
+
+        df = await manager.get_book_ticker_dataframe(exchange='mexc', limit=2)
+
+        assert str(df.index.tz) == 'UTC' and df.index.is_monotonic_increasing
+        assert list(df['mid_price']) == [101.0, 102.0]
+        assert list(df['symbol_base']) == ['ETH', 'ETH']
+        assert manager._pool.acquired == 0
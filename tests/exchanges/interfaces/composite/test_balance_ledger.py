@@ -0,0 +1,335 @@
+"""Unit tests for the incremental balance ledger.
+
+Test Coverage:
+- Spot executions: base/quote deltas, fees, duplicate executions
+- Open order locks: available/locked split, release on fill and cancel
+- Positions: realized PnL on reduce/flip, unrealized PnL at mark price
+- Futures: realized PnL and fees settled in the quote asset
+- REST reconciliation reports drift without overwriting; adopted after a gap
+- Correction path: persistent drift adopted, futures margin from exchange reports
+- Snapshot persistence and replay from recorded events (msgspec round trips)
+- BasePrivateComposite: stream events feed the ledger, balances served from the
+  ledger once synced, REST loads and BALANCE events reconcile and correct it,
+  restore_ledger()
+- BalanceSyncMixin: snapshots from the ledger, REST every `balance_reconcile_every`
+"""
+
+from typing import List
+from unittest.mock import AsyncMock, MagicMock
+
+import msgspec
+import pytest
+
+from exchanges.interfaces.composite.balance_ledger import BalanceLedger, LedgerEvent, LedgerSnapshot
+from exchanges.interfaces.composite.base_private_composite import BasePrivateComposite
+from exchanges.structs import ExchangeEnum, OrderStatus, OrderType, Side
+from exchanges.structs.common import AssetBalance, AssetName, Order, Symbol, Trade
+from infrastructure.networking.websocket.structs import PrivateWebsocketChannelType
+
+SYMBOL = Symbol(base=AssetName('ETH'), quote=AssetName('USDT'))
+ETH, USDT = SYMBOL.base, SYMBOL.quote
+
+
+def _balances(eth=0.0, usdt=1000.0):
+    return [AssetBalance(asset=ETH, available=eth, locked=0.0), AssetBalance(asset=USDT, available=usdt, locked=0.0)]
+
+
+def _order(side=Side.BUY, quantity=2.0, price=100.0, filled=0.0, status=OrderStatus.NEW, order_id='1'):
+    return Order(symbol=SYMBOL, order_id=order_id, side=side, order_type=OrderType.LIMIT, quantity=quantity,
+                 price=price, filled_quantity=filled, remaining_quantity=quantity - filled, status=status)
+
+
+def _trade(side, quantity, price, trade_id, order_id='1', fee=None, fee_asset=None):
+    return Trade(symbol=SYMBOL, side=side, quantity=quantity, price=price, timestamp=1, trade_id=trade_id,
+                 order_id=order_id, fee=fee, fee_asset=fee_asset)
+
+
+@pytest.fixture
+def ledger():
+    ledger = BalanceLedger(record=True)
+    ledger.load(_balances())
+    return ledger
+
+
+# =============================================================================
+# Spot accounting
+# =============================================================================
+
+class TestSpot:
+    def test_fills_and_fees(self, ledger):
+        assert ledger.apply_trade(_trade(Side.BUY, 1.0, 100.0, 't1', fee=0.001, fee_asset=ETH))
+        assert not ledger.apply_trade(_trade(Side.BUY, 1.0, 100.0, 't1', fee=0.001, fee_asset=ETH))   # duplicate
+
+        assert ledger.total(ETH) == pytest.approx(0.999)
+        assert ledger.total(USDT) == pytest.approx(900.0)
+
+        ledger.apply_trade(_trade(Side.SELL, 0.5, 110.0, 't2', order_id='2', fee=0.055))   # fee in quote
+        assert ledger.total(USDT) == pytest.approx(954.945)
+        position = ledger.get_position(SYMBOL)
+        assert position.realized_pnl == pytest.approx(5.0) and position.fees == pytest.approx(0.055)
+
+    def test_order_locks(self, ledger):
+        ledger.apply_order(_order())
+        assert ledger.get_balance(USDT) == AssetBalance(asset=USDT, available=800.0, locked=200.0)
+
+        # Execution before the ORDER event already releases the used lock
+        ledger.apply_trade(_trade(Side.BUY, 0.5, 100.0, 't1'))
+        assert ledger.get_balance(USDT).locked == pytest.approx(150.0)
+        assert ledger.get_balance(USDT).available == pytest.approx(800.0)
+
+        ledger.apply_order(_order(filled=0.5, status=OrderStatus.PARTIALLY_FILLED))
+        assert ledger.get_balance(USDT).locked == pytest.approx(150.0)
+
+        ledger.apply_order(_order(filled=0.5, status=OrderStatus.PARTIALLY_CANCELED))
+        assert ledger.get_balance(USDT) == AssetBalance(asset=USDT, available=950.0, locked=0.0)
+
+        ledger.apply_order(_order(side=Side.SELL, quantity=0.3, order_id='2'))
+        assert ledger.get_balance(ETH).locked == pytest.approx(0.3)
+
+
+# =============================================================================
+# Positions and PnL
+# =============================================================================
+
+class TestPositions:
+    def test_flip_and_mark(self, ledger):
+        ledger.apply_trade(_trade(Side.BUY, 1.0, 100.0, 't1'))
+        ledger.apply_trade(_trade(Side.BUY, 1.0, 110.0, 't2'))
+        position = ledger.get_position(SYMBOL)
+        assert (position.qty, position.avg_price) == (2.0, 105.0)
+
+        assert ledger.mark(SYMBOL, 120.0) == pytest.approx(30.0)
+
+        ledger.apply_trade(_trade(Side.SELL, 3.0, 120.0, 't3'))     # close 2, open short 1
+        assert (position.qty, position.avg_price) == (-1.0, 120.0)
+        assert ledger.realized_pnl == pytest.approx(30.0)
+        assert ledger.unrealized_pnl == 0.0
+
+        ledger.mark(SYMBOL, 100.0)
+        assert ledger.unrealized_pnl == pytest.approx(20.0)
+
+    def test_futures_settles_in_quote(self):
+        ledger = BalanceLedger(is_futures=True)
+        ledger.load([AssetBalance(asset=USDT, available=900.0, locked=100.0)])
+        ledger.apply_order(_order())                    # margin is not derived from orders
+
+        ledger.apply_trade(_trade(Side.SELL, 1.0, 100.0, 't1', fee=0.05))
+        ledger.apply_trade(_trade(Side.BUY, 1.0, 90.0, 't2', fee=0.045))
+        assert ledger.total(USDT) == pytest.approx(1000.0 + 10.0 - 0.095)
+        assert ledger.total(ETH) == 0.0
+        assert ledger.get_balance(USDT).locked == 100.0
+
+
+# =============================================================================
+# Reconciliation
+# =============================================================================
+
+class TestReconciliation:
+    def test_drift_reported_not_applied(self, ledger):
+        ledger.apply_trade(_trade(Side.BUY, 1.0, 100.0, 't1'))
+        assert ledger.reconcile(_balances(eth=1.0, usdt=900.0)) == []
+
+        drift = ledger.reconcile(_balances(eth=1.0, usdt=899.0))     # missed fee
+        assert [(d.asset, d.difference) for d in drift] == [(USDT, pytest.approx(-1.0))]
+        assert ledger.total(USDT) == 900.0 and ledger.last_drift == drift
+
+        ledger.apply_transfer(USDT, -1.0)
+        assert ledger.reconcile(_balances(eth=1.0, usdt=899.0)) == []
+
+    def test_adopt_after_gap(self, ledger):
+        ledger.mark_stale()
+        drift = ledger.load(_balances(eth=2.0, usdt=800.0))
+        assert {d.asset for d in drift} == {ETH, USDT}
+        assert ledger.synced and ledger.total(ETH) == 2.0
+
+    def test_partial_report(self, ledger):
+        full = ledger.reconcile([AssetBalance(asset=USDT, available=1000.0, locked=0.0),
+                                 AssetBalance(asset=ETH, available=0.5, locked=0.0)])
+        partial = ledger.reconcile([AssetBalance(asset=ETH, available=0.7, locked=0.0)], complete=False)
+        assert [d.exchange_total for d in partial] == [0.7]
+        assert ledger.last_drift == full        # only full snapshots update last_drift
+
+        assert ledger.reconcile([AssetBalance(asset=ETH, available=0.0, locked=0.0)], complete=False) == []
+
+
+# =============================================================================
+# Correction path
+# =============================================================================
+
+class TestCorrection:
+    def test_persistent_drift_adopted(self, ledger):
+        deposit = _balances(eth=0.0, usdt=1500.0)      # untracked deposit
+        drift, adopted = ledger.apply_exchange_balances(deposit)
+        assert [d.asset for d in drift] == [USDT] and adopted == []
+        assert ledger.total(USDT) == 1000.0
+
+        # Stream event for the same asset confirms it: adopted
+        drift, adopted = ledger.apply_exchange_balances(
+            [AssetBalance(asset=USDT, available=1500.0, locked=0.0)], complete=False)
+        assert adopted == [USDT] and ledger.total(USDT) == 1500.0
+        assert ledger.apply_exchange_balances(deposit) == ([], [])
+
+    def test_transient_drift_not_adopted(self, ledger):
+        # REST snapshot racing an execution, then a matching report resets the count
+        ledger.apply_exchange_balances(_balances(eth=1.0, usdt=900.0))
+        ledger.apply_trade(_trade(Side.BUY, 1.0, 100.0, 't1'))
+        assert ledger.apply_exchange_balances(_balances(eth=1.0, usdt=900.0)) == ([], [])
+        drift, adopted = ledger.apply_exchange_balances(_balances(eth=0.0, usdt=1000.0))
+        assert len(drift) == 2 and adopted == []
+        assert ledger.total(ETH) == 1.0
+
+    def test_partial_reports_before_sync_ignored(self):
+        ledger = BalanceLedger()
+        assert ledger.apply_exchange_balances([AssetBalance(asset=ETH, available=1.0, locked=0.0)],
+                                              complete=False) == ([], [])
+        assert not ledger.synced
+        assert ledger.apply_exchange_balances(_balances()) == ([], [ETH, USDT])
+        assert ledger.synced
+
+    def test_futures_margin_from_reports(self):
+        ledger = BalanceLedger(is_futures=True)
+        ledger.apply_exchange_balances([AssetBalance(asset=USDT, available=900.0, locked=100.0)])
+
+        # New position takes margin: locked follows the exchange, total unchanged
+        drift, _ = ledger.apply_exchange_balances([AssetBalance(asset=USDT, available=700.0, locked=300.0)],
+                                                  complete=False)
+        assert drift == [] and ledger.get_balance(USDT) == AssetBalance(asset=USDT, available=700.0, locked=300.0)
+
+        ledger.apply_exchange_balances([AssetBalance(asset=USDT, available=1000.0, locked=0.0)])
+        assert ledger.get_balance(USDT).locked == 0.0
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            BalanceLedger(adopt_after=0)
+
+
+# =============================================================================
+# Persistence and replay
+# =============================================================================
+
+class TestPersistence:
+    def _session(self, ledger):
+        ledger.apply_order(_order())
+        ledger.apply_trade(_trade(Side.BUY, 1.0, 100.0, 't1', fee=0.1))
+        ledger.apply_order(_order(filled=1.0, status=OrderStatus.PARTIALLY_FILLED))
+        ledger.apply_transfer(USDT, 50.0)
+        for _ in range(2):
+            ledger.apply_exchange_balances([AssetBalance(asset=ETH, available=1.5, locked=0.0)], complete=False)
+        ledger.mark(SYMBOL, 105.0)
+
+    def test_snapshot_round_trip(self, ledger):
+        self._session(ledger)
+        data = msgspec.json.encode(ledger.snapshot())
+        restored = BalanceLedger.from_snapshot(msgspec.json.decode(data, type=LedgerSnapshot))
+
+        assert restored.balances == ledger.balances
+        assert restored.get_position(SYMBOL) == ledger.get_position(SYMBOL)
+        assert restored.unrealized_pnl == pytest.approx(5.0)
+        assert not restored.synced      # totals re-baselined by the next REST snapshot
+
+        # Restored locks keep being released by later events
+        restored.apply_order(_order(filled=1.0, status=OrderStatus.CANCELED))
+        assert restored.get_balance(USDT).locked == 0.0
+
+    def test_replay_recorded_events(self, ledger):
+        self._session(ledger)
+        events = msgspec.json.decode(msgspec.json.encode(ledger.events), type=List[LedgerEvent])
+
+        replayed = BalanceLedger.replay(events)
+        assert replayed.balances == ledger.balances
+        assert replayed.realized_pnl == ledger.realized_pnl
+        assert replayed.unrealized_pnl == ledger.unrealized_pnl
+
+
+# =============================================================================
+# Composite integration
+# =============================================================================
+
+@pytest.fixture
+def private():
+    config = MagicMock()
+    config.name = 'TEST'
+    config.is_futures = False
+    config.exchange_enum = ExchangeEnum.GATEIO
+    rest = MagicMock()
+    rest.get_balances = AsyncMock(return_value=_balances())
+    exchange = BasePrivateComposite(config=config, rest_client=rest, websocket_client=MagicMock(),
+                                    logger=MagicMock())
+    return exchange
+
+
+class TestComposite:
+    async def test_stream_events_and_reconciliation(self, private):
+        await private.load_balances()
+        assert private.ledger.synced
+
+        await private._order_handler(_order())
+        await private._execution_handler(_trade(Side.BUY, 2.0, 100.0, 't1'))
+        assert private.ledger.get_balance(ETH).available == 2.0
+        assert private.ledger.get_balance(USDT) == AssetBalance(asset=USDT, available=800.0, locked=0.0)
+
+        # Stale REST snapshot: drift reported, ledger kept
+        await private.load_balances()
+        assert private.ledger.total(ETH) == 2.0
+        drift_logs = [c for c in private.logger.warning.call_args_list if c.args[0] == "Balance ledger drift vs REST"]
+        assert len(drift_logs) == 1 and drift_logs[0].kwargs['adopted'] == []
+
+        # Stream gap: the REST snapshot is adopted
+        private.ledger.mark_stale()
+        await private.load_balances()
+        assert private.ledger.total(ETH) == 0.0
+
+    async def test_balances_served_from_ledger(self, private):
+        assert private.balances == {}
+        await private.load_balances()
+        await private._order_handler(_order())
+        assert private.balances[USDT] == AssetBalance(asset=USDT, available=800.0, locked=200.0)
+        assert await private.get_asset_balance(USDT) == private.balances[USDT]
+        assert await private.get_asset_balance(ETH) == AssetBalance(asset=ETH, available=0.0, locked=0.0)
+        private._rest.get_asset_balance.assert_not_called()
+
+        # External deposit: the REST snapshot only reports drift...
+        private._rest.get_balances.return_value = _balances(eth=1.0)
+        await private.load_balances()
+        assert private.balances[ETH].total == 0.0 and private.ledger.last_drift[0].asset == ETH
+
+        # ...confirmed by the BALANCE stream event it is adopted
+        await private._balance_handler(AssetBalance(asset=ETH, available=1.0, locked=0.0))
+        assert private.balances[ETH].total == 1.0
+        drift_logs = [c for c in private.logger.warning.call_args_list
+                      if c.args[0] == "Balance ledger drift vs exchange"]
+        assert len(drift_logs) == 1 and drift_logs[0].kwargs['adopted'] == [ETH]
+
+    async def test_forced_read_is_exchange_reported(self, private):
+        await private.load_balances()
+        private._rest.get_asset_balance = AsyncMock(return_value=AssetBalance(asset=ETH, available=3.0, locked=0.0))
+        assert (await private.get_asset_balance(ETH, force=True)).total == 3.0
+        assert private.balances[ETH].total == 0.0       # single report: ledger not corrected yet
+
+    async def test_restore_ledger(self, private):
+        ledger = BalanceLedger()
+        ledger.load(_balances())
+        ledger.apply_trade(_trade(Side.BUY, 1.0, 100.0, 't1'))
+        snapshot = msgspec.json.decode(msgspec.json.encode(ledger.snapshot()), type=LedgerSnapshot)
+
+        private.restore_ledger(snapshot)
+        private._rest.get_balances.return_value = _balances(eth=1.0, usdt=901.0)
+        await private.load_balances()
+        assert private.ledger.synced and private.ledger.total(USDT) == 901.0
+        assert private.ledger.get_position(SYMBOL).qty == 1.0
+
+    async def test_balance_sync_reconciles_periodically(self, private):
+        private.balance_reconcile_every = 3
+        private._exec_bound_handler = MagicMock()
+        for reconcile in (True, False, False, True):
+            await private._sync_balances(reconcile=reconcile)
+        assert private._rest.get_balances.await_count == 2
+
+        snapshots = [c.args[1] for c in private._exec_bound_handler.call_args_list
+                     if c.args[0] == PrivateWebsocketChannelType.BALANCE_SNAPSHOT]
+        assert len(snapshots) == 4 and snapshots[-1]['balances'] == private.ledger.balances
+
+        # Not synced: always fetched
+        private.ledger.mark_stale()
+        await private._sync_balances(reconcile=False)
+        assert private._rest.get_balances.await_count == 3
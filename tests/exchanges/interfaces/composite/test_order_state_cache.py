@@ -0,0 +1,282 @@
+"""Unit tests for the private order state cache.
+
+Test Coverage:
+- Monotonic merge: stale REST replies / reordered events, sequence numbers
+- Partial-fill aggregation from executions (dedup, average price, fees)
+- Final market orders priced at the average fill; REST average price replaces the stream aggregate
+- Client order id index, terminal retention TTL and max_orders pruning
+- wait_for_fill() futures
+- BasePrivateComposite: fetch_order/wait_for_fill skip REST when the stream
+  confirmed the order, REST reconciliation after a stream gap, not synced
+  while the private WebSocket is disconnected
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from exchanges.interfaces.composite.base_private_composite import BasePrivateComposite
+from exchanges.interfaces.composite.order_state_cache import OrderStateCache, is_order_final
+from exchanges.structs import ExchangeEnum, OrderStatus, OrderType, Side
+from exchanges.structs.common import AssetName, Order, Symbol, Trade
+
+SYMBOL = Symbol(base=AssetName('ETH'), quote=AssetName('USDT'))
+
+
+def _order(status=OrderStatus.NEW, filled=0.0, average_price=None, order_id='1', price=100.0,
+           order_type=OrderType.LIMIT, **kwargs):
+    return Order(symbol=SYMBOL, order_id=order_id, side=Side.BUY, order_type=order_type,
+                 quantity=10.0, price=price, filled_quantity=filled, status=status,
+                 average_price=average_price, **kwargs)
+
+
+def _trade(quantity, price, trade_id, order_id='1', fee=0.01, timestamp=1):
+    return Trade(symbol=SYMBOL, side=Side.BUY, quantity=quantity, price=price, timestamp=timestamp,
+                 trade_id=trade_id, order_id=order_id, fee=fee)
+
+
+# =============================================================================
+# Merge ordering
+# =============================================================================
+
+class TestMerge:
+    def test_stale_updates_dropped(self):
+        cache = OrderStateCache()
+        cache.update(_order(OrderStatus.PARTIALLY_FILLED, filled=4.0))
+
+        order, applied = cache.update(_order(OrderStatus.NEW))                  # stale REST place reply
+        assert not applied and order.filled_quantity == 4.0
+
+        order, applied = cache.update(_order(OrderStatus.FILLED, filled=10.0, average_price=100.0))
+        assert applied and is_order_final(order)
+
+        order, applied = cache.update(_order(OrderStatus.PARTIALLY_FILLED, filled=6.0))   # reordered event
+        assert not applied and order.status == OrderStatus.FILLED
+
+    def test_terminal_reply_keeps_fill_details(self):
+        cache = OrderStateCache()
+        cache.update(_order(OrderStatus.PARTIALLY_FILLED, filled=4.0, average_price=99.5, client_order_id='c1'))
+
+        # Cancel reply without fill details
+        order, applied = cache.update(_order(OrderStatus.CANCELED))
+        assert applied
+        assert order.status == OrderStatus.PARTIALLY_CANCELED
+        assert (order.filled_quantity, order.average_price, order.client_order_id) == (4.0, 99.5, 'c1')
+
+        # A terminal snapshot adding nothing is ignored
+        assert not cache.update(_order(OrderStatus.CANCELED, filled=4.0, average_price=99.5))[1]
+
+    def test_sequence_numbers(self):
+        cache = OrderStateCache()
+        cache.update(_order(OrderStatus.PARTIALLY_FILLED, filled=4.0), sequence=5)
+        assert not cache.update(_order(OrderStatus.PARTIALLY_FILLED, filled=6.0), sequence=4)[1]
+        assert cache.update(_order(OrderStatus.PARTIALLY_FILLED, filled=6.0), sequence=6)[1]
+
+
+# =============================================================================
+# Executions
+# =============================================================================
+
+class TestExecutions:
+    def test_partial_fill_aggregation(self):
+        cache = OrderStateCache()
+        cache.update(_order())
+
+        order = cache.apply_trade(_trade(4.0, 100.0, 't1'))
+        assert (order.status, order.filled_quantity, order.remaining_quantity) == (OrderStatus.PARTIALLY_FILLED, 4.0, 6.0)
+        assert cache.apply_trade(_trade(4.0, 100.0, 't1')) is None                 # duplicate
+        assert cache.apply_trade(_trade(1.0, 100.0, 't0', order_id=None)) is None  # not attributable
+
+        order = cache.apply_trade(_trade(6.0, 101.0, 't2'))
+        assert order.status == OrderStatus.FILLED and is_order_final(order)
+        assert order.average_price == pytest.approx(100.6)
+        assert order.fee == pytest.approx(0.02)
+
+        # Order event lagging behind executions does not regress the state
+        order, applied = cache.update(_order(OrderStatus.PARTIALLY_FILLED, filled=4.0))
+        assert not applied and order.filled_quantity == 10.0
+
+    def test_execution_before_order(self):
+        cache = OrderStateCache()
+        assert cache.apply_trade(_trade(10.0, 100.0, 't1')) is None
+
+        # REST place reply says NEW; the buffered execution completes it
+        order, applied = cache.update(_order())
+        assert applied and order.status == OrderStatus.FILLED and order.average_price == 100.0
+
+    def test_average_price_from_executions(self):
+        cache = OrderStateCache()
+        cache.update(_order())
+        cache.apply_trade(_trade(10.0, 100.0, 't1'))
+
+        # Terminal order event without average price: filled from executions
+        order, _ = cache.update(_order(OrderStatus.FILLED, filled=10.0, timestamp=2))
+        assert order.average_price == 100.0
+
+    def test_executions_without_trade_id(self):
+        cache = OrderStateCache()
+        cache.update(_order())
+
+        # Distinct fills sharing timestamp, price and quantity are all counted
+        cache.apply_trade(_trade(2.0, 100.0, None, timestamp=5))
+        order = cache.apply_trade(_trade(2.0, 100.0, None, timestamp=5))
+        assert order.filled_quantity == 4.0
+
+
+# =============================================================================
+# Fill price
+# =============================================================================
+
+class TestFillPrice:
+    def test_market_order_priced_from_executions(self):
+        cache = OrderStateCache()
+        market = dict(order_type=OrderType.MARKET, price=0.0)
+        cache.update(_order(**market))
+        cache.apply_trade(_trade(10.0, 101.5, 't1'))
+        assert cache.get('1').price == 101.5
+
+        # Stream FILLED without fill details keeps the execution price
+        order, _ = cache.update(_order(OrderStatus.FILLED, filled=10.0, **market))
+        assert (order.price, order.average_price) == (101.5, 101.5)
+
+    def test_rest_average_replaces_stream_snapshot(self):
+        cache = OrderStateCache()
+        market = dict(order_type=OrderType.MARKET, price=0.0)
+        order, _ = cache.update(_order(OrderStatus.FILLED, filled=10.0, **market))
+        assert order.price == 0.0 and not is_order_final(order)
+
+        order, applied = cache.update(_order(OrderStatus.FILLED, filled=10.0, average_price=101.5, price=101.5),
+                                      from_rest=True)
+        assert applied and (order.price, order.average_price) == (101.5, 101.5)
+
+        # A repeated REST reply adds nothing; a stream snapshot never replaces fill details
+        assert not cache.update(_order(OrderStatus.FILLED, filled=10.0, average_price=101.5), from_rest=True)[1]
+        assert not cache.update(_order(OrderStatus.FILLED, filled=10.0, average_price=101.0))[1]
+        # An exchange-computed average differing from the stream aggregate wins
+        order, applied = cache.update(_order(OrderStatus.FILLED, filled=10.0, average_price=101.4), from_rest=True)
+        assert applied and order.price == 101.4
+
+
+# =============================================================================
+# Index and retention
+# =============================================================================
+
+class TestRetention:
+    def test_client_id_and_remove(self):
+        cache = OrderStateCache()
+        cache.update(_order(client_order_id='c1'))
+        assert cache.get_by_client_id('c1').order_id == '1'
+        assert cache.remove('1') and '1' not in cache
+        assert cache.get_by_client_id('c1') is None
+
+    def test_terminal_ttl(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr('exchanges.interfaces.composite.order_state_cache.time.monotonic', lambda: clock[0])
+        cache = OrderStateCache(terminal_ttl=60)
+        cache.update(_order(OrderStatus.CANCELED, order_id='done'))
+        cache.update(_order(order_id='open'))
+
+        clock[0] += 61
+        cache.update(_order(order_id='other'))
+        assert 'done' not in cache and 'open' in cache and len(cache) == 2
+
+    def test_max_orders(self):
+        cache = OrderStateCache(max_orders=3)
+        cache.update(_order(order_id='open'))
+        for i in range(5):
+            cache.update(_order(OrderStatus.CANCELED, order_id=str(i)))
+        assert len(cache) == 3 and 'open' in cache and '4' in cache
+
+
+# =============================================================================
+# Waiting
+# =============================================================================
+
+class TestWaitForFill:
+    async def test_resolved_by_update(self):
+        cache = OrderStateCache()
+        cache.update(_order())
+        waiter = asyncio.create_task(cache.wait_for_fill('1', timeout=1.0))
+        await asyncio.sleep(0)
+
+        cache.apply_trade(_trade(10.0, 100.0, 't1'))
+        order = await waiter
+        assert order.status == OrderStatus.FILLED
+        assert await cache.wait_for_fill('1', timeout=0.01) is order
+
+    async def test_timeout(self):
+        cache = OrderStateCache()
+        assert await cache.wait_for_fill('missing', timeout=0.01) is None
+        assert not cache._waiters
+
+
+# =============================================================================
+# Composite integration
+# =============================================================================
+
+@pytest.fixture
+def private():
+    config = MagicMock()
+    config.name = 'TEST'
+    config.exchange_enum = ExchangeEnum.GATEIO
+    rest = MagicMock()
+    rest.get_order = AsyncMock(return_value=_order(OrderStatus.FILLED, filled=10.0, average_price=100.0))
+    rest.get_open_orders = AsyncMock(return_value=[])
+    exchange = BasePrivateComposite(config=config, rest_client=rest, websocket_client=MagicMock(),
+                                    logger=MagicMock())
+    exchange._order_stream_active = True
+    return exchange
+
+
+class TestComposite:
+    async def test_stream_confirms_without_rest(self, private):
+        await private._load_open_orders()
+        assert private.order_stream_live
+
+        await private._update_order(_order())
+        waiter = asyncio.create_task(private.wait_for_fill(SYMBOL, '1', timeout=1.0))
+        await asyncio.sleep(0)
+        await private._order_handler(_order(OrderStatus.FILLED, filled=10.0, average_price=100.5))
+
+        assert (await waiter).average_price == 100.5
+        assert (await private.fetch_order(SYMBOL, '1')).average_price == 100.5
+        private._rest.get_order.assert_not_called()
+
+    async def test_reconcile_after_gap(self, private):
+        await private._load_open_orders()
+        await private._update_order(_order())
+
+        private._order_cache.mark_stale()
+        assert not private.order_stream_live
+        assert (await private.wait_for_fill(SYMBOL, '1')).status == OrderStatus.FILLED
+        private._rest.get_order.assert_awaited_once()
+
+        # Reconnect: open order missing from the REST open list is reconciled
+        private._rest.get_order.reset_mock()
+        await private._update_order(_order(order_id='2'))
+        private._rest.get_order.return_value = _order(OrderStatus.CANCELED, order_id='2')
+        await private._load_open_orders()
+        private._rest.get_order.assert_awaited_once()
+        assert private.get_order('2').status == OrderStatus.CANCELED
+        assert private.order_stream_live
+
+    async def test_not_synced_while_disconnected(self, private):
+        private._ws.is_connected.return_value = False
+        await private._load_open_orders()
+        assert not private.order_stream_live
+
+        private._ws.is_connected.return_value = True
+        await private._load_open_orders()
+        assert private.order_stream_live
+
+    async def test_stream_market_fill_priced_by_rest(self, private):
+        await private._load_open_orders()
+        await private._order_handler(_order(OrderStatus.FILLED, filled=10.0, order_type=OrderType.MARKET,
+                                            price=0.0))
+        private._rest.get_order.return_value = _order(OrderStatus.FILLED, filled=10.0, average_price=101.5,
+                                                      order_type=OrderType.MARKET, price=101.5)
+
+        order = await private.wait_for_fill(SYMBOL, '1', timeout=0.01)
+        assert (order.price, order.average_price) == (101.5, 101.5)
+        assert private.get_order('1').price == 101.5
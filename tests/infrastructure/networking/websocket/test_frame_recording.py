@@ -0,0 +1,202 @@
+"""Unit tests for WebSocket frame recording and replay.
+
+Test Coverage:
+- Segment round trip of binary and text frames, segment rotation
+- Merging recordings of several connections by receive time
+- Recording at the WebSocketManager receive boundary
+- Replay through WebSocketManager: identical frames, order and types, no
+  drops when the queue is smaller than the recording
+- Replay pacing: original pace vs accelerated (performance)
+- Gate.io JSON parsing regression through the full interface path
+"""
+
+import asyncio
+import gzip
+import time
+
+import msgspec
+import pytest
+from websockets.protocol import State as WsState
+
+from config.structs import WebSocketConfig
+from infrastructure.networking.websocket import FrameRecorder, FrameReplayer, WebSocketManager, read_frames
+from infrastructure.networking.websocket.structs import WebSocketManagerConfig
+
+T0 = 1_700_000_000_000_000_000
+
+
+class _LiveSocket:
+    """Scripted stand-in for a live connection."""
+
+    def __init__(self, frames):
+        self._frames = list(frames)
+        self.state = WsState.OPEN
+
+    async def recv(self):
+        if not self._frames:
+            await asyncio.Future()
+        return self._frames.pop(0)
+
+    async def send(self, message):
+        pass
+
+    async def close(self):
+        self.state = WsState.CLOSED
+
+
+def _manager(connect, handler, replayer=None, max_pending=1000):
+    manager = WebSocketManager(config=WebSocketConfig(), connect_method=connect, message_handler=handler,
+                               manager_config=WebSocketManagerConfig(max_pending_messages=max_pending))
+    if replayer is not None:
+        replayer.attach(manager)
+    return manager
+
+
+def _frames():
+    frames = []
+    for i in range(50):
+        frames.append(msgspec.json.encode({'seq': i, 'px': f'{100 + i / 7:.8f}'}).decode())
+        frames.append(bytes([i % 256]) * (i + 1))
+    return frames
+
+
+# =============================================================================
+# Segments
+# =============================================================================
+
+class TestSegments:
+    def test_round_trip_and_rotation(self, tmp_path):
+        frames = _frames()
+        with FrameRecorder(tmp_path, prefix='mexc', segment_bytes=512, flush_bytes=256) as recorder:
+            for i, frame in enumerate(frames):
+                recorder.record('conn-a', frame, timestamp_ns=T0 + i)
+
+        assert len(recorder.segments) > 1
+        replayed = list(read_frames(tmp_path))
+        assert [f.payload for f in replayed] == frames
+        assert [type(f.payload) for f in replayed] == [type(f) for f in frames]
+        assert [f.timestamp_ns for f in replayed] == [T0 + i for i in range(len(frames))]
+        assert {f.connection_id for f in replayed} == {'conn-a'}
+
+    def test_directory_merges_connections_by_time(self, tmp_path):
+        with FrameRecorder(tmp_path, prefix='mexc') as mexc, FrameRecorder(tmp_path, prefix='gateio') as gateio:
+            for i in range(10):
+                (mexc if i % 2 else gateio).record('mexc' if i % 2 else 'gateio', f'{i}', timestamp_ns=T0 + i)
+
+        assert [f.payload for f in read_frames(tmp_path)] == [str(i) for i in range(10)]
+        assert [f.payload for f in read_frames(tmp_path, connection_id='mexc')] == ['1', '3', '5', '7', '9']
+
+    def test_not_a_segment(self, tmp_path):
+        path = tmp_path / 'bad.wsf.gz'
+        with gzip.open(path, 'wb') as f:
+            f.write(b'nope')
+        with pytest.raises(ValueError):
+            list(read_frames(path))
+
+
+# =============================================================================
+# Manager integration
+# =============================================================================
+
+class TestManagerRecordReplay:
+    async def test_record_then_replay_is_identical(self, tmp_path):
+        frames = _frames()
+        received = []
+
+        async def handler(raw):
+            received.append(raw)
+
+        async def connect():
+            return _LiveSocket(frames)
+
+        manager = _manager(connect, handler)
+        recorder = FrameRecorder(tmp_path, prefix='live')
+        manager.enable_frame_recording(recorder, 'live-conn')
+        await manager.initialize()
+        while len(received) < len(frames):
+            await asyncio.sleep(0.01)
+        await manager.close()
+        recorder.close()
+        assert received == frames
+
+        # Queue smaller than the recording: replay must not drop frames
+        replayed = []
+
+        async def replay_handler(raw):
+            replayed.append(raw)
+            await asyncio.sleep(0)
+
+        replayer = FrameReplayer(tmp_path, speed=None)
+        manager = _manager(None, replay_handler, replayer=replayer, max_pending=8)
+        await manager.initialize()
+        await asyncio.wait_for(replayer.wait_until_processed(), timeout=5)
+        await manager.close()
+
+        assert replayed == frames
+        assert [type(f) for f in replayed] == [type(f) for f in frames]
+        assert replayer.frames_replayed == len(frames)
+        assert replayer.frames_per_second > 0
+
+    @pytest.mark.performance
+    async def test_pacing(self, tmp_path):
+        with FrameRecorder(tmp_path) as recorder:
+            for i in range(5):
+                recorder.record('c', f'{i}', timestamp_ns=T0 + i * 50_000_000)   # 50ms apart
+
+        async def replay(speed):
+            replayer = FrameReplayer(tmp_path, speed=speed)
+
+            async def handler(raw):
+                pass
+
+            manager = _manager(None, handler, replayer=replayer)
+            started = time.perf_counter()
+            await manager.initialize()
+            await asyncio.wait_for(replayer.wait_until_processed(), timeout=5)
+            elapsed = time.perf_counter() - started
+            await manager.close()
+            return elapsed
+
+        assert await replay(1.0) >= 0.19
+        assert await replay(10.0) < 0.15
+
+    def test_invalid_speed(self, tmp_path):
+        with pytest.raises(ValueError):
+            FrameReplayer(tmp_path, speed=0)
+
+
+class TestGateioParserRegression:
+    async def test_book_ticker_frames_parse_identically(self, tmp_path):
+        from config.config_manager import get_exchange_config
+        from exchanges.integrations.gateio.ws.gateio_ws_public import GateioPublicSpotWebsocket
+        from exchanges.structs import ExchangeEnum
+        from infrastructure.networking.websocket.structs import PublicWebsocketChannelType
+
+        with FrameRecorder(tmp_path, prefix='gateio') as recorder:
+            for i in range(20):
+                message = {'time': 1, 'channel': 'spot.book_ticker', 'event': 'update',
+                           'result': {'t': 1_700_000_000_000 + i, 'u': i, 's': 'BTC_USDT',
+                                      'b': f'{100 + i * 0.01:.2f}', 'B': '1.5', 'a': f'{100.02 + i * 0.01:.2f}',
+                                      'A': '2.25'}}
+                recorder.record('GATEIO_SPOT_public', msgspec.json.encode(message).decode(),
+                                timestamp_ns=T0 + i * 1000)
+
+        async def parse_session():
+            tickers = []
+
+            async def on_book_ticker(book_ticker):
+                tickers.append(book_ticker)
+
+            ws = GateioPublicSpotWebsocket(config=get_exchange_config(ExchangeEnum.GATEIO))
+            ws.bind(PublicWebsocketChannelType.BOOK_TICKER, on_book_ticker)
+            replayer = FrameReplayer(tmp_path, connection_id='GATEIO_SPOT_public', speed=None)
+            replayer.attach(ws._ws_manager)
+            await ws.initialize()
+            await asyncio.wait_for(replayer.wait_until_processed(), timeout=5)
+            await ws.close()
+            return tickers
+
+        first = await parse_session()
+        assert len(first) == 20
+        assert first[0].bid_price == 100.0 and first[-1].ask_quantity == 2.25
+        assert await parse_session() == first
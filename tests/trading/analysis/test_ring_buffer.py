@@ -0,0 +1,91 @@
+"""Unit tests for trading.analysis.ring_buffer.
+
+Test Coverage:
+- Ordered zero-copy views across wrap-around, read-only views
+- Incremental sum/mean/std/min/max parity with NumPy over a sliding window
+- NaN semantics and recovery once NaN leaves the window
+- Bulk extend() keeping the most recent samples
+- Pushes reuse the preallocated storage (no per-tick array allocation)
+"""
+
+import math
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from trading.analysis.ring_buffer import RingBuffer
+
+
+def _random_walk(n: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.cumsum(rng.normal(0, 0.05, n)) + rng.normal(0, 0.1, n)
+
+
+class TestRingBuffer:
+    def test_ordered_view_wraps(self):
+        buffer = RingBuffer(4)
+        for value in range(1, 8):
+            buffer.push(value)
+
+        view = buffer.values()
+        np.testing.assert_array_equal(view, [4.0, 5.0, 6.0, 7.0])
+        assert np.shares_memory(view, buffer._data)
+        assert buffer[-1] == buffer.last() == 7.0
+        assert buffer.is_full and len(buffer) == 4
+        with pytest.raises(ValueError):
+            view[0] = 0.0
+
+    def test_statistics_match_numpy(self):
+        data = _random_walk(3000, seed=1)
+        buffer = RingBuffer(250)
+        for i, value in enumerate(data):
+            buffer.push(value)
+            if i % 97 == 0 or i == len(data) - 1:
+                window = data[max(0, i - 249):i + 1]
+                np.testing.assert_array_equal(buffer.values(), window)
+                assert buffer.sum == pytest.approx(window.sum(), abs=1e-9)
+                assert buffer.mean == pytest.approx(window.mean(), abs=1e-12)
+                assert buffer.std == pytest.approx(window.std(), rel=1e-9)
+                assert buffer.min == window.min()
+                assert buffer.max == window.max()
+
+    def test_nan_leaves_window(self):
+        buffer = RingBuffer(3, values=[1.0, math.nan, 2.0])
+        assert math.isnan(buffer.mean) and math.isnan(buffer.max)
+
+        buffer.push(3.0)
+        buffer.push(4.0)
+        assert buffer.mean == pytest.approx(3.0)
+        assert (buffer.min, buffer.max) == (2.0, 4.0)
+
+    def test_extend_keeps_latest(self):
+        buffer = RingBuffer(5)
+        buffer.extend(np.arange(3, dtype=np.float64))
+        buffer.extend([3.0, 4.0, 5.0, 6.0])
+        np.testing.assert_array_equal(buffer.values(), [2.0, 3.0, 4.0, 5.0, 6.0])
+        assert buffer.mean == pytest.approx(4.0)
+
+        buffer.extend(np.arange(100, dtype=np.float64))
+        np.testing.assert_array_equal(np.asarray(buffer), np.arange(95, 100))
+
+        buffer.clear()
+        assert len(buffer) == 0 and math.isnan(buffer.mean) and math.isnan(buffer.last())
+
+    def test_push_reuses_storage(self):
+        buffer = RingBuffer(500, values=_random_walk(500, seed=2))
+        storage = buffer._data
+        values = [float(v) for v in _random_walk(20000, seed=3)]
+        for value in values[:1000]:     # Warm up NumPy's internal caches (resync path)
+            buffer.push(value)
+
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        for value in values[1000:]:
+            buffer.push(value)
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert buffer._data is storage
+        assert after - before < 8 * 1024      # Nothing retained per push (19k pushes)
+        assert buffer.mean == pytest.approx(np.mean(values[-500:]))
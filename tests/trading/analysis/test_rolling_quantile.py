@@ -0,0 +1,199 @@
+"""Unit tests for trading.analysis.rolling_quantile and its signal call sites.
+
+Test Coverage:
+- RollingQuantile quantile/rank/mean/std parity with NumPy, including NaN
+- Batch rolling_window_stats continuing from a seeded engine
+- calculate_arb_signals_series / ArbSignalTracker vs per-row calculate_arb_signals
+- ArbitrageAnalyzer.add_arb_signals_with_pnl vs the per-row reference loop
+- MexcGateioFuturesArbitrageSignal.apply_signals vs per-row calculate_spread_metrics
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading.analysis.arbitrage_signals import (
+    ArbSignalTracker, calculate_arb_signals, calculate_arb_signals_series
+)
+from trading.analysis.rolling_quantile import RollingQuantile, rolling_window_stats
+from trading.signals.types import Signal
+
+
+def _random_walk(n: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.cumsum(rng.normal(0, 0.05, n)) + rng.normal(0, 0.1, n)
+
+
+class TestRollingQuantile:
+    """Push API parity with NumPy over a sliding window."""
+
+    def test_matches_numpy(self):
+        values = np.round(_random_walk(400, 1), 2)  # rounding creates ties
+        engine = RollingQuantile(window=37)
+
+        for i, value in enumerate(values):
+            engine.push(value)
+            window = values[max(0, i - 36):i + 1]
+            assert len(engine) == len(window)
+            for q in (0.0, 0.2, 0.25, 0.5, 0.7, 1.0):
+                assert engine.quantile(q) == np.quantile(window, q)
+            assert engine.rank(value) == np.searchsorted(np.sort(window), value)
+            assert engine.mean == pytest.approx(np.mean(window), rel=1e-9, abs=1e-12)
+            assert engine.std == pytest.approx(np.std(window), rel=1e-7, abs=1e-12)
+
+    def test_nan_semantics(self):
+        engine = RollingQuantile(window=3, values=[1.0, np.nan, 2.0])
+
+        assert np.isnan(engine.quantile(0.5))
+        assert np.isnan(engine.mean)
+        assert engine.rank(1.5) == 1
+        assert engine.rank(np.nan) == 2
+
+        engine.push(3.0)
+        engine.push(4.0)  # NaN evicted
+        assert engine.quantile(0.5) == 3.0
+
+    def test_batch_continues_seeded_engine(self):
+        values = _random_walk(200, 2)
+        seeded = RollingQuantile(window=50, values=values[:120])
+
+        stats = rolling_window_stats(values[120:], quantiles=(0.25,), percentile_rank=True, engine=seeded)
+
+        reference = rolling_window_stats(values, window=50, quantiles=(0.25,), percentile_rank=True)
+        np.testing.assert_array_equal(stats['quantiles'], reference['quantiles'][120:])
+        np.testing.assert_array_equal(stats['percentile_rank'], reference['percentile_rank'][120:])
+        np.testing.assert_array_equal(seeded.to_array(), values[-50:])
+
+
+class TestArbSignalSeries:
+    """Incremental strided-extremes percentiles vs the one-shot function."""
+
+    @pytest.mark.parametrize('window_size,lookback', [(10, None), (10, 60), (7, 45), (4, 3)])
+    def test_series_matches_per_row_calls(self, window_size, lookback):
+        x = _random_walk(300, 3)
+        y = _random_walk(300, 4)
+        x[150] = np.nan
+
+        series = calculate_arb_signals_series(x, y, window_size=window_size, lookback_periods=lookback)
+        tracker = ArbSignalTracker(window_size, lookback)
+
+        for i in range(len(x)):
+            start = 0 if lookback is None else max(0, i - lookback)
+            expected = calculate_arb_signals(x[start:i + 1], y[start:i + 1], x[i], y[i], window_size)
+            streamed = tracker.update(x[i], y[i])
+
+            assert series.signal[i] == expected.signal
+            assert streamed.signal == expected.signal
+            np.testing.assert_equal(series.mexc_min_25pct[i], expected.mexc_vs_gateio_futures.min_25pct)
+            np.testing.assert_equal(series.gateio_max_25pct[i], expected.gateio_spot_vs_futures.max_25pct)
+            np.testing.assert_equal(streamed.gateio_spot_vs_futures.min_25pct,
+                                    expected.gateio_spot_vs_futures.min_25pct)
+            np.testing.assert_allclose(series.mexc_mean[i], expected.mexc_vs_gateio_futures.mean,
+                                       rtol=1e-9, atol=1e-12)
+
+
+def _reference_add_arb_signals(df, mexc_col, gateio_col, window_size, lookback_periods, min_history):
+    """Per-row loop of the original add_arb_signals_with_pnl signal section (with enum comparisons)."""
+    signal, direction, min_25, max_25 = [], [], [], []
+    for i in range(len(df)):
+        if i < min_history:
+            signal.append('HOLD'); direction.append('NONE'); min_25.append(np.nan); max_25.append(np.nan)
+            continue
+        start = max(0, i - lookback_periods)
+        result = calculate_arb_signals(df[mexc_col].iloc[start:i + 1].values, df[gateio_col].iloc[start:i + 1].values,
+                                       df.iloc[i][mexc_col], df.iloc[i][gateio_col], window_size)
+        min_25.append(result.mexc_vs_gateio_futures.min_25pct)
+        max_25.append(result.gateio_spot_vs_futures.max_25pct)
+        mexc_net = df.iloc[i]['mexc_vs_gateio_futures_net']
+        gateio_net = df.iloc[i]['gateio_spot_vs_futures_net']
+        sig, dirn = 'HOLD', 'NONE'
+        if result.signal == Signal.ENTER:
+            if mexc_net > 0.05 and mexc_net >= gateio_net:
+                sig, dirn = 'ENTER', 'MEXC_TO_GATEIO'
+            elif gateio_net > 0.05 and gateio_net > mexc_net:
+                sig, dirn = 'ENTER', 'GATEIO_TO_MEXC'
+        elif result.signal == Signal.EXIT:
+            if abs(mexc_net) < 0.02 and abs(gateio_net) < 0.02:
+                sig = 'EXIT'
+        signal.append(sig); direction.append(dirn)
+    return signal, direction, np.array(min_25), np.array(max_25)
+
+
+class TestArbitrageAnalyzerSignals:
+    """add_arb_signals_with_pnl signal columns vs the original per-row loop."""
+
+    def test_matches_reference_loop(self):
+        from trading.research.cross_arbitrage.arbitrage_analyzer import ArbitrageAnalyzer, AnalyzerKeys
+
+        n = 400
+        rng = np.random.default_rng(5)
+        mexc_ask = 100 + np.cumsum(rng.normal(0, 0.05, n))
+        gateio_spot_ask = mexc_ask + rng.normal(0, 0.05, n)
+        fut_bid = mexc_ask * (1.01 + rng.normal(0, 0.004, n))
+        fut_bid[300:330] = mexc_ask[300:330]  # Spreads converge -> EXIT
+        gateio_spot_ask[300:330] = mexc_ask[300:330]
+        df = pd.DataFrame({
+            AnalyzerKeys.mexc_ask: mexc_ask,
+            AnalyzerKeys.mexc_bid: mexc_ask - 0.02,
+            AnalyzerKeys.gateio_spot_ask: gateio_spot_ask,
+            AnalyzerKeys.gateio_spot_bid: gateio_spot_ask - 0.02,
+            AnalyzerKeys.gateio_futures_bid: fut_bid,
+            AnalyzerKeys.gateio_futures_ask: fut_bid + 0.02,
+            AnalyzerKeys.mexc_vs_gateio_futures_arb: (fut_bid - mexc_ask) / mexc_ask * 100,
+            AnalyzerKeys.gateio_spot_vs_futures_arb: (gateio_spot_ask - fut_bid) / fut_bid * 100,
+        }, index=pd.date_range('2025-01-01', periods=n, freq='5min'))
+        df['mexc_vs_gateio_futures_net'] = df[AnalyzerKeys.mexc_vs_gateio_futures_arb] - 0.01
+        df['gateio_spot_vs_futures_net'] = df[AnalyzerKeys.gateio_spot_vs_futures_arb] - 0.01
+        df['total_cost_pct'] = 0.01
+
+        signal, direction, min_25, max_25 = _reference_add_arb_signals(
+            df, AnalyzerKeys.mexc_vs_gateio_futures_arb, AnalyzerKeys.gateio_spot_vs_futures_arb,
+            window_size=10, lookback_periods=100, min_history=50
+        )
+
+        analyzer = ArbitrageAnalyzer.__new__(ArbitrageAnalyzer)
+        result = analyzer.add_arb_signals_with_pnl(df.copy(), lookback_periods=100, min_history=50)
+
+        assert list(result['signal']) == signal
+        assert {'ENTER', 'EXIT'} <= set(signal)
+        # Position tracking overwrites direction while a position is open; compare fresh entries
+        entries = [i for i, d in enumerate(direction) if d != 'NONE' and not result['position_open'].iloc[i - 1]]
+        assert entries
+        assert [result['direction'].iloc[i] for i in entries] == [direction[i] for i in entries]
+        np.testing.assert_array_equal(result['mexc_gateio_min_25pct'].to_numpy(), min_25)
+        np.testing.assert_array_equal(result['gateio_spot_max_25pct'].to_numpy(), max_25)
+
+
+class TestMexcGateioApplySignals:
+    """apply_signals vs per-row calculate_spread_metrics."""
+
+    def test_matches_per_row_metrics(self):
+        from trading.signals_v2.implementation.mexc_gateio_futures_arbitrage_signal import (
+            MexcGateioFuturesArbitrageSignal
+        )
+
+        n = 300
+        rng = np.random.default_rng(6)
+        strategy = MexcGateioFuturesArbitrageSignal(historical_window_hours=5, min_spread_threshold=-0.01)
+        mexc_ask = 100 + np.cumsum(rng.normal(0, 0.05, n))
+        fut_bid = mexc_ask + rng.normal(0, 0.1, n)
+        df = pd.DataFrame({
+            strategy.col_mexc_ask: mexc_ask,
+            strategy.col_mexc_bid: mexc_ask - 0.01,
+            strategy.col_gateio_fut_bid: fut_bid,
+            strategy.col_gateio_fut_ask: fut_bid + 0.01,
+        }, index=pd.date_range('2025-01-01', periods=n, freq='5min'))
+        df.iloc[100, 0] = 0.0  # Missing price row
+
+        reference = MexcGateioFuturesArbitrageSignal(historical_window_hours=5, min_spread_threshold=-0.01)
+        expected = [reference.calculate_spread_metrics(df, ts) for ts in df.index]
+
+        result = strategy.apply_signals(df)
+
+        assert list(result['entry_signal']) == [m.entry_signal for m in expected]
+        assert list(result['exit_signal']) == [m.exit_signal for m in expected]
+        assert list(result['favorable_direction']) == [m.favorable_direction for m in expected]
+        np.testing.assert_array_equal(result['mexc_to_fut_percentile'],
+                                      [m.mexc_to_gateio_fut_percentile for m in expected])
+        np.testing.assert_allclose(result['volatility'], [m.volatility for m in expected], rtol=1e-7, atol=1e-12)
+        np.testing.assert_array_equal(strategy._mexc_to_fut_history, reference._mexc_to_fut_history)
@@ -0,0 +1,65 @@
+"""Unit tests for trading.analysis.rolling_window.
+
+Test Coverage:
+- RollingWindow mean/std/min/max/sum parity with NumPy over a sliding window
+- NaN semantics and recovery once NaN leaves the window
+- Ewma parity with pandas ewm(adjust=False)
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading.analysis.rolling_window import Ewma, RollingWindow
+
+
+def _random_walk(n: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100 + np.cumsum(rng.normal(0, 0.05, n)) + rng.normal(0, 0.1, n)
+
+
+class TestRollingWindow:
+    @pytest.mark.parametrize('size', [1, 5, 20])
+    def test_matches_numpy(self, size):
+        data = np.round(_random_walk(500, seed=size), 2)  # rounding creates ties for the extremes
+        window = RollingWindow(size)
+        for i, value in enumerate(data):
+            window.push(value)
+            expected = data[max(0, i - size + 1):i + 1]
+            assert len(window) == len(expected)
+            assert (window.min, window.max, window.last()) == (expected.min(), expected.max(), expected[-1])
+            assert window.range == pytest.approx(np.ptp(expected), abs=1e-9)
+            assert window.mean == pytest.approx(expected.mean(), rel=1e-12)
+            assert window.sum == pytest.approx(expected.sum(), rel=1e-12)
+            assert window.std == pytest.approx(expected.std(), rel=1e-6, abs=1e-9)
+        np.testing.assert_array_equal(window.values(), data[-size:])
+
+    def test_nan_leaves_window(self):
+        window = RollingWindow(3, values=[1.0, math.nan, 2.0])
+        assert math.isnan(window.mean) and math.isnan(window.max)
+
+        window.push(3.0)
+        window.push(0.5)
+        assert window.mean == pytest.approx(11 / 6)
+        assert (window.min, window.max) == (0.5, 3.0)
+
+        window.clear()
+        assert len(window) == 0 and math.isnan(window.min) and math.isnan(window.last())
+
+
+class TestEwma:
+    def test_matches_pandas(self):
+        data = _random_walk(300, seed=1)
+        ewma = Ewma(span=20)
+        values = [ewma.push(value) for value in data]
+
+        expected = pd.Series(data).ewm(span=20, adjust=False).mean().to_numpy()
+        np.testing.assert_allclose(values, expected, rtol=1e-12)
+
+    def test_invalid_parameters(self):
+        with pytest.raises(ValueError):
+            Ewma()
+        with pytest.raises(ValueError):
+            Ewma(alpha=1.5)
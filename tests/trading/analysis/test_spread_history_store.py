@@ -0,0 +1,104 @@
+"""Unit tests for trading.analysis.spread_history_store.
+
+Test Coverage:
+- Binary snapshot round trip for RingBuffer and deque histories, with statistics
+- Corrupt, truncated and stale snapshots are ignored
+- warm_start(): restore + gap backfill, missing snapshot, failing backfill
+- rows_after() on naive and tz-aware time indexes
+"""
+
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading.analysis.ring_buffer import RingBuffer
+from trading.analysis.spread_history_store import (
+    SpreadHistoryStore, decode_snapshot, encode_snapshot, rows_after
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SpreadHistoryStore(str(tmp_path))
+    yield store
+    store.close()
+
+
+class TestSnapshotFormat:
+    def test_round_trip(self):
+        ring = RingBuffer(4, values=[1.0, 2.0, 3.0, 4.0, 5.0])
+        history = deque([0.5, -0.25], maxlen=10)
+        data = encode_snapshot('task', {'ring': ring, 'deque': history}, last_timestamp=1000.0,
+                               interval_seconds=60.0, written_at=1010.0)
+        snapshot = decode_snapshot(data)
+
+        assert (snapshot.key, snapshot.last_timestamp, snapshot.written_at) == ('task', 1000.0, 1010.0)
+        np.testing.assert_array_equal(snapshot.series['ring'], [2.0, 3.0, 4.0, 5.0])
+        np.testing.assert_array_equal(snapshot.series['deque'], [0.5, -0.25])
+        assert snapshot.stats['ring'] == {'mean': 3.5, 'std': pytest.approx(np.std([2, 3, 4, 5])),
+                                          'min': 2.0, 'max': 5.0}
+
+        restored = {'ring': RingBuffer(3), 'deque': deque(maxlen=10)}
+        assert snapshot.restore(restored) == 4
+        np.testing.assert_array_equal(restored['ring'].values(), [3.0, 4.0, 5.0])
+        assert list(restored['deque']) == [0.5, -0.25]
+
+    def test_invalid_data(self):
+        data = encode_snapshot('task', {'s': np.arange(10.0)}, 1000.0, 60.0)
+        with pytest.raises(ValueError):
+            decode_snapshot(b'XXXX' + data[4:])
+        with pytest.raises(ValueError):
+            decode_snapshot(data[:-8])
+
+
+class TestSpreadHistoryStore:
+    def test_load_ignores_stale_and_corrupt(self, store):
+        now = time.time()
+        store.save('fresh', {'s': np.arange(5.0)}, last_timestamp=now - 10)
+        store.save('stale', {'s': np.arange(5.0)}, last_timestamp=now - 7200)
+        store.path('corrupt').write_bytes(b'garbage')
+
+        assert len(store.load('fresh', max_age_seconds=3600).series['s']) == 5
+        assert store.load('stale', max_age_seconds=3600) is None
+        assert store.load('stale') is not None
+        assert store.load('corrupt') is None
+        assert store.load('missing') is None
+
+    async def test_warm_start_backfills_gap(self, store):
+        last_timestamp = time.time() - 900
+        store.save('task', {'spread': RingBuffer(10, values=np.arange(6.0))},
+                   last_timestamp=last_timestamp, interval_seconds=300)
+        requested = []
+
+        async def backfill(since):
+            requested.append(since)
+            return {'spread': np.array([6.0, 7.0, 8.0]), 'unknown': np.array([1.0])}
+
+        buffers = {'spread': RingBuffer(8)}
+        assert await store.warm_start('task', buffers, backfill=backfill, max_age_seconds=3600)
+        assert requested == [pytest.approx(last_timestamp)]
+        np.testing.assert_array_equal(buffers['spread'].values(), np.arange(1.0, 9.0))
+
+    async def test_warm_start_fallbacks(self, store):
+        buffers = {'spread': RingBuffer(8)}
+        assert not await store.warm_start('missing', buffers)
+
+        store.save('task', {'spread': np.arange(3.0)}, last_timestamp=time.time() - 900, interval_seconds=60)
+
+        async def failing_backfill(since):
+            raise ConnectionError("db unavailable")
+
+        assert await store.warm_start('task', buffers, backfill=failing_backfill)
+        np.testing.assert_array_equal(buffers['spread'].values(), np.arange(3.0))
+
+
+def test_rows_after():
+    index = pd.date_range('2024-01-01', periods=5, freq='5min')
+    df = pd.DataFrame({'x': range(5)}, index=index)
+    since = pd.Timestamp('2024-01-01 00:10', tz='UTC').timestamp()
+
+    assert list(rows_after(df, since)['x']) == [3, 4]
+    assert list(rows_after(df.tz_localize('UTC'), since)['x']) == [3, 4]
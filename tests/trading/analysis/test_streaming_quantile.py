@@ -0,0 +1,205 @@
+"""Unit tests for trading.analysis.streaming_quantile and its signal call sites.
+
+Test Coverage:
+- P2Quantile / TDigest accuracy vs np.quantile (rank error) on normal and random-walk data
+- Exact small-window behaviour, NaN skipping, factory and protocol conformance
+- WindowExtremes + calculate_arb_signals_streaming parity with calculate_arb_signals
+- Benchmark: per-tick streaming thresholds vs recomputing over the full history (performance)
+"""
+
+import math
+import time
+
+import numpy as np
+import pytest
+
+from trading.analysis.arbitrage_signals import calculate_arb_signals, calculate_arb_signals_streaming
+from trading.analysis.rolling_quantile import RollingQuantile
+from trading.analysis.streaming_quantile import (
+    P2Quantile, QuantileEstimator, TDigest, WindowExtremes, create_quantile_estimator
+)
+
+
+def _random_walk(n: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.cumsum(rng.normal(0, 0.05, n)) + rng.normal(0, 0.1, n)
+
+
+def _rank_error(data: np.ndarray, estimate: float, q: float) -> float:
+    """Distance between the estimate's rank in the data and the target quantile."""
+    return abs(np.mean(data <= estimate) - q)
+
+
+# =============================================================================
+# Accuracy vs exact quantiles
+# =============================================================================
+
+class TestAccuracy:
+    @pytest.mark.parametrize('q', [0.05, 0.25, 0.5, 0.9])
+    def test_p2_normal(self, q):
+        data = np.random.default_rng(1).normal(0, 1, 20000)
+        estimator = P2Quantile(q)
+        for value in data:
+            estimator.push(value)
+
+        assert _rank_error(data, estimator.quantile(), q) < 0.01
+        assert estimator.percentile(q * 100) == estimator.quantile(q)
+        with pytest.raises(ValueError):
+            estimator.quantile(0.99)
+
+    @pytest.mark.parametrize('data', [
+        np.random.default_rng(2).normal(0, 1, 20000),
+        np.random.default_rng(3).exponential(1.0, 20000),
+        _random_walk(20000, seed=4),
+    ], ids=['normal', 'exponential', 'random_walk'])
+    def test_tdigest(self, data):
+        digest = TDigest(compression=100)
+        for value in data:
+            digest.push(value)
+
+        assert len(digest) == len(data)
+        assert digest.centroid_count <= 100
+        for q in (0.01, 0.05, 0.25, 0.5, 0.75, 0.99):
+            assert _rank_error(data, digest.quantile(q), q) < 0.01, q
+        assert (digest.quantile(0.0), digest.quantile(1.0)) == (data.min(), data.max())
+        assert digest.cdf(np.quantile(data, 0.25)) == pytest.approx(0.25, abs=0.01)
+
+    def test_small_samples_exact(self):
+        values = [3.0, 1.0, 4.0, 1.5]
+        estimator = P2Quantile(0.25)
+        digest = TDigest()
+        for value in values:
+            estimator.push(value)
+            digest.push(value)
+
+        assert estimator.quantile() == np.quantile(values, 0.25)
+        assert digest.quantile(0.5) == np.quantile(values, 0.5)
+
+    def test_nan_skipped(self):
+        estimator = P2Quantile(0.5)
+        digest = TDigest()
+        for value in [1.0, math.nan, 2.0, 3.0]:
+            estimator.push(value)
+            digest.push(value)
+
+        assert (len(estimator), estimator.nan_count) == (3, 1)
+        assert (len(digest), digest.nan_count) == (3, 1)
+        assert estimator.quantile() == digest.quantile(0.5) == 2.0
+        assert math.isnan(P2Quantile(0.5).quantile()) and math.isnan(TDigest().quantile(0.5))
+
+
+# =============================================================================
+# Common interface
+# =============================================================================
+
+class TestFactory:
+    @pytest.mark.parametrize('kind', ['window', 'p2', 'tdigest'])
+    def test_protocol(self, kind):
+        estimator = create_quantile_estimator(kind, window=50, q=0.25)()
+        assert isinstance(estimator, QuantileEstimator)
+        for value in range(100):
+            estimator.push(float(value))
+        assert len(estimator) == (50 if kind == 'window' else 100)
+
+    def test_window_is_exact(self):
+        data = _random_walk(500, seed=5)
+        estimator = create_quantile_estimator('window', window=40)()
+        for i, value in enumerate(data):
+            estimator.push(value)
+            assert estimator.quantile(0.25) == np.quantile(data[max(0, i - 39):i + 1], 0.25)
+
+    def test_unknown_kind(self):
+        with pytest.raises(ValueError):
+            create_quantile_estimator('histogram')
+
+
+# =============================================================================
+# Arbitrage thresholds
+# =============================================================================
+
+class TestWindowExtremes:
+    @pytest.mark.parametrize('n', [9, 10, 57, 500])
+    def test_matches_calculate_arb_signals(self, n):
+        mexc = _random_walk(n, seed=6)
+        gateio = _random_walk(n, seed=7)
+        mexc_extremes = WindowExtremes(10)
+        gateio_extremes = WindowExtremes(10)
+        mexc_extremes.extend(mexc)
+        gateio_extremes.extend(gateio)
+
+        for current_mexc, current_gateio in [(mexc[-1], gateio[-1]), (mexc.min() - 0.01, 0.5), (0.01, -0.01)]:
+            expected = calculate_arb_signals(mexc, gateio, current_mexc, current_gateio)
+            actual = calculate_arb_signals_streaming(mexc_extremes, gateio_extremes, np.mean(mexc),
+                                                     np.mean(gateio), current_mexc, current_gateio)
+            assert actual.signal == expected.signal
+            if n >= 10:
+                assert actual.mexc_vs_gateio_futures.min_25pct == pytest.approx(expected.mexc_vs_gateio_futures.min_25pct)
+                assert actual.mexc_vs_gateio_futures.max_25pct == pytest.approx(expected.mexc_vs_gateio_futures.max_25pct)
+                assert actual.gateio_spot_vs_futures.min_25pct == pytest.approx(expected.gateio_spot_vs_futures.min_25pct)
+                assert actual.gateio_spot_vs_futures.max_25pct == pytest.approx(expected.gateio_spot_vs_futures.max_25pct)
+            else:
+                assert actual == expected
+
+    def test_bounded_window_and_tdigest(self):
+        data = _random_walk(3000, seed=8)
+        exact = WindowExtremes(10, estimator=create_quantile_estimator('window', window=99))
+        digest = WindowExtremes(10, estimator=create_quantile_estimator('tdigest'))
+        exact.extend(data)
+        digest.extend(data)
+
+        # 99 windows of 10 with step 5 cover the last 500 samples
+        windows = np.lib.stride_tricks.sliding_window_view(data[-500:], 10)[::5]
+        assert len(exact) == 99
+        assert exact.min_percentile(25) == np.percentile(windows.min(axis=1), 25)
+
+        all_windows = np.lib.stride_tricks.sliding_window_view(data, 10)[::5]
+        assert _rank_error(all_windows.max(axis=1), digest.max_percentile(25), 0.25) < 0.02
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+@pytest.mark.performance
+class TestBenchmark:
+    def test_streaming_faster_than_full_recompute(self):
+        history = _random_walk(2016, seed=9)
+        execution = _random_walk(2016, seed=10)
+        ticks = _random_walk(2000, seed=11)
+        mexc_extremes = WindowExtremes(10)
+        gateio_extremes = WindowExtremes(10)
+        mexc_extremes.extend(history)
+        gateio_extremes.extend(execution)
+        mexc_mean, gateio_mean = np.mean(history), np.mean(execution)
+
+        started = time.perf_counter()
+        streaming = [calculate_arb_signals_streaming(mexc_extremes, gateio_extremes, mexc_mean, gateio_mean,
+                                                     tick, tick).signal for tick in ticks]
+        streaming_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        expected = [calculate_arb_signals(history, execution, tick, tick).signal for tick in ticks]
+        full_seconds = time.perf_counter() - started
+
+        assert streaming == expected
+        assert streaming_seconds * 10 < full_seconds, (streaming_seconds, full_seconds)
+
+    def test_tdigest_push_is_amortized_constant(self):
+        data = _random_walk(200_000, seed=12)
+        digest = TDigest(compression=100)
+        exact = RollingQuantile()
+
+        started = time.perf_counter()
+        for value in data.tolist():
+            digest.push(value)
+        digest.quantile(0.25)
+        digest_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for value in data.tolist():
+            exact.push(value)
+        exact.quantile(0.25)
+        exact_seconds = time.perf_counter() - started
+
+        assert digest.centroid_count <= 100
+        assert digest_seconds < exact_seconds * 2, (digest_seconds, exact_seconds)
@@ -0,0 +1,354 @@
+"""Unit tests for trading.event_backtest.
+
+Test Coverage:
+- Queue position: joining, improving and deeper levels, queue consumption by
+  trades, partial fills, trade-through and book-crossing fills, taker side filter
+- Marketable limit orders taking the displayed size and resting the remainder
+- Latency: market data, request/response round trips and the private stream
+- Cancel/replace races (cancel losing against a fill, partial cancel)
+- Spot balance locking/settlement and futures position accounting
+- Driving PositionManager through the simulated DualExchange surface
+- Determinism with jitter, stream construction and throughput
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from exchanges.structs import AssetName, ExchangeEnum, Fees, OrderStatus, Side, Symbol, SymbolInfo
+from infrastructure.exceptions.exchange import InsufficientBalanceError
+from infrastructure.networking.websocket.structs import PrivateWebsocketChannelType, PublicWebsocketChannelType
+from trading.event_backtest import (
+    BookTickerStream, LatencyModel, OrderMatcher, TickBacktestEngine, TradeStream
+)
+
+SYMBOL = Symbol(base=AssetName('BTC'), quote=AssetName('USDT'))
+SYMBOLS_INFO = {SYMBOL: SymbolInfo(symbol=SYMBOL, base_precision=4, quote_precision=2,
+                                   min_base_quantity=0.001, min_quote_quantity=1.0)}
+T0 = 1_700_000_000_000
+
+
+def _book(rows):
+    """BookTickerStream from (ms offset, bid, bid_qty, ask, ask_qty) rows."""
+    rows = np.array(rows, dtype=float)
+    return BookTickerStream(SYMBOL, T0 + rows[:, 0].astype(np.int64), rows[:, 1], rows[:, 2], rows[:, 3], rows[:, 4])
+
+
+def _trades(rows):
+    """TradeStream from (ms offset, price, qty, taker side) rows."""
+    rows = np.array(rows, dtype=float)
+    return TradeStream(SYMBOL, T0 + rows[:, 0].astype(np.int64), rows[:, 1], rows[:, 2], rows[:, 3])
+
+
+def _engine(book_rows, trade_rows=(), latency=None, balances=None, fees=None, is_futures=False):
+    engine = TickBacktestEngine()
+    exchange = engine.add_exchange(ExchangeEnum.MEXC, SYMBOLS_INFO, fees=fees or Fees(0.0, 0.0),
+                                   balances=balances if balances is not None else {'USDT': 100_000, 'BTC': 100},
+                                   latency=latency, is_futures=is_futures)
+    engine.add_book_tickers(ExchangeEnum.MEXC, _book(book_rows))
+    if len(trade_rows):
+        engine.add_trades(ExchangeEnum.MEXC, _trades(trade_rows))
+    return engine, exchange
+
+
+# =============================================================================
+# Matching
+# =============================================================================
+
+class TestOrderMatcher:
+    def _matcher(self):
+        matcher = OrderMatcher(price_tolerance=0.005)
+        matcher.update_book(0, 100.0, 5.0, 100.1, 4.0)
+        return matcher
+
+    def test_queue_ahead_consumed_before_partial_fill(self):
+        matcher = self._matcher()
+        matcher.add_limit('a', Side.BUY, 100.0, 2.0)
+
+        assert matcher.match_trade(100.0, 3.0, Side.SELL) == []
+        assert matcher.resting['a'].queue_ahead == pytest.approx(2.0)
+        assert matcher.match_trade(100.0, 3.0, Side.SELL) == [('a', 100.0, pytest.approx(1.0))]
+        assert matcher.match_trade(100.0, 5.0, Side.SELL) == [('a', 100.0, pytest.approx(1.0))]
+        assert 'a' not in matcher.resting
+
+    def test_buyer_initiated_trades_do_not_touch_bids(self):
+        matcher = self._matcher()
+        matcher.add_limit('a', Side.BUY, 100.0, 2.0)
+
+        assert matcher.match_trade(100.0, 50.0, Side.BUY) == []
+        assert matcher.resting['a'].queue_ahead == pytest.approx(5.0)
+
+    def test_improving_price_is_first_in_queue(self):
+        matcher = self._matcher()
+        matcher.add_limit('a', Side.SELL, 100.05, 1.0)
+
+        assert matcher.resting['a'].queue_ahead == 0.0
+        assert matcher.match_trade(100.05, 0.4, 0) == [('a', 100.05, pytest.approx(0.4))]
+
+    def test_deeper_order_waits_until_its_level_is_best(self):
+        matcher = self._matcher()
+        matcher.add_limit('a', Side.BUY, 99.9, 1.0)
+        assert matcher.resting['a'].queue_ahead == np.inf
+
+        matcher.update_book(1, 99.9, 3.0, 100.0, 1.0)
+        assert matcher.resting['a'].queue_ahead == 3.0
+        # Size shrinking without trades shortens the queue
+        matcher.update_book(2, 99.9, 1.5, 100.0, 1.0)
+        assert matcher.resting['a'].queue_ahead == 1.5
+
+    def test_trade_through_and_crossed_book_fill_everything(self):
+        matcher = self._matcher()
+        matcher.add_limit('a', Side.BUY, 100.0, 2.0)
+        matcher.add_limit('b', Side.SELL, 100.1, 1.0)
+
+        assert matcher.match_trade(99.9, 0.01, Side.SELL) == [('a', 100.0, 2.0)]
+        assert matcher.update_book(3, 100.2, 1.0, 100.3, 1.0) == [('b', 100.1, 1.0)]
+        assert matcher.resting == {}
+
+    def test_marketable_limit_takes_displayed_size(self):
+        matcher = self._matcher()
+
+        taken = matcher.add_limit('a', Side.BUY, 100.2, 6.0)
+
+        assert taken == (100.1, 4.0)
+        assert matcher.resting['a'].remaining == pytest.approx(2.0)
+        assert matcher.resting['a'].queue_ahead == 0.0
+
+
+# =============================================================================
+# Engine
+# =============================================================================
+
+class TestTickBacktestEngine:
+    def test_latency_of_market_data_and_requests(self):
+        engine, exchange = _engine([(0, 100.0, 1.0, 100.1, 1.0), (100, 100.0, 1.0, 100.1, 1.0)],
+                                   latency=LatencyModel(market_data_ms=7, request_ms=20, response_ms=30))
+        seen = {}
+
+        async def strategy(engine):
+            await asyncio.sleep(0.001)
+            seen['book'] = SYMBOL in exchange.public.book_ticker
+            await asyncio.sleep(0.007)
+            seen['book_later'] = exchange.public.book_ticker[SYMBOL].timestamp
+            sent = engine.now_ms
+            order = await exchange.private.place_limit_order(SYMBOL, Side.BUY, 0.5, 99.0)
+            seen['round_trip'] = engine.now_ms - sent
+            seen['placed_at'] = order.timestamp - sent
+
+        engine.run(strategy)
+
+        assert seen == {'book': False, 'book_later': T0, 'round_trip': 50.0, 'placed_at': 20.0}
+
+    def test_cancel_loses_race_against_fill(self):
+        # The order rests at 100.0; a seller sweeps the level while the cancel is in flight
+        engine, exchange = _engine(
+            [(0, 100.0, 1.0, 100.1, 1.0), (200, 100.0, 1.0, 100.1, 1.0)],
+            trade_rows=[(60, 99.9, 5.0, Side.SELL)],
+            latency=LatencyModel(request_ms=20, response_ms=20, private_stream_ms=50))
+        result = {}
+
+        async def strategy(engine):
+            order = await exchange.private.place_limit_order(SYMBOL, Side.BUY, 1.0, 100.0)
+            canceled = await exchange.private.cancel_order(SYMBOL, order.order_id)
+            result['status'] = canceled.status
+            result['filled'] = canceled.filled_quantity
+
+        engine.run(strategy)
+
+        assert result == {'status': OrderStatus.FILLED, 'filled': 1.0}
+        assert engine.stats.cancels_lost == 1
+        assert engine.stats.orders_canceled == 0
+
+    def test_partial_fill_then_cancel_releases_the_rest(self):
+        engine, exchange = _engine([(0, 100.0, 0.0, 100.1, 1.0), (500, 100.0, 0.0, 100.1, 1.0)],
+                                   trade_rows=[(50, 100.0, 0.4, Side.SELL)],
+                                   balances={'USDT': 1000})
+        result = {}
+
+        async def strategy(engine):
+            order = await exchange.private.place_limit_order(SYMBOL, Side.BUY, 1.0, 100.0)
+            await asyncio.sleep(0.1)
+            result['order'] = await exchange.private.cancel_order(SYMBOL, order.order_id)
+
+        engine.run(strategy)
+
+        order = result['order']
+        assert order.status == OrderStatus.PARTIALLY_CANCELED
+        assert order.filled_quantity == pytest.approx(0.4)
+        balances = engine.simulator(ExchangeEnum.MEXC).balances
+        assert balances['USDT'].available == pytest.approx(960.0)
+        assert balances['USDT'].locked == pytest.approx(0.0)
+        assert balances['BTC'].available == pytest.approx(0.4)
+
+    def test_private_stream_is_delayed_and_not_overwritten_by_stale_reply(self):
+        engine, exchange = _engine([(0, 100.0, 0.0, 100.1, 1.0), (300, 100.0, 0.0, 100.1, 1.0)],
+                                   trade_rows=[(40, 100.0, 1.0, Side.SELL)],
+                                   latency=LatencyModel(request_ms=10, response_ms=100, private_stream_ms=15))
+        result = {}
+
+        async def strategy(engine):
+            order = await exchange.private.place_limit_order(SYMBOL, Side.BUY, 1.0, 100.0)
+            # Reply was taken at 10ms (NEW); the fill at 40ms arrived on the stream at 55ms
+            result['reply'] = order.status
+            result['cached'] = exchange.private.get_order(order.order_id).status
+
+        engine.run(strategy)
+
+        assert result == {'reply': OrderStatus.NEW, 'cached': OrderStatus.FILLED}
+
+    def test_insufficient_balance(self):
+        engine, exchange = _engine([(0, 100.0, 1.0, 100.1, 1.0)], balances={'USDT': 50})
+
+        async def strategy(engine):
+            await exchange.private.place_limit_order(SYMBOL, Side.BUY, 1.0, 100.0)
+
+        with pytest.raises(InsufficientBalanceError):
+            engine.run(strategy)
+
+    def test_futures_position_accounting(self):
+        engine, exchange = _engine([(0, 100.0, 10.0, 100.1, 10.0), (100, 101.0, 10.0, 101.1, 10.0),
+                                    (500, 101.0, 10.0, 101.1, 10.0)],
+                                   balances={'USDT': 1000}, fees=Fees(0.0, 0.001), is_futures=True)
+        result = {}
+
+        async def strategy(engine):
+            await exchange.private.place_market_order(SYMBOL, Side.BUY, 2.0)
+            result['open'] = await exchange.private.get_position(SYMBOL)
+            await asyncio.sleep(0.2)
+            await exchange.private.place_market_order(SYMBOL, Side.SELL, 2.0)
+            result['closed'] = await exchange.private.get_position(SYMBOL)
+
+        engine.run(strategy)
+
+        assert result['open'].side == Side.BUY
+        assert result['open'].qty_base == pytest.approx(2.0)
+        assert result['open'].entry_price == pytest.approx(100.1)
+        assert result['closed'] is None
+        # Realized (101.0 - 100.1) * 2 minus taker fees on both legs
+        expected = 1000 + 1.8 - 0.001 * (100.1 * 2 + 101.0 * 2)
+        assert engine.simulator(ExchangeEnum.MEXC).balances['USDT'].available == pytest.approx(expected)
+
+    def test_handlers_receive_book_tickers_and_order_updates(self):
+        engine, exchange = _engine([(0, 100.0, 1.0, 100.1, 1.0), (10, 100.0, 1.0, 100.2, 1.0),
+                                    (20, 99.0, 1.0, 99.9, 1.0)],
+                                   latency=LatencyModel(market_data_ms=1, private_stream_ms=1))
+        books, orders = [], []
+
+        async def on_book(ticker):
+            books.append(ticker.ask_price)
+
+        async def on_order(order):
+            orders.append(order.status)
+
+        async def strategy(engine):
+            exchange.adapter_public.bind(PublicWebsocketChannelType.BOOK_TICKER, on_book)
+            exchange.adapter_private.bind(PrivateWebsocketChannelType.ORDER, on_order)
+            await exchange.private.place_limit_order(SYMBOL, Side.BUY, 1.0, 99.95)
+
+        engine.run(strategy)
+
+        assert books == [100.1, 100.2, 99.9]
+        assert orders == [OrderStatus.NEW, OrderStatus.FILLED]
+
+    def test_deterministic_with_jitter(self):
+        def run_once():
+            rng = np.random.default_rng(1)
+            n = 3000
+            mid = np.round(100 + np.cumsum(rng.normal(0, 0.02, n)), 2)
+            offsets = np.cumsum(rng.integers(1, 20, n))
+            rows = np.column_stack([offsets, mid - 0.01, rng.uniform(1, 3, n), mid + 0.01, rng.uniform(1, 3, n)])
+            trades = np.column_stack([offsets + 1, mid, rng.uniform(0.5, 3, n), rng.integers(1, 3, n)])
+            engine, exchange = _engine(rows, trades, latency=LatencyModel(2, 10, 10, 5, jitter_ms=8, seed=3))
+
+            async def strategy(engine):
+                while True:
+                    book = exchange.public.book_ticker.get(SYMBOL)
+                    if book:
+                        order = await exchange.private.place_limit_order(SYMBOL, Side.BUY, 0.5, book.bid_price)
+                        await asyncio.sleep(0.05)
+                        await exchange.private.cancel_order(SYMBOL, order.order_id)
+                    await asyncio.sleep(0.01)
+
+            engine.run(strategy)
+            return [(f.timestamp, f.order_id, f.price, f.qty) for f in engine.simulator(ExchangeEnum.MEXC).fills]
+
+        first = run_once()
+        assert first
+        assert first == run_once()
+
+
+class TestPositionManagerIntegration:
+    def test_trailing_limit_order_builds_position(self):
+        from infrastructure.logging import get_logger
+        from trading.strategies.implementations.base_strategy.position_data import PositionData
+        from trading.strategies.implementations.base_strategy.position_manager import PositionManager
+
+        rng = np.random.default_rng(0)
+        n = 4000
+        offsets = np.cumsum(rng.integers(5, 40, n))
+        mid = np.round(100 + np.cumsum(rng.normal(0, 0.02, n)), 2)
+        rows = np.column_stack([offsets, mid - 0.01, rng.uniform(1, 5, n), mid + 0.01, rng.uniform(1, 5, n)])
+        trades = np.column_stack([offsets + 2, mid - 0.01, rng.uniform(0.5, 4, n), np.full(n, int(Side.SELL))])
+        engine, exchange = _engine(rows, trades, latency=LatencyModel(5, 20, 20, 10),
+                                   balances={'USDT': 10_000})
+        managers = []
+
+        async def strategy(engine):
+            await asyncio.sleep(0.1)
+            manager = PositionManager(PositionData(symbol=SYMBOL, exchange=ExchangeEnum.MEXC, side=Side.BUY),
+                                      exchange, get_logger('test_event_backtest'))
+            managers.append(manager)
+            assert await manager.initialize(target_qty=2.0)
+            while manager.position.qty < 2.0:
+                await manager.place_trailing_limit_order(Side.BUY, 0.5, trail_pct=0.05)
+                await asyncio.sleep(0.25)
+            await manager.cancel_order()
+
+        engine.run(strategy)
+
+        simulator = engine.simulator(ExchangeEnum.MEXC)
+        filled = sum(fill.qty for fill in simulator.fills)
+        assert filled >= 2.0
+        assert managers[0].position.qty == pytest.approx(filled)
+        assert simulator.balances['BTC'].available == pytest.approx(filled)
+
+
+class TestStreams:
+    def test_from_frames(self):
+        index = pd.date_range('2025-01-01', periods=3, freq='1s', tz='UTC')
+        book = BookTickerStream.from_frame(SYMBOL, pd.DataFrame(
+            {'bid_price': [1.0, 2.0, 3.0], 'bid_qty': 1.0, 'ask_price': [1.1, 2.1, 3.1], 'ask_qty': 2.0}, index=index))
+        trades = TradeStream.from_frame(SYMBOL, pd.DataFrame(
+            {'timestamp': index, 'price': [1.0, 2.0, 3.0], 'quantity': 0.5, 'side': ['buy', 'sell', 'buy']}))
+
+        expected_ms = (index.asi8 // 1_000_000).tolist()
+        assert book.timestamps.tolist() == expected_ms
+        assert trades.timestamps.tolist() == expected_ms
+        assert trades.side.tolist() == [int(Side.BUY), int(Side.SELL), int(Side.BUY)]
+
+    def test_unsorted_stream_rejected(self):
+        with pytest.raises(ValueError):
+            _book([(10, 1, 1, 2, 1), (5, 1, 1, 2, 1)])
+
+
+class TestThroughput:
+    def test_millions_of_events_per_minute(self):
+        n = 100_000
+        rng = np.random.default_rng(0)
+        mid = np.round(100 + np.cumsum(rng.normal(0, 0.02, n)), 2)
+        offsets = np.arange(n) * 10
+        rows = np.column_stack([offsets, mid - 0.01, rng.uniform(1, 3, n), mid + 0.01, rng.uniform(1, 3, n)])
+        trades = np.column_stack([offsets + 5, mid, rng.uniform(0.5, 3, n), rng.integers(1, 3, n)])
+        engine, exchange = _engine(rows, trades, latency=LatencyModel(market_data_ms=3))
+
+        async def strategy(engine):
+            # Two resting orders stay in the book for the whole run
+            await exchange.private.place_limit_order(SYMBOL, Side.BUY, 1.0, 50.0)
+            await exchange.private.place_limit_order(SYMBOL, Side.SELL, 1.0, 150.0)
+
+        stats = engine.run(strategy)
+
+        assert stats.market_events == 2 * n
+        assert stats.events_per_minute > 1_000_000
@@ -0,0 +1,304 @@
+"""Unit tests for the vectorized hedged cross-arbitrage simulation.
+
+Test Coverage:
+- simulate_hedged_positions against a per-row multi-position state machine
+  (transfer delay, position limit, exit/expiry order, both routes)
+- HedgedCrossArbitrageBacktest against the iterrows loop it replaced
+  (signals_v2, directions, actions, active positions, cumulative P&L, positions)
+- ArbitrageAnalyzer.add_reverse_delta_neutral_backtest against its row loop
+  (NaN rows, stop loss, max holding time)
+- Speed of the backtest on a month of 1m data (performance)
+"""
+
+import time
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading.analysis.arbitrage_signals import Signal, calculate_arb_signals
+from trading.research.cross_arbitrage.arbitrage_analyzer import AnalyzerKeys, ArbitrageAnalyzer
+from trading.research.cross_arbitrage.hedged_cross_arbitrage_backtest import (
+    BacktestConfig, HedgedCrossArbitrageBacktest, PositionStatus
+)
+from trading.research.cross_arbitrage.hedged_simulation import (
+    EXIT_EXPIRED, EXIT_OPEN, EXIT_SIGNAL, ROUTE_A_TO_B, ROUTE_B_TO_A, simulate_hedged_positions
+)
+
+
+def _market(n_rows, seed=0, freq='5min'):
+    """Three-venue book tickers with a mean-reverting MEXC/futures basis."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=n_rows, freq=freq)
+    mid = 1.0 * np.exp(np.cumsum(rng.normal(0, 0.002, n_rows)))
+    basis = np.zeros(n_rows)
+    for i in range(1, n_rows):
+        basis[i] = 0.7 * basis[i - 1] + rng.normal(0, 0.002)
+    futures = mid * (1 + 0.01 + basis)
+    gateio = mid * (1 + rng.normal(0, 0.0015, n_rows))
+    half = 0.0002
+    df = pd.DataFrame({
+        AnalyzerKeys.mexc_bid: mid * (1 - half), AnalyzerKeys.mexc_ask: mid * (1 + half),
+        AnalyzerKeys.gateio_spot_bid: gateio * (1 - half), AnalyzerKeys.gateio_spot_ask: gateio * (1 + half),
+        AnalyzerKeys.gateio_futures_bid: futures * (1 - half), AnalyzerKeys.gateio_futures_ask: futures * (1 + half),
+    }, index=index)
+    df[AnalyzerKeys.mexc_vs_gateio_futures_arb] = (
+        (df[AnalyzerKeys.gateio_futures_bid] - df[AnalyzerKeys.mexc_ask]) / df[AnalyzerKeys.gateio_futures_bid] * 100)
+    df[AnalyzerKeys.gateio_spot_vs_futures_arb] = (
+        (df[AnalyzerKeys.gateio_futures_bid] - df[AnalyzerKeys.gateio_spot_ask]) / df[AnalyzerKeys.gateio_futures_bid] * 100)
+    return df
+
+
+# =============================================================================
+# Row-loop references (previous implementations)
+# =============================================================================
+
+def reference_kernel(times, entry_routes, exits, transfer, max_hold, max_concurrent):
+    """Per-row state machine of the hedged backtest: [(route, entry, ready, exit, reason)]."""
+    trades, open_ = [], []
+    for i, now in enumerate(times):
+        for trade in open_:
+            if trade['ready'] is None and now - times[trade['entry']] >= transfer:
+                trade['ready'] = i
+        if entry_routes[i] != 0 and len(open_) < max_concurrent:
+            trade = {'route': entry_routes[i], 'entry': i, 'ready': None, 'exit': -1, 'reason': EXIT_OPEN}
+            trades.append(trade)
+            open_.append(trade)
+        elif exits[i]:
+            for trade in [t for t in open_ if t['ready'] is not None]:
+                trade['exit'], trade['reason'] = i, EXIT_SIGNAL
+                open_.remove(trade)
+        for trade in [t for t in open_ if now - times[t['entry']] > max_hold]:
+            trade['exit'], trade['reason'] = i, EXIT_EXPIRED
+            open_.remove(trade)
+    return [(t['route'], t['entry'], t['exit'], t['reason']) for t in trades]
+
+
+def reference_hedged_backtest(df, config):
+    """HedgedCrossArbitrageBacktest._simulate_trading before vectorization."""
+    mexc_hist, gateio_hist = np.array([]), np.array([])
+    positions, open_ = [], []
+    cumulative = 0.0
+    rows = {'signal': [], 'direction': [], 'position_action': [], 'active_positions': [], 'cumulative_pnl': []}
+    for now, row in df.iterrows():
+        mexc_hist = np.append(mexc_hist, row[AnalyzerKeys.mexc_vs_gateio_futures_arb])[-500:]
+        gateio_hist = np.append(gateio_hist, row[AnalyzerKeys.gateio_spot_vs_futures_arb])[-500:]
+        for p in open_:
+            if p['status'] == 'WAIT' and (now - p['entry_time']).total_seconds() / 60 >= config.min_transfer_time_minutes:
+                p['status'] = 'READY'
+
+        signal, direction = Signal.HOLD, None
+        mexc = row[AnalyzerKeys.mexc_vs_gateio_futures_arb]
+        if len(mexc_hist) >= 50:
+            signal = calculate_arb_signals(mexc_hist, gateio_hist, mexc, row[AnalyzerKeys.gateio_spot_vs_futures_arb]).signal
+            if signal == Signal.ENTER:
+                if abs(mexc) > abs(-mexc) and mexc < 0:
+                    direction = 'MEXC_TO_GATEIO'
+                elif abs(-mexc) > abs(mexc) and -mexc > 0:
+                    direction = 'GATEIO_TO_MEXC'
+                else:
+                    direction = 'MEXC_TO_GATEIO' if mexc < 0 else 'GATEIO_TO_MEXC'
+
+        def close(p):
+            m2g = p['direction'] == 'MEXC_TO_GATEIO'
+            dest = row[AnalyzerKeys.gateio_spot_bid] if m2g else row[AnalyzerKeys.mexc_bid]
+            fut = row[AnalyzerKeys.gateio_futures_ask]
+            spot_usd = ((dest - p['src']) / p['src']) * config.position_size_usd
+            fut_usd = ((p['hedge'] - fut) / p['hedge']) * config.position_size_usd
+            p['pnl'] = (spot_usd + fut_usd) - (config.fees_bps / 10000) * config.position_size_usd
+            p['exit_time'], p['dest'], p['fut_exit'] = now, dest, fut
+            p['holding'] = int((now - p['entry_time']).total_seconds() / 60)
+            open_.remove(p)
+
+        action = None
+        if signal == Signal.ENTER and direction and len(open_) < config.max_concurrent_positions:
+            src = row[AnalyzerKeys.mexc_ask] if direction == 'MEXC_TO_GATEIO' else row[AnalyzerKeys.gateio_spot_ask]
+            p = {'entry_time': now, 'direction': direction, 'src': src, 'hedge': row[AnalyzerKeys.gateio_futures_bid],
+                 'status': 'WAIT', 'pnl': None, 'exit_time': None}
+            positions.append(p)
+            open_.append(p)
+            action = f"OPEN_{direction}_{len(positions)}"
+        elif signal == Signal.EXIT:
+            ready = [p for p in open_ if p['status'] == 'READY']
+            for p in ready:
+                close(p)
+            action = f"CLOSE_{len(ready)}_POSITIONS" if ready else None
+        for p in [p for p in open_ if (now - p['entry_time']) > timedelta(hours=config.max_position_duration_hours)]:
+            close(p)
+
+        cumulative += sum(p['pnl'] for p in positions if p['pnl'] is not None and p['exit_time'] == now)
+        rows['signal'].append(signal.value)
+        rows['direction'].append(direction or 'NONE')
+        rows['position_action'].append(action)
+        rows['active_positions'].append(len(open_))
+        rows['cumulative_pnl'].append(cumulative)
+    return pd.DataFrame(rows, index=df.index), positions
+
+
+def reference_reverse_delta_neutral(df, entry=-2.5, exit_=-0.3, stop=-6.0, max_hours=24, fees=0.0067):
+    """ArbitrageAnalyzer.add_reverse_delta_neutral_backtest row loop before vectorization."""
+    spread = (df[AnalyzerKeys.mexc_vs_gateio_futures_arb] + df[AnalyzerKeys.gateio_spot_vs_futures_arb]) / 2
+    vol = spread.rolling(window=20).std()
+    out = {name: [] for name in ('rdn_signal', 'rdn_position_open', 'rdn_entry_spread', 'rdn_spot_entry',
+                                 'rdn_trade_pnl', 'rdn_cumulative_pnl', 'rdn_holding_hours')}
+    open_, entry_time, entry_spread, spot_entry, fut_entry, cumulative = False, None, np.nan, 0.0, 0.0, 0.0
+    for i, now in enumerate(df.index):
+        s = spread.iloc[i]
+        values = {'rdn_signal': 'HOLD', 'rdn_position_open': False, 'rdn_entry_spread': np.nan,
+                  'rdn_spot_entry': np.nan, 'rdn_trade_pnl': 0.0, 'rdn_cumulative_pnl': 0.0, 'rdn_holding_hours': 0.0}
+        if not pd.isna(s):
+            if not open_:
+                if s < entry and not pd.isna(vol.iloc[i]) and vol.iloc[i] > 0.1:
+                    open_, entry_time, entry_spread = True, now, s
+                    spot_entry = df[AnalyzerKeys.mexc_ask].iloc[i]
+                    fut_entry = df[AnalyzerKeys.gateio_futures_bid].iloc[i]
+                    values.update(rdn_signal='ENTER', rdn_position_open=True, rdn_entry_spread=s, rdn_spot_entry=spot_entry)
+            else:
+                held = (now - entry_time).total_seconds() / 3600
+                values['rdn_holding_hours'] = held
+                reason = ('SPREAD_COMPRESSION' if s > exit_ else 'STOP_LOSS' if s < stop
+                          else 'MAX_TIME' if held > max_hours else None)
+                if reason:
+                    spot_exit = df[AnalyzerKeys.mexc_bid].iloc[i]
+                    fut_exit = df[AnalyzerKeys.gateio_futures_ask].iloc[i]
+                    gross = ((spot_exit - spot_entry) / spot_entry + (fut_entry - fut_exit) / fut_entry) * 100
+                    values.update(rdn_signal=f'EXIT_{reason}', rdn_trade_pnl=gross - fees * 100)
+                    cumulative += gross - fees * 100
+                    open_ = False
+                else:
+                    values.update(rdn_position_open=True, rdn_entry_spread=entry_spread, rdn_spot_entry=spot_entry)
+            values['rdn_cumulative_pnl'] = cumulative
+        for name, value in values.items():
+            out[name].append(value)
+    return pd.DataFrame(out, index=df.index)
+
+
+# =============================================================================
+# Kernel
+# =============================================================================
+
+class TestSimulateHedgedPositions:
+    @pytest.mark.parametrize('seed', range(6))
+    def test_matches_row_state_machine(self, seed):
+        rng = np.random.default_rng(seed)
+        n = 3000
+        # Irregular timestamps with duplicates, sparse signals
+        steps = rng.choice([0, 60, 300, 600], size=n, p=[0.05, 0.45, 0.4, 0.1])
+        times = pd.DatetimeIndex(pd.Timestamp('2024-01-01') + pd.to_timedelta(np.cumsum(steps), unit='s'))
+        routes = np.where(rng.random(n) < 0.03, rng.choice([ROUTE_A_TO_B, ROUTE_B_TO_A], n), 0)
+        exits = rng.random(n) < 0.01
+        transfer = pd.Timedelta(minutes=int(rng.choice([0, 10, 45])))
+        max_hold = pd.Timedelta(hours=float(rng.choice([1, 2, 4])))
+        max_concurrent = int(rng.integers(1, 5))
+        prices = [rng.uniform(0.9, 1.1, n) for _ in range(6)]
+
+        trades = simulate_hedged_positions(times, *prices, entry_routes=routes, exits=exits,
+                                           transfer_time=transfer, max_hold=max_hold, max_concurrent=max_concurrent)
+        expected = reference_kernel(list(times), routes, exits, transfer, max_hold, max_concurrent)
+
+        assert list(zip(trades.routes.tolist(), trades.entry_rows.tolist(), trades.exit_rows.tolist(),
+                        trades.exit_reasons.tolist())) == expected
+        assert {EXIT_SIGNAL, EXIT_EXPIRED} <= set(trades.exit_reasons.tolist())
+
+    def test_prices_and_equity(self):
+        times = pd.date_range('2024-01-01', periods=6, freq='10min')
+        a_bid, a_ask = np.arange(6) + 100.0, np.arange(6) + 101.0
+        b_bid, b_ask = np.arange(6) + 200.0, np.arange(6) + 201.0
+        f_bid, f_ask = np.arange(6) + 300.0, np.arange(6) + 301.0
+        routes = np.array([ROUTE_A_TO_B, ROUTE_B_TO_A, 0, 0, 0, ROUTE_A_TO_B])
+        exits = np.array([False, False, False, True, False, False])
+
+        trades = simulate_hedged_positions(times, a_bid, a_ask, b_bid, b_ask, f_bid, f_ask, routes, exits,
+                                           transfer_time=pd.Timedelta(minutes=20), max_hold=pd.Timedelta(hours=1),
+                                           max_concurrent=2)
+
+        assert trades.entry_rows.tolist() == [0, 1, 5]
+        assert trades.ready_rows.tolist() == [2, 3, 6]
+        assert trades.exit_rows.tolist() == [3, 3, -1]
+        assert trades.source_spot_entry.tolist() == [101.0, 202.0, 106.0]
+        assert trades.dest_spot_exit[:2].tolist() == [203.0, 103.0] and np.isnan(trades.dest_spot_exit[2])
+        assert trades.hedge_futures_exit[:2].tolist() == [304.0, 304.0]
+        assert trades.active_positions().tolist() == [1, 2, 2, 0, 0, 1]
+        assert trades.realized_pnl(np.array([1.0, 2.0, np.nan])).tolist() == [0, 0, 0, 3.0, 3.0, 3.0]
+
+    def test_length_mismatch(self):
+        times = pd.date_range('2024-01-01', periods=3, freq='1min')
+        with pytest.raises(ValueError):
+            simulate_hedged_positions(times, *([np.ones(3)] * 6), np.zeros(2), np.zeros(3, dtype=bool),
+                                      pd.Timedelta(0), pd.Timedelta(hours=1), 1)
+
+
+# =============================================================================
+# Backtests
+# =============================================================================
+
+class TestHedgedBacktestParity:
+    @pytest.mark.parametrize('seed, transfer, concurrent', [(1, 10, 3), (2, 30, 1), (3, 0, 5)])
+    def test_matches_iterrows_loop(self, tmp_path, seed, transfer, concurrent):
+        df = _market(1500, seed=seed)
+        config = BacktestConfig(min_transfer_time_minutes=transfer, max_position_duration_hours=2,
+                                max_concurrent_positions=concurrent)
+        expected_df, expected_positions = reference_hedged_backtest(df.copy(), config)
+
+        backtest = HedgedCrossArbitrageBacktest(config=config, cache_dir=str(tmp_path))
+        result = backtest._simulate_trading(df.copy())
+
+        for column in ('signal', 'direction', 'position_action', 'active_positions'):
+            assert result[column].tolist() == expected_df[column].tolist(), column
+        np.testing.assert_array_equal(result['cumulative_pnl'].to_numpy(), expected_df['cumulative_pnl'].to_numpy())
+
+        assert len(backtest.positions) == len(expected_positions) > 5
+        for position, expected in zip(backtest.positions, expected_positions):
+            assert (position.entry_time, position.direction, position.exit_time) == (
+                expected['entry_time'], expected['direction'], expected['exit_time'])
+            assert position.pnl == expected['pnl']
+            if expected['pnl'] is not None:
+                assert position.holding_period_minutes == expected['holding']
+                assert position.status == PositionStatus.CLOSED
+        assert len(backtest.open_positions) == sum(p['pnl'] is None for p in expected_positions)
+        assert backtest._calculate_performance_metrics().total_trades == sum(
+            p['pnl'] is not None for p in expected_positions)
+
+    @pytest.mark.performance
+    def test_month_of_minute_data(self, tmp_path):
+        df = _market(43_200, seed=4, freq='1min')
+        backtest = HedgedCrossArbitrageBacktest(cache_dir=str(tmp_path))
+
+        started = time.perf_counter()
+        result = backtest._simulate_trading(df)
+        elapsed = time.perf_counter() - started
+
+        assert result['active_positions'].max() <= backtest.config.max_concurrent_positions
+        assert len(backtest.positions) > 0
+        assert elapsed < 10.0
+
+
+class TestReverseDeltaNeutralParity:
+    def _frame(self, seed):
+        rng = np.random.default_rng(seed)
+        n = 2000
+        df = _market(n, seed=seed)
+        # Regime-switching combined spread: deep dips, recoveries and crashes
+        level = np.repeat(rng.choice([-4.0, -1.5, 0.0, -7.0], n // 40, p=[0.4, 0.25, 0.25, 0.1]), 40)
+        df[AnalyzerKeys.mexc_vs_gateio_futures_arb] = level + rng.normal(0, 0.3, n)
+        df[AnalyzerKeys.gateio_spot_vs_futures_arb] = level + rng.normal(0, 0.3, n)
+        df.iloc[rng.choice(n, 60, replace=False), df.columns.get_loc(AnalyzerKeys.gateio_spot_vs_futures_arb)] = np.nan
+        return df
+
+    @pytest.mark.parametrize('seed, max_hours', [(0, 24), (1, 1), (2, 3)])
+    def test_matches_row_loop(self, seed, max_hours):
+        df = self._frame(seed)
+        expected = reference_reverse_delta_neutral(df, max_hours=max_hours)
+
+        result = ArbitrageAnalyzer().add_reverse_delta_neutral_backtest(df.copy(), max_holding_hours=max_hours)
+
+        assert result['rdn_signal'].tolist() == expected['rdn_signal'].tolist()
+        assert result['rdn_position_open'].tolist() == expected['rdn_position_open'].tolist()
+        for column in ('rdn_entry_spread', 'rdn_spot_entry', 'rdn_trade_pnl', 'rdn_cumulative_pnl'):
+            np.testing.assert_array_equal(result[column].to_numpy(dtype=float), expected[column].to_numpy(), column)
+        np.testing.assert_allclose(result['rdn_holding_hours'], expected['rdn_holding_hours'], rtol=1e-12)
+        exits = set(expected['rdn_signal']) - {'HOLD', 'ENTER'}
+        assert 'EXIT_SPREAD_COMPRESSION' in exits and 'EXIT_STOP_LOSS' in exits
+        if max_hours == 1:
+            assert 'EXIT_MAX_TIME' in exits
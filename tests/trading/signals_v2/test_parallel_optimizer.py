@@ -0,0 +1,138 @@
+"""Unit tests for trading.signals_v2.optimization parallel parameter search.
+
+Test Coverage:
+- SharedFrame publish/attach round trip without copying, read-only columns
+- Unsupported column dtypes are rejected
+- Parallel evaluation matches serial evaluation, in input order
+- Per-parameter-set errors are captured, not raised
+- Serial fallback when the process pool is unavailable
+- Serial fallback when the frame has columns that cannot be shared
+"""
+
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading.signals_v2.entities import PerformanceMetrics
+from trading.signals_v2.optimization import (
+    ParallelParameterOptimizer, SharedFrame, StrategyEvaluator, UnsupportedFrameError, attach_shared_frame,
+    parameter_grid
+)
+from trading.signals_v2.strategy_signal import StrategySignal
+
+
+class ThresholdSignal(StrategySignal):
+    """Toy strategy: P&L is the mean excess of a column over a threshold."""
+
+    def __init__(self, threshold: float, scale: float = 1.0, column: str = 'spread'):
+        self.threshold = threshold
+        self.scale = scale
+        self.column = column
+
+    def backtest(self, df: pd.DataFrame) -> PerformanceMetrics:
+        if self.threshold < 0:
+            raise ValueError("negative threshold")
+        excess = df[self.column].to_numpy() - self.threshold
+        return PerformanceMetrics(total_pnl_pct=float(excess.mean() * self.scale),
+                                  win_rate=float((excess > 0).mean() * 100))
+
+
+def _market_df(n: int = 1_000) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    index = pd.date_range('2025-01-01', periods=n, freq='1min', tz='UTC')
+    return pd.DataFrame({
+        'spread': rng.normal(0.1, 0.3, n),
+        'volume': rng.integers(0, 100, n),
+        'active': rng.random(n) > 0.5,
+    }, index=index)
+
+
+class TestSharedFrame:
+    """Shared memory publication of market data."""
+
+    def test_round_trip_zero_copy(self):
+        df = _market_df(50)
+        df['ts'] = df.index
+
+        with SharedFrame.publish(df) as shared:
+            attached, shm = attach_shared_frame(shared.spec)
+            pd.testing.assert_frame_equal(attached, df, check_freq=False)
+
+            values = attached['spread'].to_numpy()
+            assert not values.flags.writeable
+            assert np.shares_memory(values, np.frombuffer(shm.buf, dtype=np.uint8))
+
+            del attached, values
+            shm.close()
+
+    def test_rejects_object_columns(self):
+        with pytest.raises(UnsupportedFrameError):
+            SharedFrame.publish(pd.DataFrame({'name': ['a', 'b']}))
+
+
+class TestParallelParameterOptimizer:
+    """Process-pool evaluation of parameter sets."""
+
+    def test_parameter_grid_order(self):
+        grid = parameter_grid({'a': [1, 2], 'b': ['x', 'y']})
+        assert grid == [{'a': 1, 'b': 'x'}, {'a': 1, 'b': 'y'}, {'a': 2, 'b': 'x'}, {'a': 2, 'b': 'y'}]
+
+    def test_parallel_matches_serial_in_order(self):
+        df = _market_df()
+        params = parameter_grid({'threshold': [0.3, 0.0, 0.1, 0.2, 0.05], 'scale': [1.0, 2.0]})
+        evaluator = StrategyEvaluator(partial(ThresholdSignal, column='spread'))
+
+        serial = ParallelParameterOptimizer(evaluator, max_workers=1).evaluate(df, params)
+        parallel = ParallelParameterOptimizer(evaluator, max_workers=2, chunk_size=3).evaluate(df, params)
+
+        assert [e.index for e in parallel] == list(range(len(params)))
+        assert [e.params for e in parallel] == params
+        assert [e.result.total_pnl_pct for e in parallel] == [e.result.total_pnl_pct for e in serial]
+        assert [e.result.win_rate for e in parallel] == [e.result.win_rate for e in serial]
+
+    def test_errors_are_captured(self):
+        df = _market_df(100)
+        params = [{'threshold': 0.1}, {'threshold': -1.0}, {'threshold': 0.2}]
+
+        evaluations = ParallelParameterOptimizer(StrategyEvaluator(ThresholdSignal), max_workers=2).evaluate(df, params)
+
+        assert [e.ok for e in evaluations] == [True, False, True]
+        assert 'negative threshold' in evaluations[1].error
+
+    def test_serial_fallback_when_pool_unavailable(self, monkeypatch):
+        df = _market_df(100)
+        params = [{'threshold': 0.1}, {'threshold': 0.2}]
+        optimizer = ParallelParameterOptimizer(StrategyEvaluator(ThresholdSignal), max_workers=4)
+
+        def broken(*args, **kwargs):
+            raise BrokenProcessPool("worker died")
+
+        monkeypatch.setattr(optimizer, '_evaluate_parallel', broken)
+        evaluations = optimizer.evaluate(df, params)
+
+        assert [e.ok for e in evaluations] == [True, True]
+
+    def test_serial_fallback_for_object_columns(self):
+        df = _market_df(100)
+        df['exchange'] = 'MEXC'
+        params = [{'threshold': 0.1}, {'threshold': 0.2}]
+        optimizer = ParallelParameterOptimizer(StrategyEvaluator(ThresholdSignal), max_workers=2)
+
+        evaluations = optimizer.evaluate(df, params)
+        assert [e.result.total_pnl_pct for e in evaluations] == pytest.approx(
+            [df['spread'].mean() - 0.1, df['spread'].mean() - 0.2])
+
+        with optimizer.session(df) as session:
+            assert [e.ok for e in session.evaluate(params)] == [True, True]
+            assert session._serial and session._shared is None
+
+    async def test_evaluate_async(self):
+        df = _market_df(100)
+        optimizer = ParallelParameterOptimizer(StrategyEvaluator(ThresholdSignal), max_workers=1)
+
+        evaluations = await optimizer.evaluate_async(df, [{'threshold': 0.1}])
+
+        assert evaluations[0].result.total_pnl_pct == pytest.approx(df['spread'].mean() - 0.1)
@@ -0,0 +1,172 @@
+"""Unit tests for trading.signals_v2.optimization.search strategies.
+
+Test Coverage:
+- Search space dimensions (bounds, integer steps, plain lists)
+- Grid and random search, evaluation and wall-time budgets
+- Successive halving / Hyperband rung schedule on data prefixes
+- TPE concentrating proposals near the optimum
+- JSON-lines results log
+"""
+
+import json
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading.signals_v2.entities import PerformanceMetrics
+from trading.signals_v2.optimization import (
+    Categorical, GridSearch, Hyperband, IntUniform, LogUniform, ParallelParameterOptimizer, RandomSearch,
+    SearchBudget, StrategyEvaluator, SuccessiveHalving, TPESearch, Uniform
+)
+from trading.signals_v2.optimization.search import NumericDimension, normalize_space
+from trading.signals_v2.strategy_signal import StrategySignal
+
+
+class QuadraticSignal(StrategySignal):
+    """Toy strategy with a known optimum at x=0.3, y=0.7; reports the rows it saw."""
+
+    def __init__(self, x: float, y: float = 0.7, delay: float = 0.0):
+        self.x = x
+        self.y = y
+        self.delay = delay
+
+    def backtest(self, df: pd.DataFrame) -> PerformanceMetrics:
+        if self.delay:
+            time.sleep(self.delay)
+        pnl = -((self.x - 0.3) ** 2 + (self.y - 0.7) ** 2) * 100
+        return PerformanceMetrics(total_pnl_pct=pnl, trade_freq=len(df))
+
+
+def _optimizer(max_workers: int = 1) -> ParallelParameterOptimizer:
+    return ParallelParameterOptimizer(StrategyEvaluator(QuadraticSignal), max_workers=max_workers)
+
+
+DF = pd.DataFrame({'price': np.linspace(1.0, 2.0, 810)})
+SPACE = {'x': Uniform(0.0, 1.0), 'y': Uniform(0.0, 1.0)}
+
+
+class TestSearchSpace:
+    """Dimension sampling and encoding."""
+
+    def test_dimensions(self):
+        rng = np.random.default_rng(0)
+        ints = IntUniform(10, 30, step=5)
+        logs = LogUniform(0.01, 10.0)
+
+        assert {ints.sample(rng) for _ in range(200)} == {10, 15, 20, 25, 30}
+        assert ints.from_unit(ints.to_unit(25)) == 25
+        assert all(0.01 <= logs.sample(rng) <= 10.0 for _ in range(100))
+        assert logs.from_unit(logs.to_unit(0.5)) == pytest.approx(0.5)
+        assert normalize_space({'a': [1, 2]}) == {'a': Categorical((1, 2))}
+        with pytest.raises(ValueError):
+            Uniform(1.0, 1.0)
+
+    def test_unit_encoding_only_on_numeric_dimensions(self):
+        assert not hasattr(Categorical((1, 2)), 'to_unit')
+
+        class Incomplete(NumericDimension):
+            def sample(self, rng):
+                return 0.0
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+
+class TestBasicSearches:
+    """Grid and random search with budgets."""
+
+    def test_grid_search_finds_optimum(self):
+        result = GridSearch().run(_optimizer(), DF, {'x': [0.1, 0.3, 0.5], 'y': [0.7, 0.9]})
+
+        assert result.evaluations == 6
+        assert result.best_params == {'x': 0.3, 'y': 0.7}
+        assert result.stopped_reason == 'completed'
+
+    def test_random_search_respects_evaluation_budget(self):
+        search = RandomSearch(n_trials=50, budget=SearchBudget(max_evaluations=12), seed=1)
+
+        result = search.run(_optimizer(), DF, SPACE)
+
+        assert result.evaluations == 12
+        assert result.stopped_reason == 'max_evaluations'
+        assert result.best_score == max(trial.score for trial in result.trials)
+
+    def test_wall_time_budget(self):
+        optimizer = ParallelParameterOptimizer(StrategyEvaluator(QuadraticSignal), max_workers=1)
+        search = RandomSearch(n_trials=1000, budget=SearchBudget(max_seconds=0.05), seed=1)
+
+        result = search.run(optimizer, DF, {'x': Uniform(0.0, 1.0), 'delay': [0.01]})
+
+        assert result.stopped_reason == 'max_seconds'
+        assert result.evaluations < 20
+
+
+class TestMultiFidelity:
+    """Successive halving and Hyperband on growing data prefixes."""
+
+    def test_successive_halving_rungs(self):
+        search = SuccessiveHalving(n_configs=27, min_fraction=1 / 9, eta=3, seed=2)
+
+        result = search.run(_optimizer(), DF, SPACE)
+
+        per_rung = {}
+        for trial in result.trials:
+            per_rung.setdefault(trial.rung, []).append(trial)
+            assert trial.result.trade_freq == trial.rows
+        assert [len(per_rung[r]) for r in sorted(per_rung)] == [27, 9, 3]
+        assert [per_rung[r][0].rows for r in sorted(per_rung)] == [90, 270, 810]
+        assert result.best_trial.fraction == 1.0
+        best_rung0 = max(per_rung[0], key=lambda trial: trial.score)
+        assert result.best_score == best_rung0.score
+
+    def test_hyperband_brackets(self):
+        assert Hyperband(min_fraction=1 / 9, eta=3).brackets() == [(9, 1 / 9), (5, 1 / 3), (3, 1)]
+
+    def test_successive_halving_parallel_session(self):
+        search = SuccessiveHalving(n_configs=9, min_fraction=1 / 3, eta=3, seed=3)
+
+        result = search.run(_optimizer(max_workers=2), DF, SPACE)
+
+        assert [trial.rows for trial in result.trials] == [270] * 9 + [810] * 3
+        assert all(trial.result.trade_freq == trial.rows for trial in result.trials)
+
+
+class TestTPESearch:
+    """Parzen-estimator proposals."""
+
+    def test_proposals_concentrate_near_optimum(self):
+        search = TPESearch(n_trials=60, n_startup=10, seed=4)
+
+        result = search.run(_optimizer(), DF, SPACE)
+
+        distance = [np.hypot(t.params['x'] - 0.3, t.params['y'] - 0.7) for t in result.trials]
+        assert len(result.trials) == 60
+        assert np.mean(distance[-20:]) < np.mean(distance[:10]) / 2
+        assert result.best_score > -1.0
+
+    def test_categorical_dimension(self):
+        search = TPESearch(n_trials=30, n_startup=5, seed=0)
+
+        result = search.run(_optimizer(), DF, {'x': [0.0, 0.3, 0.9], 'y': Uniform(0.0, 1.0)})
+
+        proposed = [trial.params['x'] for trial in result.trials[5:]]
+        assert max(set(proposed), key=proposed.count) == 0.3
+        assert result.best_score > -2.0
+
+
+class TestResultsLog:
+    """JSON-lines trial log."""
+
+    def test_log_file(self, tmp_path):
+        path = tmp_path / 'trials.jsonl'
+        search = RandomSearch(n_trials=5, seed=6, log_path=str(path))
+
+        result = search.run(_optimizer(), DF, SPACE)
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line['trial_id'] for line in lines] == list(range(5))
+        assert lines[0]['search'] == 'random'
+        assert lines[0]['metrics']['total_pnl_pct'] == pytest.approx(result.trials[0].score)
+        assert set(lines[0]['params']) == {'x', 'y'}
@@ -0,0 +1,374 @@
+"""Unit tests for trading.signals_v2.position_simulation.
+
+Test Coverage:
+- Kernel parity with a per-row reference state machine (evaluate mask,
+  min/max hold, strict max hold, exit on entry row, daily entry limit)
+- Callable entry/exit finders and scan_first
+- Per-row position flags, equity curve and vectorized leg net values
+- CrossExchangeParitySignal backtest against the row loop it replaced
+- HedgedMomentumSignal backtest against the minute loop it replaced
+- Spike/Inventory strategies: transfer windows, trade ordering
+- Speed of the kernel against the row loop (performance)
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from exchanges.structs import ExchangeEnum, Fees, Side, Symbol
+from exchanges.structs.types import AssetName
+from trading.data_sources.column_utils import get_column_key
+from trading.signals_v2.entities import BacktestingParams, TradeEntry
+from trading.signals_v2.position_simulation import (
+    PositionSimulation, SignalIndex, leg_net_values, scan_first, simulate_positions
+)
+
+FEES = {
+    ExchangeEnum.MEXC: Fees(maker_fee=0.0, taker_fee=0.05),
+    ExchangeEnum.GATEIO: Fees(maker_fee=0.0, taker_fee=0.1),
+    ExchangeEnum.GATEIO_FUTURES: Fees(maker_fee=0.0, taker_fee=0.05),
+}
+
+
+def reference_loop(entries, exits, timestamps, evaluate=None, min_hold=None, max_hold=None,
+                   strict_max_hold=False, exit_on_entry_row=False, max_entries_per_day=None):
+    """Row-by-row state machine matching the iterrows backtests."""
+    n = len(entries)
+    evaluate = np.ones(n, dtype=bool) if evaluate is None else evaluate
+    entry_rows, exit_rows = [], []
+    active, entry_time = False, None
+    day, day_count = None, 0
+    for i in range(n):
+        if not evaluate[i]:
+            continue
+        now = timestamps[i]
+        if day != now.date():
+            day, day_count = now.date(), 0
+        just_entered = False
+        if not active:
+            if entries[i] and (max_entries_per_day is None or day_count < max_entries_per_day):
+                active, entry_time = True, now
+                day_count += 1
+                entry_rows.append(i)
+                just_entered = True
+            if not exit_on_entry_row or not just_entered:
+                continue
+        held = now - entry_time
+        if min_hold is not None and held < min_hold:
+            continue
+        timed_out = max_hold is not None and (held > max_hold if strict_max_hold else held >= max_hold)
+        if (exits is not None and exits[i]) or timed_out:
+            active = False
+            exit_rows.append(i)
+    if active:
+        exit_rows.append(-1)
+    return entry_rows, exit_rows
+
+
+def _random_case(seed: int, rows: int = 3000):
+    rng = np.random.default_rng(seed)
+    # Irregular spacing across several days
+    gaps = rng.choice([1, 1, 1, 2, 5, 90], size=rows)
+    timestamps = pd.Timestamp('2025-01-01', tz='UTC') + pd.to_timedelta(np.cumsum(gaps), unit='min')
+    entries = rng.random(rows) < 0.05
+    exits = rng.random(rows) < 0.03
+    evaluate = rng.random(rows) < 0.8
+    return pd.DatetimeIndex(timestamps), entries, exits, evaluate
+
+
+# =============================================================================
+# Kernel
+# =============================================================================
+
+class TestSimulatePositions:
+    @pytest.mark.parametrize('seed', range(6))
+    def test_matches_reference_loop(self, seed):
+        timestamps, entries, exits, evaluate = _random_case(seed)
+        rng = np.random.default_rng(100 + seed)
+        options = dict(
+            min_hold=pd.Timedelta(minutes=int(rng.integers(0, 10))),
+            max_hold=pd.Timedelta(minutes=int(rng.integers(5, 60))),
+            strict_max_hold=bool(seed % 2),
+            exit_on_entry_row=bool(seed % 3 == 0),
+            max_entries_per_day=int(rng.integers(1, 30)),
+        )
+
+        simulation = simulate_positions(entries, exits, timestamps, evaluate=evaluate, **options)
+        expected_entries, expected_exits = reference_loop(entries, exits, timestamps, evaluate=evaluate, **options)
+
+        assert simulation.entry_rows.tolist() == expected_entries
+        assert simulation.exit_rows.tolist() == expected_exits
+
+    def test_time_exit_only(self):
+        timestamps, entries, _, _ = _random_case(7)
+        max_hold = pd.Timedelta(minutes=15)
+
+        simulation = simulate_positions(entries, None, timestamps, max_hold=max_hold, exit_on_entry_row=True)
+        expected = reference_loop(entries, None, timestamps, max_hold=max_hold, exit_on_entry_row=True)
+
+        assert (simulation.entry_rows.tolist(), simulation.exit_rows.tolist()) == expected
+
+    def test_row_based_holds_without_timestamps(self):
+        entries = np.zeros(20, dtype=bool)
+        entries[[2, 3, 12]] = True
+
+        simulation = simulate_positions(entries, max_hold=4)
+
+        assert simulation.entry_rows.tolist() == [2, 12]
+        assert simulation.exit_rows.tolist() == [6, 16]
+
+    def test_open_position_at_end(self):
+        entries = np.array([False, True, False, False])
+        simulation = simulate_positions(entries, np.zeros(4, dtype=bool))
+
+        assert simulation.entry_rows.tolist() == [1]
+        assert simulation.exit_rows.tolist() == [-1]
+        assert simulation.closed.tolist() == [False]
+        assert simulation.position.tolist() == [0, 1, 1, 1]
+
+    def test_callable_finders(self):
+        prices = np.array([10, 9, 8, 12, 11, 7, 9, 13, 8], dtype=float)
+        below = SignalIndex(prices < 9)
+
+        def find_exit(entry, start):
+            # Exit once the price rises 4 above the entry price
+            return scan_first(lambda a, b: prices[a:b] >= prices[entry] + 4, start, len(prices), chunk=2)
+
+        simulation = simulate_positions(below.next, find_exit, n_rows=len(prices))
+
+        assert simulation.entry_rows.tolist() == [2, 5, 8]
+        assert simulation.exit_rows.tolist() == [3, 7, -1]
+
+    def test_requires_length_for_callables(self):
+        with pytest.raises(ValueError):
+            simulate_positions(lambda start: -1, lambda entry, start: -1)
+
+    def test_daily_limit_requires_timestamps(self):
+        with pytest.raises(ValueError):
+            simulate_positions(np.ones(5, dtype=bool), max_entries_per_day=1)
+
+
+class TestHelpers:
+    def test_scan_first(self):
+        values = np.arange(1000)
+        assert scan_first(lambda a, b: values[a:b] == 700, 0, 1000, chunk=8) == 700
+        assert scan_first(lambda a, b: values[a:b] == 700, 701, 1000) == -1
+        assert scan_first(lambda a, b: values[a:b] > 5, 10, 10) == -1
+
+    def test_signal_index(self):
+        index = SignalIndex(np.array([False, True, False, True]))
+        assert len(index) == 2
+        assert index.next(0) == 1
+        assert index.next(2) == 3
+        assert index.next(4) == -1
+
+    def test_equity_curve_books_pnl_on_exit_rows(self):
+        simulation = PositionSimulation(n_rows=6, entry_rows=np.array([0, 3]), exit_rows=np.array([2, -1]))
+
+        equity = simulation.equity_curve(np.array([5.0, 100.0]), initial_capital=10.0)
+
+        assert equity.tolist() == [10.0, 10.0, 15.0, 15.0, 15.0, 15.0]
+        assert simulation.position.tolist() == [1, 1, 1, 1, 1, 1]
+
+    @pytest.mark.parametrize('side', [Side.BUY, Side.SELL])
+    def test_leg_net_values_match_trade_entry(self, side):
+        prices = np.array([100.0, 250.5, 0.1234])
+        qty = np.array([1.0, 0.3, 5000.0])
+
+        values = leg_net_values(side, prices, qty, fee_pct=0.1, slippage_pct=0.05)
+
+        expected = [TradeEntry(ExchangeEnum.MEXC, side, p, q, fee_pct=0.1, slippage_pct=0.05).net_value
+                    for p, q in zip(prices, qty)]
+        np.testing.assert_allclose(values, expected, rtol=1e-12)
+
+
+# =============================================================================
+# Strategies
+# =============================================================================
+
+def _book_frame(seed: int, rows: int, exchanges, spread_scale: float = 0.004, nan_rate: float = 0.0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2025-01-01', periods=rows, freq='1min', tz='UTC')
+    base = 100 * np.exp(np.cumsum(rng.normal(0, 0.0005, rows)))
+    data = {}
+    for exchange in exchanges:
+        regime = np.repeat(rng.normal(0, spread_scale, rows // 30 + 1), 30)[:rows]
+        mid = base * (1 + regime + rng.normal(0, 0.0003, rows))
+        bid, ask = mid * 0.9998, mid * 1.0002
+        bid[rng.random(rows) < nan_rate] = np.nan
+        data[get_column_key(exchange, 'bid_price')] = bid
+        data[get_column_key(exchange, 'ask_price')] = ask
+    return pd.DataFrame(data, index=index)
+
+
+class TestCrossExchangeParitySignal:
+    @pytest.mark.parametrize('seed', range(3))
+    def test_matches_row_loop(self, seed):
+        from trading.signals_v2.implementation.cross_exchange_parity_signal import CrossExchangeParitySignal
+
+        params = {'max_daily_positions': 3 + seed, 'min_hold_time_minutes': 2 * seed,
+                  'max_position_time_minutes': 30, 'take_profit_bps': 15.0}
+        signal = CrossExchangeParitySignal(params, BacktestingParams(), FEES)
+        df = _book_frame(seed, 4000, [ExchangeEnum.MEXC, ExchangeEnum.GATEIO_FUTURES], nan_rate=0.01)
+
+        metrics = signal.backtest(df)
+
+        # Replay the old iterrows loop on the signal columns the backtest computed
+        signals = signal._initialize_backtest(signal._prepare_parity_signals(df.copy()))
+        changes = (signals['parity_entry_signal'].ne(signals['parity_entry_signal'].shift()) |
+                   signals['exit_signal'].ne(signals['exit_signal'].shift())).to_numpy()
+        valid = signals[[signal.col_mexc_bid, signal.col_mexc_ask, signal.col_gateio_futures_bid,
+                         signal.col_gateio_futures_ask]].notna().all(axis=1).to_numpy()
+        entries = (signals['parity_entry_signal'] & (signals['mexc_higher'] | signals['futures_higher'])).to_numpy()
+        expected_entries, expected_exits = reference_loop(
+            entries, signals['exit_signal'].to_numpy(), signals.index, evaluate=changes & valid,
+            min_hold=pd.Timedelta(minutes=params['min_hold_time_minutes']),
+            max_hold=pd.Timedelta(minutes=params['max_position_time_minutes']),
+            max_entries_per_day=params['max_daily_positions'])
+
+        assert signal.simulation.entry_rows.tolist() == expected_entries
+        assert signal.simulation.exit_rows.tolist() == expected_exits
+        # Entry and exit legs are both recorded as arbitrage trades
+        legs = sorted(expected_entries + [row for row in expected_exits if row >= 0])
+        assert [trade.timestamp for trade in metrics.trades] == [signals.index[row] for row in legs]
+
+
+def _hedged_momentum_minute_loop(signal, symbol):
+    """The minute-by-minute backtest HedgedMomentumSignal used before the kernel."""
+    from trading.signals_v2.implementation.hedged_momentum_signal import HedgedPosition
+
+    mexc_data = signal.price_data[ExchangeEnum.MEXC]
+    futures_data = signal.price_data[ExchangeEnum.GATEIO_FUTURES]
+    current_time = max(mexc_data.index.min(), futures_data.index.min())
+    end_time = min(mexc_data.index.max(), futures_data.index.max())
+    trades, position = [], None
+    while current_time <= end_time:
+        for exchange in [ExchangeEnum.MEXC, ExchangeEnum.GATEIO_FUTURES]:
+            current_data = signal.price_data[exchange].loc[:current_time]
+            if len(current_data) >= signal.params.momentum_lookback:
+                current_df = signal._calculate_indicators(current_data.copy())
+                signal.momentum_signals[exchange] = signal._analyze_momentum(current_df)
+
+        if position is None:
+            entry = signal.generate_entry_signal(symbol, current_time)
+            if entry:
+                position = HedgedPosition(
+                    entry_time=current_time, symbol=symbol,
+                    spot_exchange=entry['spot_exchange'], spot_side='long', spot_price=entry['spot_price'],
+                    spot_quantity=entry['spot_size_usd'] / entry['spot_price'],
+                    futures_exchange=entry['futures_exchange'], futures_side='short',
+                    futures_price=entry['futures_price'],
+                    futures_quantity=entry['futures_size_usd'] / entry['futures_price'],
+                    hedge_ratio=entry['hedge_ratio'])
+                signal.daily_position_count += 1
+
+        if position is not None:
+            exit_signal = signal.check_exit_conditions(position, current_time)
+            if exit_signal:
+                trades.append((position.entry_time, current_time, exit_signal['pnl_usd'],
+                               ', '.join(exit_signal['reasons'])))
+                position = None
+        current_time += pd.Timedelta(minutes=1)
+    return trades
+
+
+class TestHedgedMomentumSignal:
+    @pytest.mark.parametrize('seed', [1, 2])
+    def test_matches_minute_loop(self, seed):
+        from trading.signals_v2.implementation.hedged_momentum_signal import (
+            HedgedMomentumParams, HedgedMomentumSignal
+        )
+
+        rng = np.random.default_rng(seed)
+        rows = 360
+        index = pd.date_range('2025-01-01', periods=rows, freq='1min', tz='UTC')
+        # Trending regimes so momentum entries, take profits and stop losses all occur
+        drift = np.repeat(rng.choice([-0.002, 0.0, 0.002], rows // 40 + 1), 40)[:rows]
+        spot = 100 * np.exp(np.cumsum(drift + rng.normal(0, 0.002, rows)))
+        futures = spot * (1 + rng.normal(0, 0.001, rows))
+        params = HedgedMomentumParams(momentum_threshold=1.0, rsi_overbought=90, take_profit_pct=0.2,
+                                      stop_loss_pct=0.2, max_position_time_minutes=15, max_daily_positions=1000)
+        symbol = Symbol(base=AssetName('BTC'), quote=AssetName('USDT'))
+
+        def make_signal():
+            signal = HedgedMomentumSignal(params)
+            signal.price_data = {ExchangeEnum.MEXC: pd.DataFrame({'close': spot}, index=index),
+                                 ExchangeEnum.GATEIO_FUTURES: pd.DataFrame({'close': futures}, index=index)}
+            return signal
+
+        _, trades = make_signal().backtest_price_data(symbol, hours=rows // 60)
+        expected = _hedged_momentum_minute_loop(make_signal(), symbol)
+
+        assert len(expected) > 3
+        assert [(t['entry_time'], t['exit_time']) for t in trades] == [(e[0], e[1]) for e in expected]
+        assert [t['exit_reason'] for t in trades] == [e[3] for e in expected]
+        np.testing.assert_allclose([t['pnl_usd'] for t in trades], [e[2] for e in expected], rtol=1e-9)
+
+
+class TestInventoryAndSpikeStrategies:
+    def test_inventory_transfer_windows(self):
+        from trading.signals_v2.implementation.inventory_spot_strategy_signal import InventorySpotStrategySignal
+
+        backtesting_params = BacktestingParams(transfer_delay_minutes=5, transfer_fee_usd=0.5)
+        signal = InventorySpotStrategySignal({'mexc_spread_threshold_bps': 5.0, 'gateio_spread_threshold_bps': 5.0},
+                                             backtesting_params=backtesting_params, fees=FEES)
+        df = _book_frame(0, 2000, [ExchangeEnum.MEXC, ExchangeEnum.GATEIO], spread_scale=0.002)
+
+        metrics = signal.backtest(df)
+
+        rows = signal.simulation.entry_rows
+        assert len(metrics.trades) == len(rows)
+        # Each transfer blocks new entries for the transfer delay
+        gaps = np.diff(df.index[rows].asi8)
+        assert (gaps > pd.Timedelta(minutes=5).value).all()
+
+    def test_spike_trades_close_in_order(self):
+        from trading.signals_v2.implementation.spike_catching_strategy_signal import SpikeCatchingStrategySignal
+
+        rng = np.random.default_rng(3)
+        rows = 800
+        base = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, rows)))
+        data = {}
+        for exchange in [ExchangeEnum.MEXC, ExchangeEnum.GATEIO, ExchangeEnum.GATEIO_FUTURES]:
+            price = base * (1 + rng.normal(0, 0.001, rows))
+            spikes = rng.random(rows) < 0.02
+            price[spikes] *= 1 + rng.choice([-1, 1], spikes.sum()) * rng.uniform(0.01, 0.05, spikes.sum())
+            data[get_column_key(exchange, 'close')] = price
+        df = pd.DataFrame(data, index=pd.date_range('2025-01-01', periods=rows, freq='1min', tz='UTC'))
+        signal = SpikeCatchingStrategySignal(Symbol(base=AssetName('BTC'), quote=AssetName('USDT')),
+                                             max_position_time_minutes=10, backtesting_params=BacktestingParams(),
+                                             fees=FEES)
+
+        metrics = signal.backtest(df)
+
+        assert len(metrics.trades) == len(signal.trades)
+        times = [trade.timestamp for trade in signal.trades]
+        assert times == sorted(times)
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+@pytest.mark.performance
+class TestBenchmark:
+    def test_kernel_faster_than_row_loop(self):
+        rows = 200_000
+        rng = np.random.default_rng(0)
+        timestamps = pd.date_range('2025-01-01', periods=rows, freq='1s', tz='UTC')
+        entries = rng.random(rows) < 0.001
+        exits = rng.random(rows) < 0.001
+        options = dict(min_hold=pd.Timedelta(seconds=30), max_hold=pd.Timedelta(minutes=20), max_entries_per_day=500)
+
+        started = time.perf_counter()
+        simulation = simulate_positions(entries, exits, timestamps, **options)
+        kernel_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        expected = reference_loop(entries, exits, timestamps, **options)
+        loop_seconds = time.perf_counter() - started
+
+        assert (simulation.entry_rows.tolist(), simulation.exit_rows.tolist()) == expected
+        assert kernel_seconds * 10 < loop_seconds, (kernel_seconds, loop_seconds)
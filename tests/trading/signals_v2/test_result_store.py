@@ -0,0 +1,290 @@
+"""Unit tests for trading.signals_v2.optimization result store.
+
+Test Coverage:
+- Canonical params: key order, int/float spelling, enums, structs, partials
+- Data fingerprints follow content (values, index, columns), not identity
+- Result keys: strategy version and partial keywords are part of the key
+- put/get round trip of PerformanceMetrics with trade log, upsert, unpicklable runs
+- Comparison queries: runs() table, best(), filters, delete()
+- Cached grid evaluation only evaluates new parameter sets
+- Repeated screening only computes the newly added symbol
+- HedgedCrossArbitrageBacktest reuses a stored run
+"""
+
+import functools
+import sqlite3
+from datetime import datetime
+from enum import Enum
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from exchanges.structs import AssetName, ExchangeEnum, Symbol
+from trading.signals_v2.entities import ArbitrageTrade, PerformanceMetrics
+from trading.signals_v2.optimization import (
+    BacktestResultStore, ParallelParameterOptimizer, ResultKey, StrategyEvaluator, canonical_params,
+    data_fingerprint, parameter_grid
+)
+from trading.signals_v2.strategy_signal import StrategySignal
+
+
+class Side(Enum):
+    BUY = 'buy'
+
+
+class CountingSignal(StrategySignal):
+    """Toy strategy counting its backtests (serial evaluation only)."""
+    calls = 0
+
+    def __init__(self, threshold: float, scale: float = 1.0):
+        self.threshold = threshold
+        self.scale = scale
+
+    def backtest(self, df: pd.DataFrame) -> PerformanceMetrics:
+        CountingSignal.calls += 1
+        excess = df['spread'].to_numpy() - self.threshold
+        trades = [ArbitrageTrade(timestamp=datetime(2024, 1, 1), buy_exchange=ExchangeEnum.MEXC,
+                                 sell_exchange=ExchangeEnum.GATEIO, buy_price=1.0, sell_price=1.0 + e, qty=1.0,
+                                 pnl_pct=float(e), pnl_usdt=float(e)) for e in excess[:3]]
+        return PerformanceMetrics(total_pnl_pct=float(excess.mean() * self.scale),
+                                  win_rate=float((excess > 0).mean() * 100), trades=trades)
+
+
+class CountingSignalV2(CountingSignal):
+    STRATEGY_VERSION = 2
+
+
+def _frame(n_rows=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'spread': rng.normal(0, 1, n_rows)},
+                        index=pd.date_range('2024-01-01', periods=n_rows, freq='1min'))
+
+
+@pytest.fixture
+def store(tmp_path):
+    with BacktestResultStore(tmp_path / 'results.sqlite') as result_store:
+        yield result_store
+
+
+# =============================================================================
+# Keys
+# =============================================================================
+
+class TestKeys:
+    def test_canonical_params(self):
+        symbol = Symbol(base=AssetName('BTC'), quote=AssetName('USDT'))
+
+        assert canonical_params({'b': 10.0, 'a': np.int64(3)}) == canonical_params({'a': 3, 'b': 10})
+        assert canonical_params({'a': 0.5}) != canonical_params({'a': 0.25})
+        assert canonical_params({'side': Side.BUY, 'nan': float('nan')}) == '{"nan":"nan","side":"buy"}'
+        assert canonical_params({'symbol': symbol}) == canonical_params(
+            {'symbol': Symbol(base=AssetName('BTC'), quote=AssetName('USDT'))})
+        assert canonical_params({'td': pd.Timedelta(minutes=5)}) == canonical_params(
+            {'td': np.timedelta64(300, 's')})
+        with pytest.raises(TypeError):
+            canonical_params({'bad': object.__new__(type('Slotted', (), {'__slots__': ()}))})
+
+    def test_data_fingerprint(self):
+        df = _frame()
+
+        assert data_fingerprint(df) == data_fingerprint(df.copy())
+        changed = df.copy()
+        changed.iloc[10, 0] += 1e-9
+        assert data_fingerprint(changed) != data_fingerprint(df)
+        assert data_fingerprint(df.rename(columns={'spread': 'other'})) != data_fingerprint(df)
+        assert data_fingerprint(df.iloc[:-1]) != data_fingerprint(df)
+        assert data_fingerprint(df.set_axis(df.index + pd.Timedelta(minutes=1))) != data_fingerprint(df)
+        assert data_fingerprint({'symbol': 'BTC', 'hours': 24}) == data_fingerprint({'hours': 24.0, 'symbol': 'BTC'})
+
+    def test_result_key(self):
+        df = _frame()
+        key = ResultKey.build(df, CountingSignal, {'threshold': 1})
+
+        assert key == ResultKey.build(df.copy(), CountingSignal(1.0), {'threshold': 1.0})
+        assert key.strategy.endswith('CountingSignal') and key.version == '1'
+        assert ResultKey.build(df, CountingSignalV2, {'threshold': 1}).digest != key.digest
+        assert ResultKey.build(df, CountingSignal, {'threshold': 1}, version=7).version == '7'
+
+        factory = functools.partial(CountingSignal, scale=2.0)
+        partial_key = ResultKey.build(df, factory, {'threshold': 1})
+        assert partial_key.strategy == key.strategy
+        assert partial_key.params == {'scale': 2, 'threshold': 1}
+        assert partial_key.digest != key.digest
+
+
+# =============================================================================
+# Store
+# =============================================================================
+
+class TestStore:
+    def test_round_trip_with_trades(self, store):
+        df = _frame()
+        key = ResultKey.build(df, CountingSignal, {'threshold': 0.5})
+        result = CountingSignal(0.5).backtest(df)
+
+        assert store.get(key) is None
+        run_id = store.put(key, result, label='BTC_USDT', duration_ms=12.5)
+        stored = store.get(key)
+
+        assert stored.run_id == run_id and stored.label == 'BTC_USDT' and stored.duration_ms == 12.5
+        assert stored.result.total_pnl_pct == result.total_pnl_pct
+        assert stored.result.trades == result.trades
+        assert stored.metrics['total_trades'] == 3
+        trades = store.trades(run_id)
+        assert len(trades) == 3
+        assert trades['sell_exchange'].tolist() == [ExchangeEnum.GATEIO.value] * 3
+
+        # Upsert keeps a single run per key
+        assert store.put(key, PerformanceMetrics(total_pnl_pct=1.0)) == run_id
+        assert len(store) == 1
+        assert store.get(key).result.total_pnl_pct == 1.0
+        assert store.trades(run_id).empty
+
+    def test_unloadable_result_is_a_miss(self, store):
+        key = ResultKey.build(_frame(), CountingSignal, {'threshold': 0.5})
+        store.put(key, PerformanceMetrics())
+        with sqlite3.connect(store.path) as conn:
+            conn.execute("UPDATE runs SET result = ?", (b'not a pickle',))
+
+        assert store.get(key) is None
+        assert store.get(key, load_result=False) is not None
+
+    def test_compute_and_persistence(self, tmp_path):
+        path = tmp_path / 'results.sqlite'
+        key = ResultKey.build(_frame(), CountingSignal, {'threshold': 0.0})
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return PerformanceMetrics(total_pnl_usd=5.0)
+
+        with BacktestResultStore(path) as first:
+            assert first.compute(key, compute).total_pnl_usd == 5.0
+        with BacktestResultStore(path) as second:
+            assert second.compute(key, compute).total_pnl_usd == 5.0
+        assert len(calls) == 1
+
+    def test_queries(self, store):
+        df = _frame()
+        for threshold in (0.0, 0.5, 1.0):
+            for strategy, label in ((CountingSignal, 'BTC'), (CountingSignalV2, 'ETH')):
+                key = ResultKey.build(df, strategy, {'threshold': threshold})
+                store.put(key, strategy(threshold).backtest(df), label=label)
+
+        table = store.runs()
+        assert len(table) == 6
+        assert {'threshold', 'total_pnl_pct', 'win_rate', 'label', 'version'} <= set(table.columns)
+        assert set(store.runs(strategy='CountingSignal')['label']) == {'BTC'}
+        assert set(store.runs(version=2)['label']) == {'ETH'}
+        assert len(store.runs(label='BTC', data_hash=data_fingerprint(df))) == 3
+
+        best = store.best('total_pnl_pct', n=2, label='BTC')
+        assert best['threshold'].tolist() == [0, 0.5]
+        assert store.best('missing_metric').shape[0] == 6
+
+        assert store.delete(version=2) == 3
+        assert len(store) == 3
+        assert store.delete() == 3
+        assert store.runs().empty
+
+
+# =============================================================================
+# Integrations
+# =============================================================================
+
+class TestCachedEvaluation:
+    def test_only_new_param_sets_are_evaluated(self, store):
+        df = _frame()
+        optimizer = ParallelParameterOptimizer(StrategyEvaluator(CountingSignal), max_workers=1)
+        first = parameter_grid({'threshold': [0.0, 0.5], 'scale': [1.0, 2.0]})
+        second = parameter_grid({'threshold': [0.0, 0.5, 1.0], 'scale': [1.0, 2.0]})
+
+        CountingSignal.calls = 0
+        cold = store.evaluate(optimizer, df, first, CountingSignal, label='BTC')
+        assert CountingSignal.calls == 4
+
+        warm = store.evaluate(optimizer, df, second, CountingSignal, label='BTC')
+        assert CountingSignal.calls == 6
+        assert [e.index for e in warm] == list(range(6))
+        assert [e.params for e in warm] == second
+        by_params = {canonical_params(e.params): e.result.total_pnl_pct for e in cold}
+        for evaluation in warm[:4]:
+            assert evaluation.result.total_pnl_pct == by_params[canonical_params(evaluation.params)]
+
+        # New data invalidates every parameter set
+        store.evaluate(optimizer, _frame(seed=1), first, CountingSignal)
+        assert CountingSignal.calls == 10
+
+    def test_failed_evaluations_are_not_stored(self, store):
+        optimizer = ParallelParameterOptimizer(StrategyEvaluator(CountingSignal), max_workers=1)
+
+        evaluations = store.evaluate(optimizer, _frame(), [{'threshold': 0.0}, {'bogus': 1}], CountingSignal)
+
+        assert evaluations[0].ok and not evaluations[1].ok
+        assert len(store) == 1
+
+    def test_screening_only_computes_new_symbol(self, store):
+        frames = {symbol: _frame(seed=i) for i, symbol in enumerate(('BTC', 'ETH', 'SOL'))}
+        computed = []
+
+        def screen(symbols):
+            results = {}
+            for symbol in symbols:
+                key = ResultKey.build(frames[symbol], CountingSignal, {'symbol': symbol})
+                results[symbol] = store.compute(
+                    key, lambda: computed.append(symbol) or {'score': float(frames[symbol]['spread'].mean())},
+                    label=symbol)
+            return results
+
+        first = screen(['BTC', 'ETH'])
+        second = screen(['BTC', 'ETH', 'SOL'])
+
+        assert computed == ['BTC', 'ETH', 'SOL']
+        assert second['BTC'] == first['BTC']
+        assert store.runs()['score'].notna().all()
+
+
+class TestHedgedBacktestStore:
+    async def test_stored_run_is_reused(self, tmp_path, store, monkeypatch):
+        from trading.research.cross_arbitrage.hedged_cross_arbitrage_backtest import (
+            BacktestConfig, HedgedCrossArbitrageBacktest
+        )
+        from trading.research.cross_arbitrage.arbitrage_analyzer import AnalyzerKeys
+
+        rng = np.random.default_rng(0)
+        mid = np.exp(np.cumsum(rng.normal(0, 0.002, 800)))
+        futures = mid * (1.01 + rng.normal(0, 0.002, 800))
+        gateio = mid * (1 + rng.normal(0, 0.0015, 800))
+        df = pd.DataFrame({
+            AnalyzerKeys.mexc_bid: mid, AnalyzerKeys.mexc_ask: mid * 1.0004,
+            AnalyzerKeys.gateio_spot_bid: gateio, AnalyzerKeys.gateio_spot_ask: gateio * 1.0004,
+            AnalyzerKeys.gateio_futures_bid: futures, AnalyzerKeys.gateio_futures_ask: futures * 1.0004,
+        }, index=pd.date_range('2024-01-01', periods=800, freq='5min'))
+        df[AnalyzerKeys.mexc_vs_gateio_futures_arb] = (futures - mid * 1.0004) / futures * 100
+        df[AnalyzerKeys.gateio_spot_vs_futures_arb] = (futures - gateio * 1.0004) / futures * 100
+        config = BacktestConfig(max_position_duration_hours=2)
+        simulations = []
+
+        async def run():
+            backtest = HedgedCrossArbitrageBacktest(config=config, cache_dir=str(tmp_path), result_store=store)
+
+            async def prepared(df_data=None):
+                return df.copy()
+
+            simulate = backtest._simulate_trading
+            monkeypatch.setattr(backtest, '_load_and_prepare_data', prepared)
+            monkeypatch.setattr(backtest, '_simulate_trading',
+                                lambda frame: simulations.append(1) or simulate(frame))
+            return backtest, await backtest.run_backtest()
+
+        first_backtest, first = await run()
+        second_backtest, second = await run()
+
+        assert len(simulations) == 1
+        assert second['performance'] == first['performance']
+        assert len(second_backtest.positions) == len(first_backtest.positions)
+        pd.testing.assert_frame_equal(second['df'], first['df'])
+        run = store.runs().iloc[0]
+        assert run['total_trades'] == first['performance'].total_trades
+        assert len(store.trades(int(run['run_id']))) == len(first_backtest.positions)
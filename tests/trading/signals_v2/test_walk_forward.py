@@ -0,0 +1,237 @@
+"""Unit tests for trading.signals_v2.optimization.walk_forward.
+
+Test Coverage:
+- Rolling and anchored walk-forward folds in rows and time spans, with embargo
+- Purged k-fold splits excluding the embargo around each test block
+- Harness: per-fold search on training rows only, serial and process-pool folds
+- Test-window warm-up from the preceding rows, warm-up trades not scored
+- Purged folds backtest each training block separately (no feature across the gap)
+- Stitched out-of-sample metrics and parameter stability
+- Parquet cache round trip (skipped without pyarrow)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from exchanges.structs import ExchangeEnum
+from trading.signals_v2.entities import ArbitrageTrade, PerformanceMetrics
+from trading.signals_v2.optimization import (
+    GridSearch, WalkForwardHarness, parameter_stability, purged_kfold_folds, stitch_performance, walk_forward_folds
+)
+from trading.signals_v2.strategy_signal import StrategySignal
+
+
+class MeanTrackingSignal(StrategySignal):
+    """Toy strategy scoring best when `level` matches the mean price of the rows it sees."""
+
+    def __init__(self, level: float):
+        self.level = level
+
+    def backtest(self, df: pd.DataFrame) -> PerformanceMetrics:
+        if df['price'].isna().any():
+            raise ValueError("missing prices")
+        pnl = 10.0 - abs(float(df['price'].mean()) - self.level)
+        trade = ArbitrageTrade(df.index[-1].to_pydatetime(), ExchangeEnum.MEXC, ExchangeEnum.GATEIO_FUTURES,
+                               1.0, 1.0, 1.0, pnl / 10, pnl)
+        return PerformanceMetrics(total_pnl_usd=pnl, total_pnl_pct=pnl / 10, trades=[trade])
+
+
+class RollingSignal(StrategySignal):
+    """Toy strategy trading once per bar after a `window`-bar warm-up on contiguous data."""
+
+    def __init__(self, window: int, level: float = 0.0):
+        self.window = window
+        self.level = level
+
+    def backtest(self, df: pd.DataFrame) -> PerformanceMetrics:
+        if len(df) > 1 and (df.index[1:] - df.index[:-1]).max() > pd.Timedelta('1min'):
+            raise ValueError("rolling window spans a gap")
+        trades = [ArbitrageTrade(ts.to_pydatetime(), ExchangeEnum.MEXC, ExchangeEnum.GATEIO_FUTURES,
+                                 1.0, 1.0, 1.0, 0.0, 1.0 - self.level)
+                  for ts in df.index[self.window:]]
+        return PerformanceMetrics(total_pnl_usd=float(len(trades)) * (1.0 - self.level),
+                                  total_pnl_pct=float(len(trades)), trades=trades)
+
+
+def _frame(rows: int = 240) -> pd.DataFrame:
+    index = pd.date_range('2025-01-01', periods=rows, freq='1min', tz='UTC')
+    # Four flat regimes at price 1, 2, 3, 4 so each test window has a known optimum
+    return pd.DataFrame({'price': np.repeat([1.0, 2.0, 3.0, 4.0], rows // 4)}, index=index)
+
+
+class TestFolds:
+    """Fold boundaries and embargo gaps."""
+
+    def test_rolling_row_folds(self):
+        folds = walk_forward_folds(pd.RangeIndex(100), train_size=40, test_size=20, embargo=5)
+
+        assert [(f.train, f.test) for f in folds] == [
+            (((0, 40),), (45, 65)),
+            (((20, 60),), (65, 85)),
+        ]
+        assert all(f.test[0] - f.train[-1][1] == 5 for f in folds)
+
+    def test_anchored_time_folds(self):
+        df = _frame()
+        folds = walk_forward_folds(df.index, '1h', '30min', embargo='10min', anchored=True)
+
+        assert len(folds) == 5
+        assert all(f.train[0][0] == 0 for f in folds)
+        assert [f.train_rows for f in folds] == [60, 90, 120, 150, 180]
+        for fold in folds:
+            gap = df.index[fold.test[0]] - df.index[fold.train[0][1] - 1]
+            assert gap > pd.Timedelta('10min')
+            assert fold.test_rows == 30
+
+    def test_mixed_spans_rejected(self):
+        with pytest.raises(ValueError):
+            walk_forward_folds(_frame().index, 60, '30min')
+        with pytest.raises(ValueError):
+            walk_forward_folds(pd.RangeIndex(100), '1h', '30min')
+
+    def test_purged_kfold(self):
+        folds = purged_kfold_folds(pd.RangeIndex(100), n_splits=4, embargo=5)
+
+        assert [f.test for f in folds] == [(0, 25), (25, 50), (50, 75), (75, 100)]
+        assert folds[0].train == ((30, 100),)
+        assert folds[1].train == ((0, 20), (55, 100))
+        assert folds[3].train == ((0, 70),)
+        df = pd.DataFrame({'price': np.arange(100.0)})
+        assert list(folds[1].train_frame(df)['price']) == list(range(20)) + list(range(55, 100))
+
+
+class TestHarness:
+    """End-to-end walk-forward runs."""
+
+    @pytest.mark.parametrize('max_workers', [1, 2])
+    def test_walk_forward_run(self, max_workers):
+        df = _frame()
+        folds = walk_forward_folds(df.index, '1h', '1h')
+        harness = WalkForwardHarness(MeanTrackingSignal, GridSearch(),
+                                     {'level': [1.0, 2.0, 3.0, 4.0]},
+                                     initial_capital_usd=100.0, max_workers=max_workers)
+
+        report = harness.run(df, folds)
+
+        assert len(report.successful_folds) == 3
+        # Each fold trains on one regime and is tested on the next one
+        assert [r.best_params['level'] for r in report.folds] == [1.0, 2.0, 3.0]
+        assert [r.train_score for r in report.folds] == pytest.approx([1.0, 1.0, 1.0])
+        assert [r.test_score for r in report.folds] == pytest.approx([0.9, 0.9, 0.9])
+        assert report.walk_forward_efficiency == pytest.approx(0.9)
+        assert report.oos_metrics.total_trades == 3
+        assert report.oos_metrics.total_pnl_usd == pytest.approx(27.0)
+        assert report.folds[0].test_period[0] == df.index[60]
+        assert len(report.to_dataframe()) == 3
+
+    def test_failed_fold_reported(self):
+        df = _frame()
+        df.loc[df.index[60:120], 'price'] = np.nan
+        folds = walk_forward_folds(df.index, '1h', '1h')
+
+        report = WalkForwardHarness(MeanTrackingSignal, GridSearch(), {'level': [1.0, 3.0]},
+                                    max_workers=1).run(df, folds)
+
+        # Fold 0 cannot be tested, fold 1 cannot be trained; fold 2 is unaffected
+        assert 'missing prices' in report.folds[0].error
+        assert report.folds[1].error == 'No successful parameter sets on training data'
+        assert [r.fold.fold_id for r in report.successful_folds] == [2]
+        assert report.stability['level']['mode'] == 3.0
+
+
+    @pytest.mark.parametrize('warmup', [20, '20min'])
+    def test_warmup_before_test_window(self, warmup):
+        df = _frame(180)
+        folds = walk_forward_folds(df.index, '1h', '1h')
+
+        cold = WalkForwardHarness(RollingSignal, GridSearch(), {'window': [10]}, max_workers=1).run(df, folds)
+        warm = WalkForwardHarness(RollingSignal, GridSearch(), {'window': [10]}, max_workers=1,
+                                  warmup=warmup).run(df, folds)
+
+        assert [r.test_metrics.total_trades for r in cold.folds] == [50, 50]
+        # 20 warm-up rows: the first 10 of them trade, and those trades are dropped
+        assert [r.test_metrics.total_trades for r in warm.folds] == [60, 60]
+        assert all(trade.timestamp >= df.index[60] for trade in warm.folds[0].test_metrics.trades)
+        assert warm.folds[0].test_period[0] == df.index[60]
+
+    def test_purged_blocks_backtested_separately(self):
+        df = _frame(120)
+        folds = purged_kfold_folds(df.index, n_splits=3, embargo=5)
+
+        report = WalkForwardHarness(RollingSignal, GridSearch(), {'window': [10], 'level': [0.0, 0.5]},
+                                    initial_capital_usd=100.0, max_workers=1).run(df, folds)
+
+        assert len(report.successful_folds) == 3
+        # Middle fold trains on rows [0, 35) and [85, 120): 25 trades per block
+        middle = report.folds[1]
+        assert middle.fold.train_block_rows == (35, 35)
+        assert middle.best_params['level'] == 0.0
+        assert middle.train_score == pytest.approx(50.0)
+
+
+class TestAggregation:
+    """Stitched metrics and stability summaries."""
+
+    def test_stitch_performance(self):
+        times = pd.date_range('2025-01-01', periods=4, freq='10min')
+        trades = [ArbitrageTrade(t.to_pydatetime(), ExchangeEnum.MEXC, ExchangeEnum.GATEIO_FUTURES,
+                                 1.0, 1.0, 1.0, 0.0, pnl)
+                  for t, pnl in zip(times, [10.0, -20.0, 5.0, 15.0])]
+        first = PerformanceMetrics(total_pnl_usd=-10.0, trades=trades[:2])
+        second = PerformanceMetrics(total_pnl_usd=20.0, trades=trades[2:])
+
+        stitched = stitch_performance([first, second], initial_capital_usd=100.0)
+
+        assert stitched.total_pnl_usd == pytest.approx(10.0)
+        assert stitched.total_pnl_pct == pytest.approx(10.0)
+        assert stitched.total_trades == 4
+        assert stitched.win_rate == pytest.approx(75.0)
+        assert stitched.max_drawdown == pytest.approx(20.0)
+        assert stitched.trade_freq == pytest.approx(10.0)
+
+    def test_parameter_stability(self):
+        stability = parameter_stability([
+            {'level': 2.0, 'mode': 'fast'},
+            {'level': 2.0, 'mode': 'slow'},
+            {'level': 4.0, 'mode': 'fast'},
+            {'level': 2.0, 'mode': 'fast'},
+        ])
+
+        assert stability['level']['mode'] == 2.0
+        assert stability['level']['mode_share'] == 0.75
+        assert stability['level']['mean'] == pytest.approx(2.5)
+        assert stability['level']['cv'] == pytest.approx(np.std([2, 2, 4, 2]) / 2.5)
+        assert stability['mode'] == {'mode': 'fast', 'mode_share': 0.75}
+
+
+class TestParquetCache:
+    """Read-through Parquet cache for offline runs."""
+
+    async def test_round_trip(self, tmp_path):
+        pytest.importorskip('pyarrow')
+        from exchanges.structs import Symbol
+        from exchanges.structs.types import AssetName
+        from trading.data_sources.parquet_cache import ParquetCachedSource
+
+        class CountingSource:
+            calls = 0
+
+            async def get_multi_exchange_data(self, exchanges, symbol, date_to=None, hours=24, timeframe=None):
+                CountingSource.calls += 1
+                return _frame(8)
+
+        symbol = Symbol(base=AssetName('BTC'), quote=AssetName('USDT'))
+        date_to = pd.Timestamp('2025-01-02', tz='UTC').to_pydatetime()
+        cached = ParquetCachedSource(CountingSource(), tmp_path)
+
+        first = await cached.get_multi_exchange_data([ExchangeEnum.MEXC], symbol, date_to=date_to, hours=1)
+        second = await cached.get_multi_exchange_data([ExchangeEnum.MEXC], symbol, date_to=date_to, hours=1)
+        offline = ParquetCachedSource(cache_dir=tmp_path, offline=True)
+        third = await offline.get_multi_exchange_data([ExchangeEnum.MEXC], symbol, date_to=date_to, hours=1)
+
+        assert CountingSource.calls == 1
+        pd.testing.assert_frame_equal(first, second, check_freq=False)
+        pd.testing.assert_frame_equal(first, third, check_freq=False)
+        with pytest.raises(FileNotFoundError):
+            await offline.get_multi_exchange_data([ExchangeEnum.MEXC], symbol, date_to=date_to, hours=2)
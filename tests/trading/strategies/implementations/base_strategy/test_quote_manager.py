@@ -0,0 +1,190 @@
+"""Unit tests for QuoteManager and RequoteBudget.
+
+Test Coverage:
+- Token bucket refill and burst limit
+- Tick hysteresis and requote budget skipping requotes
+- Native amend, fallback to cancel-replace when amend is not supported
+- Cancel/fill race: no replacement order, fill reported once
+- Unconfirmed cancel keeps the quote (no double exposure)
+"""
+
+from unittest.mock import MagicMock
+
+import msgspec
+import pytest
+
+from exchanges.structs import OrderStatus, OrderType, Side
+from exchanges.structs.common import AssetName, Order, Symbol, SymbolInfo
+from trading.strategies.implementations.base_strategy.quote_manager import QuoteManager, RequoteBudget
+
+SYMBOL = Symbol(base=AssetName('ETH'), quote=AssetName('USDT'))
+SYMBOL_INFO = SymbolInfo(symbol=SYMBOL, base_precision=4, quote_precision=2,
+                         min_base_quantity=0.001, min_quote_quantity=1.0, tick=0.01)
+
+
+class FakePrivateExchange:
+    """Private exchange keeping orders in memory; tests script fills and failures."""
+
+    def __init__(self, amend: bool = True):
+        self.symbols_info = {SYMBOL: SYMBOL_INFO}
+        self.orders = {}
+        self.placed = []
+        self.cancels = 0
+        self.fill_on_cancel = 0.0       # quantity filled right before the cancel lands
+        self.cancel_confirmed = True
+        self._next_id = 0
+        if not amend:
+            self.amend_order = self._amend_not_supported
+
+    def get_order(self, order_id):
+        return self.orders.get(order_id)
+
+    async def place_limit_order(self, symbol, side, quantity, price, **kwargs):
+        self._next_id += 1
+        order = Order(symbol=symbol, order_id=str(self._next_id), side=side, order_type=OrderType.LIMIT,
+                      quantity=quantity, price=price, status=OrderStatus.NEW)
+        self.orders[order.order_id] = order
+        self.placed.append(order)
+        return order
+
+    async def amend_order(self, symbol, order_id, price, quantity=None):
+        order = self.orders[order_id] = msgspec.structs.replace(self.orders[order_id], price=price)
+        return order
+
+    async def _amend_not_supported(self, symbol, order_id, price, quantity=None):
+        raise NotImplementedError("no native amend")
+
+    async def cancel_order(self, symbol, order_id):
+        self.cancels += 1
+        order = self.orders[order_id]
+        if not self.cancel_confirmed:
+            raise TimeoutError("cancel request timed out")
+        if self.fill_on_cancel >= order.quantity:
+            status = OrderStatus.FILLED
+        else:
+            status = OrderStatus.PARTIALLY_CANCELED if self.fill_on_cancel else OrderStatus.CANCELED
+        order = self.orders[order_id] = msgspec.structs.replace(
+            order, status=status, filled_quantity=self.fill_on_cancel)
+        return order
+
+    async def wait_for_fill(self, symbol, order_id, timeout=2.0):
+        return self.orders.get(order_id)
+
+
+@pytest.fixture
+def reported():
+    return []
+
+
+def _quotes(exchange, reported, **kwargs):
+    async def on_order(order):
+        reported.append(order)
+    return QuoteManager(exchange, SYMBOL, MagicMock(), on_order=on_order, **kwargs)
+
+
+# =============================================================================
+# Requote budget
+# =============================================================================
+
+class TestRequoteBudget:
+    def test_burst_and_refill(self):
+        budget = RequoteBudget(rate=2.0, burst=3.0)
+        assert [budget.try_acquire(0.0) for _ in range(4)] == [True, True, True, False]
+        assert not budget.try_acquire(0.25)     # half a token
+        assert budget.try_acquire(0.5)
+        assert budget.try_acquire(100.0) and budget.tokens == pytest.approx(2.0)   # capped at burst
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            RequoteBudget(rate=0.0)
+
+
+# =============================================================================
+# Quoting
+# =============================================================================
+
+class TestQuoting:
+    async def test_hysteresis_and_amend(self, reported):
+        exchange = FakePrivateExchange()
+        quotes = _quotes(exchange, reported, min_requote_ticks=2)
+
+        order = await quotes.quote(Side.BUY, 1.0, 100.0)
+        assert order.order_id == '1' and quotes.order is order
+
+        assert (await quotes.quote(Side.BUY, 1.0, 100.01)) is order     # 1 tick < 2 ticks
+        assert quotes.skipped == 1 and not quotes.needs_requote(100.01)
+
+        amended = await quotes.quote(Side.BUY, 1.0, 100.05)
+        assert (amended.order_id, amended.price) == ('1', 100.05)
+        assert quotes.amends == 1 and exchange.cancels == 0 and len(exchange.placed) == 1
+        assert reported == [order, amended]
+
+    async def test_budget_throttles(self, reported):
+        exchange = FakePrivateExchange()
+        quotes = _quotes(exchange, reported, budget=RequoteBudget(rate=0.001, burst=2))
+        await quotes.quote(Side.SELL, 1.0, 100.0)
+
+        for price in (100.1, 100.2, 100.3, 100.4):
+            await quotes.quote(Side.SELL, 1.0, price)
+        assert (quotes.amends, quotes.throttled) == (2, 2)
+        assert quotes.order.price == 100.2
+
+    async def test_cancel_replace_fallback(self, reported):
+        exchange = FakePrivateExchange(amend=False)
+        quotes = _quotes(exchange, reported)
+        await quotes.quote(Side.BUY, 1.0, 100.0)
+
+        order = await quotes.quote(Side.BUY, 1.0, 99.5)
+        assert order.order_id == '2' and order.price == 99.5
+        assert exchange.orders['1'].status == OrderStatus.CANCELED
+        assert not quotes._amend_supported and quotes.amends == 0
+
+        await quotes.quote(Side.BUY, 1.0, 99.0)     # straight to cancel-replace
+        assert len(exchange.placed) == 3 and exchange.cancels == 2
+
+    async def test_completed_order_reported(self, reported):
+        exchange = FakePrivateExchange()
+        quotes = _quotes(exchange, reported)
+        order = await quotes.quote(Side.BUY, 1.0, 100.0)
+
+        # Fill arrives through the private stream between quotes
+        exchange.orders['1'] = msgspec.structs.replace(order, status=OrderStatus.FILLED, filled_quantity=1.0)
+        done = await quotes.quote(Side.BUY, 1.0, 101.0)
+        assert done.status == OrderStatus.FILLED and reported[-1] is done
+        assert quotes.order is None and len(exchange.placed) == 1
+
+
+# =============================================================================
+# Cancel/fill races
+# =============================================================================
+
+class TestRaces:
+    async def test_fill_during_cancel_places_no_replacement(self, reported):
+        exchange = FakePrivateExchange(amend=False)
+        quotes = _quotes(exchange, reported)
+        await quotes.quote(Side.BUY, 1.0, 100.0)
+
+        exchange.fill_on_cancel = 0.4
+        order = await quotes.quote(Side.BUY, 1.0, 99.0)
+        assert order.status == OrderStatus.PARTIALLY_CANCELED and order.filled_quantity == 0.4
+        assert len(exchange.placed) == 1 and quotes.fill_races == 1
+        assert quotes.order is None and reported[-1] is order
+
+    async def test_unconfirmed_cancel_keeps_quote(self, reported):
+        exchange = FakePrivateExchange(amend=False)
+        quotes = _quotes(exchange, reported)
+        placed = await quotes.quote(Side.BUY, 1.0, 100.0)
+
+        exchange.cancel_confirmed = False
+        order = await quotes.quote(Side.BUY, 1.0, 99.0)
+        assert order.order_id == placed.order_id and not order.is_done
+        assert len(exchange.placed) == 1 and quotes.order is order
+
+    async def test_side_change_cancels_first(self, reported):
+        exchange = FakePrivateExchange()
+        quotes = _quotes(exchange, reported)
+        await quotes.quote(Side.BUY, 1.0, 100.0)
+
+        order = await quotes.quote(Side.SELL, 1.0, 100.0)
+        assert order.side == Side.SELL and exchange.orders['1'].is_done
+        assert quotes.amends == 0 and exchange.cancels == 1
@@ -0,0 +1,268 @@
+"""Unit tests for TransferTracker against simulated exchanges.
+
+Test Coverage:
+- Completion from destination balance updates of the simulated private stream (no REST calls)
+- Baseline read before submission: credits landing before tracking starts still complete
+- Baseline and catch-up read exchange-reported balances (force=True)
+- Partial credit followed by completion / immediate REST confirmation
+- Balance handlers: stable per exchange, no credits once unbound
+- REST fallback backoff schedule and timeout flagging
+- Restart resume from the persisted baseline (msgspec round trip)
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import msgspec
+import numpy as np
+import pytest
+
+from exchanges.structs import AssetName, Symbol, SymbolInfo
+from exchanges.structs.common import AssetBalance
+from exchanges.structs.enums import DepositStatus, ExchangeEnum, WithdrawalStatus
+from trading.event_backtest import BookTickerStream, LatencyModel, TickBacktestEngine
+from trading.strategies.implementations.cross_exchange_arbitrage_strategy.asset_transfer_module import (
+    TransferRequest
+)
+from trading.strategies.implementations.cross_exchange_arbitrage_strategy.transfer_tracker import (
+    TransferPollPolicy, TransferTracker
+)
+from utils.time_utils import get_current_timestamp
+
+SOURCE = ExchangeEnum.MEXC
+DEST = ExchangeEnum.GATEIO
+ETH = AssetName('ETH')
+SYMBOL = Symbol(base=ETH, quote=AssetName('USDT'))
+SYMBOLS_INFO = {SYMBOL: SymbolInfo(symbol=SYMBOL, base_precision=4, quote_precision=2,
+                                   min_base_quantity=0.001, min_quote_quantity=1.0)}
+T0 = 1_700_000_000_000
+STREAM_SECONDS = 0.05       # Long enough for a private stream delivery
+
+
+class FakeTransferModule:
+    """Transfer module over simulated private exchanges; the REST transfer status is set by the test."""
+
+    def __init__(self, engine):
+        self.exchanges = {exchange: engine.exchange(exchange).private for exchange in (SOURCE, DEST)}
+        self.rest_calls = 0
+        self.deposit_status = DepositStatus.PENDING
+
+    async def update_transfer_request(self, request):
+        self.rest_calls += 1
+        request.withdrawal_status = WithdrawalStatus.COMPLETED
+        request.deposit_status = self.deposit_status
+        return request
+
+
+def _engine():
+    engine = TickBacktestEngine()
+    latency = LatencyModel(request_ms=5, response_ms=5, private_stream_ms=10)
+    for exchange in (SOURCE, DEST):
+        engine.add_exchange(exchange, SYMBOLS_INFO, balances={'ETH': 2.0, 'USDT': 1000.0}, latency=latency)
+        # Quotes keep simulated time running for ten minutes
+        rows = np.array([[0, 100.0, 1.0, 100.1, 1.0], [600_000, 100.0, 1.0, 100.1, 1.0]])
+        engine.add_book_tickers(exchange, BookTickerStream(SYMBOL, T0 + rows[:, 0].astype(np.int64), rows[:, 1],
+                                                           rows[:, 2], rows[:, 3], rows[:, 4]))
+    return engine
+
+
+def _request(**kwargs):
+    return TransferRequest(transfer_id='t1', asset='ETH', from_exchange=SOURCE, to_exchange=DEST,
+                           amount=10.0, fees=0.01, withdrawal_status=WithdrawalStatus.PROCESSING,
+                           created_at=get_current_timestamp(), **kwargs)
+
+
+def _balance(total):
+    return AssetBalance(asset=ETH, available=total, locked=0.0)
+
+
+@pytest.fixture
+def engine():
+    return _engine()
+
+
+@pytest.fixture
+def module(engine):
+    return FakeTransferModule(engine)
+
+
+@pytest.fixture
+def updates():
+    return []
+
+
+@pytest.fixture
+def tracker(module, updates):
+    return TransferTracker(module, MagicMock(), on_update=updates.append,
+                           poll_policy=TransferPollPolicy(initial_seconds=30, max_seconds=600))
+
+
+async def _deposit(engine, exchange, asset, amount):
+    """Credit the exchange-side balance and wait for the private stream to deliver it."""
+    engine.simulator(exchange).deposit(asset, amount)
+    await asyncio.sleep(STREAM_SECONDS)
+
+
+# =============================================================================
+# Balance stream completion
+# =============================================================================
+
+class TestBalanceStream:
+    def test_completes_from_balance_update(self, engine, tracker, module, updates):
+        async def strategy(engine):
+            for exchange in (SOURCE, DEST):
+                await engine.exchange(exchange).bind_handlers(on_balance=tracker.balance_handler(exchange))
+            baseline = await tracker.read_baseline(DEST, 'ETH')
+            request = _request()
+            await tracker.track(request, baseline=baseline)
+            assert request.balance_baseline == 2.0
+
+            await _deposit(engine, DEST, 'USDT', 100.0)        # other asset
+            await _deposit(engine, SOURCE, 'ETH', 50.0)        # other exchange
+            assert request.in_progress
+
+            await _deposit(engine, DEST, 'ETH', 9.985)         # exchange fee slightly above estimate
+            assert request.completed and not request.in_progress
+            assert request.credited_amount == pytest.approx(9.985)
+            assert tracker.pending == [] and module.rest_calls == 0
+            assert updates[-1] is request
+
+        engine.run(strategy)
+
+    def test_credit_before_tracking(self, engine, tracker, module):
+        async def strategy(engine):
+            await engine.exchange(DEST).bind_handlers(on_balance=tracker.balance_handler(DEST))
+            baseline = await tracker.read_baseline(DEST, 'ETH')
+            # Internal transfer credited (and streamed) before tracking starts
+            await _deposit(engine, DEST, 'ETH', 10.0)
+            assert await tracker.read_baseline(DEST, 'ETH') == 12.0     # a late baseline would miss it
+
+            request = _request()
+            await tracker.track(request, baseline=baseline)
+            assert request.completed and tracker.pending == []
+            assert request.balance_baseline == 2.0 and module.rest_calls == 0
+
+        engine.run(strategy)
+
+    def test_partial_credit(self, engine, tracker, module):
+        async def strategy(engine):
+            await engine.exchange(DEST).bind_handlers(on_balance=tracker.balance_handler(DEST))
+            request = _request()
+            await tracker.track(request, baseline=await tracker.read_baseline(DEST, 'ETH'))
+
+            await _deposit(engine, DEST, 'ETH', 4.0)
+            assert request.deposit_status == DepositStatus.PROCESSING
+            assert tracker._next_poll['t1'] <= time.monotonic()
+            tracker.on_balance(DEST, _balance(5.0))     # decrease is ignored
+            assert request.credited_amount == 4.0
+
+            await _deposit(engine, DEST, 'ETH', 6.0)
+            assert request.completed and module.rest_calls == 0
+
+        engine.run(strategy)
+
+    def test_partial_credit_confirmed_by_rest(self, engine, tracker, module):
+        async def strategy(engine):
+            await engine.exchange(DEST).bind_handlers(on_balance=tracker.balance_handler(DEST))
+            request = _request()
+            await tracker.track(request, baseline=await tracker.read_baseline(DEST, 'ETH'))
+            tracker.start()
+            try:
+                module.deposit_status = DepositStatus.COMPLETED
+                await _deposit(engine, DEST, 'ETH', 4.0)        # wakes the poll loop immediately
+                for _ in range(100):
+                    if not tracker.pending:
+                        break
+                    await asyncio.sleep(0.01)
+            finally:
+                await tracker.stop()
+
+            assert request.completed and module.rest_calls == 1
+            assert request.last_status_check is not None
+
+        engine.run(strategy)
+
+    def test_unbound_handler_stops_credits(self, engine, tracker):
+        async def strategy(engine):
+            handler = tracker.balance_handler(DEST)
+            assert tracker.balance_handler(DEST) is handler
+            await engine.exchange(DEST).bind_handlers(on_balance=handler)
+            request = _request()
+            await tracker.track(request, baseline=await tracker.read_baseline(DEST, 'ETH'))
+
+            await engine.exchange(DEST).unbind_handlers(on_balance=handler)
+            await _deposit(engine, DEST, 'ETH', 10.0)
+            assert request.in_progress and request.credited_amount == 0.0
+
+        engine.run(strategy)
+
+
+# =============================================================================
+# REST fallback
+# =============================================================================
+
+class TestRestFallback:
+    def test_backoff_schedule(self):
+        policy = TransferPollPolicy(initial_seconds=30, max_seconds=600)
+        assert [policy.delay(attempt) for attempt in range(6)] == [30, 60, 120, 240, 480, 600]
+        assert policy.delay(10_000) == 600
+
+    async def test_poll_until_timeout(self, module, updates):
+        tracker = TransferTracker(module, MagicMock(), on_update=updates.append, timeout_seconds=60)
+        request = _request()
+        await tracker.track(request)
+
+        await tracker.poll('t1')
+        assert request.in_progress and not request.timed_out
+        assert tracker._poll_attempts['t1'] == 1
+
+        request.created_at = get_current_timestamp() - 120_000
+        await tracker.poll('t1')
+        assert request.timed_out and tracker.pending == [request]
+        assert tracker._poll_attempts['t1'] == 64
+        tracker.logger.error.assert_called_once()
+
+        module.deposit_status = DepositStatus.COMPLETED
+        await tracker.poll('t1')
+        assert request.completed and tracker.pending == []
+        assert module.rest_calls == 3 and updates.count(request) >= 3
+
+    async def test_baseline_unavailable(self, module):
+        module.exchanges[DEST].get_asset_balance = AsyncMock(side_effect=RuntimeError('offline'))
+        tracker = TransferTracker(module, MagicMock())
+        request = _request()
+        await tracker.track(request, baseline=await tracker.read_baseline(DEST, 'ETH'))
+
+        assert request.balance_baseline is None
+        module.exchanges[DEST].get_asset_balance.assert_awaited_with('ETH', force=True)   # exchange-reported
+        tracker.on_balance(DEST, _balance(20.0))    # cannot attribute without baseline
+        assert request.in_progress and tracker.pending == [request]
+
+
+# =============================================================================
+# Restart
+# =============================================================================
+
+class TestRestart:
+    def test_resume_from_persisted_baseline(self, engine, tracker, module):
+        async def strategy(engine):
+            await engine.exchange(DEST).bind_handlers(on_balance=tracker.balance_handler(DEST))
+            request = _request()
+            await tracker.track(request, baseline=await tracker.read_baseline(DEST, 'ETH'))
+            await _deposit(engine, DEST, 'ETH', 3.0)
+            await engine.exchange(DEST).unbind_handlers(on_balance=tracker.balance_handler(DEST))
+            await tracker.stop()
+
+            restored = msgspec.json.decode(msgspec.json.encode(request), type=TransferRequest)
+            assert (restored.balance_baseline, restored.credited_amount) == (2.0, 3.0)
+
+            # Balance moved while offline: the restored baseline still attributes it
+            await _deposit(engine, DEST, 'ETH', 6.99)
+            await module.exchanges[DEST].load_balances()
+            resumed = TransferTracker(module, MagicMock())
+            await resumed.track(restored, poll_now=True)
+            assert restored.balance_baseline == 2.0
+            assert restored.completed and resumed.pending == []
+
+        engine.run(strategy)
@@ -0,0 +1,164 @@
+"""Unit tests for the maker limit strategy indicators on rolling market state.
+
+Test Coverage:
+- SafetyIndicators metrics and checks vs the list-based reference implementation
+- DynamicParameters volatility/trend/liquidity assessment vs the reference
+- Parity through warm-up, historical loads and clear_old_data()
+- Indicator reads do not materialize history lists
+"""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from trading.strategies.implementations.maker_limit_delta_neutral__simple_strategy.indicators import (
+    DynamicParameters, SafetyIndicators, SimpleMarketState
+)
+
+
+# =============================================================================
+# Reference (list-based) indicator implementations
+# =============================================================================
+
+def _reference_volatility_pct(spot_prices, minutes=20):
+    prices = list(spot_prices)[-minutes:]
+    if len(prices) < 10:
+        return None
+    return (max(prices) - min(prices)) / prices[-1] * 100
+
+
+def _reference_avg_spreads(spot_spreads, futures_spreads, minutes=5):
+    spot = list(spot_spreads)[-minutes:]
+    futures = list(futures_spreads)[-minutes:]
+    if not spot or not futures:
+        return None
+    return sum(spot) / len(spot), sum(futures) / len(futures)
+
+
+def _reference_is_trending(spot_prices, periods=15, threshold=0.002):
+    prices = list(spot_prices)[-periods:]
+    if len(prices) < 10:
+        return False
+    mid_point = len(prices) // 2
+    first_half_avg = sum(prices[:mid_point]) / mid_point
+    second_half_avg = sum(prices[mid_point:]) / (len(prices) - mid_point)
+    return abs(second_half_avg - first_half_avg) / first_half_avg > threshold
+
+
+def _reference_volatility_level(spot_prices):
+    volatility_pct = _reference_volatility_pct(spot_prices)
+    if volatility_pct is None:
+        return "unknown"
+    for level, limit in (("low", 0.5), ("medium", 1.0), ("high", 2.0)):
+        if volatility_pct <= limit:
+            return level
+    return "extreme"
+
+
+def _market_samples(n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    # Regime switches between calm and volatile/trending periods
+    scale = np.where((np.arange(n) // 40) % 2, 0.004, 0.0005)
+    drift = np.where((np.arange(n) // 60) % 3 == 1, 0.001, 0.0)
+    spot = 100 * np.exp(np.cumsum(rng.normal(drift, scale)))
+    futures = spot * (1 + rng.normal(0, 0.0005, n))
+    spot_spread = rng.uniform(0.01, 0.1, n)
+    futures_spread = spot_spread * rng.uniform(0.5, 2.5, n)
+    return spot, futures, spot_spread, futures_spread
+
+
+def _book(mid: float, spread_pct: float):
+    half = mid * spread_pct / 200
+    return SimpleNamespace(bid_price=mid - half, ask_price=mid + half)
+
+
+@pytest.fixture
+def state():
+    state = SimpleMarketState(max_history_minutes=120)
+    state.update_interval = 0
+    state.initialized = True
+    return state
+
+
+def _assert_parity(state, safety, dynamic):
+    spot_prices = state.spot_prices.values().tolist()
+    metrics = safety.get_safety_metrics()
+
+    volatility_pct = _reference_volatility_pct(spot_prices)
+    if volatility_pct is None:
+        assert 'volatility_pct' not in metrics
+    else:
+        assert metrics['volatility_pct'] == pytest.approx(volatility_pct, rel=1e-9)
+
+    spreads = _reference_avg_spreads(state.spot_spreads.values().tolist(), state.futures_spreads.values().tolist())
+    if spreads is not None:
+        assert metrics['avg_spot_spread_pct'] == pytest.approx(spreads[0], rel=1e-9)
+        assert metrics['avg_futures_spread_pct'] == pytest.approx(spreads[1], rel=1e-9)
+        assert safety._spreads_inverted() == (spreads[1] / spreads[0] > safety.max_spread_ratio)
+    assert safety._is_too_volatile() == (volatility_pct is None or volatility_pct > safety.max_volatility_threshold)
+
+    assessment = dynamic.get_market_assessment()
+    assert assessment['volatility_level'] == _reference_volatility_level(spot_prices)
+    assert assessment['is_trending'] == _reference_is_trending(spot_prices)
+    if spreads is not None:
+        assert assessment['high_liquidity'] == (spreads[0] < 0.1)
+
+
+# =============================================================================
+# Parity
+# =============================================================================
+
+class TestIndicatorParity:
+    def test_real_time_updates(self, state):
+        safety = SafetyIndicators(state, {})
+        dynamic = DynamicParameters(state, {})
+        spot, futures, spot_spread, futures_spread = _market_samples(400, seed=1)
+
+        for i in range(len(spot)):
+            state.update_real_time(_book(spot[i], spot_spread[i]), _book(futures[i], futures_spread[i]))
+            _assert_parity(state, safety, dynamic)
+
+        assert len(state.spot_prices) == 120
+        np.testing.assert_allclose(state.spot_prices.values(), spot[-120:], rtol=1e-12)
+
+    def test_historical_load_and_cleanup(self, state):
+        safety = SafetyIndicators(state, {})
+        dynamic = DynamicParameters(state, {})
+        _assert_parity(state, safety, dynamic)      # Windows created before any data
+
+        spot, futures, spot_spread, futures_spread = _market_samples(200, seed=2)
+        now = time.time()
+        state.load_initial_data({
+            'spot_prices': spot[:150].tolist(),
+            'futures_prices': futures[:150].tolist(),
+            'spot_spreads': spot_spread[:150].tolist(),
+            'futures_spreads': futures_spread[:150].tolist(),
+            'timestamps': (now - 60 * np.arange(150, 0, -1)).tolist(),
+        })
+        _assert_parity(state, safety, dynamic)
+
+        for i in range(150, 160):
+            state.update_real_time(_book(spot[i], spot_spread[i]), _book(futures[i], futures_spread[i]))
+            _assert_parity(state, safety, dynamic)
+
+        # Keep only the last ~6 minutes: windows fall back to warm-up lengths
+        state.clear_old_data(max_age_hours=0.1)
+        assert 10 <= len(state.spot_prices) < 20
+        _assert_parity(state, safety, dynamic)
+
+    def test_reads_do_not_materialize_history(self, state):
+        safety = SafetyIndicators(state, {})
+        dynamic = DynamicParameters(state, {})
+        spot, futures, spot_spread, futures_spread = _market_samples(60, seed=3)
+        for i in range(len(spot)):
+            state.update_real_time(_book(spot[i], spot_spread[i]), _book(futures[i], futures_spread[i]))
+
+        with patch.object(SimpleMarketState, 'get_recent_prices', side_effect=AssertionError), \
+                patch.object(SimpleMarketState, 'get_recent_spreads', side_effect=AssertionError):
+            safety.is_safe_to_trade()
+            dynamic.get_optimized_parameters()
+            safety.get_safety_metrics()
+        assert state.get_current_state()['spot_price_ewma'] == pytest.approx(state.spot_price_ewma.value)
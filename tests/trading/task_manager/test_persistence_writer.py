@@ -0,0 +1,214 @@
+"""Unit tests for off-loop task persistence.
+
+Test Coverage:
+- PersistenceWriter: per-key coalescing, atomic files, flush, delete ordering
+- Flush-interval durability policy batching changes, flush()/drain() overriding it
+- TaskPersistenceManager: state directory moves, saves not waiting for a stalled disk,
+  loads and removal seeing queued saves
+- TaskSerializer.encode_context output structure (enums, Symbol, exceptions)
+- Strategy TaskPersistenceManager on the same writer
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import msgspec
+import pytest
+
+from exchanges.structs import AssetName, ExchangeEnum, Symbol
+from infrastructure.logging import get_logger
+from trading.task_manager.persistence import TaskPersistenceManager
+from trading.task_manager.persistence_writer import DurabilityPolicy, PersistenceWriter
+from trading.task_manager.serialization import TaskSerializer
+from trading.tasks.base_task import TaskContext
+
+
+class ExampleContext(TaskContext):
+    exchange_name: ExchangeEnum = ExchangeEnum.MEXC
+    symbol: Symbol = Symbol(base=AssetName('BTC'), quote=AssetName('USDT'))
+    filled_quantity: float = 0.0
+
+
+@pytest.fixture
+def logger():
+    return get_logger('test_persistence_writer')
+
+
+def _slow_writes(writer, seconds):
+    atomic_write = writer._atomic_write
+
+    def slow(path, data):
+        time.sleep(seconds)
+        atomic_write(path, data)
+
+    writer._atomic_write = slow
+
+
+def _stalled_writes(writer):
+    """Hold every write until the returned event is set."""
+    released = threading.Event()
+    atomic_write = writer._atomic_write
+
+    def stalled(path, data):
+        released.wait(timeout=5.0)
+        atomic_write(path, data)
+
+    writer._atomic_write = stalled
+    return released
+
+
+# =============================================================================
+# Writer
+# =============================================================================
+
+class TestPersistenceWriter:
+    def test_coalescing_and_atomic_files(self, tmp_path, logger):
+        writer = PersistenceWriter(logger)
+        _slow_writes(writer, 0.05)
+        path = tmp_path / 'task.json'
+
+        for i in range(50):
+            writer.submit('task', path, str(i).encode())
+        assert writer.flush(timeout=5.0)
+
+        assert path.read_bytes() == b'49'
+        assert list(tmp_path.glob('.*.tmp')) == []
+        stats = writer.stats()
+        assert stats['writes'] < 50
+        assert stats['writes'] + stats['coalesced'] == 50
+        assert stats['pending'] == 0 and stats['failures'] == 0
+        writer.close()
+
+    def test_flush_interval_batches_changes(self, tmp_path, logger):
+        writer = PersistenceWriter(logger, DurabilityPolicy.every(60_000, fsync=False))
+        writer.submit('warmup', tmp_path / 'warmup.json', b'{}')
+        time.sleep(0.05)
+
+        for i in range(20):
+            writer.submit('task', tmp_path / 'task.json', str(i).encode())
+            time.sleep(0.002)
+        assert not (tmp_path / 'task.json').exists()    # Still inside the interval
+
+        assert writer.flush(timeout=5.0)                 # flush() overrides the interval
+        assert (tmp_path / 'task.json').read_bytes() == b'19'
+        assert writer.stats()['coalesced'] == 19
+        writer.close()
+
+    async def test_drain_overrides_interval(self, tmp_path, logger):
+        writer = PersistenceWriter(logger, DurabilityPolicy.every(60_000, fsync=False))
+        writer.submit('warmup', tmp_path / 'warmup.json', b'{}')
+        assert await writer.drain(timeout=5.0)
+        writer.submit('task', tmp_path / 'task.json', b'1')
+
+        assert await writer.drain(timeout=5.0)
+        assert (tmp_path / 'task.json').read_bytes() == b'1'
+        writer.close()
+
+    def test_delete_after_pending_write(self, tmp_path, logger):
+        writer = PersistenceWriter(logger)
+        _slow_writes(writer, 0.02)
+        path = tmp_path / 'task.json'
+
+        writer.submit('other', tmp_path / 'other.json', b'{}')
+        writer.submit('task', path, b'{}')
+        writer.submit('task', None, remove=[path])
+        writer.flush()
+
+        assert not path.exists()
+        assert (tmp_path / 'other.json').exists()
+
+    def test_write_failure_is_recorded(self, tmp_path, logger):
+        writer = PersistenceWriter(logger)
+        writer.submit('task', tmp_path / 'missing' / 'task.json', b'{}')
+        writer.flush()
+
+        assert writer.stats()['failures'] == 1
+        writer.close()
+        with pytest.raises(RuntimeError):
+            writer.submit('task', tmp_path / 'task.json', b'{}')
+
+
+# =============================================================================
+# Task persistence
+# =============================================================================
+
+class TestTaskPersistence:
+    def test_encode_context_structure(self):
+        context = ExampleContext(task_id='t1', state='error', error=ValueError('boom'), filled_quantity=1.5)
+        data = json.loads(TaskSerializer.encode_context(context))
+
+        assert data.pop('_schema_version') == "1.0.0"
+        assert data.pop('_persisted_at') > 0
+        assert data == {
+            'task_id': 't1', 'state': 'error', 'error': {'type': 'ValueError', 'message': 'boom'},
+            'metadata': {}, 'should_save_flag': True, 'exchange_name': ExchangeEnum.MEXC.value,
+            'symbol': {'base': 'BTC', 'quote': 'USDT'}, 'filled_quantity': 1.5,
+        }
+        assert json.loads(TaskSerializer.serialize_context(context))['symbol'] == data['symbol']
+
+    async def test_state_change_moves_file(self, tmp_path, logger):
+        persistence = TaskPersistenceManager(logger, str(tmp_path))
+        context = ExampleContext(task_id='t1', state='executing')
+        assert persistence.save_context('t1', context)
+        persistence.flush()
+        assert (tmp_path / 'active' / 't1.json').exists()
+
+        context.state = 'completed'
+        persistence.save_context('t1', context)
+        persistence.flush()
+        assert not (tmp_path / 'active' / 't1.json').exists()
+        assert json.loads((tmp_path / 'completed' / 't1.json').read_text())['state'] == 'completed'
+
+        assert await persistence.remove_task('t1')
+        persistence.flush()
+        assert persistence.get_statistics() == {'active': 0, 'completed': 0, 'errored': 0}
+        persistence.close()
+
+    async def test_save_does_not_wait_for_stalled_disk(self, tmp_path, logger):
+        persistence = TaskPersistenceManager(logger, str(tmp_path))
+        released = _stalled_writes(persistence._writer)
+        context = ExampleContext(task_id='t1', state='executing')
+
+        for i in range(10):
+            context.filled_quantity = float(i)
+            assert persistence.save_context('t1', context)
+        # All saves returned while the disk is still stalled
+        assert persistence.get_writer_stats()['writes'] == 0
+
+        # The snapshot is taken at save time and the latest one wins
+        context.filled_quantity = 100.0
+        released.set()
+        active = await persistence.load_active_tasks()
+        assert [task_id for task_id, _ in active] == ['t1']
+        assert json.loads(active[0][1])['filled_quantity'] == 9.0
+        assert persistence.get_writer_stats()['writes'] <= 2
+        persistence.close()
+
+    async def test_remove_sees_queued_save(self, tmp_path, logger):
+        persistence = TaskPersistenceManager(logger, str(tmp_path))
+        released = _stalled_writes(persistence._writer)
+        persistence.save_context('t1', ExampleContext(task_id='t1', state='executing'))
+
+        asyncio.get_running_loop().call_later(0.01, released.set)
+        assert await persistence.remove_task('t1')
+        await persistence.drain()
+        assert persistence.get_statistics()['active'] == 0
+        assert not await persistence.remove_task('t1')
+        persistence.close()
+
+    async def test_strategy_persistence_uses_writer(self, tmp_path, logger):
+        pytest.importorskip('dill')    # Required by the strategy_manager package
+        from trading.strategies.strategy_manager.task_persistence_manager import \
+            TaskPersistenceManager as StrategyPersistenceManager
+
+        persistence = StrategyPersistenceManager(logger, str(tmp_path), DurabilityPolicy.every(50, fsync=False))
+        raw = msgspec.json.encode({'status': 'active'}).decode()
+        persistence.save_context('Strategy_BTC', 'active', raw)
+        persistence.save_context('Strategy_BTC', 'error', raw)
+
+        assert await persistence.load_active_task_raw_context() == []
+        assert (tmp_path / 'errored' / 'Strategy_BTC.json').read_text() == raw
+        assert persistence.get_writer_stats()['coalesced'] == 1
+        persistence.close()
@@ -0,0 +1,264 @@
+"""Unit tests for the TaskManager deadline scheduler.
+
+Test Coverage:
+- Deadline order, rescheduling and cancellation with lazy heap entries
+- Heap compaction under heavy rescheduling
+- Tick wakeups: scheduled tasks, tasks woken while running, unsubscribed keys
+- Lag histograms (timer vs wakeup dispatch) and percentile buckets
+- TaskManager: next_delay cadence, tick-driven execution, removal, completion
+- Completed tasks popped by the loop are released from the scheduler
+- 200 symbol tasks: idle loop does not spin, ticks execute within one iteration (performance)
+"""
+
+import asyncio
+import contextlib
+import time
+
+import pytest
+
+from exchanges.structs import AssetName, Symbol
+from infrastructure.logging import get_logger
+from trading.task_manager.scheduler import DISPATCH_TIMER, DISPATCH_WAKEUP, DeadlineScheduler, LagHistogram
+from trading.task_manager.task_manager import TaskManager
+from trading.tasks.base_task import TaskExecutionResult
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _symbol(name):
+    return Symbol(base=AssetName(name), quote=AssetName('USDT'))
+
+
+# =============================================================================
+# Scheduler
+# =============================================================================
+
+class TestDeadlineScheduler:
+    def test_deadline_order_reschedule_cancel(self):
+        clock = FakeClock()
+        scheduler = DeadlineScheduler(clock)
+        scheduler.schedule('a', 1003.0)
+        scheduler.schedule('b', 1001.0)
+        scheduler.schedule('c', 1002.0)
+        scheduler.schedule('b', 1004.0)      # Reschedule later
+        assert scheduler.cancel('c')
+        assert not scheduler.cancel('missing')
+
+        assert scheduler.next_deadline() == 1003.0
+        clock.now = 1003.5
+        assert scheduler.pop_due() == [('a', DISPATCH_TIMER)]
+        clock.now = 1010.0
+        assert scheduler.pop_due() == [('b', DISPATCH_TIMER)]
+        assert scheduler.next_deadline() is None
+        assert len(scheduler) == 0
+
+    def test_compaction(self):
+        scheduler = DeadlineScheduler(FakeClock())
+        for i in range(5000):
+            scheduler.schedule(f't{i % 10}', 1000.0 + i)
+
+        assert len(scheduler) == 10
+        assert scheduler.stats()['heap_size'] <= 2 * 10 + DeadlineScheduler.COMPACT_SLACK + 1
+        assert scheduler.next_deadline() == 1000.0 + 4990
+
+    def test_wakeups(self):
+        clock = FakeClock()
+        scheduler = DeadlineScheduler(clock)
+        scheduler.schedule('idle', 1060.0)
+        scheduler.schedule('other', 1060.0)
+        scheduler.subscribe('idle', 'BTC')
+        scheduler.subscribe('running', 'BTC')
+
+        assert scheduler.wake_key('ETH') == 0
+        assert scheduler.wake_key('BTC') == 2
+        clock.now += 0.002
+        assert scheduler.pop_due() == [('idle', DISPATCH_WAKEUP)]
+        assert scheduler.wakeup_lag.count == 1
+        assert scheduler.wakeup_lag.max_ms == pytest.approx(2.0)
+
+        # Woken while running ('idle' is dispatched now): due as soon as it is rescheduled
+        scheduler.wake_key('BTC')
+        scheduler.delay('idle', 30.0)
+        assert scheduler.pop_due() == [('idle', DISPATCH_WAKEUP)]
+
+        # Unknown ('running' was never scheduled) and cancelled tasks are not revived
+        assert 'running' not in scheduler
+        scheduler.cancel('idle')
+        scheduler.wake_key('BTC')
+        assert scheduler.pop_due() == []
+
+    def test_histogram(self):
+        histogram = LagHistogram(buckets_ms=(1.0, 10.0))
+        for lag in (0.5, 0.5, 5.0, 50.0):
+            histogram.record(lag)
+
+        assert histogram.counts == [2, 1, 1]
+        assert histogram.percentile(50) == 1.0
+        assert histogram.percentile(75) == 10.0
+        assert histogram.percentile(100) == 50.0
+        assert histogram.to_dict()['buckets'] == {'<=1ms': 2, '<=10ms': 1, 'overflow': 1}
+
+    async def test_wait_returns_on_wakeup(self):
+        scheduler = DeadlineScheduler()
+        scheduler.schedule('a', scheduler.clock() + 60.0)
+        scheduler.subscribe('a', 'BTC')
+
+        asyncio.get_running_loop().call_later(0.01, scheduler.wake_key, 'BTC')
+        # Without the wakeup wait() would sleep until the 60s deadline
+        await asyncio.wait_for(scheduler.wait(), timeout=5.0)
+
+        assert scheduler.pop_due() == [('a', DISPATCH_WAKEUP)]
+
+
+# =============================================================================
+# TaskManager
+# =============================================================================
+
+class FakeContext:
+    def __init__(self, task_id, symbol):
+        self.task_id = task_id
+        self.symbol = symbol
+        self.should_save_flag = False
+
+
+class FakeTask:
+    """Duck-typed trading task recording its executions."""
+
+    def __init__(self, task_id, symbol, delay=60.0, runs=None):
+        self.context = FakeContext(task_id, symbol)
+        self.state = 'executing'
+        self.delay = delay
+        self.runs = runs
+        self.executions = []
+
+    @property
+    def task_id(self):
+        return self.context.task_id
+
+    async def execute_once(self):
+        self.executions.append(time.perf_counter())
+        if self.runs is not None and len(self.executions) >= self.runs:
+            self.state = 'completed'
+        return TaskExecutionResult(task_id=self.task_id, context=self.context, next_delay=self.delay,
+                                   should_continue=self.state != 'completed', state=self.state)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return TaskManager(get_logger('test_task_scheduler'), base_path=str(tmp_path))
+
+
+@contextlib.asynccontextmanager
+async def _running(manager):
+    await manager.start()
+    try:
+        yield manager
+    finally:
+        await manager.stop()
+
+
+async def _until(predicate, timeout=2.0):
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        assert time.perf_counter() < deadline, "condition not reached"
+        await asyncio.sleep(0.001)
+
+
+class TestTaskManagerScheduling:
+    async def test_next_delay_cadence(self, manager):
+        task = FakeTask('ScheduledTask_BTC', _symbol('BTC'), delay=0.02)
+        await manager.add_task(task)
+        async with _running(manager):
+            await _until(lambda: len(task.executions) >= 5)
+            gaps = [b - a for a, b in zip(task.executions, task.executions[1:])]
+            assert min(gaps) >= 0.015
+            assert manager.get_scheduler_stats()['timer_lag']['count'] >= 5
+
+    async def test_tick_wakes_subscribed_tasks(self, manager):
+        btc = FakeTask('TickTask_BTC', _symbol('BTC'))
+        eth = FakeTask('TickTask_ETH', _symbol('ETH'))
+        slow = FakeTask('SlowTask_BTC', _symbol('BTC'))
+        await manager.add_task(btc, wake_on_tick=True)
+        await manager.add_task(eth, wake_on_tick=True)
+        await manager.add_task(slow)
+        async with _running(manager):
+            await _until(lambda: all(len(t.executions) == 1 for t in (btc, eth, slow)))
+
+            assert manager.notify_symbol(_symbol('BTC')) == 1
+            await _until(lambda: len(btc.executions) == 2)
+            await asyncio.sleep(0.02)
+
+            assert len(eth.executions) == 1 and len(slow.executions) == 1
+            assert manager.get_status()['scheduler']['wakeup_lag']['count'] == 1
+
+    async def test_removal_and_completion(self, manager):
+        removed = FakeTask('RemovedTask_BTC', _symbol('BTC'), delay=0.005)
+        finite = FakeTask('FiniteTask_ETH', _symbol('ETH'), delay=0.005, runs=3)
+        await manager.add_task(removed, wake_on_tick=True)
+        await manager.add_task(finite)
+        async with _running(manager):
+            await _until(lambda: len(removed.executions) >= 2 and manager.get_task(finite.task_id) is None)
+
+            assert await manager.remove_task(removed.task_id)
+            count = len(removed.executions)
+            manager.notify_symbol(_symbol('BTC'))
+            await asyncio.sleep(0.05)
+
+            assert len(removed.executions) <= count + 1    # At most the execution already in flight
+            assert len(finite.executions) == 3
+            assert manager.task_count == 0
+
+    async def test_completed_task_released_from_scheduler(self, manager):
+        task = FakeTask('ParkedTask_BTC', _symbol('BTC'), delay=0.005)
+        await manager.add_task(task, wake_on_tick=True)
+        async with _running(manager):
+            await _until(lambda: len(task.executions) >= 1)
+            task.state = 'completed'     # Completed outside execute_once (e.g. stopped)
+            await _until(lambda: task.task_id not in manager._scheduler
+                         and manager.get_scheduler_stats()['dispatched'] == 0)
+
+            count = len(task.executions)
+            assert manager.notify_symbol(_symbol('BTC')) == 0
+            await asyncio.sleep(0.02)
+            assert len(task.executions) == count and manager.get_task(task.task_id) is task
+
+
+@pytest.mark.performance
+class TestManySymbols:
+    async def test_idle_and_tick_latency(self, manager):
+        tasks = [FakeTask(f'SymbolTask_S{i}', _symbol(f'S{i}')) for i in range(200)]
+        for task in tasks:
+            await manager.add_task(task, wake_on_tick=True)
+
+        iterations = 0
+        wait = manager._scheduler.wait
+
+        async def counted_wait(*args, **kwargs):
+            nonlocal iterations
+            iterations += 1
+            await wait(*args, **kwargs)
+
+        manager._scheduler.wait = counted_wait
+        async with _running(manager):
+            await _until(lambda: all(task.executions for task in tasks))
+
+            # Idle: every task waits 60s, so the loop sleeps instead of polling
+            before = iterations
+            cpu_before = time.process_time()
+            await asyncio.sleep(0.3)
+            assert iterations - before <= 2
+            assert time.process_time() - cpu_before < 0.1
+
+            # A tick is dispatched by the next loop iteration
+            tick = time.perf_counter()
+            manager.notify_symbol(_symbol('S42'))
+            await _until(lambda: len(tasks[42].executions) == 2)
+            assert tasks[42].executions[-1] - tick < 0.05
+            assert sum(len(task.executions) for task in tasks) == 201
+            assert manager.get_scheduler_stats()['wakeup_lag']['max_ms'] < 50